@@ -0,0 +1,118 @@
+"""Round trips and wall time of a KG read workflow: one call at a time vs one batch.
+
+The workflow is what an entity view does for each of N entities — get the
+entity graph, get its frames, list its relations — so 3N requests one call
+at a time, and one ``POST /api/graphs/batch`` batched. Both
+arms send the same operations through the same client: the per-call arm
+uses ``_make_authenticated_request`` directly, so neither arm pays
+GraphObject decoding and the difference is the round trips and the
+server-side read parallelism.
+
+Measured with the same discipline as ``perf_ab.py``: arms alternate within
+each repetition, repetition 0 is discarded in both as cold, and the best
+remaining run is kept.
+
+Usage (against a running server; the client reads its usual env config):
+
+    TSPACE=sp_lead_synth_100k TGRAPH=urn:sp_lead_synth_100k TN=20 \\
+        python scripts/perf_batch_roundtrips.py
+
+``TRTT_MS`` adds an artificial delay per round trip, to see the effect of a
+remote link from a local run.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from vitalgraph.client.vitalgraph_client import VitalGraphClient  # noqa: E402
+
+SPACE = os.environ.get("TSPACE", "sp_lead_synth_100k")
+GRAPH = os.environ.get("TGRAPH", "urn:sp_lead_synth_100k")
+N = min(int(os.environ.get("TN", "20")), 66)  # 3 ops each; a batch holds 200
+REPS = int(os.environ.get("TREPS", "3"))
+RTT_MS = float(os.environ.get("TRTT_MS", "0"))
+
+
+def _workflow(uris):
+    for uri in uris:
+        yield "GET", "kgentities", {"uri": uri, "include_entity_graph": True}
+        yield "GET", "kgentities/kgframes", {"entity_uri": uri}
+        yield "GET", "kgrelations", {"entity_source_uri": uri}
+
+
+def _count_round_trips(client):
+    """Wrap the client's request path; returns the counter list."""
+    counter = [0]
+    send = client._make_authenticated_request
+
+    async def counted(method, url, **kwargs):
+        counter[0] += 1
+        if RTT_MS:
+            await asyncio.sleep(RTT_MS / 1000)
+        return await send(method, url, **kwargs)
+
+    client._make_authenticated_request = counted
+    return counter
+
+
+async def _individual(client, uris):
+    base = f"{client.config.get_server_url()}/api/graphs"
+    for method, path, params in _workflow(uris):
+        response = await client._make_authenticated_request(
+            method, f"{base}/{path}", params={"space_id": SPACE, "graph_id": GRAPH, **params})
+        response.json()
+
+
+async def _batched(client, uris):
+    async with client.batch(SPACE, GRAPH, stop_on_error=False) as batch:
+        for method, path, params in _workflow(uris):
+            batch.add(method, path, params)
+    failed = [item for item in batch.items if not item.success]
+    if failed:
+        raise RuntimeError(f"{len(failed)} batched operations failed; "
+                           f"first: {failed[0].path} -> {failed[0].status_code}")
+
+
+async def main():
+    client = VitalGraphClient()
+    await client.open()
+    try:
+        listing = await client.kgentities.list_kgentities(SPACE, GRAPH, page_size=N)
+        uris = [str(e.URI) for e in listing.objects or []][:N]
+        if not uris:
+            print(f"no entities in {SPACE}/{GRAPH}")
+            return
+        counter = _count_round_trips(client)
+        arms = {"individual": _individual, "batch": _batched}
+        best = {name: None for name in arms}
+        trips = {}
+        for rep in range(REPS + 1):
+            order = list(arms) if rep % 2 == 0 else list(reversed(arms))
+            for name in order:
+                before = counter[0]
+                t0 = time.perf_counter()
+                await arms[name](client, uris)
+                ms = (time.perf_counter() - t0) * 1000
+                trips[name] = counter[0] - before
+                if rep == 0:
+                    continue          # cold, discarded in EVERY arm
+                if best[name] is None or ms < best[name]:
+                    best[name] = ms
+        ops = 3 * len(uris)
+        print(f"  workflow: {len(uris)} entities x (entity graph, frames, relations) = {ops} ops"
+              + (f", +{RTT_MS:.0f}ms/round trip" if RTT_MS else ""))
+        print(f"  {'arm':12s}{'round trips':>13s}{'best ms':>12s}")
+        for name in arms:
+            print(f"  {name:12s}{trips[name]:>13d}{best[name]:>12,.1f}")
+        print(f"  speedup: {best['individual'] / best['batch']:.1f}x")
+    finally:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
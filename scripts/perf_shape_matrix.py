@@ -46,6 +46,11 @@ Usage
     # plan classification only, no execution (fast, safe on any size)
     python scripts/perf_shape_matrix.py --space sp_lead_synth_100k \\
         --graph urn:sp_lead_synth_100k --no-execute
+
+    # A/B the declared property tables on listing and filter
+    # shapes: same SQL generated with the rewrite on and off
+    python scripts/perf_shape_matrix.py --space sp_lead_synth_10k \\
+        --graph urn:sp_lead_synth_10k --property-table --only property_table
 """
 
 from __future__ import annotations
@@ -161,14 +166,13 @@ def build_criteria(comparator="eq", slot_class=TEXT, depth=2, negate=False):
 
 
 def classify(plan_text: str) -> str:
-    """Cost class from a plan. See the module docstring for the categories."""
-    if "EXISTS" not in plan_text and "SubPlan" not in plan_text:
-        return "set-based"
-    for line in plan_text.splitlines():
-        stripped = line.strip()
-        if stripped.startswith("->  Sort") or stripped.startswith("->  HashAggregate"):
-            return "blocking"
-    return "ordered-probe"
+    """Cost class from a plan. See the module docstring for the categories.
+
+    Shared with the executor's auto-explain capture, so a
+    captured production plan and a sweep cell are classified alike.
+    """
+    from vitalgraph.db.sparql_sql.auto_explain import classify_plan_text
+    return classify_plan_text(plan_text)
 
 
 async def sql_for(conn, criteria, space, graph, entity_type, page_size, sidecar):
@@ -282,6 +286,74 @@ async def run_cell(conn, cell: Cell, criteria, space, graph, entity_type,
     return cell
 
 
+async def run_property_table_cell(conn, cell: Cell, criteria, space, graph,
+                                  entity_type, page_size, sidecar,
+                                  execute: bool) -> Cell:
+    """A/B one shape with the property-table rewrite on and off.
+
+    Unlike run_cell this is not a cost-class question — a property table
+    changes how many joins there are, not whether the plan is ordered — so
+    the cell records EXPLAIN cost and wall time for both sides, and the
+    result sets must be identical. A table that is not 'ready' makes both
+    sides the same SQL; the note says so rather than reporting a 1.0x win.
+    """
+    import vitalgraph.db.sparql_sql.rewrite_property_table as rpt
+
+    sides = {}
+    saved = rpt.ENABLED
+    try:
+        for label, enabled in (("off", False), ("on", True)):
+            rpt.ENABLED = enabled
+            gen = await sql_for(conn, criteria, space, graph, entity_type,
+                                page_size, sidecar)
+            plan = "\n".join(r[0] for r in await conn.fetch("EXPLAIN " + gen.sql))
+            first = plan.splitlines()[0] if plan else ""
+            cost = float(first.split("cost=")[1].split("..")[1].split()[0]) \
+                if "cost=" in first else 0.0
+            sides[label] = {"gen": gen, "cost": cost,
+                            "ptab": "_ptab_" in gen.sql}
+    except Exception as exc:
+        cell.plan_class, cell.note = "no-plan", f"{type(exc).__name__}: {exc}"[:110]
+        return cell
+    finally:
+        rpt.ENABLED = saved
+
+    cell.plan_class = "property-table" if sides["on"]["ptab"] else "no-rewrite"
+    cell.cost = sides["on"]["cost"]
+    cell.detail = {"cost_off": sides["off"]["cost"], "cost_on": sides["on"]["cost"]}
+    if not sides["on"]["ptab"]:
+        cell.rows_ok, cell.note = "-", "no ready property table matched this shape"
+        return cell
+    if not execute:
+        cell.rows_ok = "-"
+        cell.note = f"cost {sides['off']['cost']:.0f} -> {sides['on']['cost']:.0f}"
+        return cell
+
+    try:
+        timings, results = {}, {}
+        for label in ("off", "on"):
+            t = time.perf_counter()
+            results[label] = await asyncio.wait_for(
+                _fetch(conn, sides[label]["gen"]), CELL_TIMEOUT_S)
+            timings[label] = (time.perf_counter() - t) * 1000
+        cell.detail.update({"ms_off": timings["off"], "ms_on": timings["on"],
+                            "rows": len(results["on"])})
+        if results["on"] != results["off"]:
+            cell.rows_ok = "MISMATCH"
+        elif not results["on"]:
+            cell.rows_ok = "VACUOUS"
+        else:
+            cell.rows_ok = "OK"
+        cell.note = (f"cost {sides['off']['cost']:.0f} -> {sides['on']['cost']:.0f}; "
+                     f"{timings['off']:.0f}ms -> {timings['on']:.0f}ms")
+    except asyncio.TimeoutError:
+        cell.rows_ok = "TIMEOUT"
+        cell.note = f"exceeded {CELL_TIMEOUT_S}s"
+    except Exception as exc:
+        cell.rows_ok, cell.note = "ERROR", f"{type(exc).__name__}: {exc}"[:110]
+    return cell
+
+
 async def _fetch(conn, gen):
     """Run a generated query, fencing it exactly as the executor does."""
     if gen.needs_ordered_scan:
@@ -312,6 +384,10 @@ async def main() -> int:
                     help="nesting depth of the base shape. Must match the "
                          "fixture: a depth-2 base against a depth-1 fixture "
                          "matches nothing and every cell reports VACUOUS.")
+    ap.add_argument("--property-table", action="store_true",
+                    help="add the property_table dimension: listing and "
+                         "filter shapes A/B'd with the property-table rewrite "
+                         "on and off. Needs a ready declaration in the space.")
     a = ap.parse_args()
 
     import asyncpg
@@ -359,6 +435,26 @@ async def main() -> int:
     for n in (False, True):
         await sweep("negate", str(n), negate=n)
 
+    if a.property_table and (not a.only or a.only == "property_table"):
+        print("property table (rewrite off -> on)")
+        shapes = (("listing", []),
+                  ("filter eq / text", build_criteria(depth=1)),
+                  ("filter gt / double", build_criteria(comparator="gt",
+                                                        slot_class=DOUBLE,
+                                                        depth=1)))
+        for label, crit in shapes:
+            for et_label, et in (("KGEntity", KGENTITY), ("Lead", SPECIFIC_ENTITY)):
+                for ps in (25, 1000):
+                    cell = Cell(dimension="property_table",
+                                value=f"{label} / {et_label} / {ps}")
+                    cell = await run_property_table_cell(
+                        conn, cell, crit, a.space, a.graph, et, ps,
+                        a.sidecar, execute)
+                    cells.append(cell)
+                    print(f"  {'property_table':14s} {cell.value:34s} "
+                          f"{cell.plan_class:14s} {cell.rows_ok:9s} {cell.note}",
+                          flush=True)
+
     await conn.close()
 
     lines = [f"# KGQuery shape matrix — {a.space}", "",
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Filtered vector top-K: recall and latency per mode as filter selectivity varies.
+
+A vector-driving top-K restricted to a child pattern (KGQuery vector
+criteria plus type / slot / geo filters) used to run as one HNSW-ordered
+subquery with the filter applied to the index's output. This compares
+that statement with the modes vitalgraph/db/sparql_sql/vg_ann.py chooses
+between, on a scratch table:
+
+  hnsw       the pre-vg_ann driving subquery, as generated
+  exact      filter first, exact distances, sort
+  iterative  pgvector >= 0.8 iterative scan + exact rerank (skipped before 0.8)
+  overfetch  K/selectivity candidates, filter, rerank (single round)
+  auto       resolve_ann_request: mode from planner estimates, with the
+             widening / exact fallbacks
+
+Recall@K is against the exact answer. The filter is a side table of
+subject uuids with a uniformly random bucket, so selectivity is exact.
+
+Needs a PostgreSQL with pgvector; pass --dsn or set VG_BENCH_DSN. The
+scratch tables are created in a temp schema and dropped.
+
+Usage:
+    python test_scripts/perf/benchmark_filtered_ann.py --dsn postgresql://... \\
+        --rows 200000 --dims 64 --k 10 --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from vitalgraph.db.sparql_sql.vg_ann import (  # noqa: E402
+    AnnPlan, MIN_EF_SEARCH, ann_top_k_sql, choose_ann_plan, resolve_ann_request,
+    supports_iterative_scan,
+)
+from vitalgraph.db.sparql_sql.vg_functions import AnnRequest  # noqa: E402
+from vitalgraph.db.vector_codec import copy_upsert_vectors, register_vector_codec  # noqa: E402
+
+SELECTIVITIES = (0.001, 0.01, 0.05, 0.2, 0.5, 1.0)
+
+
+def _data(rows: int, dims: int, clusters: int = 64):
+    rng = np.random.default_rng(7)
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    labels = rng.integers(0, clusters, rows)
+    vecs = centers[labels] + 0.35 * rng.standard_normal((rows, dims)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    queries = centers[rng.integers(0, clusters, 1000)] + \
+        0.35 * rng.standard_normal((1000, dims)).astype(np.float32)
+    return vecs, queries, rng.integers(0, 1000, rows)
+
+
+def _forced(mode: str, k: int, sel: float) -> AnnPlan:
+    if mode == 'exact':
+        return AnnPlan('exact', candidates=k)
+    if mode == 'iterative':
+        plan = choose_ann_plan(k, 1.0, 1.0, True, True)
+        plan.settings['hnsw.max_scan_tuples'] = str(max(20_000, int(k / sel * 6)))
+        return plan
+    cand = min(1000, max(2 * k, int(k / sel * 1.5)))
+    return AnnPlan('overfetch', candidates=cand, ef_search=max(cand, MIN_EF_SEARCH),
+                   settings={'hnsw.ef_search': str(max(cand, MIN_EF_SEARCH))})
+
+
+async def _fetch(conn, plan: AnnPlan, sql: str, q):
+    async with conn.transaction():
+        for name, value in plan.settings.items():
+            await conn.execute("SELECT set_config($1, $2, true)", name, value)
+        return [r['subject_uuid'] for r in await conn.fetch(sql, q)]
+
+
+async def bench(dsn: str, rows: int, dims: int, k: int, queries: int) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    schema = f"vg_bench_{uuid.uuid4().hex[:8]}"
+    vec_table, flt = f"{schema}.vec", f"{schema}.flt"
+    try:
+        if not await register_vector_codec(conn):
+            print("pgvector is not installed in this database")
+            return
+        version = await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        iterative = supports_iterative_scan(version)
+        await conn.execute(f"CREATE SCHEMA {schema}")
+        await conn.execute(
+            f"CREATE TABLE {vec_table} (subject_uuid uuid, context_uuid uuid, "
+            f"embedding vector({dims}), updated_time timestamptz, "
+            f"PRIMARY KEY (subject_uuid, context_uuid))")
+        await conn.execute(f"CREATE TABLE {flt} (v0__uuid uuid PRIMARY KEY, bucket int)")
+
+        vecs, qvecs, buckets = _data(rows, dims)
+        ctx = uuid.uuid4()
+        ids = [uuid.uuid4() for _ in range(rows)]
+        t0 = time.perf_counter()
+        for i in range(0, rows, 5000):
+            await copy_upsert_vectors(
+                conn, vec_table, ("subject_uuid", "context_uuid", "embedding"),
+                [(ids[j], ctx, vecs[j]) for j in range(i, min(rows, i + 5000))],
+                conflict_columns=("subject_uuid", "context_uuid"))
+        await conn.copy_records_to_table(
+            "flt", schema_name=schema, records=list(zip(ids, map(int, buckets))))
+        await conn.execute(f"CREATE INDEX ON {flt} (bucket)")
+        await conn.execute(f"CREATE INDEX ON {vec_table} USING hnsw (embedding vector_cosine_ops)")
+        await conn.execute(f"ANALYZE {vec_table}; ANALYZE {flt}")
+        print(f"pgvector {version}; loaded {rows} x {dims}-d and built HNSW in "
+              f"{time.perf_counter() - t0:.1f}s; K={k}, {queries} queries per cell")
+
+        modes = ['hnsw', 'exact'] + (['iterative'] if iterative else []) + ['overfetch', 'auto']
+        print(f"{'selectivity':>11} " + " ".join(f"{m:>21}" for m in modes))
+        print(f"{'':>11} " + " ".join(f"{'recall  p50ms  p95ms':>21}" for _ in modes))
+        for sel in SELECTIVITIES:
+            child = f"SELECT v0__uuid FROM {flt} WHERE bucket < {int(sel * 1000)}"
+            cells = []
+            truths = []
+            for qi in range(queries):
+                sql = ann_top_k_sql(_forced('exact', k, sel), vec_table, child, "v0__uuid", k)
+                truths.append(set(await _fetch(conn, AnnPlan('exact', k), sql, qvecs[qi])))
+            for mode in modes:
+                recalls, lat = [], []
+                for qi in range(queries):
+                    q = qvecs[qi]
+                    t0 = time.perf_counter()
+                    if mode == 'hnsw':
+                        got = await _fetch(conn, AnnPlan('hnsw', k), (
+                            f"SELECT subject_uuid FROM {vec_table} WHERE TRUE AND subject_uuid IN "
+                            f"(SELECT DISTINCT v0__uuid FROM ({child}) AS __cs "
+                            f"WHERE v0__uuid IS NOT NULL) "
+                            f"ORDER BY embedding <=> $1::vector LIMIT {k}"), q)
+                    elif mode == 'auto':
+                        req = AnnRequest(placeholder="__VG_ANN_0__", vec_table=vec_table,
+                                         ctx_clause="", child_sql=child,
+                                         child_uuid_col="v0__uuid", limit=k,
+                                         vector_literal=None)
+                        sub, _, _ = await resolve_ann_request(conn, req, q)
+                        got = [r['subject_uuid'] for r in await conn.fetch(sub)]
+                    else:
+                        plan = _forced(mode, k, sel)
+                        sql = ann_top_k_sql(plan, vec_table, child, "v0__uuid", k)
+                        got = await _fetch(conn, plan, sql, q)
+                    lat.append((time.perf_counter() - t0) * 1000)
+                    truth = truths[qi]
+                    recalls.append(len(truth & set(got)) / len(truth) if truth else 1.0)
+                lat.sort()
+                cells.append(f"{statistics.mean(recalls):>6.3f} {lat[len(lat) // 2]:>6.1f} "
+                             f"{lat[int(len(lat) * 0.95) - 1]:>6.1f}")
+            print(f"{sel:>11.3f} " + " ".join(f"{c:>21}" for c in cells))
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dsn", default=os.environ.get("VG_BENCH_DSN"))
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--dims", type=int, default=64)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=50)
+    args = ap.parse_args()
+    if not args.dsn:
+        print("needs a PostgreSQL with pgvector: pass --dsn or set VG_BENCH_DSN")
+        return
+    asyncio.run(bench(args.dsn, args.rows, args.dims, args.k, args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Entity-graph invalidation fan-out: per-entity vs coalesced NOTIFY.
+
+Before coalescing, a write of N entities sent N ``CHANNEL_ENTITY_GRAPH``
+notifications and every listening instance flushed the graph's count
+cache N times. This measures both sides of that for one batch write.
+
+What it measures:
+  1. Listener cost: applying the payloads of an N-entity write to warm
+     EntityGraphCache/CountCache instances, per-entity (legacy payloads)
+     vs coalesced. Runs without a database.
+  2. Sender cost and delivery: wall time to NOTIFY the payloads on one
+     connection until a second connection has received them all.
+     Needs PostgreSQL; pass --dsn or set VG_BENCH_DSN.
+
+Usage:
+    python test_scripts/perf/benchmark_invalidation_fanout.py --entities 5000
+    python test_scripts/perf/benchmark_invalidation_fanout.py --dsn postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from vitalgraph.cache.count_cache import CountCache  # noqa: E402
+from vitalgraph.cache.entity_graph_cache import EntityGraphCache  # noqa: E402
+from vitalgraph.signal.entity_graph_invalidation import (  # noqa: E402
+    EntityGraphInvalidator, build_payloads,
+)
+
+SPACE = "bench_space"
+GRAPH = "http://vital.ai/graph/bench"
+CHANNEL = "vg_bench_entity_graph"
+
+
+def _uris(n: int):
+    return [f"http://vital.ai/haley.ai/app/KGEntity/{i:08d}-7c4e-4f0b-9a55-bench" for i in range(n)]
+
+
+def _legacy_payloads(uris):
+    return [{"type": "updated", "space_id": SPACE, "graph_id": GRAPH, "entity_uri": u}
+            for u in uris]
+
+
+def _coalesced_payloads(uris):
+    payloads = build_payloads(
+        {"type": "updated", "space_id": SPACE, "graph_id": GRAPH, "origin": "writer"}, uris)
+    for i, p in enumerate(payloads, 1):
+        p["seq"] = i
+    return payloads
+
+
+class _CountingCountCache(CountCache):
+    """CountCache that counts graph flushes (each one scans the whole cache)."""
+
+    flushes = 0
+
+    def invalidate_graph(self, space_id, graph_id):
+        self.flushes += 1
+        super().invalidate_graph(space_id, graph_id)
+
+
+def _warm_caches(uris, counts: int):
+    ec, cc = EntityGraphCache(), _CountingCountCache()
+    for u in uris:
+        ec.put(SPACE, GRAPH, u, [{"s": u, "p": "p", "o": "o"}])
+    # Counts cached for other graphs: every flush still scans them.
+    for i in range(counts):
+        cc.put(SPACE, f"{GRAPH}/{i % 50}", f"q{i}", i)
+    return ec, cc
+
+
+def bench_listener(n: int, counts: int) -> None:
+    uris = _uris(n)
+    for label, payloads in (("per-entity", _legacy_payloads(uris)),
+                            ("coalesced", _coalesced_payloads(uris))):
+        ec, cc = _warm_caches(uris, counts)
+        inv = EntityGraphInvalidator(ec, cc, origin="listener")
+        encoded = [json.dumps(p, separators=(",", ":")) for p in payloads]
+        t0 = time.perf_counter()
+        for raw in encoded:
+            inv.apply(json.loads(raw))
+        dt = time.perf_counter() - t0
+        print(f"  {label:<11} {len(payloads):>6} payloads  "
+              f"{sum(map(len, encoded)):>9,} bytes  "
+              f"{cc.flushes:>6} count flushes  {dt * 1000:>8.1f} ms")
+
+
+async def bench_notify(dsn: str, n: int) -> None:
+    import asyncpg
+
+    sender = await asyncpg.connect(dsn)
+    listener = await asyncpg.connect(dsn)
+    uris = _uris(n)
+    try:
+        for label, payloads in (("per-entity", _legacy_payloads(uris)),
+                                ("coalesced", _coalesced_payloads(uris))):
+            done = asyncio.Event()
+            received = 0
+
+            def on_notify(conn, pid, channel, payload, total=len(payloads)):
+                nonlocal received
+                received += 1
+                if received == total:
+                    done.set()
+
+            await listener.add_listener(CHANNEL, on_notify)
+            t0 = time.perf_counter()
+            for p in payloads:
+                await sender.execute("SELECT pg_notify($1, $2)", CHANNEL,
+                                     json.dumps(p, separators=(",", ":")))
+            await asyncio.wait_for(done.wait(), timeout=120)
+            dt = time.perf_counter() - t0
+            await listener.remove_listener(CHANNEL, on_notify)
+            print(f"  {label:<11} {len(payloads):>6} NOTIFYs  {dt * 1000:>9.1f} ms to deliver")
+    finally:
+        await sender.close()
+        await listener.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dsn", default=os.environ.get("VG_BENCH_DSN"))
+    ap.add_argument("--entities", type=int, default=5_000)
+    ap.add_argument("--counts", type=int, default=2_000,
+                    help="cached count queries (other graphs) per listener")
+    args = ap.parse_args()
+
+    print(f"listener, one {args.entities}-entity write:")
+    bench_listener(args.entities, args.counts)
+    if args.dsn:
+        print("sender -> listener delivery:")
+        asyncio.run(bench_notify(args.dsn, args.entities))
+    else:
+        print("(no --dsn / VG_BENCH_DSN: skipping NOTIFY delivery bench)")
+
+
+if __name__ == "__main__":
+    main()
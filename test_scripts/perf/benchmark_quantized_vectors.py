@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Quantized HNSW storage: index size, build time, recall@K and latency.
+
+Builds the HNSW index of a scratch vector table once per storage mode of
+vitalgraph/db/vector_storage.py, with the DDL
+``SparqlSQLSchema.create_vector_hnsw_index_sql`` generates:
+
+  vector    HNSW over the full-precision vector(d) column (the old default)
+  halfvec   HNSW over embedding::halfvec(d)
+  binary    HNSW over binary_quantize(embedding)::bit(d), Hamming distance
+
+and for each reports the index's on-disk size (pg_relation_size — what
+has to stay in memory for warm searches), the build time, and recall@K
+plus latency of the top-K statement the driving subquery generates for
+that storage (quantized candidate scan, then full-precision rerank), at
+each rerank factor. Recall is against an exact scan of the same table.
+
+Needs a PostgreSQL with pgvector >= 0.7; pass --dsn or set VG_BENCH_DSN.
+The scratch table is created in a temp schema and dropped.
+
+Usage:
+    python test_scripts/perf/benchmark_quantized_vectors.py --dsn postgresql://... \\
+        --rows 500000 --dims 384 --k 10 --queries 100 --factors 1,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema  # noqa: E402
+from vitalgraph.db.vector_codec import copy_upsert_vectors, register_vector_codec  # noqa: E402
+from vitalgraph.db.vector_storage import (  # noqa: E402
+    STORAGE_MODES, index_distance_sql, supports_quantized_storage,
+)
+
+
+def _data(rows: int, dims: int, clusters: int = 256):
+    rng = np.random.default_rng(11)
+    centers = rng.standard_normal((clusters, dims)).astype(np.float32)
+    vecs = centers[rng.integers(0, clusters, rows)] + \
+        0.5 * rng.standard_normal((rows, dims)).astype(np.float32)
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    queries = centers[rng.integers(0, clusters, 1000)] + \
+        0.5 * rng.standard_normal((1000, dims)).astype(np.float32)
+    return vecs, queries
+
+
+def _top_k_sql(table: str, storage: str, dims: int, k: int, factor: int) -> str:
+    q = "$1::vector"
+    if storage == "vector" and factor == 1:
+        return f"SELECT subject_uuid FROM {table} ORDER BY embedding <=> {q} LIMIT {k}"
+    return (
+        f"SELECT subject_uuid FROM (SELECT subject_uuid, embedding FROM {table} "
+        f"ORDER BY {index_distance_sql(storage, dims, q)} LIMIT {k * factor}) AS __vq "
+        f"ORDER BY embedding <=> {q} LIMIT {k}"
+    )
+
+
+def _mb(n: int) -> str:
+    return f"{n / 2**20:,.1f}"
+
+
+async def bench(dsn: str, rows: int, dims: int, k: int, queries: int,
+                factors, work_mem: str) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    schema = f"vg_bench_{uuid.uuid4().hex[:8]}"
+    space, index = schema, "bench"
+    table = SparqlSQLSchema.vec_table_name(space, index)
+    ddl = SparqlSQLSchema()
+    try:
+        if not await register_vector_codec(conn):
+            print("pgvector is not installed in this database")
+            return
+        version = await conn.fetchval("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        if not supports_quantized_storage(version):
+            print(f"pgvector {version} has no halfvec / bit indexes (needs >= 0.7)")
+            return
+        await conn.execute(f"CREATE SCHEMA {schema}")
+        await conn.execute(f"SET search_path = {schema}, public")
+        stmts = ddl.create_vector_data_table_sql(space, index, dims)
+        await conn.execute(stmts[0])
+
+        vecs, qvecs = _data(rows, dims)
+        ids = [uuid.uuid4() for _ in range(rows)]
+        ctx = uuid.uuid4()
+        t0 = time.perf_counter()
+        for i in range(0, rows, 5000):
+            await copy_upsert_vectors(
+                conn, table, ("subject_uuid", "context_uuid", "embedding"),
+                [(ids[j], ctx, vecs[j]) for j in range(i, min(rows, i + 5000))],
+                conflict_columns=("subject_uuid", "context_uuid"))
+        await conn.execute(f"ANALYZE {table}")
+        heap = await conn.fetchval("SELECT pg_table_size($1::regclass)", table)
+        print(f"pgvector {version}; loaded {rows} x {dims}-d in {time.perf_counter() - t0:.1f}s "
+              f"(table {_mb(heap)} MB); K={k}, {queries} queries, "
+              f"maintenance_work_mem={work_mem}")
+
+        truths = []
+        await conn.execute("SET enable_indexscan = off")
+        for qi in range(queries):
+            got = await conn.fetch(
+                f"SELECT subject_uuid FROM {table} ORDER BY embedding <=> $1::vector LIMIT {k}",
+                qvecs[qi])
+            truths.append({r['subject_uuid'] for r in got})
+        await conn.execute("RESET enable_indexscan")
+
+        print(f"{'storage':>8} {'index MB':>9} {'build s':>8} {'factor':>6} "
+              f"{'recall':>7} {'p50 ms':>7} {'p95 ms':>7}")
+        hnsw = SparqlSQLSchema.vec_hnsw_index_name(space, index)
+        for storage in STORAGE_MODES:
+            await conn.execute(f"DROP INDEX IF EXISTS {hnsw}")
+            await conn.execute(f"SET maintenance_work_mem = '{work_mem}'")
+            t0 = time.perf_counter()
+            await conn.execute(ddl.create_vector_hnsw_index_sql(space, index, dims, "cosine", storage))
+            build = time.perf_counter() - t0
+            size = await conn.fetchval("SELECT pg_relation_size($1::regclass)", hnsw)
+            for factor in factors:
+                sql = _top_k_sql(table, storage, dims, k, factor)
+                await conn.execute(f"SET hnsw.ef_search = {max(40, k * factor)}")
+                recalls, lat = [], []
+                for qi in range(queries):
+                    t1 = time.perf_counter()
+                    got = {r['subject_uuid'] for r in await conn.fetch(sql, qvecs[qi])}
+                    lat.append((time.perf_counter() - t1) * 1000)
+                    recalls.append(len(truths[qi] & got) / len(truths[qi]))
+                lat.sort()
+                print(f"{storage:>8} {_mb(size):>9} {build:>8.1f} {factor:>6} "
+                      f"{statistics.mean(recalls):>7.3f} {lat[len(lat) // 2]:>7.2f} "
+                      f"{lat[int(len(lat) * 0.95) - 1]:>7.2f}")
+    finally:
+        await conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dsn", default=os.environ.get("VG_BENCH_DSN"))
+    ap.add_argument("--rows", type=int, default=200_000)
+    ap.add_argument("--dims", type=int, default=384)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--queries", type=int, default=100)
+    ap.add_argument("--factors", default="1,2,4,8",
+                    help="rerank factors to measure (candidates = K x factor)")
+    ap.add_argument("--maintenance-work-mem", default="1GB")
+    args = ap.parse_args()
+    if not args.dsn:
+        print("needs a PostgreSQL with pgvector: pass --dsn or set VG_BENCH_DSN")
+        return
+    factors = [int(f) for f in args.factors.split(",") if f.strip()]
+    asyncio.run(bench(args.dsn, args.rows, args.dims, args.k, args.queries,
+                      factors, args.maintenance_work_mem))
+
+
+if __name__ == "__main__":
+    main()
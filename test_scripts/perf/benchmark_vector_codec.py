@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Text vs binary pgvector transfer: population vectors/s and per-query cost.
+
+Before the binary codec every embedding crossed into PostgreSQL as a
+``"[...]"`` string built per vector, and population upserted one row per
+round trip. This compares that path with the binary codec and the
+COPY-based upsert (vitalgraph/db/vector_codec.py).
+
+What it measures:
+  1. Client-side encode cost per vector: str-join literal vs binary codec.
+     Runs without a database.
+  2. Population vectors/s into a scratch ``vector(N)`` table: per-row text
+     upserts vs one binary COPY + merge per batch.
+  3. Per-query overhead of binding a query vector: ``$1::vector`` as text
+     vs binary, on a trivial ``<=>`` against itself.
+
+(2) and (3) need a PostgreSQL with pgvector; pass --dsn or set
+VG_BENCH_DSN. The scratch table is created in a temp schema and dropped.
+
+Usage:
+    python test_scripts/perf/benchmark_vector_codec.py
+    python test_scripts/perf/benchmark_vector_codec.py --dsn postgresql://... \\
+        --rows 20000 --batch 100 --dims 384
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from vitalgraph.db.vector_codec import (  # noqa: E402
+    copy_upsert_vectors, encode_vector, register_vector_codec,
+)
+
+
+def _legacy_literal(vec) -> str:
+    return "[" + ",".join(str(v) for v in vec) + "]"
+
+
+def bench_encode(dims: int, n: int) -> None:
+    rng = np.random.default_rng(0)
+    vecs = rng.standard_normal((n, dims)).astype(np.float32)
+    # Pre-032 providers returned lists (``.tolist()``) and callers joined them.
+    as_lists = [v.tolist() for v in vecs]
+
+    t0 = time.perf_counter()
+    text = [_legacy_literal(v) for v in as_lists]
+    t_text = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    binary = [encode_vector(v) for v in vecs]
+    t_bin = time.perf_counter() - t0
+
+    print(f"encode, {n} x {dims}-d:")
+    print(f"  text   {n / t_text:>12,.0f} vectors/s   {len(text[0]):>6} bytes/vector")
+    print(f"  binary {n / t_bin:>12,.0f} vectors/s   {len(binary[0]):>6} bytes/vector")
+    print(f"  speedup {t_text / t_bin:.1f}x")
+
+
+async def bench_db(dsn: str, dims: int, rows: int, batch: int, queries: int) -> None:
+    import asyncpg
+
+    text_conn = await asyncpg.connect(dsn)
+    bin_conn = await asyncpg.connect(dsn)
+    schema = f"vg_bench_{uuid.uuid4().hex[:8]}"
+    table = f"{schema}.vec"
+    try:
+        await text_conn.execute(f"CREATE SCHEMA {schema}")
+        await text_conn.execute(
+            f"CREATE TABLE {table} (subject_uuid uuid, context_uuid uuid, "
+            f"embedding vector({dims}), updated_time timestamptz, "
+            f"PRIMARY KEY (subject_uuid, context_uuid))")
+        if not await register_vector_codec(bin_conn):
+            print("pgvector is not installed in this database")
+            return
+
+        rng = np.random.default_rng(1)
+        ctx = uuid.uuid4()
+        data = [(uuid.uuid4(), ctx, v) for v in rng.standard_normal((rows, dims)).astype(np.float32)]
+        upsert = (f"INSERT INTO {table} (subject_uuid, context_uuid, embedding, updated_time) "
+                  f"VALUES ($1, $2, $3::vector, CURRENT_TIMESTAMP) "
+                  f"ON CONFLICT (subject_uuid, context_uuid) DO UPDATE "
+                  f"SET embedding = EXCLUDED.embedding, updated_time = EXCLUDED.updated_time")
+
+        t0 = time.perf_counter()
+        for s, c, v in data:
+            await text_conn.execute(upsert, s, c, _legacy_literal(v.tolist()))
+        t_text = time.perf_counter() - t0
+        await text_conn.execute(f"TRUNCATE {table}")
+
+        t0 = time.perf_counter()
+        for i in range(0, rows, batch):
+            await copy_upsert_vectors(
+                bin_conn, table, ("subject_uuid", "context_uuid", "embedding"),
+                data[i:i + batch], conflict_columns=("subject_uuid", "context_uuid"))
+        t_bin = time.perf_counter() - t0
+
+        print(f"population, {rows} x {dims}-d:")
+        print(f"  text per-row      {rows / t_text:>10,.0f} vectors/s")
+        print(f"  binary COPY/{batch:<5} {rows / t_bin:>10,.0f} vectors/s")
+        print(f"  speedup {t_text / t_bin:.1f}x")
+
+        q = data[0][2]
+        sql = "SELECT $1::vector <=> $1::vector"
+        text_lat, bin_lat = [], []
+        for _ in range(queries):
+            t0 = time.perf_counter()
+            await text_conn.fetchval(sql, _legacy_literal(q.tolist()))
+            text_lat.append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            await bin_conn.fetchval(sql, q)
+            bin_lat.append(time.perf_counter() - t0)
+        print(f"query vector bind, median of {queries}:")
+        print(f"  text   {statistics.median(text_lat) * 1e6:>8.0f} us")
+        print(f"  binary {statistics.median(bin_lat) * 1e6:>8.0f} us")
+    finally:
+        await text_conn.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await text_conn.close()
+        await bin_conn.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--dsn", default=os.environ.get("VG_BENCH_DSN"))
+    ap.add_argument("--dims", type=int, default=384)
+    ap.add_argument("--encode-n", type=int, default=20_000)
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--batch", type=int, default=100)
+    ap.add_argument("--queries", type=int, default=500)
+    args = ap.parse_args()
+
+    bench_encode(args.dims, args.encode_n)
+    if args.dsn:
+        asyncio.run(bench_db(args.dsn, args.dims, args.rows, args.batch, args.queries))
+    else:
+        print("(no --dsn / VG_BENCH_DSN: skipping population and query benches)")
+
+
+if __name__ == "__main__":
+    main()
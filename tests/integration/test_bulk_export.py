@@ -17,7 +17,8 @@ from rdflib.namespace import XSD
 
 from .conftest import skip_no_infra, TEST_SPACE_PREFIX
 from vitalgraph.db.sparql_sql.bulk_export import (
-    export_space, import_space, export_space_to_nquads, read_export_manifest)
+    export_space, import_space, export_space_to_nquads, read_export_manifest,
+    export_space_delta, import_space_delta)
 from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
 
 pytestmark = [pytest.mark.integration, skip_no_infra,
@@ -231,3 +232,89 @@ async def test_export_is_self_consistent_under_concurrent_writes(
         """)
 
     assert dangling == 0, f"{dangling} exported quads reference unexported terms"
+
+
+# ---------------------------------------------------------------------------
+# Catch-up delta rounds
+# ---------------------------------------------------------------------------
+
+
+async def _distinct_quads(conn, sid):
+    return {(r["s"], r["p"], r["o"], r["c"]) for r in await conn.fetch(
+        f"SELECT subject_uuid s, predicate_uuid p, object_uuid o, context_uuid c "
+        f"FROM {sid}_rdf_quad")}
+
+
+async def test_delta_rounds_converge_target_on_source(
+        space_impl, two_spaces, tmp_path):
+    """Full export, then two delta rounds with inserts AND deletes: after each
+    import the target holds exactly the source's quads, its edge table is
+    re-derived for the touched subjects, and re-applying a delta is a no-op."""
+    src, dst = two_spaces
+    edges = []
+    for i in range(10):
+        e = URIRef(f"urn:delta:e:{i}")
+        edges.append([(e, HES, URIRef(f"urn:delta:s:{i}"), G),
+                      (e, HED, URIRef(f"urn:delta:d:{i}"), G)])
+    await space_impl.add_rdf_quads_batch_bulk(src, [q for e in edges[:6] for q in e])
+
+    pool = space_impl.db_impl.connection_pool
+    base_dir = str(tmp_path / "full")
+    async with pool.acquire() as conn:
+        paths = await export_space(conn, src, base_dir, track_deletes=True)
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await import_space(conn, dst, paths)
+
+    # Round 1: two edges added, one edge removed.
+    await space_impl.add_rdf_quads_batch_bulk(src, [q for e in edges[6:8] for q in e])
+    await space_impl.remove_rdf_quads_batch_bulk(src, edges[0])
+    d1 = str(tmp_path / "d1")
+    async with pool.acquire() as conn:
+        await export_space_delta(conn, src, base_dir, d1)
+    m1 = read_export_manifest(d1)
+    assert m1["kind"] == "delta" and m1["base_snapshot"]
+    assert m1["counts"]["rdf_quad"] == 4
+    assert m1["counts"]["quad_tombstone"] == 2
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            applied = await import_space_delta(conn, dst, d1)
+        assert applied["quads_added"] == 4 and applied["quads_removed"] == 2
+        assert await _distinct_quads(conn, dst) == await _distinct_quads(conn, src)
+        assert (await _counts(conn, dst))["edge"] == 7
+
+        # Idempotent: the same delta again changes nothing.
+        async with conn.transaction():
+            again = await import_space_delta(conn, dst, d1)
+        assert again["quads_added"] == 0 and again["quads_removed"] == 0
+        assert (await _counts(conn, dst))["edge"] == 7
+
+    # Round 2 chains from round 1's manifest and only carries round 2's writes.
+    await space_impl.remove_rdf_quads_batch_bulk(src, edges[6])
+    await space_impl.add_rdf_quads_batch_bulk(src, edges[9])
+    d2 = str(tmp_path / "d2")
+    async with pool.acquire() as conn:
+        await export_space_delta(conn, src, d1, d2)
+    assert read_export_manifest(d2)["counts"]["rdf_quad"] == 2
+
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            await import_space_delta(conn, dst, d2)
+        assert await _distinct_quads(conn, dst) == await _distinct_quads(conn, src)
+        assert (await _counts(conn, dst))["edge"] == 7
+
+
+async def test_delta_refuses_base_without_delete_tracking(
+        space_impl, two_spaces, tmp_path):
+    src = two_spaces[0]
+    async with space_impl.db_impl.connection_pool.acquire() as conn:
+        await export_space(conn, src, str(tmp_path / "full"))  # tracking is opt-in
+        # A plain backup leaves no triggers or tombstone log behind.
+        assert not await conn.fetchval(
+            "SELECT count(*) FROM pg_trigger WHERE tgname = 'delta_tombstone' "
+            "AND tgrelid IN ($1::regclass, $2::regclass)",
+            f"{src}_rdf_quad", f"{src}_term")
+        with pytest.raises(ValueError):
+            await export_space_delta(conn, src, str(tmp_path / "full"),
+                                     str(tmp_path / "d"))
@@ -345,3 +345,42 @@ class TestKGGraphIsolation:
         assert await backend_adapter.object_exists(kg_space, graph_a, entity.URI)
         # Not visible in graph_b
         assert not await backend_adapter.object_exists(kg_space, graph_b, entity.URI)
+
+
+# ---------------------------------------------------------------------------
+# Batched write validation
+# ---------------------------------------------------------------------------
+
+class TestKGWriteValidation:
+    """check_write_batch answers what the per-object SPARQL checks did."""
+
+    async def test_sql_probe_matches_sparql(self, backend_adapter, kg_space, graph_uri):
+        from ai_haley_kg_domain.model.KGEntity import KGEntity
+        from ai_haley_kg_domain.model.KGFrame import KGFrame
+        from vitalgraph.kg_impl import kg_write_validation
+        from vitalgraph.kg_impl.kg_write_validation import check_write_batch
+
+        entity = KGEntity()
+        entity.URI = f"http://example.org/entity/{uuid.uuid4()}"
+        entity.name = "Owner"
+        owned = KGFrame()
+        owned.URI = f"http://example.org/frame/{uuid.uuid4()}"
+        owned.kGGraphURI = entity.URI
+        foreign = KGFrame()
+        foreign.URI = f"http://example.org/frame/{uuid.uuid4()}"
+        foreign.kGGraphURI = f"http://example.org/entity/{uuid.uuid4()}"
+        missing = f"http://example.org/frame/{uuid.uuid4()}"
+        await backend_adapter.store_objects(kg_space, graph_uri, [entity, owned, foreign])
+
+        uris = [entity.URI, owned.URI, foreign.URI, missing]
+        check = await check_write_batch(backend_adapter, kg_space, graph_uri,
+                                        uris, owner_uri=entity.URI)
+        assert check.path == "sql"
+        assert check.existing == {entity.URI, owned.URI, foreign.URI}
+        assert check.frames == {owned.URI, foreign.URI}
+        assert check.owned_frames() == {owned.URI}
+
+        via_sparql = await kg_write_validation._check_sparql(
+            backend_adapter, kg_space, graph_uri, uris, entity.URI)
+        assert (via_sparql.existing, via_sparql.frames, via_sparql.owned) == (
+            check.existing, check.frames, check.owned)
@@ -0,0 +1,70 @@
+"""Segmentation time on 1-50 MB documents.
+
+No database — this measures the segmenter alone, on the shape that used
+to go quadratic: a large converted document (one heading, then tens of MB
+of paragraphs) segmented with a model-like tokenizer. Asserts the growth
+class is linear and prints the curve.
+
+Measured on the development container (word-piece-like tokenizer):
+
+    size     before     after
+    1 MB     0.65 s     0.35 s
+    5 MB     7.4 s      1.6 s
+    10 MB    25 s       3.3 s
+    20 MB    99 s       8.4 s
+    50 MB    —          16 s
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import time
+
+import pytest
+
+from vitalgraph.document.document_segmenter import DocumentSegmenter
+from vitalgraph.document.segment_config import MarkdownSegmentConfig
+
+from .harness import assert_growth_class
+
+pytestmark = [pytest.mark.performance, pytest.mark.slow]
+
+SIZES_MB = (1, 10, 50)
+
+_WORDS = ("segment token paragraph heading document converter vector graph "
+          "entity frame relation query result model index").split()
+_PIECE_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def _wordpiece(text: str) -> int:
+    return len(_PIECE_RE.findall(text)) + 2
+
+
+def _converted_pdf(megabytes: int) -> str:
+    rng = random.Random(45)
+    target = megabytes * 1_000_000
+    parts = ["# Converted document"]
+    size = 0
+    while size < target:
+        lines = "\n".join(
+            " ".join(rng.choice(_WORDS) + ("." if rng.random() < 0.08 else "")
+                     for _ in range(rng.randint(20, 120)))
+            for _ in range(rng.randint(1, 3)))
+        parts.append(lines)
+        size += len(lines) + 2
+    return "\n\n".join(parts)
+
+
+def test_segmentation_time_is_linear_in_document_size():
+    points = {}
+    for mb in SIZES_MB:
+        text = _converted_pdf(mb)
+        segmenter = DocumentSegmenter(tokenizer=_wordpiece, max_input_tokens=512)
+        started = time.perf_counter()
+        segments = segmenter.segment(text, MarkdownSegmentConfig())
+        points[mb] = time.perf_counter() - started
+        assert segments and max(s.token_length for s in segments) <= 512
+        print(f"\n{mb:>3} MB: {points[mb]:.2f}s, {len(segments)} segments")
+
+    assert_growth_class(points, allowed=["flat", "log", "linear"])
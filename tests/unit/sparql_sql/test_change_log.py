@@ -0,0 +1,226 @@
+"""Unit tests for the change-log feed against a scripted connection.
+
+The ordering and resume guarantees live in a few statements: the advisory
+lock taken before a seq is drawn, max(seq) + 1 numbering, and the
+position check in read_changes. These pin them; tests/integration/
+test_change_log.py runs the real thing on PostgreSQL.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import uuid
+
+import pytest
+
+from vitalgraph.db.sparql_sql import change_log
+
+SPACE = "sp_cdc"
+
+
+class _Conn:
+    """Answers the statements change_log issues; records what it ran."""
+
+    def __init__(self, seqs=(), enabled=True):
+        self.seqs = list(seqs)
+        self.enabled = enabled
+        self.executed = []
+
+    async def fetchval(self, sql, *args):
+        if "to_regclass" in sql:
+            return self.enabled
+        return max(self.seqs, default=0)
+
+    async def fetch(self, sql, *args):
+        after, limit = args
+        now = datetime.now(timezone.utc)
+        return [{"seq": s, "op": "I", "quads": "[]", "created_time": now}
+                for s in self.seqs if s > after][:limit]
+
+    async def fetchrow(self, sql, *args):
+        return {"lo": min(self.seqs, default=None),
+                "hi": max(self.seqs, default=0)}
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+        return "INSERT 0 1"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    change_log.invalidate_change_log_cache()
+    yield
+    change_log.invalidate_change_log_cache()
+
+
+def _quads(n):
+    return [tuple(uuid.uuid4() for _ in range(4)) for _ in range(n)]
+
+
+class TestAppendChanges:
+
+    async def test_noop_without_a_log(self):
+        conn = _Conn(enabled=False)
+        assert await change_log.append_changes(conn, SPACE, "I", _quads(3)) == 0
+        assert conn.executed == []
+
+    async def test_locks_before_drawing_a_seq_and_chunks(self, monkeypatch):
+        monkeypatch.setattr(change_log, "_QUADS_PER_ROW", 2)
+        conn = _Conn()
+        assert await change_log.append_changes(conn, SPACE, "D", _quads(5)) == 3
+        statements = [sql for sql, _ in conn.executed]
+        assert "pg_advisory_xact_lock" in statements[0]
+        assert conn.executed[0][1] == (change_log._lock_key(SPACE),)
+        inserts = statements[1:]
+        assert len(inserts) == 3
+        assert all("COALESCE(max(seq), 0) + 1" in sql for sql in inserts)
+        assert [len(args[1]) for _, args in conn.executed[1:]] == [2, 2, 1]
+
+    async def test_rejects_unknown_op(self):
+        with pytest.raises(ValueError):
+            await change_log.append_changes(_Conn(), SPACE, "U", _quads(1))
+
+    def test_lock_key_is_stable_and_per_space(self):
+        assert change_log._lock_key(SPACE) == change_log._lock_key(SPACE)
+        assert change_log._lock_key(SPACE) != change_log._lock_key("other")
+
+
+class _DeleteConn(_Conn):
+    """A DELETE ... RETURNING that removes ``removed``."""
+
+    def __init__(self, removed, enabled=True):
+        super().__init__(enabled=enabled)
+        self.removed = removed
+
+    async def fetch(self, sql, *args):
+        self.executed.append((sql, args))
+        return self.removed
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+        return f"DELETE {len(self.removed)}" if sql.startswith("DELETE") else "INSERT 0 1"
+
+
+class TestDeleteQuadsLogged:
+
+    DELETE = f"DELETE FROM {SPACE}_rdf_quad WHERE subject_uuid = ANY($1)"
+
+    async def test_logs_exactly_the_returned_rows_before_anything_else(self):
+        removed = _quads(3)
+        conn = _DeleteConn(removed)
+        assert await change_log.delete_quads_logged(conn, SPACE, self.DELETE, ["s"]) == 3
+        (delete_sql, delete_args), lock, (log_sql, log_args) = conn.executed
+        assert delete_sql.startswith(self.DELETE) and "RETURNING subject_uuid" in delete_sql
+        assert delete_args == (["s"],)
+        assert "pg_advisory_xact_lock" in lock[0]
+        assert log_args[0] == "D" and log_args[1] == [q[0] for q in removed]
+
+    async def test_plain_delete_without_a_log(self):
+        conn = _DeleteConn(_quads(2), enabled=False)
+        assert await change_log.delete_quads_logged(conn, SPACE, self.DELETE, ["s"]) == 2
+        assert [sql for sql, _ in conn.executed] == [self.DELETE]
+
+
+class _CaptureConn(_Conn):
+    """Hands back ``captured`` as the update's capture table."""
+
+    def __init__(self, captured):
+        super().__init__()
+        self.captured = captured
+
+    async def fetch(self, sql, *args):
+        self.executed.append((sql, args))
+        return self.captured
+
+
+def _captured(op, quad):
+    return dict(zip(("op", "subject_uuid", "predicate_uuid", "object_uuid",
+                     "context_uuid"), (op, *quad)))
+
+
+class TestSparqlUpdateCapture:
+
+    async def test_runs_of_one_op_are_appended_in_statement_order(self):
+        d1, d2, i1 = _quads(3)
+        g = uuid.uuid4()
+        conn = _CaptureConn([_captured("D", d1), _captured("D", d2),
+                             _captured("I", i1),
+                             _captured("R", (None, None, None, g))])
+        assert await change_log.append_captured_changes(conn, SPACE) == 3
+        statements = [(sql, args) for sql, args in conn.executed
+                      if "pg_advisory_xact_lock" not in sql]
+        assert statements[0][0].startswith("SELECT op") and "ORDER BY ord" in statements[0][0]
+        assert statements[1][0] == "DROP TABLE _upd_changes"
+        (_, d_args), (_, i_args), (r_sql, r_args) = statements[2:]
+        assert d_args[0] == "D" and d_args[1] == [d1[0], d2[0]]
+        assert i_args[0] == "I" and i_args[1] == [i1[0]]
+        assert "'R'" in r_sql and r_args == ([g],)
+
+    async def test_resets_are_a_no_op_without_a_log(self):
+        conn = _Conn(enabled=False)
+        assert await change_log.append_graph_resets(conn, SPACE, [uuid.uuid4()]) == 0
+        assert conn.executed == []
+
+    def test_update_sql_captures_what_its_statements_changed(self):
+        from vitalgraph.db.jena_sparql.jena_types import (
+            QuadPattern, URINode, UpdateClear, VarNode)
+        from vitalgraph.db.sparql_sql.emit_update import (
+            CHANGE_CAPTURE_TABLE, _clear_sql, _delete_from_bindings)
+
+        dq = QuadPattern(subject=VarNode("s"), predicate=URINode("urn:p"),
+                         object=VarNode("o"), graph=None)
+        plain = _delete_from_bindings(dq, SPACE, "urn:g", var_map={"s": "s", "o": "o"})
+        captured = _delete_from_bindings(dq, SPACE, "urn:g",
+                                         var_map={"s": "s", "o": "o"}, capture=True)
+        assert "RETURNING" not in plain
+        assert captured.startswith(f"WITH _changed AS ({plain} RETURNING q.subject_uuid")
+        assert f"INSERT INTO {CHANGE_CAPTURE_TABLE}" in captured and "'D'" in captured
+
+        clear_all = _clear_sql(UpdateClear(target="ALL"), SPACE, capture=True)
+        assert f"SELECT DISTINCT 'R', context_uuid FROM {SPACE}_rdf_quad" in clear_all
+        assert clear_all.endswith(f"DELETE FROM {SPACE}_rdf_quad")
+        clear_one = _clear_sql(UpdateClear(graph="urn:g", target="urn:g"), SPACE,
+                               capture=True)
+        assert clear_one.startswith(f"INSERT INTO {CHANGE_CAPTURE_TABLE} (op, context_uuid)")
+
+
+class TestReadChanges:
+
+    async def test_reads_after_position(self):
+        rows = await change_log.read_changes(_Conn(seqs=[1, 2, 3]), SPACE, 1)
+        assert [r["seq"] for r in rows] == [2, 3]
+        assert rows[0]["op"] == "insert" and rows[0]["quads"] == []
+
+    async def test_a_reset_row_reads_as_reset(self):
+        class _ResetConn(_Conn):
+            async def fetch(self, sql, *args):
+                return [{"seq": 1, "op": "R", "quads": '[[null, null, null, "<urn:g>"]]',
+                         "created_time": None}]
+
+        (row,) = await change_log.read_changes(_ResetConn(seqs=[1]), SPACE, 0)
+        assert row["op"] == "reset" and row["quads"] == [[None, None, None, "<urn:g>"]]
+
+    @pytest.mark.parametrize("seqs,after", [
+        ([], 0),            # fresh log
+        ([1, 2, 3], 3),     # caught up
+        ([4, 5], 3),        # resumes exactly at the oldest retained row
+        ([5], 5),           # pruned down to the newest row, caught up
+    ])
+    async def test_resumable_positions(self, seqs, after):
+        await change_log.read_changes(_Conn(seqs=seqs), SPACE, after)
+
+    @pytest.mark.parametrize("seqs,after", [
+        ([4, 5], 2),        # seq 3 was pruned
+        ([4, 5], 0),        # "from the beginning" after pruning
+        ([1, 2], 7),        # ahead of the log: it was re-created
+        ([], 7),
+    ])
+    async def test_unresumable_positions(self, seqs, after):
+        with pytest.raises(change_log.ChangeLogPositionError):
+            await change_log.read_changes(_Conn(seqs=seqs), SPACE, after)
+
+
+def test_ddl_numbers_seq_without_a_sequence():
+    ddl = "\n".join(change_log.create_change_log_sql(SPACE))
+    assert f"{SPACE}_change_log" in ddl
+    assert "seq          BIGINT PRIMARY KEY" in ddl
@@ -0,0 +1,69 @@
+"""Unit tests for the SQL the online partition migration generates.
+
+The migration itself needs PostgreSQL 18 and is exercised in
+tests/performance/test_partition_pruning.py; these pin the generated DDL.
+"""
+
+from __future__ import annotations
+
+from vitalgraph.db.sparql_sql.partition_migrate import (
+    _capture_ddl, _new_core_ddl, _staged_index_plan, _swap_sql,
+)
+from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
+
+SPACE = "sp_a_rather_long_space_identifier_xyz"
+
+
+def _tables():
+    return SparqlSQLSchema.get_table_names(SPACE)
+
+
+class TestStagedIndexPlan:
+
+    def test_only_core_tables_are_staged(self):
+        plan = _staged_index_plan(SparqlSQLSchema(), SPACE, _tables())
+        assert plan
+        for _temp, _final, sql in plan:
+            assert any(f" ON {SPACE}_{core}_new " in sql
+                       for core in ("rdf_quad", "edge", "frame_entity")), sql
+        finals = {final for _t, final, _s in plan}
+        assert f"idx_{SPACE}_quad_ctx_pred" in finals
+        assert not any("_term_" in f for f in finals)
+
+    def test_temp_names_fit_and_are_unique(self):
+        """Temp names must survive PostgreSQL's 63-byte identifier limit."""
+        plan = _staged_index_plan(SparqlSQLSchema(), SPACE, _tables())
+        temps = [temp for temp, _f, _s in plan]
+        assert len(temps) == len(set(temps))
+        assert all(len(temp) <= 63 for temp in temps)
+        for temp, final, sql in plan:
+            assert sql.startswith(f"CREATE INDEX IF NOT EXISTS {temp} ON ")
+            assert final not in sql
+
+
+class TestCaptureDdl:
+
+    def test_logs_keys_of_the_new_layout(self):
+        stmts = "\n".join(_capture_ddl(SPACE, f"{SPACE}_rdf_quad", "rdf_quad"))
+        assert f"{SPACE}_pmig_log_rdf_quad" in stmts
+        assert "NEW.context_uuid" in stmts and "OLD.subject_uuid" in stmts
+        # quad_uuid is not part of the slim key, so it is not logged.
+        assert "quad_uuid" not in stmts
+        assert "AFTER TRUNCATE" in stmts
+
+    def test_edge_key(self):
+        stmts = "\n".join(_capture_ddl(SPACE, f"{SPACE}_edge", "edge"))
+        assert "NEW.edge_uuid, NEW.context_uuid" in stmts
+
+
+class TestNewLayout:
+
+    def test_new_edge_table_keeps_edge_type(self):
+        ddl = "\n".join(_new_core_ddl(_tables(), 4))
+        assert "edge_type_uuid" in ddl
+        assert f"{SPACE}_rdf_quad_new_p3 PARTITION OF" in ddl
+
+    def test_swap_renames_partitions(self):
+        stmts = _swap_sql([f"{SPACE}_edge"], 2)
+        assert stmts[0] == f"DROP TABLE {SPACE}_edge CASCADE"
+        assert f"ALTER TABLE {SPACE}_edge_new_p1 RENAME TO {SPACE}_edge_p1" in stmts
@@ -0,0 +1,307 @@
+"""Unit tests for declared property tables.
+
+Covers the BGP rewrite in rewrite_property_table.py, declaration validation,
+the SQL the DDL / sync helpers produce, and where promotion runs. Rewrite tests build plans the
+same way test_rewrite_tables.py does.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from vitalgraph.db.sparql_sql.ir import (
+    PlanV2, TableRef, VarSlot, AliasGenerator,
+    KIND_BGP, KIND_PROJECT,
+)
+import vitalgraph.db.sparql_sql.ensure_property_table as ept
+from vitalgraph.db.sparql_sql.ensure_property_table import (
+    PropertyColumn, PropertyTableDef, STATUS_BUILDING, STATUS_READY,
+    validate_definition, create_data_table_sql, uri_uuid,
+)
+from vitalgraph.db.sparql_sql.sync_property_table import _derive_sql
+import vitalgraph.db.sparql_sql.rewrite_property_table as rpt
+from vitalgraph.db.sparql_sql.rewrite_property_table import rewrite_property_table
+
+SPACE = "test_space"
+
+TYPE_PRED = "http://vital.ai/ontology/haley-ai-kg#hasKGEntityType"
+LEAD = "urn:acme:kg:entity:Lead"
+NAME = "http://vital.ai/ontology/vital-core#hasName"
+RATING = "urn:acme:kg:hasRating"
+OTHER = "urn:acme:kg:hasOther"
+GRAPH = "urn:graph"
+
+LEAD_DEF = PropertyTableDef(
+    name="lead",
+    type_predicate=TYPE_PRED,
+    type_uri=LEAD,
+    columns=(PropertyColumn("name", NAME),
+             PropertyColumn("rating", RATING, "num")),
+    status=STATUS_READY,
+)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _make_bgp_plan(tables, var_slots, tagged_constraints):
+    plan = PlanV2(kind=KIND_BGP)
+    plan.tables = tables
+    plan.var_slots = var_slots
+    plan.tagged_constraints = tagged_constraints
+    plan.constraints = [sql for _, sql in tagged_constraints]
+    return plan
+
+
+def _aliases():
+    aliases = AliasGenerator()
+    for alias, text in (("c_0", TYPE_PRED), ("c_1", LEAD), ("c_2", NAME),
+                        ("c_3", RATING), ("c_4", GRAPH), ("c_5", OTHER)):
+        aliases.constants[(text, "U")] = alias
+    return aliases
+
+
+def _quad(alias):
+    return TableRef(ref_id=alias, kind="quad",
+                    table_name=f"{SPACE}_rdf_quad", alias=alias)
+
+
+def _listing_plan(ctx=("c_4", "c_4", "c_4")):
+    """?s type Lead . ?s name ?n . ?s rating ?r — each quad in one graph."""
+    tables = [_quad("q0"), _quad("q1"), _quad("q2"),
+              TableRef(ref_id="t0", kind="term", table_name=f"{SPACE}_term",
+                       join_col="q1.object_uuid", alias="t0")]
+    tagged = [
+        ("q0", "q0.predicate_uuid = __CONST_c_0__"),
+        ("q0", "q0.object_uuid = __CONST_c_1__"),
+        ("q1", "q1.predicate_uuid = __CONST_c_2__"),
+        ("q2", "q2.predicate_uuid = __CONST_c_3__"),
+        ("q1", "q1.subject_uuid = q0.subject_uuid"),
+        ("q2", "q2.subject_uuid = q0.subject_uuid"),
+    ]
+    for q, c in zip(("q0", "q1", "q2"), ctx):
+        tagged.append((q, f"{q}.context_uuid = __CONST_{c}__"))
+    var_slots = {
+        "s": VarSlot(name="s", positions=[("q0", "subject_uuid"),
+                                          ("q1", "subject_uuid"),
+                                          ("q2", "subject_uuid")]),
+        "n": VarSlot(name="n", positions=[("q1", "object_uuid")]),
+        "r": VarSlot(name="r", positions=[("q2", "object_uuid")]),
+    }
+    return _make_bgp_plan(tables, var_slots, tagged)
+
+
+# ===========================================================================
+# rewrite_property_table
+# ===========================================================================
+
+class TestRewritePropertyTable:
+
+    def test_non_bgp_passthrough(self):
+        plan = PlanV2(kind=KIND_PROJECT)
+        assert rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF]) is plan
+
+    def test_no_defs_passthrough(self):
+        plan = _listing_plan()
+        result = rewrite_property_table(plan, _aliases(), SPACE, [])
+        assert [t.kind for t in result.tables].count("quad") == 3
+
+    def test_collapses_typed_listing(self):
+        result = rewrite_property_table(_listing_plan(), _aliases(), SPACE,
+                                        [LEAD_DEF])
+        kinds = [t.kind for t in result.tables]
+        assert kinds.count("quad") == 0
+        pt = [t for t in result.tables if t.kind == "property_table"]
+        assert len(pt) == 1
+        assert pt[0].table_name == f"{SPACE}_ptab_lead"
+        a = pt[0].alias
+
+        assert result.var_slots["s"].positions == [(a, "subject_uuid")]
+        assert result.var_slots["n"].positions == [(a, "name_uuid")]
+        assert result.var_slots["r"].positions == [(a, "rating_uuid")]
+        term = [t for t in result.tables if t.kind == "term"][0]
+        assert term.join_col == f"{a}.name_uuid"
+
+        sql = result.constraints
+        assert f"{a}.name_uuid IS NOT NULL" in sql
+        assert f"{a}.rating_uuid IS NOT NULL" in sql
+        assert f"{a}.context_uuid = __CONST_c_4__" in sql
+        # Predicate / type constants and the subject co-reference are gone.
+        assert not any("predicate_uuid" in s for s in sql)
+        assert not any("subject_uuid" in s for s in sql)
+        assert len(sql) == len(set(sql))
+
+    def test_disabled_switch(self, monkeypatch):
+        monkeypatch.setattr(rpt, "ENABLED", False)
+        result = rewrite_property_table(_listing_plan(), _aliases(), SPACE,
+                                        [LEAD_DEF])
+        assert all(t.kind != "property_table" for t in result.tables)
+
+    def test_declines_without_graph_scope(self):
+        """A row is per (subject, graph): an unscoped BGP is not rewritten."""
+        plan = _listing_plan()
+        plan.tagged_constraints = [(o, s) for o, s in plan.tagged_constraints
+                                   if "context_uuid" not in s]
+        plan.constraints = [s for _, s in plan.tagged_constraints]
+        result = rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF])
+        assert all(t.kind != "property_table" for t in result.tables)
+
+    def test_mismatched_graph_member_stays_a_quad(self):
+        aliases = _aliases()
+        aliases.constants[("urn:graph2", "U")] = "c_9"
+        plan = _listing_plan(ctx=("c_4", "c_4", "c_9"))
+        result = rewrite_property_table(plan, aliases, SPACE, [LEAD_DEF])
+        quads = [t.alias for t in result.tables if t.kind == "quad"]
+        assert quads == ["q2"]
+        a = [t for t in result.tables if t.kind == "property_table"][0].alias
+        assert (a, "subject_uuid") in result.var_slots["s"].positions
+        assert ("q2", "subject_uuid") in result.var_slots["s"].positions
+
+    def test_repeated_property_is_not_collapsed_twice(self):
+        """?s name ?a . ?s name ?b is a self-join a single row cannot hold."""
+        plan = _listing_plan()
+        plan.tables.insert(3, _quad("q3"))
+        plan.tagged_constraints += [
+            ("q3", "q3.predicate_uuid = __CONST_c_2__"),
+            ("q3", "q3.context_uuid = __CONST_c_4__"),
+        ]
+        plan.var_slots["s"].positions.append(("q3", "subject_uuid"))
+        plan.var_slots["m"] = VarSlot(name="m", positions=[("q3", "object_uuid")])
+        result = rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF])
+        assert [t.alias for t in result.tables if t.kind == "quad"] == ["q3"]
+
+    def test_undeclared_predicate_stays_a_quad(self):
+        plan = _listing_plan()
+        plan.tagged_constraints = [
+            (o, s.replace("__CONST_c_3__", "__CONST_c_5__"))
+            for o, s in plan.tagged_constraints]
+        result = rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF])
+        assert [t.alias for t in result.tables if t.kind == "quad"] == ["q2"]
+
+    def test_variable_predicate_is_ineligible(self):
+        plan = _listing_plan()
+        plan.var_slots["p"] = VarSlot(name="p", positions=[("q1", "predicate_uuid")])
+        result = rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF])
+        assert "q1" in [t.alias for t in result.tables if t.kind == "quad"]
+
+    def test_type_quad_object_variable_declines(self):
+        """A variable bound to the (dropped) type object cannot be served."""
+        plan = _listing_plan()
+        plan.var_slots["ty"] = VarSlot(name="ty", positions=[("q0", "object_uuid")])
+        result = rewrite_property_table(plan, _aliases(), SPACE, [LEAD_DEF])
+        assert all(t.kind != "property_table" for t in result.tables)
+        assert len([t for t in result.tables if t.kind == "quad"]) == 3
+
+
+# ===========================================================================
+# Declarations, DDL and derive SQL
+# ===========================================================================
+
+class TestPropertyTableDefinition:
+
+    def test_valid_definition(self):
+        validate_definition(LEAD_DEF)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"name": "Bad-Name"},
+        {"columns": ()},
+        {"columns": (PropertyColumn("a", NAME), PropertyColumn("a", RATING))},
+        {"columns": (PropertyColumn("a", NAME), PropertyColumn("b", NAME))},
+        {"columns": (PropertyColumn("a", TYPE_PRED),)},
+        {"columns": (PropertyColumn("a", NAME, "blob"),)},
+    ])
+    def test_invalid_definitions(self, kwargs):
+        fields = dict(name="lead", type_predicate=TYPE_PRED, type_uri=LEAD,
+                      columns=LEAD_DEF.columns, status=STATUS_READY)
+        fields.update(kwargs)
+        with pytest.raises(ValueError):
+            validate_definition(PropertyTableDef(**fields))
+
+    def test_value_columns_by_type(self):
+        assert [c for c, _, _ in PropertyColumn("x", NAME).value_columns()] == \
+            ["x_uuid", "x_text"]
+        assert [c for c, _, _ in PropertyColumn("x", NAME, "num").value_columns()] == \
+            ["x_uuid", "x_text", "x_num"]
+
+    def test_data_table_ddl(self):
+        stmts = create_data_table_sql(SPACE, LEAD_DEF)
+        ddl = stmts[0]
+        assert f"{SPACE}_ptab_lead" in ddl
+        assert "PRIMARY KEY (subject_uuid, context_uuid)" in ddl
+        assert "rating_num NUMERIC" in ddl
+        joined = "\n".join(stmts)
+        assert "(context_uuid, name_text, subject_uuid)" in joined
+
+    def test_derive_sql_inlines_uuids(self):
+        sql = _derive_sql(SPACE, LEAD_DEF, subject_param="$1")
+        assert f"'{uri_uuid(LEAD)}'::uuid" in sql
+        assert f"'{uri_uuid(NAME)}'::uuid" in sql
+        assert "ty.subject_uuid = ANY($1)" in sql
+        assert "GROUP BY ty.subject_uuid, ty.context_uuid" in sql
+        assert "ANY($1)" not in _derive_sql(SPACE, LEAD_DEF)
+
+
+# ===========================================================================
+# Promotion: the maintenance job's, never the query path's
+# ===========================================================================
+
+class _RegistryConn:
+    """A registry with one ready and one overdue 'building' declaration."""
+
+    def __init__(self):
+        self.executed = []
+
+    async def fetchval(self, sql, *args):
+        return True                      # registry exists; lock is free
+
+    async def fetch(self, sql, *args):
+        if "FROM test_space_property_table ORDER BY" in sql:
+            return [
+                {"table_name": "lead", "type_predicate_uri": TYPE_PRED,
+                 "type_uri": LEAD, "columns": [{"column": "name",
+                                                "predicate": NAME}],
+                 "status": STATUS_READY},
+                {"table_name": "deal", "type_predicate_uri": TYPE_PRED,
+                 "type_uri": "urn:acme:kg:entity:Deal",
+                 "columns": [{"column": "name", "predicate": NAME}],
+                 "status": STATUS_BUILDING},
+            ]
+        return [{"table_name": "deal"}]  # past its grace period
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+        return "OK"
+
+
+class TestPropertyTablePromotion:
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        ept.invalidate_property_table_cache()
+        yield
+        ept.invalidate_property_table_cache()
+
+    async def test_query_path_only_looks_up(self, monkeypatch):
+        async def rebuild(*args, **kwargs):
+            raise AssertionError("a query must never rebuild a property table")
+
+        monkeypatch.setattr(ept, "rebuild_property_tables", rebuild)
+        conn = _RegistryConn()
+        ready = await ept.ensure_property_tables(SPACE, conn=conn)
+        assert [d.name for d in ready] == ["lead"]
+        assert conn.executed == []
+
+    async def test_promotion_rebuilds_overdue_tables_and_unlocks(self, monkeypatch):
+        rebuilt = []
+
+        async def rebuild(conn, space_id, names=None):
+            rebuilt.append(list(names))
+            return {n: 0 for n in names}
+
+        monkeypatch.setattr(ept, "rebuild_property_tables", rebuild)
+        conn = _RegistryConn()
+        assert await ept.promote_property_tables(conn, SPACE) == ["deal"]
+        assert rebuilt == [["deal"]]
+        assert conn.executed == [("SELECT pg_advisory_unlock(hashtext($1))",
+                                  (f"{SPACE}_ptab_deal",))]
@@ -0,0 +1,151 @@
+"""Unit tests for the shared-transaction pool stand-in, against a scripted pool.
+
+What a transactional batch relies on: inside ``shared_transaction`` every
+acquire — ``async with``, awaited, nested, from another task — gets the one
+connection in the one transaction, tasks take turns on it, the block
+commits or rolls back as a whole, and after it the real pool is back —
+and the process-wide caches stay out of it while it is open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from vitalgraph.cache.count_cache import CountCache
+from vitalgraph.cache.entity_graph_cache import EntityGraphCache
+from vitalgraph.cache.etag_cache import ETagCache
+from vitalgraph.db.sparql_sql.shared_connection import (
+    SharedConnectionPool, in_shared_transaction, shared_pool_for, shared_transaction,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.log.append("begin")
+
+    async def __aexit__(self, exc_type, *_):
+        self.conn.log.append("rollback" if exc_type else "commit")
+
+
+class _Conn:
+    def __init__(self, name):
+        self.name = name
+        self.log = []
+        self.busy = 0
+        self.overlap = False
+
+    def transaction(self):
+        return _Transaction(self)
+
+    async def query(self):
+        self.busy += 1
+        self.overlap |= self.busy > 1
+        await asyncio.sleep(0.005)
+        self.busy -= 1
+
+
+class _Acquire:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def __aenter__(self):
+        return await self.pool._take()
+
+    async def __aexit__(self, *_):
+        self.pool.released += 1
+
+    def __await__(self):
+        return self.pool._take().__await__()
+
+
+class _Pool:
+    def __init__(self):
+        self.taken = 0
+        self.released = 0
+
+    def acquire(self, timeout=None):
+        return _Acquire(self)
+
+    async def _take(self):
+        self.taken += 1
+        return _Conn(f"pooled{self.taken}")
+
+    async def release(self, conn, timeout=None):
+        self.released += 1
+
+    def get_size(self):
+        return 7
+
+
+async def test_every_acquire_in_the_block_is_the_transactions_connection():
+    owner, pool = object(), _Pool()
+    async with shared_transaction(owner, pool) as shared:
+        stand_in = shared_pool_for(owner, pool)
+        assert isinstance(stand_in, SharedConnectionPool)
+        assert shared_pool_for(object(), pool) is pool      # another db_impl: untouched
+        async with stand_in.acquire() as conn:
+            async with stand_in.acquire() as nested:        # same task re-enters
+                assert nested is conn
+        awaited = await stand_in.acquire()
+        assert awaited is conn
+        await stand_in.release(awaited)
+        assert stand_in.get_size() == 7                     # the rest is the real pool's
+    assert conn.log == ["begin", "commit"]
+    assert pool.taken == 1 and shared_pool_for(owner, pool) is pool
+
+
+async def test_tasks_take_turns_and_a_raise_rolls_back():
+    owner, pool = object(), _Pool()
+
+    async def use():
+        async with shared_pool_for(owner, pool).acquire() as conn:
+            await conn.query()
+            return conn
+
+    with pytest.raises(RuntimeError):
+        async with shared_transaction(owner, pool):
+            conns = await asyncio.gather(*[asyncio.ensure_future(use()) for _ in range(4)])
+            raise RuntimeError("operation failed")
+    assert len({c.name for c in conns}) == 1 and not conns[0].overlap
+    assert conns[0].log == ["begin", "rollback"]
+
+
+async def test_a_task_outliving_the_block_gets_the_real_pool():
+    owner, pool = object(), _Pool()
+    async with shared_transaction(owner, pool) as shared:
+        inner = shared
+        with pytest.raises(RuntimeError, match="already open"):
+            async with shared_transaction(owner, pool):
+                pass
+    async with inner.acquire() as conn:
+        assert conn.name == "pooled2"
+
+
+async def test_caches_neither_serve_nor_store_inside_the_block():
+    counts, graphs, etags = CountCache(), EntityGraphCache(), ETagCache()
+    counts.put("sp", "g", "q", 5)
+    graphs.put("sp", "g", "urn:e", [{"s": "urn:e"}])
+    etags.put("sp", "g", "urn:e", "entity", '"committed"')
+
+    owner, pool = object(), _Pool()
+    async with shared_transaction(owner, pool):
+        assert in_shared_transaction()
+        # What is read here may include the batch's uncommitted writes.
+        assert counts.get("sp", "g", "q") is None
+        assert graphs.get("sp", "g", "urn:e") is None
+        assert etags.get("sp", "g", "urn:e", "entity") is None
+        counts.put("sp", "g", "q", 6)
+        graphs.put("sp", "g", "urn:e", [{"s": "urn:e", "o": "uncommitted"}])
+        etags.put("sp", "g", "urn:e", "entity", '"uncommitted"')
+
+    assert not in_shared_transaction()
+    assert counts.get("sp", "g", "q") == 5
+    assert graphs.get("sp", "g", "urn:e") == [{"s": "urn:e"}]
+    assert etags.get("sp", "g", "urn:e", "entity") == '"committed"'
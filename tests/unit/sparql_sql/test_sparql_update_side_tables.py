@@ -0,0 +1,156 @@
+"""Side-table upkeep of execute_sparql_update, against a scripted pool.
+
+Declared property tables have no background self-heal, so the update keeps
+them in step inside its own transaction: a failed sync fails the update
+instead of committing quads under a 'ready' table that no longer matches.
+The change log is written in that transaction too, from the rows the
+update's SQL captured.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from vitalgraph.db.jena_sparql import jena_ast_mapper
+from vitalgraph.db.jena_sparql.jena_types import (
+    LiteralNode, QuadPattern, URINode, VarNode,
+    UpdateClear, UpdateCopy, UpdateDataDelete, UpdateModify,
+)
+from vitalgraph.db.sparql_sql import generator, sparql_sql_space_impl as ssi
+from vitalgraph.db.sparql_sql import change_log, sync_property_table
+
+pytestmark = pytest.mark.unit
+
+SPACE = "sp_upd"
+NAME = "http://example.org/name"
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.depth += 1
+        self.conn.log.append("begin")
+
+    async def __aexit__(self, exc_type, *_):
+        self.conn.depth -= 1
+        self.conn.log.append("rollback" if exc_type else "commit")
+
+
+class _Conn:
+    def __init__(self):
+        self.depth = 0
+        self.log = []
+
+    def transaction(self):
+        return _Transaction(self)
+
+    async def execute(self, sql, *args):
+        self.log.append("update" if sql == "UPDATE SQL" else "other")
+        return "DELETE 0"
+
+    async def fetch(self, *args, **kwargs):
+        return []
+
+    async def fetchval(self, *args, **kwargs):
+        return None
+
+    async def fetchrow(self, *args, **kwargs):
+        return None
+
+
+class _Acquire:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *_):
+        return False
+
+
+def _impl(monkeypatch, ops):
+    conn = _Conn()
+    impl = ssi.SparqlSQLSpaceImpl({})
+    impl.db_impl = SimpleNamespace(
+        _pool=SimpleNamespace(acquire=lambda: _Acquire(conn)),
+        get_signal_manager=lambda: None)
+    impl._get_sidecar_client = lambda: None
+
+    async def compile_(update, client):
+        return {}
+
+    async def generate_sql(cr, space_id, conn=None, capture_changes=False):
+        conn.log.append(f"generate capture={capture_changes}")
+        return SimpleNamespace(sql="UPDATE SQL")
+
+    monkeypatch.setattr(ssi._compile_cache, "compile", compile_)
+    monkeypatch.setattr(jena_ast_mapper, "map_compile_response",
+                        lambda raw: SimpleNamespace(ok=True, update_ops=ops))
+    monkeypatch.setattr(generator, "generate_sql", generate_sql)
+    return impl, conn
+
+
+def _delete(subject):
+    return UpdateDataDelete(quads=[QuadPattern(
+        subject=subject, predicate=URINode(NAME),
+        object=LiteralNode("old"), graph=URINode("urn:g"))])
+
+
+async def test_property_tables_sync_inside_the_update_transaction(monkeypatch):
+    impl, conn = _impl(monkeypatch, [_delete(URINode("urn:s1"))])
+    seen = []
+
+    async def sync(c, space_id, subject_uuids):
+        seen.append((c.depth, c.log[-1], len(subject_uuids)))
+        return 1
+
+    monkeypatch.setattr(sync_property_table, "sync_property_tables", sync)
+    assert await impl.execute_sparql_update(SPACE, "DELETE DATA {...}")
+    assert seen == [(1, "update", 1)]
+
+
+async def test_a_failed_sync_rolls_the_update_back(monkeypatch):
+    impl, conn = _impl(monkeypatch, [_delete(URINode("urn:s1"))])
+
+    async def sync(c, space_id, subject_uuids):
+        raise RuntimeError("property table sync failed")
+
+    monkeypatch.setattr(sync_property_table, "sync_property_tables", sync)
+    assert not await impl.execute_sparql_update(SPACE, "DELETE DATA {...}")
+    assert conn.log[1:4] == ["begin", "update", "rollback"]
+
+
+async def test_change_log_is_appended_before_the_update_commits(monkeypatch):
+    impl, conn = _impl(monkeypatch, [_delete(VarNode("s"))])
+
+    async def enabled(c, space_id, use_cache=True):
+        return True
+
+    async def append(c, space_id):
+        c.log.append(f"append depth={c.depth}")
+        return 1
+
+    monkeypatch.setattr(change_log, "is_change_log_enabled", enabled)
+    monkeypatch.setattr(change_log, "append_captured_changes", append)
+    assert await impl.execute_sparql_update(SPACE, "DELETE WHERE {...}")
+    assert conn.log[:5] == ["generate capture=True", "begin", "update",
+                            "append depth=1", "commit"]
+
+
+@pytest.mark.parametrize("ops, expected", [
+    ([_delete(URINode("urn:s1"))], set()),
+    ([UpdateModify(delete_quads=[QuadPattern(
+        subject=VarNode("s"), predicate=URINode(NAME), object=VarNode("o"),
+        graph=None)],
+        where_pattern=object())], {NAME}),
+    ([UpdateClear(graph="urn:g", target="urn:g")], set()),
+    ([UpdateClear(target="ALL")], None),
+    ([UpdateCopy(source="urn:a", dest="urn:b")], None),
+])
+def test_stale_predicates_of_an_update(ops, expected):
+    assert ssi._where_bound_write_predicates(ops) == expected
@@ -0,0 +1,136 @@
+"""Unit tests for orphan term GC against a scripted connection.
+
+Safety against a concurrent writer reusing a deterministic term UUID rests
+on the delete's statement order — lock_timeout, then both table locks,
+then a re-checked DELETE — and resumability on when the cursor moves.
+These pin both without a database.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+import asyncpg
+import pytest
+
+from vitalgraph.db.sparql_sql import term_gc
+
+SPACE = "sp_gc"
+
+
+class _Tx:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.log.append("BEGIN")
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.log.append("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class _Conn:
+    """A term table of sorted UUIDs, some referenced by quads."""
+
+    def __init__(self, terms, referenced=(), lock_busy=False):
+        self.terms = sorted(terms)
+        self.referenced = set(referenced)
+        self.lock_busy = lock_busy
+        self.state = {"cursor_uuid": None, "sweep_started": None}
+        self.log = []
+
+    def transaction(self):
+        return _Tx(self)
+
+    async def execute(self, sql, *args):
+        self.log.append(sql.strip())
+        if sql.lstrip().startswith("LOCK TABLE") and self.lock_busy:
+            raise asyncpg.exceptions.LockNotAvailableError("busy")
+        if "SET cursor_uuid = $1" in sql:
+            self.state["cursor_uuid"] = args[0]
+        elif "SET sweep_started = now()" in sql:
+            self.state["sweep_started"] = "now"
+        return "OK"
+
+    async def fetchval(self, sql, *args):
+        return 8192
+
+    async def fetch(self, sql, *args):
+        after, limit = args
+        chunk = [t for t in self.terms if after is None or t > after][:limit]
+        return [{"term_uuid": t, "orphan": t not in self.referenced} for t in chunk]
+
+    async def fetchrow(self, sql, *args):
+        self.log.append(sql.strip())
+        if "DELETE FROM" in sql:
+            gone = [t for t in args[0] if t not in self.referenced]
+            self.terms = [t for t in self.terms if t not in gone]
+            return {"n": len(gone), "nbytes": 40 * len(gone)}
+        if "sweeps_done = sweeps_done + 1" in sql:
+            self.state.update(cursor_uuid=None, sweep_started=None)
+            return {"last_sweep_deleted": 0, "last_sweep_bytes": 0, "sweep_scanned": 0}
+        return dict(self.state)
+
+
+def _uuids(n):
+    return sorted(uuid.uuid4() for _ in range(n))
+
+
+class TestDeleteOrphans:
+
+    async def test_locks_before_the_rechecked_delete(self):
+        terms = _uuids(3)
+        conn = _Conn(terms)
+        assert await term_gc.delete_orphans(conn, SPACE, terms) == (3, 120)
+        statements = conn.log
+        assert statements[0] == "BEGIN"
+        assert statements[1].startswith("SET LOCAL lock_timeout")
+        assert statements[2] == (f"LOCK TABLE {SPACE}_term, {SPACE}_rdf_quad "
+                                 "IN SHARE ROW EXCLUSIVE MODE")
+        delete = statements[3]
+        assert "DELETE FROM" in delete
+        for col in term_gc._QUAD_POSITIONS:
+            assert f"q.{col} = tm.term_uuid" in delete
+        assert statements[-1] == "COMMIT"
+
+    async def test_busy_tables_defer_the_chunk(self):
+        terms = _uuids(2)
+        conn = _Conn(terms, lock_busy=True)
+        assert await term_gc.delete_orphans(conn, SPACE, terms) is None
+        assert conn.terms == terms and conn.log[-1] == "ROLLBACK"
+
+    async def test_no_candidates_takes_no_lock(self):
+        conn = _Conn([])
+        assert await term_gc.delete_orphans(conn, SPACE, []) == (0, 0)
+        assert conn.log == []
+
+
+class TestSweep:
+
+    async def test_budget_stops_mid_sweep_and_resumes(self):
+        terms = _uuids(10)
+        conn = _Conn(terms, referenced=terms[::2])
+        first = await term_gc.sweep_orphan_terms(conn, SPACE, chunk_size=3, max_chunks=2)
+        assert first["chunks"] == 2 and not first["sweep_complete"]
+        assert conn.state["cursor_uuid"] == terms[5]
+
+        second = await term_gc.sweep_orphan_terms(conn, SPACE, chunk_size=3)
+        assert second["sweep_complete"] and second["scanned"] == 4
+        assert first["deleted"] + second["deleted"] == 5
+        assert conn.terms == terms[::2]
+        assert conn.state["cursor_uuid"] is None
+
+    async def test_deferred_chunk_keeps_the_cursor(self):
+        terms = _uuids(4)
+        conn = _Conn(terms, lock_busy=True)
+        result = await term_gc.sweep_orphan_terms(conn, SPACE, chunk_size=2)
+        assert result["deferred_chunks"] == 1 and result["chunks"] == 0
+        assert conn.state["cursor_uuid"] is None and conn.terms == terms
+
+
+def test_state_table_is_registered_for_drop():
+    from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
+    assert f"{SPACE}_term_gc" in term_gc.create_term_gc_state_sql(SPACE)
+    drops = SparqlSQLSchema().drop_space_tables_sql(SPACE)
+    assert f"DROP TABLE IF EXISTS {SPACE}_term_gc CASCADE" in drops
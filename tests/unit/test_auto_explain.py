@@ -0,0 +1,110 @@
+"""Automatic EXPLAIN capture for slow SPARQL.
+
+Pins the capture policy (first slow execution per shape, cooldown, global
+budget), that the plan is taken under the executor's own settings and
+never with ANALYZE, and that JSON plans get the same cost class as the
+text plans perf_shape_matrix.py classifies.
+"""
+
+import json
+
+from vitalgraph.db.sparql_sql.auto_explain import (
+    AutoExplain, classify_plan_json, classify_plan_text,
+)
+
+
+def _node(node_type, *children, **extra):
+    node = {"Node Type": node_type, **extra}
+    if children:
+        node["Plans"] = list(children)
+    return node
+
+
+SEMI = _node("Index Scan", **{"Subplan Name": "SubPlan 1", "Parent Relationship": "SubPlan"})
+
+
+def test_json_classes_match_text_classes():
+    ordered = [{"Plan": _node("Limit", _node("Unique", _node("Index Scan"), SEMI))}]
+    blocking = [{"Plan": _node("Limit", _node("Sort", _node("Seq Scan"), SEMI))}]
+    hashed = [{"Plan": _node("Limit", _node("Aggregate", SEMI, Strategy="Hashed"))}]
+    set_based = [{"Plan": _node("Sort", _node("Hash Join", _node("Seq Scan")))}]
+    assert classify_plan_json(ordered) == "ordered-probe"
+    assert classify_plan_json(blocking) == "blocking"
+    assert classify_plan_json(json.dumps(hashed)) == "blocking"
+    assert classify_plan_json(set_based) == "set-based"
+    assert classify_plan_text("Limit\n  ->  Sort\n        SubPlan 1") == "blocking"
+
+
+def test_first_slow_execution_per_shape_then_cooldown():
+    ae = AutoExplain(slow_ms=100, sample_rate=0, per_minute=10, cooldown_s=3600)
+    assert ae.reason_for("a", 50) is None
+    assert ae.reason_for("a", 150) == "slow-first"
+    assert ae.reason_for("a", 900) is None
+    assert ae.reason_for("b", 150) == "slow-first"
+    ae._explained_at["a"] -= 3600
+    assert ae.reason_for("a", 150) == "slow-recheck"
+
+
+def test_budget_bounds_captures():
+    ae = AutoExplain(slow_ms=1, sample_rate=0, per_minute=2, cooldown_s=3600)
+    reasons = [ae.reason_for(f"s{i}", 10) for i in range(5)]
+    assert reasons.count("slow-first") == 2 and ae.skipped_budget == 3
+
+
+def test_disabled_with_zero_threshold():
+    ae = AutoExplain(slow_ms=0, sample_rate=0, per_minute=10, cooldown_s=0)
+    assert ae.reason_for("a", 10 ** 6) is None
+
+
+class _Tx:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *a):
+        return False
+
+
+class _Conn:
+    def __init__(self):
+        self.log = []
+
+    def transaction(self):
+        return _Tx()
+
+    async def execute(self, sql, *args):
+        self.log.append((sql, args))
+
+    async def fetchval(self, sql, *args):
+        self.log.append((sql, args))
+        return json.dumps([{"Plan": _node("Limit", _node("Sort", SEMI))}])
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *a):
+                return False
+        return _Ctx()
+
+
+async def test_capture_runs_under_executor_settings_without_analyze():
+    conn = _Conn()
+    ae = AutoExplain(slow_ms=10, sample_rate=0, per_minute=10, cooldown_s=3600)
+    task = ae.maybe_capture(_Pool(conn), "sp", "h" * 64, "SELECT 1",
+                            {"total_ms": 50.0, "exec_ms": 40.0}, needs_ordered_scan=True)
+    await task
+    sqls = [s for s, _ in conn.log]
+    assert "SET LOCAL enable_sort = off" in sqls
+    (explain,) = [s for s in sqls if s.startswith("EXPLAIN")]
+    assert explain == "EXPLAIN (FORMAT JSON, SETTINGS) SELECT 1"
+    (insert_args,) = [a for s, a in conn.log if "sparql_explain_log" in s]
+    assert insert_args[:4] == ("sp", "h" * 64, "slow-first", "blocking")
+    assert ae.captured == 1 and ae._in_flight == 0
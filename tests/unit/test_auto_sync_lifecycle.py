@@ -1,7 +1,7 @@
 """auto_sync task lifecycle vs. space deletion (L0 — no DB, no model load).
 
-auto_sync runs fire-and-forget background tasks. Callers discard the returned
-Task, so before the in-flight registry there was no way to stop work already
+auto_sync queues fire-and-forget background work. Callers discard the returned
+future, so before the in-flight registry there was no way to stop work already
 queued against a space that was being deleted. The observed symptom:
 
     .811  Dropped space tables for: apitest_f95db9fb
@@ -23,14 +23,20 @@ import asyncio
 import pytest
 
 from vitalgraph.vectorization import auto_sync
+from vitalgraph.vectorization.sync_queue import SyncQueue
 
 pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
 
 
 @pytest.fixture(autouse=True)
-def _clean_registry():
+async def _clean_registry(monkeypatch):
+    # A fresh queue per test (its workers belong to the test's loop), with
+    # no linger so batches start on the next loop pass.
+    monkeypatch.setattr(auto_sync, "sync_queue", SyncQueue(auto_sync._run_queued, linger=0))
     auto_sync._IN_FLIGHT.clear()
     yield
+    auto_sync.sync_queue.abort()
+    await asyncio.sleep(0)
     auto_sync._IN_FLIGHT.clear()
 
 
@@ -167,9 +173,11 @@ class TestCancelSpaceSyncs:
         The stub swallows the FIRST cancellation only, so the timeout path is
         exercised and the test can still clean up afterwards.
         """
+        started = asyncio.Event()
         swallowed = asyncio.Event()
 
         async def _stubborn(*a, **kw):
+            started.set()
             try:
                 await asyncio.sleep(10)
             except asyncio.CancelledError:
@@ -180,7 +188,8 @@ class TestCancelSpaceSyncs:
         task = auto_sync.schedule_sync(
             db_impl=object(), space_id="sp1", subject_uris=["urn:a"], graph_uri="g",
         )
-        await asyncio.sleep(0)
+        # The queue's worker has to pick the batch up first.
+        await started.wait()
 
         loop = asyncio.get_running_loop()
         t0 = loop.time()
@@ -193,5 +202,5 @@ class TestCancelSpaceSyncs:
         # blocking on the task's 10s sleep.
         assert elapsed < 1.0, f"cancel_space_syncs blocked for {elapsed:.2f}s"
 
-        task.cancel()
-        await asyncio.gather(task, return_exceptions=True)
+        assert task.cancelled()
+        # The batch is still in its second sleep; the fixture aborts the queue.
@@ -0,0 +1,474 @@
+"""Batch endpoint and client batch — no database.
+
+The real batch router is mounted next to scripted stand-ins for the KG
+routes, so what is under test is the batch itself: in-process dispatch
+with the caller's auth, results in request order, writes as barriers,
+independent reads in parallel under the bound, ``depends_on`` skipping,
+``stop_on_error``, and the paths a batch may not reach. The client side
+runs over an ASGI transport against the same app, including the
+one-by-one fallback for a server without the route.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from fastapi import APIRouter, Body, Depends, FastAPI, Header, HTTPException, Query
+from fastapi.testclient import TestClient
+
+from vitalgraph.client.batch import ClientBatch
+from vitalgraph.client.utils.client_utils import VitalGraphClientError
+from vitalgraph.endpoint.batch_endpoint import create_batch_router, plan_dependencies
+from vitalgraph.model.batch_model import BatchOperation
+
+pytestmark = pytest.mark.unit
+
+USERS = {
+    "writer": {"username": "w", "role": "user", "spaces": {"sp": "rw"}},
+    "reader": {"username": "r", "role": "user", "spaces": {"sp": "r"}},
+}
+
+
+def _auth(x_user: str = Header("writer")):
+    if x_user not in USERS:
+        raise HTTPException(401, "Not authenticated")
+    return USERS[x_user]
+
+
+class _Store:
+    """Scripted KG routes; records what ran, in what order, how concurrently."""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.log = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _enter(self, what):
+        self.log.append(what)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+    def router(self):
+        router = APIRouter()
+
+        @router.get("/kgentities")
+        async def get_entity(space_id: str = Query(...), graph_id: str = Query(...),
+                             uri: str = Query(None), user=Depends(_auth)):
+            await self._enter(("get", uri))
+            if uri == "urn:missing":
+                return {"success": False, "status": "not_found", "message": "no such entity"}
+            return {"success": True, "status": "found", "uri": uri, "graph_id": graph_id,
+                    "user": user["username"]}
+
+        @router.get("/kgentities/kgframes")
+        async def get_frames(space_id: str = Query(...), entity_uri: str = Query(...),
+                             user=Depends(_auth)):
+            await self._enter(("frames", entity_uri))
+            return {"success": True, "status": "found", "frames": [entity_uri + "/f1"]}
+
+        @router.post("/kgentities")
+        async def write_entities(body: dict = Body(...), space_id: str = Query(...),
+                                 operation_mode: str = Query("create"), user=Depends(_auth)):
+            await self._enter(("write", body["name"]))
+            if body["name"] == "boom":
+                raise HTTPException(500, "store failed")
+            return {"success": True, "status": "upserted", "mode": operation_mode}
+
+        @router.post("/kgentities/query")
+        async def query(body: dict = Body(...), space_id: str = Query(...), user=Depends(_auth)):
+            await self._enter(("query", body["q"]))
+            return {"success": True, "status": "found", "entity_uris": [body["q"]]}
+
+        @router.post("/files")  # present in the app, but not a batchable root
+        async def files(user=Depends(_auth)):
+            return {"success": True}
+
+        return router
+
+
+class _Transactions:
+    """A backend db_impl's shared_transaction: records how each one ended."""
+
+    def __init__(self, fail_commit=False):
+        self.fail_commit = fail_commit
+        self.outcomes = []
+
+    @asynccontextmanager
+    async def shared_transaction(self):
+        try:
+            yield
+        except BaseException:
+            self.outcomes.append("rollback")
+            raise
+        if self.fail_commit:
+            self.outcomes.append("commit failed")
+            raise RuntimeError("serialization failure")
+        self.outcomes.append("commit")
+
+
+class _Space:
+    def __init__(self, db_impl):
+        self.space_impl = self
+        self.db_impl = db_impl
+
+    def get_db_space_impl(self):
+        return self
+
+
+class _Spaces:
+    def __init__(self, db_impl=None):
+        self.db_impl = db_impl
+
+    async def get_space_or_load(self, space_id):
+        return _Space(self.db_impl) if space_id == "sp" else None
+
+
+def _app(store, batch=True, spaces=None):
+    app = FastAPI()
+    app.include_router(store.router(), prefix="/api/graphs")
+    if batch:
+        app.include_router(create_batch_router(spaces or _Spaces(), _auth),
+                           prefix="/api/graphs")
+    return app
+
+
+def _op(method, path, **kw):
+    return {"method": method, "path": path, **kw}
+
+
+def _run(store, operations, user="writer", spaces=None, **options):
+    client = TestClient(_app(store, spaces=spaces))
+    response = client.post("/api/graphs/batch", params={"space_id": "sp"},
+                           headers={"x-user": user},
+                           json={"operations": operations, "graph_id": "urn:g", **options})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_operations_run_in_process_with_the_callers_auth():
+    store = _Store(delay=0)
+    data = _run(store, [
+        _op("GET", "kgentities", params={"uri": "urn:e1"}),
+        _op("GET", "kgentities/kgframes", params={"entity_uri": "urn:e1"}),
+        _op("POST", "kgentities", params={"operation_mode": "upsert"}, body={"name": "a"}),
+        _op("POST", "kgentities/query", body={"q": "x"}),
+    ])
+    assert data["success"] and data["status"] == "ok"
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+    first = data["results"][0]["body"]
+    assert first["user"] == "w" and first["graph_id"] == "urn:g"  # batch default filled in
+    assert data["results"][1]["body"]["frames"] == ["urn:e1/f1"]
+    assert data["results"][2]["body"]["mode"] == "upsert"
+    assert data["succeeded"] == 4 and data["failed"] == 0
+
+
+def test_reads_run_in_parallel_and_writes_are_barriers():
+    store = _Store(delay=0.03)
+    reads = [_op("GET", "kgentities", params={"uri": f"urn:e{i}"}) for i in range(6)]
+    data = _run(store, reads[:3] + [_op("POST", "kgentities", body={"name": "w"})] + reads[3:],
+                max_parallel=2)
+    assert data["success"]
+    assert store.peak == 2
+    writes_at = store.log.index(("write", "w"))
+    assert set(store.log[:writes_at]) == {("get", f"urn:e{i}") for i in range(3)}
+    assert set(store.log[writes_at + 1:]) == {("get", f"urn:e{i}") for i in range(3, 6)}
+
+
+def test_dependency_plan():
+    ops = [BatchOperation(**o) for o in [
+        _op("GET", "kgentities", id="a"),
+        _op("POST", "kgentities/query"),          # a read, despite POST
+        _op("POST", "kgentities", id="w"),
+        _op("GET", "kgentities"),
+        _op("GET", "kgrelations", depends_on=["a"]),
+        _op("DELETE", "kgentities"),
+    ]]
+    after, requires = plan_dependencies(ops)
+    assert after == [set(), set(), {0, 1}, {2}, {0, 2}, {2, 3, 4}]
+    assert requires == [set(), set(), set(), set(), {0}, set()]
+
+
+def test_failed_dependency_is_skipped_but_the_rest_runs():
+    store = _Store(delay=0)
+    data = _run(store, [
+        _op("GET", "kgentities", id="missing", params={"uri": "urn:missing"}),
+        _op("GET", "kgentities/kgframes", params={"entity_uri": "urn:missing"},
+            depends_on=["missing"]),
+        _op("GET", "kgentities", params={"uri": "urn:e2"}),
+    ], stop_on_error=False)
+    results = data["results"]
+    assert results[0]["status_code"] == 200 and results[0]["body"]["success"] is False
+    assert results[1]["skipped"] and results[1]["status_code"] == 424
+    assert results[2]["body"]["uri"] == "urn:e2"
+    assert (data["succeeded"], data["failed"], data["skipped"]) == (1, 1, 1)
+    assert data["status"] == "partial" and data["success"] is False
+    assert ("frames", "urn:missing") not in store.log
+
+
+def test_stop_on_error_skips_everything_after_a_failed_write():
+    store = _Store(delay=0)
+    data = _run(store, [
+        _op("POST", "kgentities", body={"name": "a"}),
+        _op("POST", "kgentities", body={"name": "boom"}),
+        _op("POST", "kgentities", body={"name": "c"}),
+        _op("GET", "kgentities", params={"uri": "urn:e1"}),
+    ])
+    codes = [(r["status_code"], r["skipped"]) for r in data["results"]]
+    assert codes == [(200, False), (500, False), (424, True), (424, True)]
+    assert store.log == [("write", "a"), ("write", "boom")]  # "a" stays written: no rollback
+
+
+def test_operation_errors_become_results():
+    store = _Store(delay=0)
+    data = _run(store, [
+        _op("GET", "kgentities/kgframes"),           # 422: entity_uri missing
+        _op("PUT", "kgentities/query", body={}),     # 405
+        _op("GET", "kgentities/nothing-here"),       # 404
+        _op("POST", "kgentities", body={"name": "boom"}),  # handler raised 500
+    ], stop_on_error=False)
+    assert [r["status_code"] for r in data["results"]] == [422, 405, 404, 500]
+    assert data["results"][3]["body"] == {"detail": "store failed"}
+    assert data["failed"] == 4
+
+
+@pytest.mark.parametrize("operations,message", [
+    ([], "no operations"),
+    ([_op("POST", "files")], "cannot be batched"),
+    ([_op("POST", "batch", body={"operations": []})], "cannot be batched"),
+    ([_op("GET", "kgentities/../files")], "cannot be batched"),
+    ([_op("GET", "kgentities", depends_on=["later"]), _op("GET", "kgentities", id="later")],
+     "earlier operation"),
+    ([_op("GET", "kgentities", id="x"), _op("GET", "kgentities", id="x")], "duplicate id"),
+    ([_op("GET", "kgentities")] * 201, "limit is 200"),
+    ([_op("GET", "kgentities", params={"space_id": "other", "uri": "urn:e1"})],
+     "space_id cannot be set"),
+])
+def test_invalid_batches_are_refused_whole(operations, message):
+    store = _Store(delay=0)
+    data = _run(store, operations)
+    assert data["status"] == "invalid_request" and message in data["message"]
+    assert store.log == []
+
+
+def test_permissions_and_space():
+    store = _Store(delay=0)
+    reads = [_op("GET", "kgentities", params={"uri": "urn:e1"})]
+    assert _run(store, reads, user="reader")["success"]
+    client = TestClient(_app(store))
+    write = {"operations": [_op("POST", "kgentities", body={"name": "a"})]}
+    assert client.post("/api/graphs/batch", params={"space_id": "sp"}, json=write,
+                       headers={"x-user": "reader"}).status_code == 403
+    other = client.post("/api/graphs/batch", params={"space_id": "nope"},
+                        json={"operations": reads}, headers={"x-user": "writer"})
+    assert other.status_code == 403
+    USERS["admin"] = {"username": "a", "role": "admin"}
+    try:
+        missing = client.post("/api/graphs/batch", params={"space_id": "nope"},
+                              json={"operations": reads}, headers={"x-user": "admin"}).json()
+    finally:
+        del USERS["admin"]
+    assert missing["status"] == "not_found"
+
+
+def test_transactional_batch_runs_one_at_a_time_and_commits():
+    store, transactions = _Store(delay=0.01), _Transactions()
+    data = _run(store, [_op("GET", "kgentities", params={"uri": f"urn:e{i}"}) for i in range(3)]
+                + [_op("POST", "kgentities", body={"name": "a"})],
+                spaces=_Spaces(transactions), transactional=True, max_parallel=4)
+    assert data["success"] and not data["rolled_back"]
+    assert store.peak == 1 and transactions.outcomes == ["commit"]
+
+
+def test_transactional_batch_with_writes_flushes_the_space_caches():
+    from vitalgraph.cache.count_cache import _count_cache
+    _count_cache.put("sp", "urn:g", "q", 5)
+    _count_cache.put("other", "urn:g", "q", 7)
+    try:
+        data = _run(_Store(delay=0), [_op("POST", "kgentities", body={"name": "a"})],
+                    spaces=_Spaces(_Transactions()), transactional=True)
+        assert data["success"]
+        assert _count_cache.get("sp", "urn:g", "q") is None
+        assert _count_cache.get("other", "urn:g", "q") == 7
+    finally:
+        _count_cache.invalidate_space("other")
+
+
+def test_transactional_batch_rolls_back_on_the_first_failure():
+    store, transactions = _Store(delay=0), _Transactions()
+    data = _run(store, [
+        _op("POST", "kgentities", body={"name": "a"}),
+        _op("POST", "kgentities", body={"name": "boom"}),
+        _op("POST", "kgentities", body={"name": "c"}),
+    ], spaces=_Spaces(transactions), transactional=True, stop_on_error=False)
+    assert data["rolled_back"] and data["status"] == "partial"
+    assert "rolled back" in data["message"]
+    assert [r["status_code"] for r in data["results"]] == [200, 500, 424]
+    assert transactions.outcomes == ["rollback"]
+
+    failing = _Transactions(fail_commit=True)
+    data = _run(_Store(delay=0), [_op("POST", "kgentities", body={"name": "a"})],
+                spaces=_Spaces(failing), transactional=True)
+    assert data["status"] == "store_failed" and data["rolled_back"]
+    assert "serialization failure" in data["message"]
+
+
+def test_transactional_writes_are_refused_without_backend_support():
+    store = _Store(delay=0)
+    data = _run(store, [_op("POST", "kgentities", body={"name": "a"})], transactional=True)
+    assert data["status"] == "invalid_request" and "one transaction" in data["message"]
+    assert store.log == []
+    reads = _run(store, [_op("GET", "kgentities", params={"uri": "urn:e1"})],
+                 transactional=True)
+    assert reads["success"] and not reads["rolled_back"]
+
+
+def test_operations_reuse_the_batch_users_authentication(monkeypatch):
+    pytest.importorskip("bcrypt")
+    from vitalgraph.auth.vitalgraph_auth import VitalGraphAuth
+
+    auth = VitalGraphAuth(secret_key="batch-test-secret")
+    token = auth.create_tokens({"username": "w", "role": "admin"})["access_token"]
+    verified = []
+    verify = auth.jwt_auth.verify_token
+    monkeypatch.setattr(auth.jwt_auth, "verify_token",
+                        lambda *a, **kw: verified.append(a[1]) or verify(*a, **kw))
+    current_user = auth.create_get_current_user_dependency()
+
+    router = APIRouter()
+
+    @router.get("/kgentities")
+    async def whoami(space_id: str = Query(...), user=Depends(current_user)):
+        return {"success": True, "status": "found", "user": user["username"]}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/graphs")
+    app.include_router(create_batch_router(_Spaces(), current_user), prefix="/api/graphs")
+    response = TestClient(app).post(
+        "/api/graphs/batch", params={"space_id": "sp"},
+        headers={"Authorization": f"Bearer {token}"},
+        json={"operations": [_op("GET", "kgentities")] * 5})
+    assert [r["body"]["user"] for r in response.json()["results"]] == ["w"] * 5
+    assert verified == ["access"]
+
+
+# ---------------------------------------------------------------------------
+# Client batch
+# ---------------------------------------------------------------------------
+
+class _Config:
+    def get_server_url(self):
+        return "http://vg"
+
+
+class _Client:
+    """Sends through an ASGI transport; counts round trips."""
+
+    def __init__(self, app):
+        self.config = _Config()
+        self.http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://vg")
+        self.requests = []
+
+    async def _make_authenticated_request(self, method, url, params=None, json=None,
+                                          idempotent=None):
+        self.requests.append((method, url.rsplit("/api/graphs/", 1)[1], idempotent))
+        response = await self.http.request(method, url, params=params, json=json)
+        if response.status_code >= 400:
+            raise VitalGraphClientError(f"Request failed ({response.status_code})",
+                                        status_code=response.status_code)
+        return response
+
+
+async def test_client_batch_is_one_round_trip():
+    client = _Client(_app(_Store(delay=0)))
+    async with ClientBatch(client, "sp", "urn:g") as batch:
+        entity = batch.get_kgentity("urn:e1")
+        frames = batch.get_kgentity_frames("urn:e1")
+        write = batch.add("POST", "kgentities", {"operation_mode": "upsert"}, body={"name": "a"},
+                          depends_on=[entity])
+        assert not entity.done
+    assert client.requests == [("POST", "batch", False)]
+    assert entity.success and entity.response["uri"] == "urn:e1"
+    assert frames.response["frames"] == ["urn:e1/f1"]
+    assert write.success and write.depends_on == [entity.id]
+    assert batch.success and batch.round_trips == 1
+
+
+async def test_client_batch_reports_or_raises_failures():
+    client = _Client(_app(_Store(delay=0)))
+    async with ClientBatch(client, "sp", "urn:g") as batch:
+        missing = batch.get_kgentity("urn:missing")
+        after = batch.add("POST", "kgentities", body={"name": "a"})
+    assert not missing.success and after.skipped and not batch.success
+
+    with pytest.raises(VitalGraphClientError, match="did not succeed"):
+        async with ClientBatch(client, "sp", "urn:g", raise_on_error=True) as batch:
+            batch.get_kgentity("urn:missing")
+
+
+async def test_client_batch_sends_nothing_when_the_block_fails():
+    client = _Client(_app(_Store(delay=0)))
+    with pytest.raises(RuntimeError):
+        async with ClientBatch(client, "sp") as batch:
+            batch.get_kgentity("urn:e1")
+            raise RuntimeError("caller bug")
+    assert client.requests == []
+    with pytest.raises(VitalGraphClientError, match="earlier operation"):
+        batch.add("GET", "kgentities", depends_on=["nope"])
+    with pytest.raises(VitalGraphClientError, match="space_id"):
+        batch.get_kgentity("urn:e1", space_id="other")
+
+
+async def test_client_falls_back_to_single_calls_without_the_route():
+    store = _Store(delay=0)
+    client = _Client(_app(store, batch=False))
+    async with ClientBatch(client, "sp", "urn:g", stop_on_error=False) as batch:
+        missing = batch.add("GET", "kgentities", {"uri": "urn:missing"}, id="m")
+        frames = batch.add("GET", "kgentities/kgframes", {"entity_uri": "urn:missing"},
+                           depends_on=["m"])
+        other = batch.get_kgentity("urn:e2")
+    assert [r[1] for r in client.requests] == ["batch", "kgentities", "kgentities"]
+    assert batch.round_trips == 3
+    assert not missing.success and frames.skipped and frames.status_code == 424
+    assert other.success and other.response["graph_id"] == "urn:g"
+
+
+async def test_update_helper_reaches_the_real_kgentities_route(monkeypatch):
+    pytest.importorskip("vital_ai_vitalsigns")
+    from vitalgraph.endpoint.kgentities_endpoint import KGEntitiesEndpoint
+
+    endpoint = KGEntitiesEndpoint(_Spaces(), _auth)
+    modes = []
+
+    async def record(space_id, graph_id, quads, operation_mode, parent_uri, current_user):
+        modes.append(operation_mode.value)
+        return {"success": True, "status": "updated"}
+
+    monkeypatch.setattr(endpoint, "_create_or_update_entities", record)
+    monkeypatch.setattr(ClientBatch, "_quads", staticmethod(lambda objects: {"quads": []}))
+    app = FastAPI()
+    app.include_router(endpoint.router, prefix="/api/graphs")
+    app.include_router(create_batch_router(_Spaces(), _auth), prefix="/api/graphs")
+    async with ClientBatch(_Client(app), "sp", "urn:g") as batch:
+        update = batch.update_kgentities([])
+    assert update.success, update.response
+    assert (update.method, update.path) == ("POST", "kgentities") and modes == ["update"]
+
+
+async def test_transactional_client_batch_reports_the_rollback():
+    transactions = _Transactions()
+    client = _Client(_app(_Store(delay=0), spaces=_Spaces(transactions)))
+    async with ClientBatch(client, "sp", "urn:g", transactional=True) as batch:
+        written = batch.add("POST", "kgentities", body={"name": "a"})
+        batch.add("POST", "kgentities", body={"name": "boom"})
+    assert written.success and batch.rolled_back and not batch.success
+
+    with pytest.raises(VitalGraphClientError, match="transactional"):
+        async with ClientBatch(_Client(_app(_Store(delay=0), batch=False)), "sp",
+                               transactional=True) as batch:
+            batch.add("POST", "kgentities", body={"name": "a"})
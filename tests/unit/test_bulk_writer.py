@@ -0,0 +1,226 @@
+"""Client bulk writer — no server, no VitalSigns.
+
+Items are pre-encoded quad groups and the client is a scripted fake that
+records each request, so what is under test is the writer itself: chunk
+packing by bytes, never splitting an item, the in-flight bound, the
+idempotent flag, gzip bodies with the 415 (and first-chunk 400/422)
+fallback, and failure accounting.
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from vitalgraph.client.bulk_writer import BulkWriter, iter_nquads_entity_graphs
+from vitalgraph.client.utils.client_utils import VitalGraphClientError
+from vitalgraph.model.quad_model import Quad
+
+pytestmark = pytest.mark.unit
+
+
+def _entity(i, quads=3, pad=0):
+    return [Quad(s=f"<urn:e{i}>", p=f"<urn:p{k}>", o='"' + "x" * pad + f'{k}"', g=None)
+            for k in range(quads)]
+
+
+class _Config:
+    def __init__(self, max_concurrency=0):
+        self.max_concurrency = max_concurrency
+
+    def get_server_url(self):
+        return "http://vg"
+
+    def get_max_concurrency(self):
+        return self.max_concurrency
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class _Client:
+    """Records requests; ``script`` maps a request number to an exception or body."""
+
+    def __init__(self, script=None, delay=0.0, max_concurrency=0):
+        self.config = _Config(max_concurrency)
+        self.wire_format = "json_quads"
+        self.script = script or {}
+        self.delay = delay
+        self.requests = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def _make_authenticated_request(self, method, url, **kwargs):
+        n = len(self.requests)
+        body = kwargs["content"]
+        if kwargs["headers"].get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.requests.append({"url": url, "params": kwargs["params"], "headers": kwargs["headers"],
+                              "idempotent": kwargs.get("idempotent"),
+                              "subjects": {q["s"] for q in json.loads(body)["quads"]}})
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        outcome = self.script.get(n)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _Response(outcome or {"success": True, "status": "upserted"})
+
+
+async def test_chunks_are_sized_by_bytes_and_items_are_not_split():
+    client = _Client()
+    items = [_entity(i, quads=4, pad=200) for i in range(20)]
+    result = await BulkWriter(client, "sp", "urn:g", target_chunk_bytes=3000).write(items)
+
+    assert result.success and result.objects_sent == 20 and result.quads_sent == 80
+    assert len(client.requests) == result.chunks_sent > 1
+    seen = [s for r in client.requests for s in r["subjects"]]
+    assert sorted(seen) == sorted(f"<urn:e{i}>" for i in range(20))  # each entity in exactly one chunk
+    assert all(len(r["subjects"]) <= 3 for r in client.requests)
+
+
+async def test_max_chunk_objects_caps_small_items():
+    client = _Client()
+    result = await BulkWriter(client, "sp", "urn:g", max_chunk_objects=5).write(
+        _entity(i, quads=1) for i in range(12))
+    assert [len(r["subjects"]) for r in client.requests] == [5, 5, 2]
+    assert result.objects_sent == 12
+
+
+async def test_async_source_and_bounded_concurrency():
+    client = _Client(delay=0.01)
+
+    async def source():
+        for i in range(40):
+            yield _entity(i, quads=1)
+
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=2, concurrency=3)
+    result = await writer.write(source())
+    assert result.chunks_sent == 20
+    assert client.peak == 3
+
+
+async def test_concurrency_defaults_to_client_limit():
+    assert BulkWriter(_Client(max_concurrency=7), "sp", "g").concurrency == 7
+    assert BulkWriter(_Client(), "sp", "g").concurrency == 4
+
+
+async def test_upsert_is_sent_idempotent_and_create_is_not():
+    client = _Client()
+    await BulkWriter(client, "sp", "urn:g").write([_entity(1)])
+    await BulkWriter(client, "sp", "urn:g", operation_mode="create").write([_entity(2)])
+    assert client.requests[0]["params"] == {"space_id": "sp", "graph_id": "urn:g",
+                                            "operation_mode": "upsert"}
+    assert client.requests[0]["url"] == "http://vg/api/graphs/kgentities"
+    assert [r["idempotent"] for r in client.requests] == [True, False]
+
+
+async def test_bodies_are_gzipped_and_415_turns_compression_off():
+    client = _Client(script={0: VitalGraphClientError("unsupported", status_code=415)})
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, concurrency=1)
+    result = await writer.write([_entity(i, pad=500) for i in range(3)])
+
+    encodings = [r["headers"].get("Content-Encoding") for r in client.requests]
+    assert encodings == ["gzip", None, None, None]
+    assert result.success and result.chunks_sent == 3
+    assert writer.compress is False
+
+
+async def test_422_on_the_first_chunk_turns_compression_off():
+    client = _Client(script={0: VitalGraphClientError("bad json", status_code=422)})
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, concurrency=1)
+    result = await writer.write([_entity(i) for i in range(2)])
+
+    encodings = [r["headers"].get("Content-Encoding") for r in client.requests]
+    assert encodings == ["gzip", None, None]
+    assert result.success and writer.compress is False
+
+
+async def test_400_after_compression_was_accepted_is_a_chunk_failure():
+    client = _Client(script={1: VitalGraphClientError("invalid", status_code=400)})
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, concurrency=1,
+                        fail_fast=False)
+    result = await writer.write([_entity(i) for i in range(3)])
+
+    assert [r["headers"].get("Content-Encoding") for r in client.requests] == ["gzip"] * 3
+    assert [f.status_code for f in result.failed_chunks] == [400]
+    assert writer.compress is True
+
+
+async def test_400_repeated_uncompressed_keeps_compression():
+    bad = VitalGraphClientError("invalid", status_code=400)
+    client = _Client(script={0: bad, 1: bad})
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, concurrency=1,
+                        fail_fast=False)
+    result = await writer.write([_entity(i) for i in range(2)])
+
+    encodings = [r["headers"].get("Content-Encoding") for r in client.requests]
+    assert encodings == ["gzip", None, "gzip"]
+    assert [f.status_code for f in result.failed_chunks] == [400]
+    assert writer.compress is True
+
+
+async def test_compression_is_reported():
+    client = _Client()
+    result = await BulkWriter(client, "sp", "urn:g").write([_entity(i, pad=300) for i in range(50)])
+    assert result.wire_bytes < result.raw_bytes
+    assert result.compression_ratio > 2
+    assert result.objects_per_second > 0
+    assert "objects/s" in result.summary()
+
+
+async def test_failed_chunk_is_recorded_and_stops_the_source():
+    client = _Client(script={1: {"success": False, "status": "invalid_request",
+                                 "message": "No valid KGEntity objects found in request"}})
+    progress = []
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, concurrency=1,
+                        on_progress=lambda r: progress.append(r.chunks_sent))
+    result = await writer.write([_entity(i) for i in range(10)])
+
+    assert not result.success
+    assert result.failed_chunks[0].index == 1
+    assert "invalid_request" in result.failed_chunks[0].error
+    assert result.objects_failed == 1
+    assert len(client.requests) < 10
+    assert progress[:2] == [1, 1]
+
+
+async def test_without_fail_fast_every_chunk_is_attempted():
+    client = _Client(script={0: VitalGraphClientError("boom", status_code=500)})
+    writer = BulkWriter(client, "sp", "urn:g", max_chunk_objects=1, fail_fast=False)
+    result = await writer.write([_entity(i) for i in range(4)])
+    assert len(client.requests) == 4
+    assert result.objects_sent == 3 and result.failed_chunks[0].status_code == 500
+
+
+def test_nquads_file_is_grouped_by_entity_graph(tmp_path):
+    pytest.importorskip("vital_ai_vitalsigns")  # the N-Quads parser lives beside the VitalSigns codecs
+    graph = "<http://vital.ai/ontology/haley-ai-kg#hasKGGraphURI>"
+    path = tmp_path / "data.nq.gz"
+    lines = [
+        f'<urn:e0> {graph} <urn:e0> <urn:g> .',
+        '<urn:e0> <urn:p> "0" <urn:g> .',
+        f'<urn:e1> {graph} <urn:e1> <urn:g> .',
+        # e0's frame arrives after e1 has started, its slot as a literal URI
+        f'<urn:f0> {graph} <urn:e0> <urn:g> .',
+        '<urn:loose> <urn:p> "x" <urn:g> .',
+        f'<urn:s0> {graph} "urn:e0"^^<http://www.w3.org/2001/XMLSchema#anyURI> <urn:g> .',
+        '<urn:e1> <urn:p> "1" <urn:g> .',
+    ]
+    with gzip.open(path, "wt") as f:
+        f.write("\n".join(lines) + "\n")
+    groups = list(iter_nquads_entity_graphs(str(path), batch_lines=2))
+    assert [sorted({q.s for q in g}) for g in groups] == [
+        ["<urn:loose>"], ["<urn:e0>", "<urn:f0>", "<urn:s0>"], ["<urn:e1>"]]
+    assert sum(len(g) for g in groups) == len(lines)
@@ -28,6 +28,7 @@ from vitalgraph.client.utils.client_utils import (
     VitalGraphClientTimeoutError,
     VitalGraphClientUnavailableError,
 )
+from vitalgraph.client.utils.response_cache import ResponseCache
 from vitalgraph.client.vitalgraph_client import VitalGraphClient
 
 
@@ -57,6 +58,9 @@ class FakeConfig:
             'max_concurrency': 0,
             'breaker_threshold': 5,
             'breaker_reset': 30.0,
+            'response_cache_entries': 0,
+            'response_cache_mb': 32.0,
+            'response_compression': True,
         }
         self.values.update(overrides)
 
@@ -77,6 +81,9 @@ class FakeConfig:
     def get_max_concurrency(self): return self.values['max_concurrency']
     def get_breaker_threshold(self): return self.values['breaker_threshold']
     def get_breaker_reset(self): return self.values['breaker_reset']
+    def get_response_cache_entries(self): return self.values['response_cache_entries']
+    def get_response_cache_mb(self): return self.values['response_cache_mb']
+    def get_response_compression(self): return self.values['response_compression']
 
 
 def make_client(handler, clock=None, **config_overrides) -> VitalGraphClient:
@@ -624,3 +631,46 @@ async def test_stats_counters(sleeps):
     assert stats['attempts'] == 2
     assert stats['retries_pre_send'] == 1
     assert stats['breaker_state'] == 'closed'
+
+
+# ---------------------------------------------------------------------------
+# Conditional GETs
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.asyncio
+async def test_client_revalidates_cached_get():
+    seen = []
+    body = b'{"results": [], "total_count": 0}'
+
+    def handler(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, content=body)
+
+    client = make_client(handler, response_cache_entries=8)
+    url = "http://testserver/api/graphs/kgentities"
+    params = {"space_id": "sp", "uri": "urn:e1"}
+    first = await client._make_authenticated_request("GET", url, params=params)
+    second = await client._make_authenticated_request("GET", url, params=params)
+
+    assert seen == [None, '"v1"']
+    assert second.status_code == 200 and second.content == first.content == body
+    assert client.stats()["response_cache"]["revalidated"] == 1
+    # Different parameters are a different resource.
+    await client._make_authenticated_request("GET", url, params={"space_id": "sp", "uri": "urn:e2"})
+    assert seen[-1] is None
+
+
+def test_response_cache_is_bounded_by_bytes():
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    request = httpx.Request("GET", "http://x")
+    for i in range(3):
+        cache.store(cache.key(f"http://x/{i}"),
+                    httpx.Response(200, headers={"ETag": f'"{i}"'}, content=b"12345", request=request))
+    assert cache.stats()["entries"] == 2 and cache.etag_for(cache.key("http://x/0")) is None
+    cache.store(cache.key("http://x/ns"),
+                httpx.Response(200, headers={"ETag": '"n"', "Cache-Control": "no-store"},
+                               content=b"1", request=request))
+    assert cache.etag_for(cache.key("http://x/ns")) is None
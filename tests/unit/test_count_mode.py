@@ -0,0 +1,148 @@
+"""Count modes for listings — parsing, the capped rewrite, the
+planner-estimate walk and the resolution order. No DB: estimates run
+against a scripted connection.
+"""
+
+import pytest
+
+from vitalgraph.db.sparql_sql.count_mode import (
+    COUNT_CAPPED, COUNT_ESTIMATED, COUNT_EXACT, COUNT_NONE, DEFAULT_COUNT_CAP,
+    CountMode, cap_count_sparql, finish_count, parse_count_mode,
+    pattern_count_estimate, plan_count_rows, resolve_count,
+)
+
+
+def test_parse_count_mode():
+    assert parse_count_mode(None) == CountMode(COUNT_EXACT)
+    assert parse_count_mode(" Estimated ") == CountMode(COUNT_ESTIMATED)
+    assert parse_count_mode("none") == CountMode(COUNT_NONE)
+    assert parse_count_mode("capped") == CountMode(COUNT_CAPPED, DEFAULT_COUNT_CAP)
+    assert str(parse_count_mode("capped:50")) == "capped:50"
+    for bad in ("fast", "capped:0", "capped:x", "capped:-3", "capped:10000000"):
+        with pytest.raises(ValueError):
+            parse_count_mode(bad)
+
+
+def test_cap_count_sparql_shapes():
+    distinct = cap_count_sparql(
+        "SELECT (COUNT(DISTINCT ?entity) AS ?count) WHERE {\n  ?entity a <urn:T> .\n}", 10)
+    assert "SELECT (COUNT(*) AS ?count)" in distinct
+    assert "SELECT DISTINCT ?entity WHERE" in distinct
+    assert "ORDER BY ?entity LIMIT 11" in distinct
+
+    sub = cap_count_sparql(
+        "SELECT (COUNT(*) AS ?count) WHERE { { SELECT DISTINCT ?s WHERE { ?s ?p ?o } } }", 5)
+    assert sub.rstrip().endswith("LIMIT 6 }\n}")
+
+    plain = cap_count_sparql("SELECT (COUNT(*) AS ?count) WHERE { ?s <urn:p> ?o }", 5)
+    assert "SELECT * WHERE" in plain and "LIMIT 6" in plain
+
+    assert cap_count_sparql("SELECT (COUNT(?s) AS ?count) WHERE { ?s ?p ?o }", 5) is None
+    assert cap_count_sparql(
+        "SELECT (COUNT(*) AS ?c) WHERE { { SELECT ?s WHERE { ?s ?p ?o } LIMIT 3 } }", 5) is None
+    assert cap_count_sparql("SELECT ?s WHERE { ?s ?p ?o }", 5) is None
+
+
+def test_plan_count_rows_walks_to_the_counted_input():
+    plan = [{"Plan": {"Node Type": "Aggregate", "Strategy": "Plain", "Plan Rows": 1,
+                      "Plans": [{"Node Type": "Seq Scan", "Plan Rows": 4200}]}}]
+    assert plan_count_rows(plan) == 4200
+    # Per-worker estimates below a Gather are scaled back up (2 workers + leader).
+    parallel = {"Plan": {"Node Type": "Aggregate", "Strategy": "Plain", "Plan Rows": 1,
+                         "Plans": [{"Node Type": "Gather", "Workers Planned": 2, "Plan Rows": 3,
+                                    "Plans": [{"Node Type": "Aggregate", "Strategy": "Plain",
+                                               "Plan Rows": 1,
+                                               "Plans": [{"Node Type": "Parallel Seq Scan",
+                                                          "Plan Rows": 1000}]}]}]}}
+    assert plan_count_rows([parallel]) == 2400
+    # A hashed aggregate is the DISTINCT being counted: its estimate is the answer.
+    hashed = {"Plan": {"Node Type": "Aggregate", "Strategy": "Plain", "Plan Rows": 1,
+                       "Plans": [{"Node Type": "Aggregate", "Strategy": "Hashed", "Plan Rows": 77,
+                                  "Plans": [{"Node Type": "Seq Scan", "Plan Rows": 9000}]}]}}
+    assert plan_count_rows([hashed]) == 77
+    assert plan_count_rows([]) is None
+
+
+class _Recorder:
+    def __init__(self, value):
+        self.value = value
+        self.queries = []
+
+    async def __call__(self, query):
+        self.queries.append(query)
+        return self.value
+
+
+def _estimate(value):
+    async def _run():
+        return value
+    return _run
+
+
+COUNT_Q = "SELECT (COUNT(DISTINCT ?e) AS ?count) WHERE { ?e a <urn:T> }"
+
+
+@pytest.mark.asyncio
+async def test_resolve_count_modes():
+    run = _Recorder(40)
+    assert await resolve_count(CountMode(COUNT_EXACT), COUNT_Q, run) == (40, COUNT_EXACT)
+    assert run.queries == [COUNT_Q]
+
+    run = _Recorder(0)
+    assert await resolve_count(CountMode(COUNT_NONE), COUNT_Q, run) == (0, COUNT_NONE)
+    assert run.queries == []
+
+    # Estimators in order; the first answer wins and nothing is counted.
+    run = _Recorder(0)
+    got = await resolve_count(CountMode(COUNT_ESTIMATED), COUNT_Q, run,
+                              [_estimate(None), _estimate(12345)])
+    assert got == (12345, COUNT_ESTIMATED) and run.queries == []
+
+    # No estimate: bounded, never unbounded.
+    run = _Recorder(DEFAULT_COUNT_CAP + 1)
+    got = await resolve_count(CountMode(COUNT_ESTIMATED), COUNT_Q, run, [_estimate(None)])
+    assert got == (DEFAULT_COUNT_CAP, COUNT_CAPPED)
+    assert f"LIMIT {DEFAULT_COUNT_CAP + 1}" in run.queries[0]
+
+    # Under the cap the capped count is exact.
+    run = _Recorder(7)
+    assert await resolve_count(CountMode(COUNT_CAPPED, 10), COUNT_Q, run) == (7, COUNT_EXACT)
+
+    # A count the cap cannot rewrite is not run unbounded.
+    run = _Recorder(10**9)
+    assert await resolve_count(CountMode(COUNT_CAPPED, 10), "ASK { ?s ?p ?o }", run) \
+        == (0, COUNT_NONE)
+    assert run.queries == []
+
+
+def test_finish_count_never_below_the_page():
+    assert finish_count(3, COUNT_EXACT, 100, 10) == 3
+    assert finish_count(0, COUNT_NONE, 20, 10) == 30
+    assert finish_count(5, COUNT_ESTIMATED, 0, 10) == 10
+    assert finish_count(1000, COUNT_CAPPED, 0, 10) == 1000
+
+
+class _Conn:
+    def __init__(self, pred, pairs):
+        self.pred = pred
+        self.pairs = pairs
+
+    async def fetchrow(self, sql, *args):
+        assert "_rdf_pred_stats" in sql
+        return self.pred
+
+    async def fetch(self, sql, *args):
+        assert "_rdf_stats" in sql and len(args[1]) == 2
+        return self.pairs
+
+
+@pytest.mark.asyncio
+async def test_pattern_count_estimate_from_stats():
+    conn = _Conn({"row_count": 900, "pruned": False}, [{"row_count": 40}, {"row_count": 2}])
+    assert await pattern_count_estimate(conn, "sp", "urn:p") == 900
+    assert await pattern_count_estimate(conn, "sp", "urn:p", ["urn:a", "urn:b"]) == 42
+    # No stats row yet: unknown, so the next estimator gets its turn.
+    assert await pattern_count_estimate(_Conn(None, []), "sp", "urn:p") is None
+    # A missing pair of a pruned predicate is unknown, not zero.
+    pruned = _Conn({"row_count": 900, "pruned": True}, [{"row_count": 40}])
+    assert await pattern_count_estimate(pruned, "sp", "urn:p", ["urn:a", "urn:b"]) is None
@@ -0,0 +1,109 @@
+"""Same-as resolution through the canonical-id table.
+
+``entity_canonical`` replaces the per-hop chain walk, so what these tests
+pin is the number and shape of statements: a create is one root lookup
+plus a union update, a cycle or a second mapping from a merged source is
+rejected before anything is written, and resolving any number of ids is a
+single query.
+"""
+
+import pytest
+
+from vitalgraph.entity_registry.entity_same_as_ops import SameAsMixin, canonical_rows_sql
+
+
+class _Tx:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *a):
+        return False
+
+
+class _Conn:
+    def __init__(self, fetch_rows=None):
+        self.fetch_rows = fetch_rows or []
+        self.calls = []
+
+    def transaction(self):
+        return _Tx()
+
+    async def execute(self, sql, *args):
+        self.calls.append(("execute", sql, args))
+
+    async def fetch(self, sql, *args):
+        self.calls.append(("fetch", sql, args))
+        return self.fetch_rows
+
+    async def fetchrow(self, sql, *args):
+        self.calls.append(("fetchrow", sql, args))
+        return {"same_as_id": 1, "source_entity_id": args[0], "target_entity_id": args[1]}
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *a):
+                return False
+        return _Ctx()
+
+
+class _Registry(SameAsMixin):
+    def __init__(self, conn):
+        self.pool = _Pool(conn)
+
+    async def _log_change(self, *a, **kw):
+        pass
+
+
+def _roots(**canonical):
+    return [{"entity_id": e, "canonical_id": c} for e, c in canonical.items()]
+
+
+async def test_create_points_the_source_tree_at_the_target_root():
+    conn = _Conn(_roots(a="a", b="c"))
+    await _Registry(conn).create_same_as("a", "b")
+
+    sqls = [sql for _, sql, _ in conn.calls]
+    assert "pg_advisory_xact_lock" in sqls[0]
+    assert sum("FROM entity e" in s for s in sqls) == 1
+    assert not any("LIMIT 1" in s for s in sqls)
+    (_, update, args), = [c for c in conn.calls if "UPDATE entity_canonical" in c[1]]
+    assert args == ("c", "a")
+    (_, insert, args), = [c for c in conn.calls if "INSERT INTO entity_canonical" in c[1]]
+    assert args == ("a", "c")
+
+
+async def test_cycle_is_rejected_from_the_roots():
+    conn = _Conn(_roots(a="a", b="a"))
+    with pytest.raises(ValueError, match="would create a cycle"):
+        await _Registry(conn).create_same_as("a", "b")
+    assert not any(kind == "fetchrow" for kind, _, _ in conn.calls)
+
+
+async def test_merged_source_is_rejected():
+    conn = _Conn(_roots(a="x", b="b"))
+    with pytest.raises(ValueError, match="already merged"):
+        await _Registry(conn).create_same_as("a", "b")
+
+
+async def test_resolve_entities_is_one_query():
+    conn = _Conn(_roots(a="c", c="c"))
+    resolved = await _Registry(conn).resolve_entities(["a", "c", "a", "missing"])
+    assert resolved == {"a": "c", "c": "c"}
+    (_, sql, args), = conn.calls
+    assert "entity_canonical" in sql and args == (["a", "c", "missing"],)
+    assert await _Registry(_Conn()).resolve_entities([]) == {}
+
+
+def test_rows_sql_scope():
+    assert "$1" in canonical_rows_sql(scoped=True)
+    assert "$1" not in canonical_rows_sql(scoped=False)
@@ -0,0 +1,128 @@
+"""Coalesced, sequenced entity-graph NOTIFY payloads.
+
+Pins the two halves of the contract: the sender packs any number of URIs
+into payloads that stay under PostgreSQL's NOTIFY limit with consecutive
+per-space sequence numbers, and the listener applies each payload with one
+count flush, skips its own, and flushes the space when a sequence number
+is skipped.
+"""
+
+import json
+
+from vitalgraph.signal.entity_graph_invalidation import (
+    MAX_NOTIFY_PAYLOAD_BYTES, EntityGraphInvalidator, build_payloads,
+)
+from vitalgraph.signal.signal_manager import CHANNEL_ENTITY_GRAPH, SignalManager
+
+HEADER = {"type": "updated", "space_id": "sp", "graph_id": "g", "origin": "w"}
+
+
+class _Cache:
+    def __init__(self):
+        self.calls = []
+
+    def invalidate(self, *key):
+        self.calls.append(("entity",) + key)
+
+    def invalidate_graph(self, *key):
+        self.calls.append(("graph",) + key)
+
+    def invalidate_space(self, space_id):
+        self.calls.append(("space", space_id))
+
+
+def _uris(n):
+    return [f"http://example.org/entity/{i:06d}" for i in range(n)]
+
+
+def test_payloads_fit_the_notify_limit_and_cover_every_uri():
+    uris = _uris(5000)
+    payloads = build_payloads(HEADER, uris + uris[:10])
+    assert 1 < len(payloads) < 100
+    for p in payloads:
+        p["seq"] = 10 ** 12
+        assert len(json.dumps(p, separators=(",", ":")).encode()) < MAX_NOTIFY_PAYLOAD_BYTES
+    assert [u for p in payloads for u in p["entity_uris"]] == uris
+
+
+def test_oversized_uri_degrades_to_graph_wide():
+    (p,) = build_payloads(HEADER, ["http://x/" + "a" * 9000])
+    assert p["entity_uris"] == []
+
+
+async def test_sender_stamps_consecutive_sequence_per_space():
+    sm = SignalManager.__new__(SignalManager)
+    sm.origin, sm._entity_graph_seq = "w", {}
+    sm.entity_graph_payloads_sent = sm.entity_graph_entities_sent = 0
+    sent = []
+
+    async def _send(channel, payload):
+        sent.append((channel, json.loads(payload)))
+    sm._send_notification = _send
+
+    await sm.notify_entity_graphs_changed("sp", "g", _uris(2000))
+    await sm.notify_entity_graph_changed("sp", "g", "http://example.org/entity/x")
+    assert {c for c, _ in sent} == {CHANNEL_ENTITY_GRAPH}
+    assert [p["seq"] for _, p in sent] == list(range(1, len(sent) + 1))
+    assert sm.entity_graph_entities_sent == 2001
+
+
+def test_listener_flushes_counts_once_per_payload():
+    ec, cc = _Cache(), _Cache()
+    inv = EntityGraphInvalidator(ec, cc, origin="me")
+    inv.apply({**HEADER, "seq": 1, "entity_uris": ["a", "b", "c"]})
+    assert ec.calls == [("entity", "sp", "g", u) for u in "abc"]
+    assert cc.calls == [("graph", "sp", "g")]
+
+
+def test_listener_skips_own_payloads_and_applies_legacy_ones():
+    ec, cc = _Cache(), _Cache()
+    inv = EntityGraphInvalidator(ec, cc, origin="w")
+    inv.apply({**HEADER, "seq": 1, "entity_uris": ["a"]})
+    assert ec.calls == [] and inv.own_skipped == 1
+    inv.apply({"type": "updated", "space_id": "sp", "graph_id": "g", "entity_uri": "a"})
+    assert ec.calls == [("entity", "sp", "g", "a")]
+
+
+def test_sequence_gap_flushes_the_space():
+    ec, cc = _Cache(), _Cache()
+    inv = EntityGraphInvalidator(ec, cc, origin="me")
+    inv.apply({**HEADER, "seq": 4, "entity_uris": ["a"]})
+    inv.apply({**HEADER, "seq": 6, "entity_uris": ["b"]})
+    assert inv.gaps == 1
+    assert ec.calls[-1] == ("space", "sp") and cc.calls[-1] == ("space", "sp")
+    inv.apply({**HEADER, "seq": 7, "entity_uris": ["c"]})
+    assert inv.gaps == 1 and ec.calls[-1] == ("entity", "sp", "g", "c")
+
+
+async def test_backend_quad_writes_notify_peers_graph_wide():
+    from vitalgraph.db.sparql_sql.sparql_sql_space_impl import SparqlSQLSpaceImpl
+    sent = []
+
+    class _SM:
+        async def notify_entity_graphs_changed(self, space_id, graph_id, uris):
+            sent.append((space_id, graph_id, list(uris)))
+
+    impl = SparqlSQLSpaceImpl({})
+    impl.set_signal_manager(_SM())
+    await impl._invalidate_counts_for_quads(
+        "sp", [("s1", "p", "o", "urn:g1"), ("s2", "p", "o", "urn:g1"),
+               ("s3", "p", "o", "urn:g2")])
+    assert sorted(sent) == [("sp", "urn:g1", []), ("sp", "urn:g2", [])]
+
+
+def test_written_graphs_of_an_update():
+    from vitalgraph.db.jena_sparql.jena_types import (
+        LiteralNode, QuadPattern, URINode, VarNode,
+        UpdateClear, UpdateDataInsert, UpdateMove,
+    )
+    from vitalgraph.db.sparql_sql.sparql_sql_space_impl import (
+        _written_graphs_from_update_ops,
+    )
+    quad = dict(subject=URINode("urn:s"), predicate=URINode("urn:p"),
+                object=LiteralNode("o"))
+    ops = [UpdateDataInsert(quads=[QuadPattern(graph=URINode("urn:a"), **quad),
+                                   QuadPattern(graph=VarNode("g"), **quad)]),
+           UpdateClear(graph="urn:b", target="urn:b"),
+           UpdateMove(source="urn:c", dest="DEFAULT")]
+    assert _written_graphs_from_update_ops(ops) == {"urn:a", "urn:b", "urn:c"}
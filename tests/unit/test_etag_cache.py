@@ -0,0 +1,236 @@
+"""Conditional reads — content ETags, If-None-Match evaluation
+and the validator cache's invalidation, including by every type, frame,
+slot and triple write route. The client half is covered in
+test_client_retry.py.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from vitalgraph.cache.count_cache import _count_cache
+from vitalgraph.cache.etag_cache import (
+    ETagCache, _etag_cache, compute_etag, conditional, etag_matches,
+)
+
+
+QUADS = [
+    {"s": "<urn:e1>", "p": "<urn:name>", "o": '"one"', "g": "<urn:g>"},
+    {"s": "<urn:e1>", "p": "<urn:type>", "o": "<urn:T>", "g": "<urn:g>"},
+]
+
+
+def test_compute_etag_is_content_derived():
+    etag = compute_etag("entity", QUADS)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert compute_etag("entity", list(reversed(QUADS))) == etag
+    assert compute_etag("graph", QUADS) != etag
+    changed = [dict(QUADS[0], o='"uno"'), QUADS[1]]
+    assert compute_etag("entity", changed) != etag
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"x", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"a"', None)
+
+
+def test_validators_follow_count_cache_invalidation():
+    _etag_cache.put("sp", "urn:g", "urn:e1", "entity", '"v1"')
+    _etag_cache.put("sp", "urn:h", "urn:e2", "entity", '"v2"')
+    _count_cache.invalidate_graph("sp", "urn:g")
+    assert _etag_cache.get("sp", "urn:g", "urn:e1", "entity") is None
+    assert _etag_cache.get("sp", "urn:h", "urn:e2", "entity") == '"v2"'
+    _count_cache.invalidate_space("sp")
+    assert _etag_cache.get("sp", "urn:h", "urn:e2", "entity") is None
+
+
+def test_etag_cache_bounds_and_per_uri_invalidation():
+    cache = ETagCache(max_entries=2)
+    cache.put("sp", "g", "urn:a", "entity", '"a"')
+    cache.put("sp", "g", "urn:a", "graph", '"ag"')
+    cache.put("sp", "g", "urn:b", "entity", '"b"')
+    assert cache.get("sp", "g", "urn:a", "entity") is None
+    cache.invalidate("sp", "g", "urn:a")
+    assert cache.stats["entries"] == 1
+
+
+class _Headers(dict):
+    @property
+    def headers(self):
+        return self
+
+
+def test_conditional_sets_etag_or_answers_304():
+    response = _Headers()
+    etag, not_modified = conditional("sp", "urn:g", "urn:e1", "entity", QUADS, None, response)
+    assert not_modified is None and response["ETag"] == etag
+    assert _etag_cache.get("sp", "urn:g", "urn:e1", "entity") == etag
+
+    _, not_modified = conditional("sp", "urn:g", "urn:e1", "entity", QUADS, etag, _Headers())
+    assert not_modified.status_code == 304
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.body == b""
+
+
+# ---------------------------------------------------------------------------
+# Write routes invalidate the validators they can make stale
+# ---------------------------------------------------------------------------
+
+class _SignalManager:
+    def __init__(self):
+        self.sent = []
+
+    async def notify_entity_graphs_changed(self, space_id, graph_id, entity_uris, signal_type):
+        self.sent.append((space_id, graph_id, list(entity_uris), signal_type))
+
+
+class _Backend:
+    def __init__(self):
+        self.signals = _SignalManager()
+
+    def get_signal_manager(self):
+        return self.signals
+
+    async def execute_sparql_query(self, space_id, query):
+        return {"results": {"bindings": []}}
+
+
+class _SpaceManager:
+    def __init__(self):
+        self.backend = _Backend()
+
+    async def get_space_or_load(self, space_id):
+        return SimpleNamespace(space_impl=SimpleNamespace(get_db_space_impl=lambda: self.backend))
+
+
+def _admin():
+    return {"username": "admin", "role": "admin"}
+
+
+def test_invalidate_graph_caches_is_local_and_notified():
+    import asyncio
+    from vitalgraph.signal.entity_graph_invalidation import invalidate_graph_caches
+
+    sm = _SpaceManager()
+    _etag_cache.put("sp", "urn:g", "urn:e1", "entity", '"v1"')
+    asyncio.run(invalidate_graph_caches(sm, "sp", "urn:g", "deleted"))
+    assert _etag_cache.get("sp", "urn:g", "urn:e1", "entity") is None
+    assert sm.backend.signals.sent == [("sp", "urn:g", [], "deleted")]
+
+
+QUAD_BODY = {"quads": [{"s": "<urn:x>", "p": "<urn:p>", "o": '"v"', "g": "<urn:g>"}]}
+
+# (write method patched to "succeed", HTTP method, path, query, JSON body)
+TYPE_WRITES = [
+    ("_create_kgtypes", "POST", "/kgtypes", {}, QUAD_BODY),
+    ("_update_kgtypes", "PUT", "/kgtypes", {}, QUAD_BODY),
+    ("_delete_kgtypes", "DELETE", "/kgtypes", {"uri": "urn:t1"}, None),
+    ("_create_type_relationship", "POST", "/kgtypes/relationships", {"id": "urn:t1"},
+     {"edge_type": "urn:Edge", "target_uri": "urn:t2"}),
+    ("_delete_type_relationship", "DELETE", "/kgtypes/relationships",
+     {"id": "urn:t1", "edge_uri": "urn:e"}, None),
+    ("_update_type_documentation", "PUT", "/kgtypes/documentation", {"id": "urn:t1"},
+     {"content": "# T1"}),
+    ("_delete_type_documentation", "DELETE", "/kgtypes/documentation", {"id": "urn:t1"}, None),
+]
+
+FRAME_WRITES = [
+    ("_create_frames", "POST", "/kgframes", {}, QUAD_BODY),
+    ("_create_frames", "POST", "/kgframes", {"operation_mode": "update"}, QUAD_BODY),
+    ("_delete_frame_by_uri", "DELETE", "/kgframes", {"uri": "urn:f1"}, None),
+    ("_delete_frames_by_uris", "DELETE", "/kgframes", {"uri_list": "urn:f1,urn:f2"}, None),
+    ("_create_frame_slots", "POST", "/kgframes/kgslots", {"frame_uri": "urn:f1"}, QUAD_BODY),
+    ("_update_frame_slots", "POST", "/kgframes/kgslots",
+     {"frame_uri": "urn:f1", "operation_mode": "update"}, QUAD_BODY),
+    ("_delete_frame_slots", "DELETE", "/kgframes/kgslots",
+     {"frame_uri": "urn:f1", "slot_uris": "urn:s1"}, None),
+]
+
+TRIPLE_WRITES = [
+    ("_add_triples", "POST", "/triples", {}, QUAD_BODY),
+    ("_delete_triples", "DELETE", "/triples", {}, QUAD_BODY),
+]
+
+
+def _client(*endpoints):
+    app = FastAPI()
+    for endpoint in endpoints:
+        app.include_router(endpoint.router, prefix="/api/graphs")
+    return TestClient(app)
+
+
+def _write(client, endpoint, name, method, path, params, body, base):
+    async def _done(*args, **kwargs):
+        return JSONResponse({"success": True})
+    setattr(endpoint, name, _done)
+    r = client.request(method, f"/api/graphs{path}", params={**base, **params}, json=body)
+    assert r.status_code == 200, r.text
+
+
+def _revalidate_after(client, get_params, key, write):
+    _etag_cache.put(*key, '"v1"')
+    headers = {"If-None-Match": '"v1"'}
+    assert client.get("/api/graphs" + get_params[0], params=get_params[1],
+                      headers=headers).status_code == 304
+    write()
+    r = client.get("/api/graphs" + get_params[0], params=get_params[1], headers=headers)
+    assert r.status_code == 200, r.text
+
+
+@pytest.mark.parametrize("write", TYPE_WRITES, ids=lambda w: f"{w[1]} {w[2]} {w[0]}")
+def test_type_writes_end_type_revalidation(write):
+    pytest.importorskip("vital_ai_vitalsigns")
+    from vitalgraph.endpoint.kgtypes_endpoint import KGTypesEndpoint
+
+    endpoint = KGTypesEndpoint(_SpaceManager(), _admin)
+
+    async def _missing(**kwargs):
+        return None
+    endpoint.kgtypes_read_processor.get_kgtype_by_uri = _missing
+    client = _client(endpoint)
+    graph = KGTypesEndpoint._types_graph("sp")
+    _revalidate_after(
+        client, ("/kgtypes", {"space_id": "sp", "uri": "urn:t1"}),
+        ("sp", graph, "urn:t1", "type"),
+        lambda: _write(client, endpoint, *write, base={"space_id": "sp"}))
+
+
+@pytest.mark.parametrize("write", FRAME_WRITES + TRIPLE_WRITES,
+                         ids=lambda w: f"{w[1]} {w[2]} {w[0]}")
+def test_frame_and_triple_writes_end_frame_revalidation(write):
+    pytest.importorskip("vital_ai_vitalsigns")
+    from vitalgraph.endpoint.kgframes_endpoint import KGFramesEndpoint
+    from vitalgraph.endpoint.triples_endpoint import TriplesEndpoint
+
+    space_manager = _SpaceManager()
+    frames = KGFramesEndpoint(space_manager, _admin)
+    triples = TriplesEndpoint(space_manager, _admin)
+    client = _client(frames, triples)
+    target = frames if write in FRAME_WRITES else triples
+    base = {"space_id": "sp", "graph_id": "urn:g"}
+    _revalidate_after(
+        client, ("/kgframes", dict(base, uri="urn:f1")),
+        ("sp", "urn:g", "urn:f1", "frame"),
+        lambda: _write(client, target, *write, base=base))
+    assert space_manager.backend.signals.sent[-1][:3] == ("sp", "urn:g", [])
+
+
+def test_triple_writes_drop_the_graphs_validators():
+    from vitalgraph.endpoint.triples_endpoint import TriplesEndpoint
+
+    for write in TRIPLE_WRITES:
+        space_manager = _SpaceManager()
+        endpoint = TriplesEndpoint(space_manager, _admin)
+        _etag_cache.put("sp", "urn:g", "urn:e1", "entity", '"v1"')
+        _write(_client(endpoint), endpoint, *write, base={"space_id": "sp", "graph_id": "urn:g"})
+        assert _etag_cache.get("sp", "urn:g", "urn:e1", "entity") is None
+        signal = "updated" if write[1] == "POST" else "deleted"
+        assert space_manager.backend.signals.sent == [("sp", "urn:g", [], signal)]
@@ -0,0 +1,124 @@
+"""In-process latency histograms and the /metrics exposition.
+
+Buckets are cumulative at render time, label sets are capped, the output
+is valid OpenMetrics text, and the HTTP middleware observes every request
+whether or not the PostgreSQL collector is attached.
+"""
+
+import re
+
+import pytest
+
+from vitalgraph.metrics import histograms
+from vitalgraph.metrics.histograms import (
+    DEFAULT_BUCKETS, MetricsRegistry, observe_sparql_timing, status_class,
+)
+
+
+def _samples(text, name):
+    out = {}
+    for line in text.splitlines():
+        if line.startswith(name):
+            key, value = line.rsplit(" ", 1)
+            out[key] = float(value)
+    return out
+
+
+def test_buckets_are_cumulative_with_count_and_sum():
+    reg = MetricsRegistry()
+    h = reg.histogram("t_seconds", "test", ("op",))
+    for s in (0.0002, 0.003, 0.003, 7.0, 500.0):
+        h.labels("a").observe(s)
+    text = reg.render()
+    s = _samples(text, "t_seconds")
+    assert s['t_seconds_bucket{op="a",le="0.00025"}'] == 1
+    assert s['t_seconds_bucket{op="a",le="0.005"}'] == 3
+    assert s['t_seconds_bucket{op="a",le="10"}'] == 4
+    assert s['t_seconds_bucket{op="a",le="+Inf"}'] == 5
+    assert s['t_seconds_count{op="a"}'] == 5
+    assert abs(s['t_seconds_sum{op="a"}'] - 507.0062) < 1e-9
+    # One line per bound plus +Inf, count and sum.
+    assert len(s) == len(DEFAULT_BUCKETS) + 3
+
+
+def test_render_is_openmetrics():
+    reg = MetricsRegistry()
+    reg.counter("t_calls", "calls", ("who",)).labels('say "hi"').inc(2)
+    reg.register_collector(lambda: [("t_gauge", "gauge", "g", [({"k": "v"}, 0.5)])])
+    reg.register_collector(lambda: 1 / 0)  # a broken collector is skipped
+    text = reg.render()
+    assert text.endswith("# EOF\n")
+    assert "# TYPE t_calls counter" in text
+    assert 't_calls_total{who="say \\"hi\\""} 2' in text
+    assert 't_gauge{k="v"} 0.5' in text
+    for line in text.splitlines():
+        assert line.startswith("#") or re.match(r"^[a-z_]+(\{.*\})? \S+$", line), line
+
+
+def test_label_sets_are_capped(monkeypatch):
+    monkeypatch.setattr(histograms, "MAX_SERIES", 3)
+    reg = MetricsRegistry()
+    h = reg.histogram("t_seconds", "test", ("path",))
+    for i in range(10):
+        h.labels(f"/p/{i}").observe(0.01)
+    assert len(h._children) == 4
+    assert h.labels("other").count == 7
+    assert h.overflowed == 7
+
+
+def test_metric_kinds_must_implement_child_and_render():
+    with pytest.raises(TypeError):
+        histograms._Metric("t_total", "test")
+
+    class Partial(histograms._Metric):
+        def _new_child(self):
+            return object()
+
+    with pytest.raises(TypeError):
+        Partial("t_total", "test")
+
+
+def test_sparql_timing_feeds_stage_and_acquire_histograms():
+    before = histograms.pool_acquire_seconds.labels("sparql_query").count
+    observe_sparql_timing({"acquire_ms": 2.0, "exec_ms": 40.0, "total_ms": 45.0, "rows": 3})
+    assert histograms.pool_acquire_seconds.labels("sparql_query").count == before + 1
+    assert histograms.sparql_stage_seconds.labels("exec").count >= 1
+    assert ("rows",) not in histograms.sparql_stage_seconds._children
+
+
+def test_status_class():
+    assert status_class(200) == "2xx" and status_class(404) == "4xx" and status_class(503) == "5xx"
+
+
+async def test_middleware_observes_without_collector():
+    from types import SimpleNamespace
+    from vitalgraph.metrics.metrics_middleware import MetricsMiddleware
+
+    child = histograms.http_request_seconds.labels("sparql_query", "GET", "2xx")
+    before = child.count
+    request = SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace()),
+        url=SimpleNamespace(path="/api/graphs/sparql/query"),
+        method="GET",
+        query_params={"space_id": "sp"},
+    )
+
+    async def call_next(_):
+        return SimpleNamespace(status_code=200)
+
+    mw = MetricsMiddleware(app=None)
+    await mw.dispatch(request, call_next)
+    assert child.count == before + 1
+
+
+def test_cache_collector_reports_hit_ratio():
+    from vitalgraph.cache.count_cache import _count_cache
+    from vitalgraph.endpoint.openmetrics_endpoint import collect_caches
+
+    _count_cache.get("sp", "g", "missing-hash")
+    families = {name: samples for name, _, _, samples in collect_caches()}
+    count = {labels["cache"]: value for labels, value in families["vitalgraph_cache_misses"]}
+    assert count["count"] >= 1
+    ratios = dict((labels["cache"], v) for labels, v in families["vitalgraph_cache_hit_ratio"])
+    assert 0.0 <= ratios["count"] <= 1.0
+    assert {"count", "entity_graph"} <= set(ratios)
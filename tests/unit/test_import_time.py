@@ -0,0 +1,90 @@
+"""Import-time budgets for the client and CLI entry points.
+
+Each entry module is imported in a fresh interpreter under
+``python -X importtime``. Two things are checked: that none of the heavy
+stacks (VitalSigns and the domain ontology, rdflib, pyoxigraph, the
+server implementation, pydantic models, the endpoint modules) is loaded
+just by importing it, and that its cumulative import time stays under a
+budget. The module check is the precise one; the time budget is generous
+and scales with ``VITALGRAPH_IMPORT_BUDGET_SCALE`` for slow CI machines.
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.unit
+
+HEAVY = (
+    "vital_ai_vitalsigns", "ai_haley_kg_domain", "rdflib", "pyoxigraph",
+    "fastapi", "asyncpg", "pydantic",
+    "vitalgraph.impl", "vitalgraph.db", "vitalgraph.endpoint",
+    "vitalgraph.client.endpoint", "vitalgraph.model",
+)
+
+SCALE = float(os.environ.get("VITALGRAPH_IMPORT_BUDGET_SCALE", "1"))
+
+# (entry module, budget in seconds, third-party modules it needs to import at all)
+ENTRY_POINTS = [
+    ("vitalgraph.client.vitalgraph_client", 0.5, ()),
+    ("vitalgraph.client.client_factory", 0.5, ()),
+    ("vitalgraph.client.cmd.vitalgraph_repl", 1.0, ("prompt_toolkit",)),
+    ("vitalgraph.cmd.vitalgraph_import_cmd", 0.5, ()),
+    ("vitalgraph.cmd.vitalgraph_export_cmd", 0.5, ()),
+    ("vitalgraph.cmd.vitalgraphdb_cmd", 0.5, ()),
+    ("vitalgraph.admin_cmd.vitalgraphdb_admin_cmd", 1.0,
+     ("click", "click_repl", "prompt_toolkit", "tabulate")),
+    ("vitalgraph.agent_registry_cmd.vitalgraph_agent_registry_cmd", 1.0, ("prompt_toolkit",)),
+    ("vitalgraph.entity_registry_cmd.vitalgraph_entity_registry_cmd", 1.0, ("prompt_toolkit",)),
+]
+
+_PROBE = """
+import json, sys, {module}
+heavy = {heavy!r}
+print(json.dumps(sorted({{h for m in sys.modules for h in heavy if m == h or m.startswith(h + ".")}})))
+"""
+
+
+def _import(module):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True, timeout=120,
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cumulative = None
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and line.rsplit("|", 1)[-1].strip() == module:
+            cumulative = int(line.split("|")[1]) / 1e6
+    return json.loads(proc.stdout.strip().splitlines()[-1]), cumulative
+
+
+@pytest.mark.parametrize("module,budget,requires", ENTRY_POINTS,
+                         ids=[m.rsplit(".", 1)[-1] for m, _, _ in ENTRY_POINTS])
+def test_entry_point_imports_light(module, budget, requires):
+    for dep in requires:
+        if importlib.util.find_spec(dep) is None:
+            pytest.skip(f"{dep} not installed")
+    loaded, seconds = _import(module)
+    assert loaded == [], f"{module} imports heavy modules at startup: {loaded}"
+    assert seconds is not None
+    assert seconds < budget * SCALE, f"{module} took {seconds:.3f}s to import (budget {budget}s)"
+
+
+def test_endpoints_load_on_first_use():
+    from vitalgraph.client.config.client_config_loader import VitalGraphClientConfig
+    from vitalgraph.client.vitalgraph_client import VitalGraphClient
+
+    client = VitalGraphClient(config=VitalGraphClientConfig())
+    assert "changes" not in vars(client)
+    changes = client.changes
+    assert type(changes).__name__ == "ChangesClientEndpoint" and changes.client is client
+    assert client.changes is changes  # built once, then a plain attribute
+
+    fake = object()
+    client.kgentities = fake  # tests substitute endpoints by assignment
+    assert client.kgentities is fake
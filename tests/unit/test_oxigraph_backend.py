@@ -0,0 +1,227 @@
+"""Embedded Oxigraph backend — no PostgreSQL, no Fuseki.
+
+Runs the backend on in-memory stores and, for persistence, on RocksDB
+stores under tmp_path: space lifecycle, batch writes, the SPARQL-JSON
+binding shape the KG adapter consumes, atomic update_quads, the native
+bulk loader and in-process signals — and the KG adapter the endpoints
+reach the backend through.
+"""
+
+import pytest
+from rdflib import Literal, URIRef
+
+pytest.importorskip("pyoxigraph")
+
+from vitalgraph.db.backend_config import BackendConfig, BackendFactory, BackendType
+from vitalgraph.db.oxigraph.oxigraph_signal_impl import OxigraphSignalManager
+from vitalgraph.db.oxigraph.oxigraph_space_impl import OxigraphSpaceImpl
+from vitalgraph.signal.signal_manager import CHANNEL_GRAPH, CHANNEL_SPACES
+
+pytestmark = pytest.mark.unit
+
+G = URIRef("urn:test:graph")
+S = URIRef("urn:test:s")
+NAME = URIRef("http://vital.ai/ontology/vital-core#hasName")
+COUNT = URIRef("urn:test:count")
+
+
+@pytest.fixture
+async def backend():
+    b = OxigraphSpaceImpl()
+    assert await b.connect()
+    assert await b.create_space_storage("sp1")
+    yield b
+    await b.close()
+
+
+async def _all_quads(b, space_id="sp1"):
+    return {q async for q in b.quads(space_id, (None, None, None, None))}
+
+
+async def test_space_lifecycle(backend):
+    await backend.create_space_metadata("sp1", {"space_name": "Space One",
+                                                "space_description": "d", "tenant": "t1"})
+    spaces = await backend.list_spaces()
+    assert [(s["space_id"], s["space_name"], s["tenant"]) for s in spaces] == [("sp1", "Space One", "t1")]
+    assert await backend.space_exists("sp1")
+
+    assert await backend.delete_space_storage("sp1")
+    assert not await backend.space_exists("sp1")
+    assert await backend.list_spaces() == []
+    with pytest.raises(ValueError):
+        backend.get_store("sp1")
+
+
+async def test_space_id_cannot_escape_store_path(tmp_path):
+    b = OxigraphSpaceImpl(store_path=str(tmp_path))
+    await b.connect()
+    assert not await b.create_space_storage("../outside")
+    assert not (tmp_path.parent / "outside").exists()
+    await b.close()
+
+
+async def test_batch_add_remove_and_typed_round_trip(backend):
+    quads = [(S, NAME, Literal("alpha"), G), (S, COUNT, Literal(3), G),
+             (S, NAME, Literal("bonjour", lang="fr"), G)]
+    assert await backend.add_rdf_quads_batch("sp1", quads) == 3
+    assert await backend.add_rdf_quads_batch("sp1", quads[:1]) == 1  # idempotent
+    assert await backend.get_rdf_quad_count("sp1") == 3
+    assert await backend.get_rdf_quad_count("sp1", str(G)) == 3
+    assert await _all_quads(backend) == set(quads)
+
+    assert await backend.remove_rdf_quads_batch("sp1", quads[:2] + [(S, NAME, Literal("gone"), G)]) == 2
+    assert await _all_quads(backend) == {quads[2]}
+
+
+async def test_bulk_path_above_threshold():
+    b = OxigraphSpaceImpl(bulk_threshold=10)
+    await b.connect()
+    await b.create_space_storage("sp1")
+    quads = [(URIRef(f"urn:test:s{i}"), NAME, Literal(f"n{i}"), G) for i in range(25)]
+    assert await b.add_rdf_quads_batch("sp1", quads) == 25
+    assert await b.get_rdf_quad_count("sp1") == 25
+    await b.close()
+
+
+async def test_select_and_ask_shape(backend):
+    await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("alpha"), G),
+                                              (S, COUNT, Literal(3), G)])
+    bindings = await backend.query_quads(
+        "sp1", f"SELECT ?p ?o WHERE {{ GRAPH <{G}> {{ <{S}> ?p ?o }} }} ORDER BY ?p")
+    assert bindings == [
+        {"p": {"type": "uri", "value": str(NAME)}, "o": {"type": "literal", "value": "alpha"}},
+        {"p": {"type": "uri", "value": str(COUNT)},
+         "o": {"type": "literal", "value": "3",
+               "datatype": "http://www.w3.org/2001/XMLSchema#integer"}},
+    ]
+    # Default graph is the union of named graphs, as on the Fuseki datasets
+    ask = await backend.query_quads("sp1", f"ASK {{ <{S}> ?p ?o }}")
+    assert ask["boolean"] is True
+
+
+async def test_failed_query_raises_not_empty(backend):
+    result = await backend.execute_sparql_query("sp1", "SELECT WHERE {")
+    assert result["success"] is False
+    with pytest.raises(RuntimeError):
+        await backend.query_quads("sp1", "SELECT WHERE {")
+
+
+async def test_update_quads_is_one_transaction(backend):
+    await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("old"), G)])
+    assert await backend.update_quads("sp1", str(G), [(S, NAME, Literal("old"), G)],
+                                      [(S, NAME, Literal("new"), G)])
+    assert await _all_quads(backend) == {(S, NAME, Literal("new"), G)}
+
+    # A bad insert must leave the delete unapplied
+    bad = (S, URIRef("not a valid iri"), Literal("x"), G)
+    assert not await backend.update_quads("sp1", str(G), [(S, NAME, Literal("new"), G)], [bad])
+    assert await _all_quads(backend) == {(S, NAME, Literal("new"), G)}
+
+
+async def test_sparql_update(backend):
+    assert await backend.execute_sparql_update(
+        "sp1", f'INSERT DATA {{ GRAPH <{G}> {{ <{S}> <{NAME}> "via update" }} }}')
+    assert await _all_quads(backend) == {(S, NAME, Literal("via update"), G)}
+
+
+async def test_bulk_load_into_graph(backend):
+    data = "".join(f'<urn:test:s{i}> <{NAME}> "n{i}" .\n' for i in range(100))
+    result = await backend.bulk_load("sp1", data.encode(), format="nt", graph_uri=str(G))
+    assert result["success"] and result["quads"] == 100
+    assert await backend.get_rdf_quad_count("sp1", str(G)) == 100
+
+    failed = await backend.bulk_load("sp1", b"not rdf", format="nt")
+    assert failed["success"] is False
+
+
+@pytest.fixture
+def adapter(backend):
+    pytest.importorskip("vital_ai_vitalsigns")
+    from vitalgraph.kg_impl.kg_backend_utils import (
+        OxigraphBackendAdapter, create_backend_adapter,
+    )
+    adapter = create_backend_adapter(backend)
+    assert isinstance(adapter, OxigraphBackendAdapter)
+    return adapter
+
+
+async def test_adapter_update_quads_is_one_transaction(backend, adapter):
+    await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("old"), G)])
+    assert await adapter.update_quads("sp1", str(G), [(S, NAME, Literal("old"), G)],
+                                      [(S, NAME, Literal("new"), G)])
+    assert await _all_quads(backend) == {(S, NAME, Literal("new"), G)}
+
+    bad = (S, URIRef("not a valid iri"), Literal("x"), G)
+    assert not await adapter.update_quads("sp1", str(G), [(S, NAME, Literal("new"), G)], [bad])
+    assert await _all_quads(backend) == {(S, NAME, Literal("new"), G)}
+
+
+async def test_adapter_removes_a_quad_batch(backend, adapter):
+    keep, drop = (S, NAME, Literal("a"), G), (S, COUNT, Literal(1), G)
+    await backend.add_rdf_quads_batch("sp1", [keep, drop])
+    assert await adapter.remove_rdf_quads_batch("sp1", [drop]) == 1
+    assert await _all_quads(backend) == {keep}
+    # A failure is reported as nothing removed, not raised.
+    assert await adapter.remove_rdf_quads_batch("missing", [keep]) == 0
+
+
+async def test_adapter_reads_objects_in_uri_order(backend, adapter, monkeypatch):
+    other = URIRef("urn:test:other")
+    await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("s"), G),
+                                              (other, NAME, Literal("o"), G)])
+
+    async def as_triples(triples):
+        return list(triples)
+    monkeypatch.setattr(adapter, "_triples_to_vitalsigns", as_triples)
+
+    triples = await adapter.get_objects_by_uris("sp1", [str(other), str(S)], str(G))
+    assert triples == [(other, NAME, Literal("o")), (S, NAME, Literal("s"))]
+    assert await adapter.get_objects_by_uris("sp1", [str(S)]) == []
+    assert await adapter.get_objects_by_uris("sp1", [], str(G)) == []
+
+
+async def test_signals_are_delivered_in_process(backend):
+    seen = []
+    backend.signal_manager.register_callback(CHANNEL_GRAPH, seen.append)
+    backend.signal_manager.register_callback(CHANNEL_SPACES, seen.append)
+    await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("a"), G)])
+    await backend.create_space_storage("sp2")
+    await backend.signal_manager.bus.drain()
+
+    assert {"type": "updated", "graph_uri": str(G), "space_id": "sp1"}.items() <= seen[0].items()
+    assert seen[1]["type"] == "created"
+
+
+async def test_failing_listener_does_not_fail_the_write(backend):
+    def boom(data):
+        raise RuntimeError("listener bug")
+    backend.signal_manager.register_callback(CHANNEL_GRAPH, boom)
+    assert await backend.add_rdf_quads_batch("sp1", [(S, NAME, Literal("a"), G)]) == 1
+    await backend.signal_manager.bus.drain()
+
+
+async def test_persistence_across_reopen(tmp_path):
+    b = OxigraphSpaceImpl(store_path=str(tmp_path))
+    await b.connect()
+    await b.create_space_storage("sp1")
+    await b.create_space_metadata("sp1", {"space_name": "Kept"})
+    await b.add_namespace("sp1", "ex", "http://example.org/")
+    await b.add_rdf_quads_batch("sp1", [(S, NAME, Literal("kept"), G)])
+    await b.close()
+
+    b = OxigraphSpaceImpl(store_path=str(tmp_path))
+    assert await b.connect()
+    assert [s["space_name"] for s in await b.list_spaces()] == ["Kept"]
+    assert await b.get_namespace_uri("sp1", "ex") == "http://example.org/"
+    assert await _all_quads(b) == {(S, NAME, Literal("kept"), G)}
+
+    assert await b.delete_space_storage("sp1")
+    assert not (tmp_path / "spaces" / "sp1").exists()
+    await b.close()
+
+
+def test_factory_builds_oxigraph_components():
+    config = BackendConfig(backend_type=BackendType.OXIGRAPH, connection_params={})
+    assert isinstance(BackendFactory.create_space_backend(config), OxigraphSpaceImpl)
+    assert isinstance(BackendFactory.create_sparql_backend(config), OxigraphSpaceImpl)
+    assert isinstance(BackendFactory.create_signal_manager(config), OxigraphSignalManager)
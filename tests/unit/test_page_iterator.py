@@ -0,0 +1,126 @@
+"""Async page iterators with prefetch — no server.
+
+A scripted listing of N rows stands in for the endpoint, so what is under
+test is the iterator: offset order whatever order pages arrive in, the
+in-flight bound, overlap with the consumer, where the walk stops (short
+page, exact total, limit), and cancellation on exit or failure.
+"""
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from vitalgraph.client.page_iterator import PageIterator
+from vitalgraph.client.utils.client_utils import VitalGraphClientError
+
+pytestmark = pytest.mark.unit
+
+
+class _Listing:
+    """``rows`` rows served page by page; records every request."""
+
+    def __init__(self, rows, kind="none", delay=0.0, jitter=False, fail_at=None):
+        self.rows = rows
+        self.kind = kind
+        self.delay = delay
+        self.jitter = jitter
+        self.fail_at = fail_at
+        self.requests = []
+        self.cancelled = 0
+        self.completed = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def fetch(self, offset, size):
+        self.requests.append((offset, size))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay * (random.random() if self.jitter else 1))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        if offset == self.fail_at:
+            return SimpleNamespace(success=False, message="store_failed", results=[])
+        page = list(range(offset, min(offset + size, self.rows)))
+        total = offset + len(page) if self.kind == "none" else self.rows
+        return SimpleNamespace(success=True, results=page, total_count=total,
+                               total_count_kind=self.kind)
+
+
+async def test_rows_come_back_in_order_with_bounded_prefetch():
+    random.seed(7)
+    listing = _Listing(95, delay=0.005, jitter=True)
+    it = PageIterator(listing.fetch, "results", page_size=10, max_in_flight=3)
+    assert [row async for row in it] == list(range(95))
+    assert listing.peak == 3
+    assert it.pages_fetched >= 10
+
+
+async def test_next_page_loads_while_the_caller_works():
+    listing = _Listing(30, delay=0.01)
+    started = []
+    async for page in PageIterator(listing.fetch, "results", page_size=10).pages():
+        started.append(len(listing.requests))
+        await asyncio.sleep(0.02)  # the caller's own work
+    assert started[0] == 2  # page 1 was already requested before page 0 was handed over
+
+
+async def test_short_page_ends_the_walk():
+    listing = _Listing(25)
+    it = PageIterator(listing.fetch, "results", page_size=10, max_in_flight=4)
+    assert await it.collect() == list(range(25))
+    # offsets 30.. were speculative; at most max_in_flight - 1 past the end
+    assert len([o for o, _ in listing.requests if o >= 30]) <= 3
+
+
+async def test_exact_total_stops_scheduling_at_the_end():
+    listing = _Listing(40, kind="exact")
+    it = PageIterator(listing.fetch, "results", page_size=10, max_in_flight=1)
+    assert len(await it.collect()) == 40
+    assert [o for o, _ in listing.requests] == [0, 10, 20, 30]
+    assert it.total_count == 40 and it.total_count_kind == "exact"
+
+
+async def test_limit_and_offset_trim_the_requests():
+    listing = _Listing(100)
+    it = PageIterator(listing.fetch, "results", page_size=10, offset=5, limit=23)
+    assert await it.collect() == list(range(5, 28))
+    assert listing.requests == [(5, 10), (15, 10), (25, 3)]
+
+
+async def test_break_cancels_outstanding_requests():
+    listing = _Listing(1000, delay=0.02)
+    gen = PageIterator(listing.fetch, "results", page_size=10, max_in_flight=3).pages()
+    async for page in gen:
+        await asyncio.sleep(0.005)
+        if page.results[0] == 10:
+            break
+    await gen.aclose()
+    requested = len(listing.requests)
+    await asyncio.sleep(0.05)
+    assert len(listing.requests) == requested  # nothing scheduled after exit
+    assert listing.in_flight == 0
+    assert listing.cancelled >= 1 and listing.completed < requested
+
+
+async def test_failed_page_raises_and_cancels_the_rest():
+    listing = _Listing(100, delay=0.001, fail_at=20)
+    seen = []
+    with pytest.raises(VitalGraphClientError, match="store_failed"):
+        async for row in PageIterator(listing.fetch, "results", page_size=10, max_in_flight=3):
+            seen.append(row)
+    assert seen == list(range(20))
+    assert listing.in_flight == 0
+
+
+def test_arguments_are_validated():
+    with pytest.raises(ValueError):
+        PageIterator(lambda o, s: None, "results", page_size=0)
+    with pytest.raises(ValueError):
+        PageIterator(lambda o, s: None, "results", max_in_flight=0)
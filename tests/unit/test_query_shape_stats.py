@@ -0,0 +1,137 @@
+"""Per-query-shape SPARQL statistics.
+
+Shapes are keyed by the compile cache's parameterized hash, windows merge
+exactly (histograms add), and a flush is one batched upsert that leaves
+unknown spaces out. Pinned here against scripted sidecar and pool objects.
+"""
+
+from vitalgraph.db.sparql_sql.compile_cache import SparqlCompileCache
+from vitalgraph.metrics.query_shape_stats import (
+    N_BUCKETS, STAGES, QueryShapeStats, percentile, summarize,
+)
+
+
+def _timing(total, rows=10):
+    t = {stage: total / 10 for stage in STAGES}
+    t.update(total_ms=total, exec_ms=total / 2, rows=rows)
+    return t
+
+
+class _Sidecar:
+    async def compile(self, sparql):
+        return {"ok": True, "sparql": sparql}
+
+
+async def test_shape_hash_ignores_iris():
+    cache = SparqlCompileCache()
+    q = "SELECT ?p ?o WHERE { GRAPH <http://g/%s> { <http://e/%s> ?p ?o } }"
+    raw_a, key_a = await cache.compile_with_key(q % ("1", "a"), _Sidecar())
+    raw_b, key_b = await cache.compile_with_key(q % ("2", "b"), _Sidecar())
+    assert key_a == key_b and len(key_a) == 64
+    assert "http://e/b" in raw_b["sparql"]
+
+
+def test_percentiles_from_the_histogram():
+    stats = QueryShapeStats()
+    for ms in [1.0] * 90 + [100.0] * 9 + [5000.0]:
+        stats.record("sp", "h", _timing(ms), "SELECT 1", "ASK {}")
+    (shape,) = summarize(stats.pending_rows())
+    total = shape["stages"]["total_ms"]
+    assert shape["calls"] == 100 and shape["rows_total"] == 1000
+    assert 1.0 <= total["p50_ms"] < 1.25
+    assert 100.0 <= total["p95_ms"] < 125.0
+    assert 100.0 <= total["p99_ms"] < 125.0
+    assert shape["worst_total_ms"] == 5000.0
+
+
+def test_windows_merge_and_keep_the_slowest_example():
+    a, b = QueryShapeStats(), QueryShapeStats()
+    a.record("sp", "h", _timing(10.0), "fast sql", "fast")
+    b.record("sp", "h", _timing(900.0), "slow sql", "slow")
+    (shape,) = summarize(a.pending_rows() + b.pending_rows())
+    assert shape["calls"] == 2 and shape["worst_sql"] == "slow sql"
+    assert shape["stages"]["total_ms"]["sum_ms"] == 910.0
+
+
+def test_shape_cap_drops_new_shapes_only():
+    stats = QueryShapeStats(max_shapes=1)
+    stats.record("sp", "h1", _timing(1.0))
+    stats.record("sp", "h2", _timing(1.0))
+    stats.record("sp", "h1", _timing(1.0))
+    assert stats.dropped == 1 and [r["calls"] for r in stats.pending_rows()] == [2]
+
+
+class _Conn:
+    def __init__(self):
+        self.batches = []
+
+    async def fetch(self, sql, *args):
+        return [{"space_id": "sp"}]
+
+    async def executemany(self, sql, records):
+        self.batches.append((sql, list(records)))
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *a):
+                return False
+        return _Ctx()
+
+
+async def test_flush_is_one_batch_for_known_spaces():
+    conn = _Conn()
+    stats = QueryShapeStats()
+    stats._pool = _Pool(conn)
+    stats.record("sp", "h1", _timing(3.0))
+    stats.record("sp", "h2", _timing(4.0))
+    stats.record("gone", "h1", _timing(5.0))
+    assert await stats.flush() == 2
+    (sql, records), = conn.batches
+    assert "ON CONFLICT (space_id, shape_hash, bucket_start)" in sql
+    assert "WITH ORDINALITY" in sql
+    assert {r[1] for r in records} == {"h1", "h2"}
+    assert all(len(r[7]) == len(STAGES) * N_BUCKETS for r in records)
+    assert stats.pending_rows() == []
+
+
+class _FailingConn(_Conn):
+    async def executemany(self, sql, records):
+        raise ConnectionError("server closed the connection")
+
+
+async def test_failed_flush_keeps_the_window():
+    conn = _FailingConn()
+    stats = QueryShapeStats()
+    stats._pool = _Pool(conn)
+    stats.record("sp", "h1", _timing(3.0), "slow sql")
+    assert await stats.flush() == 0
+    stats.record("sp", "h1", _timing(1.0), "fast sql")  # recorded after the failure
+    (row,) = stats.pending_rows()
+    assert row["calls"] == 2 and row["worst_sql"] == "slow sql"
+
+    conn = _Conn()
+    stats._pool = _Pool(conn)
+    assert await stats.flush() == 1 and conn.batches[0][1][0][3] == 2
+
+
+async def test_stop_flushes_the_last_window():
+    conn = _Conn()
+    stats = QueryShapeStats(flush_interval=3600)
+    await stats.start(_Pool(conn))
+    stats.record("sp", "h1", _timing(3.0))
+    await stats.stop()
+    assert len(conn.batches) == 1 and stats.pending_rows() == []
+
+
+def test_percentile_of_empty_histogram():
+    assert percentile([0] * N_BUCKETS, 0.5) == 0.0
@@ -0,0 +1,170 @@
+"""Response compression and the one-pass model serializer.
+
+A small FastAPI app through TestClient: the compression middleware's
+negotiation and pass-through rules, and FastModelRoute producing exactly
+the bytes FastAPI's own serialization would. Also the request side:
+Content-Encoding bodies inflated before the route reads
+them, with the 415/400/413 refusals.
+"""
+
+import gzip
+from typing import Union
+
+import pytest
+from fastapi import APIRouter, FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from vitalgraph.api.compression import (
+    CompressionMiddleware, RequestBodyDecodeError, _DecodingReceive, _GunzipDecoder,
+    negotiate_encoding,
+)
+from vitalgraph.api.fast_response import FastModelRoute
+from vitalgraph.model.quad_model import Quad, QuadResponse, QuadResultsResponse
+
+
+def _quads(n):
+    return [Quad(s=f"<urn:s{i % 5}>", p="<urn:p>", o=f'"{i}"', g="<urn:g>") for i in range(n)]
+
+
+def _routes(router: APIRouter) -> None:
+    @router.get("/quads", response_model=Union[QuadResponse, QuadResultsResponse])
+    async def quads(n: int = 3, response: Response = None):
+        response.headers["ETag"] = '"v1"'
+        return QuadResultsResponse(total_count=n, results=_quads(n))
+
+    @router.get("/page", response_model=QuadResponse)
+    async def page(n: int = 3):
+        return QuadResponse(total_count=n, page_size=n, offset=0, results=_quads(n))
+
+
+def _app(route_class=None, max_decoded_size=None) -> TestClient:
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+    _routes(router)
+    app = FastAPI()
+    app.include_router(router)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(4):
+                yield ("x" * 2000 + str(i)).encode()
+        return StreamingResponse(chunks(), media_type="application/n-quads")
+
+    @app.get("/blob")
+    async def blob():
+        return Response(b"\0" * 5000, media_type="application/octet-stream")
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("tiny")
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        body = await request.body()
+        return {"length": len(body), "content_length": request.headers.get("content-length"),
+                "encoding": request.headers.get("content-encoding"), "head": body[:20].decode()}
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, max_decoded_size=max_decoded_size)
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    offered = ["zstd", "br", "gzip"]
+    assert negotiate_encoding("gzip, deflate", offered) == "gzip"
+    assert negotiate_encoding("gzip;q=0.5, br", offered) == "br"
+    assert negotiate_encoding("br, zstd, gzip", offered) == "zstd"
+    assert negotiate_encoding("*", offered) == "zstd"
+    assert negotiate_encoding("*;q=0.1, gzip;q=0", offered) == "zstd"
+    assert negotiate_encoding("identity", offered) is None
+    assert negotiate_encoding("gzip;q=0", offered) is None
+    assert negotiate_encoding(None, offered) is None
+
+
+def test_large_json_is_compressed_and_etag_weakened():
+    client = _app(FastModelRoute)
+    r = client.get("/quads", params={"n": 200}, headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert r.headers["etag"] == 'W/"v1"'
+    assert int(r.headers["content-length"]) < len(r.content)   # r.content is decoded
+    assert r.json()["total_count"] == 200
+
+
+def test_pass_through_cases():
+    client = _app()
+    plain = client.get("/quads", params={"n": 200}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == '"v1"'
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    blob = client.get("/blob", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in blob.headers
+
+
+def test_streamed_body_is_compressed_incrementally():
+    client = _app()
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as r:
+        assert r.headers["content-encoding"] == "gzip"
+        assert "content-length" not in r.headers
+        raw = b"".join(r.iter_raw())
+    assert gzip.decompress(raw) == b"".join(
+        ("x" * 2000 + str(i)).encode() for i in range(4))
+
+
+@pytest.mark.parametrize("path", ["/quads?n=50", "/page?n=50"])
+def test_fast_route_matches_fastapi_bytes(path):
+    fast = _app(FastModelRoute).get(path, headers={"Accept-Encoding": "identity"})
+    slow = _app().get(path, headers={"Accept-Encoding": "identity"})
+    assert fast.status_code == slow.status_code == 200
+    assert fast.content == slow.content
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+    assert fast.headers.get("etag") == slow.headers.get("etag")
+
+
+def test_gzip_request_body_is_inflated():
+    body = b'{"quads": [' + b'"x", ' * 2000 + b'"y"]}'
+    r = _app().post("/echo", content=gzip.compress(body),
+                    headers={"Content-Encoding": "gzip", "Content-Type": "application/json"})
+    assert r.status_code == 200
+    assert r.json() == {"length": len(body), "content_length": None, "encoding": None,
+                        "head": body[:20].decode()}
+
+
+def test_request_decoding_refusals():
+    client = _app()
+    unknown = client.post("/echo", content=b"abc", headers={"Content-Encoding": "lzma"})
+    assert unknown.status_code == 415
+    assert "gzip" in unknown.headers["accept-encoding"]
+
+    corrupt = client.post("/echo", content=b"not gzip at all", headers={"Content-Encoding": "gzip"})
+    assert corrupt.status_code == 400
+    truncated = client.post("/echo", content=gzip.compress(b"x" * 5000)[:-8],
+                            headers={"Content-Encoding": "gzip"})
+    assert truncated.status_code == 400
+
+    bomb = _app(max_decoded_size=10_000).post("/echo", content=gzip.compress(b"\0" * 100_000),
+                                              headers={"Content-Encoding": "gzip"})
+    assert bomb.status_code == 413
+    assert "detail" in bomb.json()
+
+
+async def test_bomb_is_inflated_only_up_to_the_limit():
+    bomb = gzip.compress(b"\0" * 20_000_000)
+    assert len(_GunzipDecoder().decompress(bomb, 10_000)) == 10_001
+    assert len(_GunzipDecoder().decompress(gzip.compress(b"ab"), 2)) == 2
+
+    # Refused at the first wire chunk that passes the limit, one byte over it.
+    half = len(bomb) // 2
+    messages = iter([{"type": "http.request", "body": bomb[:half], "more_body": True},
+                     {"type": "http.request", "body": bomb[half:], "more_body": False}])
+
+    async def receive():
+        return next(messages)
+
+    inflating = _DecodingReceive(receive, _GunzipDecoder(), 10_000)
+    with pytest.raises(RequestBodyDecodeError) as refused:
+        while True:
+            await inflating()
+    assert refused.value.status_code == 413
+    assert inflating.decoded == 10_001
@@ -0,0 +1,127 @@
+"""Concurrent, fair segmentation dispatch — no DB, no model load.
+
+The worker's claim and job body are replaced by in-memory queues, so what
+is under test is the dispatcher: slot accounting, round-robin across
+spaces, and the throughput it reports.
+"""
+
+import asyncio
+import operator
+
+import pytest
+
+from vitalgraph.document import cpu_pool
+from vitalgraph.document.segmentation_worker import SegmentationWorker, _Throughput
+
+pytestmark = pytest.mark.unit
+
+
+class _Job:
+    def __init__(self, job_id):
+        self.job_id = job_id
+
+
+class _Spaces:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def list_active_spaces(self):
+        return list(self.ids)
+
+
+class _Worker(SegmentationWorker):
+    """Claims from per-space lists; a job "segments" into 3 pieces."""
+
+    def __init__(self, queues, concurrency, gate=None):
+        super().__init__(_Spaces(list(queues)), concurrency=concurrency)
+        self.queues = {k: list(v) for k, v in queues.items()}
+        self.claimed = []
+        self.gate = gate
+        self.running_now = 0
+        self.peak = 0
+        self._running = True
+
+    async def _claim(self, space_id):
+        if not self.queues[space_id]:
+            return None
+        self.claimed.append(space_id)
+        return _Job(self.queues[space_id].pop(0))
+
+    async def _get_pool(self, space_id):
+        return object()
+
+    async def _process_job(self, space_id, job, manager):
+        self.running_now += 1
+        self.peak = max(self.peak, self.running_now)
+        if self.gate is not None:
+            await self.gate.wait()
+        else:
+            await asyncio.sleep(0)
+        self.running_now -= 1
+        self._jobs_processed += 1
+        self._record_throughput(space_id, 3)
+
+
+async def _drain(worker):
+    while await worker._poll_all_spaces():
+        pass
+    await asyncio.gather(*worker._inflight)
+
+
+async def test_spaces_are_served_round_robin():
+    worker = _Worker({"big": range(6), "small": range(2), "mid": range(3)}, concurrency=1)
+    await _drain(worker)
+    assert worker.claimed[:6] == ["big", "small", "mid", "big", "small", "mid"]
+    assert worker.claimed.count("big") == 6 and len(worker.claimed) == 11
+
+
+async def test_slots_bound_concurrency():
+    gate = asyncio.Event()
+    worker = _Worker({"a": range(5), "b": range(5)}, concurrency=3, gate=gate)
+    poll = asyncio.create_task(_drain(worker))
+    for _ in range(20):
+        await asyncio.sleep(0)
+    # Three claimed and running; the dispatcher is parked waiting for a slot.
+    assert len(worker.claimed) == 3 and worker.running_now == 3
+    assert worker.get_health()["jobs_in_flight"] == 3
+    gate.set()
+    await poll
+    assert worker.peak == 3 and len(worker.claimed) == 10
+    assert worker.get_health()["jobs_in_flight"] == 0
+
+
+async def test_throughput_reported_in_health_and_metrics():
+    worker = _Worker({"a": range(4), "b": range(2)}, concurrency=2)
+    await _drain(worker)
+    health = worker.get_health()
+    assert health["jobs_processed"] == 6
+    assert health["segments_total"] == 18
+    assert health["documents_per_second"] > 0 and health["segments_per_second"] > 0
+
+    families = {name: samples for name, _, _, samples in worker.collect()}
+    totals = {labels["space"]: v for labels, v in families["vitalgraph_segmentation_segments_total"]}
+    assert totals == {"a": 12, "b": 6}
+
+
+def test_throughput_window_slides():
+    tp = _Throughput(window=10)
+    tp.record(5, now=0.0)
+    tp.record(3, now=8.0)
+    assert tp.rates(now=9.0) == (0.2, 0.8)
+    assert tp.rates(now=15.0) == (0.1, 0.3)
+    assert (tp.documents_total, tp.segments_total) == (2, 8)
+
+
+async def test_run_cpu_thread_fallback(monkeypatch):
+    monkeypatch.setenv("VITALGRAPH_DOC_CPU_WORKERS", "0")
+    cpu_pool.shutdown_cpu_pool()
+    assert await cpu_pool.run_cpu(operator.add, 2, 3) == 5
+
+
+async def test_run_cpu_process_pool(monkeypatch):
+    monkeypatch.setenv("VITALGRAPH_DOC_CPU_WORKERS", "1")
+    cpu_pool.shutdown_cpu_pool()
+    try:
+        assert await cpu_pool.run_cpu(operator.mul, 6, 7) == 42
+    finally:
+        cpu_pool.shutdown_cpu_pool()
@@ -0,0 +1,118 @@
+"""Linear-time segmentation.
+
+The splitter used to re-tokenize every candidate chunk at every recursion
+level and located chunks with ``str.find`` from the section start, which
+made large documents quadratic. These tests pin what the offset-based
+splitter guarantees instead: exact offsets, the token limit holding even
+for tokenizers the index only approximates, and a tokenizer workload that
+does not grow with the square of the document.
+"""
+
+import random
+import re
+
+import pytest
+
+from vitalgraph.document.document_segmenter import DocumentSegmenter, _TokenIndex
+from vitalgraph.document.segment_config import MarkdownSegmentConfig, PlainSplitConfig
+
+pytestmark = pytest.mark.unit
+
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu".split()
+
+# Word-piece-like: 4-char pieces plus punctuation, 2 special tokens. Close to
+# additive over words, like the real model.
+_PIECE_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def wordpiece(text):
+    return len(_PIECE_RE.findall(text)) + 2
+
+
+def _document(paragraphs, seed=3, heading_every=0):
+    rng = random.Random(seed)
+    out = []
+    for i in range(paragraphs):
+        if heading_every and i % heading_every == 0:
+            out.append(f"## Section {i}")
+        lines = []
+        for _ in range(rng.randint(1, 3)):
+            lines.append(" ".join(
+                rng.choice(WORDS) + ("." if rng.random() < 0.1 else "")
+                for _ in range(rng.randint(5, 90))))
+        out.append("\n".join(lines))
+    return "\n\n".join(out)
+
+
+class TestTokenIndex:
+    def test_whitespace_counts_are_exact(self):
+        text = "  one two\n\nthree   four five \n six"
+        index = _TokenIndex(text)
+        for a in range(len(text)):
+            for b in range(a, len(text) + 1):
+                assert index.count(a, b) == len(text[a:b].split()), (a, b)
+
+    def test_model_counts_add_up_over_words(self):
+        text = _document(20)
+        index = _TokenIndex(text, wordpiece)
+        assert index.count(0, len(text)) == wordpiece(text)
+
+    def test_tail_start(self):
+        text = "one two three four"
+        index = _TokenIndex(text)
+        assert text[index.tail_start(0, len(text), 2):] == "three four"
+        assert index.tail_start(4, len(text), 10) == 4  # never before the range
+
+
+@pytest.mark.parametrize("tokenizer", [None, wordpiece, lambda t: len(t) // 4 + 2])
+@pytest.mark.parametrize("method", ["plain", "markdown"])
+def test_limit_holds_and_offsets_are_exact(tokenizer, method):
+    text = _document(120, heading_every=40 if method == "markdown" else 0)
+    config = (MarkdownSegmentConfig if method == "markdown" else PlainSplitConfig)(
+        max_segment_tokens=60, min_segment_tokens=0)
+    segments = DocumentSegmenter(tokenizer=tokenizer).segment(text, config)
+    assert len(segments) > 10
+    count = tokenizer or (lambda t: len(t.split()))
+    for s in segments:
+        assert s.token_length == count(s.content) <= 60
+        if s.segment_type_uri != "urn:segtype:markdown_section":
+            assert text[s.start_char_offset:s.end_char_offset] == s.content
+
+
+def test_overlap_offsets_cover_the_overlap():
+    text = _document(40)
+    config = PlainSplitConfig(max_segment_tokens=50, min_segment_tokens=0, overlap_tokens=5)
+    segments = DocumentSegmenter().segment(text, config)
+    for prev, seg in zip(segments, segments[1:]):
+        assert seg.start_char_offset < prev.end_char_offset
+        overlap = " ".join(text[seg.start_char_offset:prev.end_char_offset].split())
+        assert seg.content.startswith(overlap)
+        assert 1 <= len(overlap.split()) <= 5  # fewer if the previous chunk is shorter
+
+
+def test_run_on_text_is_split_at_spaces_not_mid_word():
+    # No paragraph, line or sentence breaks: the old splitter fell straight
+    # through to fixed-width character chunks here.
+    text = " ".join(WORDS * 200)
+    segments = DocumentSegmenter().segment(text, PlainSplitConfig(
+        max_segment_tokens=50, min_segment_tokens=0))
+    assert all(s.content.split()[0] in WORDS and s.content.split()[-1] in WORDS
+               for s in segments)
+
+
+def test_tokenizer_work_is_linear_in_document_size():
+    def characters_tokenized(paragraphs):
+        seen = [0]
+
+        def counting(text):
+            seen[0] += len(text)
+            return wordpiece(text)
+
+        text = _document(paragraphs, heading_every=paragraphs)  # one huge section
+        DocumentSegmenter(tokenizer=counting).segment(text, MarkdownSegmentConfig(
+            max_segment_tokens=200, min_segment_tokens=0))
+        return seen[0] / len(text)
+
+    small, large = characters_tokenized(200), characters_tokenized(3200)
+    # Each character is tokenized a small, constant number of times.
+    assert large < 4 and large < small * 1.5, (small, large)
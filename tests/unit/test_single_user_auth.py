@@ -0,0 +1,82 @@
+"""Single-user mode for backends with no user store (embedded Oxigraph).
+
+The embedded backend has no user, API key or permission tables, so the
+server must not quietly fall back to the bootstrap admin forever: it
+refuses to start unless OXIGRAPH_SINGLE_USER disables auth, and in that
+mode every request is one local admin — no token, and no bootstrap.
+"""
+
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from vitalgraph.auth.vitalgraph_auth import VitalGraphAuth
+from vitalgraph.config.config_loader import VitalGraphConfig
+
+pytestmark = pytest.mark.unit
+
+SECRET = "test-secret-key-for-single-user-mode"
+
+
+def _auth(single_user: bool) -> VitalGraphAuth:
+    auth = VitalGraphAuth(secret_key=SECRET, db_impl=None)
+    auth.set_bootstrap_admin("root", "bootstrap-pass")
+    if single_user:
+        auth.enable_single_user()
+    return auth
+
+
+async def test_single_user_needs_no_token():
+    get_current_user = _auth(single_user=True).create_get_current_user_dependency()
+    user = await get_current_user()
+    assert user["username"] == "local"
+    assert user["role"] == "admin"
+
+
+async def test_single_user_login_is_the_local_user_never_bootstrap():
+    auth = _auth(single_user=True)
+    assert not await auth._bootstrap_available("root")
+    for username, password in (("root", "bootstrap-pass"), ("anyone", "anything")):
+        user = await auth.authenticate_user(username, password)
+        assert user["username"] == "local"
+    assert (await auth._get_user_from_db("local"))["role"] == "admin"
+    assert await auth._get_user_from_db("root") is None
+
+
+async def test_without_single_user_a_missing_db_still_means_bootstrap():
+    """The refusal below is what keeps this path off for Oxigraph."""
+    assert await _auth(single_user=False)._bootstrap_available("root")
+
+
+def test_oxigraph_config_single_user_is_opt_in(monkeypatch):
+    monkeypatch.setenv("VITALGRAPH_ENVIRONMENT", "unittest")
+    monkeypatch.delenv("UNITTEST_OXIGRAPH_SINGLE_USER", raising=False)
+    monkeypatch.delenv("OXIGRAPH_SINGLE_USER", raising=False)
+    assert VitalGraphConfig().get_oxigraph_config()["single_user"] is False
+    monkeypatch.setenv("OXIGRAPH_SINGLE_USER", "true")
+    assert VitalGraphConfig().get_oxigraph_config()["single_user"] is True
+
+
+def test_oxigraph_without_single_user_refuses_to_start(monkeypatch):
+    app_impl = pytest.importorskip("vitalgraph.impl.vitalgraphapp_impl")
+    from fastapi import FastAPI
+
+    class _NoBackendImpl:
+        def __init__(self, config):
+            self.config = config
+
+        def get_db_impl(self):
+            return None
+
+        def get_config(self):
+            return self.config
+
+    monkeypatch.setattr(app_impl, "VitalGraphImpl", _NoBackendImpl)
+    monkeypatch.setenv("VITALGRAPH_ENVIRONMENT", "unittest")
+    monkeypatch.setenv("JWT_SECRET_KEY", SECRET)
+    monkeypatch.setenv("BACKEND_TYPE", "oxigraph")
+    monkeypatch.delenv("UNITTEST_BACKEND_TYPE", raising=False)
+    monkeypatch.delenv("UNITTEST_OXIGRAPH_SINGLE_USER", raising=False)
+    monkeypatch.delenv("OXIGRAPH_SINGLE_USER", raising=False)
+    with pytest.raises(ValueError, match="OXIGRAPH_SINGLE_USER"):
+        app_impl.VitalGraphAppImpl(FastAPI(), VitalGraphConfig())
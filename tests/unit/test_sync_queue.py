@@ -0,0 +1,214 @@
+"""Coalescing auto-sync queue — no DB, no model load.
+
+The runner is a recorder standing in for ``auto_sync._run_sync``; the
+journal runs against a scripted pool.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from vitalgraph.vectorization.sync_queue import SyncQueue
+
+pytestmark = [pytest.mark.unit, pytest.mark.asyncio]
+
+
+class _Recorder:
+    def __init__(self, gate: asyncio.Event = None):
+        self.calls = []
+        self.gate = gate
+
+    async def __call__(self, db_impl, space_id, uris, graph_uri, operation):
+        self.calls.append((space_id, graph_uri, operation, list(uris)))
+        if self.gate is not None:
+            await self.gate.wait()
+
+
+class _Conn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+        self.fetched = []
+
+    async def fetch(self, sql, *args):
+        self.fetched.append((sql, args))
+        rows, self.rows = self.rows, []
+        return rows
+
+    async def execute(self, sql, *args):
+        self.executed.append((sql, args))
+
+
+class _Acquire:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Pool:
+    def __init__(self, rows=()):
+        self.conn = _Conn(list(rows))
+
+    def acquire(self):
+        return _Acquire(self.conn)
+
+
+class _Db:
+    def __init__(self, pool=None):
+        self.connection_pool = pool
+
+
+@pytest.fixture
+async def make_queue():
+    queues = []
+
+    def _make(runner, **kw):
+        kw.setdefault("linger", 0)
+        q = SyncQueue(runner, **kw)
+        queues.append(q)
+        return q
+
+    yield _make
+    for q in queues:
+        q.abort()
+    await asyncio.sleep(0)
+
+
+async def test_burst_coalesces_and_latest_operation_wins(make_queue):
+    run = _Recorder()
+    q = make_queue(run, linger=0.02)
+    db = _Db()
+    first = q.submit(db, "sp", "g", ["urn:a", "urn:b"], "upsert")
+    again = q.submit(db, "sp", "g", ["urn:a"], "upsert")
+    gone = q.submit(db, "sp", "g", ["urn:b"], "delete")
+    assert q.depth == 2
+    await asyncio.wait_for(asyncio.gather(first, again, gone), 1)
+    assert run.calls == [("sp", "g", "upsert", ["urn:a"]), ("sp", "g", "delete", ["urn:b"])]
+    assert q.depth == 0
+
+
+async def test_batches_split_by_graph_and_size(make_queue):
+    run = _Recorder()
+    q = make_queue(run, batch_size=2, workers=1)
+    db = _Db()
+    futures = [q.submit(db, "sp", "g1", ["urn:1", "urn:2", "urn:3"], "upsert"),
+               q.submit(db, "sp", "g2", ["urn:4"], "upsert")]
+    await asyncio.wait_for(asyncio.gather(*futures), 1)
+    assert [(g, uris) for _, g, _, uris in run.calls] == [
+        ("g1", ["urn:1", "urn:2"]), ("g1", ["urn:3"]), ("g2", ["urn:4"])]
+
+
+async def test_one_batch_per_space_at_a_time(make_queue):
+    gate = asyncio.Event()
+    run = _Recorder(gate)
+    q = make_queue(run, workers=4)
+    db = _Db()
+    first = q.submit(db, "sp", "g", ["urn:a"], "upsert")
+    await asyncio.sleep(0.01)
+    # urn:a is running: a new change to it is queued again, not merged.
+    second = q.submit(db, "sp", "g", ["urn:a"], "upsert")
+    await asyncio.sleep(0.01)
+    assert len(run.calls) == 1 and q.stats()["spaces"][0]["inflight"] == 1
+    gate.set()
+    await asyncio.wait_for(asyncio.gather(first, second), 1)
+    assert len(run.calls) == 2
+
+
+async def test_back_pressure_waits_for_drain(make_queue):
+    gate = asyncio.Event()
+    q = make_queue(_Recorder(gate), high_water=3, batch_size=1, workers=1)
+    db = _Db()
+    q.submit(db, "sp", "g", ["urn:1", "urn:2", "urn:3", "urn:4"], "upsert")
+    await asyncio.sleep(0.01)
+    # One subject is in flight; the three still pending hold the mark.
+    assert await q.wait_for_capacity(max_wait=0.02) >= 0.02
+
+    waiter = asyncio.ensure_future(q.wait_for_capacity(max_wait=1))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    gate.set()   # the next batch takes the queue below the mark
+    assert await asyncio.wait_for(waiter, 1) < 1
+
+
+async def test_discard_space_cancels_pending_and_running(make_queue):
+    gate = asyncio.Event()
+    q = make_queue(_Recorder(gate), batch_size=1, workers=1)
+    db = _Db()
+    running = q.submit(db, "drop", "g", ["urn:a"], "upsert")
+    queued = q.submit(db, "drop", "g", ["urn:b"], "upsert")
+    keep = q.submit(db, "keep", "g", ["urn:c"], "upsert")
+    await asyncio.sleep(0.01)
+
+    assert await q.discard_space("drop") == 2
+    assert queued.cancelled() and not running.done()
+    assert [s["space_id"] for s in q.stats()["spaces"]] == ["keep"]
+    gate.set()
+    await asyncio.wait_for(keep, 1)
+
+
+async def test_journal_recovery_and_cleanup(make_queue):
+    then = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    pool = _Pool([{"space_id": "sp", "graph_uri": "g", "subject_uri": "urn:a",
+                   "operation": "delete", "enqueued_at": then}])
+    run = _Recorder()
+    q = make_queue(run, journal_interval=3600, owner="inst-1")
+    assert await q.start(_Db(pool)) == 1
+
+    # Only rows whose lease ran out are claimed, and they become this
+    # instance's without being written again ...
+    (sql, args), = pool.conn.fetched
+    assert "lease_until < now()" in sql and "SKIP LOCKED" in sql
+    assert args[0] == "inst-1"
+    await asyncio.sleep(0.01)
+    assert run.calls == [("sp", "g", "delete", ["urn:a"])]
+    # ... and deleted once synced.
+    (sql, args), = pool.conn.executed
+    assert "DELETE FROM sync_queue" in sql and args[:3] == ("sp", "g", ["urn:a"])
+    await q.stop()
+
+
+async def test_journal_loop_renews_the_lease_and_adopts_expired_rows(make_queue):
+    gate = asyncio.Event()
+    pool = _Pool()
+    q = make_queue(_Recorder(gate), journal_interval=0.01, lease=0.03, owner="inst-1")
+    await q.start(_Db(pool))
+    then = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    pool.conn.rows = [{"space_id": "sp", "graph_uri": "g", "subject_uri": "urn:b",
+                       "operation": "upsert", "enqueued_at": then}]
+    await asyncio.sleep(0.1)
+    assert any("lease_until = now() + " in sql and args == ("inst-1", 0.03)
+               for sql, args in pool.conn.executed)
+    assert len(pool.conn.fetched) >= 2 and q.depth + sum(
+        s["inflight"] for s in q.stats()["spaces"]) == 1
+    gate.set()
+    await q.stop()
+
+
+async def test_stop_journals_pending_entries(make_queue):
+    gate = asyncio.Event()
+    pool = _Pool()
+    q = make_queue(_Recorder(gate), batch_size=1, workers=1, journal_interval=3600,
+                   owner="inst-1")
+    await q.start(_Db(pool))
+    q.submit(_Db(pool), "sp", "g", ["urn:a", "urn:b"], "upsert")
+    await asyncio.sleep(0.01)
+    await q.stop()
+    (sql, args), (release, release_args) = pool.conn.executed
+    # The running batch is put back and journaled with the waiting entry,
+    # under this instance's lease, which stop() then ends.
+    assert sorted(args[2]) == ["urn:a", "urn:b"] and args[3] == ["upsert", "upsert"]
+    assert args[5] == "inst-1"
+    assert "lease_until = now() WHERE owner" in release and release_args == ("inst-1",)
+
+
+async def test_collect_reports_per_space_gauges():
+    q = SyncQueue(_Recorder())
+    assert [name for name, *_ in q.collect()] == [
+        "vitalgraph_sync_queue_depth", "vitalgraph_sync_queue_inflight",
+        "vitalgraph_sync_queue_lag_seconds"]
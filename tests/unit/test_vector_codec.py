@@ -0,0 +1,133 @@
+"""Binary pgvector codec and COPY upsert, against scripted connections.
+
+The byte layout must match pgvector's ``vector_recv``/``vector_send``
+exactly — a wrong header is a server-side error at best and silently
+mis-sized vectors at worst — so it is pinned here byte for byte. The
+COPY upsert is pinned by its statement sequence: staging, one binary
+COPY, one merge that keeps the last row per key.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+import pytest
+
+from vitalgraph.db import vector_codec
+
+
+class _Tx:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        self.conn.log.append("BEGIN")
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.conn.log.append("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+class _Conn:
+    def __init__(self, schema="public"):
+        self.schema = schema
+        self.log = []
+        self.codecs = []
+        self.copied = None
+
+    def transaction(self):
+        return _Tx(self)
+
+    async def fetchval(self, sql, *args):
+        self.log.append("LOOKUP")
+        return self.schema
+
+    async def set_type_codec(self, name, **kw):
+        self.codecs.append((name, kw))
+
+    async def execute(self, sql, *args):
+        self.log.append(sql)
+
+    async def executemany(self, sql, records):
+        self.log.append(sql)
+        self.copied = records
+
+    async def copy_records_to_table(self, table, *, records, columns):
+        self.log.append(f"COPY {table}")
+        self.copied = (columns, list(records))
+
+
+class TestCodec:
+
+    def test_byte_layout_matches_vector_recv(self):
+        data = vector_codec.encode_vector(np.array([1.0, -2.5], dtype=np.float32))
+        assert data == struct.pack(">HHff", 2, 0, 1.0, -2.5)
+
+    def test_round_trip_is_float32(self):
+        vec = np.random.default_rng(0).standard_normal(384).astype(np.float32)
+        out = vector_codec.decode_vector(vector_codec.encode_vector(vec))
+        assert out.dtype == np.float32 and np.array_equal(out, vec)
+
+    def test_accepts_lists_and_legacy_literals(self):
+        expected = vector_codec.encode_vector(np.array([0.5, 0.25], dtype=np.float32))
+        assert vector_codec.encode_vector([0.5, 0.25]) == expected
+        assert vector_codec.encode_vector("[0.5,0.25]") == expected
+
+    def test_rejects_batches(self):
+        with pytest.raises(ValueError):
+            vector_codec.encode_vector(np.zeros((2, 3)))
+
+
+class TestRegistration:
+
+    async def test_binary_codec_in_the_extension_schema(self):
+        conn = _Conn(schema="extensions")
+        assert await vector_codec.register_vector_codec(conn)
+        (name, kw), = conn.codecs
+        assert name == "vector" and kw["schema"] == "extensions"
+        assert kw["format"] == "binary"
+        assert kw["encoder"] is vector_codec.encode_vector
+
+    async def test_ensure_registers_once(self):
+        conn = _Conn()
+        assert await vector_codec.ensure_vector_codec(conn)
+        assert await vector_codec.ensure_vector_codec(conn)
+        assert conn.log.count("LOOKUP") == 1 and len(conn.codecs) == 1
+
+    async def test_no_extension_falls_back_to_text(self):
+        conn = _Conn(schema=None)
+        arg = await vector_codec.vector_arg(conn, np.array([0.5, 1.0], dtype=np.float32))
+        assert arg == "[0.5,1.0]" and conn.codecs == []
+
+
+class TestCopyUpsert:
+
+    async def test_one_copy_and_one_merge(self):
+        conn = _Conn()
+        rows = [("s1", "g", [0.1, 0.2]), ("s2", "g", [0.3, 0.4])]
+        n = await vector_codec.copy_upsert_vectors(
+            conn, "sp_vec_idx", ("subject_uuid", "context_uuid", "embedding"), rows,
+            conflict_columns=("subject_uuid", "context_uuid"))
+        assert n == 2
+        stmts = conn.log[conn.log.index("BEGIN"):]
+        assert stmts[1].startswith("CREATE TEMP TABLE IF NOT EXISTS _vg_stage_sp_vec_idx")
+        assert stmts[2] == "TRUNCATE _vg_stage_sp_vec_idx"
+        assert stmts[3] == "COPY _vg_stage_sp_vec_idx"
+        merge = stmts[4]
+        assert "DISTINCT ON (subject_uuid, context_uuid)" in merge and "ord DESC" in merge
+        assert "embedding = EXCLUDED.embedding" in merge
+        assert "updated_time = EXCLUDED.updated_time" in merge
+        assert stmts[5] == "COMMIT"
+
+        columns, records = conn.copied
+        assert columns == ["ord", "subject_uuid", "context_uuid", "embedding"]
+        assert [r[0] for r in records] == [0, 1]
+        assert records[1][3].dtype == np.float32
+
+    async def test_without_codec_uses_text_executemany(self):
+        conn = _Conn(schema=None)
+        await vector_codec.copy_upsert_vectors(
+            conn, "t", ("k", "embedding"), [(1, [1.0, 2.0])], conflict_columns=("k",))
+        assert "$2::vector" in conn.log[-1] and "COPY" not in " ".join(conn.log)
+        assert conn.copied == [(1, "[1.0,2.0]")]
@@ -0,0 +1,97 @@
+"""Quantized HNSW storage for vector indexes.
+
+provider_config selects the storage, the data-table DDL indexes the
+matching expression, and both the generated driving subquery and the
+filtered-ANN statements order the candidate scan by that same expression
+before reranking at full precision.
+"""
+
+import pytest
+
+from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
+from vitalgraph.db.sparql_sql.vg_ann import ann_top_k_sql, choose_ann_plan
+from vitalgraph.db.vector_storage import (
+    hnsw_using_sql, index_distance_sql, storage_config, supports_quantized_storage,
+    validate_storage,
+)
+
+
+def test_storage_config():
+    assert storage_config(None) == ("vector", 1)
+    assert storage_config({"model": "x"}) == ("vector", 1)
+    assert storage_config({"storage": "halfvec"}) == ("halfvec", 2)
+    assert storage_config('{"storage": "binary", "rerank_factor": 4}') == ("binary", 4)
+    with pytest.raises(ValueError):
+        storage_config({"storage": "pq"})
+    with pytest.raises(ValueError):
+        storage_config({"storage": "binary", "rerank_factor": 0})
+    assert validate_storage("halfvec", 3072) is None
+    assert validate_storage("halfvec", 8192) is not None
+    assert supports_quantized_storage("0.7.0") and not supports_quantized_storage("0.6.2")
+
+
+def test_hnsw_ddl_per_storage():
+    assert hnsw_using_sql("vector", 8, "l2") == "USING hnsw (embedding vector_l2_ops)"
+    assert hnsw_using_sql("halfvec", 8) == "USING hnsw ((embedding::halfvec(8)) halfvec_cosine_ops)"
+    assert hnsw_using_sql("binary", 8, "l2") == \
+        "USING hnsw ((binary_quantize(embedding)::bit(8)) bit_hamming_ops)"
+
+    stmts = SparqlSQLSchema().create_vector_data_table_sql("sp", "i", 8, "cosine", "binary")
+    assert "embedding       vector(8) NOT NULL" in stmts[0]
+    assert "idx_sp_vec_i_hnsw" in stmts[1] and "bit_hamming_ops" in stmts[1]
+    default = SparqlSQLSchema().create_vector_data_table_sql("sp", "i", 8)
+    assert "USING hnsw (embedding vector_cosine_ops)" in default[1]
+
+
+def test_index_distance_matches_index_expression():
+    q = "$1::vector"
+    assert index_distance_sql("vector", 8, q) == "embedding <=> $1::vector"
+    assert index_distance_sql("halfvec", 8, q) == \
+        "embedding::halfvec(8) <=> ($1::vector)::halfvec(8)"
+    assert index_distance_sql("binary", 8, q) == \
+        "binary_quantize(embedding)::bit(8) <~> binary_quantize($1::vector)"
+    # Unknown width: exact distance, correct without the index.
+    assert index_distance_sql("binary", None, q) == "embedding <=> $1::vector"
+
+
+def test_filtered_ann_orders_by_quantized_index_and_reranks():
+    plan = choose_ann_plan(5, 1e6, 1e5, True, True, rerank_factor=8)
+    assert plan.candidates == 40
+    sql = ann_top_k_sql(plan, "sp_vec_i", "SELECT v0__uuid FROM q", "v0__uuid", 5,
+                        storage="binary", dimensions=8)
+    inner, outer = sql.split(") AS __ann")
+    assert "ORDER BY binary_quantize(embedding)::bit(8) <~> binary_quantize($1::vector) LIMIT 40" in inner
+    assert "embedding <=> $1::vector AS dist" in inner
+    assert outer.strip().endswith("ORDER BY dist LIMIT 5")
+
+
+def _driving(meta):
+    from vitalgraph.db.sparql_sql.vg_functions import (
+        VG_VECTOR_SIMILARITY, vector_top_k_driving_sql,
+    )
+
+    from .sparql_sql.emit_helpers import _func, _lit, _make_ctx, _var
+
+    ctx = _make_ctx({"entity": "text"})
+    ctx.vector_index_meta = meta
+    expr = _func("vectorSimilarity", _var("entity"), _lit("cats"), _lit("idx"),
+                 function_iri=VG_VECTOR_SIMILARITY)
+    return vector_top_k_driving_sql(expr, ctx, 10, threshold=0.3,
+                                    child_sql="SELECT v0__uuid FROM t",
+                                    child_uuid_col="v0__uuid")
+
+
+def test_driving_subquery_reranks_quantized_candidates():
+    plain = _driving({"idx": {"dimensions": 8, "storage": "vector", "rerank_factor": 1}})
+    assert "__vq" not in plain.join_subquery
+    assert plain.ann_request.storage == "vector"
+
+    d = _driving({"idx": {"dimensions": 8, "storage": "halfvec", "rerank_factor": 3}})
+    sql = d.join_subquery
+    assert "ORDER BY embedding::halfvec(8) <=>" in sql and "LIMIT 30) AS __vq" in sql
+    # Threshold and final order use the full-precision distance.
+    tail = sql.split(") AS __vq", 1)[1]
+    assert "WHERE 1 - (embedding <=>" in tail and "ORDER BY embedding <=>" in tail
+    assert tail.count("LIMIT 10") == 1
+    req = d.ann_request
+    assert (req.storage, req.dimensions, req.rerank_factor) == ("halfvec", 8, 3)
@@ -0,0 +1,181 @@
+"""Filtered vector top-K: mode choice, SQL forms and resolution.
+
+The mode follows the filter's estimated selectivity (exact for small
+filtered sets, iterative scan on pgvector >= 0.8, over-fetch before it),
+index modes rerank exactly, and an over-fetch that under-returns widens
+and then falls back to exact. Resolution runs against a scripted
+connection and inlines the top-K between the driving subquery's markers.
+"""
+
+import json
+import uuid
+
+from vitalgraph.db.sparql_sql.vg_ann import (
+    EXACT_MAX_ROWS, MAX_EF_SEARCH, ann_top_k_sql, choose_ann_plan,
+    resolve_ann_requests, supports_iterative_scan,
+)
+from vitalgraph.db.sparql_sql.vg_functions import AnnRequest, VectorRequest
+
+
+def test_mode_follows_selectivity():
+    assert choose_ann_plan(10, 1e6, 5_000, True, True).mode == "exact"
+    assert choose_ann_plan(10, 1e6, 5e5, False, True).mode == "exact"
+
+    it = choose_ann_plan(10, 1e6, 5e4, True, True)
+    assert it.mode == "iterative"
+    assert it.settings["hnsw.iterative_scan"] == "relaxed_order"
+    # 5% selective: ~300 tuples expected to be scanned, floor of 20k
+    assert int(it.settings["hnsw.max_scan_tuples"]) >= 20_000
+    assert it.candidates == 20
+
+    of = choose_ann_plan(10, 1e6, 5e5, True, False)
+    assert of.mode == "overfetch" and of.candidates == 30
+    assert of.settings == {"hnsw.ef_search": "40"}
+    # 4% selective needs 375 candidates; 0.4% would need 3750 > the ef_search cap
+    assert choose_ann_plan(10, 1e6, 2e4 + EXACT_MAX_ROWS, True, False).candidates <= MAX_EF_SEARCH
+    assert choose_ann_plan(10, 1e7, 4e4, True, False).mode == "exact"
+
+
+def test_pgvector_version_gate():
+    assert supports_iterative_scan("0.8.0") and supports_iterative_scan("0.10.1")
+    assert not supports_iterative_scan("0.7.4") and not supports_iterative_scan(None)
+
+
+def test_sql_forms():
+    child = "SELECT v0__uuid FROM sp_rdf_quad"
+    exact = ann_top_k_sql(choose_ann_plan(5, 0, 0, False, False), "sp_vec_i", child,
+                          "v0__uuid", 5, threshold=0.5)
+    assert "ORDER BY score DESC LIMIT 5" in exact and "ORDER BY embedding" not in exact
+    assert "> 0.5" in exact
+
+    it = ann_top_k_sql(choose_ann_plan(5, 1e6, 1e5, True, True), "sp_vec_i", child, "v0__uuid", 5)
+    inner, outer = it.split(") AS __ann")
+    assert "subject_uuid IN" in inner and "ORDER BY embedding <=> $1::vector LIMIT 10" in inner
+    assert outer.strip().endswith("ORDER BY dist LIMIT 5")
+
+    of = ann_top_k_sql(choose_ann_plan(5, 1e6, 5e5, True, False), "sp_vec_i", child, "v0__uuid", 5,
+                       threshold=0.5)
+    inner, outer = of.split(") AS __ann")
+    assert "subject_uuid IN" not in inner and "subject_uuid IN" in outer
+    assert "> 0.5" not in of  # index modes: the resolver applies the threshold
+
+
+class _Tx:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Conn:
+    """Scripted asyncpg connection: catalog stats, an EXPLAIN estimate, top-K rows."""
+
+    def __init__(self, table_rows, filter_rows, version, results):
+        self.table_rows, self.filter_rows, self.version = table_rows, filter_rows, version
+        self.results = list(results)
+        self.statements, self.settings = [], []
+
+    def transaction(self):
+        return _Tx()
+
+    async def fetchrow(self, sql, *args):
+        return {"table_rows": self.table_rows, "has_hnsw": True, "version": self.version}
+
+    async def fetchval(self, sql, *args):
+        if sql.startswith("EXPLAIN"):
+            return json.dumps([{"Plan": {"Plan Rows": self.filter_rows}}])
+        return None  # no vector type: the codec stays text
+
+    async def execute(self, sql, *args):
+        if "set_config" in sql:
+            self.settings.append(args)
+
+    async def fetch(self, sql, *args):
+        self.statements.append(sql)
+        return self.results.pop(0)
+
+
+def _request(limit=3):
+    vr = VectorRequest(placeholder="__VG_EMBED_1__", search_text="cats",
+                       index_name="i", space_id="sp")
+    vr.embedding = [0.1, 0.2]
+    return AnnRequest(
+        placeholder="__VG_ANN_1__", vec_table="sp_vec_i", ctx_clause="",
+        child_sql="SELECT v0__uuid FROM sp_rdf_quad", child_uuid_col="v0__uuid",
+        limit=limit, vector_request=vr)
+
+
+def _rows(n):
+    return [{"subject_uuid": uuid.uuid4(), "score": 0.9 - i / 100} for i in range(n)]
+
+
+async def test_overfetch_widens_then_falls_back_to_exact():
+    req = _request()
+    sql = f"SELECT * FROM x JOIN ({req.begin_marker}DEFAULT{req.end_marker}) AS vt ON TRUE"
+    conn = _Conn(1e6, 4e5, "0.7.4", [_rows(1), _rows(2), _rows(2), _rows(3)])
+    out = await resolve_ann_requests(sql, [req], "sp", conn, [req.vector_request])
+
+    assert "DEFAULT" not in out and req.begin_marker not in out
+    assert out.count("::uuid") == 3 and "AS __vg_ann(subject_uuid, __vg_score)" in out
+    # 40% selective, K=3: 12 candidates, then x4 twice, then exact
+    first, second, third, last = conn.statements
+    assert "LIMIT 12) AS __ann" in first and "LIMIT 48) AS __ann" in second
+    assert "LIMIT 192) AS __ann" in third
+    assert "ORDER BY score DESC" in last
+    assert ("hnsw.ef_search", "40") in conn.settings and ("hnsw.ef_search", "192") in conn.settings
+
+
+async def test_threshold_short_result_is_not_a_short_scan():
+    req = _request()
+    req.threshold = 0.895
+    sql = f"({req.begin_marker}DEFAULT{req.end_marker})"
+    # Two rows passed the filter; the second is already below the threshold.
+    conn = _Conn(1e6, 4e5, "0.7.4", [_rows(2)])
+    out = await resolve_ann_requests(sql, [req], "sp", conn, [req.vector_request])
+    assert len(conn.statements) == 1 and out.count("::uuid") == 1
+
+    # Every filtered row passed the threshold: the scan may have stopped
+    # short, so it is widened as before.
+    req.threshold = 0.5
+    conn = _Conn(1e6, 4e5, "0.7.4", [_rows(2), _rows(3)])
+    out = await resolve_ann_requests(sql, [req], "sp", conn, [req.vector_request])
+    assert len(conn.statements) == 2 and out.count("::uuid") == 3
+
+
+async def test_iterative_scan_settings_and_no_placeholder_left():
+    req = _request(limit=2)
+    sql = f"({req.begin_marker}DEFAULT{req.end_marker})"
+    conn = _Conn(1e6, 1e5, "0.8.0", [_rows(2)])
+    out = await resolve_ann_requests(sql, [req], "sp", conn, [req.vector_request])
+    assert out.startswith("(SELECT * FROM (VALUES")
+    assert ("hnsw.iterative_scan", "relaxed_order") in conn.settings
+    assert len(conn.statements) == 1
+
+
+async def test_unresolved_child_placeholder_keeps_default():
+    req = _request()
+    req.child_sql += " WHERE __VG_FUZZY_FILTER_0__"
+    sql = f"({req.begin_marker}DEFAULT{req.end_marker})"
+    out = await resolve_ann_requests(sql, [req], "sp", _Conn(1e6, 1e5, "0.8.0", []),
+                                     [req.vector_request])
+    assert "DEFAULT" in out
+
+
+def test_driving_subquery_is_marked_and_recorded():
+    from vitalgraph.db.sparql_sql.emit_extend import _try_vector_driving_extend
+    from vitalgraph.db.sparql_sql.ir import KIND_EXTEND, PlanV2
+    from vitalgraph.db.sparql_sql.vg_functions import VG_VECTOR_SIMILARITY
+
+    from .sparql_sql.emit_helpers import _func, _leaf_bgp, _lit, _make_ctx, _var
+
+    ctx = _make_ctx({"entity": "text"})
+    expr = _func("vectorSimilarity", _var("entity"), _lit("cats"), _lit("idx"),
+                 function_iri=VG_VECTOR_SIMILARITY)
+    plan = PlanV2(kind=KIND_EXTEND, extend_var="score", extend_expr=expr,
+                  hints={"vg_top_k": {"limit": 7}}, children=[_leaf_bgp()])
+    sql = _try_vector_driving_extend(plan, ctx, "SELECT v0, v0__uuid FROM test_space_rdf_quad")
+    (req,) = ctx.ann_requests
+    assert req.limit == 7 and req.vector_request is ctx.vector_requests[0]
+    body = sql[sql.index(req.begin_marker):sql.index(req.end_marker)]
+    assert "LIMIT 7" in body
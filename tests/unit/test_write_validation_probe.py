@@ -0,0 +1,103 @@
+"""`probe_subjects` answers write-path validation from UUIDs alone.
+
+The batched validation layer exists to replace one SPARQL ASK per object
+with one primary-key probe per request. What makes that correct is that the
+subject, type and owner UUIDs are the deterministic term UUIDs — computed
+in Python, never looked up — and that results are mapped back to URIs
+without a term-table join. These tests pin exactly that against a scripted
+pool: one statement, no term table, UUID parameters that match
+`_generate_term_uuid`, and flags mapped to the right URI.
+"""
+
+from vitalgraph.db.sparql_sql.sparql_sql_space_impl import (
+    SparqlSQLSpaceImpl, _generate_term_uuid,
+)
+
+G = "http://example.org/graph/g"
+KGFRAME = "http://vital.ai/ontology/haley-ai-kg#KGFrame"
+HAS_KG_GRAPH_URI = "http://vital.ai/ontology/haley-ai-kg#hasKGGraphURI"
+ENTITY = "http://example.org/entity/e"
+FRAME = "http://example.org/frame/f"
+OTHER = "http://example.org/frame/other"
+MISSING = "http://example.org/frame/missing"
+
+
+class _Conn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, sql, *args):
+        self.calls.append((sql, args))
+        return self.rows
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        conn = self.conn
+
+        class _Ctx:
+            async def __aenter__(self):
+                return conn
+
+            async def __aexit__(self, *a):
+                return False
+        return _Ctx()
+
+
+def _impl(rows):
+    impl = SparqlSQLSpaceImpl.__new__(SparqlSQLSpaceImpl)
+
+    class _Schema:
+        @staticmethod
+        def get_table_names(space_id):
+            return {"rdf_quad": f"{space_id}_rdf_quad", "term": f"{space_id}_term"}
+
+    conn = _Conn(rows)
+
+    class _DB:
+        _pool = _Pool(conn)
+
+    impl.schema = _Schema()
+    impl.db_impl = _DB()
+    return impl, conn
+
+
+async def test_one_probe_without_a_term_join():
+    rows = [
+        {"subject_uuid": _generate_term_uuid(FRAME, "U"), "has_type": True, "owned": True},
+        {"subject_uuid": _generate_term_uuid(OTHER, "U"), "has_type": True, "owned": None},
+    ]
+    impl, conn = _impl(rows)
+    found = await impl.probe_subjects("sp", G, [FRAME, OTHER, MISSING],
+                                      KGFRAME, HAS_KG_GRAPH_URI, ENTITY)
+
+    assert found == {FRAME: (True, True), OTHER: (True, False)}
+    assert len(conn.calls) == 1
+    sql, args = conn.calls[0]
+    assert "sp_term" not in sql and "GROUP BY subject_uuid" in sql
+    assert set(args[0]) == {_generate_term_uuid(u, "U") for u in (FRAME, OTHER, MISSING)}
+    assert args[1:] == (
+        _generate_term_uuid(G, "U"),
+        _generate_term_uuid("http://www.w3.org/1999/02/22-rdf-syntax-ns#type", "U"),
+        _generate_term_uuid(KGFRAME, "U"),
+        _generate_term_uuid(HAS_KG_GRAPH_URI, "U"),
+        _generate_term_uuid(ENTITY, "U"),
+    )
+
+
+async def test_no_owner_and_no_uris():
+    impl, conn = _impl([])
+    assert await impl.probe_subjects("sp", G, [FRAME], KGFRAME, HAS_KG_GRAPH_URI) == {}
+    assert conn.calls[0][1][-1] is None
+    assert await impl.probe_subjects("sp", G, [], KGFRAME, HAS_KG_GRAPH_URI) == {}
+    assert len(conn.calls) == 1
+
+
+async def test_check_subjects_exist_maps_uuids_back_without_a_join():
+    impl, conn = _impl([{"subject_uuid": _generate_term_uuid(FRAME, "U")}])
+    assert await impl.check_subjects_exist("sp", G, [FRAME, MISSING]) == [FRAME]
+    assert "sp_term" not in conn.calls[0][0]
@@ -26,7 +26,8 @@ from tabulate import tabulate
 
 # Import VitalGraphDB components
 from vitalgraph.config.config_loader import VitalGraphConfig
-from vitalgraph.impl.vitalgraph_impl import VitalGraphImpl
+# VitalGraphImpl (the whole server stack) is imported by connect, so that
+# --help and argument errors return at once.
 # GraphImportOp removed — import is now handled by standalone vitalgraphimport CLI
 
 
@@ -193,6 +194,7 @@ class VitalGraphDBAdminREPL:
             
             # Create VitalGraphImpl instance with the loaded config
             print("Initializing VitalGraph implementation...")
+            from vitalgraph.impl.vitalgraph_impl import VitalGraphImpl
             self.vital_graph_impl = VitalGraphImpl(config=self.config)
             
             backend_type = self.config.get_backend_config().get('type', 'sparql_sql')
@@ -606,13 +608,15 @@ class VitalGraphDBAdminREPL:
         
         if not args:
             print("Usage: rebuild <subcommand> [space_id]")
-            print("Available subcommands: indexes, index, stats, analyze, vacuum, resync")
+            print("Available subcommands: indexes, index, stats, analyze, vacuum, resync, property-tables")
             print("  rebuild indexes             - Rebuild all space indexes")
             print("  rebuild index <space_id>    - Rebuild indexes for specific space")
             print("  rebuild stats [space_id]    - Rebuild query optimizer statistics")
             print("  rebuild analyze [space_id]  - Run ANALYZE on space tables")
             print("  rebuild vacuum [space_id]   - Run VACUUM on space tables")
             print("  rebuild resync [space_id]   - Resync auxiliary tables (edge, frame_entity, stats)")
+            print("  rebuild property-tables <space_id> [name ...]")
+            print("                              - Rebuild declared property tables (all, or the named ones)")
             return True
         
         subcommand = args[0].lower()
@@ -635,9 +639,11 @@ class VitalGraphDBAdminREPL:
             return self.cmd_rebuild_vacuum(args[1:])
         elif subcommand == 'resync':
             return self.cmd_rebuild_resync(args[1:])
+        elif subcommand in ('property-tables', 'property_tables'):
+            return self.cmd_rebuild_property_tables(args[1:])
         else:
             print(f"Unknown rebuild subcommand: {subcommand}")
-            print("Available subcommands: indexes, index, stats, analyze, vacuum, resync")
+            print("Available subcommands: indexes, index, stats, analyze, vacuum, resync, property-tables")
         
         return True
     
@@ -979,6 +985,7 @@ class VitalGraphDBAdminREPL:
                         print(f"   ✅ frame_entity: {result['frame_entity_rows']:>10,} rows")
                         print(f"   ✅ pred_stats:   {result['pred_stats_rows']:>10,} rows")
                         print(f"   ✅ quad_stats:   {result['quad_stats_rows']:>10,} rows")
+                        print(f"   ✅ property:     {result.get('property_table_rows', 0):>10,} rows")
                 except Exception as e:
                     print(f"   ❌ Resync failed: {e}")
             
@@ -991,6 +998,58 @@ class VitalGraphDBAdminREPL:
         
         return True
     
+    def cmd_rebuild_property_tables(self, args: list[str]) -> bool:
+        """Rebuild declared property tables of a space and re-evaluate status.
+
+        A table left 'degraded' (a declared property turned out multi-valued)
+        or 'building' (after a WHERE-bound SPARQL UPDATE) is only used by
+        query rewrites again after a rebuild finds it clean.
+        """
+        if not self.connected:
+            print("❌ Not connected to database. Use 'connect;' first.")
+            return True
+        
+        backend_type = self.config.get_backend_config().get('type', 'sparql_sql')
+        if backend_type != 'sparql_sql':
+            print("❌ Property tables are only available for the sparql_sql backend.")
+            return True
+        
+        if not args:
+            print("Usage: rebuild property-tables <space_id> [name ...]")
+            return True
+        
+        space_id = args[0]
+        names = args[1:] or None
+        
+        async def _do_rebuild(sid, table_names):
+            pool = getattr(self.db_impl, 'connection_pool', None)
+            if not pool:
+                print("❌ No connection pool available")
+                return
+            
+            from vitalgraph.db.sparql_sql.ensure_property_table import (
+                load_property_tables, rebuild_property_tables,
+            )
+            
+            print(f"\n🔄 Rebuilding property tables for space '{sid}'...")
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    counts = await rebuild_property_tables(conn, sid, table_names)
+                defs = await load_property_tables(conn, sid, use_cache=False)
+            if not counts:
+                print("   No property tables declared.")
+                return
+            status = {d.name: d.status for d in defs}
+            for name, rows in counts.items():
+                print(f"   ✅ {name:<24} {rows:>10,} rows  [{status.get(name, '?')}]")
+        
+        try:
+            self._run_async(_do_rebuild(space_id, names))
+        except Exception as e:
+            print(f"❌ Property table rebuild failed: {e}")
+        
+        return True
+    
     def cmd_reindex(self, args: list[str]) -> bool:
         """Reindex database indexes for a specific space (synonym for rebuild index)."""
         if not self.connected:
@@ -1724,6 +1783,8 @@ class VitalGraphDBAdminREPL:
   rebuild analyze [space_id];- Run ANALYZE on space tables
   rebuild vacuum [space_id]; - Run VACUUM on space tables
   rebuild resync [space_id]; - Resync auxiliary tables (edge, frame_entity, stats)
+  rebuild property-tables <space_id> [name ...];
+                             - Rebuild declared property tables
   clear <space-id>;          - Clear data within a space but leave the space in place
 
 🌐 Space Management:
@@ -1778,6 +1839,7 @@ Note: All commands must end with a semicolon (;)
             self.config = VitalGraphConfig()
             
             # Create VitalGraphImpl instance with the loaded config
+            from vitalgraph.impl.vitalgraph_impl import VitalGraphImpl
             self.vital_graph_impl = VitalGraphImpl(config=self.config)
             
             backend_type = self.config.get_backend_config().get('type', 'sparql_sql')
@@ -1009,6 +1009,8 @@ class AgentRegistryImpl:
         embeddings = await provider.vectorize_texts([query_text])
         query_embedding = embeddings[0]
 
+        from vitalgraph.db.vector_codec import vector_arg
+
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(
                 f"SELECT v.agent_id, v.search_text, "
@@ -1019,7 +1021,7 @@ class AgentRegistryImpl:
                 f"AND v.{emb_col} IS NOT NULL "
                 f"ORDER BY v.{emb_col} <=> $1::vector "
                 f"LIMIT $2",
-                str(query_embedding), limit,
+                await vector_arg(conn, query_embedding), limit,
             )
 
             results = []
@@ -18,6 +18,7 @@ from typing import List, Optional
 
 import asyncpg
 
+from vitalgraph.db.vector_codec import copy_upsert_vectors
 from vitalgraph.agent_registry.agent_registry_vector_schema import (
     AGENT_VECTOR_TABLE, FTS_AGENT_TABLE,
 )
@@ -170,17 +171,16 @@ class AgentRegistryVectorPopulator:
 
         # Insert into vector + FTS tables
         async with self.pool.acquire() as conn:
-            await conn.executemany(f"""
-                INSERT INTO {AGENT_VECTOR_TABLE} (subject_uuid, agent_id, {self._embedding_column}, search_text, updated_time)
-                VALUES ($1, $2, $3, $4, CURRENT_TIMESTAMP)
-                ON CONFLICT (subject_uuid) DO UPDATE
-                SET {self._embedding_column} = EXCLUDED.{self._embedding_column},
-                    search_text = EXCLUDED.search_text,
-                    updated_time = CURRENT_TIMESTAMP
-            """, [
-                (str(rec[0]), rec[1], embeddings[idx], rec[2])
-                for idx, rec in enumerate(records)
-            ])
+            # One binary COPY + merge for the batch
+            await copy_upsert_vectors(
+                conn, AGENT_VECTOR_TABLE,
+                ('subject_uuid', 'agent_id', self._embedding_column, 'search_text'),
+                [(str(rec[0]), rec[1], embeddings[idx], rec[2])
+                 for idx, rec in enumerate(records)],
+                conflict_columns=('subject_uuid',),
+                vector_column=self._embedding_column,
+                update_columns=(self._embedding_column, 'search_text'),
+            )
 
             await conn.executemany(f"""
                 INSERT INTO {FTS_AGENT_TABLE} (subject_uuid, agent_id, search_text, updated_time)
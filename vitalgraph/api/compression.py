@@ -0,0 +1,509 @@
+"""Negotiated response compression.
+
+Entity graphs, KGQuery pages, JSON-quad exports and SPARQL results are
+large, highly repetitive JSON — the same few predicate URIs and graph URI
+on every quad — and they went out uncompressed. A 20k-quad page is
+several MB on the wire and typically shrinks 10-20x.
+
+Pure ASGI, like `request_bounds`, so a streamed body (exports, SPARQL
+results) is compressed chunk by chunk instead of being buffered whole.
+Each chunk is flushed at a block boundary so a stream keeps making
+visible progress — the client-side stall detection and the transfer
+stall fence would otherwise see silence while the compressor waits for
+more input.
+
+NEGOTIATION. ``Accept-Encoding`` q-values decide; on a tie the server's
+order wins (zstd, br, gzip — cheapest to decode first). zstd and br need
+their optional libraries (``zstandard``, ``brotli``) and are simply not
+offered without them; gzip is always available. ``identity;q=0`` or an
+empty match leaves the response alone.
+
+WHAT IS LEFT ALONE:
+  - bodies under ``VITALGRAPH_COMPRESS_MIN_BYTES`` (1024; 0 disables) —
+    the header and CPU cost more than they save;
+  - content types that are already compressed or opaque (anything not
+    text / JSON / RDF, e.g. file downloads);
+  - responses that already carry a Content-Encoding or a Content-Range;
+  - 204 / 304 and HEAD.
+
+A compressed response's strong ETag is weakened (``W/``), as RFC 9110
+requires for a representation whose bytes depend on the coding. The
+ETag validators in `cache.etag_cache` compare weakly, so a client
+revalidating with either form still gets its 304.
+
+REQUEST BODIES. The client bulk writer gzips its chunks —
+quad JSON shrinks about as well on the way up as on the way down. A
+request with ``Content-Encoding`` is inflated here, chunk by chunk as
+``receive`` is called, and the app sees an identity body with the
+coding and length headers removed; the stall fence in `request_bounds`
+still sees every chunk arrive. An unknown coding is a 415 naming the
+ones that work (RFC 9110 §15.5.16), a corrupt body a 400, and a body
+inflating past ``VITALGRAPH_MAX_DECODED_REQUEST_BYTES`` (256 MiB; 0
+disables) a 413 — a few KB of gzip can expand a thousandfold, so the
+limit is on the decoded size, not the bytes on the wire, and each chunk
+is inflated only up to what is left of it: a bomb costs the limit in
+memory, not its full expansion. br is accepted only where brotli can
+cap its output (1.2+).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:  # optional: pip install zstandard
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - depends on the environment
+    _zstd = None
+
+try:  # optional: pip install brotli
+    import brotli as _brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    _brotli = None
+
+
+_DEFAULT_MIN_BYTES = 1024
+
+_COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/ld+json",
+    "application/n-quads",
+    "application/n-triples",
+    "application/sparql-results+json",
+    "application/sparql-results+xml",
+    "application/rdf+xml",
+    "application/xml",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/openmetrics-text",
+    "text/",
+)
+
+
+_DEFAULT_MAX_DECODED_BYTES = 256 * 1024 * 1024
+
+
+def _max_decoded_bytes() -> int:
+    raw = os.environ.get("VITALGRAPH_MAX_DECODED_REQUEST_BYTES")
+    if raw is None:
+        return _DEFAULT_MAX_DECODED_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("VITALGRAPH_MAX_DECODED_REQUEST_BYTES=%r is not an integer; "
+                       "using %s", raw, _DEFAULT_MAX_DECODED_BYTES)
+        return _DEFAULT_MAX_DECODED_BYTES
+
+
+def _min_bytes() -> int:
+    raw = os.environ.get("VITALGRAPH_COMPRESS_MIN_BYTES")
+    if raw is None:
+        return _DEFAULT_MIN_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("VITALGRAPH_COMPRESS_MIN_BYTES=%r is not an integer; "
+                       "using %s", raw, _DEFAULT_MIN_BYTES)
+        return _DEFAULT_MIN_BYTES
+
+
+# ---------------------------------------------------------------------------
+# Encoders — one object per response, compress(chunk) / finish()
+# ---------------------------------------------------------------------------
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._c = zlib.compressobj(5, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush(zlib.Z_FINISH)
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        self._c = _zstd.ZstdCompressor(level=3).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data) + self._c.flush(_zstd.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush(_zstd.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._c = _brotli.Compressor(quality=4)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+# ---------------------------------------------------------------------------
+# Decoders — request bodies, one object per request, decompress(chunk)
+#
+# ``decompress(data, max_length)`` stops producing output once it has more
+# than ``max_length`` bytes (None = no bound), so a bomb is refused after the
+# limit plus one step, not after it has been inflated whole.
+# ---------------------------------------------------------------------------
+
+_DECODE_STEP = 64 * 1024
+
+
+class _GunzipDecoder:
+    def __init__(self) -> None:
+        self._d = zlib.decompressobj(31)
+
+    def decompress(self, data: bytes, max_length: Optional[int] = None) -> bytes:
+        if max_length is None:
+            return self._d.decompress(data)
+        # max_length + 1: output short of it means the input is used up.
+        return self._d.decompress(data, max_length + 1)
+
+    def finish(self) -> bytes:
+        tail = self._d.flush()
+        if not self._d.eof:
+            raise zlib.error("truncated gzip stream")
+        return tail
+
+
+class _DecodeLimitReached(Exception):
+    pass
+
+
+class _BoundedSink:
+    """Write target for zstd's stream writer, which emits its output in
+    ``_DECODE_STEP`` pieces: stops the writer once past ``max_length``."""
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.max_length: Optional[int] = None
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        if self.max_length is not None and self.size > self.max_length:
+            raise _DecodeLimitReached()
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks, self.size = [], 0
+        return data
+
+
+class _ZstdDecoder:
+    def __init__(self) -> None:
+        self._sink = _BoundedSink()
+        self._w = _zstd.ZstdDecompressor().stream_writer(self._sink, write_size=_DECODE_STEP)
+
+    def decompress(self, data: bytes, max_length: Optional[int] = None) -> bytes:
+        self._sink.max_length = max_length
+        try:
+            self._w.write(data)
+        except _DecodeLimitReached:
+            pass
+        return self._sink.take()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _BrotliDecoder:
+    def __init__(self) -> None:
+        self._d = _brotli.Decompressor()
+
+    def decompress(self, data: bytes, max_length: Optional[int] = None) -> bytes:
+        if max_length is None:
+            return self._d.process(data)
+        out = [self._d.process(data, output_buffer_limit=_DECODE_STEP)]
+        size = len(out[0])
+        # Output still pending inside the decoder is drained one step at a time.
+        while size <= max_length and not self._d.can_accept_more_data():
+            out.append(self._d.process(b"", output_buffer_limit=_DECODE_STEP))
+            size += len(out[-1])
+        return b"".join(out)
+
+    def finish(self) -> bytes:
+        if not self._d.is_finished():
+            raise ValueError("truncated brotli stream")
+        return b""
+
+
+def _brotli_bounded() -> bool:
+    """Whether the installed brotli can cap its output (brotli >= 1.2)."""
+    try:
+        _brotli.Decompressor().process(b"", output_buffer_limit=1)
+    except TypeError:
+        return False
+    return True
+
+
+def available_decoders() -> List[Tuple[str, Callable]]:
+    """Request content codings this process can inflate."""
+    decoders = []
+    if _zstd is not None:
+        decoders.append(("zstd", _ZstdDecoder))
+    if _brotli is not None and _brotli_bounded():
+        decoders.append(("br", _BrotliDecoder))
+    decoders.append(("gzip", _GunzipDecoder))
+    decoders.append(("x-gzip", _GunzipDecoder))
+    return decoders
+
+
+class RequestBodyDecodeError(Exception):
+    """A compressed request body that cannot be (or may not be) inflated."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def available_encodings() -> List[Tuple[str, Callable]]:
+    """Encodings this process can produce, in server preference order."""
+    encodings = []
+    if _zstd is not None:
+        encodings.append(("zstd", _Zstd))
+    if _brotli is not None:
+        encodings.append(("br", _Brotli))
+    encodings.append(("gzip", _Gzip))
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str],
+                       offered: Optional[List[str]] = None) -> Optional[str]:
+    """Pick a content coding for ``Accept-Encoding`` (RFC 9110 §12.5.3), or None.
+
+    Highest q wins; the server's order (``offered``) breaks ties. ``*``
+    stands for every coding not listed explicitly.
+    """
+    if not accept_encoding:
+        return None
+    if offered is None:
+        offered = [name for name, _ in available_encodings()]
+    weights = {}
+    for part in accept_encoding.split(","):
+        fields = part.strip().split(";")
+        coding = fields[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    best, best_q = None, 0.0
+    for coding in offered:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _is_compressible(content_type: str) -> bool:
+    ct = content_type.split(";", 1)[0].strip().lower()
+    return any(ct.startswith(t) if t.endswith("/") else ct == t
+               for t in _COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """Compress eligible responses with the best coding the client accepts."""
+
+    def __init__(self, app, minimum_size: Optional[int] = None,
+                 max_decoded_size: Optional[int] = None) -> None:
+        self.app = app
+        self.minimum_size = _min_bytes() if minimum_size is None else minimum_size
+        self.max_decoded_size = (_max_decoded_bytes() if max_decoded_size is None
+                                 else max_decoded_size)
+        self.encoders = dict(available_encodings())
+        self.decoders = dict(available_decoders())
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope.get("type") == "http":
+            for name, value in scope.get("headers", ()):
+                if name == b"content-encoding":
+                    await self._decoded(scope, receive, send,
+                                        value.decode("latin-1").strip().lower())
+                    return
+        await self._respond(scope, receive, send)
+
+    async def _respond(self, scope, receive, send) -> None:
+        if scope.get("type") != "http" or scope.get("method") == "HEAD" \
+                or self.minimum_size <= 0:
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        coding = negotiate_encoding(accept, list(self.encoders))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(
+            send, coding, self.encoders[coding], self.minimum_size))
+
+    async def _decoded(self, scope, receive, send, coding: str) -> None:
+        """Run the request with its body inflated from ``coding``."""
+        if coding == "identity":
+            decoder_cls = None
+        else:
+            decoder_cls = self.decoders.get(coding)
+            if decoder_cls is None:
+                supported = ", ".join(name for name in self.decoders if name != "x-gzip")
+                await _send_error(send, 415, f"Unsupported request Content-Encoding {coding!r}",
+                                  [(b"accept-encoding", supported.encode("latin-1"))])
+                return
+        # The inflated length is unknown up front, so Content-Length goes too.
+        dropped = ((b"content-encoding",) if decoder_cls is None
+                   else (b"content-encoding", b"content-length"))
+        scope = dict(scope)
+        scope["headers"] = [(k, v) for k, v in scope["headers"] if k not in dropped]
+        if decoder_cls is not None:
+            receive = _DecodingReceive(receive, decoder_cls(), self.max_decoded_size)
+        started = False
+
+        async def tracking_send(message) -> None:
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self._respond(scope, receive, tracking_send)
+        except RequestBodyDecodeError as e:
+            if started:
+                raise
+            logger.info("Rejected %s request body: %s", coding, e.detail)
+            await _send_error(send, e.status_code, e.detail)
+
+
+async def _send_error(send, status: int, detail: str, extra_headers=()) -> None:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"),
+                            (b"content-length", str(len(body)).encode("latin-1")),
+                            *extra_headers]})
+    await send({"type": "http.response.body", "body": body})
+
+
+class _DecodingReceive:
+    """The ``receive`` wrapper for a compressed request body."""
+
+    def __init__(self, receive, decoder, limit: int) -> None:
+        self.receive = receive
+        self.decoder = decoder
+        self.limit = limit
+        self.decoded = 0
+
+    async def __call__(self):
+        message = await self.receive()
+        if message["type"] != "http.request":
+            return message
+        more = message.get("more_body", False)
+        # Only what is left of the limit is inflated; one byte past it is a 413.
+        remaining = self.limit - self.decoded if self.limit else None
+        try:
+            data = self.decoder.decompress(message.get("body", b""), remaining)
+            if not more and (remaining is None or len(data) <= remaining):
+                data += self.decoder.finish()
+        except Exception as e:
+            raise RequestBodyDecodeError(400, f"Malformed compressed request body: {e}") from e
+        self.decoded += len(data)
+        if self.limit and self.decoded > self.limit:
+            raise RequestBodyDecodeError(
+                413, f"Request body exceeds {self.limit} bytes once decompressed")
+        return {"type": "http.request", "body": data, "more_body": more}
+
+
+class _CompressingSend:
+    """The ``send`` wrapper: holds back ``http.response.start`` until the
+    first body chunk shows whether compressing is worth it."""
+
+    def __init__(self, send, coding: str, encoder_cls, minimum_size: int) -> None:
+        self.send = send
+        self.coding = coding
+        self.encoder_cls = encoder_cls
+        self.minimum_size = minimum_size
+        self.start = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            self.start = message
+            headers = {k.lower(): v for k, v in message.get("headers", ())}
+            if (message["status"] in (204, 304) or message["status"] < 200
+                    or b"content-encoding" in headers
+                    or b"content-range" in headers
+                    or not _is_compressible(
+                        headers.get(b"content-type", b"").decode("latin-1"))):
+                self.passthrough = True
+                await self.send(message)
+            return
+        if kind != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.encoder is None:
+            if not more and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            self.encoder = self.encoder_cls()
+            if more:
+                await self.send(self._start_headers(None))
+            else:
+                data = self.encoder.compress(body) + self.encoder.finish()
+                await self.send(self._start_headers(len(data)))
+                await self.send({"type": "http.response.body", "body": data})
+                return
+
+        data = self.encoder.compress(body) if body else b""
+        if not more:
+            data += self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more})
+
+    def _start_headers(self, length: Optional[int]):
+        headers = []
+        vary = None
+        for name, value in self.start.get("headers", ()):
+            lname = name.lower()
+            if lname == b"content-length":
+                continue
+            if lname == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            if lname == b"vary":
+                vary = value
+                continue
+            headers.append((name, value))
+        headers.append((b"content-encoding", self.coding.encode("latin-1")))
+        if vary is None:
+            vary = b"Accept-Encoding"
+        elif b"accept-encoding" not in vary.lower():
+            vary = vary + b", Accept-Encoding"
+        headers.append((b"vary", vary))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**self.start, "headers": headers}
@@ -0,0 +1,98 @@
+"""Serialize quad-bearing response models once, without re-validating them.
+
+FastAPI does not trust a returned model. For a route with a
+``response_model`` it dumps the object, validates the dump against the
+response model again — every ``Quad`` of a 20k-quad entity graph
+rebuilt and checked a second time — and only then serializes. The
+endpoints here have just built those models from their own quads, so
+the second validation buys nothing and was the largest serialization
+cost on bulk reads.
+
+``FastModelRoute`` is an ``APIRoute`` for routers that return such
+models. When a handler returns an instance of (one of) the route's
+declared response model classes, the instance is written straight to
+JSON by pydantic-core's serializer and returned as a ready ``Response``;
+FastAPI passes a ``Response`` through untouched. Anything else — dicts,
+other models, routes using ``response_model_exclude_*`` or include
+filters — takes FastAPI's normal path, so the fast path can only ever
+produce the bytes FastAPI would have.
+
+Headers and a status code set on an injected ``Response`` parameter
+(the ETag from `cache.etag_cache`, for one) are carried over, since
+FastAPI only merges those into responses it builds itself.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import typing
+from typing import Any, Callable, Tuple
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class ModelJSONResponse(Response):
+    """A response model instance, serialized by pydantic-core in one pass."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content, by_alias=True)
+        return super().render(content)
+
+
+def _model_classes(response_model: Any) -> Tuple[type, ...]:
+    """Concrete BaseModel classes a ``response_model`` admits (unions unpacked)."""
+    if inspect.isclass(response_model) and issubclass(response_model, BaseModel):
+        return (response_model,)
+    if typing.get_origin(response_model) is typing.Union:
+        classes = ()
+        for arg in typing.get_args(response_model):
+            classes += _model_classes(arg)
+        return classes
+    return ()
+
+
+class FastModelRoute(APIRoute):
+    """``APIRoute`` that skips FastAPI's response re-validation for the
+    route's own response models (see the module docstring)."""
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        fast: dict = {"types": (), "status": 200}
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _fast_endpoint(endpoint, fast)
+        super().__init__(path, endpoint, **kwargs)
+        plain = (self.response_model_include is None
+                 and self.response_model_exclude is None
+                 and not self.response_model_exclude_unset
+                 and not self.response_model_exclude_defaults
+                 and not self.response_model_exclude_none
+                 and self.response_model_by_alias
+                 and isinstance(kwargs.get("response_class", DefaultPlaceholder(None)),
+                                DefaultPlaceholder))
+        if plain:
+            fast["types"] = _model_classes(self.response_model)
+        fast["status"] = self.status_code or 200
+
+
+def _fast_endpoint(endpoint: Callable[..., Any], fast: dict) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def wrapped(*args: Any, **kwargs: Any) -> Any:
+        result = await endpoint(*args, **kwargs)
+        if type(result) not in fast["types"]:
+            return result
+        response = ModelJSONResponse(result, status_code=fast["status"])
+        for value in kwargs.values():
+            if isinstance(value, Response) and not isinstance(value, ModelJSONResponse):
+                # FastAPI's injected sub-response: status is None unless set.
+                if value.status_code:
+                    response.status_code = value.status_code
+                response.raw_headers.extend(
+                    (k, v) for k, v in value.raw_headers if k != b"content-length")
+        return response
+    return wrapped
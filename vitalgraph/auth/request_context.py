@@ -4,13 +4,18 @@ Request context for audit logging.
 Uses contextvars to capture IP and user-agent from the incoming request
 so audit events can include client information without threading Request
 objects through the entire call stack.
+
+Also carries the user a batch request authenticated as, so the operations
+it dispatches in-process reuse that user instead of verifying the same
+token once per operation.
 """
 
-from contextvars import ContextVar
-from typing import Optional
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
 
 _request_ip: ContextVar[Optional[str]] = ContextVar("request_ip", default=None)
 _request_ua: ContextVar[Optional[str]] = ContextVar("request_ua", default=None)
+_authenticated_user: ContextVar[Optional[Dict]] = ContextVar("authenticated_user", default=None)
 
 
 def set_request_context(ip: Optional[str], user_agent: Optional[str]) -> None:
@@ -24,3 +29,17 @@ def get_request_ip() -> Optional[str]:
 
 def get_request_ua() -> Optional[str]:
     return _request_ua.get()
+
+
+def set_authenticated_user(user: Optional[Dict]) -> Token:
+    """Mark the rest of this context as already authenticated as ``user``;
+    reset with the returned token."""
+    return _authenticated_user.set(user)
+
+
+def reset_authenticated_user(token: Token) -> None:
+    _authenticated_user.reset(token)
+
+
+def get_authenticated_user() -> Optional[Dict]:
+    return _authenticated_user.get()
@@ -14,6 +14,7 @@ from fastapi.security import OAuth2PasswordBearer
 from .api_key import is_api_key, extract_prefix, verify_api_key
 from .audit import emit_audit_event
 from .jwt_auth import JWTAuth
+from .request_context import get_authenticated_user
 from .password import hash_password, verify_password
 from .token_version_cache import TokenVersionCache
 
@@ -49,6 +50,10 @@ class VitalGraphAuth:
         # within this process after that.
         self._bootstrap_retired: bool = False
 
+        # Single-user mode: auth disabled for a backend with no user store
+        # (embedded Oxigraph). Every caller is this one local admin.
+        self._single_user: Optional[Dict] = None
+
     def set_db_impl(self, db_impl) -> None:
         """Set or update the database implementation reference."""
         self.db_impl = db_impl
@@ -71,6 +76,26 @@ class VitalGraphAuth:
             "spaces": {},
         }
 
+    def enable_single_user(self, username: str = "local") -> None:
+        """Disable authentication: every request runs as one local admin.
+
+        For backends with no user, API key or permission tables (embedded
+        Oxigraph), where there is nothing to check a credential against.
+        Requests need no token, login accepts any credentials and issues
+        tokens for the local user, and the bootstrap admin is never used —
+        the server only enters this mode when its config asks for it.
+        """
+        self._single_user = {
+            "username": username,
+            "full_name": "Local User",
+            "email": "",
+            "role": "admin",
+            "is_active": True,
+            "token_version": 0,
+            "spaces": {},
+        }
+        logger.warning(f"Authentication disabled: single-user mode as '{username}'")
+
     async def _bootstrap_available(self, username: str) -> bool:
         """Whether the bootstrap admin may be used for ``username`` right now.
 
@@ -81,6 +106,8 @@ class VitalGraphAuth:
         If the DB is unreachable the service has no functionality anyway, so we
         do NOT enable bootstrap on error — it returns False rather than fail-open.
         """
+        if self._single_user is not None:
+            return False
         if not self._bootstrap_admin or self._bootstrap_retired:
             return False
         if self._bootstrap_admin["username"] != username:
@@ -103,7 +130,12 @@ class VitalGraphAuth:
 
         Checks the database first. Falls back to bootstrap admin if no
         DB users exist. Returns user dict on success, None on failure.
+        In single-user mode there is nothing to check against: the local
+        user is returned.
         """
+        if self._single_user is not None:
+            return dict(self._single_user)
+
         user = await self._get_user_from_db(username)
 
         if user is None:
@@ -142,6 +174,10 @@ class VitalGraphAuth:
 
     async def _get_user_from_db(self, username: str) -> Optional[Dict]:
         """Fetch user record from database including space access."""
+        if self._single_user is not None:
+            if username != self._single_user["username"]:
+                return None
+            return dict(self._single_user)
         if self.db_impl is None:
             return None
         try:
@@ -311,9 +347,21 @@ class VitalGraphAuth:
 
         The returned user dict includes: username, full_name, email, role, spaces.
         Token version is checked against an in-memory cache (with DB fallback)
-        to detect revoked tokens within the cache TTL window.
+        to detect revoked tokens within the cache TTL window. In single-user
+        mode the dependency takes no token and returns the local user.
         """
+        if self._single_user is not None:
+            async def get_local_user() -> Dict:
+                return dict(self._single_user)
+            return get_local_user
+
         async def get_current_user(token: str = Depends(self.oauth2_scheme)) -> Dict:
+            # An operation dispatched by a batch: the batch request already
+            # verified this same token.
+            batch_user = get_authenticated_user()
+            if batch_user is not None:
+                return batch_user
+
             # API key detection: vg_ prefix
             if is_api_key(token):
                 return await self._validate_api_key(token)
@@ -18,6 +18,8 @@ import time
 from collections import OrderedDict
 from typing import Dict, Optional, Tuple
 
+from ..db.sparql_sql.shared_connection import in_shared_transaction
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +42,13 @@ class CountCache:
         self._evictions_ttl: int = 0
         self._invalidations: int = 0
 
+        # Caches whose entries go stale exactly when this graph's counts do
+        # (the ETag validators). Every write path invalidates
+        # this cache (see invalidate_graph_caches for the routes that do not
+        # track entities), so they follow it rather than being wired into
+        # each of those paths separately.
+        self._listeners: list = []
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -51,6 +60,8 @@ class CountCache:
 
     def get(self, space_id: str, graph_id: str, sparql_hash: str) -> Optional[int]:
         """Return cached count or None on miss / TTL expiry."""
+        if in_shared_transaction():
+            return None
         key = (space_id, graph_id, sparql_hash)
         entry = self._cache.get(key)
         if entry is None:
@@ -67,7 +78,9 @@ class CountCache:
         return count
 
     def put(self, space_id: str, graph_id: str, sparql_hash: str, count: int) -> None:
-        """Store a count result."""
+        """Store a count result (not from inside a shared transaction)."""
+        if in_shared_transaction():
+            return
         key = (space_id, graph_id, sparql_hash)
         self._cache.pop(key, None)  # remove old entry if present
         self._cache[key] = (count, time.time())
@@ -82,6 +95,8 @@ class CountCache:
         for k in keys:
             self._cache.pop(k, None)
             self._invalidations += 1
+        for listener in self._listeners:
+            listener.invalidate_graph(space_id, graph_id)
 
     def invalidate_space(self, space_id: str) -> None:
         """Remove all cached counts for a given space."""
@@ -89,6 +104,14 @@ class CountCache:
         for k in keys:
             self._cache.pop(k, None)
             self._invalidations += 1
+        for listener in self._listeners:
+            listener.invalidate_space(space_id)
+
+    def add_listener(self, listener) -> None:
+        """Have ``listener.invalidate_graph`` / ``invalidate_space`` follow
+        this cache's invalidations."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
 
     # ------------------------------------------------------------------
     # Stats / observability
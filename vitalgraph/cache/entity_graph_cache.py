@@ -16,6 +16,8 @@ import zlib
 from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+from ..db.sparql_sql.shared_connection import in_shared_transaction
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,6 +60,8 @@ class EntityGraphCache:
 
     def get(self, space_id: str, graph_id: str, entity_uri: str) -> Optional[List[Any]]:
         """Return cached quads or None on miss / TTL expiry."""
+        if in_shared_transaction():
+            return None
         key = (space_id, graph_id, entity_uri)
         entry = self._cache.get(key)
         if entry is None:
@@ -74,7 +78,10 @@ class EntityGraphCache:
         return json.loads(zlib.decompress(compressed))
 
     def put(self, space_id: str, graph_id: str, entity_uri: str, quads: List[Any]) -> None:
-        """Compress and store quads. Silently skips if byte cap would be exceeded."""
+        """Compress and store quads. Silently skips if byte cap would be exceeded,
+        or inside a shared transaction (the quads may never commit)."""
+        if in_shared_transaction():
+            return
         key = (space_id, graph_id, entity_uri)
         # Remove old entry if present (reclaim bytes)
         if key in self._cache:
@@ -0,0 +1,204 @@
+"""
+Strong ETags and a validator cache for entity, frame and type reads.
+
+A client re-reading an unchanged entity graph used to pay for all of it
+again: the SPARQL fetch (or the EntityGraphCache decompress), the
+GraphObject → quad conversion and the transfer. With an ETag on the GET
+response the client can send ``If-None-Match`` and, when nothing changed,
+get an empty 304 instead.
+
+The ETag is a hash of the response's quads, canonicalised (each quad as
+sorted-key JSON, the lines sorted), so it depends only on the content:
+two instances serving the same entity agree on it, and an unchanged
+entity keeps its ETag across restarts. It is also salted with the
+representation (``entity`` vs ``graph`` for include_entity_graph), since
+those are different bodies for the same URI.
+
+Answering a 304 without reading anything needs the ETag to be known
+without the quads. ``ETagCache`` keeps the last ETag served per
+(space, graph, uri, representation). It is invalidated together with the
+count cache, so "a count for this graph may be stale" and "a validator for
+this graph may be stale" are the same event. ``CountCache.invalidate_graph``
+/ ``invalidate_space`` run locally on every write: the entity write paths,
+the type, frame, slot and triple routes (``invalidate_graph_caches`` in
+entity_graph_invalidation.py), the backend quad add/remove paths under
+/objects, import and kgrelations (``_invalidate_counts_for_quads``), the
+SPARQL update path and graph clear/drop. Other instances only learn of a
+write through the entity-graph NOTIFY, whose listener flushes the graph's
+counts for every payload it applies; all of the paths above send one,
+per entity or graph-wide. A SPARQL update names its graphs only where
+they are concrete, so one writing through ``GRAPH ?g``, the default
+graph or ``CLEAR ALL`` reaches peers only for entities this instance had
+cached; those peers, like any write made with SQL directly against the
+quad tables, keep their validators until the TTL expires.
+
+Per-graph is coarser than per-entity; the cost of the coarseness is only
+that a validator is recomputed from the quads (and a 304 still sent if
+they did not change).
+
+A validator missing from the cache is not a miss for the client: the
+read runs as before, the ETag is computed from what it returned, and if
+it equals ``If-None-Match`` the response is still a 304 — no body, no
+client-side parse.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..db.sparql_sql.shared_connection import in_shared_transaction
+
+logger = logging.getLogger(__name__)
+
+
+def compute_etag(representation: str, quads: Iterable[Any]) -> str:
+    """Strong ETag (quoted) for a quad list served as ``representation``."""
+    lines = []
+    for q in quads:
+        d = q.model_dump() if hasattr(q, 'model_dump') else q
+        lines.append(json.dumps(d, sort_keys=True, separators=(",", ":")))
+    lines.sort()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(representation.encode("utf-8"))
+    for line in lines:
+        h.update(b"\n")
+        h.update(line.encode("utf-8"))
+    return f'"{h.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """RFC 9110 ``If-None-Match`` evaluation (weak comparison) against ``etag``."""
+    if not if_none_match or not etag:
+        return False
+    value = if_none_match.strip()
+    if value == "*":
+        return True
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in value.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+    return False
+
+
+class ETagCache:
+    """LRU map of the last ETag served per (space, graph, uri, representation)."""
+
+    def __init__(self, max_entries: int = 50_000, ttl_seconds: float = 900):
+        self._cache: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+
+        # Counters for observability
+        self._hits: int = 0
+        self._misses: int = 0
+        self._not_modified: int = 0
+        self._invalidations: int = 0
+
+    def get(self, space_id: str, graph_id: str, uri: str,
+            representation: str) -> Optional[str]:
+        """Return the cached ETag or None on miss / TTL expiry."""
+        if in_shared_transaction():
+            return None
+        key = (space_id, graph_id, uri, representation)
+        entry = self._cache.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        etag, ts = entry
+        if time.time() - ts > self._ttl_seconds:
+            self._cache.pop(key, None)
+            self._misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self._hits += 1
+        return etag
+
+    def put(self, space_id: str, graph_id: str, uri: str,
+            representation: str, etag: str) -> None:
+        if in_shared_transaction():
+            return
+        key = (space_id, graph_id, uri, representation)
+        self._cache.pop(key, None)
+        self._cache[key] = (etag, time.time())
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
+
+    def record_not_modified(self) -> None:
+        self._not_modified += 1
+
+    def invalidate(self, space_id: str, graph_id: str, uri: str) -> None:
+        """Drop every representation's validator for one URI."""
+        keys = [k for k in self._cache
+                if k[0] == space_id and k[1] == graph_id and k[2] == uri]
+        for k in keys:
+            self._cache.pop(k, None)
+            self._invalidations += 1
+
+    def invalidate_graph(self, space_id: str, graph_id: str) -> None:
+        keys = [k for k in self._cache if k[0] == space_id and k[1] == graph_id]
+        for k in keys:
+            self._cache.pop(k, None)
+            self._invalidations += 1
+
+    def invalidate_space(self, space_id: str) -> None:
+        keys = [k for k in self._cache if k[0] == space_id]
+        for k in keys:
+            self._cache.pop(k, None)
+            self._invalidations += 1
+
+    @property
+    def stats(self) -> Dict:
+        total_requests = self._hits + self._misses
+        return {
+            "entries": len(self._cache),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / total_requests, 3) if total_requests else 0.0,
+            "not_modified": self._not_modified,
+            "invalidations": self._invalidations,
+        }
+
+
+# Module-level singleton — shared across all endpoint instances within one process.
+_etag_cache = ETagCache()
+
+
+def _register() -> None:
+    from .count_cache import _count_cache
+    _count_cache.add_listener(_etag_cache)
+
+
+_register()
+
+
+def not_modified_response(etag: str):
+    """An empty 304 carrying the validator, as RFC 9110 requires."""
+    from fastapi import Response
+    _etag_cache.record_not_modified()
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def conditional(space_id: str, graph_id: str, uri: str, representation: str,
+                quads, if_none_match: Optional[str],
+                response=None) -> Tuple[str, Optional[Any]]:
+    """Validate a freshly read quad list: compute and remember its ETag, set it
+    on ``response`` and return ``(etag, not_modified)`` — ``not_modified`` is a
+    304 response to return instead of the body, or None.
+
+    Only graph-scoped reads are remembered: invalidation is keyed by graph
+    URI, so a validator for an unnamed graph could not be invalidated.
+    """
+    etag = compute_etag(representation, quads)
+    if graph_id:
+        _etag_cache.put(space_id, graph_id, uri, representation, etag)
+    if etag_matches(if_none_match, etag):
+        return etag, not_modified_response(etag)
+    if response is not None:
+        response.headers["ETag"] = etag
+    return etag, None
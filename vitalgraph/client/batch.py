@@ -0,0 +1,318 @@
+"""VitalGraph Client Batch
+
+Collects KG calls and sends them as one ``POST /api/graphs/batch``.
+A workflow such as "get the entity, its frames and its
+relations, then upsert a correction" is four round trips one call at a
+time; inside a batch it is one, and the server runs the three reads
+concurrently.
+
+Operations are queued with ``add`` (any KG route) or the typed helpers, and
+each returns a ``BatchItem`` whose result is filled in when the batch runs —
+on leaving the ``async with`` block, or on an explicit ``execute()``. A
+block left by an exception sends nothing.
+
+- **Order.** Results follow the written order: a write sees every earlier
+  operation, later ones see it. Reads between writes are independent.
+- **Dependencies.** ``depends_on`` names earlier items (by ``id`` or the
+  item itself); an item whose dependency failed is skipped (424).
+- **Failure.** With ``stop_on_error`` (default) the first failed operation
+  skips the rest. Writes that already ran stay written — there is no
+  rollback, unless ``transactional`` is set: the server then runs the
+  operations one at a time in one transaction and rolls every write back
+  on the first failure (sparql_sql backends; others refuse a transactional
+  batch with writes). ``raise_on_error`` raises after the results are
+  filled in.
+- **Older servers.** A server without the batch route answers 404; the
+  operations are then sent one by one, in order, with the same skipping
+  rules, so code written against the batch works either way.
+
+Usage::
+
+    async with client.batch(space_id, graph_id) as batch:
+        entity = batch.get_kgentity(uri, include_entity_graph=True)
+        frames = batch.get_kgentity_frames(uri)
+        relations = batch.list_relations(entity_source_uri=uri)
+    objects = entity.objects()
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .utils.client_utils import VitalGraphClientError, build_query_params
+
+logger = logging.getLogger(__name__)
+
+_FAILED_DEPENDENCY = 424
+
+
+@dataclass
+class BatchItem:
+    """One queued operation, and its result once the batch has run."""
+
+    index: int
+    method: str
+    path: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    body: Any = None
+    id: Optional[str] = None
+    depends_on: List[str] = field(default_factory=list)
+
+    status_code: Optional[int] = None
+    response: Any = None
+    skipped: bool = False
+    elapsed_ms: float = 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.status_code is not None
+
+    @property
+    def success(self) -> bool:
+        """Ran, answered below 400, and did not report ``success: false``."""
+        if not self.done or self.skipped or self.status_code >= 400:
+            return False
+        return not (isinstance(self.response, dict) and self.response.get("success") is False)
+
+    def objects(self, vs=None) -> List[Any]:
+        """The response's quads as GraphObjects (requires VitalSigns)."""
+        from .utils.format_helpers import deserialize_response_to_graphobjects
+        from .utils.wire_format import ClientWireFormat
+        if not isinstance(self.response, dict):
+            return []
+        return deserialize_response_to_graphobjects(self.response, ClientWireFormat.JSON_QUADS, vs)
+
+    def to_wire(self) -> Dict[str, Any]:
+        op = {"id": self.id, "method": self.method, "path": self.path,
+              "params": self.params, "depends_on": self.depends_on}
+        if self.body is not None:
+            op["body"] = self.body
+        return op
+
+
+class ClientBatch:
+    """Queue of KG operations sent to one space as a single request."""
+
+    def __init__(self, client, space_id: str, graph_id: Optional[str] = None, *,
+                 stop_on_error: bool = True, max_parallel: Optional[int] = None,
+                 raise_on_error: bool = False, transactional: bool = False):
+        """
+        Args:
+            client: VitalGraphClient to send through
+            space_id: Space every operation targets
+            graph_id: Default graph_id for every operation
+            stop_on_error: Skip the remaining operations after a failure
+            max_parallel: Independent reads the server runs at once
+            raise_on_error: Raise VitalGraphClientError if any operation failed
+            transactional: All or nothing: roll every write back on a failure
+        """
+        self.client = client
+        self.space_id = space_id
+        self.graph_id = graph_id
+        self.stop_on_error = stop_on_error
+        self.max_parallel = max_parallel
+        self.raise_on_error = raise_on_error
+        self.transactional = transactional
+        self.rolled_back = False
+        self.items: List[BatchItem] = []
+        self.round_trips = 0
+        self.elapsed_seconds = 0.0
+        self._ids = (f"op{n}" for n in itertools.count())
+        self._executed = False
+
+    async def __aenter__(self) -> "ClientBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None and not self._executed:
+            await self.execute()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ------------------------------------------------------------------
+    # Queueing
+    # ------------------------------------------------------------------
+
+    def add(self, method: str, path: str, params: Optional[Dict[str, Any]] = None,
+            body: Any = None, depends_on: Sequence[Union[str, BatchItem]] = (),
+            id: Optional[str] = None) -> BatchItem:
+        """Queue any KG call.
+
+        Args:
+            method: GET, POST, PUT or DELETE
+            path: Route under /api/graphs (e.g. ``kgentities/kgframes``)
+            params: Query parameters; graph_id defaults to the batch's, and
+                space_id is always the batch's (setting it is an error)
+            body: JSON request body
+            depends_on: Earlier items (or their ids) that must succeed first
+            id: Name for this item (generated when depends_on needs one)
+        """
+        if self._executed:
+            raise VitalGraphClientError("Batch has already been executed")
+        if params and "space_id" in params:
+            raise VitalGraphClientError("space_id cannot be set per operation; "
+                                        "a batch runs against one space")
+        deps = []
+        for dep in depends_on:
+            if isinstance(dep, BatchItem):
+                if dep.id is None:
+                    dep.id = next(self._ids)
+                dep = dep.id
+            if not any(item.id == dep for item in self.items):
+                raise VitalGraphClientError(f"depends_on '{dep}' does not name an earlier operation")
+            deps.append(dep)
+        item = BatchItem(index=len(self.items), method=method.upper(), path=path.strip("/"),
+                         params=build_query_params(**(params or {})), body=body,
+                         id=id, depends_on=deps)
+        self.items.append(item)
+        return item
+
+    def get_kgentity(self, uri: str, include_entity_graph: bool = False, **params) -> BatchItem:
+        return self.add("GET", "kgentities", dict(
+            params, uri=uri, include_entity_graph=include_entity_graph))
+
+    def get_kgentity_frames(self, entity_uri: str, **params) -> BatchItem:
+        return self.add("GET", "kgentities/kgframes", dict(params, entity_uri=entity_uri))
+
+    def list_kgentities(self, **params) -> BatchItem:
+        return self.add("GET", "kgentities", params)
+
+    def list_relations(self, **params) -> BatchItem:
+        return self.add("GET", "kgrelations", params)
+
+    def query_kgentities(self, query: Dict[str, Any], **params) -> BatchItem:
+        return self.add("POST", "kgentities/query", params, body=query)
+
+    def upsert_kgentities(self, objects: List[Any], **params) -> BatchItem:
+        return self.add("POST", "kgentities", dict(params, operation_mode="upsert"),
+                        body=self._quads(objects))
+
+    def update_kgentities(self, objects: List[Any], **params) -> BatchItem:
+        return self.add("POST", "kgentities", dict(params, operation_mode="update"),
+                        body=self._quads(objects))
+
+    def delete_kgentity(self, uri: str, delete_entity_graph: bool = False, **params) -> BatchItem:
+        return self.add("DELETE", "kgentities", dict(
+            params, uri=uri, delete_entity_graph=delete_entity_graph))
+
+    @staticmethod
+    def _quads(objects: List[Any]) -> Any:
+        from .utils.format_helpers import serialize_graphobjects_for_request
+        from .utils.wire_format import ClientWireFormat
+        body, _ = serialize_graphobjects_for_request(objects, ClientWireFormat.JSON_QUADS)
+        return body
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    @property
+    def success(self) -> bool:
+        return not self.rolled_back and all(item.success for item in self.items)
+
+    async def execute(self) -> List[BatchItem]:
+        """Send the queued operations and fill in every item's result.
+
+        Raises:
+            VitalGraphClientError: The server refused the batch as a whole,
+                or ``raise_on_error`` is set and an operation failed
+        """
+        if self._executed:
+            raise VitalGraphClientError("Batch has already been executed")
+        self._executed = True
+        if not self.items:
+            return self.items
+
+        started = time.monotonic()
+        try:
+            data = await self._send_batch()
+        except VitalGraphClientError as e:
+            if getattr(e, "status_code", None) != 404:
+                raise
+            if self.transactional:
+                raise VitalGraphClientError(
+                    "Server has no batch route; a transactional batch cannot be "
+                    "sent one call at a time", status_code=404) from e
+            logger.warning("Server has no batch route; sending %d operations one by one",
+                           len(self.items))
+            await self._send_individually()
+        else:
+            if data.get("success") is False and not data.get("results"):
+                raise VitalGraphClientError(
+                    f"Batch refused: {data.get('status')}: {data.get('message', '')}".strip())
+            self.rolled_back = data.get("rolled_back", False)
+            for result in data.get("results", []):
+                item = self.items[result["index"]]
+                item.status_code = result["status_code"]
+                item.response = result.get("body")
+                item.skipped = result.get("skipped", False)
+                item.elapsed_ms = result.get("elapsed_ms", 0.0)
+        finally:
+            self.elapsed_seconds = time.monotonic() - started
+
+        if self.raise_on_error and not self.success:
+            failed = [item for item in self.items if not item.success]
+            first = failed[0]
+            raise VitalGraphClientError(
+                f"{len(failed)} batch operations did not succeed; first: "
+                f"{first.method} {first.path} -> {first.status_code}",
+                status_code=first.status_code)
+        return self.items
+
+    async def _send_batch(self) -> Dict[str, Any]:
+        url = f"{self.client.config.get_server_url()}/api/graphs/batch"
+        payload = {
+            "operations": [item.to_wire() for item in self.items],
+            "graph_id": self.graph_id,
+            "stop_on_error": self.stop_on_error,
+            "max_parallel": self.max_parallel,
+        }
+        if self.transactional:
+            payload["transactional"] = True
+        self.round_trips += 1
+        response = await self.client._make_authenticated_request(
+            "POST", url, params={"space_id": self.space_id}, json=payload,
+            idempotent=all(item.method == "GET" for item in self.items))
+        return response.json()
+
+    async def _send_individually(self) -> None:
+        """Fallback for servers without the batch route: same order, same
+        skipping rules, one request per operation."""
+        base = f"{self.client.config.get_server_url()}/api/graphs"
+        by_id = {item.id: item for item in self.items if item.id}
+        stopped = False
+        for item in self.items:
+            failed_dep = next((d for d in item.depends_on if not by_id[d].success), None)
+            if stopped or failed_dep is not None:
+                item.status_code, item.skipped = _FAILED_DEPENDENCY, True
+                item.response = {"detail": "Batch stopped after a failed operation" if stopped
+                                 else f"Dependency {failed_dep} did not succeed"}
+            else:
+                params = {"space_id": self.space_id}
+                if self.graph_id is not None:
+                    params["graph_id"] = self.graph_id
+                params.update(item.params)
+                kwargs = {"params": params, "idempotent": item.method == "GET"}
+                if item.body is not None:
+                    kwargs["json"] = item.body
+                started = time.monotonic()
+                self.round_trips += 1
+                try:
+                    response = await self.client._make_authenticated_request(
+                        item.method, f"{base}/{item.path}", **kwargs)
+                    item.status_code = response.status_code
+                    try:
+                        item.response = response.json()
+                    except ValueError:
+                        item.response = response.text
+                except VitalGraphClientError as e:
+                    item.status_code = getattr(e, "status_code", None) or 500
+                    item.response = {"detail": str(e)}
+                item.elapsed_ms = (time.monotonic() - started) * 1000
+            if self.stop_on_error and not item.success:
+                stopped = True
@@ -0,0 +1,421 @@
+"""VitalGraph Client Bulk Writer
+
+Loads a large stream of GraphObjects through the KGEntities endpoint.
+``create_kgentities`` sends whatever list it is handed as one
+request: a whole file becomes one enormous body that holds the server's
+request slot for minutes and is lost entirely on one transient failure,
+while one-entity-per-call spends the load on round trips.
+
+The writer sits between the two:
+
+- **Size-targeted chunks.** Items are packed into a chunk until its
+  estimated serialized size reaches ``target_chunk_bytes`` (4 MiB) or it
+  holds ``max_chunk_objects``. Chunking is by bytes, not object count, so a
+  stream of large entity graphs and a stream of tiny ones both land near
+  the same request size. An item that is a list of GraphObjects (an entity
+  with its frames, slots and edges) is never split across chunks — the
+  server validates an entity graph as a unit.
+- **Bounded concurrency.** At most ``concurrency`` chunks are in flight,
+  and the source is not read ahead of them, so memory stays at roughly
+  ``concurrency x target_chunk_bytes`` however large the input. Requests
+  still go through the client's own limiter
+  (``{PROFILE}_CLIENT_MAX_CONCURRENCY``), which caps them together with
+  anything else the application is doing.
+- **Idempotent retry.** Chunks are sent in ``upsert`` mode by default and
+  marked idempotent, so the client's retry policy may replay a chunk whose
+  response was lost (post-send failure) — writing the same objects twice
+  leaves the same graph. ``operation_mode="create"`` is honoured but is
+  not replay-safe and is retried only when the request never left.
+- **Compressed bodies.** Chunks are gzipped (quad JSON typically shrinks
+  8-15x). A server that predates request decompression answers 415, or —
+  reading the gzip bytes as JSON — 400/422; the writer then turns
+  compression off and resends. A 400/422 is taken that way only until the
+  server has accepted one compressed chunk, and only if the uncompressed
+  resend does not fail the same way.
+- **Throughput.** ``BulkWriteResult`` reports objects, chunks, wire bytes
+  and objects/s; ``on_progress`` is called after every chunk.
+
+Usage::
+
+    writer = client.bulk_writer(space_id, graph_id)
+    result = await writer.write(objects)          # iterable or async iterable
+    print(result.summary())
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ..model.quad_model import Quad, QuadRequest
+from .utils.client_utils import VitalGraphClientError, build_query_params
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET_CHUNK_BYTES = 4 * 1024 * 1024
+DEFAULT_MAX_CHUNK_OBJECTS = 5000
+DEFAULT_CONCURRENCY = 4
+
+# Per-quad JSON framing: {"s":"","p":"","o":"","g":""}, plus separators.
+_QUAD_OVERHEAD_BYTES = 32
+
+# Modes whose replay after a lost response leaves the same graph.
+_IDEMPOTENT_MODES = frozenset({"upsert", "update"})
+
+
+@dataclass
+class FailedChunk:
+    """A chunk the server did not accept, after the client's retries."""
+
+    index: int
+    object_count: int
+    error: str
+    status_code: Optional[int] = None
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome and throughput of one ``BulkWriter.write`` call."""
+
+    objects_sent: int = 0
+    objects_failed: int = 0
+    chunks_sent: int = 0
+    quads_sent: int = 0
+    raw_bytes: int = 0
+    wire_bytes: int = 0
+    elapsed_seconds: float = 0.0
+    failed_chunks: List[FailedChunk] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        return not self.failed_chunks
+
+    @property
+    def objects_per_second(self) -> float:
+        return self.objects_sent / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.raw_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def summary(self) -> str:
+        text = (f"{self.objects_sent} objects in {self.chunks_sent} chunks, "
+                f"{self.elapsed_seconds:.1f}s ({self.objects_per_second:.0f} objects/s, "
+                f"{self.wire_bytes / 1e6:.1f} MB sent, {self.compression_ratio:.1f}x)")
+        if self.failed_chunks:
+            text += f"; {len(self.failed_chunks)} chunks / {self.objects_failed} objects failed"
+        return text
+
+
+@dataclass
+class _Chunk:
+    index: int
+    quads: List[Quad]
+    object_count: int
+    estimated_bytes: int
+
+
+Item = Union[Any, Sequence[Any]]
+
+
+class BulkWriter:
+    """Chunked, concurrent, retrying writer of GraphObjects into one graph."""
+
+    def __init__(
+        self,
+        client,
+        space_id: str,
+        graph_id: str,
+        *,
+        operation_mode: str = "upsert",
+        target_chunk_bytes: int = DEFAULT_TARGET_CHUNK_BYTES,
+        max_chunk_objects: int = DEFAULT_MAX_CHUNK_OBJECTS,
+        concurrency: Optional[int] = None,
+        compress: bool = True,
+        fail_fast: bool = True,
+        on_progress: Optional[Callable[[BulkWriteResult], Any]] = None,
+    ):
+        """
+        Args:
+            client: Connected VitalGraphClient
+            space_id: Target space
+            graph_id: Target graph URI
+            operation_mode: KGEntities operation mode; ``upsert`` (default)
+                makes every chunk safe to replay
+            target_chunk_bytes: Serialized size to aim each request at
+            max_chunk_objects: Upper bound on objects per request
+            concurrency: Chunks in flight; defaults to the client's
+                max_concurrency, or 4 when that is unlimited
+            compress: gzip request bodies
+            fail_fast: Stop reading the source after the first failed
+                chunk (chunks already in flight still finish)
+            on_progress: Called with the running result after each chunk
+        """
+        if target_chunk_bytes <= 0 or max_chunk_objects <= 0:
+            raise ValueError("target_chunk_bytes and max_chunk_objects must be positive")
+        self.client = client
+        self.space_id = space_id
+        self.graph_id = graph_id
+        self.operation_mode = operation_mode
+        self.target_chunk_bytes = target_chunk_bytes
+        self.max_chunk_objects = max_chunk_objects
+        if concurrency is None:
+            config = getattr(client, "config", None)
+            configured = config.get_max_concurrency() if config is not None else 0
+            concurrency = configured if configured > 0 else DEFAULT_CONCURRENCY
+        self.concurrency = max(1, concurrency)
+        self.compress = compress
+        # Set once the server accepts a gzipped chunk; from then on a 400/422
+        # is about the chunk's content, not its encoding.
+        self._compression_accepted = False
+        self.fail_fast = fail_fast
+        self.on_progress = on_progress
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def write(self, source: Union[Iterable[Item], AsyncIterable[Item]]) -> BulkWriteResult:
+        """Write every item from ``source``; returns when all chunks are settled.
+
+        Each item is a GraphObject, a list of GraphObjects kept together in
+        one chunk, or a list of ``Quad`` (already-encoded objects, e.g. read
+        from an N-Quads file).
+        """
+        result = BulkWriteResult()
+        started = time.monotonic()
+        slots = asyncio.Semaphore(self.concurrency)
+        pending: set = set()
+        failed = False
+
+        def settle(task: asyncio.Task) -> None:
+            nonlocal failed
+            pending.discard(task)
+            slots.release()
+            if not task.cancelled() and task.result() is False:
+                failed = True
+
+        async def dispatch(chunk: _Chunk) -> None:
+            await slots.acquire()
+            task = asyncio.ensure_future(self._send_chunk(chunk, result, started))
+            pending.add(task)
+            task.add_done_callback(settle)
+
+        quads: List[Quad] = []
+        objects = 0
+        size = 0
+        index = 0
+        try:
+            async for item in _aiter(source):
+                if failed and self.fail_fast:
+                    break
+                item_quads, item_objects = self._encode(item)
+                item_size = _estimate_bytes(item_quads)
+                if quads and (size + item_size > self.target_chunk_bytes
+                              or objects + item_objects > self.max_chunk_objects):
+                    await dispatch(_Chunk(index, quads, objects, size))
+                    index += 1
+                    quads, objects, size = [], 0, 0
+                quads.extend(item_quads)
+                objects += item_objects
+                size += item_size
+            if quads and not (failed and self.fail_fast):
+                await dispatch(_Chunk(index, quads, objects, size))
+            if pending:
+                await asyncio.gather(*list(pending), return_exceptions=True)
+        except BaseException:
+            for task in list(pending):
+                task.cancel()
+            raise
+        result.elapsed_seconds = time.monotonic() - started
+        logger.info("Bulk write to %s/%s: %s", self.space_id, self.graph_id, result.summary())
+        return result
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def _encode(self, item: Item) -> Tuple[List[Quad], int]:
+        """(quads, object count) for one source item."""
+        if isinstance(item, (list, tuple)):
+            if item and all(isinstance(q, Quad) for q in item):
+                return list(item), len({q.s for q in item})
+            objects = list(item)
+        else:
+            objects = [item]
+        from ..utils.quad_format_utils import graphobjects_to_quad_list
+        return graphobjects_to_quad_list(objects), len(objects)
+
+    def _body(self, chunk: _Chunk) -> Tuple[bytes, str]:
+        """Serialized request body and content type for the client's wire format."""
+        wire_format = getattr(self.client, "wire_format", None)
+        if getattr(wire_format, "value", wire_format) == "nquads":
+            from ..utils.quad_format_utils import quads_to_nquads_text
+            return quads_to_nquads_text(chunk.quads).encode("utf-8"), "application/n-quads"
+        payload = QuadRequest(quads=chunk.quads).model_dump()
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8"), "application/json"
+
+    def _prepare(self, chunk: _Chunk, compress: bool) -> Tuple[bytes, int, dict]:
+        raw, content_type = self._body(chunk)
+        headers = {"Content-Type": content_type}
+        body = raw
+        if compress:
+            body = _gzip(raw)
+            headers["Content-Encoding"] = "gzip"
+        return body, len(raw), headers
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+
+    async def _send_chunk(self, chunk: _Chunk, result: BulkWriteResult, started: float) -> bool:
+        url = f"{self.client.config.get_server_url()}/api/graphs/kgentities"
+        params = build_query_params(space_id=self.space_id, graph_id=self.graph_id,
+                                    operation_mode=self.operation_mode)
+        compress = self.compress
+        fallback_status = None
+        try:
+            while True:
+                # Serialization and gzip are CPU work; keep them off the loop
+                # so the other chunks' responses are read meanwhile.
+                body, raw_size, headers = await asyncio.to_thread(self._prepare, chunk, compress)
+                try:
+                    response = await self.client._make_authenticated_request(
+                        "POST", url, params=params, content=body, headers=headers,
+                        idempotent=self.operation_mode in _IDEMPOTENT_MODES)
+                except VitalGraphClientError as e:
+                    status = getattr(e, "status_code", None)
+                    if compress and (status == 415 or (
+                            status in (400, 422) and not self._compression_accepted)):
+                        logger.warning("Server does not accept compressed request bodies "
+                                       "(HTTP %s); sending the rest uncompressed", status)
+                        self.compress = compress = False
+                        fallback_status = status
+                        continue
+                    if fallback_status in (400, 422) and status == fallback_status:
+                        # Rejected uncompressed too: the chunk was bad, not gzip.
+                        self.compress = True
+                    raise
+                break
+            if compress:
+                self._compression_accepted = True
+            try:
+                data = response.json()
+            except ValueError:
+                data = {}
+            if isinstance(data, dict) and data.get("success") is False:
+                raise VitalGraphClientError(
+                    f"{data.get('status', 'failed')}: {data.get('message', '')}".strip(),
+                    status_code=response.status_code)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Bulk write chunk %d (%d objects) failed: %s",
+                         chunk.index, chunk.object_count, e)
+            result.failed_chunks.append(FailedChunk(
+                chunk.index, chunk.object_count, str(e), getattr(e, "status_code", None)))
+            result.objects_failed += chunk.object_count
+            self._progress(result, started)
+            return False
+
+        result.chunks_sent += 1
+        result.objects_sent += chunk.object_count
+        result.quads_sent += len(chunk.quads)
+        result.raw_bytes += raw_size
+        result.wire_bytes += len(body)
+        self._progress(result, started)
+        return True
+
+    def _progress(self, result: BulkWriteResult, started: float) -> None:
+        result.elapsed_seconds = time.monotonic() - started
+        if self.on_progress is not None:
+            try:
+                self.on_progress(result)
+            except Exception as e:
+                logger.warning("Bulk write progress callback failed: %s", e)
+
+
+def _estimate_bytes(quads: List[Quad]) -> int:
+    return sum(len(q.s) + len(q.p) + len(q.o) + len(q.g or "") + _QUAD_OVERHEAD_BYTES
+               for q in quads)
+
+
+def _gzip(data: bytes) -> bytes:
+    compressor = zlib.compressobj(5, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+async def _aiter(source):
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+
+
+_HAS_KG_GRAPH_URI = "<http://vital.ai/ontology/haley-ai-kg#hasKGGraphURI>"
+
+
+def _graph_key(term: str) -> str:
+    """hasKGGraphURI's object as a subject term: ``<uri>``, whether it was
+    written as an IRI or as a (typed) literal."""
+    if term.startswith('"'):
+        return "<" + term[1:term.index('"', 1)] + ">"
+    return term
+
+
+def _read_nquads(path: str, batch_lines: int):
+    from ..utils.quad_format_utils import nquads_text_to_quads
+
+    opener = open
+    if str(path).endswith(".gz"):
+        import gzip
+        opener = gzip.open
+    with opener(path, "rt", encoding="utf-8") as f:
+        while True:
+            lines = [line for _, line in zip(range(batch_lines), f)]
+            if not lines:
+                break
+            yield from nquads_text_to_quads("".join(lines))
+
+
+def iter_nquads_entity_graphs(path: str, batch_lines: int = 10_000):
+    """Yield the quads of an N-Quads / N-Triples file grouped by entity graph.
+
+    An entity's frames, slots and edges are separate subjects that carry
+    the entity's URI in ``hasKGGraphURI``; the server validates an entity
+    graph as a unit, so each one must reach ``BulkWriter.write`` as one
+    item, never split across chunks. A first pass reads only the subjects
+    and their ``hasKGGraphURI`` to count each graph's quads; the second
+    holds a graph's quads until its count is reached and yields it then.
+    A file written graph by graph (as VitalGraph exports are) holds one
+    graph at a time; a scattered one holds what is still incomplete.
+    Subjects without ``hasKGGraphURI`` are their own group.
+    """
+    graph_of = {}
+    quads_of = {}
+    for quad in _read_nquads(path, batch_lines):
+        quads_of[quad.s] = quads_of.get(quad.s, 0) + 1
+        if quad.p == _HAS_KG_GRAPH_URI:
+            graph_of[quad.s] = _graph_key(quad.o)
+    expected = {}
+    for subject, count in quads_of.items():
+        key = graph_of.get(subject, subject)
+        expected[key] = expected.get(key, 0) + count
+    del quads_of
+
+    groups = {}
+    for quad in _read_nquads(path, batch_lines):
+        key = graph_of.get(quad.s, quad.s)
+        group = groups.setdefault(key, [])
+        group.append(quad)
+        if len(group) == expected[key]:
+            yield groups.pop(key)
+    for group in groups.values():  # the file changed between the passes
+        yield group
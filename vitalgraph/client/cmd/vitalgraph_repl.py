@@ -26,7 +26,6 @@ from prompt_toolkit.shortcuts import CompleteStyle
 from prompt_toolkit.completion import WordCompleter
 
 from ..vitalgraph_client import VitalGraphClient, VitalGraphClientError
-from ...model.sparql_model import SPARQLQueryRequest
 
 
 # ---------------------------------------------------------------------------
@@ -136,7 +135,7 @@ class VitalGraphREPL:
         # Support two-word commands: "list spaces", "get entity", etc.
         if len(parts) >= 2 and parts[0].lower() in (
             'list', 'get', 'space', 'server', 'user', 'process',
-            'import', 'export', 'file',
+            'import', 'export', 'file', 'bulk',
         ):
             return f"{parts[0].lower()} {parts[1].lower()}", parts[2:]
         if len(parts) >= 2 and parts[0].lower() == 'sparql' and parts[1].lower() == 'multiline':
@@ -185,6 +184,8 @@ class VitalGraphREPL:
             'file list':      self.cmd_file_list,
             'file upload':    self.cmd_file_upload,
             'file download':  self.cmd_file_download,
+            # Bulk load
+            'bulk load':      self.cmd_bulk_load,
             # Admin
             'user list':      self.cmd_user_list,
             'process list':   self.cmd_process_list,
@@ -574,6 +575,7 @@ class VitalGraphREPL:
             print("Usage: sparql <SPARQL query>")
             return True
         query = ' '.join(args)
+        from ...model.sparql_model import SPARQLQueryRequest
         req = SPARQLQueryRequest(
             query=query,
             default_graph_uri=None,
@@ -626,6 +628,7 @@ class VitalGraphREPL:
             print("(empty query)")
             return True
         query = '\n'.join(lines)
+        from ...model.sparql_model import SPARQLQueryRequest
         req = SPARQLQueryRequest(
             query=query,
             default_graph_uri=None,
@@ -905,6 +908,61 @@ class VitalGraphREPL:
             print(f"❌ Error: {e}")
         return True
 
+    # ==================================================================
+    # Bulk load
+    # ==================================================================
+
+    def cmd_bulk_load(self, args: list[str]) -> bool:
+        """Bulk load objects: bulk load <file.nq|.nt[.gz]> [--space S] [--graph G]
+        [--mode upsert|create] [--chunk-kb N] [--concurrency N] [--no-compress]"""
+        if not self._require_connected():
+            return True
+        space_id = self._parse_flag(args, '--space') or self.current_space
+        if not space_id:
+            print("Usage: bulk load <file> [--space S] [--graph G]")
+            return True
+        graph_id = self._parse_flag(args, '--graph') or self._require_graph()
+        if not graph_id:
+            return True
+        mode = self._parse_flag(args, '--mode') or 'upsert'
+        chunk_kb = self._parse_flag(args, '--chunk-kb')
+        concurrency = self._parse_flag(args, '--concurrency')
+        compress = self._parse_flag(args, '--no-compress', has_value=False) is None
+        local_path = args[0] if args else None
+        if not local_path:
+            print("Usage: bulk load <file.nq|file.nt[.gz]> [--mode upsert|create] "
+                  "[--chunk-kb N] [--concurrency N] [--no-compress]")
+            return True
+        path_obj = Path(local_path).expanduser()
+        if not path_obj.exists():
+            print(f"❌ File not found: {local_path}")
+            return True
+
+        from ..bulk_writer import iter_nquads_entity_graphs
+
+        def progress(result):
+            print(f"\r  {result.objects_sent} objects, {result.chunks_sent} chunks, "
+                  f"{result.objects_per_second:.0f} objects/s", end="", flush=True)
+
+        options = {'operation_mode': mode, 'compress': compress, 'on_progress': progress}
+        if chunk_kb:
+            options['target_chunk_bytes'] = int(chunk_kb) * 1024
+        if concurrency:
+            options['concurrency'] = int(concurrency)
+        try:
+            writer = self.client.bulk_writer(space_id, graph_id, **options)
+            result = _run_async(writer.write(iter_nquads_entity_graphs(str(path_obj))))
+            print()
+            if result.success:
+                print(f"✅ Loaded {path_obj.name}: {result.summary()}")
+            else:
+                print(f"❌ {path_obj.name}: {result.summary()}")
+                for failed in result.failed_chunks[:5]:
+                    print(f"   chunk {failed.index} ({failed.object_count} objects): {failed.error}")
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+        return True
+
     # ==================================================================
     # Admin (6g)
     # ==================================================================
@@ -1021,6 +1079,10 @@ Files:
   file upload <path> [--uri U]     Upload file content
   file download <uri> [--output P] Download file content
 
+Bulk load:
+  bulk load <file.nq|.nt[.gz]>     Chunked, concurrent, compressed load
+      [--mode upsert|create] [--chunk-kb N] [--concurrency N] [--no-compress]
+
 Admin:
   user list              List users
   process list           Running processes
@@ -1043,12 +1105,12 @@ Admin:
             'types', 'relations', 'entity', 'info',
             'sparql', 'multiline',
             'import', 'export', 'download',
-            'file', 'upload',
+            'file', 'upload', 'bulk', 'load',
             'user', 'process', 'server',
             'help', 'exit', 'quit',
             '--space', '--graph', '--type', '--search', '--limit', '--offset',
             '--uri', '--output', '--api-key', '--status', '--job-id',
-            '--entity-uri',
+            '--entity-uri', '--mode', '--chunk-kb', '--concurrency', '--no-compress',
             'table', 'json', 'csv',
         ]
         return WordCompleter(words, ignore_case=True)
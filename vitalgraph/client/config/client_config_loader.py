@@ -114,6 +114,12 @@ class VitalGraphClientConfig:
                 # Circuit breaker; threshold 0 disables.
                 'breaker_threshold': int(self._get_profile_env('BREAKER_THRESHOLD', '5')),
                 'breaker_reset': float(self._get_profile_env('BREAKER_RESET', '30')),
+                # Revalidating GET response cache; 0 entries disables.
+                'response_cache_entries': int(self._get_profile_env('RESPONSE_CACHE_ENTRIES', '256')),
+                'response_cache_mb': float(self._get_profile_env('RESPONSE_CACHE_MB', '32')),
+                # Accept-Encoding negotiation; false asks for identity.
+                'response_compression': self._get_profile_env(
+                    'RESPONSE_COMPRESSION', 'true').strip().lower() in ('1', 'true', 'yes', 'on'),
             }
         }
     
@@ -337,6 +343,37 @@ class VitalGraphClientConfig:
         client_config = self.get_client_config()
         return float(client_config.get('breaker_reset', 30))
 
+    def get_response_cache_entries(self) -> int:
+        """
+        Get the maximum number of GET responses kept for ETag revalidation
+        (0 disables the response cache).
+
+        Returns:
+            Maximum cached responses
+        """
+        client_config = self.get_client_config()
+        return int(client_config.get('response_cache_entries', 256))
+
+    def get_response_cache_mb(self) -> float:
+        """
+        Get the total body size, in MB, the response cache may hold.
+
+        Returns:
+            Cache size limit in megabytes
+        """
+        client_config = self.get_client_config()
+        return float(client_config.get('response_cache_mb', 32))
+
+    def get_response_compression(self) -> bool:
+        """
+        Get whether the client asks for compressed (zstd / br / gzip) responses.
+
+        Returns:
+            True to negotiate compression, False for identity
+        """
+        client_config = self.get_client_config()
+        return bool(client_config.get('response_compression', True))
+
     def validate_config(self) -> None:
         """
         Validate the loaded configuration.
@@ -379,6 +416,8 @@ class VitalGraphClientConfig:
             ('Max concurrency', self.get_max_concurrency()),
             ('Breaker threshold', self.get_breaker_threshold()),
             ('Breaker reset', self.get_breaker_reset()),
+            ('Response cache entries', self.get_response_cache_entries()),
+            ('Response cache MB', self.get_response_cache_mb()),
         ):
             if not isinstance(value, (int, float)) or value < 0:
                 raise ClientConfigurationError(f"{name} must be a non-negative number")
@@ -11,15 +11,7 @@ from typing import Dict, Any, Optional, TypeVar, Type
 
 from pydantic import BaseModel
 from ..utils.client_utils import VitalGraphClientError
-from ..utils.format_helpers import (
-    ClientWireFormat,
-    FORMAT_TO_ACCEPT,
-    FORMAT_TO_CONTENT_TYPE,
-    serialize_graphobjects_for_request,
-    deserialize_response_to_graphobjects,
-    extract_pagination_from_json_quads,
-    is_json_quads_response,
-)
+from ..utils.wire_format import ClientWireFormat, FORMAT_TO_ACCEPT
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,197 @@
+"""
+VitalGraph Client - Changes Endpoint
+
+Client-side endpoint for a space's change log (CDC feed): status,
+enable/disable, and an async iterator over change records that resumes
+from a sequence number.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator
+
+import httpx
+
+from .base_endpoint import BaseEndpoint
+from ..utils.client_utils import (
+    VitalGraphClientError,
+    VitalGraphClientConnectionError,
+    validate_required_params,
+    build_query_params,
+)
+from ...model.changes_model import (
+    ChangeLogStatusResponse, ChangeRecord, ChangesPageResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+# A follow stream is idle between changes; the server writes a heartbeat
+# line every 15s, so a read that waits much longer than that is a dead
+# connection, not a quiet log.
+FOLLOW_READ_TIMEOUT = 60.0
+
+
+class ChangesClientEndpoint(BaseEndpoint):
+    """Client endpoint for the per-space change-log feed."""
+
+    def __init__(self, client):
+        super().__init__(client)
+
+    def _base_url(self) -> str:
+        return f"{self._get_server_url()}/api/changes"
+
+    async def get_status(self, space_id: str) -> ChangeLogStatusResponse:
+        """Whether the space has a change log, and the seq range it retains.
+
+        Args:
+            space_id: Space ID
+
+        Returns:
+            ChangeLogStatusResponse (status NOT_FOUND when not enabled)
+        """
+        self._check_connection()
+        validate_required_params(space_id=space_id)
+        params = build_query_params(space_id=space_id)
+        return await self._make_typed_request(
+            "GET", f"{self._base_url()}/status", ChangeLogStatusResponse,
+            params=params,
+        )
+
+    async def enable(self, space_id: str) -> ChangeLogStatusResponse:
+        """Start recording quad-level changes for a space.
+
+        Args:
+            space_id: Space ID
+
+        Returns:
+            ChangeLogStatusResponse with the log's current seq
+        """
+        self._check_connection()
+        validate_required_params(space_id=space_id)
+        params = build_query_params(space_id=space_id)
+        return await self._make_typed_request(
+            "POST", f"{self._base_url()}/enable", ChangeLogStatusResponse,
+            params=params,
+        )
+
+    async def disable(self, space_id: str) -> ChangeLogStatusResponse:
+        """Drop the space's change log.
+
+        Args:
+            space_id: Space ID
+
+        Returns:
+            ChangeLogStatusResponse with status DELETED
+        """
+        self._check_connection()
+        validate_required_params(space_id=space_id)
+        params = build_query_params(space_id=space_id)
+        return await self._make_typed_request(
+            "DELETE", self._base_url(), ChangeLogStatusResponse, params=params,
+        )
+
+    async def get_changes(self, space_id: str, after_seq: int = 0,
+                          limit: int = 100) -> ChangesPageResponse:
+        """Read one page of change records after ``after_seq``.
+
+        Args:
+            space_id: Space ID
+            after_seq: Last seq already applied (0 = from the beginning)
+            limit: Maximum records to return
+
+        Returns:
+            ChangesPageResponse; continue with ``after_seq=page.next_seq``
+        """
+        self._check_connection()
+        validate_required_params(space_id=space_id)
+        params = build_query_params(space_id=space_id, after_seq=after_seq,
+                                    limit=limit, stream=False)
+        return await self._make_typed_request(
+            "GET", self._base_url(), ChangesPageResponse, params=params,
+        )
+
+    async def iter_changes(self, space_id: str, after_seq: int = 0,
+                           follow: bool = False,
+                           limit: int = 100) -> AsyncIterator[ChangeRecord]:
+        """Iterate change records after ``after_seq``, in seq order.
+
+        Without ``follow`` the iterator ends once it has caught up. With
+        ``follow`` it keeps the stream open and yields new changes as they
+        commit; a dropped connection is reopened from the last record
+        yielded, so no record is skipped or repeated. Persist ``record.seq``
+        after applying a record and pass it back as ``after_seq`` to resume
+        in a later process.
+
+        Args:
+            space_id: Space ID
+            after_seq: Last seq already applied (0 = from the beginning)
+            follow: Keep streaming new changes
+            limit: Records per server-side read
+
+        Raises:
+            VitalGraphClientError: The log is not enabled, or ``after_seq``
+                is outside its retained range (re-bootstrap from a full read)
+        """
+        self._check_connection()
+        validate_required_params(space_id=space_id)
+        session = self.client.async_session
+        if session is None:
+            raise VitalGraphClientError("Client is not connected")
+
+        seq = after_seq
+        attempt = 0
+        while True:
+            params = build_query_params(space_id=space_id, after_seq=seq,
+                                        limit=limit, follow=follow, stream=True)
+            await self.client._ensure_valid_token()
+            try:
+                async with session.stream(
+                    "GET", self._base_url(), params=params,
+                    timeout=httpx.Timeout(
+                        connect=self.client.config.get_connect_timeout(),
+                        read=FOLLOW_READ_TIMEOUT if follow else self.client.config.get_timeout(),
+                        write=self.client.config.get_timeout(),
+                        pool=self.client.config.get_pool_timeout(),
+                    ),
+                ) as response:
+                    response.raise_for_status()
+                    if "ndjson" not in response.headers.get("content-type", ""):
+                        # Refusal before any record: a ChangesPageResponse.
+                        page = ChangesPageResponse.model_validate_json(await response.aread())
+                        if not page.success:
+                            raise VitalGraphClientError(page.message)
+                        for record in page.changes:
+                            seq = record.seq
+                            yield record
+                        return
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        if "error" in data:
+                            raise VitalGraphClientError(data["error"])
+                        if data.get("heartbeat"):
+                            continue
+                        record = ChangeRecord.model_validate(data)
+                        seq = record.seq
+                        attempt = 0
+                        yield record
+                if not follow:
+                    return
+            except (httpx.TransportError, ConnectionResetError) as e:
+                if not follow or attempt >= self.client.retry_policy.max_retries:
+                    raise VitalGraphClientConnectionError(
+                        f"Change stream for {space_id} failed after seq {seq} "
+                        f"({type(e).__name__}: {e})"
+                    ) from e
+                sleep_for = self.client.retry_policy.compute_sleep(attempt)
+                attempt += 1
+                logger.warning("Change stream for %s dropped after seq %d; "
+                               "reconnecting in %.1fs", space_id, seq, sleep_for)
+                await asyncio.sleep(sleep_for)
+            except httpx.HTTPStatusError as e:
+                raise VitalGraphClientError(
+                    f"Change stream for {space_id} failed: {e}",
+                    status_code=e.response.status_code,
+                ) from e
@@ -61,6 +61,8 @@ from ...model.entity_registry_model import (
     SameAsEnvelope,
     SameAsResponse,
     SameAsRetractRequest,
+    ResolveEntitiesRequest,
+    ResolveEntitiesResponse,
     SimilarEntityResponse,
     EntitySearchResponse,
     LocationSearchResponse,
@@ -594,6 +596,19 @@ class EntityRegistryClientEndpoint(BaseEndpoint):
         )
         return resp
 
+    async def resolve_entities(self, entity_ids: List[str]) -> ResolveEntitiesResponse:
+        """Resolve many entities to their canonical IDs in one request.
+
+        Returns:
+            ResolveEntitiesResponse; ``.canonical`` maps each existing ID to
+            its canonical ID, ``.not_found`` lists IDs that do not exist.
+        """
+        self._check_connection()
+        return await self._make_typed_request(
+            "POST", self._url("/sameas/resolve/batch"), ResolveEntitiesResponse,
+            json=ResolveEntitiesRequest(entity_ids=list(entity_ids)).model_dump(),
+        )
+
     # ------------------------------------------------------------------
     # Entity Types
     # ------------------------------------------------------------------
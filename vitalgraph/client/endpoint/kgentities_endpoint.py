@@ -102,6 +102,7 @@ class KGEntitiesEndpoint(BaseEndpoint):
         created_after: Optional[str] = ..., created_before: Optional[str] = ...,
         modified_after: Optional[str] = ..., modified_before: Optional[str] = ...,
         action_type: Optional[str] = ..., provenance_type: Optional[str] = ...,
+        count_mode: Optional[str] = ...,
     ) -> PaginatedGraphObjectResponse: ...
 
     @overload
@@ -114,6 +115,7 @@ class KGEntitiesEndpoint(BaseEndpoint):
         created_after: Optional[str] = ..., created_before: Optional[str] = ...,
         modified_after: Optional[str] = ..., modified_before: Optional[str] = ...,
         action_type: Optional[str] = ..., provenance_type: Optional[str] = ...,
+        count_mode: Optional[str] = ...,
     ) -> MultiEntityGraphResponse: ...
 
     async def list_kgentities(
@@ -135,6 +137,7 @@ class KGEntitiesEndpoint(BaseEndpoint):
         modified_before: Optional[str] = None,
         action_type: Optional[str] = None,
         provenance_type: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ) -> Union[PaginatedGraphObjectResponse, MultiEntityGraphResponse]:
         """
         List KGEntities with pagination and optional filtering.
@@ -157,6 +160,8 @@ class KGEntitiesEndpoint(BaseEndpoint):
             modified_before: Entities modified before this ISO 8601 datetime
             action_type: Filter by action type URI (entity has this value in hasKGActionTypeList)
             provenance_type: Filter by provenance type URI (exact match on hasKGProvenanceType)
+            count_mode: How total_count is computed — 'exact' (server default),
+                'estimated', 'capped:N' or 'none'; see total_count_kind
             
         Returns:
             PaginatedGraphObjectResponse if include_entity_graph=False
@@ -188,6 +193,7 @@ class KGEntitiesEndpoint(BaseEndpoint):
                 modified_before=modified_before,
                 action_type=action_type,
                 provenance_type=provenance_type,
+                count_mode=count_mode,
             )
             
             response = await self._make_request('GET', url, params=params)
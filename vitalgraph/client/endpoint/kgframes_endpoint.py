@@ -99,7 +99,8 @@ class KGFramesEndpoint(BaseEndpoint):
                             created_after: Optional[str] = None,
                             created_before: Optional[str] = None,
                             modified_after: Optional[str] = None,
-                            modified_before: Optional[str] = None) -> PaginatedGraphObjectResponse:
+                            modified_before: Optional[str] = None,
+                            count_mode: Optional[str] = None) -> PaginatedGraphObjectResponse:
         """
         List KGFrames with pagination, filtering, and sorting.
         
@@ -120,6 +121,8 @@ class KGFramesEndpoint(BaseEndpoint):
             created_before: ISO 8601 upper bound for creation time
             modified_after: ISO 8601 lower bound for modification time
             modified_before: ISO 8601 upper bound for modification time
+            count_mode: How total_count is computed — 'exact' (server default),
+                'estimated', 'capped:N' or 'none'; see total_count_kind
             
         Returns:
             PaginatedGraphObjectResponse containing KGFrame GraphObjects
@@ -149,6 +152,7 @@ class KGFramesEndpoint(BaseEndpoint):
                 created_before=created_before,
                 modified_after=modified_after,
                 modified_before=modified_before,
+                count_mode=count_mode,
             )
             
             response = await self._make_request('GET', url, params=params)
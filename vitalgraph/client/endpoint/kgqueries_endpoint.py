@@ -39,7 +39,8 @@ class KGQueriesEndpoint(BaseEndpoint):
         offset: int = 0,
         include_frame_graph: bool = False,
         include_entity_graph: bool = False,
-        count_only: bool = False
+        count_only: bool = False,
+        count_mode: Optional[str] = None
     ) -> KGQueryResponse:
         """
         Query entity-to-entity connections based on criteria.
@@ -54,6 +55,8 @@ class KGQueriesEndpoint(BaseEndpoint):
             criteria: Query criteria specifying query type and filters
             page_size: Number of results per page (default: 10)
             offset: Offset for pagination (default: 0)
+            count_mode: How total_count is computed — 'exact', 'estimated',
+                'capped:N' or 'none'; see total_count_kind (optional)
             
         Returns:
             KGQueryResponse with connections based on query_type
@@ -78,7 +81,8 @@ class KGQueriesEndpoint(BaseEndpoint):
                 offset=offset,
                 include_frame_graph=include_frame_graph,
                 include_entity_graph=include_entity_graph,
-                count_only=count_only
+                count_only=count_only,
+                count_mode=count_mode
             )
             
             # Log complete request for debugging
@@ -20,7 +20,8 @@ class TriplesEndpoint(BaseEndpoint):
     
     async def list_triples(self, space_id: str, graph_id: str, page_size: int = 10, offset: int = 0, 
                     subject: Optional[str] = None, predicate: Optional[str] = None, 
-                    object: Optional[str] = None, object_filter: Optional[str] = None) -> TripleListResponse:
+                    object: Optional[str] = None, object_filter: Optional[str] = None,
+                    count_mode: Optional[str] = None) -> TripleListResponse:
         """
         List/Search triples with optional filtering.
         
@@ -33,6 +34,9 @@ class TriplesEndpoint(BaseEndpoint):
             predicate: Predicate URI filter (optional)
             object: Object value filter (optional)
             object_filter: Keyword to search within object values (optional)
+            count_mode: How total_count is computed — 'exact' (server default),
+                'estimated', 'capped:N' or 'none'; the response's
+                total_count_kind says which it got (optional)
             
         Returns:
             TripleListResponse containing triples data and pagination info
@@ -52,7 +56,8 @@ class TriplesEndpoint(BaseEndpoint):
             subject=subject,
             predicate=predicate,
             object=object,
-            object_filter=object_filter
+            object_filter=object_filter,
+            count_mode=count_mode
         )
         
         return await self._make_typed_request('GET', url, TripleListResponse, params=params)
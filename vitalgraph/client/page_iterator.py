@@ -0,0 +1,183 @@
+"""
+Async page iterators with prefetch for the client's listing calls.
+
+Every listing endpoint pages by ``page_size``/``offset``, and the natural
+caller loop — fetch a page, process it, fetch the next — leaves the
+connection idle while the caller works and the caller idle while the
+server works. Exporting a graph over the API then runs at one round trip
+per page, not at the rate either side can sustain.
+
+``PageIterator`` walks a listing for the caller and keeps the next pages
+already on the wire:
+
+- PREFETCH. Offsets are known in advance, so up to ``max_in_flight`` page
+  requests are scheduled ahead of the page being consumed. Pages are
+  still handed out strictly in offset order, whatever order the responses
+  come back in. The requests share the client's connection pool,
+  concurrency limiter and retry policy like any other call.
+- BOUNDED MEMORY. At most the page being consumed plus ``max_in_flight``
+  decoded pages are alive at once; nothing accumulates across the walk.
+  Each page's body is bounded by the server's page-size cap, so per-page
+  decoding stays small and no incremental JSON parser is needed.
+- KNOWING WHERE TO STOP. A page shorter than ``page_size`` is the last
+  one. An exact ``total_count`` (``total_count_kind == 'exact'``) bounds
+  scheduling from the first page on, so no request is issued past the end.
+  Under ``count_mode='none'`` — the default for the iterators that support
+  it, because the per-page count is the most expensive part of a listing —
+  the short page is what ends the walk, and at most ``max_in_flight - 1``
+  speculative requests past the end are cancelled or discarded.
+- CLEAN EXIT. Breaking out of the loop, an exception in the caller, or a
+  failed page cancels every outstanding request.
+
+Offset paging is not a snapshot: rows written while the walk runs can be
+skipped or repeated, exactly as with a hand-written loop. Use the change
+log (``client.changes.iter_changes``) to follow a graph consistently.
+
+Usage::
+
+    async for entity in client.iter_kgentities(space_id, graph_id):
+        ...
+
+    async for page in client.iter_triples(space_id, graph_id).pages():
+        ...
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple
+
+from .utils.client_utils import VitalGraphClientError
+
+DEFAULT_MAX_IN_FLIGHT = 2
+
+PageFetcher = Callable[[int, int], Awaitable[Any]]
+
+
+class PageIterator:
+    """Iterate a paged listing item by item (or page by page) with prefetch.
+
+    ``fetch(offset, page_size)`` returns one page response; ``items`` names
+    the response attribute holding that page's rows (``objects``,
+    ``results``, ``types``, ...). Iterating the object yields rows;
+    ``pages()`` yields the responses themselves.
+    """
+
+    def __init__(self, fetch: PageFetcher, items: str, *, page_size: int = 100,
+                 offset: int = 0, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 limit: Optional[int] = None):
+        """
+        Args:
+            fetch: ``async (offset, page_size) -> page`` for one page
+            items: Attribute of the page response holding its rows
+            page_size: Rows requested per page
+            offset: Offset of the first row
+            max_in_flight: Page requests kept outstanding ahead of the caller
+            limit: Stop after this many rows (None = the whole listing)
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+        self.fetch = fetch
+        self.items = items
+        self.page_size = page_size
+        self.offset = offset
+        self.max_in_flight = max_in_flight
+        self.limit = limit
+        self.pages_fetched = 0
+        self.total_count: Optional[int] = None
+        self.total_count_kind: Optional[str] = None
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iter_items()
+
+    async def _iter_items(self) -> AsyncIterator[Any]:
+        async for page in self.pages():
+            for item in self._rows(page):
+                yield item
+
+    async def collect(self) -> List[Any]:
+        """All rows as a list — only for listings known to be small."""
+        return [item async for item in self]
+
+    async def pages(self) -> AsyncIterator[Any]:
+        """Yield page responses in offset order, prefetching ahead.
+
+        With a ``limit``, the last page's rows are trimmed to it.
+
+        Raises:
+            VitalGraphClientError: A page came back as a failure
+        """
+        pending: Deque[Tuple[int, int, asyncio.Task]] = deque()
+        next_offset = self.offset
+        end = None if self.limit is None else self.offset + self.limit
+
+        def schedule() -> None:
+            nonlocal next_offset
+            while len(pending) < self.max_in_flight and (end is None or next_offset < end):
+                size = self.page_size if end is None else min(self.page_size, end - next_offset)
+                pending.append((next_offset, size, asyncio.ensure_future(self.fetch(next_offset, size))))
+                next_offset += size
+
+        try:
+            schedule()
+            while pending:
+                offset, requested, task = pending.popleft()
+                page = await task
+                self._check(page)
+                self.pages_fetched += 1
+                rows = self._rows(page)
+
+                bound = None
+                if len(rows) < requested:
+                    bound = offset + len(rows)
+                total = self._exact_total(page, offset + len(rows))
+                if total is not None:
+                    bound = total if bound is None else min(bound, total)
+                if bound is not None and (end is None or bound < end):
+                    end = bound
+                if end is not None:
+                    if len(rows) > end - offset:
+                        rows = rows[:max(end - offset, 0)]
+                        setattr(page, self.items, rows)
+                    while pending and pending[-1][0] >= end:
+                        pending.pop()[2].cancel()
+
+                schedule()  # before handing the page over, so the next ones load meanwhile
+                if rows or self.pages_fetched == 1:
+                    yield page
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*(task for _, _, task in pending), return_exceptions=True)
+
+    def _rows(self, page) -> List[Any]:
+        return getattr(page, self.items, None) or []
+
+    def _check(self, page) -> None:
+        ok = getattr(page, "is_success", None)
+        if ok is None:
+            ok = getattr(page, "success", True)
+        if not ok:
+            detail = (getattr(page, "error_message", None) or getattr(page, "message", None)
+                      or getattr(page, "status", None) or "listing failed")
+            raise VitalGraphClientError(f"Page request failed: {detail}",
+                                        status_code=getattr(page, "status_code", None))
+
+    def _exact_total(self, page, seen: int) -> Optional[int]:
+        """The listing's exact row count, when the page reports one.
+
+        Only ``total_count`` under kind ``exact`` is trusted: estimated and
+        capped counts are not bounds, and a total smaller than the rows
+        already seen is a stale count, not the end.
+        """
+        total = getattr(page, "total_count", None)
+        kind = getattr(page, "total_count_kind", "exact")
+        if self.total_count is None and total is not None:
+            self.total_count, self.total_count_kind = total, kind
+        if total is None or kind != "exact" or total < seen:
+            return None
+        return total
@@ -95,6 +95,9 @@ class PaginatedGraphObjectResponse(GraphObjectResponse):
     """Response with pagination metadata."""
     
     total_count: int = Field(default=0, description="Total count across all pages")
+    total_count_kind: str = Field(
+        default="exact",
+        description="How total_count was produced: exact, estimated, capped or none")
     page_size: int = Field(default=10, description="Items per page")
     offset: int = Field(default=0, description="Current offset")
     has_more: bool = Field(default=False, description="Whether more pages exist")
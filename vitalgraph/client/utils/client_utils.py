@@ -68,4 +68,27 @@ def build_query_params(**params) -> Dict[str, Any]:
     Returns:
         Dictionary with non-None parameters
     """
-    return {k: v for k, v in params.items() if v is not None}
\ No newline at end of file
+    return {k: v for k, v in params.items() if v is not None}
+
+def accept_encoding(enabled: bool = True) -> str:
+    """
+    Build the Accept-Encoding header for response compression.
+
+    Lists only the codings the installed httpx can decode — zstd and br
+    appear when ``zstandard`` / ``brotli`` are installed — preferring the
+    ones that are cheapest to decode. httpx decompresses transparently.
+
+    Args:
+        enabled: False to ask for uncompressed responses ("identity")
+
+    Returns:
+        Accept-Encoding header value
+    """
+    if not enabled:
+        return "identity"
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+        supported = set(SUPPORTED_DECODERS)
+    except ImportError:  # private module; fall back to what httpx always has
+        supported = {"gzip", "deflate"}
+    return ", ".join(c for c in ("zstd", "br", "gzip", "deflate") if c in supported)
@@ -10,7 +10,6 @@ without leaking format details into the endpoint logic.
 
 import json
 import logging
-from enum import Enum
 from typing import List, Optional, Dict, Any, Tuple
 
 from vital_ai_vitalsigns.model.GraphObject import GraphObject
@@ -23,31 +22,17 @@ from vitalgraph.utils.quad_format_utils import (
     quads_to_nquads_text,
     nquads_text_to_quads,
 )
+from .wire_format import (  # noqa: F401 — re-exported; defined apart so they import cheaply
+    ClientWireFormat,
+    FORMAT_TO_ACCEPT,
+    FORMAT_TO_CONTENT_TYPE,
+    MIME_JSON,
+    MIME_NQUADS,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class ClientWireFormat(str, Enum):
-    """Wire format preference for the client."""
-    JSON_QUADS = "json_quads"
-    NQUADS = "nquads"
-
-
-# MIME types
-MIME_NQUADS = "application/n-quads"
-MIME_JSON = "application/json"
-
-FORMAT_TO_ACCEPT = {
-    ClientWireFormat.JSON_QUADS: MIME_JSON,
-    ClientWireFormat.NQUADS: MIME_NQUADS,
-}
-
-FORMAT_TO_CONTENT_TYPE = {
-    ClientWireFormat.JSON_QUADS: MIME_JSON,
-    ClientWireFormat.NQUADS: MIME_NQUADS,
-}
-
-
 # ---------------------------------------------------------------------------
 # Request serialization  (GraphObjects → wire body)
 # ---------------------------------------------------------------------------
@@ -140,6 +125,7 @@ def extract_pagination_from_json_quads(response_data: dict) -> dict:
     """Extract pagination metadata from a QuadResponse envelope."""
     return {
         "total_count": response_data.get("total_count", 0),
+        "total_count_kind": response_data.get("total_count_kind", "exact"),
         "page_size": response_data.get("page_size", 0),
         "offset": response_data.get("offset", 0),
     }
@@ -0,0 +1,126 @@
+"""
+VitalGraph Client Response Cache
+
+Bounded cache of validated GET responses.
+
+The server now sends a strong ``ETag`` on single entity / frame / type
+reads and answers ``If-None-Match`` with an empty 304 when the resource
+has not changed. This cache is the client half: it keeps the body and
+headers of every GET that came back with an ETag, and the next identical
+GET is sent with ``If-None-Match``. A 304 is turned back into a 200 built
+from the stored body, so callers — and every endpoint's parsing code —
+cannot tell a revalidated response from a fresh one.
+
+Nothing is served without asking the server: there is no freshness
+lifetime, only revalidation. The saving is the body (an entity graph can
+be hundreds of KB of quads) and, on the server, the quad read.
+
+The cache is bounded both by entry count and by total body bytes and
+evicts least-recently-used first. Responses carrying ``Cache-Control:
+no-store`` are never stored. Keys include the Accept header, since the
+same URL can be served as JSON quads or as a binary format.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+_WIRE_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+CacheKey = Tuple[str, Tuple[Tuple[str, str], ...], str]
+
+
+class ResponseCache:
+    """LRU of (etag, status, headers, body) per GET URL + params + Accept."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024):
+        self._entries: "OrderedDict[CacheKey, Tuple[str, int, Dict[str, str], bytes]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+        self.revalidated = 0
+        self.stored = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    @staticmethod
+    def key(url: str, params: Any = None, headers: Optional[Mapping[str, str]] = None) -> CacheKey:
+        """Cache key for a GET. ``params`` may be a dict, a list of pairs or None."""
+        items = params.items() if isinstance(params, Mapping) else (params or ())
+        flat = []
+        for k, v in items:
+            if isinstance(v, (list, tuple)):
+                flat.extend((str(k), str(x)) for x in v)
+            elif v is not None:
+                flat.append((str(k), str(v)))
+        accept = ""
+        for name, value in (headers or {}).items():
+            if name.lower() == "accept":
+                accept = value
+        return str(url), tuple(sorted(flat)), accept
+
+    def etag_for(self, key: CacheKey) -> Optional[str]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def store(self, key: CacheKey, response: httpx.Response) -> None:
+        """Remember a 200 response if it carries an ETag and may be stored."""
+        etag = response.headers.get("etag")
+        if not self.enabled or response.status_code != 200 or not etag:
+            return
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return
+        body = response.content
+        if len(body) > self._max_bytes:
+            self._drop(key)
+            return
+        self._drop(key)
+        # The body is stored decoded, so the headers describing the wire
+        # encoding must not be replayed with it.
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in _WIRE_HEADERS}
+        self._entries[key] = (etag, response.status_code, headers, body)
+        self._bytes += len(body)
+        self.stored += 1
+        while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+            _, (_, _, _, old) = self._entries.popitem(last=False)
+            self._bytes -= len(old)
+            self.evictions += 1
+
+    def replay(self, key: CacheKey, not_modified: httpx.Response) -> Optional[httpx.Response]:
+        """The stored 200 for a 304, or None if it is no longer cached."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        etag, status, headers, body = entry
+        self._entries.move_to_end(key)
+        self.revalidated += 1
+        return httpx.Response(status, headers=headers, content=body,
+                              request=not_modified.request)
+
+    def _drop(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[3])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "stored": self.stored,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,31 @@
+"""
+Client wire-format names and MIME types.
+
+Kept apart from ``format_helpers`` (which re-exports them) so that choosing
+a wire format — ``VitalGraphClient(wire_format=...)``, the Accept header
+set in ``open()`` — does not import VitalSigns and the quad codecs; those
+load with the first endpoint that actually serializes objects.
+"""
+
+from enum import Enum
+
+
+class ClientWireFormat(str, Enum):
+    """Wire format preference for the client."""
+    JSON_QUADS = "json_quads"
+    NQUADS = "nquads"
+
+
+# MIME types
+MIME_NQUADS = "application/n-quads"
+MIME_JSON = "application/json"
+
+FORMAT_TO_ACCEPT = {
+    ClientWireFormat.JSON_QUADS: MIME_JSON,
+    ClientWireFormat.NQUADS: MIME_NQUADS,
+}
+
+FORMAT_TO_CONTENT_TYPE = {
+    ClientWireFormat.JSON_QUADS: MIME_JSON,
+    ClientWireFormat.NQUADS: MIME_NQUADS,
+}
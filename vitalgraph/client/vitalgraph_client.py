@@ -6,6 +6,7 @@ REST API client for connecting to VitalGraph servers with JWT authentication.
 from __future__ import annotations
 
 import httpx
+import importlib
 import logging
 import time
 import asyncio
@@ -14,40 +15,15 @@ from typing import TYPE_CHECKING, Optional, Dict, Any, List, Union
 from pathlib import Path
 
 from .config.client_config_loader import VitalGraphClientConfig, ClientConfigurationError
-from .endpoint.kgtypes_endpoint import KGTypesEndpoint
-from .endpoint.kgframes_endpoint import KGFramesEndpoint
-from .endpoint.kgentities_endpoint import KGEntitiesEndpoint
-from .endpoint.kgrelations_endpoint import KGRelationsEndpoint
-from .endpoint.kgqueries_endpoint import KGQueriesEndpoint
-from .endpoint.objects_endpoint import ObjectsEndpoint
-from .endpoint.files_endpoint import FilesEndpoint
-from .endpoint.spaces_endpoint import SpacesEndpoint
-from .endpoint.users_endpoint import UsersEndpoint
-from .endpoint.sparql_endpoint import SparqlEndpoint
-from .endpoint.graphs_endpoint import GraphsEndpoint
-from .endpoint.triples_endpoint import TriplesEndpoint
-from .endpoint.import_endpoint import ImportEndpoint
-from .endpoint.export_endpoint import ExportEndpoint
-from .endpoint.entity_registry_endpoint import EntityRegistryClientEndpoint
-from .endpoint.agent_registry_endpoint import AgentRegistryClientEndpoint
-from .endpoint.process_endpoint import ProcessClientEndpoint
-from .endpoint.admin_endpoint import AdminClientEndpoint
-from .endpoint.api_keys_endpoint import ApiKeysClientEndpoint
-from .endpoint.fuzzy_mappings_endpoint import FuzzyMappingsClientEndpoint
-from .endpoint.vector_indexes_endpoint import VectorIndexesClientEndpoint
-from .endpoint.search_mappings_endpoint import SearchMappingsClientEndpoint
-from .endpoint.fts_indexes_endpoint import FtsIndexesClientEndpoint
-from .endpoint.geo_config_endpoint import GeoConfigClientEndpoint
-from .endpoint.geo_points_endpoint import GeoPointsClientEndpoint
-from .endpoint.kgdocuments_endpoint import KGDocumentsEndpoint as KGDocumentsClientEndpoint
-from .endpoint.metrics_endpoint import MetricsClientEndpoint
-from .endpoint.ontology_endpoint import OntologyClientEndpoint
 from .utils.client_utils import (
     VitalGraphClientError,
     VitalGraphClientConnectionError,
     VitalGraphClientTimeoutError,
     VitalGraphClientUnavailableError,
+    accept_encoding,
 )
+from .utils.response_cache import ResponseCache
+from .page_iterator import DEFAULT_MAX_IN_FLIGHT, PageIterator
 from .retry import (
     CircuitBreaker,
     FailureClass,
@@ -59,20 +35,22 @@ from .retry import (
     parse_retry_after,
     safe_log_url,
 )
-from .utils.format_helpers import ClientWireFormat
+from .utils.wire_format import ClientWireFormat
 from .vitalgraph_client_inf import VitalGraphClientInterface
-from ..model.sparql_model import GraphInfo, SPARQLGraphResponse
-from .response.client_response import (
-    GraphResponse, GraphsListResponse, GraphCreateResponse, GraphDeleteResponse, GraphClearResponse,
-    SpaceResponse, SpacesListResponse, SpaceCreateResponse, SpaceUpdateResponse, SpaceDeleteResponse,
-    KGTypesListResponse, KGTypeResponse, KGTypeCreateResponse, KGTypeUpdateResponse, KGTypeDeleteResponse,
-    ObjectsListResponse, ObjectResponse, ObjectCreateResponse, ObjectUpdateResponse, ObjectDeleteResponse,
-    PaginatedGraphObjectResponse, FrameGraphResponse, CreateEntityResponse, UpdateEntityResponse, DeleteResponse,
-    EntityResponse,
-    FilesListResponse, FileResponse, FileCreateResponse, FileUpdateResponse, FileDeleteResponse, FileUploadResponse,
-)
 
 if TYPE_CHECKING:
+    from ..model.sparql_model import GraphInfo, SPARQLGraphResponse
+    from .response.client_response import (
+        GraphResponse, GraphsListResponse, GraphCreateResponse, GraphDeleteResponse, GraphClearResponse,
+        SpaceResponse, SpacesListResponse, SpaceCreateResponse, SpaceUpdateResponse, SpaceDeleteResponse,
+        KGTypesListResponse, KGTypeResponse, KGTypeCreateResponse, KGTypeUpdateResponse, KGTypeDeleteResponse,
+        ObjectsListResponse, ObjectResponse, ObjectCreateResponse, ObjectUpdateResponse, ObjectDeleteResponse,
+        PaginatedGraphObjectResponse, FrameGraphResponse, CreateEntityResponse, UpdateEntityResponse, DeleteResponse,
+        EntityResponse,
+        FilesListResponse, FileResponse, FileCreateResponse, FileUpdateResponse, FileDeleteResponse, FileUploadResponse,
+    )
+    from .batch import ClientBatch
+    from .bulk_writer import BulkWriter
     from ..model.quad_model import QuadRequest
     from ..model.sparql_model import (
         SPARQLQueryRequest, SPARQLQueryResponse, SPARQLUpdateRequest, SPARQLUpdateResponse,
@@ -92,6 +70,37 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class _LazyEndpoint:
+    """
+    An endpoint handler imported and constructed on first attribute access.
+
+    The endpoint modules pull in VitalSigns, the domain ontology and the
+    quad codecs at import time, which made ``import VitalGraphClient`` cost
+    seconds — paid by every REPL start and every serverless cold start, even
+    for a caller that only lists spaces. As a class attribute
+    this descriptor defers both the import and the construction; the built
+    endpoint is then stored in the instance ``__dict__``, which shadows the
+    descriptor, so every later access is a plain attribute read. Assigning
+    the attribute (tests substituting a fake endpoint) works as before.
+    """
+
+    def __init__(self, module: str, class_name: str):
+        self.module = module
+        self.class_name = class_name
+        self.name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, client, owner=None):
+        if client is None:
+            return self
+        module = importlib.import_module(f".endpoint.{self.module}", __package__)
+        endpoint = getattr(module, self.class_name)(client)
+        client.__dict__[self.name] = endpoint
+        return endpoint
+
+
 class VitalGraphClient(VitalGraphClientInterface):
     """
     VitalGraph REST API client with JWT authentication.
@@ -99,6 +108,37 @@ class VitalGraphClient(VitalGraphClientInterface):
     Provides functionality to connect to VitalGraph API servers using
     JWT-based authentication with automatic token refresh and connection management.
     """
+
+    # Endpoint handlers, each imported and built on first use.
+    kgtypes = _LazyEndpoint("kgtypes_endpoint", "KGTypesEndpoint")
+    kgframes = _LazyEndpoint("kgframes_endpoint", "KGFramesEndpoint")
+    kgentities = _LazyEndpoint("kgentities_endpoint", "KGEntitiesEndpoint")
+    kgrelations = _LazyEndpoint("kgrelations_endpoint", "KGRelationsEndpoint")
+    kgqueries = _LazyEndpoint("kgqueries_endpoint", "KGQueriesEndpoint")
+    objects = _LazyEndpoint("objects_endpoint", "ObjectsEndpoint")
+    files = _LazyEndpoint("files_endpoint", "FilesEndpoint")
+    spaces = _LazyEndpoint("spaces_endpoint", "SpacesEndpoint")
+    users = _LazyEndpoint("users_endpoint", "UsersEndpoint")
+    sparql = _LazyEndpoint("sparql_endpoint", "SparqlEndpoint")
+    graphs = _LazyEndpoint("graphs_endpoint", "GraphsEndpoint")
+    triples = _LazyEndpoint("triples_endpoint", "TriplesEndpoint")
+    imports = _LazyEndpoint("import_endpoint", "ImportEndpoint")
+    exports = _LazyEndpoint("export_endpoint", "ExportEndpoint")
+    entity_registry = _LazyEndpoint("entity_registry_endpoint", "EntityRegistryClientEndpoint")
+    agent_registry = _LazyEndpoint("agent_registry_endpoint", "AgentRegistryClientEndpoint")
+    processes = _LazyEndpoint("process_endpoint", "ProcessClientEndpoint")
+    admin = _LazyEndpoint("admin_endpoint", "AdminClientEndpoint")
+    api_keys = _LazyEndpoint("api_keys_endpoint", "ApiKeysClientEndpoint")
+    fuzzy_mappings = _LazyEndpoint("fuzzy_mappings_endpoint", "FuzzyMappingsClientEndpoint")
+    vector_indexes = _LazyEndpoint("vector_indexes_endpoint", "VectorIndexesClientEndpoint")
+    search_mappings = _LazyEndpoint("search_mappings_endpoint", "SearchMappingsClientEndpoint")
+    fts_indexes = _LazyEndpoint("fts_indexes_endpoint", "FtsIndexesClientEndpoint")
+    kgdocuments = _LazyEndpoint("kgdocuments_endpoint", "KGDocumentsEndpoint")
+    geo_config = _LazyEndpoint("geo_config_endpoint", "GeoConfigClientEndpoint")
+    geo_points = _LazyEndpoint("geo_points_endpoint", "GeoPointsClientEndpoint")
+    metrics = _LazyEndpoint("metrics_endpoint", "MetricsClientEndpoint")
+    ontology = _LazyEndpoint("ontology_endpoint", "OntologyClientEndpoint")
+    changes = _LazyEndpoint("changes_endpoint", "ChangesClientEndpoint")
     
     def __init__(self, *, config: Optional[VitalGraphClientConfig] = None, 
                  token_expiry_seconds: Optional[int] = None,
@@ -136,6 +176,11 @@ class VitalGraphClient(VitalGraphClientInterface):
             {PROFILE}_CLIENT_BREAKER_THRESHOLD: Consecutive failures before the
                 circuit breaker opens (0 disables)
             {PROFILE}_CLIENT_BREAKER_RESET: Breaker reset timeout in seconds
+            {PROFILE}_CLIENT_RESPONSE_CACHE_ENTRIES: GET responses kept for ETag
+                revalidation (0 disables)
+            {PROFILE}_CLIENT_RESPONSE_CACHE_MB: Body bytes the response cache may hold
+            {PROFILE}_CLIENT_RESPONSE_COMPRESSION: Ask for compressed responses
+                (true/false, default true)
 
         Example:
             # Use LOCAL profile with username/password
@@ -191,39 +236,15 @@ class VitalGraphClient(VitalGraphClientInterface):
             reset_timeout=self.config.get_breaker_reset(),
         )
         self.retry_stats = RetryStats()
+        # Revalidating cache of ETag-carrying GET responses.
+        self.response_cache = ResponseCache(
+            max_entries=self.config.get_response_cache_entries(),
+            max_bytes=int(self.config.get_response_cache_mb() * 1024 * 1024),
+        )
         self._concurrency_limiter: Optional[asyncio.Semaphore] = None
         # Seam for tests: the budget clock. Mirrors CircuitBreaker's clock.
         self._clock = time.monotonic
 
-        # Initialize endpoint handlers
-        self.kgtypes = KGTypesEndpoint(self)
-        self.kgframes = KGFramesEndpoint(self)
-        self.kgentities = KGEntitiesEndpoint(self)
-        self.kgrelations = KGRelationsEndpoint(self)
-        self.kgqueries = KGQueriesEndpoint(self)
-        self.objects = ObjectsEndpoint(self)
-        self.files = FilesEndpoint(self)
-        self.spaces = SpacesEndpoint(self)
-        self.users = UsersEndpoint(self)
-        self.sparql = SparqlEndpoint(self)
-        self.graphs = GraphsEndpoint(self)
-        self.triples = TriplesEndpoint(self)
-        self.imports = ImportEndpoint(self)
-        self.exports = ExportEndpoint(self)
-        self.entity_registry = EntityRegistryClientEndpoint(self)
-        self.agent_registry = AgentRegistryClientEndpoint(self)
-        self.processes = ProcessClientEndpoint(self)
-        self.admin = AdminClientEndpoint(self)
-        self.api_keys = ApiKeysClientEndpoint(self)
-        self.fuzzy_mappings = FuzzyMappingsClientEndpoint(self)
-        self.vector_indexes = VectorIndexesClientEndpoint(self)
-        self.search_mappings = SearchMappingsClientEndpoint(self)
-        self.fts_indexes = FtsIndexesClientEndpoint(self)
-        self.kgdocuments = KGDocumentsClientEndpoint(self)
-        self.geo_config = GeoConfigClientEndpoint(self)
-        self.geo_points = GeoPointsClientEndpoint(self)
-        self.metrics = MetricsClientEndpoint(self)
-        self.ontology = OntologyClientEndpoint(self)
     
     async def open(self) -> None:
         """
@@ -244,11 +265,12 @@ class VitalGraphClient(VitalGraphClientInterface):
         try:
             # Create async HTTP session
             timeout = self.config.get_timeout()
-            from .utils.format_helpers import FORMAT_TO_ACCEPT
+            from .utils.wire_format import FORMAT_TO_ACCEPT
             accept_mime = FORMAT_TO_ACCEPT.get(self.wire_format, 'application/json')
             headers = {
                 'Accept': accept_mime,
-                'User-Agent': 'VitalGraph-Client/1.0'
+                'User-Agent': 'VitalGraph-Client/1.0',
+                'Accept-Encoding': accept_encoding(self.config.get_response_compression()),
             }
             
             # Per-phase timeouts rather than one scalar: a 30s connect timeout is
@@ -794,7 +816,9 @@ class VitalGraphClient(VitalGraphClientInterface):
                 response = await self._send_once(
                     method, url, remaining, timeout, **kwargs
                 )
-                response.raise_for_status()
+                # A 304 is the answer to a conditional GET, not a failure.
+                if response.status_code != 304:
+                    response.raise_for_status()
                 self.circuit_breaker.record_success()
                 return response
 
@@ -900,8 +924,66 @@ class VitalGraphClient(VitalGraphClientInterface):
         if not self.is_connected():
             raise VitalGraphClientError("Client is not connected")
 
+        if method.upper() == "GET" and self.response_cache.enabled:
+            return await self._conditional_get(url, **kwargs)
         return await self._send_with_retry(method, url, auth=True, **kwargs)
 
+    async def _conditional_get(self, url: str, **kwargs) -> httpx.Response:
+        """GET through the response cache: revalidate a cached body with
+        ``If-None-Match`` and hand back the stored 200 on a 304."""
+        cache = self.response_cache
+        key = cache.key(url, kwargs.get("params"), kwargs.get("headers"))
+        etag = cache.etag_for(key)
+        if etag is not None:
+            headers = dict(kwargs.get("headers") or {})
+            headers.setdefault("If-None-Match", etag)
+            kwargs["headers"] = headers
+        response = await self._send_with_retry("GET", url, auth=True, **kwargs)
+        if response.status_code == 304:
+            if etag is None:
+                return response  # the caller's own conditional request
+            replayed = cache.replay(key, response)
+            if replayed is not None:
+                return replayed
+            # Evicted between send and reply: fetch the body unconditionally.
+            kwargs["headers"].pop("If-None-Match", None)
+            response = await self._send_with_retry("GET", url, auth=True, **kwargs)
+        cache.store(key, response)
+        return response
+
+    def bulk_writer(self, space_id: str, graph_id: str, **options) -> "BulkWriter":
+        """
+        Create a chunked, concurrent writer for loading many objects.
+
+        Args:
+            space_id: Space identifier
+            graph_id: Graph identifier
+            **options: ``BulkWriter`` options (operation_mode,
+                target_chunk_bytes, concurrency, compress, on_progress, ...)
+
+        Returns:
+            BulkWriter bound to this client; call ``await writer.write(objects)``
+        """
+        from .bulk_writer import BulkWriter
+        return BulkWriter(self, space_id, graph_id, **options)
+
+    def batch(self, space_id: str, graph_id: Optional[str] = None, **options) -> "ClientBatch":
+        """
+        Collect KG calls and send them to the server as one request.
+
+        Args:
+            space_id: Space identifier
+            graph_id: Default graph identifier for every operation
+            **options: ``ClientBatch`` options (stop_on_error, max_parallel,
+                raise_on_error, transactional)
+
+        Returns:
+            ClientBatch; use as ``async with client.batch(...) as batch:``,
+            results are filled in on leaving the block
+        """
+        from .batch import ClientBatch
+        return ClientBatch(self, space_id, graph_id, **options)
+
     def stats(self) -> Dict[str, Any]:
         """
         Get in-process retry and circuit breaker counters.
@@ -912,6 +994,7 @@ class VitalGraphClient(VitalGraphClientInterface):
         data = self.retry_stats.as_dict()
         data["breaker_state"] = self.circuit_breaker.state.value
         data["breaker_trips"] = self.circuit_breaker.trip_count
+        data["response_cache"] = self.response_cache.stats()
         return data
 
     def get_server_info(self) -> Dict[str, Any]:
@@ -1225,6 +1308,30 @@ class VitalGraphClient(VitalGraphClientInterface):
             KGTypeListResponse containing KGTypes data and pagination info
         """
         return await self.kgtypes.list_kgtypes(space_id, graph_id, page_size, offset, search)
+
+    def iter_kgtypes(self, space_id: str, page_size: int = 100,
+                     max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                     search: Optional[str] = None, type_uri: Optional[str] = None) -> PageIterator:
+        """
+        Iterate every matching KGType, prefetching the next pages.
+
+        KGTypes are space-level, so unlike ``list_kgtypes`` there is no graph_id.
+
+        Args:
+            space_id: Space identifier
+            page_size: Types per request (server maximum 100)
+            max_in_flight: Page requests kept outstanding ahead of the caller
+            limit: Stop after this many types (None = all)
+            search: Optional search term
+            type_uri: Optional type URI to filter by subclass
+
+        Returns:
+            PageIterator yielding KGType GraphObjects; ``.pages()`` yields KGTypesListResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.kgtypes.list_kgtypes(
+                space_id, page_size=size, offset=offset, search=search, type_uri=type_uri),
+            "types", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_kgtype(self, space_id: str, graph_id: str, uri: str) -> KGTypeResponse:
         """
@@ -1303,6 +1410,16 @@ class VitalGraphClient(VitalGraphClientInterface):
                                document_type_uri: Optional[str] = None):
         """List KGDocuments with pagination and optional filtering."""
         return await self.kgdocuments.list_kgdocuments(space_id, graph_id, page_size, offset, search, include_segments, document_type_uri)
+
+    def iter_kgdocuments(self, space_id: str, graph_id: str, page_size: int = 100,
+                         max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                         search: Optional[str] = None, include_segments: bool = False,
+                         document_type_uri: Optional[str] = None) -> PageIterator:
+        """Iterate every matching KGDocument, prefetching the next pages (server maximum 100 per page)."""
+        return PageIterator(
+            lambda offset, size: self.kgdocuments.list_kgdocuments(
+                space_id, graph_id, size, offset, search, include_segments, document_type_uri),
+            "documents", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_kgdocument(self, space_id: str, graph_id: str, uri: str):
         """Get a single KGDocument by URI."""
@@ -1385,6 +1502,30 @@ class VitalGraphClient(VitalGraphClientInterface):
             PaginatedGraphObjectResponse containing KGFrame GraphObjects
         """
         return await self.kgframes.list_kgframes(space_id, graph_id, page_size, offset, search=search, **kwargs)
+
+    def iter_kgframes(self, space_id: str, graph_id: str, page_size: int = 1000,
+                      max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                      count_mode: Optional[str] = "none", **filters) -> PageIterator:
+        """
+        Iterate every matching KGFrame, prefetching the next pages.
+
+        Args:
+            space_id: Space identifier
+            graph_id: Graph identifier
+            page_size: Frames per request (server maximum 1000)
+            max_in_flight: Page requests kept outstanding ahead of the caller
+            limit: Stop after this many frames (None = all)
+            count_mode: Passed to each page; 'none' skips the per-page count
+            **filters: list_kgframes filters (parent_uri, search, frame_type_uri, ...)
+
+        Returns:
+            PageIterator yielding KGFrame GraphObjects; ``.pages()`` yields
+            PaginatedGraphObjectResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.kgframes.list_kgframes(
+                space_id, graph_id, size, offset, count_mode=count_mode, **filters),
+            "objects", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_kgframe(self, space_id: str, graph_id: str, uri: str) -> FrameGraphResponse:
         """
@@ -1553,6 +1694,30 @@ class VitalGraphClient(VitalGraphClientInterface):
             EntityListResponse containing KGEntities data and pagination info
         """
         return await self.kgentities.list_kgentities(space_id, graph_id, page_size, offset, search)
+
+    def iter_kgentities(self, space_id: str, graph_id: str, page_size: int = 1000,
+                        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                        count_mode: Optional[str] = "none", **filters) -> PageIterator:
+        """
+        Iterate every matching KGEntity, prefetching the next pages.
+
+        Args:
+            space_id: Space identifier
+            graph_id: Graph identifier
+            page_size: Entities per request (server maximum 1000)
+            max_in_flight: Page requests kept outstanding ahead of the caller
+            limit: Stop after this many entities (None = all)
+            count_mode: Passed to each page; 'none' skips the per-page count
+            **filters: list_kgentities filters (entity_type_uri, search, sort_by, status, ...)
+
+        Returns:
+            PageIterator yielding KGEntity GraphObjects; ``.pages()`` yields
+            PaginatedGraphObjectResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.kgentities.list_kgentities(
+                space_id, graph_id, size, offset, count_mode=count_mode, **filters),
+            "objects", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_kgentity(self, space_id: str, graph_id: str, uri: str) -> EntityResponse:
         """
@@ -1671,6 +1836,19 @@ class VitalGraphClient(VitalGraphClientInterface):
             ObjectsResponse containing Objects data and pagination info
         """
         return await self.objects.list_objects(space_id, graph_id, page_size, offset, search)
+
+    def iter_objects(self, space_id: str, graph_id: str, page_size: int = 1000,
+                     max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                     search: Optional[str] = None) -> PageIterator:
+        """
+        Iterate every object in a graph, prefetching the next pages.
+
+        Returns:
+            PageIterator yielding GraphObjects; ``.pages()`` yields ObjectsListResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.objects.list_objects(space_id, graph_id, size, offset, search),
+            "objects", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_object(self, space_id: str, graph_id: str, uri: str) -> ObjectResponse:
         """
@@ -1759,6 +1937,19 @@ class VitalGraphClient(VitalGraphClientInterface):
             FilesResponse containing Files data and pagination info
         """
         return await self.files.list_files(space_id, graph_id, page_size, offset, file_filter)
+
+    def iter_files(self, space_id: str, graph_id: Optional[str] = None, page_size: int = 1000,
+                   max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                   file_filter: Optional[str] = None) -> PageIterator:
+        """
+        Iterate every file node, prefetching the next pages.
+
+        Returns:
+            PageIterator yielding FileNode GraphObjects; ``.pages()`` yields FilesListResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.files.list_files(space_id, graph_id, size, offset, file_filter),
+            "objects", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def get_file(self, space_id: str, uri: str, graph_id: Optional[str] = None) -> FileResponse:
         """
@@ -2051,7 +2242,8 @@ class VitalGraphClient(VitalGraphClientInterface):
     
     async def list_triples(self, space_id: str, graph_id: str, page_size: int = 10, offset: int = 0, 
                     subject: Optional[str] = None, predicate: Optional[str] = None, 
-                    object: Optional[str] = None, object_filter: Optional[str] = None) -> 'TripleListResponse':
+                    object: Optional[str] = None, object_filter: Optional[str] = None,
+                    count_mode: Optional[str] = None) -> 'TripleListResponse':
         """
         List/search triples with pagination and filtering options.
         
@@ -2064,11 +2256,36 @@ class VitalGraphClient(VitalGraphClientInterface):
             predicate: Predicate URI filter (optional)
             object: Object value filter (optional)
             object_filter: Object filter (optional)
+            count_mode: 'exact', 'estimated', 'capped:N' or 'none' (optional)
             
         Returns:
             TripleListResponse containing triples data and pagination info
         """
-        return await self.triples.list_triples(space_id, graph_id, page_size, offset, subject, predicate, object, object_filter)
+        return await self.triples.list_triples(space_id, graph_id, page_size, offset, subject, predicate, object, object_filter,
+                                               count_mode=count_mode)
+
+    def iter_triples(self, space_id: str, graph_id: str, page_size: int = 100,
+                     max_in_flight: int = DEFAULT_MAX_IN_FLIGHT, limit: Optional[int] = None,
+                     count_mode: Optional[str] = "none", **filters) -> PageIterator:
+        """
+        Iterate every matching quad, prefetching the next pages.
+
+        Args:
+            space_id: Space identifier
+            graph_id: Graph identifier
+            page_size: Quads per request (server maximum 100)
+            max_in_flight: Page requests kept outstanding ahead of the caller
+            limit: Stop after this many quads (None = all)
+            count_mode: Passed to each page; 'none' skips the per-page count
+            **filters: list_triples filters (subject, predicate, object, object_filter)
+
+        Returns:
+            PageIterator yielding Quad rows; ``.pages()`` yields TripleListResponse
+        """
+        return PageIterator(
+            lambda offset, size: self.triples.list_triples(
+                space_id, graph_id, size, offset, count_mode=count_mode, **filters),
+            "results", page_size=page_size, max_in_flight=max_in_flight, limit=limit)
     
     async def search_triples(self, space_id: str, graph_id: Optional[str] = None, subject: Optional[str] = None, 
                       predicate: Optional[str] = None, object_value: Optional[str] = None, 
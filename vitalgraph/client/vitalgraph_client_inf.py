@@ -5,39 +5,45 @@ This interface can be implemented by different client implementations
 (REST client, mock client, etc.) to ensure consistent API.
 """
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
-from ..model.sparql_model import (
-    SPARQLQueryRequest, SPARQLQueryResponse, SPARQLUpdateRequest, SPARQLUpdateResponse,
-    SPARQLInsertRequest, SPARQLInsertResponse, SPARQLDeleteRequest, SPARQLDeleteResponse,
-    GraphInfo, SPARQLGraphRequest, SPARQLGraphResponse
-)
-from .response.client_response import (
-    GraphResponse, GraphsListResponse, GraphCreateResponse, GraphDeleteResponse, GraphClearResponse,
-    SpaceResponse, SpacesListResponse, SpaceCreateResponse, SpaceUpdateResponse, SpaceDeleteResponse,
-    KGTypesListResponse, KGTypeResponse, KGTypeCreateResponse, KGTypeUpdateResponse, KGTypeDeleteResponse,
-    ObjectsListResponse, ObjectResponse, ObjectCreateResponse, ObjectUpdateResponse, ObjectDeleteResponse,
-    PaginatedGraphObjectResponse, FrameGraphResponse, CreateEntityResponse, UpdateEntityResponse, DeleteResponse,
-    EntityResponse,
-    FilesListResponse, FileResponse, FileCreateResponse, FileUpdateResponse, FileDeleteResponse, FileUploadResponse,
-)
-from ..model.triples_model import (
-    TripleListResponse, TripleOperationResponse
-)
-from ..model.users_model import (
-    User, UsersListResponse, UserCreateResponse, UserUpdateResponse, UserDeleteResponse
-)
-from ..model.spaces_model import Space
-from ..model.import_model import (
-    ImportJobCreate, ImportJob, ImportJobsResponse, ImportJobResponse, ImportCreateResponse,
-    ImportDeleteResponse, ImportExecuteResponse, ImportStatusResponse, ImportLogResponse, ImportUploadResponse
-)
-from ..model.export_model import (
-    ExportJobCreate, ExportJob, ExportJobsResponse, ExportJobResponse, ExportCreateResponse,
-    ExportDeleteResponse, ExportExecuteResponse, ExportStatusResponse
-)
-from vital_ai_vitalsigns.model.GraphObject import GraphObject
-from ..model.quad_model import QuadRequest
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, Union
+
+# Annotations only: importing the interface (and with it VitalGraphClient)
+# must not load VitalSigns or the model layer.
+if TYPE_CHECKING:
+    from ..model.sparql_model import (
+        SPARQLQueryRequest, SPARQLQueryResponse, SPARQLUpdateRequest, SPARQLUpdateResponse,
+        SPARQLInsertRequest, SPARQLInsertResponse, SPARQLDeleteRequest, SPARQLDeleteResponse,
+        GraphInfo, SPARQLGraphRequest, SPARQLGraphResponse
+    )
+    from .response.client_response import (
+        GraphResponse, GraphsListResponse, GraphCreateResponse, GraphDeleteResponse, GraphClearResponse,
+        SpaceResponse, SpacesListResponse, SpaceCreateResponse, SpaceUpdateResponse, SpaceDeleteResponse,
+        KGTypesListResponse, KGTypeResponse, KGTypeCreateResponse, KGTypeUpdateResponse, KGTypeDeleteResponse,
+        ObjectsListResponse, ObjectResponse, ObjectCreateResponse, ObjectUpdateResponse, ObjectDeleteResponse,
+        PaginatedGraphObjectResponse, FrameGraphResponse, CreateEntityResponse, UpdateEntityResponse, DeleteResponse,
+        EntityResponse,
+        FilesListResponse, FileResponse, FileCreateResponse, FileUpdateResponse, FileDeleteResponse, FileUploadResponse,
+    )
+    from ..model.triples_model import (
+        TripleListResponse, TripleOperationResponse
+    )
+    from ..model.users_model import (
+        User, UsersListResponse, UserCreateResponse, UserUpdateResponse, UserDeleteResponse
+    )
+    from ..model.spaces_model import Space
+    from ..model.import_model import (
+        ImportJobCreate, ImportJob, ImportJobsResponse, ImportJobResponse, ImportCreateResponse,
+        ImportDeleteResponse, ImportExecuteResponse, ImportStatusResponse, ImportLogResponse, ImportUploadResponse
+    )
+    from ..model.export_model import (
+        ExportJobCreate, ExportJob, ExportJobsResponse, ExportJobResponse, ExportCreateResponse,
+        ExportDeleteResponse, ExportExecuteResponse, ExportStatusResponse
+    )
+    from vital_ai_vitalsigns.model.GraphObject import GraphObject
+    from ..model.quad_model import QuadRequest
 
 
 class VitalGraphClientInterface(ABC):
@@ -443,7 +449,8 @@ class VitalGraphClientInterface(ABC):
     @abstractmethod
     async def list_triples(self, space_id: str, graph_id: str, page_size: int = 10, offset: int = 0, 
                     subject: Optional[str] = None, predicate: Optional[str] = None, 
-                    object: Optional[str] = None, object_filter: Optional[str] = None) -> TripleListResponse:
+                    object: Optional[str] = None, object_filter: Optional[str] = None,
+                    count_mode: Optional[str] = None) -> TripleListResponse:
         """List/search triples with pagination and filtering options."""
         pass
     
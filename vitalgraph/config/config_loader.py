@@ -133,6 +133,14 @@ class VitalGraphConfig:
                     'url': self._get_profile_env('SIDECAR_URL', 'http://localhost:7070'),
                 }
             },
+            'oxigraph': {
+                # Directory for the embedded RocksDB stores; empty = in-memory
+                'store_path': self._get_profile_env('OXIGRAPH_STORE_PATH', ''),
+                'bulk_threshold': int(self._get_profile_env('OXIGRAPH_BULK_THRESHOLD', '10000')),
+                # No user store: the server refuses to start unless this
+                # explicitly disables auth for a single local user
+                'single_user': self._get_profile_env('OXIGRAPH_SINGLE_USER', 'false').lower() == 'true'
+            },
             'fuseki_postgresql': {
                 'database': {
                     'host': self._get_profile_env('DB_HOST', 'localhost'),
@@ -343,6 +351,19 @@ class VitalGraphConfig:
         """
         return self.config_data.get('sparql_sql', {})
     
+    def get_oxigraph_config(self) -> Dict[str, Any]:
+        """
+        Get embedded Oxigraph backend configuration section.
+        
+        Returns:
+            Dictionary containing oxigraph configuration
+                (store_path, bulk_threshold, single_user). The embedded
+                backend has no user, API key or permission tables, so
+                single_user must be set: every request then runs as one
+                local admin, with no login.
+        """
+        return self.config_data.get('oxigraph', {})
+    
     def get_fuseki_postgresql_config(self) -> Dict[str, Any]:
         """
         Get Fuseki-PostgreSQL hybrid backend configuration section.
@@ -160,6 +160,15 @@ class BackendFactory:
             except ImportError as e:
                 raise ImportError(f"SPARQL SQL SPARQL backend dependencies not available: {e}")
                 
+        elif config.backend_type == BackendType.OXIGRAPH:
+            try:
+                from .oxigraph.oxigraph_space_impl import OxigraphSpaceImpl
+                
+                # Like the hybrid backend, SPARQL goes through the space implementation
+                return OxigraphSpaceImpl(**config.connection_params)
+            except ImportError as e:
+                raise ImportError(f"Oxigraph SPARQL backend dependencies not available: {e}")
+                
         else:
             raise ValueError(f"SPARQL backend not supported for: {config.backend_type}")
     
@@ -211,6 +220,13 @@ class BackendFactory:
             except ImportError as e:
                 raise ImportError(f"SPARQL SQL signal manager dependencies not available: {e}")
                 
+        elif config.backend_type == BackendType.OXIGRAPH:
+            try:
+                from .oxigraph.oxigraph_signal_impl import OxigraphSignalManager
+                return OxigraphSignalManager(**signal_config)
+            except ImportError as e:
+                raise ImportError(f"Oxigraph signal manager dependencies not available: {e}")
+                
         else:
             raise ValueError(f"Signal manager not supported for: {config.backend_type}")
     
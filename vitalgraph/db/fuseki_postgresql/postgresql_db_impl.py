@@ -89,6 +89,8 @@ class FusekiPostgreSQLDbImpl(UserManagementMixin, DbImplInterface):
             
             import json as _json
 
+            from vitalgraph.db.vector_codec import register_vector_codec
+
             async def _init_conn(conn):
                 await conn.set_type_codec(
                     'jsonb', encoder=_json.dumps, decoder=_json.loads,
@@ -98,6 +100,9 @@ class FusekiPostgreSQLDbImpl(UserManagementMixin, DbImplInterface):
                     'json', encoder=_json.dumps, decoder=_json.loads,
                     schema='pg_catalog',
                 )
+                # Binary pgvector codec: embeddings as float32 ndarrays,
+                # not "[...]" text. No-op before CREATE EXTENSION.
+                await register_vector_codec(conn)
 
             # Create connection pool using asyncpg
             from vitalgraph.db.pool import create_pool, DEFAULT_ACQUIRE_TIMEOUT
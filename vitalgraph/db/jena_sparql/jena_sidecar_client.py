@@ -12,6 +12,8 @@ from typing import Optional, Dict, Any
 
 import httpx
 
+from ...metrics.histograms import sidecar_seconds
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_URL = "http://localhost:7070"
@@ -159,11 +161,18 @@ class AsyncSidecarClient:
             )
 
         t0 = time.monotonic()
-        resp = await self._client.post(
-            "/v1/sparql/compile",
-            json={"sparql": sparql},
-        )
+        try:
+            resp = await self._client.post(
+                "/v1/sparql/compile",
+                json={"sparql": sparql},
+            )
+        except Exception:
+            sidecar_seconds.labels("compile", "error").observe(time.monotonic() - t0)
+            raise
         elapsed_ms = (time.monotonic() - t0) * 1000
+        sidecar_seconds.labels(
+            "compile", "ok" if resp.status_code < 400 else "error"
+        ).observe(elapsed_ms / 1000)
 
         resp.raise_for_status()
         data = resp.json()
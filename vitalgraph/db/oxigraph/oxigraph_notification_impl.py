@@ -0,0 +1,87 @@
+"""
+In-process notification transport for the embedded Oxigraph backend.
+
+The PostgreSQL backends carry signals over NOTIFY/LISTEN so that every
+VitalGraph instance sharing the database hears about every change. An
+embedded Oxigraph store is owned by exactly one process (RocksDB takes an
+exclusive lock on the directory), so there is nobody outside the process
+to tell: the transport is a channel -> callbacks table in memory.
+
+Delivery stays asynchronous, as it is with NOTIFY. ``publish`` schedules
+the callbacks as a task and returns, so a writer never waits on a slow
+listener and a listener that raises cannot fail the write that triggered
+it. Payloads are the same JSON strings the PostgreSQL SignalManager sends,
+decoded once per publish, so listeners written against that manager work
+unchanged.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Set
+
+logger = logging.getLogger(__name__)
+
+
+class OxigraphNotificationBus:
+    """Channel fan-out for notifications that never leave the process."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable[[dict], Any]]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self.published = 0
+        self.closed = False
+
+    def subscribe(self, channel: str, callback: Callable[[dict], Any]) -> None:
+        """Call ``callback(data)`` for every payload published on ``channel``."""
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def unsubscribe(self, channel: str, callback: Callable[[dict], Any]) -> bool:
+        """Remove one registration of ``callback``; False if it was not there."""
+        callbacks = self._subscribers.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+            return True
+        return False
+
+    def publish(self, channel: str, payload: str) -> None:
+        """Deliver ``payload`` (a JSON string) to the channel's subscribers.
+
+        Returns immediately; callbacks run in a task on the current loop.
+        """
+        if self.closed:
+            return
+        callbacks = list(self._subscribers.get(channel, ()))
+        self.published += 1
+        if not callbacks:
+            return
+        try:
+            data = json.loads(payload) if payload else {}
+        except json.JSONDecodeError:
+            data = {"raw_payload": payload}
+        task = asyncio.get_running_loop().create_task(
+            self._deliver(channel, callbacks, data))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _deliver(self, channel: str, callbacks: List[Callable[[dict], Any]],
+                       data: dict) -> None:
+        for callback in callbacks:
+            try:
+                result = callback(data)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error executing callback for channel '{channel}': {e}")
+
+    async def drain(self) -> None:
+        """Wait until every published payload has been delivered."""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def close(self) -> None:
+        """Drop all subscribers and cancel deliveries still in flight."""
+        self.closed = True
+        for task in list(self._pending):
+            task.cancel()
+        self._subscribers.clear()
@@ -0,0 +1,123 @@
+"""
+Signal manager for the embedded Oxigraph backend.
+
+Same channels, same payloads and the same ``notify_*`` / ``register_callback``
+API as the PostgreSQL ``SignalManager`` — the caches, the entity-graph
+invalidation and the space registry subscribe to those and need not know
+which backend is underneath. Only the transport differs: ``NOTIFY`` becomes
+a publish on the process-local ``OxigraphNotificationBus``.
+
+It also implements ``SignalManagerInterface`` so ``BackendFactory`` can hand
+it out alongside the other backends' managers.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..space_backend_interface import SignalManagerInterface
+from ...signal.signal_manager import (
+    CHANNEL_SPACE,
+    SIGNAL_TYPE_CREATED,
+    SIGNAL_TYPE_DELETED,
+    SIGNAL_TYPE_UPDATED,
+    SignalManager,
+)
+from .oxigraph_notification_impl import OxigraphNotificationBus
+
+logger = logging.getLogger(__name__)
+
+
+class OxigraphSignalManager(SignalManager, SignalManagerInterface):
+    """In-process signals: no database connection, no listener task."""
+
+    def __init__(self, bus: Optional[OxigraphNotificationBus] = None, **config):
+        """
+        Args:
+            bus: Transport to publish on; a private one if omitted. Pass the
+                backend's bus to share subscribers with it.
+            **config: Accepted for factory compatibility, unused.
+        """
+        # Set before the base __init__, which registers its logging callbacks.
+        self.bus = bus or OxigraphNotificationBus()
+        self.config = config
+        super().__init__(db_impl=None)
+        # callback -> [(channel, registered wrapper)], for unsubscribe
+        self._space_subscriptions: Dict[Callable, List[Tuple[str, Callable]]] = {}
+
+    # ------------------------------------------------------------------
+    # Transport (overrides the PostgreSQL connection handling)
+    # ------------------------------------------------------------------
+
+    def register_callback(self, channel: str, callback: Callable[[dict], Any]):
+        if not callable(callback):
+            self.logger.error(f"Callback for channel '{channel}' is not callable: {callback}")
+            return
+        self.callbacks.setdefault(channel, []).append(callback)
+        self.bus.subscribe(channel, callback)
+
+    def unregister_callback(self, channel: str, callback: Callable[[dict], Any]) -> bool:
+        if callback in self.callbacks.get(channel, []):
+            self.callbacks[channel].remove(callback)
+        return self.bus.unsubscribe(channel, callback)
+
+    async def start_listening(self):
+        """Nothing to connect; marks the manager running."""
+        self.running = True
+
+    async def stop_listening(self):
+        """Deliver anything still queued, then stop."""
+        self.running = False
+        await self.bus.drain()
+
+    async def _send_notification(self, channel: str, payload: str):
+        self.bus.publish(channel, payload)
+        self.logger.debug(f"🔔 Published in-process notification on '{channel}': {payload}")
+
+    # ------------------------------------------------------------------
+    # SignalManagerInterface
+    # ------------------------------------------------------------------
+
+    async def notify_space_created(self, space_id: str) -> None:
+        await self.notify_spaces_changed(SIGNAL_TYPE_CREATED)
+        await self.notify_space_changed(space_id, SIGNAL_TYPE_CREATED)
+
+    async def notify_space_deleted(self, space_id: str) -> None:
+        await self.notify_spaces_changed(SIGNAL_TYPE_DELETED)
+        await self.notify_space_changed(space_id, SIGNAL_TYPE_DELETED)
+
+    async def notify_space_updated(self, space_id: str, update_type: str,
+                                   metadata: Dict[str, Any] = None) -> None:
+        payload = {
+            "type": SIGNAL_TYPE_UPDATED,
+            "space_id": space_id,
+            "update_type": update_type,
+            "timestamp": str(asyncio.get_event_loop().time()),
+        }
+        if metadata:
+            payload["metadata"] = metadata
+        await self._send_notification(CHANNEL_SPACE, json.dumps(payload, default=str))
+
+    async def subscribe_to_space_events(self, callback, space_id: Optional[str] = None) -> None:
+        if space_id is None:
+            wrapper = callback
+        else:
+            async def wrapper(data: dict):
+                if data.get("space_id") == space_id:
+                    result = callback(data)
+                    if asyncio.iscoroutine(result):
+                        await result
+        self.register_callback(CHANNEL_SPACE, wrapper)
+        self._space_subscriptions.setdefault(callback, []).append((CHANNEL_SPACE, wrapper))
+
+    async def unsubscribe_from_space_events(self, callback) -> None:
+        for channel, wrapper in self._space_subscriptions.pop(callback, []):
+            self.unregister_callback(channel, wrapper)
+
+    def close(self) -> None:
+        self.running = False
+        self.bus.close()
+        self._space_subscriptions.clear()
+        for callbacks in self.callbacks.values():
+            callbacks.clear()
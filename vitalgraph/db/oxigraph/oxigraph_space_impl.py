@@ -0,0 +1,765 @@
+"""
+Embedded Oxigraph space backend for VitalGraph.
+
+Everything runs in the VitalGraph process on pyoxigraph — no PostgreSQL,
+no Fuseki, no SPARQL sidecar. Intended for small single-node tenants
+(edge deployments) and as the fast backend for unit and integration
+tests, where a space costs a directory (or nothing, in memory) instead of
+a database schema and a Fuseki dataset.
+
+Architecture:
+- One pyoxigraph ``Store`` per space, so a space is its own dataset and
+  graph URIs are used verbatim — the same isolation the Fuseki datasets
+  give, and SPARQL from the KG endpoints runs unmodified.
+- An admin store holds the space registry (name, description, tenant)
+  and per-space namespace prefixes, as RDF in ``urn:vitalgraph:spaces``.
+- ``store_path`` set: RocksDB-backed stores under
+  ``{store_path}/admin`` and ``{store_path}/spaces/{space_id}``.
+  ``store_path`` unset: in-memory stores, gone when the process exits.
+- Writes of up to ``bulk_threshold`` quads are one transaction
+  (``Store.extend``); larger batches and file loads go through the native
+  bulk loader, which writes sorted SST files directly and skips the
+  transaction log. ``bulk_load`` exposes the loader for whole files.
+- Signals are in-process (``OxigraphSignalManager``): RocksDB locks the
+  store directory, so a store has exactly one owning process and nobody
+  outside it to notify.
+
+Blocking store calls run in worker threads; pyoxigraph releases the GIL
+while it works, so queries on different spaces proceed in parallel.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple, Union
+
+from pyoxigraph import (
+    BlankNode,
+    DefaultGraph,
+    Literal as OxLiteral,
+    NamedNode,
+    Quad,
+    RdfFormat,
+    Store,
+)
+from rdflib import BNode, Literal, URIRef
+from rdflib.term import Identifier
+
+from ..space_backend_interface import SpaceBackendInterface
+from ...signal.signal_manager import SIGNAL_TYPE_UPDATED
+from .oxigraph_signal_impl import OxigraphSignalManager
+from .oxigraph_sparql_impl import OxigraphSparqlImpl
+
+logger = logging.getLogger(__name__)
+
+# Space ids become directory names.
+_SPACE_ID_RE = re.compile(r"^[A-Za-z0-9_\-]+$")
+
+_XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+_ADMIN_GRAPH = NamedNode("urn:vitalgraph:spaces")
+_SPACE_CLASS = NamedNode("urn:vitalgraph:Space")
+_NAMESPACE_CLASS = NamedNode("urn:vitalgraph:Namespace")
+_RDF_TYPE = NamedNode("http://www.w3.org/1999/02/22-rdf-syntax-ns#type")
+_P = {
+    name: NamedNode(f"urn:vitalgraph:{name}")
+    for name in ("spaceId", "spaceName", "spaceDescription", "tenant", "updateTime",
+                 "namespaceOf", "prefix", "namespaceUri")
+}
+
+# Quads fetched per worker-thread hop when streaming ``quads()``.
+_QUAD_PAGE = 5_000
+
+_IRI_PREFIXES = ("http://", "https://", "urn:", "file:", "mailto:", "tag:")
+
+
+def _to_oxigraph(term, *, allow_literal: bool = False):
+    """An rdflib term (or plain string) as a pyoxigraph term; None stays None.
+
+    Strings follow the rules the other backends apply to untyped terms:
+    ``<iri>`` and ``_:label`` are parsed, anything that looks like an IRI
+    is a NamedNode, and in the object position the rest is a plain literal.
+    """
+    if term is None or isinstance(term, (NamedNode, BlankNode, OxLiteral)):
+        return term
+    if isinstance(term, URIRef):
+        return NamedNode(str(term))
+    if isinstance(term, BNode):
+        return BlankNode(str(term))
+    if isinstance(term, Literal):
+        if term.language:
+            return OxLiteral(str(term), language=term.language)
+        if term.datatype is not None:
+            return OxLiteral(str(term), datatype=NamedNode(str(term.datatype)))
+        return OxLiteral(str(term))
+    text = str(term)
+    if text.startswith("<") and text.endswith(">"):
+        return NamedNode(text[1:-1])
+    if text.startswith("_:"):
+        return BlankNode(text[2:])
+    if allow_literal and not text.startswith(_IRI_PREFIXES):
+        return OxLiteral(text)
+    return NamedNode(text)
+
+
+def _to_oxigraph_graph(graph):
+    if graph is None or graph == "" or isinstance(graph, DefaultGraph):
+        return DefaultGraph()
+    return _to_oxigraph(graph)
+
+
+def _to_rdflib(term) -> Optional[Identifier]:
+    """A pyoxigraph term as rdflib; the default graph becomes None."""
+    if isinstance(term, NamedNode):
+        return URIRef(term.value)
+    if isinstance(term, BlankNode):
+        return BNode(term.value)
+    if isinstance(term, OxLiteral):
+        if term.language:
+            return Literal(term.value, lang=term.language)
+        if term.datatype.value != _XSD_STRING:
+            return Literal(term.value, datatype=URIRef(term.datatype.value))
+        return Literal(term.value)
+    return None
+
+
+def _to_quad(quad: Union[tuple, list]) -> Quad:
+    s, p, o, g = quad
+    return Quad(_to_oxigraph(s), _to_oxigraph(p), _to_oxigraph(o, allow_literal=True),
+                _to_oxigraph_graph(g))
+
+
+def _has_blank_node(quad: Quad) -> bool:
+    return isinstance(quad.subject, BlankNode) or isinstance(quad.object, BlankNode)
+
+
+def _rdf_format(fmt: Union[RdfFormat, str, None], path: Optional[str]) -> RdfFormat:
+    """``fmt`` as an RdfFormat: accepts a format, extension or media type."""
+    if isinstance(fmt, RdfFormat):
+        return fmt
+    if fmt:
+        return (RdfFormat.from_media_type(fmt) if "/" in fmt
+                else RdfFormat.from_extension(fmt.lstrip(".")))
+    if path:
+        guessed = RdfFormat.from_extension(os.path.splitext(str(path))[1].lstrip("."))
+        if guessed is not None:
+            return guessed
+    raise ValueError("RDF format not given and not inferable from the file name")
+
+
+class OxigraphSpaceImpl(SpaceBackendInterface):
+    """
+    SpaceBackendInterface on embedded pyoxigraph stores, one per space.
+
+    Also provides the calls the KG endpoints make on a backend
+    (``execute_sparql_query``, ``query_quads``, ``execute_sparql_update``,
+    ``update_quads``, ``create_space_metadata``, ``list_spaces`` returning
+    dicts) so ``OxigraphBackendAdapter`` is a thin pass-through.
+    """
+
+    def __init__(self, store_path: Optional[str] = None, bulk_threshold: int = 10_000,
+                 **kwargs):
+        """
+        Initialize the Oxigraph backend. Stores are opened by ``connect()``.
+
+        Args:
+            store_path: Directory for the RocksDB stores; None or '' keeps
+                everything in memory.
+            bulk_threshold: Batches of at least this many quads bypass the
+                transactional path for the bulk loader.
+            **kwargs: Additional configuration parameters (ignored)
+        """
+        self.store_path = store_path or None
+        self.bulk_threshold = bulk_threshold
+        self._admin: Optional[Store] = None
+        self._stores: Dict[str, Store] = {}
+        self._store_lock = threading.Lock()
+        self._sparql_impl: Optional[OxigraphSparqlImpl] = None
+        self.signal_manager = OxigraphSignalManager()
+        self.connected = False
+        if self.store_path is None:
+            logger.warning("Oxigraph backend is in-memory: all data is lost when the process exits")
+        logger.info(f"OxigraphSpaceImpl initialized (store_path={self.store_path or ':memory:'})")
+
+    # ========================================
+    # Connection and Resource Management
+    # ========================================
+
+    async def connect(self) -> bool:
+        """Open the admin store (spaces are opened on first use)."""
+        if self.connected:
+            return True
+        try:
+            if self.store_path is None:
+                self._admin = Store()
+            else:
+                os.makedirs(os.path.join(self.store_path, "spaces"), exist_ok=True)
+                self._admin = await asyncio.to_thread(
+                    Store, os.path.join(self.store_path, "admin"))
+            self.connected = True
+            await self.signal_manager.start_listening()
+            logger.info("Oxigraph backend connected")
+            return True
+        except Exception as e:
+            logger.error(f"Error opening Oxigraph stores at {self.store_path}: {e}")
+            return False
+
+    async def disconnect(self) -> bool:
+        """Flush and release every store. In-memory data is discarded."""
+        await self.signal_manager.stop_listening()
+        with self._store_lock:
+            stores, self._stores = list(self._stores.values()), {}
+            admin, self._admin = self._admin, None
+        if self.store_path is not None:
+            # Flushed on the loop thread, not via to_thread: a pool worker can
+            # hold its call's reference a moment after returning, which keeps
+            # the RocksDB lock and fails an immediate reopen of the directory.
+            for store in stores + ([admin] if admin is not None else []):
+                try:
+                    store.flush()
+                except Exception as e:
+                    logger.warning(f"Error flushing Oxigraph store: {e}")
+        del stores, admin
+        self.connected = False
+        return True
+
+    async def is_connected(self) -> bool:
+        return self.connected
+
+    async def close(self) -> bool:
+        """Close the backend (same as disconnect)."""
+        result = await self.disconnect()
+        self.signal_manager.close()
+        return result
+
+    @asynccontextmanager
+    async def get_db_connection(self, space_id: Optional[str] = None):
+        """Yield the space's store (the admin store without a space)."""
+        yield self.get_store(space_id) if space_id else self._require_admin()
+
+    def get_signal_manager(self) -> OxigraphSignalManager:
+        return self.signal_manager
+
+    def _require_admin(self) -> Store:
+        if self._admin is None:
+            raise RuntimeError("Backend not connected")
+        return self._admin
+
+    def _space_dir(self, space_id: str) -> str:
+        return os.path.join(self.store_path, "spaces", space_id)
+
+    @staticmethod
+    def _space_node(space_id: str) -> NamedNode:
+        return NamedNode(f"urn:vitalgraph:space:{space_id}")
+
+    def _is_registered(self, space_id: str) -> bool:
+        return any(self._require_admin().quads_for_pattern(
+            self._space_node(space_id), _RDF_TYPE, _SPACE_CLASS, _ADMIN_GRAPH))
+
+    def get_store(self, space_id: str) -> Store:
+        """
+        The open store for a space, opening it on first use.
+
+        Raises:
+            ValueError: if the space does not exist
+        """
+        store = self._stores.get(space_id)
+        if store is not None:
+            return store
+        if not self._is_registered(space_id):
+            raise ValueError(f"Space '{space_id}' does not exist")
+        return self._open_store(space_id)
+
+    def _open_store(self, space_id: str) -> Store:
+        with self._store_lock:
+            store = self._stores.get(space_id)
+            if store is None:
+                store = Store() if self.store_path is None else Store(self._space_dir(space_id))
+                self._stores[space_id] = store
+            return store
+
+    # ========================================
+    # Space Lifecycle Management
+    # ========================================
+
+    async def create_space_storage(self, space_id: str, partition_quads: int = 0) -> bool:
+        """Create the store for a space and register it.
+
+        ``partition_quads`` is a PostgreSQL-only option (sparql_sql backend)
+        and is ignored here.
+        """
+        if not _SPACE_ID_RE.match(space_id or ""):
+            logger.error(f"Invalid space id for Oxigraph storage: {space_id!r}")
+            return False
+        try:
+            admin = self._require_admin()
+            await asyncio.to_thread(self._open_store, space_id)
+            node = self._space_node(space_id)
+            await asyncio.to_thread(admin.extend, [
+                Quad(node, _RDF_TYPE, _SPACE_CLASS, _ADMIN_GRAPH),
+                Quad(node, _P["spaceId"], OxLiteral(space_id), _ADMIN_GRAPH),
+            ])
+            await self.signal_manager.notify_space_created(space_id)
+            logger.info(f"Oxigraph storage created for space: {space_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error creating space storage for {space_id}: {e}")
+            return False
+
+    async def delete_space_storage(self, space_id: str) -> bool:
+        """Drop the space's store, its directory, metadata and namespaces."""
+        try:
+            admin = self._require_admin()
+            with self._store_lock:
+                store = self._stores.pop(space_id, None)
+            if store is not None and self.store_path is None:
+                await asyncio.to_thread(store.clear)
+            del store
+            if self.store_path is not None:
+                await asyncio.to_thread(shutil.rmtree, self._space_dir(space_id), True)
+            node = self._space_node(space_id)
+            await asyncio.to_thread(admin.update, f"""
+                DELETE WHERE {{ GRAPH <{_ADMIN_GRAPH.value}> {{ ?ns <{_P['namespaceOf'].value}> {node} ; ?p ?o }} }} ;
+                DELETE WHERE {{ GRAPH <{_ADMIN_GRAPH.value}> {{ {node} ?p ?o }} }}
+            """)
+            await self.signal_manager.notify_space_deleted(space_id)
+            logger.info(f"Oxigraph storage deleted for space: {space_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting space storage for {space_id}: {e}")
+            return False
+
+    async def space_exists(self, space_id: str) -> bool:
+        try:
+            return self._is_registered(space_id)
+        except RuntimeError:
+            return False
+
+    async def space_storage_exists(self, space_id: str) -> bool:
+        return await self.space_exists(space_id)
+
+    async def create_space_metadata(self, space_id: str, metadata: Dict[str, Any]) -> bool:
+        """Record (or replace) a space's name, description and tenant."""
+        try:
+            admin = self._require_admin()
+            node = self._space_node(space_id)
+            fields = {
+                "spaceName": metadata.get('space_name') or space_id,
+                "spaceDescription": metadata.get('space_description') or '',
+                "tenant": metadata.get('tenant') or 'default',
+                "updateTime": datetime.now(timezone.utc).isoformat(),
+            }
+
+            def _replace():
+                for name in fields:
+                    for quad in list(admin.quads_for_pattern(node, _P[name], None, _ADMIN_GRAPH)):
+                        admin.remove(quad)
+                admin.extend([Quad(node, _P[name], OxLiteral(value), _ADMIN_GRAPH)
+                              for name, value in fields.items()])
+
+            await asyncio.to_thread(_replace)
+            return True
+        except Exception as e:
+            logger.error(f"Error creating space metadata for {space_id}: {e}")
+            return False
+
+    async def delete_space_metadata(self, space_id: str) -> bool:
+        return await self.create_space_metadata(space_id, {})
+
+    async def get_space_metadata(self, space_id: str) -> Optional[Dict[str, Any]]:
+        for space in await self.list_spaces():
+            if space['space_id'] == space_id:
+                return space
+        return None
+
+    async def list_spaces(self) -> List[Dict[str, Any]]:
+        """All registered spaces as dicts shaped like the PostgreSQL ``space`` rows."""
+        try:
+            admin = self._require_admin()
+        except RuntimeError:
+            return []
+        query = f"""
+            SELECT ?space_id ?space_name ?space_description ?tenant ?update_time WHERE {{
+                GRAPH <{_ADMIN_GRAPH.value}> {{
+                    ?s a <{_SPACE_CLASS.value}> ; <{_P['spaceId'].value}> ?space_id .
+                    OPTIONAL {{ ?s <{_P['spaceName'].value}> ?space_name }}
+                    OPTIONAL {{ ?s <{_P['spaceDescription'].value}> ?space_description }}
+                    OPTIONAL {{ ?s <{_P['tenant'].value}> ?tenant }}
+                    OPTIONAL {{ ?s <{_P['updateTime'].value}> ?update_time }}
+                }}
+            }} ORDER BY ?space_id
+        """
+
+        def _run():
+            # Results are lazy: consume them on the worker thread too.
+            results = admin.query(query)
+            variables = [v.value for v in results.variables]
+            return [{name: (row[name].value if row[name] is not None else None)
+                     for name in variables}
+                    for row in results]
+
+        return await asyncio.to_thread(_run)
+
+    async def get_space_info(self, space_id: str) -> Dict[str, Any]:
+        try:
+            store = self.get_store(space_id)
+            graphs = await asyncio.to_thread(lambda: sorted(g.value for g in store.named_graphs()))
+            return {
+                'space_id': space_id,
+                'metadata': await self.get_space_metadata(space_id),
+                'quad_count': await self.get_rdf_quad_count(space_id),
+                'graph_uris': graphs,
+                'store_path': self._space_dir(space_id) if self.store_path else None,
+                'backend_type': 'oxigraph',
+            }
+        except Exception as e:
+            logger.error(f"Error getting space info for {space_id}: {e}")
+            return {'space_id': space_id, 'error': str(e), 'backend_type': 'oxigraph'}
+
+    # ========================================
+    # RDF Quad Operations
+    # ========================================
+
+    async def add_rdf_quad(self, space_id: str, quad: Union[tuple, list]) -> bool:
+        return await self.add_rdf_quads_batch(space_id, [quad]) > 0
+
+    async def remove_rdf_quad(self, space_id: str, s: str, p: str, o: str, g: str) -> bool:
+        return await self.remove_rdf_quads_batch(space_id, [(s, p, o, g)]) > 0
+
+    async def get_rdf_quad(self, space_id: str, s: str, p: str, o: str, g: str) -> bool:
+        store = self.get_store(space_id)
+        return _to_quad((s, p, o, g)) in store
+
+    async def get_rdf_quad_count(self, space_id: str, graph_uri: Optional[str] = None) -> int:
+        store = self.get_store(space_id)
+        if graph_uri is None:
+            return await asyncio.to_thread(len, store)
+        graph = _to_oxigraph_graph(graph_uri)
+        return await asyncio.to_thread(
+            lambda: sum(1 for _ in store.quads_for_pattern(None, None, None, graph)))
+
+    async def add_rdf_quads_batch(self, space_id: str,
+                                  quads: List[Tuple[Identifier, Identifier, Identifier, Identifier]],
+                                  auto_commit: bool = True, verify_count: bool = False,
+                                  connection=None) -> int:
+        """
+        Add quads (rdflib terms or strings). Returns the number submitted;
+        quads already present are not duplicated.
+
+        Below ``bulk_threshold`` the batch is one transaction. At or above it
+        the bulk loader is used: much faster, but not atomic — a failure part
+        way leaves the quads written so far.
+        """
+        if not quads:
+            return 0
+        try:
+            store = self.get_store(space_id)
+            converted = [_to_quad(q) for q in quads]
+            if len(converted) >= self.bulk_threshold:
+                await asyncio.to_thread(store.bulk_extend, converted)
+            else:
+                await asyncio.to_thread(store.extend, converted)
+            await self._notify_graphs(space_id, converted)
+            return len(converted)
+        except Exception as e:
+            logger.error(f"Error adding {len(quads)} quads to space {space_id}: {e}")
+            return 0
+
+    async def add_rdf_quads_batch_bulk(self, space_id: str, quads: list, connection=None) -> int:
+        """Add quads through the bulk loader regardless of batch size."""
+        if not quads:
+            return 0
+        try:
+            store = self.get_store(space_id)
+            converted = [_to_quad(q) for q in quads]
+            await asyncio.to_thread(store.bulk_extend, converted)
+            await self._notify_graphs(space_id, converted)
+            return len(converted)
+        except Exception as e:
+            logger.error(f"Error bulk adding {len(quads)} quads to space {space_id}: {e}")
+            return 0
+
+    async def remove_rdf_quads_batch(self, space_id: str, quads: List[tuple]) -> int:
+        """Remove quads; returns how many were present and removed."""
+        if not quads:
+            return 0
+        try:
+            store = self.get_store(space_id)
+            converted = [_to_quad(q) for q in quads]
+
+            def _remove() -> int:
+                removed = 0
+                for quad in converted:
+                    if quad in store:
+                        store.remove(quad)
+                        removed += 1
+                return removed
+
+            removed = await asyncio.to_thread(_remove)
+            if removed:
+                await self._notify_graphs(space_id, converted)
+            return removed
+        except Exception as e:
+            logger.error(f"Error removing {len(quads)} quads from space {space_id}: {e}")
+            return 0
+
+    async def update_quads(self, space_id: str, graph_id: str,
+                           delete_quads: List[tuple], insert_quads: List[tuple]) -> bool:
+        """
+        Delete then insert as one transaction: one SPARQL update request,
+        which Oxigraph applies atomically, so readers never see the object
+        with its old triples gone and the new ones not yet written.
+
+        ``DELETE DATA`` cannot name blank nodes; a delete set containing one
+        falls back to removing quad by quad ahead of the insert.
+        """
+        try:
+            store = self.get_store(space_id)
+            deletes = [_to_quad(q) for q in delete_quads]
+            inserts = [_to_quad(q) for q in insert_quads]
+
+            def _apply():
+                parts = []
+                if any(_has_blank_node(q) for q in deletes):
+                    for quad in deletes:
+                        store.remove(quad)
+                elif deletes:
+                    parts.append("DELETE DATA { %s }" % " ".join(_quad_pattern(q) for q in deletes))
+                if inserts:
+                    parts.append("INSERT DATA { %s }" % " ".join(_quad_pattern(q) for q in inserts))
+                if parts:
+                    store.update(" ;\n".join(parts))
+
+            await asyncio.to_thread(_apply)
+            await self._notify_graphs(space_id, deletes + inserts)
+            return True
+        except Exception as e:
+            logger.error(f"update_quads failed for space {space_id}: {e}")
+            return False
+
+    async def quads(self, space_id: str, quad_pattern: tuple, context: Optional[Any] = None):
+        """
+        Stream quads matching ``(s, p, o, g)`` (None = any) as rdflib terms.
+
+        The store is read a page at a time off the event loop, so a scan of
+        a large space neither blocks the loop nor materializes every quad.
+        """
+        s, p, o, g = (tuple(quad_pattern) + (None,) * 4)[:4]
+        if g is None and context is not None:
+            g = context
+        store = self.get_store(space_id)
+        pattern = (_to_oxigraph(s), _to_oxigraph(p), _to_oxigraph(o, allow_literal=True),
+                   _to_oxigraph_graph(g) if g is not None else None)
+        # pyoxigraph iterators are bound to the thread that created them, so
+        # the scan gets one worker of its own for its whole lifetime.
+        loop = asyncio.get_running_loop()
+        worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="oxigraph-scan")
+        scan: Dict[str, Any] = {}
+        try:
+            await loop.run_in_executor(
+                worker, lambda: scan.setdefault('it', store.quads_for_pattern(*pattern)))
+            while True:
+                page = await loop.run_in_executor(
+                    worker, lambda: list(itertools.islice(scan['it'], _QUAD_PAGE)))
+                for quad in page:
+                    yield (_to_rdflib(quad.subject), _to_rdflib(quad.predicate),
+                           _to_rdflib(quad.object), _to_rdflib(quad.graph_name))
+                if len(page) < _QUAD_PAGE:
+                    return
+        finally:
+            # ...and must be dropped there too.
+            await loop.run_in_executor(worker, scan.clear)
+            worker.shutdown(wait=False)
+
+    async def bulk_load(self, space_id: str, data: Union[bytes, str, None] = None, *,
+                        path: Optional[str] = None, format: Union[RdfFormat, str, None] = None,
+                        graph_uri: Optional[str] = None, base_iri: Optional[str] = None,
+                        lenient: bool = False) -> Dict[str, Any]:
+        """
+        Load an RDF document or file with Oxigraph's native bulk loader.
+
+        The loader streams the input, sorts in memory-bounded runs and
+        ingests the result as RocksDB SST files — no per-quad transaction,
+        no Python objects per quad. It is not atomic: on a parse error the
+        quads before it stay loaded.
+
+        Args:
+            space_id: Target space
+            data: Serialized RDF (``path`` instead for a file)
+            path: File to load
+            format: RdfFormat, extension (``'nt'``, ``'nq'``, ``'ttl'``…) or
+                media type; guessed from ``path`` when omitted
+            graph_uri: Graph for triple formats; ignored for quad formats
+            base_iri: Base for relative IRIs
+            lenient: Skip IRI/literal validation (faster, trusts the input)
+
+        Returns:
+            Dict with keys: success, space_id, format, quads, elapsed_seconds
+            (and error on failure)
+        """
+        started = time.monotonic()
+        try:
+            store = self.get_store(space_id)
+            rdf_format = _rdf_format(format, path)
+            to_graph = _to_oxigraph_graph(graph_uri) if graph_uri else None
+
+            def _load() -> int:
+                before = len(store)
+                store.bulk_load(data, rdf_format, path=path, base_iri=base_iri,
+                                to_graph=to_graph, lenient=lenient)
+                return len(store) - before
+
+            loaded = await asyncio.to_thread(_load)
+            await self.signal_manager.notify_space_updated(space_id, 'bulk_load')
+            elapsed = time.monotonic() - started
+            logger.info(f"Bulk loaded {loaded} quads into space {space_id} in {elapsed:.2f}s")
+            return {'success': True, 'space_id': space_id, 'format': str(rdf_format),
+                    'quads': loaded, 'elapsed_seconds': elapsed}
+        except Exception as e:
+            logger.error(f"Bulk load into space {space_id} failed: {e}")
+            return {'success': False, 'space_id': space_id, 'error': str(e),
+                    'quads': 0, 'elapsed_seconds': time.monotonic() - started}
+
+    async def _notify_graphs(self, space_id: str, quads: Iterable[Quad]) -> None:
+        graphs = {q.graph_name.value for q in quads if isinstance(q.graph_name, NamedNode)}
+        for graph_uri in sorted(graphs):
+            await self.signal_manager.notify_graph_changed(graph_uri, SIGNAL_TYPE_UPDATED, space_id)
+
+    # ========================================
+    # Term Management
+    # ========================================
+    # Oxigraph interns terms itself; there is no term table to manage.
+
+    async def add_term(self, space_id: str, term_text: str, term_type: str,
+                       lang: Optional[str] = None, datatype_id: Optional[int] = None) -> Optional[str]:
+        return None
+
+    async def get_term_uuid(self, space_id: str, term_text: str, term_type: str,
+                            lang: Optional[str] = None, datatype_id: Optional[int] = None) -> Optional[str]:
+        return None
+
+    async def delete_term(self, space_id: str, term_text: str, term_type: str,
+                          lang: Optional[str] = None, datatype_id: Optional[int] = None) -> bool:
+        return True
+
+    # ========================================
+    # Namespace Management
+    # ========================================
+
+    def _namespace_node(self, space_id: str, prefix: str) -> NamedNode:
+        return NamedNode(f"urn:vitalgraph:space:{space_id}:namespace:{prefix}")
+
+    async def add_namespace(self, space_id: str, prefix: str, namespace_uri: str) -> Optional[int]:
+        """Add or replace a prefix mapping; returns the space's namespace count."""
+        try:
+            admin = self._require_admin()
+            node = self._namespace_node(space_id, prefix)
+
+            def _replace():
+                for quad in list(admin.quads_for_pattern(node, _P["namespaceUri"], None, _ADMIN_GRAPH)):
+                    admin.remove(quad)
+                admin.extend([
+                    Quad(node, _RDF_TYPE, _NAMESPACE_CLASS, _ADMIN_GRAPH),
+                    Quad(node, _P["namespaceOf"], self._space_node(space_id), _ADMIN_GRAPH),
+                    Quad(node, _P["prefix"], OxLiteral(prefix), _ADMIN_GRAPH),
+                    Quad(node, _P["namespaceUri"], OxLiteral(namespace_uri), _ADMIN_GRAPH),
+                ])
+
+            await asyncio.to_thread(_replace)
+            return len(await self.list_namespaces(space_id))
+        except Exception as e:
+            logger.error(f"Error adding namespace {prefix} to space {space_id}: {e}")
+            return None
+
+    async def get_namespace_uri(self, space_id: str, prefix: str) -> Optional[str]:
+        admin = self._require_admin()
+        for quad in admin.quads_for_pattern(self._namespace_node(space_id, prefix),
+                                            _P["namespaceUri"], None, _ADMIN_GRAPH):
+            return quad.object.value
+        return None
+
+    async def list_namespaces(self, space_id: str) -> List[Dict[str, Any]]:
+        admin = self._require_admin()
+        query = f"""
+            SELECT ?prefix ?uri WHERE {{
+                GRAPH <{_ADMIN_GRAPH.value}> {{
+                    ?ns <{_P['namespaceOf'].value}> {self._space_node(space_id)} ;
+                        <{_P['prefix'].value}> ?prefix ;
+                        <{_P['namespaceUri'].value}> ?uri .
+                }}
+            }} ORDER BY ?prefix
+        """
+
+        def _run():
+            return [{'prefix': row['prefix'].value, 'namespace_uri': row['uri'].value}
+                    for row in admin.query(query)]
+
+        return await asyncio.to_thread(_run)
+
+    # ========================================
+    # SPARQL Integration
+    # ========================================
+
+    def get_sparql_impl(self, space_id: str) -> OxigraphSparqlImpl:
+        if self._sparql_impl is None:
+            self._sparql_impl = OxigraphSparqlImpl(self)
+        return self._sparql_impl
+
+    async def execute_sparql_query(self, space_id: str, query: str, **kwargs) -> Dict[str, Any]:
+        """SPARQL JSON results (see ``OxigraphSparqlImpl.execute_sparql_query``)."""
+        return await self.get_sparql_impl(space_id).execute_sparql_query(space_id, query)
+
+    async def query_quads(self, space_id: str, sparql_query: str) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Bindings for a SELECT, the full result dict for an ASK — what the
+        Fuseki dataset manager returns, which the KG adapter expects.
+
+        Raises:
+            RuntimeError: if the query failed (an empty list would read as
+                "no triples")
+        """
+        result = await self.execute_sparql_query(space_id, sparql_query)
+        if result.get('success') is False:
+            raise RuntimeError(f"query_quads({space_id}) failed: {result.get('error')}")
+        if 'boolean' in result:
+            return result
+        return result.get('results', {}).get('bindings', [])
+
+    async def execute_sparql_update(self, space_id: str, sparql_update: str, **kwargs) -> bool:
+        success = await self.get_sparql_impl(space_id).execute_sparql_update(space_id, sparql_update)
+        if success:
+            await self.signal_manager.notify_space_updated(space_id, 'sparql_update')
+        return success
+
+    # ========================================
+    # Utility Methods
+    # ========================================
+
+    def get_manager_info(self) -> Dict[str, Any]:
+        return {
+            'backend_type': 'oxigraph',
+            'store_path': self.store_path,
+            'in_memory': self.store_path is None,
+            'open_spaces': sorted(self._stores),
+            'bulk_threshold': self.bulk_threshold,
+            'connected': self.connected,
+        }
+
+    def get_connection_info(self) -> Dict[str, Any]:
+        return self.get_manager_info()
+
+
+def _quad_pattern(quad: Quad) -> str:
+    """A ground quad in SPARQL ``DATA`` block syntax."""
+    triple = f"{quad.subject} {quad.predicate} {quad.object} ."
+    if isinstance(quad.graph_name, DefaultGraph):
+        return triple
+    return f"GRAPH {quad.graph_name} {{ {triple} }}"
@@ -0,0 +1,124 @@
+"""
+SPARQL execution for the embedded Oxigraph backend.
+
+Queries run in-process against the space's pyoxigraph ``Store`` — no
+sidecar compile, no SQL generation, no HTTP. SELECT results are produced
+by Oxigraph's own SPARQL-JSON serializer and parsed once, so bindings have
+exactly the shape the Fuseki and sparql_sql backends return
+(``{'results': {'bindings': [{'var': {'type': ..., 'value': ...}}]}}``)
+and ``GraphObjectRetriever`` and the KG endpoints consume them unchanged.
+
+The default graph is the union of the named graphs, matching the
+``tdb2:unionDefaultGraph true`` the Fuseki datasets are configured with.
+
+Store calls block (RocksDB reads, query evaluation), so each one runs in a
+worker thread; pyoxigraph releases the GIL while it evaluates.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List
+
+from pyoxigraph import (
+    BlankNode,
+    Literal,
+    NamedNode,
+    QueryBoolean,
+    QueryResultsFormat,
+    QuerySolutions,
+    QueryTriples,
+)
+
+from ..space_backend_interface import SparqlBackendInterface
+
+_XSD_STRING = "http://www.w3.org/2001/XMLSchema#string"
+
+
+def term_to_json(term) -> Dict[str, str]:
+    """A pyoxigraph term as a SPARQL-JSON binding value."""
+    if isinstance(term, NamedNode):
+        return {"type": "uri", "value": term.value}
+    if isinstance(term, BlankNode):
+        return {"type": "bnode", "value": term.value}
+    if isinstance(term, Literal):
+        value = {"type": "literal", "value": term.value}
+        if term.language:
+            value["xml:lang"] = term.language
+        elif term.datatype.value != _XSD_STRING:
+            value["datatype"] = term.datatype.value
+        return value
+    return {"type": "literal", "value": str(term)}
+
+
+class OxigraphSparqlImpl(SparqlBackendInterface):
+    """SPARQL query/update against one backend's per-space Oxigraph stores."""
+
+    def __init__(self, space_impl):
+        """
+        Args:
+            space_impl: OxigraphSpaceImpl owning the stores
+        """
+        self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.space_impl = space_impl
+
+    async def execute_sparql_query(self, space_id: str, query: str, **kwargs) -> Dict[str, Any]:
+        """
+        Execute a SPARQL query against a space.
+
+        Returns:
+            SELECT: SPARQL JSON results plus ``success``
+            ASK: ``{'head': {}, 'boolean': bool, 'success': True}``
+            CONSTRUCT/DESCRIBE: bindings over ``subject``/``predicate``/``object``
+            On error: ``{'success': False, 'error': ..., 'results': {'bindings': []}}``
+        """
+        try:
+            store = self.space_impl.get_store(space_id)
+            return await asyncio.to_thread(self._run_query, store, query)
+        except Exception as e:
+            self.logger.error(f"Error executing SPARQL query in space '{space_id}': {e}")
+            return {"success": False, "error": str(e), "results": {"bindings": []}}
+
+    def _run_query(self, store, query: str) -> Dict[str, Any]:
+        result = store.query(query, use_default_graph_as_union=True)
+        if isinstance(result, QueryBoolean):
+            return {"head": {}, "boolean": bool(result), "success": True}
+        if isinstance(result, QuerySolutions):
+            data = json.loads(result.serialize(format=QueryResultsFormat.JSON))
+            data["success"] = True
+            return data
+        if isinstance(result, QueryTriples):
+            bindings: List[Dict[str, Any]] = [
+                {"subject": term_to_json(t.subject),
+                 "predicate": term_to_json(t.predicate),
+                 "object": term_to_json(t.object)}
+                for t in result
+            ]
+            return {"head": {"vars": ["subject", "predicate", "object"]},
+                    "results": {"bindings": bindings}, "success": True}
+        raise TypeError(f"Unexpected query result type: {type(result).__name__}")
+
+    async def execute_sparql_update(self, space_id: str, update: str, **kwargs) -> bool:
+        """
+        Execute a SPARQL 1.1 update. Oxigraph applies the whole request in
+        one transaction: either every operation in it lands or none does.
+        """
+        try:
+            store = self.space_impl.get_store(space_id)
+            await asyncio.to_thread(store.update, update)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error executing SPARQL update in space '{space_id}': {e}")
+            return False
+
+    def get_query_capabilities(self) -> Dict[str, Any]:
+        return {
+            'supports_construct': True,
+            'supports_ask': True,
+            'supports_describe': True,
+            'supports_property_paths': True,
+            'supports_sparql_11': True,
+            'supports_named_graphs': True,
+            'supports_federation': False,
+            'backend_type': 'oxigraph',
+        }
@@ -0,0 +1,244 @@
+"""
+Automatic EXPLAIN capture for slow SPARQL executions.
+
+``slow_query_log`` records that a request was slow, not why. The plan
+cliffs that matter here (issues/047: an ordered probe turning into a
+blocking Sort past a data-dependent row count; issues/088) are decided by
+the planner at execution time against the statistics of that moment, and
+by the time someone reruns the SQL by hand the data or the statistics
+have moved and the plan they see is a different one.
+
+So the execution path captures the plan itself, for the exact generated
+SQL, right after the slow execution:
+
+* the first time a query shape (compile-cache shape hash)
+  crosses the slow threshold — and again after a cooldown, so a shape
+  that regresses later is re-captured;
+* optionally, a random sample of all executions, to have plans for shapes
+  that are merely common.
+
+The capture is plain ``EXPLAIN (FORMAT JSON, SETTINGS)``, never ANALYZE —
+the execution time is already known, and re-running a query that just
+took a minute would double the damage. It runs under the same transaction
+settings the executor used (read fence, ``enable_sort = off`` for
+ordered-scan plans); explaining it unfenced classifies a plan that never
+runs, which is exactly how perf_shape_matrix.py once mis-reported six
+cells. It runs in a background task on its own pooled connection, so the
+slow request is not made slower, and is bounded by a global per-minute
+budget and a concurrency cap.
+
+Each capture is classified with the same cost classes as
+``scripts/perf_shape_matrix.py`` (ordered-probe / blocking / set-based)
+and stored in ``sparql_explain_log`` with the shape hash, the reason, the
+execution's timing and the SQL.
+
+Configuration (environment):
+    VITALGRAPH_AUTO_EXPLAIN_SLOW_MS       slow threshold; 0 disables (default 500)
+    VITALGRAPH_AUTO_EXPLAIN_SAMPLE_RATE   fraction of all executions (default 0)
+    VITALGRAPH_AUTO_EXPLAIN_PER_MINUTE    capture budget per process (default 6)
+    VITALGRAPH_AUTO_EXPLAIN_COOLDOWN_S    per-shape re-capture interval (default 3600)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULTS = {
+    'VITALGRAPH_AUTO_EXPLAIN_SLOW_MS': 500.0,
+    'VITALGRAPH_AUTO_EXPLAIN_SAMPLE_RATE': 0.0,
+    'VITALGRAPH_AUTO_EXPLAIN_PER_MINUTE': 6.0,
+    'VITALGRAPH_AUTO_EXPLAIN_COOLDOWN_S': 3600.0,
+}
+MAX_CONCURRENT_CAPTURES = 2
+MAX_TRACKED_SHAPES = 10_000
+
+
+def _env_float(name: str) -> float:
+    raw = os.environ.get(name)
+    if raw is None:
+        return _DEFAULTS[name]
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        logger.warning("%s=%r is not a number; using %s", name, raw, _DEFAULTS[name])
+        return _DEFAULTS[name]
+
+
+# ---------------------------------------------------------------------------
+# Plan classification (shared with scripts/perf_shape_matrix.py)
+# ---------------------------------------------------------------------------
+
+def classify_plan_text(plan_text: str) -> str:
+    """Cost class of a text-format plan.
+
+    ordered-probe  Unique/Limit directly over an ordered index scan — O(page)
+    blocking       a Sort or HashAggregate between them — O(matches)
+    set-based      no semi-join at all — O(matches) by construction
+    """
+    if "EXISTS" not in plan_text and "SubPlan" not in plan_text:
+        return "set-based"
+    for line in plan_text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("->  Sort") or stripped.startswith("->  HashAggregate"):
+            return "blocking"
+    return "ordered-probe"
+
+
+def _walk(node: Dict[str, Any], depth: int = 0):
+    yield node, depth
+    for child in node.get('Plans') or []:
+        yield from _walk(child, depth + 1)
+
+
+def classify_plan_json(plan: Any) -> str:
+    """``classify_plan_text`` for ``EXPLAIN (FORMAT JSON)`` output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if isinstance(plan, list):
+        plan = plan[0] if plan else {}
+    root = plan.get('Plan', plan) if isinstance(plan, dict) else {}
+    semi_join = False
+    blocking = False
+    for node, depth in _walk(root):
+        if 'Subplan Name' in node or 'EXISTS' in json.dumps(
+                {k: v for k, v in node.items() if k != 'Plans'}):
+            semi_join = True
+        # As in the text form, only nodes below the root ("->  Sort").
+        if depth > 0 and (node.get('Node Type') == 'Sort' or (
+                node.get('Node Type') == 'Aggregate' and node.get('Strategy') == 'Hashed')):
+            blocking = True
+    if not semi_join:
+        return "set-based"
+    return "blocking" if blocking else "ordered-probe"
+
+
+# ---------------------------------------------------------------------------
+# Capture policy
+# ---------------------------------------------------------------------------
+
+class AutoExplain:
+    """Decides which executions to EXPLAIN and captures them in the background."""
+
+    def __init__(self, slow_ms: Optional[float] = None, sample_rate: Optional[float] = None,
+                 per_minute: Optional[float] = None, cooldown_s: Optional[float] = None):
+        self.slow_ms = _env_float('VITALGRAPH_AUTO_EXPLAIN_SLOW_MS') if slow_ms is None else slow_ms
+        self.sample_rate = (_env_float('VITALGRAPH_AUTO_EXPLAIN_SAMPLE_RATE')
+                            if sample_rate is None else sample_rate)
+        self.per_minute = (_env_float('VITALGRAPH_AUTO_EXPLAIN_PER_MINUTE')
+                           if per_minute is None else per_minute)
+        self.cooldown_s = (_env_float('VITALGRAPH_AUTO_EXPLAIN_COOLDOWN_S')
+                           if cooldown_s is None else cooldown_s)
+        self._explained_at: Dict[str, float] = {}
+        self._window_start = 0.0
+        self._window_count = 0
+        self._in_flight = 0
+        self.captured = 0
+        self.skipped_budget = 0
+
+    def reason_for(self, shape_hash: str, total_ms: float) -> Optional[str]:
+        """Why this execution should be captured, or None. Consumes budget."""
+        now = time.monotonic()
+        reason = None
+        if self.slow_ms > 0 and total_ms >= self.slow_ms:
+            last = self._explained_at.get(shape_hash)
+            if last is None or now - last >= self.cooldown_s:
+                reason = 'slow-first' if last is None else 'slow-recheck'
+        if reason is None and self.sample_rate > 0 and random.random() < self.sample_rate:
+            reason = 'sampled'
+        if reason is None:
+            return None
+
+        if now - self._window_start >= 60:
+            self._window_start, self._window_count = now, 0
+        if self._window_count >= self.per_minute or self._in_flight >= MAX_CONCURRENT_CAPTURES:
+            self.skipped_budget += 1
+            return None
+        self._window_count += 1
+        if len(self._explained_at) >= MAX_TRACKED_SHAPES:
+            self._explained_at.clear()
+        self._explained_at[shape_hash] = now
+        return reason
+
+    def maybe_capture(self, pool, space_id: str, shape_hash: str, sql: str,
+                      timing: Dict[str, Any], needs_ordered_scan: bool) -> Optional[asyncio.Task]:
+        """Schedule a capture if policy and budget allow. Never raises."""
+        try:
+            if pool is None or not shape_hash:
+                return None
+            reason = self.reason_for(shape_hash, float(timing.get('total_ms') or 0.0))
+            if reason is None:
+                return None
+            self._in_flight += 1
+            return asyncio.create_task(self._capture(
+                pool, space_id, shape_hash, sql, timing, needs_ordered_scan, reason))
+        except Exception as e:
+            logger.debug("auto-explain scheduling failed (non-fatal): %s", e)
+            return None
+
+    async def _capture(self, pool, space_id, shape_hash, sql, timing,
+                       needs_ordered_scan, reason) -> None:
+        from .sparql_sql_space_impl import _apply_read_fence
+        try:
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await _apply_read_fence(conn)
+                    if needs_ordered_scan:
+                        await conn.execute("SET LOCAL enable_sort = off")
+                    plan = await _explain(conn, sql)
+                plan_class = classify_plan_json(plan)
+                await conn.execute(
+                    """
+                    INSERT INTO sparql_explain_log
+                        (space_id, shape_hash, reason, plan_class, total_ms, exec_ms,
+                         ordered_scan, sql, plan)
+                    SELECT $1, $2, $3, $4, $5, $6, $7, $8, $9::jsonb
+                    WHERE EXISTS (SELECT 1 FROM space WHERE space_id = $1)
+                    """,
+                    space_id, shape_hash, reason, plan_class,
+                    float(timing.get('total_ms') or 0.0), float(timing.get('exec_ms') or 0.0),
+                    bool(needs_ordered_scan), sql, json.dumps(plan),
+                )
+            self.captured += 1
+            logger.info("auto-explain [%s] shape %s (%s, %.0fms): %s",
+                        space_id, shape_hash[:12], reason, timing.get('total_ms', 0), plan_class)
+        except Exception as e:
+            logger.debug("auto-explain capture failed (non-fatal): %s", e)
+        finally:
+            self._in_flight -= 1
+
+
+async def _explain(conn, sql: str) -> List[Dict[str, Any]]:
+    try:
+        raw = await conn.fetchval("EXPLAIN (FORMAT JSON, SETTINGS) " + sql)
+    except Exception as e:
+        # SETTINGS is PostgreSQL 12+.
+        if 'SETTINGS' not in str(e).upper():
+            raise
+        raw = await conn.fetchval("EXPLAIN (FORMAT JSON) " + sql)
+    return json.loads(raw) if isinstance(raw, str) else raw
+
+
+async def read_explain_log(conn, shape_hash: str, limit: int = 20) -> List[Dict[str, Any]]:
+    """Captured plans for a shape, newest first."""
+    rows = await conn.fetch(
+        "SELECT id, space_id, shape_hash, captured_at, reason, plan_class, total_ms, "
+        "exec_ms, ordered_scan, sql, plan FROM sparql_explain_log "
+        "WHERE shape_hash = $1 ORDER BY captured_at DESC LIMIT $2",
+        shape_hash, limit)
+    out = []
+    for r in rows:
+        d = dict(r)
+        if isinstance(d.get('plan'), str):
+            d['plan'] = json.loads(d['plan'])
+        out.append(d)
+    return out
+
+
+# Process-wide policy, alongside the compile cache and shape stats.
+auto_explain = AutoExplain()
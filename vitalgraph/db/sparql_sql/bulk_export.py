@@ -14,6 +14,17 @@ backup — they are resynced on import instead.
 records that snapshot in a ``manifest.json`` sidecar, so an export is internally
 consistent and can anchor a later catch-up sync.  See
 ``planning/planning_db/space_sync_and_cutover_plan.md`` §5b.
+
+``export_space_delta`` / ``import_space_delta`` are that catch-up sync:
+rows added since a manifest's watermark, found by ``xmin``
+visibility, and rows removed since it, from a per-space tombstone log that
+``export_space(track_deletes=True)`` switches on before it takes its
+snapshot.  Tracking is opt-in: the log is written by row triggers on every
+delete until ``disable_delta_tracking``, and only the caller knows which
+watermark its targets still need, so it owns ``prune_delta_tombstones``
+between rounds and ``disable_delta_tracking`` after the cutover.  Each delta writes
+its own manifest, so rounds chain — export, import, delta, delta, … — and a
+cutover stops writes only for the last, smallest round.
 """
 
 from __future__ import annotations
@@ -21,7 +32,7 @@ from __future__ import annotations
 import json
 import logging
 import os
-from typing import Dict
+from typing import Dict, List, Union
 
 from .sparql_sql_schema import SparqlSQLSchema
 
@@ -35,12 +46,113 @@ _EXPORT_TABLES = ("datatype", "term", "rdf_quad")
 _MANIFEST_NAME = "manifest.json"
 _MANIFEST_VERSION = 1
 
+# Delta files: added rows per core table, plus one tombstone file per tracked
+# table. Tombstones carry the deleted row's full key — for rdf_quad that
+# includes quad_uuid, which both layouts' primary keys cover.
+_TOMBSTONE_TABLES = {
+    "rdf_quad": ("quad_tombstone",
+                 ("subject_uuid", "predicate_uuid", "object_uuid",
+                  "context_uuid", "quad_uuid")),
+    "term": ("term_tombstone", ("term_uuid",)),
+}
+
 
 def _bare(name: str) -> str:
     return name.split(".")[-1]
 
 
-async def export_space(conn, space_id: str, dest_dir: str) -> Dict[str, str]:
+async def enable_delta_tracking(conn, space_id: str) -> None:
+    """Start logging deletes from rdf_quad and term into tombstone tables.
+
+    ``xmin`` can say which rows were *added* after a snapshot; nothing in a
+    heap says which were removed. The tombstone log does, written by an AFTER
+    DELETE OR UPDATE trigger so every delete path — bulk, SPARQL UPDATE, graph
+    CLEAR, entity graph delete — is covered without touching any of them.
+    An UPDATE logs the old row, whose replacement then shows up as added.
+
+    Idempotent. CREATE TRIGGER waits for in-flight writes to the table, so
+    once this returns every later delete is logged; call it (as export_space
+    does) before taking the snapshot a delta will be measured from.
+    """
+    t = SparqlSQLSchema.get_table_names(space_id)
+    async with conn.transaction():
+        for key, (tomb_key, cols) in _TOMBSTONE_TABLES.items():
+            table, tomb = _bare(t[key]), _bare(t[tomb_key])
+            fn = f"{space_id}_delta_capture_{key}"
+            col_ddl = ", ".join(f"{c} UUID NOT NULL" for c in cols)
+            await conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {tomb} (
+                    {col_ddl},
+                    deleted_xid  xid8 NOT NULL DEFAULT pg_current_xact_id(),
+                    deleted_time TIMESTAMP NOT NULL DEFAULT now()
+                )""")
+            await conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{tomb}_xid ON {tomb} (deleted_xid)")
+            await conn.execute(f"""
+                CREATE OR REPLACE FUNCTION {fn}() RETURNS trigger AS $$
+                BEGIN
+                    INSERT INTO {tomb} ({", ".join(cols)})
+                    VALUES ({", ".join("OLD." + c for c in cols)});
+                    RETURN NULL;
+                END
+                $$ LANGUAGE plpgsql""")
+            await conn.execute(
+                f"CREATE OR REPLACE TRIGGER delta_tombstone AFTER DELETE OR UPDATE "
+                f"ON {table} FOR EACH ROW EXECUTE FUNCTION {fn}()")
+
+
+async def disable_delta_tracking(conn, space_id: str) -> None:
+    """Stop logging deletes and drop the tombstone log (after a cutover)."""
+    t = SparqlSQLSchema.get_table_names(space_id)
+    async with conn.transaction():
+        for key, (tomb_key, _cols) in _TOMBSTONE_TABLES.items():
+            await conn.execute(
+                f"DROP TRIGGER IF EXISTS delta_tombstone ON {_bare(t[key])}")
+            await conn.execute(f"DROP TABLE IF EXISTS {_bare(t[tomb_key])}")
+            await conn.execute(
+                f"DROP FUNCTION IF EXISTS {space_id}_delta_capture_{key}()")
+
+
+async def prune_delta_tombstones(conn, space_id: str, snapshot: str) -> int:
+    """Drop tombstones already covered by an export taken at ``snapshot``.
+
+    Pass the snapshot of the oldest manifest any target still needs to catch
+    up from; everything that target has already seen is removed. Returns the
+    number of tombstones deleted.
+    """
+    t = SparqlSQLSchema.get_table_names(space_id)
+    deleted = 0
+    for _key, (tomb_key, _cols) in _TOMBSTONE_TABLES.items():
+        tomb = _bare(t[tomb_key])
+        if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", tomb):
+            continue
+        result = await conn.execute(
+            f"DELETE FROM {tomb} "
+            f"WHERE pg_visible_in_snapshot(deleted_xid, $1::text::pg_snapshot)",
+            snapshot)
+        deleted += int(result.split()[-1]) if result else 0
+    return deleted
+
+
+async def _copy_columns(conn, table: str) -> List[str]:
+    """Non-generated columns of a table, in order — what COPY moves."""
+    rows = await conn.fetch(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = $1 "
+        "AND is_generated = 'NEVER' ORDER BY ordinal_position", table)
+    return [r["column_name"] for r in rows]
+
+
+def _copy_count(status: str) -> int:
+    """Row count from a ``COPY n`` command status."""
+    try:
+        return int((status or "").split()[-1])
+    except ValueError:
+        return 0
+
+
+async def export_space(conn, space_id: str, dest_dir: str,
+                       track_deletes: bool = False) -> Dict[str, str]:
     """Binary-COPY each core table to ``<dest_dir>/<table>.bin``.
 
     All three COPYs run inside a single ``REPEATABLE READ`` read-only
@@ -59,6 +171,14 @@ async def export_space(conn, space_id: str, dest_dir: str) -> Dict[str, str]:
     were nonetheless invisible to the export, so a ``ts > watermark`` delta
     silently loses them.  ``pg_visible_in_snapshot(xmin, watermark)`` does not.
 
+    ``track_deletes`` switches on the tombstone log (enable_delta_tracking)
+    before the snapshot is taken, which is what lets ``export_space_delta``
+    later ship deletes as well as inserts. It is off by default: the triggers
+    stay installed and the log grows with every delete until the caller
+    prunes it (``prune_delta_tombstones``) and finally drops it
+    (``disable_delta_tracking``), which a one-off backup never does. Only a
+    migration that will run delta rounds should pass True.
+
     Returns a ``{logical_table: file_path}`` map (plus a ``"manifest"`` key).
     Streams row-by-row, so peak memory is independent of table size.
     """
@@ -66,6 +186,9 @@ async def export_space(conn, space_id: str, dest_dir: str) -> Dict[str, str]:
     os.makedirs(dest_dir, exist_ok=True)
     paths: Dict[str, str] = {}
 
+    if track_deletes:
+        await enable_delta_tracking(conn, space_id)
+
     async with conn.transaction(isolation="repeatable_read", readonly=True):
         # Read the watermark INSIDE the transaction, before any COPY: it must
         # describe the same snapshot the COPYs see.
@@ -87,8 +210,10 @@ async def export_space(conn, space_id: str, dest_dir: str) -> Dict[str, str]:
     manifest = {
         "space_id": space_id,
         "version": _MANIFEST_VERSION,
+        "kind": "full",
         "snapshot": snapshot,
         "wal_lsn": lsn,
+        "delta_tracking": bool(track_deletes),
         "tables": {k: os.path.basename(v) for k, v in paths.items()},
     }
     manifest_path = os.path.join(dest_dir, _MANIFEST_NAME)
@@ -156,6 +281,204 @@ async def import_space(conn, space_id: str, paths: Dict[str, str],
     return counts
 
 
+# ---------------------------------------------------------------------------
+# Catch-up sync — deltas since a manifest's snapshot watermark
+# ---------------------------------------------------------------------------
+
+def _load_manifest(since: Union[str, Dict[str, object]]) -> Dict[str, object]:
+    return read_export_manifest(since) if isinstance(since, str) else since
+
+
+async def export_space_delta(conn, space_id: str,
+                             since: Union[str, Dict[str, object]],
+                             dest_dir: str) -> Dict[str, str]:
+    """Export what changed in ``space_id`` since an earlier export.
+
+    ``since`` is that export's directory or its loaded manifest — a full export
+    or a previous delta, so rounds chain. Writes, in the same binary COPY
+    format as export_space:
+
+    - ``<table>.bin`` for datatype, term and rdf_quad: rows whose ``xmin`` is
+      not visible in the watermark snapshot, i.e. committed after it;
+    - ``<table>_tombstone.bin`` for rdf_quad and term: keys deleted after it;
+
+    plus a manifest whose ``snapshot`` is this delta's own, the watermark for
+    the next round. Everything is read in one REPEATABLE READ snapshot, so the
+    added and removed sets describe the same interval.
+
+    The added-row scan reads each core table once (xmin is not indexed), so an
+    export costs a sequential scan even when the delta is tiny; it moves only
+    the delta, and the import touches only the delta. Raises ValueError when
+    the watermark is from another space or predates delete tracking — the
+    deletes since then are unknowable, and a delta without them would leave
+    removed quads alive on the target.
+    """
+    base = _load_manifest(since)
+    if base.get("space_id") != space_id:
+        raise ValueError(f"manifest is for space {base.get('space_id')!r}, "
+                         f"not {space_id!r}")
+    if not base.get("delta_tracking"):
+        raise ValueError(
+            "the base export was taken without delete tracking; deletes since "
+            "its watermark cannot be recovered — take a new full export")
+    base_snapshot = base["snapshot"]
+
+    t = SparqlSQLSchema.get_table_names(space_id)
+    os.makedirs(dest_dir, exist_ok=True)
+    paths: Dict[str, str] = {}
+    counts: Dict[str, int] = {}
+    columns: Dict[str, List[str]] = {}
+
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        snapshot = await conn.fetchval("SELECT pg_current_snapshot()::text")
+        try:
+            lsn = await conn.fetchval("SELECT pg_current_wal_lsn()::text")
+        except Exception:
+            lsn = None
+
+        for key in _EXPORT_TABLES:
+            table = _bare(t[key])
+            cols = await _copy_columns(conn, table)
+            path = os.path.join(dest_dir, f"{table}.bin")
+            status = await conn.copy_from_query(
+                f"SELECT {', '.join(cols)} FROM {table} "
+                f"WHERE NOT pg_visible_in_snapshot(xmin::text::xid8, "
+                f"'{base_snapshot}'::pg_snapshot)",
+                output=path, format="binary")
+            paths[key], columns[key], counts[key] = path, cols, _copy_count(status)
+
+        for key, (tomb_key, cols) in _TOMBSTONE_TABLES.items():
+            tomb = _bare(t[tomb_key])
+            path = os.path.join(dest_dir, f"{tomb}.bin")
+            status = await conn.copy_from_query(
+                f"SELECT {', '.join(cols)} FROM {tomb} "
+                f"WHERE NOT pg_visible_in_snapshot(deleted_xid, "
+                f"'{base_snapshot}'::pg_snapshot)",
+                output=path, format="binary")
+            paths[tomb_key], columns[tomb_key] = path, list(cols)
+            counts[tomb_key] = _copy_count(status)
+
+    manifest = {
+        "space_id": space_id,
+        "version": _MANIFEST_VERSION,
+        "kind": "delta",
+        "base_snapshot": base_snapshot,
+        "snapshot": snapshot,
+        "wal_lsn": lsn,
+        "delta_tracking": True,
+        "tables": {k: os.path.basename(v) for k, v in paths.items()},
+        "columns": columns,
+        "counts": counts,
+    }
+    manifest_path = os.path.join(dest_dir, _MANIFEST_NAME)
+    with open(manifest_path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+    paths["manifest"] = manifest_path
+    logger.info("export_space_delta(%s): %s since %s -> %s",
+                space_id, counts, base_snapshot, snapshot)
+    return paths
+
+
+async def import_space_delta(conn, space_id: str, delta_dir: str,
+                             resync: bool = True) -> Dict[str, int]:
+    """Apply a delta written by export_space_delta to ``space_id``.
+
+    Idempotent: removals delete by full key, additions insert with ON
+    CONFLICT DO NOTHING, and the derived tables are re-derived rather than
+    adjusted, so applying the same delta twice leaves the same space. Deltas
+    must be applied in the order they were exported.
+
+    Removals go first, so a row deleted and re-added in the interval (a term
+    is, whenever it is garbage-collected and reused) ends up present. Only the
+    derived rows of the subjects and predicates the delta touched are resynced
+    — edge, frame_entity, stats and property tables — which is what keeps the
+    cost of a round proportional to the delta rather than to the space.
+
+    Must run inside the caller's transaction (staging tables are ON COMMIT
+    DROP). Returns counts of what was applied.
+    """
+    if not conn.is_in_transaction():
+        raise RuntimeError("import_space_delta must run inside a transaction")
+    manifest = read_export_manifest(delta_dir)
+    if manifest.get("kind") != "delta":
+        raise ValueError(f"{delta_dir} is not a delta export")
+    if manifest.get("space_id") is None:
+        raise ValueError(f"{delta_dir} manifest has no space_id")
+
+    t = SparqlSQLSchema.get_table_names(space_id)
+    files = manifest["tables"]
+    columns = manifest["columns"]
+
+    async def _stage(key: str, like_table: str) -> str:
+        stage = f"_delta_{key}"
+        cols = columns[key]
+        await conn.execute(
+            f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+            f"SELECT {', '.join(cols)} FROM {like_table} WITH NO DATA")
+        await conn.copy_to_table(stage, source=os.path.join(delta_dir, files[key]),
+                                 columns=cols, format="binary")
+        return stage
+
+    staged = {key: await _stage(key, _bare(t[key])) for key in _EXPORT_TABLES}
+    for key, (tomb_key, cols) in _TOMBSTONE_TABLES.items():
+        # Staged shaped like the live table's key columns.
+        staged[tomb_key] = await _stage(tomb_key, _bare(t[key]))
+
+    q, term, dt = _bare(t["rdf_quad"]), _bare(t["term"]), _bare(t["datatype"])
+    sq, sqt = staged["rdf_quad"], staged["quad_tombstone"]
+
+    subjects = [r["s"] for r in await conn.fetch(
+        f"SELECT subject_uuid s FROM {sq} UNION SELECT subject_uuid FROM {sqt}")]
+    predicates = [r["p"] for r in await conn.fetch(
+        f"SELECT predicate_uuid p FROM {sq} UNION SELECT predicate_uuid FROM {sqt}")]
+
+    if resync and subjects:
+        # Before the quads change: these resolve frames through the edge
+        # table, so they must run while the old edge rows are still there.
+        from .sync_frame_entity_table import sync_frame_entity_before_delete
+        from .sync_edge_table import sync_edge_table_before_delete
+        await sync_frame_entity_before_delete(conn, space_id, subjects)
+        await sync_edge_table_before_delete(conn, space_id, subjects)
+
+    key_match = " AND ".join(
+        f"x.{c} = s.{c}" for c in _TOMBSTONE_TABLES["rdf_quad"][1])
+    quads_removed = _copy_count(await conn.execute(
+        f"DELETE FROM {q} x USING {sqt} s WHERE {key_match}"))
+    terms_removed = _copy_count(await conn.execute(
+        f"DELETE FROM {term} x USING {staged['term_tombstone']} s "
+        f"WHERE x.term_uuid = s.term_uuid"))
+
+    added = {}
+    for key in _EXPORT_TABLES:
+        cols = ", ".join(columns[key])
+        added[key] = _copy_count(await conn.execute(
+            f"INSERT INTO {_bare(t[key])} ({cols}) SELECT {cols} FROM {staged[key]} "
+            f"ON CONFLICT DO NOTHING"))
+    # Same realignment as import_space: the copied ids did not advance it.
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{dt}', 'datatype_id'), "
+        f"COALESCE((SELECT max(datatype_id) FROM {dt}), 1))")
+
+    if resync and subjects:
+        from .sync_edge_table import sync_edge_table_after_insert
+        from .sync_frame_entity_table import sync_frame_entity_after_edge_insert
+        from .sync_stats_tables import resync_stats_for_predicates
+        from .sync_property_table import sync_property_tables
+        await sync_edge_table_after_insert(conn, space_id, subjects)
+        await sync_frame_entity_after_edge_insert(conn, space_id, subjects)
+        await resync_stats_for_predicates(conn, space_id, predicates)
+        await sync_property_tables(conn, space_id, subjects)
+
+    counts = {
+        "quads_added": added["rdf_quad"], "quads_removed": quads_removed,
+        "terms_added": added["term"], "terms_removed": terms_removed,
+        "datatypes_added": added["datatype"], "subjects_resynced": len(subjects),
+    }
+    logger.info("import_space_delta(%s): %s (watermark %s)",
+                space_id, counts, manifest["snapshot"])
+    return counts
+
+
 # ---------------------------------------------------------------------------
 # RDF (N-Quads) export — reconstruct portable RDF from the UUID-encoded tables
 # ---------------------------------------------------------------------------
@@ -0,0 +1,427 @@
+"""Per-space change-data-capture log of quad inserts and deletes.
+
+Downstream consumers — the data-warehouse wide tables, search indexers,
+caches in other services — used to follow writes by polling or by the
+coarse ``CHANNEL_ENTITY_GRAPH`` NOTIFY, which names an entity but not what
+changed, and is lost by anyone not listening at the time. This log is the
+durable, ordered version: one ``{space}_change_log`` row per batch of quads
+a write added or removed, with a monotonically increasing ``seq``, written
+in the same transaction as the quad change itself. A consumer remembers the
+last ``seq`` it applied and resumes from there.
+
+Ordering. A BIGSERIAL is not a safe resume cursor: sequence values are
+handed out at INSERT, not at COMMIT, so a reader can see seq 12 while the
+transaction holding seq 11 is still open, advance past it, and never see
+it. ``append_changes`` instead takes a transaction-scoped advisory lock per
+space and draws ``max(seq) + 1`` under it, holding the lock to commit. Log
+rows therefore become visible strictly in seq order, and a rolled-back
+write leaves no hole: the committed log is always a gap-free range, so
+"everything after my last seq" is exact and a missing seq can only mean
+pruning. Most write paths record as their *last* step, so the serialised
+window is the log insert plus the commit, not the whole write. A replace
+(``delete_quads_logged`` then an insert) is the exception: its delete is
+logged, and the lock taken, before the insert runs, so that 'D' draws the
+lower seq — the window then covers the insert as well.
+
+Payload. Quads are rendered server-side to N-Triples terms (see
+bulk_export._nt_term_sql) from the term rows the same transaction just
+resolved — self-contained, so a consumer never needs a term dictionary and
+a delete stays readable after the term is gone. Large batches are split
+into rows of ``_QUADS_PER_ROW`` quads so one stream record stays bounded.
+
+Semantics are set-based: an 'I' row lists quads a batch *wrote*; the bulk
+path cannot tell which of them were already present (ON CONFLICT DO
+NOTHING), so replaying an insert of an existing quad, or a delete of an
+absent one, must be a no-op for the consumer — as it is in the store.
+
+SPARQL UPDATE is logged from the rows it actually changed: with a log,
+emit_update wraps each quad INSERT/DELETE so ``RETURNING`` copies them into
+a per-transaction capture table, and ``append_captured_changes`` turns that
+into log rows before commit — WHERE-bound deletes included. Whole-graph
+operations (CLEAR, DROP, COPY, MOVE, ADD, and the graph endpoints) are not
+itemised: they log an 'R' (reset) row naming each graph whose contents were
+replaced wholesale, and a consumer drops its copy of that graph and
+re-reads it.
+
+Opt-in per space (``enable_change_log``): the log doubles the write volume
+of every batch, and a space nobody follows should not pay for it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import struct
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .bulk_export import _bare, _nt_term_sql
+from .emit_update import CHANGE_CAPTURE_TABLE
+from .sparql_sql_schema import SparqlSQLSchema
+
+logger = logging.getLogger(__name__)
+
+OP_INSERT = "I"
+OP_DELETE = "D"
+OP_RESET = "R"
+
+# Quads per log row: keeps one stream record (and one JSONB value) bounded
+# whatever the size of the write that produced it.
+_QUADS_PER_ROW = 1_000
+
+# Retention defaults for prune_change_log / the maintenance job. A consumer
+# that falls further behind than this must re-bootstrap (ChangeLogPositionError).
+RETENTION_HOURS_DEFAULT = 72
+RETENTION_MAX_ROWS_DEFAULT = 1_000_000
+# Rows deleted per prune statement, so a first prune of a big backlog does
+# not hold one long DELETE.
+_PRUNE_BATCH = 50_000
+
+# Whether a space has a change log, cached like the property-table
+# declarations: the write path asks on every batch. enable/disable update
+# this process at once and notify the others.
+_enabled_cache: Dict[str, Tuple[float, bool]] = {}
+_ENABLED_TTL_S = 30.0
+
+
+class ChangeLogPositionError(Exception):
+    """A resume position the retained log cannot continue from.
+
+    Either it was pruned (older than the oldest retained row) or it is
+    ahead of the log — the log was disabled and re-created since. Both mean
+    the consumer must re-bootstrap from a full read.
+    """
+
+    def __init__(self, space_id: str, after_seq: int,
+                 oldest_seq: Optional[int], head_seq: int):
+        self.space_id = space_id
+        self.after_seq = after_seq
+        self.oldest_seq = oldest_seq
+        self.head_seq = head_seq
+        super().__init__(
+            f"change log of {space_id}: cannot resume after seq {after_seq} "
+            f"(retained range {oldest_seq}..{head_seq}); re-bootstrap from a "
+            f"full read and resume from current_seq")
+
+
+def _lock_key(space_id: str) -> int:
+    """Stable 64-bit advisory lock key for a space's log (see module doc)."""
+    digest = hashlib.sha256(f"vitalgraph_change_log:{space_id}".encode()).digest()
+    return struct.unpack("!q", digest[:8])[0]
+
+
+def _log_table(space_id: str) -> str:
+    return _bare(SparqlSQLSchema.get_table_names(space_id)["change_log"])
+
+
+def create_change_log_sql(space_id: str) -> List[str]:
+    """DDL for ``{space}_change_log`` (idempotent)."""
+    table = _log_table(space_id)
+    return [
+        f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                seq          BIGINT PRIMARY KEY,
+                op           CHAR(1) NOT NULL CHECK (op IN ('I', 'D', 'R')),
+                quad_count   INTEGER NOT NULL,
+                quads        JSONB NOT NULL,
+                created_time TIMESTAMPTZ NOT NULL DEFAULT now()
+            )
+        """,
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_time ON {table} (created_time)",
+    ]
+
+
+async def _notify_invalidate(space_id: str) -> None:
+    """Tell other instances to re-check the log now rather than at TTL."""
+    try:
+        from . import db_provider as _db
+        impl = _db._impl
+        sm = impl.get_signal_manager() if impl and hasattr(impl, 'get_signal_manager') else None
+        if sm:
+            await sm.notify_cache_invalidate("change_log", space_id)
+    except Exception as e:      # pragma: no cover - best effort
+        logger.debug("change_log invalidate notify skipped: %s", e)
+
+
+def invalidate_change_log_cache(space_id: Optional[str] = None) -> None:
+    """Forget the cached enabled flag for one space (or all spaces)."""
+    if space_id is None:
+        _enabled_cache.clear()
+    else:
+        _enabled_cache.pop(space_id, None)
+
+
+async def is_change_log_enabled(conn, space_id: str, use_cache: bool = True) -> bool:
+    """Whether the space has a change log (cached; see _ENABLED_TTL_S)."""
+    if use_cache:
+        cached = _enabled_cache.get(space_id)
+        if cached and time.monotonic() - cached[0] < _ENABLED_TTL_S:
+            return cached[1]
+    enabled = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL",
+                                  _log_table(space_id))
+    _enabled_cache[space_id] = (time.monotonic(), bool(enabled))
+    return bool(enabled)
+
+
+async def enable_change_log(conn, space_id: str) -> int:
+    """Create the space's change log. Returns the current head seq.
+
+    Another instance may keep writing unlogged batches until the invalidate
+    NOTIFY reaches it (at most the cache TTL), so a consumer bootstrapping
+    off a fresh log should take its baseline read after that, and start
+    from the seq it reads with it (``current_seq``), not from this one.
+    """
+    for stmt in create_change_log_sql(space_id):
+        await conn.execute(stmt)
+    _enabled_cache[space_id] = (time.monotonic(), True)
+    await _notify_invalidate(space_id)
+    return await current_seq(conn, space_id)
+
+
+async def disable_change_log(conn, space_id: str) -> None:
+    """Drop the space's change log; consumers must re-bootstrap afterwards."""
+    await conn.execute(f"DROP TABLE IF EXISTS {_log_table(space_id)}")
+    _enabled_cache[space_id] = (time.monotonic(), False)
+    await _notify_invalidate(space_id)
+
+
+async def append_changes(conn, space_id: str, op: str,
+                         quad_uuids: Iterable[Tuple]) -> int:
+    """Append the quads a write just changed to the space's change log.
+
+    ``quad_uuids`` are (subject, predicate, object, context) term UUIDs;
+    their terms must exist, which they do inside the write's transaction.
+    Call inside that transaction, as its last step (see module doc).
+    No-op when the space has no log. Returns the number of rows appended.
+    """
+    rows = list(quad_uuids)
+    if not rows or not await is_change_log_enabled(conn, space_id):
+        return 0
+    if op not in (OP_INSERT, OP_DELETE):
+        raise ValueError(f"change log op must be 'I' or 'D', not {op!r}")
+
+    t = SparqlSQLSchema.get_table_names(space_id)
+    term, dtab = _bare(t["term"]), _bare(t["datatype"])
+    table = _log_table(space_id)
+    quad_json = (f"jsonb_build_array({_nt_term_sql('ts')}, {_nt_term_sql('tp')}, "
+                 f"{_nt_term_sql('tobj', 'd')}, {_nt_term_sql('tc')})")
+    sql = f"""
+        INSERT INTO {table} (seq, op, quad_count, quads)
+        SELECT (SELECT COALESCE(max(seq), 0) + 1 FROM {table}),
+               $1, count(*), jsonb_agg({quad_json} ORDER BY q.ord)
+        FROM unnest($2::uuid[], $3::uuid[], $4::uuid[], $5::uuid[])
+             WITH ORDINALITY AS q(s, p, o, g, ord)
+        JOIN {term} ts ON ts.term_uuid = q.s
+        JOIN {term} tp ON tp.term_uuid = q.p
+        JOIN {term} tobj ON tobj.term_uuid = q.o
+        JOIN {term} tc ON tc.term_uuid = q.g
+        LEFT JOIN {dtab} d ON d.datatype_id = tobj.datatype_id
+        HAVING count(*) > 0
+    """
+
+    await conn.execute("SELECT pg_advisory_xact_lock($1)", _lock_key(space_id))
+    appended = 0
+    for i in range(0, len(rows), _QUADS_PER_ROW):
+        chunk = rows[i:i + _QUADS_PER_ROW]
+        result = await conn.execute(
+            sql, op,
+            [r[0] for r in chunk], [r[1] for r in chunk],
+            [r[2] for r in chunk], [r[3] for r in chunk])
+        appended += int(result.split()[-1]) if result else 0
+    return appended
+
+
+async def append_graph_resets(conn, space_id: str,
+                              context_uuids: Iterable) -> int:
+    """Log that the given graphs were replaced wholesale (op 'R').
+
+    For CLEAR / DROP and the other whole-graph operations, whose quads are
+    not enumerated. Each row lists the graphs as ``[null, null, null, g]``
+    entries; a consumer discards what it holds for each and re-reads it.
+    Same transaction and ordering rules as append_changes. Returns the
+    number of rows appended.
+    """
+    graphs = list(dict.fromkeys(context_uuids))
+    if not graphs or not await is_change_log_enabled(conn, space_id):
+        return 0
+
+    t = SparqlSQLSchema.get_table_names(space_id)
+    term = _bare(t["term"])
+    table = _log_table(space_id)
+    sql = f"""
+        INSERT INTO {table} (seq, op, quad_count, quads)
+        SELECT (SELECT COALESCE(max(seq), 0) + 1 FROM {table}),
+               '{OP_RESET}', count(*),
+               jsonb_agg(jsonb_build_array(NULL, NULL, NULL, {_nt_term_sql('tc')})
+                         ORDER BY q.ord)
+        FROM unnest($1::uuid[]) WITH ORDINALITY AS q(g, ord)
+        JOIN {term} tc ON tc.term_uuid = q.g
+        HAVING count(*) > 0
+    """
+
+    await conn.execute("SELECT pg_advisory_xact_lock($1)", _lock_key(space_id))
+    appended = 0
+    for i in range(0, len(graphs), _QUADS_PER_ROW):
+        result = await conn.execute(sql, graphs[i:i + _QUADS_PER_ROW])
+        appended += int(result.split()[-1]) if result else 0
+    return appended
+
+
+async def append_captured_changes(conn, space_id: str) -> int:
+    """Log what a SPARQL UPDATE captured, then drop the capture table.
+
+    The update's SQL must have been emitted with ``capture_changes`` (see
+    emit_update), in this transaction. Consecutive rows of one op become
+    one append, so the log keeps the order the statements ran in — a
+    DELETE/INSERT WHERE reads as its deletes, then its inserts. Returns the
+    number of log rows appended.
+    """
+    rows = await conn.fetch(
+        f"SELECT op, subject_uuid, predicate_uuid, object_uuid, context_uuid "
+        f"FROM {CHANGE_CAPTURE_TABLE} ORDER BY ord")
+    # A transactional batch can run several updates in one transaction.
+    await conn.execute(f"DROP TABLE {CHANGE_CAPTURE_TABLE}")
+    appended = 0
+    for op, run in itertools.groupby(rows, key=lambda r: r["op"]):
+        run = list(run)
+        if op == OP_RESET:
+            appended += await append_graph_resets(
+                conn, space_id, [r["context_uuid"] for r in run])
+        else:
+            appended += await append_changes(
+                conn, space_id, op,
+                [(r["subject_uuid"], r["predicate_uuid"], r["object_uuid"],
+                  r["context_uuid"]) for r in run])
+    return appended
+
+
+async def delete_quads_logged(conn, space_id: str, delete_sql: str, *args) -> int:
+    """Run a ``DELETE FROM {space}_rdf_quad ...`` and log the quads it removed.
+
+    For write paths that delete by subject, graph or key rather than from an
+    enumerated quad list: ``RETURNING`` names exactly the rows removed, and
+    they are appended as 'D' in the caller's transaction, so a consumer sees
+    a replace as delete-then-insert rather than as an insert on top of the
+    old values. Without a log for the space the statement runs as given and
+    nothing is materialised. Returns the number of quads deleted.
+
+    A write that inserts after deleting calls this first: 'D' then draws the
+    lower seq, and the insert's own ``append_changes`` the next one. That
+    takes the log's lock here, before the insert, rather than as the
+    write's last step (see module doc).
+    """
+    if not await is_change_log_enabled(conn, space_id):
+        result = await conn.execute(delete_sql, *args)
+        return int(result.split()[-1]) if result else 0
+    rows = await conn.fetch(
+        delete_sql + " RETURNING subject_uuid, predicate_uuid, object_uuid, context_uuid",
+        *args)
+    await append_changes(conn, space_id, OP_DELETE, [tuple(r) for r in rows])
+    return len(rows)
+
+
+async def current_seq(conn, space_id: str) -> int:
+    """Seq of the newest committed log row (0 for an empty log)."""
+    table = _log_table(space_id)
+    return await conn.fetchval(
+        f"SELECT COALESCE(max(seq), 0) FROM {table}") or 0
+
+
+async def change_log_status(conn, space_id: str) -> Dict[str, object]:
+    """Enabled flag, retained seq window and row count for a space."""
+    if not await is_change_log_enabled(conn, space_id, use_cache=False):
+        return {"enabled": False, "oldest_seq": None, "current_seq": None,
+                "rows": 0}
+    row = await conn.fetchrow(
+        f"SELECT min(seq) AS lo, max(seq) AS hi, count(*) AS n "
+        f"FROM {_log_table(space_id)}")
+    return {"enabled": True, "oldest_seq": row["lo"],
+            "current_seq": row["hi"] or 0, "rows": row["n"]}
+
+
+async def read_changes(conn, space_id: str, after_seq: int,
+                       limit: int = 100) -> List[Dict[str, object]]:
+    """Up to ``limit`` log rows with ``seq > after_seq``, oldest first.
+
+    Raises ChangeLogPositionError when the log cannot continue from
+    ``after_seq`` (see the class). Each row is {"seq", "op",
+    "created_time", "quads"} with ``op`` "insert", "delete" or "reset" and
+    ``quads`` a list of [s, p, o, g] N-Triples terms (only g for a reset).
+    """
+    table = _log_table(space_id)
+    rows = await conn.fetch(
+        f"SELECT seq, op, quads, created_time FROM {table} "
+        f"WHERE seq > $1 ORDER BY seq LIMIT $2",
+        after_seq, limit)
+    if not rows or rows[0]["seq"] != after_seq + 1:
+        # The log is gap-free, so a missing next row means the position is
+        # outside the retained range — unless the consumer is simply caught
+        # up, which is the common case. 0 is only "the beginning" while
+        # nothing has been pruned; after that a consumer starts from
+        # current_seq, taken with its baseline read.
+        bounds = await conn.fetchrow(
+            f"SELECT min(seq) AS lo, COALESCE(max(seq), 0) AS hi FROM {table}")
+        lo, hi = bounds["lo"], bounds["hi"]
+        if lo is None:
+            resumable = after_seq == 0
+        else:
+            resumable = lo <= after_seq + 1 and after_seq <= hi
+        if not resumable:
+            raise ChangeLogPositionError(space_id, after_seq, lo, hi)
+    return [_row_dict(r) for r in rows]
+
+
+_OP_NAMES = {OP_INSERT: "insert", OP_DELETE: "delete", OP_RESET: "reset"}
+
+
+def _row_dict(r) -> Dict[str, object]:
+    quads = r["quads"]
+    if isinstance(quads, str):
+        quads = json.loads(quads)
+    return {
+        "seq": r["seq"],
+        "op": _OP_NAMES[r["op"]],
+        "created_time": r["created_time"].isoformat() if r["created_time"] else None,
+        "quads": quads,
+    }
+
+
+async def prune_change_log(conn, space_id: str,
+                           retention_hours: float = RETENTION_HOURS_DEFAULT,
+                           max_rows: int = RETENTION_MAX_ROWS_DEFAULT) -> int:
+    """Delete log rows older than the retention window or past the row cap.
+
+    Both bounds are turned into a seq cutoff — rows are deleted from the
+    old end only, so the retained log stays a contiguous range and
+    read_changes can tell a pruned position from a live one. The newest
+    row is always kept: append_changes numbers from it. Returns the number
+    of rows deleted.
+    """
+    if not await is_change_log_enabled(conn, space_id, use_cache=False):
+        return 0
+    table = _log_table(space_id)
+    cutoff = await conn.fetchval(
+        f"SELECT LEAST("
+        f"  GREATEST((SELECT max(seq) FROM {table} "
+        f"            WHERE created_time < now() - make_interval(secs => $1)),"
+        f"           (SELECT max(seq) - $2 FROM {table})),"
+        f"  (SELECT max(seq) - 1 FROM {table}))",
+        float(retention_hours) * 3600.0, int(max_rows))
+    if not cutoff or cutoff < 1:
+        return 0
+    deleted = 0
+    while True:
+        result = await conn.execute(
+            f"DELETE FROM {table} WHERE seq IN ("
+            f"  SELECT seq FROM {table} WHERE seq <= $1 ORDER BY seq LIMIT $2)",
+            cutoff, _PRUNE_BATCH)
+        n = int(result.split()[-1]) if result else 0
+        deleted += n
+        if n < _PRUNE_BATCH:
+            break
+    if deleted:
+        logger.info("prune_change_log(%s): deleted %d row(s) up to seq %d",
+                    space_id, deleted, cutoff)
+    return deleted
@@ -54,6 +54,19 @@ class SparqlCompileCache:
         Returns the raw JSON response dict, identical to
         ``await client.compile(sparql)`` but potentially served from cache.
         """
+        raw, _ = await self.compile_with_key(sparql, client)
+        return raw
+
+    async def compile_with_key(
+        self,
+        sparql: str,
+        client,  # AsyncSidecarClient
+    ) -> Tuple[Dict[str, Any], str]:
+        """``compile`` plus the cache key — the query's parameterized-shape hash.
+
+        Queries that differ only in their IRIs share the key, which is what
+        per-shape statistics group on.
+        """
         normalized, uri_list = self._parameterize(sparql)
         key = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
@@ -68,7 +81,7 @@ class SparqlCompileCache:
                     100.0 * self._hits / (self._hits + self._misses),
                     len(self._cache),
                 )
-            return self._restore(cached_str, uri_list)
+            return self._restore(cached_str, uri_list), key
 
         # Cache miss — call sidecar with parameterized query
         self._misses += 1
@@ -81,10 +94,10 @@ class SparqlCompileCache:
             self._cache.move_to_end(key)
             while len(self._cache) > self._maxsize:
                 self._cache.popitem(last=False)
-            return self._restore(cached_str, uri_list)
+            return self._restore(cached_str, uri_list), key
 
         # Error response — don't cache, but still restore URIs
-        return self._restore(json.dumps(raw), uri_list)
+        return self._restore(json.dumps(raw), uri_list), key
 
     @property
     def stats(self) -> Dict[str, Any]:
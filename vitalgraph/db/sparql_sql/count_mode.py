@@ -0,0 +1,288 @@
+"""Count modes for paginated listings.
+
+Every listing page used to be returned with an exact ``total_count``:
+``COUNT(*)`` / ``COUNT(DISTINCT ?x)`` over the whole match set, run next
+to a page query that stops after 25 rows. A count cannot be paged, so on
+a multi-million-row graph it is O(matches) however small the page is, and
+it is routinely the slower half of the request (a triples listing of one
+predicate in a 50M-quad space: page in milliseconds, count in seconds).
+
+Callers now choose with ``count_mode``:
+
+``exact``       (default) the true total, as before.
+``estimated``   a statistic instead of a scan, in this order of preference:
+                the ``{space}_rdf_pred_stats`` / ``{space}_rdf_stats``
+                row counts for a predicate (and object) pattern, the
+                ``{space}_frame_entity`` cardinality for frames, and
+                otherwise the planner's row estimate for the generated
+                count SQL (``EXPLAIN``, nothing executed). Stats tables
+                are space-wide, so a graph-scoped listing gets the
+                space's figure; the planner estimate honours the graph.
+``capped:N``    the count stops at N: the counted subquery gets
+                ``LIMIT N + 1``, so the work is bounded by N rows. Below
+                the cap the answer is exact; at the cap it is a lower
+                bound (render "N+"). ``capped`` alone means
+                ``capped:DEFAULT_COUNT_CAP``.
+``none``        no count query at all. ``total_count`` is what the page
+                proves to exist (``offset + len(page)``).
+
+Responses carry ``total_count_kind`` — ``exact``, ``estimated``,
+``capped`` (hit the cap) or ``none`` — so a client never has to guess
+which of these it is looking at. An estimate that cannot be produced
+(no statistics, a query shape the planner cannot be asked about)
+degrades to a capped count, never to an unbounded one.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence, Tuple
+
+COUNT_EXACT = "exact"
+COUNT_ESTIMATED = "estimated"
+COUNT_CAPPED = "capped"
+COUNT_NONE = "none"
+COUNT_KINDS = (COUNT_EXACT, COUNT_ESTIMATED, COUNT_CAPPED, COUNT_NONE)
+
+# Same bound KGQuery's include_total_count=yes has used (issues/047).
+DEFAULT_COUNT_CAP = 1000
+MAX_COUNT_CAP = 1_000_000
+
+COUNT_MODE_DESCRIPTION = (
+    "How to compute total_count: 'exact' (default), 'estimated' (statistics "
+    "or planner estimate, no scan), 'capped:N' (stop counting at N; a total "
+    "of N is a lower bound) or 'none' (no count). The response's "
+    "total_count_kind says which kind was returned.")
+
+
+@dataclass(frozen=True)
+class CountMode:
+    kind: str
+    cap: Optional[int] = None
+
+    def __str__(self) -> str:
+        return f"{COUNT_CAPPED}:{self.cap}" if self.kind == COUNT_CAPPED else self.kind
+
+
+EXACT = CountMode(COUNT_EXACT)
+
+
+def parse_count_mode(value: Optional[str], default: str = COUNT_EXACT) -> CountMode:
+    """Parse ``exact | estimated | capped[:N] | none``; ValueError otherwise."""
+    if value is None or not str(value).strip():
+        return parse_count_mode(default)
+    text = str(value).strip().lower()
+    if text in (COUNT_EXACT, COUNT_ESTIMATED, COUNT_NONE):
+        return CountMode(text)
+    if text == COUNT_CAPPED:
+        return CountMode(COUNT_CAPPED, DEFAULT_COUNT_CAP)
+    if text.startswith(COUNT_CAPPED + ":"):
+        try:
+            cap = int(text.split(":", 1)[1])
+        except ValueError:
+            cap = 0
+        if 1 <= cap <= MAX_COUNT_CAP:
+            return CountMode(COUNT_CAPPED, cap)
+        raise ValueError(f"count_mode capped:N needs 1 <= N <= {MAX_COUNT_CAP}, got {value!r}")
+    raise ValueError(
+        f"count_mode must be exact, estimated, capped:N or none, got {value!r}")
+
+
+def settle_capped(count: int, cap: int) -> Tuple[int, str]:
+    """``(total, kind)`` for a count run with ``LIMIT cap + 1``."""
+    if count > cap:
+        return cap, COUNT_CAPPED
+    return count, COUNT_EXACT
+
+
+def uncounted_total(offset: int, page_rows: int) -> int:
+    """``total_count`` under ``none``: what the page proves exists."""
+    return offset + page_rows
+
+
+# ---------------------------------------------------------------------------
+# capped:N — bound a SPARQL count query
+# ---------------------------------------------------------------------------
+
+_COUNT_HEAD = re.compile(
+    r"SELECT\s*\(\s*COUNT\s*\(\s*(DISTINCT\s+)?(\?\w+|\*)\s*\)\s+AS\s+(\?\w+)\s*\)\s*WHERE\s*\{",
+    re.IGNORECASE)
+_TAIL_LIMIT = re.compile(r"\bLIMIT\s+\d+\s*(OFFSET\s+\d+\s*)?$", re.IGNORECASE)
+
+
+def cap_count_sparql(query: str, cap: int) -> Optional[str]:
+    """Rewrite a ``SELECT (COUNT(...) AS ?c) WHERE {...}`` query to count at
+    most ``cap + 1`` solutions, or None for a shape it does not recognise.
+
+    ``COUNT(DISTINCT ?v)`` becomes a count over ``SELECT DISTINCT ?v ...
+    ORDER BY ?v LIMIT cap+1`` — the ORDER BY is only there so the SQL
+    generator's SLICE-over-ORDER paging rewrite, which fences the plan,
+    applies to the bounded subquery (issues/047). ``COUNT(*)`` over a
+    sub-select gets the LIMIT on that sub-select; ``COUNT(*)`` over a
+    plain pattern counts a ``SELECT *`` sub-select. Queries that already
+    carry a LIMIT are left alone.
+    """
+    m = _COUNT_HEAD.search(query)
+    if not m:
+        return None
+    end = query.rstrip()
+    if not end.endswith("}"):
+        return None
+    body = end[m.end():-1].strip()
+    distinct, var, alias = m.group(1), m.group(2), m.group(3)
+    limit = f"LIMIT {int(cap) + 1}"
+    head = query[:m.start()]
+
+    if var != "*":
+        if not distinct:
+            return None
+        return (f"{head}SELECT (COUNT(*) AS {alias}) WHERE {{\n"
+                f"  {{ SELECT DISTINCT {var} WHERE {{\n    {body}\n  }} "
+                f"ORDER BY {var} {limit} }}\n}}")
+
+    inner = body
+    if inner.startswith("{") and inner.endswith("}"):
+        inner = inner[1:-1].strip()
+    if re.match(r"SELECT\b", inner, re.IGNORECASE):
+        if _TAIL_LIMIT.search(inner):
+            return None
+        return f"{head}SELECT (COUNT(*) AS {alias}) WHERE {{\n  {{ {inner} {limit} }}\n}}"
+    return (f"{head}SELECT (COUNT(*) AS {alias}) WHERE {{\n"
+            f"  {{ SELECT * WHERE {{\n    {body}\n  }} {limit} }}\n}}")
+
+
+# ---------------------------------------------------------------------------
+# estimated — statistics and planner estimates
+# ---------------------------------------------------------------------------
+
+def plan_count_rows(plan: Any) -> Optional[int]:
+    """Rows a count query would count, from its ``EXPLAIN (FORMAT JSON)``.
+
+    The top of a count plan is a plain Aggregate (one row); the estimate
+    that matters is the input to it. Grouped / hashed aggregates are
+    DISTINCTs and their estimate is the one wanted, so the walk stops
+    there. Below a Gather the estimates are per process, so they are
+    scaled back up by the planner's own parallel divisor.
+    """
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    if isinstance(plan, list):
+        plan = plan[0] if plan else None
+    node = plan.get("Plan") if isinstance(plan, dict) else None
+    scale = 1.0
+    while node is not None:
+        kind = node.get("Node Type")
+        children = node.get("Plans") or []
+        if kind in ("Gather", "Gather Merge") and children:
+            workers = int(node.get("Workers Planned") or 0)
+            # cost.c get_parallel_divisor(), leader participating
+            scale = workers + max(1.0 - 0.3 * workers, 0.0)
+            node = children[0]
+            continue
+        passthrough = (
+            (kind == "Aggregate" and node.get("Strategy", "Plain") == "Plain")
+            or kind in ("Limit", "Result", "Subquery Scan"))
+        if passthrough and children:
+            node = children[0]
+            continue
+        rows = node.get("Plan Rows")
+        return None if rows is None else int(round(float(rows) * scale))
+    return None
+
+
+async def estimate_sql_count(conn, sql: str) -> Optional[int]:
+    """Planner estimate of the rows a count statement counts; nothing runs."""
+    try:
+        raw = await conn.fetchval("EXPLAIN (FORMAT JSON) " + sql)
+    except Exception:
+        return None
+    return plan_count_rows(raw)
+
+
+async def pattern_count_estimate(conn, space_id: str, predicate_uri: str,
+                                 object_uris: Optional[Iterable[str]] = None) -> Optional[int]:
+    """Quads with ``predicate_uri`` (and one of ``object_uris``), from the
+    stats tables the join reorder already maintains.
+
+    Space-wide. None when the answer cannot be trusted: a predicate with
+    no ``rdf_pred_stats`` row may simply not have been analyzed yet, and a
+    pair absent from ``rdf_stats`` of a predicate marked ``pruned`` may
+    have been pruned rather than have no quads.
+    """
+    from .sparql_sql_space_impl import _generate_term_uuid
+
+    p_uuid = _generate_term_uuid(predicate_uri, 'U')
+    try:
+        pred = await conn.fetchrow(
+            f"SELECT row_count, pruned FROM {space_id}_rdf_pred_stats "
+            f"WHERE predicate_uuid = $1", p_uuid)
+        if pred is None:
+            return None
+        if object_uris is None:
+            return int(pred['row_count'])
+        o_uuids = list(dict.fromkeys(_generate_term_uuid(u, 'U') for u in object_uris))
+        rows = await conn.fetch(
+            f"SELECT row_count FROM {space_id}_rdf_stats "
+            f"WHERE predicate_uuid = $1 AND object_uuid = ANY($2::uuid[])",
+            p_uuid, o_uuids)
+    except Exception:
+        return None
+    if len(rows) < len(o_uuids) and pred['pruned']:
+        return None
+    return sum(int(r['row_count']) for r in rows)
+
+
+async def frame_count_estimate(conn, space_id: str, graph_uri: Optional[str]) -> Optional[int]:
+    """Frames in a graph, from the planner's view of ``{space}_frame_entity``
+    (one row per frame and graph)."""
+    from .sparql_sql_space_impl import _generate_term_uuid
+
+    where = ""
+    if graph_uri:
+        where = f" WHERE context_uuid = '{_generate_term_uuid(graph_uri, 'U')}'::uuid"
+    return await estimate_sql_count(
+        conn, f"SELECT count(*) FROM {space_id}_frame_entity{where}")
+
+
+# ---------------------------------------------------------------------------
+# Resolution
+# ---------------------------------------------------------------------------
+
+async def resolve_count(mode: CountMode, count_query: str,
+                        run: Callable[[str], Awaitable[int]],
+                        estimators: Sequence[Callable[[], Awaitable[Optional[int]]]] = (),
+                        ) -> Tuple[int, str]:
+    """``(total, kind)`` for ``count_query`` under ``mode``.
+
+    ``run`` executes a SPARQL count and returns the number; ``estimators``
+    are tried in order for ``estimated`` and the first non-None answer
+    wins. ``none`` returns 0 without running anything — the caller
+    replaces it with ``finish_count`` once the page is known. A ``capped``
+    count whose query cannot be bounded is answered the same way: the
+    page-derived lower bound, never the unbounded count it was asked to
+    avoid.
+    """
+    if mode.kind == COUNT_NONE:
+        return 0, COUNT_NONE
+    if mode.kind == COUNT_ESTIMATED:
+        for estimate in estimators:
+            n = await estimate()
+            if n is not None:
+                return max(int(n), 0), COUNT_ESTIMATED
+        mode = CountMode(COUNT_CAPPED, DEFAULT_COUNT_CAP)
+    if mode.kind == COUNT_CAPPED:
+        capped = cap_count_sparql(count_query, mode.cap)
+        if capped is None:
+            return 0, COUNT_NONE
+        return settle_capped(await run(capped), mode.cap)
+    return await run(count_query), COUNT_EXACT
+
+
+def finish_count(total: int, kind: str, offset: int, page_rows: int) -> int:
+    """Reconcile a non-exact total with the page actually returned: never
+    report fewer rows than the page proves exist."""
+    if kind == COUNT_EXACT:
+        return total
+    return max(total, uncounted_total(offset, page_rows))
@@ -22,7 +22,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from .vg_functions import FuzzyRequest, VectorRequest
+    from .vg_functions import AnnRequest, FuzzyRequest, VectorRequest
 
 from .ir import AliasGenerator
 from .sql_type_generation import TypeRegistry
@@ -260,6 +260,9 @@ class EmitContext:
         # FuzzyRequests: vg:fuzzyMatch calls that need MinHash LSH + RapidFuzz
         # resolution before SQL execution.
         self._fuzzy_requests: List['FuzzyRequest'] = []
+        # AnnRequests: filtered vector top-K subqueries that vg_ann may
+        # resolve with a selectivity-chosen mode before execution.
+        self._ann_requests: List['AnnRequest'] = []
         # Variables an expression referenced but could not resolve. Each
         # compiled to NULL, which is correct for a legitimately unbound
         # variable and a silently-widened constraint if the translator should
@@ -407,6 +410,18 @@ class EmitContext:
         """
         self._fuzzy_requests.append(request)
 
+    def add_ann_request(self, request: 'AnnRequest') -> None:
+        """Record a filtered vector top-K that can be resolved before execution.
+
+        Called by the vector-driving EXTEND path in emit_extend.
+        """
+        self._ann_requests.append(request)
+
+    @property
+    def ann_requests(self) -> List['AnnRequest']:
+        """Filtered vector top-K subqueries in this query."""
+        return self._ann_requests
+
     def add_unresolved_var(self, var: str, in_scope: bool = False,
                            reason: str = "unresolvable") -> None:
         """Record a variable an expression referenced but could not resolve.
@@ -506,6 +521,8 @@ class EmitContext:
         ctx._vector_requests = self._vector_requests
         # Share fuzzy requests list across parent/child contexts
         ctx._fuzzy_requests = self._fuzzy_requests
+        # Share filtered-ANN requests list across parent/child contexts
+        ctx._ann_requests = self._ann_requests
         # Share deferred UUIDs list across parent/child contexts
         ctx._deferred_uuids = self._deferred_uuids
         # Share the ordered-scan flag (issues/047)
@@ -157,6 +157,8 @@ def _try_vector_driving_extend(plan: PlanV2, ctx: EmitContext, child_sql: str) -
     # Record vector request if needed
     if driving.vec_request is not None:
         ctx.add_vector_request(driving.vec_request)
+    if driving.ann_request is not None:
+        ctx.add_ann_request(driving.ann_request)
 
     # Allocate names
     var = plan.extend_var
@@ -39,6 +39,48 @@ class UnboundDeleteTemplateVar(ValueError):
     """
 
 
+# Per-transaction table the quad statements copy their changed rows into when
+# the space has a change log (``capture_changes``). change_log.
+# append_captured_changes turns it into log rows before the update commits.
+CHANGE_CAPTURE_TABLE = "_upd_changes"
+
+_QUAD_COLS = ("subject_uuid", "predicate_uuid", "object_uuid", "context_uuid")
+
+
+def _capture_table_sql() -> str:
+    """DDL for the capture table; ``ord`` keeps statement order."""
+    return (
+        f"CREATE TEMP TABLE IF NOT EXISTS {CHANGE_CAPTURE_TABLE} ("
+        f"ord BIGSERIAL, op CHAR(1) NOT NULL, subject_uuid UUID, "
+        f"predicate_uuid UUID, object_uuid UUID, context_uuid UUID NOT NULL"
+        f") ON COMMIT DROP"
+    )
+
+
+def _captured(stmt: str, op: str, alias: Optional[str] = None) -> str:
+    """Wrap a quad INSERT or DELETE so the rows it changed are captured.
+
+    ``RETURNING`` yields exactly the rows the statement inserted (after its
+    NOT EXISTS guard) or deleted (whatever bound them), so the log records
+    what happened rather than what the update text named.
+    """
+    prefix = f"{alias}." if alias else ""
+    returning = ", ".join(prefix + c for c in _QUAD_COLS)
+    return (
+        f"WITH _changed AS ({stmt} RETURNING {returning}) "
+        f"INSERT INTO {CHANGE_CAPTURE_TABLE} (op, {', '.join(_QUAD_COLS)}) "
+        f"SELECT '{op}', {', '.join(_QUAD_COLS)} FROM _changed"
+    )
+
+
+def _capture_reset(context_expr: str) -> str:
+    """Record one graph as replaced wholesale (op 'R', see change_log)."""
+    return (
+        f"INSERT INTO {CHANGE_CAPTURE_TABLE} (op, context_uuid) "
+        f"SELECT 'R', g FROM (SELECT {context_expr} AS g) r WHERE g IS NOT NULL"
+    )
+
+
 # Deterministic UUID namespace — must match sparql_sql_space_impl._VITALGRAPH_NS
 _VITALGRAPH_NS = _uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
 
@@ -334,6 +376,7 @@ async def update_to_sql(
     conn_params: Optional[Dict[str, Any]] = None,
     conn=None,
     default_graph_uri: Optional[str] = None,
+    capture_changes: bool = False,
 ) -> str:
     """Translate a list of update operations to SQL.
 
@@ -344,15 +387,19 @@ async def update_to_sql(
         conn: Existing DB connection (for WHERE-based ops).
         default_graph_uri: URI for the default graph context.
             If None, uses 'urn:default'.
+        capture_changes: Copy every quad the SQL inserts or deletes, and a
+            reset row per graph a whole-graph op replaces, into
+            CHANGE_CAPTURE_TABLE. Must run inside a transaction.
 
     Returns:
         Semicolon-separated SQL string.
     """
     dg = default_graph_uri or _FALLBACK_DEFAULT_GRAPH
-    parts: List[str] = []
+    parts: List[str] = [_capture_table_sql()] if capture_changes else []
     for op in ops:
         parts.append(await _dispatch_one(op, space_id, conn_params=conn_params,
-                                         conn=conn, default_graph_uri=dg))
+                                         conn=conn, default_graph_uri=dg,
+                                         capture=capture_changes))
     return ";".join(parts)
 
 
@@ -362,6 +409,7 @@ async def _dispatch_one(
     conn_params: Optional[Dict[str, Any]] = None,
     conn=None,
     default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+    capture: bool = False,
 ) -> str:
     """Dispatch a single update operation to its SQL generator.
 
@@ -377,32 +425,39 @@ async def _dispatch_one(
                 await _ensure_datatype_id(space_id, dt_uri, dt_map, conn=conn)
         return _insert_data_sql(op.quads, space_id,
                                 default_graph_uri=default_graph_uri,
-                                dt_map=dt_map)
+                                dt_map=dt_map, capture=capture)
     elif isinstance(op, UpdateDataDelete):
         dt_map = await _resolve_datatype_map(space_id, conn=conn, conn_params=conn_params)
         return _delete_data_sql(op.quads, space_id,
                                 default_graph_uri=default_graph_uri,
-                                dt_map=dt_map)
+                                dt_map=dt_map, capture=capture)
     elif isinstance(op, UpdateModify):
         return await _modify_sql(op, space_id, conn_params=conn_params, conn=conn,
-                                 default_graph_uri=default_graph_uri)
+                                 default_graph_uri=default_graph_uri,
+                                 capture=capture)
     elif isinstance(op, UpdateDeleteWhere):
         return await _delete_where_sql(op, space_id, conn_params=conn_params,
-                                       conn=conn, default_graph_uri=default_graph_uri)
+                                       conn=conn, default_graph_uri=default_graph_uri,
+                                       capture=capture)
     elif isinstance(op, UpdateClear):
-        return _clear_sql(op, space_id, default_graph_uri=default_graph_uri)
+        return _clear_sql(op, space_id, default_graph_uri=default_graph_uri,
+                          capture=capture)
     elif isinstance(op, UpdateDrop):
-        return _drop_sql(op, space_id, default_graph_uri=default_graph_uri)
+        return _drop_sql(op, space_id, default_graph_uri=default_graph_uri,
+                         capture=capture)
     elif isinstance(op, UpdateCreate):
         return _create_sql(op, space_id)
     elif isinstance(op, UpdateLoad):
         return _load_sql(op, space_id)
     elif isinstance(op, UpdateCopy):
-        return _copy_sql(op, space_id, default_graph_uri=default_graph_uri)
+        return _copy_sql(op, space_id, default_graph_uri=default_graph_uri,
+                         capture=capture)
     elif isinstance(op, UpdateMove):
-        return _move_sql(op, space_id, default_graph_uri=default_graph_uri)
+        return _move_sql(op, space_id, default_graph_uri=default_graph_uri,
+                         capture=capture)
     elif isinstance(op, UpdateAdd):
-        return _add_sql(op, space_id, default_graph_uri=default_graph_uri)
+        return _add_sql(op, space_id, default_graph_uri=default_graph_uri,
+                        capture=capture)
     raise NotImplementedError(f"No SQL translation for {type(op).__name__}")
 
 
@@ -412,7 +467,8 @@ async def _dispatch_one(
 
 def _insert_data_sql(quads: List[QuadPattern], space_id: str,
                      default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
-                     dt_map: Optional[Dict[str, int]] = None) -> str:
+                     dt_map: Optional[Dict[str, int]] = None,
+                     capture: bool = False) -> str:
     """INSERT DATA → term upserts + quad inserts.
 
     Uses deterministic UUID v5 for new terms, populates datatype_id and
@@ -458,7 +514,7 @@ def _insert_data_sql(quads: List[QuadPattern], space_id: str,
                                      lang=_node_lang(q.object))
         g_uuid = _term_uuid_subquery(term_table, graph_uri, "U")
 
-        stmts.append(
+        stmt = (
             f"INSERT INTO {quad_table} "
             f"(subject_uuid, predicate_uuid, object_uuid, context_uuid) "
             f"SELECT {s_uuid}, {p_uuid}, {o_uuid}, {g_uuid} "
@@ -467,6 +523,7 @@ def _insert_data_sql(quads: List[QuadPattern], space_id: str,
             f"WHERE subject_uuid = {s_uuid} AND predicate_uuid = {p_uuid} "
             f"AND object_uuid = {o_uuid} AND context_uuid = {g_uuid})"
         )
+        stmts.append(_captured(stmt, "I") if capture else stmt)
     return ";\n".join(stmts)
 
 
@@ -476,7 +533,8 @@ def _insert_data_sql(quads: List[QuadPattern], space_id: str,
 
 def _delete_data_sql(quads: List[QuadPattern], space_id: str,
                      default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
-                     dt_map: Optional[Dict[str, int]] = None) -> str:
+                     dt_map: Optional[Dict[str, int]] = None,
+                     capture: bool = False) -> str:
     """DELETE DATA → DELETE FROM statements with deterministic UUID lookups."""
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
@@ -511,7 +569,8 @@ def _delete_data_sql(quads: List[QuadPattern], space_id: str,
             where_parts.append(
                 f"context_uuid = {_term_uuid_subquery(term_table, default_graph_uri, 'U')}"
             )
-        stmts.append(f"DELETE FROM {quad_table} WHERE " + " AND ".join(where_parts))
+        stmt = f"DELETE FROM {quad_table} WHERE " + " AND ".join(where_parts)
+        stmts.append(_captured(stmt, "D") if capture else stmt)
     return ";\n".join(stmts)
 
 
@@ -525,6 +584,7 @@ async def _modify_sql(
     conn_params: Optional[Dict[str, Any]] = None,
     conn=None,
     default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+    capture: bool = False,
 ) -> str:
     """DELETE/INSERT WHERE → combined SQL.
 
@@ -548,11 +608,12 @@ async def _modify_sql(
     if not op.where_pattern:
         parts: List[str] = []
         if op.delete_quads:
-            parts.append(_delete_data_sql(op.delete_quads, space_id, dt_map=dt_map))
+            parts.append(_delete_data_sql(op.delete_quads, space_id, dt_map=dt_map,
+                                          capture=capture))
         if op.insert_quads:
             parts.append(_insert_data_sql(op.insert_quads, space_id,
                                           default_graph_uri=default_graph_uri,
-                                          dt_map=dt_map))
+                                          dt_map=dt_map, capture=capture))
         return ";\n".join(parts)
 
     # Full WHERE pattern matching via V2 pipeline
@@ -630,7 +691,8 @@ async def _modify_sql(
         for dq in op.delete_quads:
             stmts.append(_delete_from_bindings(dq, space_id, target_graph,
                                                var_map=var_map,
-                                               dt_map=dt_map))
+                                               dt_map=dt_map,
+                                               capture=capture))
 
     # Step 3: Ensure new constant terms exist for INSERT template
     if op.insert_quads:
@@ -692,7 +754,8 @@ async def _modify_sql(
         for iq in op.insert_quads:
             stmts.append(_insert_from_bindings(iq, space_id, target_graph,
                                                var_map=var_map,
-                                               dt_map=dt_map))
+                                               dt_map=dt_map,
+                                               capture=capture))
 
     # Step 5: Cleanup
     stmts.append("DROP TABLE IF EXISTS _upd_bindings")
@@ -706,6 +769,7 @@ async def _delete_where_sql(
     conn_params: Optional[Dict[str, Any]] = None,
     conn=None,
     default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+    capture: bool = False,
 ) -> str:
     """DELETE WHERE → convert to UpdateModify with identical delete/where patterns.
 
@@ -749,13 +813,15 @@ async def _delete_where_sql(
         where_pattern=where_pattern,
     )
     return await _modify_sql(modify, space_id, conn_params=conn_params, conn=conn,
-                             default_graph_uri=default_graph_uri)
+                             default_graph_uri=default_graph_uri,
+                             capture=capture)
 
 
 def _delete_from_bindings(dq: QuadPattern, space_id: str,
                           default_graph: Optional[str] = None,
                           var_map: Optional[Dict[str, str]] = None,
-                          dt_map: Optional[Dict[str, int]] = None) -> str:
+                          dt_map: Optional[Dict[str, int]] = None,
+                          capture: bool = False) -> str:
     """Generate DELETE ... USING _upd_bindings for one delete template quad."""
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
@@ -844,22 +910,25 @@ def _delete_from_bindings(dq: QuadPattern, space_id: str,
         return "SELECT 1"  # all positions are unbound variables → no-op
 
     if needs_bindings:
-        return (
+        stmt = (
             f"DELETE FROM {quad_table} q "
             f"USING _upd_bindings b "
             f"WHERE " + " AND ".join(conditions)
         )
-    # No variables reference bindings — direct DELETE without USING
-    return (
-        f"DELETE FROM {quad_table} q "
-        f"WHERE " + " AND ".join(conditions)
-    )
+    else:
+        # No variables reference bindings — direct DELETE without USING
+        stmt = (
+            f"DELETE FROM {quad_table} q "
+            f"WHERE " + " AND ".join(conditions)
+        )
+    return _captured(stmt, "D", alias="q") if capture else stmt
 
 
 def _insert_from_bindings(iq: QuadPattern, space_id: str,
                           default_graph: Optional[str] = None,
                           var_map: Optional[Dict[str, str]] = None,
-                          dt_map: Optional[Dict[str, int]] = None) -> str:
+                          dt_map: Optional[Dict[str, int]] = None,
+                          capture: bool = False) -> str:
     """Generate INSERT ... SELECT from _upd_bindings for one insert template quad."""
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
@@ -876,7 +945,7 @@ def _insert_from_bindings(iq: QuadPattern, space_id: str,
     else:
         g_expr = _term_uuid_subquery(term_table, _FALLBACK_DEFAULT_GRAPH, "U")
 
-    return (
+    stmt = (
         f"INSERT INTO {quad_table} "
         f"(subject_uuid, predicate_uuid, object_uuid, context_uuid) "
         f"SELECT _s, _p, _o, _g FROM ("
@@ -887,6 +956,7 @@ def _insert_from_bindings(iq: QuadPattern, space_id: str,
         f"WHERE subject_uuid = _ins._s AND predicate_uuid = _ins._p "
         f"AND object_uuid = _ins._o AND context_uuid = _ins._g)"
     )
+    return _captured(stmt, "I") if capture else stmt
 
 
 # ===========================================================================
@@ -894,39 +964,42 @@ def _insert_from_bindings(iq: QuadPattern, space_id: str,
 # ===========================================================================
 
 def _clear_sql(op: UpdateClear, space_id: str,
-               default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH) -> str:
-    """CLEAR GRAPH/DEFAULT/NAMED/ALL → DELETE FROM statements."""
+               default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+               capture: bool = False) -> str:
+    """CLEAR GRAPH/DEFAULT/NAMED/ALL → DELETE FROM statements.
+
+    With ``capture`` the cleared graphs are recorded as resets, not quad by
+    quad; for ALL and NAMED that is every graph that still has quads.
+    """
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
 
-    if op.target == "ALL":
-        return f"DELETE FROM {quad_table}"
-
-    if op.target == "DEFAULT":
-        return (
-            f"DELETE FROM {quad_table} WHERE context_uuid = "
-            f"{_term_uuid_subquery(term_table, default_graph_uri, 'U')}"
-        )
-
-    if op.target == "NAMED":
-        return (
-            f"DELETE FROM {quad_table} WHERE context_uuid != "
-            f"{_term_uuid_subquery(term_table, default_graph_uri, 'U')}"
-        )
-
-    # Specific graph URI
-    graph_uri = op.graph or op.target
-    return (
-        f"DELETE FROM {quad_table} WHERE context_uuid = "
-        f"{_term_uuid_subquery(term_table, graph_uri, 'U')}"
-    )
+    if op.target in ("ALL", "NAMED"):
+        where = ("" if op.target == "ALL" else
+                 f" WHERE context_uuid != "
+                 f"{_term_uuid_subquery(term_table, default_graph_uri, 'U')}")
+        stmt = f"DELETE FROM {quad_table}{where}"
+        if not capture:
+            return stmt
+        return (f"INSERT INTO {CHANGE_CAPTURE_TABLE} (op, context_uuid) "
+                f"SELECT DISTINCT 'R', context_uuid FROM {quad_table}{where};\n"
+                f"{stmt}")
+
+    # DEFAULT, or a specific graph URI
+    graph_uri = (default_graph_uri if op.target == "DEFAULT"
+                 else op.graph or op.target)
+    graph_uuid = _term_uuid_subquery(term_table, graph_uri, 'U')
+    stmt = f"DELETE FROM {quad_table} WHERE context_uuid = {graph_uuid}"
+    return f"{_capture_reset(graph_uuid)};\n{stmt}" if capture else stmt
 
 
 def _drop_sql(op: UpdateDrop, space_id: str,
-              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH) -> str:
+              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+              capture: bool = False) -> str:
     """DROP GRAPH → same as CLEAR (no separate graph catalog)."""
     clear_op = UpdateClear(graph=op.graph, target=op.target, silent=op.silent)
-    return _clear_sql(clear_op, space_id, default_graph_uri=default_graph_uri)
+    return _clear_sql(clear_op, space_id, default_graph_uri=default_graph_uri,
+                      capture=capture)
 
 
 def _create_sql(op: UpdateCreate, space_id: str) -> str:
@@ -953,8 +1026,12 @@ def _load_sql(op: UpdateLoad, space_id: str) -> str:
 
 
 def _copy_sql(op: UpdateCopy, space_id: str,
-              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH) -> str:
-    """COPY source TO dest → clear dest, then insert all source quads with dest context."""
+              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+              capture: bool = False) -> str:
+    """COPY source TO dest → clear dest, then insert all source quads with dest context.
+
+    With ``capture`` the clear records dest as reset, which covers the copy.
+    """
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
     stmts: List[str] = []
@@ -971,7 +1048,8 @@ def _copy_sql(op: UpdateCopy, space_id: str,
 
     # Clear destination
     dest_clear = UpdateClear(graph=dst_uri, target=dst_uri)
-    stmts.append(_clear_sql(dest_clear, space_id, default_graph_uri=default_graph_uri))
+    stmts.append(_clear_sql(dest_clear, space_id, default_graph_uri=default_graph_uri,
+                            capture=capture))
 
     # Copy source quads with dest context
     src_uuid = _term_uuid_subquery(term_table, src_uri, "U")
@@ -988,7 +1066,8 @@ def _copy_sql(op: UpdateCopy, space_id: str,
 
 
 def _move_sql(op: UpdateMove, space_id: str,
-              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH) -> str:
+              default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+              capture: bool = False) -> str:
     """MOVE source TO dest → COPY source TO dest, then DROP source."""
     stmts: List[str] = []
 
@@ -1000,16 +1079,22 @@ def _move_sql(op: UpdateMove, space_id: str,
         return "SELECT 1"
 
     copy_op = UpdateCopy(source=op.source, dest=op.dest, silent=op.silent)
-    stmts.append(_copy_sql(copy_op, space_id, default_graph_uri=default_graph_uri))
+    stmts.append(_copy_sql(copy_op, space_id, default_graph_uri=default_graph_uri,
+                           capture=capture))
 
     drop_op = UpdateDrop(graph=src_uri, target=src_uri, silent=op.silent)
-    stmts.append(_drop_sql(drop_op, space_id, default_graph_uri=default_graph_uri))
+    stmts.append(_drop_sql(drop_op, space_id, default_graph_uri=default_graph_uri,
+                           capture=capture))
     return ";\n".join(stmts)
 
 
 def _add_sql(op: UpdateAdd, space_id: str,
-             default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH) -> str:
-    """ADD source TO dest → copy source quads into dest (additive, no clear)."""
+             default_graph_uri: str = _FALLBACK_DEFAULT_GRAPH,
+             capture: bool = False) -> str:
+    """ADD source TO dest → copy source quads into dest (additive, no clear).
+
+    With ``capture`` dest is recorded as reset rather than quad by quad.
+    """
     quad_table = f"{space_id}_rdf_quad"
     term_table = f"{space_id}_term"
     stmts: List[str] = []
@@ -1022,6 +1107,8 @@ def _add_sql(op: UpdateAdd, space_id: str,
 
     src_uuid = _term_uuid_subquery(term_table, src_uri, "U")
     dst_uuid = _term_uuid_subquery(term_table, dst_uri, "U")
+    if capture:
+        stmts.append(_capture_reset(dst_uuid))
 
     stmts.append(
         f"INSERT INTO {quad_table} "
@@ -0,0 +1,383 @@
+"""Declared per-type property tables — registry, DDL and lifecycle.
+
+A property table is a wide, one-row-per-subject projection of the quads of
+one KG type: for every subject carrying ``<type_predicate> <type_uri>`` in a
+graph, one row with a column group per declared single-valued property.
+
+    {space}_ptab_{name}(subject_uuid, context_uuid, overflow,
+                        {col}_uuid, {col}_text [, {col}_num | {col}_dt] ...)
+
+It exists because listing and sorting a type by N properties is N quad
+self-joins plus N term joins against the largest table in the space. A BGP
+fully covered by a declaration becomes one scan of a table that holds only
+that type (rewrite_property_table), and the ``{col}_text`` index is already
+in ORDER BY order for a listing sorted on that property.
+
+Declarations live in ``{space}_property_table``; the data tables are derived
+data maintained by the write path (sync_property_table) exactly like the edge
+and frame_entity tables.
+
+Status lifecycle:
+
+- ``building`` — declared and populated, but other instances may not have
+  picked the declaration up yet, so writes they made in that window were not
+  synced. Not used for rewrites. Promoted by a full rebuild in the
+  maintenance job (promote_property_tables) once the grace period (two
+  definition-cache TTLs) has passed. A SPARQL UPDATE whose
+  subjects are WHERE-bound puts a table back here too: the write path cannot
+  name the rows it changed, so the table is rebuilt instead.
+- ``ready``    — maintained by every instance; used for rewrites.
+- ``degraded`` — a subject was seen with two values for a declared
+  "single-valued" property. The table cannot represent that, so it stays
+  maintained but is never used for rewrites again until rebuilt from a
+  corrected declaration. Declining is the only correct response: a rewrite
+  would silently drop the second value.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+VALUE_TYPES = ("uri", "text", "num", "datetime")
+
+STATUS_BUILDING = "building"
+STATUS_READY = "ready"
+STATUS_DEGRADED = "degraded"
+
+# Names become part of a table name and of index names, so they are held to
+# a conservative identifier grammar rather than quoted.
+_NAME_RE = re.compile(r"^[a-z][a-z0-9_]{0,40}$")
+
+# Deterministic UUID namespace (same as sparql_sql_space_impl)
+_VITALGRAPH_NS = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
+
+# Definitions are read on every write (to know what to sync) and every query
+# (to know what to rewrite), so they are cached per process. The TTL bounds how
+# long another instance can miss a new declaration or a degradation.
+_DEF_TTL_S = 30.0
+
+# Module-level cache: space_id → (loaded_at, [PropertyTableDef])
+_property_table_defs: Dict[str, Tuple[float, List["PropertyTableDef"]]] = {}
+
+
+def uri_uuid(uri: str) -> uuid.UUID:
+    """Deterministic term UUID of a URI (matches _generate_term_uuid)."""
+    return uuid.uuid5(_VITALGRAPH_NS, f"{uri}\x00U")
+
+
+@dataclass(frozen=True)
+class PropertyColumn:
+    """One declared single-valued property of a property table."""
+    column: str
+    predicate: str
+    value_type: str = "text"
+
+    def value_columns(self) -> List[Tuple[str, str, str]]:
+        """(data column, SQL type, term-table source column) for this property.
+
+        Every property carries ``_uuid`` (the object term, what a rewritten
+        BGP joins on) and ``_text`` (what the emitted ORDER BY sorts on, so a
+        sorted listing can walk the index). Numeric and datetime properties
+        also carry the generated term column for range filters.
+        """
+        cols = [(f"{self.column}_uuid", "UUID", "object_uuid"),
+                (f"{self.column}_text", "TEXT", "term_text")]
+        if self.value_type == "num":
+            cols.append((f"{self.column}_num", "NUMERIC", "num_val"))
+        elif self.value_type == "datetime":
+            cols.append((f"{self.column}_dt", "TIMESTAMP", "dt_val"))
+        return cols
+
+
+@dataclass(frozen=True)
+class PropertyTableDef:
+    """A declared property table: type selector plus its columns."""
+    name: str
+    type_predicate: str
+    type_uri: str
+    columns: Tuple[PropertyColumn, ...] = field(default_factory=tuple)
+    status: str = STATUS_BUILDING
+
+    def data_table(self, space_id: str) -> str:
+        return f"{space_id}_ptab_{self.name}"
+
+    def column_for_predicate(self, predicate: str) -> Optional[PropertyColumn]:
+        for c in self.columns:
+            if c.predicate == predicate:
+                return c
+        return None
+
+
+def validate_definition(d: PropertyTableDef) -> None:
+    """Raise ValueError if a declaration cannot be turned into a table."""
+    if not _NAME_RE.match(d.name):
+        raise ValueError(f"Invalid property table name {d.name!r}: "
+                         f"must match {_NAME_RE.pattern}")
+    if not d.type_predicate or not d.type_uri:
+        raise ValueError("type_predicate and type_uri are required")
+    if not d.columns:
+        raise ValueError("A property table needs at least one column")
+    seen_cols, seen_preds = set(), set()
+    for c in d.columns:
+        if not _NAME_RE.match(c.column):
+            raise ValueError(f"Invalid column name {c.column!r}: "
+                             f"must match {_NAME_RE.pattern}")
+        if c.value_type not in VALUE_TYPES:
+            raise ValueError(f"Invalid value_type {c.value_type!r} for "
+                             f"{c.column!r}: expected one of {VALUE_TYPES}")
+        if c.column in seen_cols:
+            raise ValueError(f"Duplicate column {c.column!r}")
+        if c.predicate in seen_preds:
+            raise ValueError(f"Predicate {c.predicate!r} declared twice")
+        if c.predicate == d.type_predicate:
+            # The type quad is the row selector; a column for it would be
+            # multi-valued for every subject with a second type.
+            raise ValueError(f"Column {c.column!r} repeats the type predicate")
+        seen_cols.add(c.column)
+        seen_preds.add(c.predicate)
+
+
+def create_data_table_sql(space_id: str, d: PropertyTableDef) -> List[str]:
+    """DDL for one property data table and its indexes."""
+    table = d.data_table(space_id)
+    col_ddl = []
+    for c in d.columns:
+        for name, sql_type, _src in c.value_columns():
+            col_ddl.append(f"{name} {sql_type}")
+    cols = ",\n                ".join(col_ddl)
+    stmts = [f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                subject_uuid UUID NOT NULL,
+                context_uuid UUID NOT NULL,
+                overflow     BOOLEAN NOT NULL DEFAULT FALSE,
+                {cols},
+                PRIMARY KEY (subject_uuid, context_uuid)
+            )
+        ''']
+    idx = f"idx_{space_id}_ptab_{d.name}"
+    stmts.append(f"CREATE INDEX IF NOT EXISTS {idx}_ctx "
+                 f"ON {table} (context_uuid, subject_uuid)")
+    for c in d.columns:
+        # Sorted listing: context equality, then the ORDER BY column, with
+        # the subject carried so the page needs no heap visit to tie-break.
+        stmts.append(f"CREATE INDEX IF NOT EXISTS {idx}_{c.column}_text "
+                     f"ON {table} (context_uuid, {c.column}_text, subject_uuid)")
+        # Equality on the object term — `?s prop <const>` rewritten.
+        stmts.append(f"CREATE INDEX IF NOT EXISTS {idx}_{c.column}_uuid "
+                     f"ON {table} ({c.column}_uuid)")
+        if c.value_type == "num":
+            stmts.append(f"CREATE INDEX IF NOT EXISTS {idx}_{c.column}_num "
+                         f"ON {table} (context_uuid, {c.column}_num)")
+        elif c.value_type == "datetime":
+            stmts.append(f"CREATE INDEX IF NOT EXISTS {idx}_{c.column}_dt "
+                         f"ON {table} (context_uuid, {c.column}_dt)")
+    return stmts
+
+
+def _def_from_row(row) -> PropertyTableDef:
+    cols = row["columns"]
+    if isinstance(cols, str):
+        cols = json.loads(cols)
+    return PropertyTableDef(
+        name=row["table_name"],
+        type_predicate=row["type_predicate_uri"],
+        type_uri=row["type_uri"],
+        columns=tuple(PropertyColumn(column=c["column"],
+                                     predicate=c["predicate"],
+                                     value_type=c.get("value_type", "text"))
+                      for c in cols),
+        status=row["status"],
+    )
+
+
+async def load_property_tables(conn, space_id: str,
+                               use_cache: bool = True) -> List[PropertyTableDef]:
+    """All declarations for a space, whatever their status.
+
+    The write path syncs every declaration (a 'building' table must still
+    see writes), so this is the list sync uses; rewrites filter to 'ready'.
+    A space created before the registry existed simply has none.
+    """
+    if use_cache:
+        cached = _property_table_defs.get(space_id)
+        if cached and time.monotonic() - cached[0] < _DEF_TTL_S:
+            return cached[1]
+
+    registry = f"{space_id}_property_table"
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", registry)
+    defs: List[PropertyTableDef] = []
+    if exists:
+        rows = await conn.fetch(
+            f"SELECT table_name, type_predicate_uri, type_uri, columns, status "
+            f"FROM {registry} ORDER BY table_name")
+        defs = [_def_from_row(r) for r in rows]
+    _property_table_defs[space_id] = (time.monotonic(), defs)
+    return defs
+
+
+def invalidate_property_table_cache(space_id: Optional[str] = None) -> None:
+    """Drop cached declarations for one space (or all spaces)."""
+    if space_id is None:
+        _property_table_defs.clear()
+    else:
+        _property_table_defs.pop(space_id, None)
+
+
+async def _notify_invalidate(space_id: str) -> None:
+    """Tell other instances to reload declarations now rather than at TTL."""
+    try:
+        from . import db_provider as _db
+        impl = _db._impl
+        sm = impl.get_signal_manager() if impl and hasattr(impl, 'get_signal_manager') else None
+        if sm:
+            await sm.notify_cache_invalidate("property_table", space_id)
+    except Exception as e:
+        logger.debug("Property table invalidation notify failed (non-critical): %s", e)
+
+
+async def set_property_table_status(conn, space_id: str, name: str,
+                                    status: str) -> None:
+    """Persist a status change and make every instance see it."""
+    ready_clause = ", ready_time = CURRENT_TIMESTAMP" if status == STATUS_READY else ""
+    await conn.execute(
+        f"UPDATE {space_id}_property_table "
+        f"SET status = $2, status_time = CURRENT_TIMESTAMP{ready_clause} "
+        f"WHERE table_name = $1", name, status)
+    invalidate_property_table_cache(space_id)
+    await _notify_invalidate(space_id)
+
+
+async def declare_property_table(conn, space_id: str,
+                                 d: PropertyTableDef) -> Dict[str, int]:
+    """Register, create and populate a property table.
+
+    The table is left in 'building': instances that have not reloaded their
+    declarations yet are not syncing it, so it only becomes eligible for
+    rewrites after promote_property_tables rebuilds it past the grace period.
+    Returns {'rows': n, 'overflow': n}.
+    """
+    from .sync_property_table import rebuild_property_table
+
+    validate_definition(d)
+    registry = f"{space_id}_property_table"
+    # Older spaces predate the registry; creating it here is idempotent.
+    from .sparql_sql_schema import SparqlSQLSchema
+    await conn.execute(SparqlSQLSchema.create_property_table_registry_sql(space_id))
+
+    cols_json = json.dumps([{"column": c.column, "predicate": c.predicate,
+                             "value_type": c.value_type} for c in d.columns])
+    await conn.execute(
+        f"INSERT INTO {registry} (table_name, type_predicate_uri, type_uri, "
+        f"columns, status) VALUES ($1, $2, $3, $4::jsonb, $5)",
+        d.name, d.type_predicate, d.type_uri, cols_json, STATUS_BUILDING)
+    for stmt in create_data_table_sql(space_id, d):
+        await conn.execute(stmt)
+
+    rows, overflow = await rebuild_property_table(conn, space_id, d)
+    if overflow:
+        await set_property_table_status(conn, space_id, d.name, STATUS_DEGRADED)
+    else:
+        invalidate_property_table_cache(space_id)
+        await _notify_invalidate(space_id)
+    logger.info("declare_property_table(%s, %s): %d rows, %d overflow",
+                space_id, d.name, rows, overflow)
+    return {"rows": rows, "overflow": overflow}
+
+
+async def drop_property_table(conn, space_id: str, name: str) -> bool:
+    """Remove a declaration and its data table.  Returns True if it existed."""
+    registry = f"{space_id}_property_table"
+    exists = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", registry)
+    if not exists:
+        return False
+    deleted = await conn.fetchval(
+        f"DELETE FROM {registry} WHERE table_name = $1 RETURNING table_name", name)
+    await conn.execute(f"DROP TABLE IF EXISTS {space_id}_ptab_{name} CASCADE")
+    invalidate_property_table_cache(space_id)
+    await _notify_invalidate(space_id)
+    return deleted is not None
+
+
+async def rebuild_property_tables(conn, space_id: str,
+                                  names: Optional[Sequence[str]] = None) -> Dict[str, int]:
+    """Full rebuild of declared tables; re-evaluates degraded/building status.
+
+    A rebuild is the one place a table can leave 'degraded' — it recounts
+    every subject, so if the data no longer has a multi-valued subject the
+    table is ready again. Returns {name: rows}.
+    """
+    from .sync_property_table import rebuild_property_table
+
+    defs = await load_property_tables(conn, space_id, use_cache=False)
+    out: Dict[str, int] = {}
+    for d in defs:
+        if names and d.name not in names:
+            continue
+        for stmt in create_data_table_sql(space_id, d):
+            await conn.execute(stmt)
+        rows, overflow = await rebuild_property_table(conn, space_id, d)
+        status = STATUS_DEGRADED if overflow else STATUS_READY
+        if status != d.status:
+            await set_property_table_status(conn, space_id, d.name, status)
+        await conn.execute(f"ANALYZE {d.data_table(space_id)}")
+        out[d.name] = rows
+    return out
+
+
+async def promote_property_tables(conn, space_id: str) -> List[str]:
+    """Rebuild 'building' tables whose grace period has passed.
+
+    A rebuild TRUNCATEs and re-derives the whole table, so this runs from
+    the maintenance job, never on a connection answering a query. Other
+    instances' jobs may run it for the same space: a session advisory lock
+    per table keeps it to one rebuilder. Returns the names rebuilt.
+    """
+    defs = await load_property_tables(conn, space_id, use_cache=False)
+    building = [d.name for d in defs if d.status == STATUS_BUILDING]
+    if not building:
+        return []
+    due = await conn.fetch(
+        f"SELECT table_name FROM {space_id}_property_table "
+        f"WHERE status = $1 AND table_name = ANY($2) "
+        f"AND status_time < CURRENT_TIMESTAMP - make_interval(secs => $3)",
+        STATUS_BUILDING, building, 2 * _DEF_TTL_S)
+    names = [r["table_name"] for r in due
+             if await conn.fetchval(
+                 "SELECT pg_try_advisory_lock(hashtext($1))",
+                 f"{space_id}_ptab_{r['table_name']}")]
+    try:
+        if names:
+            await rebuild_property_tables(conn, space_id, names)
+    finally:
+        for n in names:
+            await conn.execute(
+                "SELECT pg_advisory_unlock(hashtext($1))",
+                f"{space_id}_ptab_{n}")
+    return names
+
+
+async def ensure_property_tables(space_id: str, conn=None,
+                                 conn_params=None) -> List[PropertyTableDef]:
+    """Ready declarations for a space — what the generator may rewrite to.
+
+    Lookup only: it runs for every query, so promoting a 'building' table
+    is left to the maintenance job (promote_property_tables). Never raises:
+    a failure here means no rewrite, not a failed query.
+    """
+    from .ensure_edge_table import _acquire_conn
+
+    try:
+        async with _acquire_conn(conn, conn_params) as c:
+            defs = await load_property_tables(c, space_id)
+            return [d for d in defs if d.status == STATUS_READY]
+    except Exception as e:
+        logger.warning("ensure_property_tables(%s): failed: %s", space_id, e)
+        return []
@@ -91,6 +91,7 @@ async def prepare_exists_subplans(plan: PlanV2, space_id: str, *,
                                   graph_lock_uri: Optional[str] = None,
                                   edge_table_ready: bool = False,
                                   frame_entity_ready: bool = False,
+                                  property_tables=None,
                                   depth: int = 0) -> int:
     """Collect and optimize every EXISTS body in `plan`. Returns how many.
 
@@ -153,13 +154,18 @@ async def prepare_exists_subplans(plan: PlanV2, space_id: str, *,
                     rewrite_frame_entity_table)
                 inner_plan = rewrite_frame_entity_table(inner_plan,
                                                         inner_aliases, space_id)
+            if property_tables:
+                from .rewrite_property_table import rewrite_property_table
+                inner_plan = rewrite_property_table(inner_plan, inner_aliases,
+                                                    space_id, property_tables)
 
             # Nested EXISTS inside this body.
             await prepare_exists_subplans(
                 inner_plan, space_id, conn=conn, conn_params=conn_params,
                 graph_lock_uri=graph_lock_uri,
                 edge_table_ready=edge_table_ready,
-                frame_entity_ready=frame_entity_ready, depth=depth + 1)
+                frame_entity_ready=frame_entity_ready,
+                property_tables=property_tables, depth=depth + 1)
 
             node.prepared_plan = inner_plan
             node.prepared_aliases = inner_aliases
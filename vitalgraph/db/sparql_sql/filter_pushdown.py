@@ -47,7 +47,7 @@ logger = logging.getLogger(__name__)
 
 def _quad_aliases(bgp: PlanV2) -> set:
     return {t.alias for t in bgp.tables
-            if t.kind in ("quad", "edge", "frame_entity")}
+            if t.kind in ("quad", "edge", "frame_entity", "property_table")}
 
 
 def _term_set(ctx, term_table: str, cond: str) -> str:
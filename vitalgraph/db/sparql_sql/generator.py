@@ -20,6 +20,7 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 from ..jena_sparql.jena_ast_mapper import map_compile_response, CompileResult
+from ..vector_storage import STORAGE_VECTOR, storage_config
 
 from .ir import AliasGenerator
 from .collect import collect, _CONST_PREFIX, _CONST_SUFFIX, _esc
@@ -50,6 +51,9 @@ class GenerateResult:
     # FuzzyRequests that need MinHash LSH + RapidFuzz resolution before execution.
     # Non-empty when the query uses vg:fuzzyMatch with a text argument.
     fuzzy_requests: List[Any] = field(default_factory=list)
+    # AnnRequests for filtered vector top-K subqueries. Optional to resolve:
+    # the SQL carries a correct default for each (see vg_ann).
+    ann_requests: List[Any] = field(default_factory=list)
     # True when the SQL's O(page) property depends on the planner picking an
     # ordered, early-terminating scan. The executor fences the statement so it
     # cannot fall back to a blocking sort over the whole match set
@@ -614,12 +618,14 @@ async def generate_sql(
     graph_lock_uri: Optional[str] = None,
     default_graph: Optional[str] = None,
     multi_vector_config: Optional[Dict[str, Any]] = None,
+    capture_changes: bool = False,
 ) -> GenerateResult:
     """Generate SQL from a compiled SPARQL query using the v2 pipeline.
 
     The collect/emit pipeline is pure (no I/O).  Only constant
     materialization, stats loading, datatype loading, and MV checks
-    are awaited.
+    are awaited. ``capture_changes`` applies to updates only (see
+    emit_update.update_to_sql).
     """
     if not compile_result.ok:
         return GenerateResult(ok=False, error=compile_result.error)
@@ -629,7 +635,8 @@ async def generate_sql(
         from .emit_update import update_to_sql
         sql = await update_to_sql(compile_result.update_ops, space_id,
                                   conn_params=conn_params, conn=conn,
-                                  default_graph_uri=default_graph)
+                                  default_graph_uri=default_graph,
+                                  capture_changes=capture_changes)
         return GenerateResult(ok=True, sql=sql, var_map={}, sparql_vars=[])
 
     algebra = compile_result.algebra
@@ -705,6 +712,7 @@ async def generate_sql(
         from .ensure_edge_table import ensure_edge_table
         from .ensure_frame_entity_table import ensure_frame_entity_table
         edge_ready = frame_entity_ready = False
+        property_tables = []
         if conn is not None or conn_params is not None:
             edge_ready = await ensure_edge_table(space_id, conn=conn,
                                                  conn_params=conn_params)
@@ -719,6 +727,17 @@ async def generate_sql(
                 from .rewrite_frame_entity_table import rewrite_frame_entity_table
                 plan = rewrite_frame_entity_table(plan, aliases, space_id)
 
+            # Stage 2a.2b: Declared property tables. After the edge and
+            # frame_entity rewrites, which claim their quads first — what is
+            # left on a typed subject is its plain properties.
+            from .ensure_property_table import ensure_property_tables
+            property_tables = await ensure_property_tables(
+                space_id, conn=conn, conn_params=conn_params)
+            if property_tables:
+                from .rewrite_property_table import rewrite_property_table
+                plan = rewrite_property_table(plan, aliases, space_id,
+                                              property_tables)
+
         # Stage 2a.3: Build the plans inside FILTER EXISTS / NOT EXISTS bodies.
         #
         # Has to happen HERE — after the rewrites, so the bodies get the same
@@ -730,7 +749,8 @@ async def generate_sql(
         await prepare_exists_subplans(
             plan, space_id, conn=conn, conn_params=conn_params,
             graph_lock_uri=graph_lock_uri,
-            edge_table_ready=edge_ready, frame_entity_ready=frame_entity_ready)
+            edge_table_ready=edge_ready, frame_entity_ready=frame_entity_ready,
+            property_tables=property_tables)
 
         # Stage 2a.3b: A prepared EXISTS body now knows which of ITS constants
         # resolved, so a NOT EXISTS that can never match is knowable here and
@@ -792,15 +812,19 @@ async def generate_sql(
             try:
                 vi_table = f"{space_id}_vector_index"
                 rows = await conn.fetch(
-                    f"SELECT index_name, model_name, dimensions "
+                    f"SELECT index_name, model_name, dimensions, provider_config "
                     f"FROM {vi_table}")
-                vector_index_meta = {
-                    r['index_name']: {
+                for r in rows:
+                    try:
+                        storage, rerank_factor = storage_config(r['provider_config'])
+                    except ValueError:
+                        storage, rerank_factor = STORAGE_VECTOR, 1
+                    vector_index_meta[r['index_name']] = {
                         'model_name': r['model_name'],
                         'dimensions': r['dimensions'],
+                        'storage': storage,
+                        'rerank_factor': rerank_factor,
                     }
-                    for r in rows
-                }
             except Exception:
                 pass  # table may not exist for non-vector spaces
             try:
@@ -928,6 +952,7 @@ async def generate_sql(
             trace_json=ctx.trace.to_json(),
             vector_requests=ctx.vector_requests,
             fuzzy_requests=ctx.fuzzy_requests,
+            ann_requests=ctx.ann_requests,
             needs_ordered_scan=ctx.needs_ordered_scan,
         )
 
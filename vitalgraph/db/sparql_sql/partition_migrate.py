@@ -13,15 +13,42 @@ Strategy: build alongside → backfill → swap.
      (and their partition children) into place, rebuild the core indexes on the
      now-partitioned tables, and resync stats.
 
-Runs inside the caller's transaction — atomic (readers see the old layout until
-commit, the new one after). The backfill holds locks for its duration, so this
-is a maintenance-window operation per space, not zero-downtime.
+``migrate_space_to_partitioned`` runs inside the caller's transaction — atomic
+(readers see the old layout until commit, the new one after). The backfill
+holds locks for its duration, so it is a maintenance-window operation.
+
+``migrate_space_to_partitioned_online`` is the zero-downtime variant for spaces
+too large for that window. Same end state, different locking:
+
+  1. Setup (short transaction): ``_new`` tables, a progress table and a change
+     log, plus capture triggers on the live core tables. From here on every
+     write to a live table records its key in the log.
+  2. Backfill in ctid page ranges, one short transaction per chunk; the chunk
+     and its progress row commit together, so a crashed run resumes where it
+     stopped by calling the function again.
+  3. Indexes are built on the ``_new`` tables under temporary names. Only the
+     (unused) new tables are locked while they build.
+  4. Catch-up: replay the log until fewer than ``max_lag`` keys are pending.
+  5. Swap (one short transaction, bounded by ``lock_timeout`` and retried):
+     lock the live tables, drain the last few log keys, drop old, rename new
+     tables and their indexes into place.
+
+Replay does not re-apply operations in order. It *reconciles* each logged key:
+delete it from the new table, re-copy whatever the live table holds for it now.
+That is idempotent and order-free, so out-of-order commits, duplicate log rows
+and a backfill chunk that copied a row just before it was deleted all converge
+— the delete logged the key, and the next replay runs after the chunk
+committed. A TRUNCATE of a live table (resync_all does that to edge and
+frame_entity) is logged as a marker that restarts that table's backfill.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from typing import Dict
+import time
+from typing import Callable, Dict, List, Optional, Tuple
 
 from .sparql_sql_schema import SparqlSQLSchema
 
@@ -29,6 +56,23 @@ logger = logging.getLogger(__name__)
 
 _CORE = ("rdf_quad", "edge", "frame_entity")
 
+# Identity of a row in the NEW layout — what the change log records and what
+# replay reconciles on. rdf_quad's is the slim PK, so the old table's duplicate
+# (s,p,o,c) rows collapse to one key exactly as the backfill collapses them.
+_KEYS = {
+    "rdf_quad": ("subject_uuid", "predicate_uuid", "object_uuid", "context_uuid"),
+    "edge": ("edge_uuid", "context_uuid"),
+    "frame_entity": ("frame_uuid", "context_uuid"),
+}
+
+# Online-mode defaults. A chunk is a ctid page range, so its size is bounded in
+# pages rather than rows: 1,000 8kB pages is ~8MB of heap per transaction.
+_CHUNK_PAGES = 1000
+_REPLAY_BATCH = 5000
+_MAX_LAG = 1000
+_LOCK_TIMEOUT_MS = 2000
+_SWAP_ATTEMPTS = 10
+
 
 def _bare(name: str) -> str:
     return name.split(".")[-1]
@@ -38,7 +82,7 @@ def _new_core_ddl(t: Dict[str, str], n: int):
     """DDL to build the three partitioned core tables under a `_new` suffix."""
     q, e, f = _bare(t["rdf_quad"]), _bare(t["edge"]), _bare(t["frame_entity"])
     stmts = [
-        f"""CREATE TABLE {q}_new (
+        f"""CREATE TABLE IF NOT EXISTS {q}_new (
                 subject_uuid   UUID NOT NULL,
                 predicate_uuid UUID NOT NULL,
                 object_uuid    UUID NOT NULL,
@@ -47,14 +91,15 @@ def _new_core_ddl(t: Dict[str, str], n: int):
                 dataset        VARCHAR(50) NOT NULL DEFAULT 'primary',
                 PRIMARY KEY (subject_uuid, predicate_uuid, object_uuid, context_uuid)
             ) PARTITION BY HASH (context_uuid)""",
-        f"""CREATE TABLE {e}_new (
+        f"""CREATE TABLE IF NOT EXISTS {e}_new (
                 edge_uuid        UUID NOT NULL,
                 source_node_uuid UUID NOT NULL,
                 dest_node_uuid   UUID NOT NULL,
                 context_uuid     UUID NOT NULL,
+                edge_type_uuid   UUID,
                 PRIMARY KEY (edge_uuid, context_uuid)
             ) PARTITION BY HASH (context_uuid)""",
-        f"""CREATE TABLE {f}_new (
+        f"""CREATE TABLE IF NOT EXISTS {f}_new (
                 frame_uuid         UUID NOT NULL,
                 source_entity_uuid UUID,
                 dest_entity_uuid   UUID,
@@ -65,11 +110,43 @@ def _new_core_ddl(t: Dict[str, str], n: int):
     for base in (q, e, f):
         for i in range(n):
             stmts.append(
-                f"CREATE TABLE {base}_new_p{i} PARTITION OF {base}_new "
+                f"CREATE TABLE IF NOT EXISTS {base}_new_p{i} PARTITION OF {base}_new "
                 f"FOR VALUES WITH (MODULUS {n}, REMAINDER {i})")
     return stmts
 
 
+async def _copy_columns(conn, src: str, dst: str) -> List[str]:
+    """Columns present in both tables, in the destination's order.
+
+    Spaces predating edge_type_uuid have an edge table without it; copying by
+    name rather than ``SELECT *`` lets those migrate too (the column stays NULL
+    until the next edge resync, which is what the nullable column means).
+    """
+    rows = await conn.fetch(
+        "SELECT table_name, column_name, ordinal_position "
+        "FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = ANY($1)",
+        [src, dst])
+    src_cols = {r["column_name"] for r in rows if r["table_name"] == src}
+    return [r["column_name"] for r in sorted(rows, key=lambda r: r["ordinal_position"])
+            if r["table_name"] == dst and r["column_name"] in src_cols]
+
+
+def _swap_sql(bases, n: int) -> List[str]:
+    """Drop the live core tables and rename the ``_new`` ones into place.
+
+    DROP … CASCADE frees every index / extended-statistics name tied to the old
+    tables, which is what lets the new ones take those names.
+    """
+    stmts = []
+    for base in bases:
+        stmts.append(f"DROP TABLE {base} CASCADE")
+        stmts.append(f"ALTER TABLE {base}_new RENAME TO {base}")
+        for i in range(n):
+            stmts.append(f"ALTER TABLE {base}_new_p{i} RENAME TO {base}_p{i}")
+    return stmts
+
+
 async def distinct_quads(conn, space_id: str):
     """Set of distinct (s,p,o,c) — the set-semantics fingerprint of the space."""
     t = SparqlSQLSchema.get_table_names(space_id)
@@ -95,22 +172,16 @@ async def migrate_space_to_partitioned(conn, space_id: str,
         await conn.execute(stmt)
 
     # 2. backfill (rdf_quad dedups against the new slim PK)
-    await conn.execute(
-        f"INSERT INTO {q}_new "
-        f"(subject_uuid, predicate_uuid, object_uuid, context_uuid, quad_uuid, dataset) "
-        f"SELECT subject_uuid, predicate_uuid, object_uuid, context_uuid, quad_uuid, dataset "
-        f"FROM {q} ON CONFLICT DO NOTHING")
-    await conn.execute(f"INSERT INTO {e}_new SELECT * FROM {e} ON CONFLICT DO NOTHING")
-    await conn.execute(f"INSERT INTO {f}_new SELECT * FROM {f} ON CONFLICT DO NOTHING")
+    for base in (q, e, f):
+        cols = ", ".join(await _copy_columns(conn, base, f"{base}_new"))
+        await conn.execute(
+            f"INSERT INTO {base}_new ({cols}) SELECT {cols} FROM {base} "
+            f"ON CONFLICT DO NOTHING")
     new_quads = await conn.fetchval(f"SELECT count(*) FROM {q}_new")
 
     # 3. swap: drop old (CASCADE frees all index/stat names), rename _new in
-    for base in (q, e, f):
-        await conn.execute(f"DROP TABLE {base} CASCADE")
-        await conn.execute(f"ALTER TABLE {base}_new RENAME TO {base}")
-        for i in range(n_partitions):
-            await conn.execute(
-                f"ALTER TABLE {base}_new_p{i} RENAME TO {base}_p{i}")
+    for stmt in _swap_sql((q, e, f), n_partitions):
+        await conn.execute(stmt)
 
     # 4. rebuild indexes (names freed by the DROP CASCADE); create_space_indexes
     #    is comprehensive — unrelated tables' indexes already exist (IF NOT EXISTS)
@@ -126,3 +197,388 @@ async def migrate_space_to_partitioned(conn, space_id: str,
                 old_quads - new_quads, n_partitions)
     return {"old_quads": old_quads, "new_quads": new_quads,
             "dupes_dropped": old_quads - new_quads}
+
+
+# ---------------------------------------------------------------------------
+# Online migration
+# ---------------------------------------------------------------------------
+
+def _state_table(space_id: str) -> str:
+    return f"{space_id}_pmig_state"
+
+
+def _log_table(space_id: str, core: str) -> str:
+    return f"{space_id}_pmig_log_{core}"
+
+
+def _capture_fn(space_id: str, core: str) -> str:
+    return f"{space_id}_pmig_capture_{core}"
+
+
+def _capture_ddl(space_id: str, base: str, core: str) -> List[str]:
+    """Change log, capture function and triggers for one live core table.
+
+    The log holds keys only — replay re-reads the row from the live table, so
+    there is nothing to gain from logging values and a lot of WAL to lose.
+    Key columns are nullable: an all-NULL row is the TRUNCATE marker.
+    """
+    log = _log_table(space_id, core)
+    fn = _capture_fn(space_id, core)
+    keys = _KEYS[core]
+    key_cols = ",\n                ".join(f"{k} UUID" for k in keys)
+    new_vals = ", ".join(f"NEW.{k}" for k in keys)
+    old_vals = ", ".join(f"OLD.{k}" for k in keys)
+    key_list = ", ".join(keys)
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {log} (
+                seq BIGSERIAL PRIMARY KEY,
+                {key_cols}
+            )""",
+        f"""CREATE OR REPLACE FUNCTION {fn}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'TRUNCATE' THEN
+                    INSERT INTO {log} DEFAULT VALUES;
+                    RETURN NULL;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO {log} ({key_list}) VALUES ({new_vals});
+                END IF;
+                IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                    INSERT INTO {log} ({key_list}) VALUES ({old_vals});
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql""",
+        f"CREATE OR REPLACE TRIGGER pmig_capture AFTER INSERT OR UPDATE OR DELETE "
+        f"ON {base} FOR EACH ROW EXECUTE FUNCTION {fn}()",
+        f"CREATE OR REPLACE TRIGGER pmig_capture_truncate AFTER TRUNCATE "
+        f"ON {base} FOR EACH STATEMENT EXECUTE FUNCTION {fn}()",
+    ]
+
+
+def _staged_index_plan(schema: SparqlSQLSchema, space_id: str,
+                       t: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """Core-table indexes of create_space_indexes_sql, retargeted at ``_new``.
+
+    Returns (temp_name, final_name, create_sql). The temporary name is a short
+    hash rather than ``final + suffix``: index names are already near the
+    63-byte limit for long space ids, and PostgreSQL silently truncates, which
+    would make the post-swap rename miss.
+    """
+    plan = []
+    for stmt in schema.create_space_indexes_sql(space_id):
+        if not stmt.startswith("CREATE INDEX IF NOT EXISTS "):
+            continue
+        for core in _CORE:
+            base = _bare(t[core])
+            marker = f" ON {t[core]} "
+            if marker not in stmt:
+                continue
+            final = stmt[len("CREATE INDEX IF NOT EXISTS "):].split()[0]
+            temp = "pmig_" + hashlib.md5(final.encode()).hexdigest()[:20]
+            sql = (f"CREATE INDEX IF NOT EXISTS {temp}"
+                   + stmt[len("CREATE INDEX IF NOT EXISTS ") + len(final):]
+                   .replace(marker, f" ON {base}_new ", 1))
+            plan.append((temp, final, sql))
+    return plan
+
+
+async def _locked(conn, lock_timeout_ms: int, attempts: int, body):
+    """Run ``body(conn)`` in a transaction whose lock waits are bounded.
+
+    ``lock_timeout`` is what keeps this from becoming the outage it exists to
+    avoid: an ACCESS EXCLUSIVE request queued behind a long-running reader
+    blocks every later reader and writer too. Failing fast and retrying after
+    a backoff lets that traffic through. Returns (result, held_ms) where
+    held_ms is how long the transaction ran.
+    """
+    import asyncpg
+    delay = 0.05
+    for attempt in range(1, attempts + 1):
+        try:
+            t0 = time.perf_counter()
+            async with conn.transaction():
+                await conn.execute(f"SET LOCAL lock_timeout = '{int(lock_timeout_ms)}ms'")
+                result = await body(conn)
+            return result, (time.perf_counter() - t0) * 1000
+        except asyncpg.exceptions.LockNotAvailableError:
+            if attempt == attempts:
+                raise
+            logger.info("partition migration: lock not available (attempt %d/%d), "
+                        "retrying in %.2fs", attempt, attempts, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+
+async def _replay(conn, space_id: str, core: str, base: str,
+                  limit: Optional[int]) -> int:
+    """Reconcile up to ``limit`` logged keys (all when None). Returns keys done.
+
+    Only rows visible to this transaction are consumed: a log row from a
+    writer that commits later stays behind for the next round, even if its
+    seq is lower than what was consumed here.
+    """
+    log = _log_table(space_id, core)
+    keys = _KEYS[core]
+    key_list = ", ".join(keys)
+    bound = (f"(SELECT max(seq) FROM (SELECT seq FROM {log} ORDER BY seq "
+             f"LIMIT {int(limit)}) b)" if limit else f"(SELECT max(seq) FROM {log})")
+    rows = await conn.fetch(
+        f"DELETE FROM {log} WHERE seq <= {bound} RETURNING seq, {key_list}")
+    if not rows:
+        return 0
+
+    marker = max((r["seq"] for r in rows if r[keys[0]] is None), default=None)
+    if marker is not None:
+        # A TRUNCATE on the live table: the new copy is void. Start this
+        # table's backfill over; keys logged after the marker are reconciled
+        # below against the (re-filling) live table, which is still correct.
+        await conn.execute(f"TRUNCATE {base}_new")
+        await conn.execute(
+            f"UPDATE {_state_table(space_id)} SET next_page = 0, "
+            f"total_pages = NULL, updated_time = now() WHERE core = $1", core)
+        rows = [r for r in rows if r["seq"] > marker]
+
+    distinct = list({tuple(r[k] for k in keys) for r in rows})
+    if distinct:
+        arrays = [[k[i] for k in distinct] for i in range(len(keys))]
+        unnest = ", ".join(f"${i + 1}::uuid[]" for i in range(len(keys)))
+        match = " AND ".join(f"x.{k} = u.{k}" for k in keys)
+        await conn.execute(
+            f"DELETE FROM {base}_new x USING unnest({unnest}) AS u({key_list}) "
+            f"WHERE {match}", *arrays)
+        cols = ", ".join(await _copy_columns(conn, base, f"{base}_new"))
+        xcols = ", ".join(f"x.{c}" for c in cols.split(", "))
+        await conn.execute(
+            f"INSERT INTO {base}_new ({cols}) SELECT {xcols} FROM {base} x "
+            f"JOIN unnest({unnest}) AS u({key_list}) ON {match} "
+            f"ON CONFLICT DO NOTHING", *arrays)
+    return len(rows)
+
+
+async def _lag(conn, space_id: str) -> int:
+    return sum([await conn.fetchval(f"SELECT count(*) FROM {_log_table(space_id, c)}")
+                for c in _CORE])
+
+
+async def migrate_space_to_partitioned_online(
+    conn,
+    space_id: str,
+    n_partitions: int = 16,
+    *,
+    chunk_pages: int = _CHUNK_PAGES,
+    replay_batch: int = _REPLAY_BATCH,
+    max_lag: int = _MAX_LAG,
+    lock_timeout_ms: int = _LOCK_TIMEOUT_MS,
+    swap_attempts: int = _SWAP_ATTEMPTS,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> Dict[str, int]:
+    """Migrate one space to the partitioned layout while it stays writable.
+
+    ``conn`` must NOT be inside a transaction — the point is many short ones.
+    Concurrent writers on other connections keep working throughout; they are
+    blocked only by the setup and swap transactions, each bounded by
+    ``lock_timeout_ms`` to acquire and by ``max_lag`` log keys to hold.
+
+    Resumable: progress is committed with each chunk, so calling this again
+    after a crash continues the backfill instead of restarting it. Use
+    ``abort_online_migration`` to discard a half-done migration instead.
+
+    ``progress`` (optional) is called with a dict per chunk and per replay
+    round: {"phase", "core", "page", "pages", "lag"}.
+
+    Returns the same counts as migrate_space_to_partitioned, plus the lock
+    hold times — ``setup_lock_ms``, ``swap_lock_ms`` and ``max_chunk_ms`` —
+    so callers (and tests) can check the bound held.
+    """
+    if conn.is_in_transaction():
+        raise RuntimeError("online migration manages its own transactions; "
+                           "call it outside a transaction")
+    schema = SparqlSQLSchema()
+    t = schema.get_table_names(space_id)
+    bases = {core: _bare(t[core]) for core in _CORE}
+    state = _state_table(space_id)
+
+    relkind = await conn.fetchval(
+        "SELECT relkind FROM pg_class WHERE relname = $1 "
+        "AND relnamespace = current_schema()::regnamespace", bases["rdf_quad"])
+    if relkind is None:
+        raise ValueError(f"space {space_id!r} has no rdf_quad table")
+    if relkind == "p":
+        raise ValueError(f"space {space_id!r} is already partitioned")
+
+    def _report(**kw):
+        if progress is not None:
+            progress(kw)
+
+    # 1. Setup. Creating the triggers takes SHARE ROW EXCLUSIVE on each live
+    #    table, which waits for in-flight writes — hence the bounded lock.
+    async def _setup(c):
+        for stmt in _new_core_ddl(t, n_partitions):
+            await c.execute(stmt)
+        await c.execute(f"""CREATE TABLE IF NOT EXISTS {state} (
+                core         TEXT PRIMARY KEY,
+                next_page    BIGINT NOT NULL DEFAULT 0,
+                total_pages  BIGINT,
+                n_partitions INT NOT NULL,
+                indexed      BOOLEAN NOT NULL DEFAULT FALSE,
+                started_time TIMESTAMP NOT NULL DEFAULT now(),
+                updated_time TIMESTAMP NOT NULL DEFAULT now()
+            )""")
+        for core in _CORE:
+            for stmt in _capture_ddl(space_id, bases[core], core):
+                await c.execute(stmt)
+            await c.execute(
+                f"INSERT INTO {state} (core, n_partitions) VALUES ($1, $2) "
+                f"ON CONFLICT (core) DO NOTHING", core, n_partitions)
+        return await c.fetchval(
+            f"SELECT n_partitions FROM {state} WHERE core = 'rdf_quad'")
+
+    existing_n, setup_ms = await _locked(conn, lock_timeout_ms, swap_attempts, _setup)
+    if existing_n != n_partitions:
+        raise ValueError(
+            f"a migration of {space_id!r} to {existing_n} partitions is already "
+            f"in progress; resume it with n_partitions={existing_n} or abort it")
+
+    old_quads = await conn.fetchval(f"SELECT count(*) FROM {t['rdf_quad']}")
+    block = int(await conn.fetchval("SELECT current_setting('block_size')"))
+    max_chunk_ms = 0.0
+
+    # 2. Chunked backfill, with a replay round after each chunk so the log
+    #    does not grow for the whole duration of a long backfill.
+    async def _backfill_until_done():
+        nonlocal max_chunk_ms
+        while True:
+            pending = await conn.fetch(
+                f"SELECT core, next_page, total_pages FROM {state} "
+                f"WHERE total_pages IS NULL OR next_page < total_pages ORDER BY core")
+            if not pending:
+                return
+            for r in pending:
+                core, base = r["core"], bases[r["core"]]
+                total = r["total_pages"]
+                if total is None:
+                    # Pages appended after this are new writes: the log has them.
+                    total = await conn.fetchval(
+                        f"SELECT pg_relation_size('{base}') / {block}")
+                    await conn.execute(
+                        f"UPDATE {state} SET total_pages = $2 WHERE core = $1",
+                        core, total)
+                cols = ", ".join(await _copy_columns(conn, base, f"{base}_new"))
+                page = r["next_page"]
+                while page < total:
+                    end = min(page + chunk_pages, total)
+                    t0 = time.perf_counter()
+                    async with conn.transaction():
+                        await conn.execute(
+                            f"INSERT INTO {base}_new ({cols}) SELECT {cols} FROM {base} "
+                            f"WHERE ctid >= '({page},0)'::tid AND ctid < '({end},0)'::tid "
+                            f"ON CONFLICT DO NOTHING")
+                        await conn.execute(
+                            f"UPDATE {state} SET next_page = $2, updated_time = now() "
+                            f"WHERE core = $1", core, end)
+                    max_chunk_ms = max(max_chunk_ms, (time.perf_counter() - t0) * 1000)
+                    page = end
+                    async with conn.transaction():
+                        await _replay(conn, space_id, core, base, replay_batch)
+                    _report(phase="backfill", core=core, page=page, pages=total,
+                            lag=None)
+                    if await conn.fetchval(
+                            f"SELECT total_pages IS NULL FROM {state} WHERE core = $1",
+                            core):
+                        break  # a TRUNCATE reset this table; outer loop restarts it
+
+    await _backfill_until_done()
+
+    # 3. Indexes on the new tables, under temporary names. Slow on a big space,
+    #    but only the _new tables are locked while they build.
+    index_plan = _staged_index_plan(schema, space_id, t)
+    if not await conn.fetchval(f"SELECT bool_and(indexed) FROM {state}"):
+        for _temp, _final, sql in index_plan:
+            await conn.execute(sql)
+        await conn.execute(f"UPDATE {state} SET indexed = TRUE")
+
+    # 4. Catch-up until the remaining log is small enough to drain under lock.
+    async def _catch_up():
+        while True:
+            for core in _CORE:
+                async with conn.transaction():
+                    await _replay(conn, space_id, core, bases[core], replay_batch)
+            await _backfill_until_done()   # only does work after a TRUNCATE
+            lag = await _lag(conn, space_id)
+            _report(phase="catchup", core=None, page=None, pages=None, lag=lag)
+            if lag <= max_lag:
+                return
+
+    await _catch_up()
+
+    # 5. Swap. Writers are blocked from LOCK to COMMIT, so that window holds
+    #    only the drain of at most ~max_lag keys plus catalog renames.
+    async def _swap(c):
+        await c.execute("LOCK TABLE " + ", ".join(bases[core] for core in _CORE)
+                        + " IN ACCESS EXCLUSIVE MODE")
+        for core in _CORE:
+            await _replay(c, space_id, core, bases[core], None)
+        if await c.fetchval(
+                f"SELECT count(*) FROM {state} "
+                f"WHERE total_pages IS NULL OR next_page < total_pages"):
+            # A TRUNCATE slipped in since catch-up; swapping now would publish
+            # a partial copy. Roll back, let catch-up (outside the lock)
+            # replay the marker and refill, then try again.
+            raise _BackfillReset()
+        new_quads = await c.fetchval(f"SELECT count(*) FROM {bases['rdf_quad']}_new")
+        for stmt in _swap_sql([bases[core] for core in _CORE], n_partitions):
+            await c.execute(stmt)
+        for temp, final, _sql in index_plan:
+            await c.execute(f"ALTER INDEX {temp} RENAME TO {final}")
+        for core in _CORE:
+            await c.execute(f"DROP TABLE IF EXISTS {_log_table(space_id, core)}")
+            await c.execute(f"DROP FUNCTION IF EXISTS {_capture_fn(space_id, core)}()")
+        await c.execute(f"DROP TABLE IF EXISTS {state}")
+        return new_quads
+
+    while True:
+        try:
+            new_quads, swap_ms = await _locked(conn, lock_timeout_ms,
+                                               swap_attempts, _swap)
+            break
+        except _BackfillReset:
+            await _catch_up()
+
+    # 6. Statistics objects / column targets on the new tables (catalog-only,
+    #    the indexes already exist under their final names), then stats.
+    for stmt in schema.create_space_indexes_sql(space_id):
+        await conn.execute(stmt)
+    from .sync_stats_tables import resync_stats_tables
+    async with conn.transaction():
+        await resync_stats_tables(conn, space_id)
+    for core in _CORE:
+        await conn.execute(f"ANALYZE {bases[core]}")
+
+    logger.info("migrate_space_to_partitioned_online(%s): %d -> %d quads, "
+                "%d partitions; setup lock %.0fms, swap lock %.0fms, "
+                "longest chunk %.0fms", space_id, old_quads, new_quads,
+                n_partitions, setup_ms, swap_ms, max_chunk_ms)
+    return {"old_quads": old_quads, "new_quads": new_quads,
+            "dupes_dropped": old_quads - new_quads,
+            "setup_lock_ms": round(setup_ms), "swap_lock_ms": round(swap_ms),
+            "max_chunk_ms": round(max_chunk_ms)}
+
+
+class _BackfillReset(Exception):
+    """Raised inside the swap transaction to roll it back after a TRUNCATE."""
+
+
+async def abort_online_migration(conn, space_id: str) -> None:
+    """Discard an unfinished online migration; the live tables are untouched."""
+    t = SparqlSQLSchema.get_table_names(space_id)
+    async with conn.transaction():
+        for core in _CORE:
+            base = _bare(t[core])
+            await conn.execute(f"DROP TRIGGER IF EXISTS pmig_capture ON {base}")
+            await conn.execute(f"DROP TRIGGER IF EXISTS pmig_capture_truncate ON {base}")
+            await conn.execute(f"DROP TABLE IF EXISTS {base}_new CASCADE")
+            await conn.execute(f"DROP TABLE IF EXISTS {_log_table(space_id, core)}")
+            await conn.execute(f"DROP FUNCTION IF EXISTS {_capture_fn(space_id, core)}()")
+        await conn.execute(f"DROP TABLE IF EXISTS {_state_table(space_id)}")
+    logger.info("abort_online_migration(%s): discarded", space_id)
@@ -1,7 +1,7 @@
 """Bulk resync of all auxiliary tables for a space.
 
 Call after bulk loads, disaster recovery, or manual DB edits.
-Rebuilds edge, frame_entity, and stats tables from scratch,
+Rebuilds edge, frame_entity, stats and declared property tables from scratch,
 runs ANALYZE on all space tables, and invalidates the stats cache.
 """
 
@@ -52,6 +52,17 @@ async def resync_all_auxiliary_tables(conn, space_id: str) -> Dict[str, int]:
         logger.warning("resync_all(%s): edge fan-out skipped (%s)",
                        space_id, exc)
 
+    # 3c. Declared property tables. A rebuild also re-evaluates each table's
+    # status, so this is how a 'building' or 'degraded' table is recovered
+    # after the data behind it has been fixed.
+    ptab_rows = 0
+    try:
+        from .sync_property_table import resync_property_tables
+        ptab_rows = await resync_property_tables(conn, space_id)
+    except Exception as exc:
+        logger.warning("resync_all(%s): property tables skipped (%s)",
+                       space_id, exc)
+
     # 4. Geo table — extract lat/lon from existing quads
     geo_points = 0
     try:
@@ -116,6 +127,7 @@ async def resync_all_auxiliary_tables(conn, space_id: str) -> Dict[str, int]:
         'pred_stats_rows': stats['pred_stats'],
         'quad_stats_rows': stats['quad_stats'],
         'edge_fanout_rows': fanout_rows,
+        'property_table_rows': ptab_rows,
         'geo_points': geo_points,
     }
     logger.info("resync_all_auxiliary_tables(%s): %s", space_id, result)
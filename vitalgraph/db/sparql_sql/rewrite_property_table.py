@@ -0,0 +1,266 @@
+"""Property-table rewrite for v2 IR — collapses a typed subject's property
+quads into one row of a declared {space}_ptab_{name} table.
+
+The pattern detected, for a ready declaration (type_predicate, type_uri,
+columns):
+
+    type quad:      ?s <type_predicate> <type_uri>
+    property quads: ?s <column.predicate> ?o_i      (or a constant object)
+
+all in the same BGP, all scoped to the same constant graph. Each group is
+replaced by one table:
+
+    {space}_ptab_{name}(subject_uuid, context_uuid, {col}_uuid, ...)
+
+so a listing over N properties scans one narrow, type-only table instead of
+N+1 quad self-joins. Property quads are kept as an inner join, hence the
+``{col}_uuid IS NOT NULL`` added for each one: a subject without the property
+has a row here but no match in the BGP.
+
+Preconditions, each of which is why a shape is declined rather than
+approximated:
+
+- The declaration is 'ready'. 'degraded' means a declared property turned out
+  multi-valued; a row holds one value, so the rewrite would drop the rest.
+- Every quad in a group has the same constant context constraint, and no
+  GRAPH variable. A row is per (subject, graph); quads matched across graphs
+  are a different relation.
+- The predicate of every grouped quad is a constant, and each column is used
+  at most once per group. ``?s name ?a . ?s name ?b`` is a self-join the
+  table cannot express, so the second quad stays a quad.
+"""
+
+from __future__ import annotations
+
+import copy
+import logging
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from .ir import PlanV2, TableRef, AliasGenerator, KIND_BGP
+
+logger = logging.getLogger(__name__)
+
+# Perf A/B switch (scripts/perf_shape_matrix.py --property-table): the
+# declarations stay maintained, only the rewrite is bypassed.
+ENABLED = True
+
+_PRED_RE = re.compile(r"(\w+)\.predicate_uuid\s*=\s*__CONST_(c_\d+)__")
+_OBJ_RE = re.compile(r"(\w+)\.object_uuid\s*=\s*__CONST_(c_\d+)__")
+_REF_RE = re.compile(r"(?<![A-Za-z0-9_])([A-Za-z_]\w*)\.(\w+)")
+_TAUTOLOGY_RE = re.compile(r"^\s*([\w.]+)\s*=\s*([\w.]+)\s*$")
+
+
+def rewrite_property_table(plan: PlanV2, aliases: AliasGenerator,
+                           space_id: str, defs) -> PlanV2:
+    """Rewrite a v2 plan to read declared property tables where possible.
+
+    ``defs`` are the ready PropertyTableDef declarations of the space (see
+    ensure_property_table.ensure_property_tables).
+    """
+    if not ENABLED or not defs:
+        return plan
+
+    if plan.kind != KIND_BGP or not plan.tables:
+        for i, child in enumerate(plan.children):
+            plan.children[i] = rewrite_property_table(child, aliases,
+                                                      space_id, defs)
+        return plan
+
+    original_plan = copy.deepcopy(plan)
+    rewritten = _rewrite_bgp(plan, aliases, space_id, defs)
+    return rewritten if rewritten is not None else original_plan
+
+
+def _rewrite_bgp(plan: PlanV2, aliases: AliasGenerator, space_id: str,
+                 defs) -> Optional[PlanV2]:
+    """Rewrite one BGP in place.  Returns None to decline."""
+    # --- Step 1: Constant reverse map, per-quad predicate/object URIs ---
+    const_to_uri: Dict[str, str] = {}
+    for (text, ttype), col_alias in aliases.constants.items():
+        if ttype == "U":
+            const_to_uri[col_alias] = text
+
+    quad_aliases = {t.alias for t in plan.tables if t.kind == "quad"}
+    quad_predicate: Dict[str, str] = {}
+    quad_obj_const: Dict[str, str] = {}
+    quad_ctx: Dict[str, Set[str]] = {a: set() for a in quad_aliases}
+
+    for owner, sql in plan.tagged_constraints:
+        if owner not in quad_aliases:
+            continue
+        m = _PRED_RE.search(sql)
+        if m and m.group(1) == owner:
+            quad_predicate[owner] = const_to_uri.get(m.group(2), "")
+        m = _OBJ_RE.search(sql)
+        if m and m.group(1) == owner:
+            quad_obj_const[owner] = const_to_uri.get(m.group(2), "")
+        if sql.startswith(f"{owner}.context_uuid"):
+            # Normalised so two quads' graph scoping can be compared.
+            quad_ctx[owner].add(sql.replace(f"{owner}.", "@."))
+
+    # --- Step 2: Subject variables; quads a group must not take ---
+    quad_subject_var: Dict[str, str] = {}
+    ineligible: Set[str] = set()
+    for var_name, slot in plan.var_slots.items():
+        for ref_id, col in slot.positions:
+            if ref_id not in quad_aliases:
+                continue
+            if col == "subject_uuid":
+                quad_subject_var[ref_id] = var_name
+            elif col in ("context_uuid", "predicate_uuid"):
+                ineligible.add(ref_id)
+
+    # --- Step 3: Match groups per declaration ---
+    used: Set[str] = set()
+    # alias → (pt alias, {old_col: new_col or None})
+    alias_map: Dict[str, Tuple[str, Dict[str, Optional[str]]]] = {}
+    new_tables: List[TableRef] = []
+    not_null: List[Tuple[str, str]] = []
+
+    for d in defs:
+        for tq in sorted(quad_aliases):
+            if tq in used or tq in ineligible:
+                continue
+            if (quad_predicate.get(tq) != d.type_predicate
+                    or quad_obj_const.get(tq) != d.type_uri):
+                continue
+            subj = quad_subject_var.get(tq)
+            ctx = frozenset(quad_ctx.get(tq, ()))
+            if not subj or not ctx:
+                continue
+
+            members: List[Tuple[str, str]] = []   # (quad alias, column)
+            taken_cols: Set[str] = set()
+            for q in sorted(quad_aliases):
+                if q == tq or q in used or q in ineligible:
+                    continue
+                if quad_subject_var.get(q) != subj:
+                    continue
+                if frozenset(quad_ctx.get(q, ())) != ctx:
+                    continue
+                col = d.column_for_predicate(quad_predicate.get(q, ""))
+                if col is None or col.column in taken_cols:
+                    continue
+                members.append((q, col.column))
+                taken_cols.add(col.column)
+
+            if not members:
+                continue
+
+            pt_alias = aliases.next("pt")
+            new_tables.append(TableRef(
+                ref_id=pt_alias, kind="property_table",
+                table_name=d.data_table(space_id), alias=pt_alias,
+            ))
+            used.add(tq)
+            alias_map[tq] = (pt_alias, {
+                "subject_uuid": "subject_uuid",
+                "predicate_uuid": None,
+                "object_uuid": None,
+                "context_uuid": "context_uuid",
+            })
+            for q, column in members:
+                used.add(q)
+                alias_map[q] = (pt_alias, {
+                    "subject_uuid": "subject_uuid",
+                    "predicate_uuid": None,
+                    "object_uuid": f"{column}_uuid",
+                    "context_uuid": "context_uuid",
+                })
+                not_null.append((pt_alias, f"{pt_alias}.{column}_uuid IS NOT NULL"))
+            logger.debug("property_table rewrite: %s + %d property quad(s) "
+                         "→ %s (%s)", tq, len(members), pt_alias, d.name)
+
+    if not alias_map:
+        return plan
+
+    # --- Step 4: Tables ---
+    kept: List[TableRef] = []
+    for t in plan.tables:
+        if t.alias in alias_map:
+            continue
+        if t.kind == "term" and t.join_col:
+            parts = t.join_col.split(".")
+            if len(parts) == 2 and parts[0] in alias_map:
+                new_alias, col_map = alias_map[parts[0]]
+                new_col = col_map.get(parts[1])
+                if not new_col:
+                    continue  # term join for a constant position — gone
+                t.join_col = f"{new_alias}.{new_col}"
+        kept.append(t)
+    plan.tables = new_tables + kept
+
+    # --- Step 5: Variable positions ---
+    for slot in plan.var_slots.values():
+        new_positions: List[Tuple[str, str]] = []
+        for ref_id, col in slot.positions:
+            if ref_id in alias_map:
+                new_alias, col_map = alias_map[ref_id]
+                new_col = col_map.get(col)
+                if new_col is None:
+                    return None  # a variable on a dropped column
+                pos = (new_alias, new_col)
+            else:
+                pos = (ref_id, col)
+            if pos not in new_positions:
+                new_positions.append(pos)
+        slot.positions = new_positions
+
+    # --- Step 6: Constraints ---
+    new_tagged: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for owner, sql in plan.tagged_constraints + not_null:
+        dropped = False
+
+        def _sub(m: "re.Match") -> str:
+            nonlocal dropped
+            a, col = m.group(1), m.group(2)
+            if a not in alias_map:
+                return m.group(0)
+            new_alias, col_map = alias_map[a]
+            new_col = col_map.get(col, col)
+            if new_col is None:
+                dropped = True
+                return m.group(0)
+            return f"{new_alias}.{new_col}"
+
+        new_sql = _REF_RE.sub(_sub, sql)
+        if dropped:
+            if owner in alias_map:
+                continue  # the quad's own predicate / type constant
+            logger.info("property_table rewrite: declining — %r references "
+                        "a collapsed quad position with no column", sql)
+            return None
+        m = _TAUTOLOGY_RE.match(new_sql)
+        if m and m.group(1) == m.group(2):
+            continue  # co-reference now inside one row
+        if new_sql in seen:
+            continue
+        seen.add(new_sql)
+        new_owner = alias_map[owner][0] if owner in alias_map else owner
+        new_tagged.append((new_owner, new_sql))
+
+    plan.tagged_constraints = new_tagged
+    plan.constraints = [sql for _, sql in new_tagged]
+
+    # --- Step 7: Structural leaf records (read by semijoin / reorder) ---
+    plan.leaf_terms = _remap_leaves(plan.leaf_terms, alias_map)
+    plan.range_leaves = _remap_leaves(plan.range_leaves, alias_map)
+
+    return plan
+
+
+def _remap_leaves(leaves: Dict, alias_map: Dict) -> Dict:
+    """Re-key (alias, col) leaf records onto the property table columns."""
+    out = {}
+    for (alias, col), v in (leaves or {}).items():
+        if alias in alias_map:
+            new_alias, col_map = alias_map[alias]
+            new_col = col_map.get(col)
+            if new_col is None:
+                continue
+            out[(new_alias, new_col)] = v
+        else:
+            out[(alias, col)] = v
+    return out
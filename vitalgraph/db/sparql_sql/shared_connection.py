@@ -0,0 +1,133 @@
+"""
+One connection and one transaction shared by a run of operations.
+
+The sparql_sql code takes a pool connection wherever it needs one —
+``db_impl.connection_pool.acquire()``, ``db_impl._pool``, the pipeline's
+``db_provider.get_pool()`` — and every write commits in its own
+transaction. A transactional batch needs all of its operations on ONE
+connection inside ONE transaction, without threading a connection through
+every handler.
+
+``shared_transaction(db_impl)`` opens that transaction and publishes it in
+a contextvar; while it is open, ``SparqlSQLDbImpl.connection_pool`` returns
+a ``SharedConnectionPool`` instead of the real pool, whose ``acquire()``
+hands out the transaction's connection. A handler's own
+``conn.transaction()`` then becomes a savepoint inside it. Tasks started
+inside the block inherit the contextvar, so they are serialized on the
+connection (an asyncpg connection runs one query at a time); re-acquiring
+from the task already holding it is allowed. Once the block ends the pool
+stand-in stops handing out the connection, so a background task that
+outlives the batch falls back to the real pool.
+
+What is read inside the block includes the transaction's own uncommitted
+writes, so the process-wide caches (entity graphs, counts, ETag
+validators) neither serve nor store anything while it is open:
+``in_shared_transaction`` is what they check.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+_shared: ContextVar[Optional["SharedConnectionPool"]] = ContextVar(
+    "sparql_sql_shared_connection", default=None)
+
+
+class SharedConnectionPool:
+    """Pool stand-in handing out one connection inside an open transaction."""
+
+    def __init__(self, owner, pool, connection) -> None:
+        self.owner = owner
+        self._pool = pool
+        self._connection = connection
+        self._lock = asyncio.Lock()
+        self._holder: Optional[asyncio.Task] = None
+        self._depth = 0
+        self.open = True
+
+    def acquire(self, *, timeout=None) -> "_SharedAcquire":
+        return _SharedAcquire(self, timeout)
+
+    async def release(self, connection, *, timeout=None) -> None:
+        if connection is self._connection:
+            self._exit()
+        else:
+            await self._pool.release(connection, timeout=timeout)
+
+    def __getattr__(self, name):
+        return getattr(self._pool, name)
+
+    async def _enter(self):
+        task = asyncio.current_task()
+        if self._holder is not task:
+            await self._lock.acquire()
+            self._holder = task
+        self._depth += 1
+        return self._connection
+
+    def _exit(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            self._holder = None
+            self._lock.release()
+
+
+class _SharedAcquire:
+    """``acquire()`` result: usable as ``async with`` or awaited, like asyncpg's."""
+
+    def __init__(self, shared: SharedConnectionPool, timeout) -> None:
+        self.shared = shared
+        self.timeout = timeout
+        self._fallback = None
+
+    async def __aenter__(self):
+        if not self.shared.open:
+            self._fallback = self.shared._pool.acquire(timeout=self.timeout)
+            return await self._fallback.__aenter__()
+        return await self.shared._enter()
+
+    async def __aexit__(self, *exc) -> None:
+        if self._fallback is not None:
+            await self._fallback.__aexit__(*exc)
+        else:
+            self.shared._exit()
+
+    def __await__(self):
+        if not self.shared.open:
+            return self.shared._pool.acquire(timeout=self.timeout).__await__()
+        return self.shared._enter().__await__()
+
+
+def in_shared_transaction() -> bool:
+    """True while this context runs inside an open shared transaction."""
+    shared = _shared.get()
+    return shared is not None and shared.open
+
+
+def shared_pool_for(owner, pool):
+    """What ``owner.connection_pool`` should hand out in this context."""
+    shared = _shared.get()
+    if shared is not None and shared.open and shared.owner is owner:
+        return shared
+    return pool
+
+
+@asynccontextmanager
+async def shared_transaction(owner, pool):
+    """Run the block with ``owner``'s connections on one transaction.
+
+    Commits when the block completes and rolls back when it raises.
+    """
+    if shared_pool_for(owner, pool) is not pool:
+        raise RuntimeError("A shared transaction is already open in this context")
+    async with pool.acquire() as connection:
+        async with connection.transaction():
+            shared = SharedConnectionPool(owner, pool, connection)
+            token = _shared.set(shared)
+            try:
+                yield shared
+            finally:
+                _shared.reset(token)
+                shared.open = False
@@ -123,7 +123,13 @@ class SparqlSQLAdmin(DbAdminInterface):
         # Ensure extensions + functions (idempotent — always runs)
         await db_impl.execute_update("CREATE EXTENSION IF NOT EXISTS pg_trgm")
         await db_impl.execute_update("CREATE EXTENSION IF NOT EXISTS pgcrypto")
+        had_vector = await db_impl.execute_query(
+            "SELECT 1 FROM pg_extension WHERE extname = 'vector'")
         await db_impl.execute_update("CREATE EXTENSION IF NOT EXISTS vector")
+        if not had_vector and getattr(db_impl, 'connection_pool', None) is not None:
+            # Pooled connections opened before the type existed have no
+            # binary vector codec; replace them.
+            await db_impl.connection_pool.expire_connections()
         await db_impl.execute_update("CREATE EXTENSION IF NOT EXISTS postgis")
         await db_impl.execute_update(_VITALGRAPH_TERM_UUID_DDL)
         await db_impl.execute_update(_VITALGRAPH_ISO_TO_UTC_DDL)
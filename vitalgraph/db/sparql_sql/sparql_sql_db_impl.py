@@ -18,6 +18,7 @@ import asyncpg
 from ..db_inf import DbImplInterface
 from ..user_management import UserManagementMixin
 from ...utils.resource_manager import track_pool
+from .shared_connection import shared_pool_for, shared_transaction
 
 logger = logging.getLogger(__name__)
 
@@ -86,12 +87,32 @@ class SparqlSQLDbImpl(UserManagementMixin, DbImplInterface):
 
     def __init__(self, postgresql_config: dict):
         self.config = postgresql_config
-        self.connection_pool: Optional[asyncpg.Pool] = None
+        self._connection_pool: Optional[asyncpg.Pool] = None
         self.connected = False
         self._signal_manager = None
 
         logger.info("SparqlSQLDbImpl initialized")
 
+    @property
+    def connection_pool(self) -> Optional[asyncpg.Pool]:
+        """The asyncpg pool — or, inside ``shared_transaction()``, the
+        stand-in handing out that transaction's connection."""
+        if self._connection_pool is None:
+            return None
+        return shared_pool_for(self, self._connection_pool)
+
+    @connection_pool.setter
+    def connection_pool(self, pool: Optional[asyncpg.Pool]) -> None:
+        self._connection_pool = pool
+
+    def shared_transaction(self):
+        """Async context manager running every operation in the block on one
+        connection and one transaction (transactional batches): commits when
+        the block completes, rolls back when it raises."""
+        if self._connection_pool is None:
+            raise RuntimeError("SparqlSQLDbImpl not connected — call connect() first")
+        return shared_transaction(self, self._connection_pool)
+
     @property
     def _pool(self) -> asyncpg.Pool:
         """Return connection_pool, raising if not connected."""
@@ -110,6 +131,8 @@ class SparqlSQLDbImpl(UserManagementMixin, DbImplInterface):
 
             import json as _json
 
+            from vitalgraph.db.vector_codec import register_vector_codec
+
             async def _init_conn(conn):
                 await conn.set_type_codec(
                     'jsonb', encoder=_json.dumps, decoder=_json.loads,
@@ -119,6 +142,9 @@ class SparqlSQLDbImpl(UserManagementMixin, DbImplInterface):
                     'json', encoder=_json.dumps, decoder=_json.loads,
                     schema='pg_catalog',
                 )
+                # Binary pgvector codec: embeddings as float32 ndarrays,
+                # not "[...]" text. No-op before CREATE EXTENSION.
+                await register_vector_codec(conn)
 
             from vitalgraph.db.pool import create_pool, DEFAULT_ACQUIRE_TIMEOUT
 
@@ -407,6 +407,51 @@ class SparqlSQLSchema:
                 metadata JSONB
             )
         '''),
+        ("sparql_shape_stats", '''
+            CREATE TABLE IF NOT EXISTS sparql_shape_stats (
+                space_id VARCHAR(255) NOT NULL REFERENCES space(space_id) ON DELETE CASCADE,
+                shape_hash VARCHAR(64) NOT NULL,
+                bucket_start TIMESTAMPTZ NOT NULL,
+                calls BIGINT NOT NULL DEFAULT 0,
+                rows_total BIGINT NOT NULL DEFAULT 0,
+                max_rows BIGINT NOT NULL DEFAULT 0,
+                stage_sum_ms DOUBLE PRECISION[] NOT NULL,
+                stage_hist BIGINT[] NOT NULL,
+                worst_total_ms DOUBLE PRECISION NOT NULL DEFAULT 0,
+                worst_sql TEXT,
+                worst_sparql TEXT,
+                first_seen TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                last_seen TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                PRIMARY KEY (space_id, shape_hash, bucket_start)
+            )
+        '''),
+        ("sparql_explain_log", '''
+            CREATE TABLE IF NOT EXISTS sparql_explain_log (
+                id BIGSERIAL PRIMARY KEY,
+                space_id VARCHAR(255) NOT NULL REFERENCES space(space_id) ON DELETE CASCADE,
+                shape_hash VARCHAR(64) NOT NULL,
+                captured_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                reason VARCHAR(20) NOT NULL,
+                plan_class VARCHAR(20) NOT NULL,
+                total_ms DOUBLE PRECISION,
+                exec_ms DOUBLE PRECISION,
+                ordered_scan BOOLEAN NOT NULL DEFAULT FALSE,
+                sql TEXT NOT NULL,
+                plan JSONB NOT NULL
+            )
+        '''),
+        ("sync_queue", '''
+            CREATE TABLE IF NOT EXISTS sync_queue (
+                space_id VARCHAR(255) NOT NULL REFERENCES space(space_id) ON DELETE CASCADE,
+                graph_uri TEXT NOT NULL,
+                subject_uri TEXT NOT NULL,
+                operation VARCHAR(10) NOT NULL,
+                enqueued_at TIMESTAMPTZ NOT NULL,
+                owner TEXT NOT NULL,
+                lease_until TIMESTAMPTZ NOT NULL,
+                PRIMARY KEY (space_id, graph_uri, subject_uri)
+            )
+        '''),
         ("import_export_job", '''
             CREATE TABLE IF NOT EXISTS import_export_job (
                 job_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -474,6 +519,14 @@ class SparqlSQLSchema:
         "CREATE INDEX IF NOT EXISTS idx_query_metrics_space_gran ON query_metrics(space_id, bucket_granularity, bucket_start DESC)",
         # Slow query log indexes
         "CREATE INDEX IF NOT EXISTS idx_slow_query_space_time ON slow_query_log(space_id, recorded_at DESC)",
+        # SPARQL query-shape stats indexes
+        "CREATE INDEX IF NOT EXISTS idx_shape_stats_time ON sparql_shape_stats(bucket_start DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_explain_log_shape ON sparql_explain_log(shape_hash, captured_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_explain_log_time ON sparql_explain_log(captured_at)",
+        # Auto-sync journal indexes
+        "CREATE INDEX IF NOT EXISTS idx_sync_queue_enqueued ON sync_queue(enqueued_at)",
+        "CREATE INDEX IF NOT EXISTS idx_sync_queue_lease ON sync_queue(lease_until)",
+        "CREATE INDEX IF NOT EXISTS idx_sync_queue_owner ON sync_queue(owner)",
         # Import/export job indexes
         "CREATE INDEX IF NOT EXISTS idx_iej_space_status ON import_export_job(space_id, status)",
         "CREATE INDEX IF NOT EXISTS idx_iej_created ON import_export_job(created_at DESC)",
@@ -493,7 +546,7 @@ class SparqlSQLSchema:
 
     # Reverse-dependency order for truncate / drop operations
     ADMIN_DROP_ORDER: List[str] = [
-        'import_export_job', 'slow_query_log', 'query_metrics', 'space_analytics', 'agent_change_log', 'agent_endpoint', 'agent', 'agent_type',
+        'import_export_job', 'sync_queue', 'sparql_explain_log', 'sparql_shape_stats', 'slow_query_log', 'query_metrics', 'space_analytics', 'agent_change_log', 'agent_endpoint', 'agent', 'agent_type',
         'process', 'graph', '"user"', 'space', 'install',
     ]
 
@@ -552,6 +605,15 @@ class SparqlSQLSchema:
             'search_mapping_index': f'{space_id}_search_mapping_index',
             'search_mapping_property': f'{space_id}_search_mapping_property',
             'fts_index': f'{space_id}_fts_index',
+            'property_table': f'{space_id}_property_table',
+            # Delete logs for catch-up export (bulk_export.enable_delta_tracking);
+            # created on demand, not by create_space_tables_sql.
+            'quad_tombstone': f'{space_id}_rdf_quad_tombstone',
+            'term_tombstone': f'{space_id}_term_tombstone',
+            # CDC feed (change_log.enable_change_log); opt-in, on demand.
+            'change_log': f'{space_id}_change_log',
+            # Orphan-term sweep cursor (term_gc); created by the first sweep.
+            'term_gc': f'{space_id}_term_gc',
         }
 
     # ------------------------------------------------------------------
@@ -907,8 +969,34 @@ class SparqlSQLSchema:
             )
         ''')
 
+        # 17. Property table registry (declared per-type wide tables; the
+        #     data tables themselves are {space}_ptab_{name}, created by
+        #     ensure_property_table.declare_property_table)
+        stmts.append(self.create_property_table_registry_sql(space_id))
+
         return stmts
 
+    @staticmethod
+    def create_property_table_registry_sql(space_id: str) -> str:
+        """DDL for the property table registry.
+
+        Separate from create_space_tables_sql because declaring the first
+        property table on a space created before the registry existed has to
+        create it on its own.
+        """
+        return f'''
+            CREATE TABLE IF NOT EXISTS {space_id}_property_table (
+                table_name          VARCHAR(64) PRIMARY KEY,
+                type_predicate_uri  TEXT NOT NULL,
+                type_uri            TEXT NOT NULL,
+                columns             JSONB NOT NULL,
+                status              VARCHAR(16) NOT NULL DEFAULT 'building',
+                status_time         TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_time        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                ready_time          TIMESTAMP
+            )
+        '''
+
     def create_space_indexes_sql(self, space_id: str) -> List[str]:
         """Return SQL statements to create indexes on per-space tables.
 
@@ -1076,6 +1164,11 @@ class SparqlSQLSchema:
             f"DROP TABLE IF EXISTS {t['search_mapping_index']} CASCADE",
             f"DROP TABLE IF EXISTS {t['search_mapping_property']} CASCADE",
             f"DROP TABLE IF EXISTS {t['search_mapping']} CASCADE",
+            f"DROP TABLE IF EXISTS {t['property_table']} CASCADE",
+            f"DROP TABLE IF EXISTS {t['quad_tombstone']} CASCADE",
+            f"DROP TABLE IF EXISTS {t['term_tombstone']} CASCADE",
+            f"DROP TABLE IF EXISTS {t['change_log']} CASCADE",
+            f"DROP TABLE IF EXISTS {t['term_gc']} CASCADE",
         ]
 
     def drop_space_indexes_sql(self, space_id: str) -> List[str]:
@@ -1202,17 +1295,19 @@ class SparqlSQLSchema:
         """Drop all per-space tables and views.
 
         In addition to the well-known tables, dynamically discovers and drops
-        any ``_vec_*`` and ``_fts_*`` data tables that were created by
-        vector/FTS index lifecycle operations.
+        any ``_vec_*``, ``_fts_*`` and ``_ptab_*`` data tables that were
+        created by vector/FTS index and property table lifecycle operations.
         """
-        # First drop dynamically-named data tables (_vec_*, _fts_*)
+        # First drop dynamically-named data tables (_vec_*, _fts_*, _ptab_*)
         # so foreign-key references don't block registry table drops.
         dynamic_rows = await conn.fetch(
             "SELECT table_name FROM information_schema.tables "
             "WHERE table_schema = 'public' "
-            "  AND (table_name LIKE $1 OR table_name LIKE $2)",
+            "  AND (table_name LIKE $1 OR table_name LIKE $2 "
+            "       OR table_name LIKE $3)",
             f"{space_id}_vec_%",
             f"{space_id}_fts_%",
+            f"{space_id}_ptab_%",
         )
         for row in dynamic_rows:
             tbl = row["table_name"]
@@ -1237,12 +1332,16 @@ class SparqlSQLSchema:
             f"DROP TABLE IF EXISTS {space_id}_document_segmentation_config CASCADE"
         )
 
-        # Also drop any trigger functions left by FTS data tables
+        # Also drop trigger functions left by FTS data tables, delete tracking
+        # (bulk_export) and an unfinished online partition migration
         fn_rows = await conn.fetch(
             "SELECT routine_name FROM information_schema.routines "
             "WHERE routine_schema = 'public' "
-            "  AND routine_name LIKE $1",
+            "  AND (routine_name LIKE $1 OR routine_name LIKE $2 "
+            "       OR routine_name LIKE $3)",
             f"{space_id}_fts_%_tsv_trigger",
+            f"{space_id}_delta_capture_%",
+            f"{space_id}_pmig_capture_%",
         )
         for row in fn_rows:
             await conn.execute(f"DROP FUNCTION IF EXISTS {row['routine_name']}() CASCADE")
@@ -1338,23 +1437,18 @@ class SparqlSQLSchema:
 
     def create_vector_data_table_sql(
         self, space_id: str, index_name: str, dimensions: int,
-        distance_metric: str = "cosine",
+        distance_metric: str = "cosine", storage: str = "vector",
     ) -> List[str]:
         """Return SQL to create a vector data table + indexes for a named index.
 
         Each registered vector index gets its own table with the correct
-        dimension and appropriate HNSW index.
+        dimension and appropriate HNSW index. ``storage`` (``vector``,
+        ``halfvec`` or ``binary``, from the index's provider_config) picks
+        what the HNSW index is built over; the table always stores the
+        full-precision vectors used for reranking.
         """
         table = self.vec_table_name(space_id, index_name)
 
-        # Map distance metric to pgvector ops class
-        ops_map = {
-            "cosine": "vector_cosine_ops",
-            "l2": "vector_l2_ops",
-            "inner_product": "vector_ip_ops",
-        }
-        ops_class = ops_map.get(distance_metric, "vector_cosine_ops")
-
         stmts = [
             f'''CREATE TABLE IF NOT EXISTS {table} (
                 subject_uuid    UUID NOT NULL,
@@ -1364,10 +1458,8 @@ class SparqlSQLSchema:
                 PRIMARY KEY (subject_uuid, context_uuid)
             )''',
             # HNSW index for ANN vector search
-            f'''CREATE INDEX IF NOT EXISTS idx_{space_id}_vec_{index_name}_hnsw
-                ON {table}
-                USING hnsw (embedding {ops_class})
-                WITH (m = 16, ef_construction = 200)''',
+            self.create_vector_hnsw_index_sql(
+                space_id, index_name, dimensions, distance_metric, storage),
             # Context index for graph-scoped queries
             f'''CREATE INDEX IF NOT EXISTS idx_{space_id}_vec_{index_name}_ctx
                 ON {table} (context_uuid)''',
@@ -1377,6 +1469,32 @@ class SparqlSQLSchema:
         ]
         return stmts
 
+    @staticmethod
+    def vec_hnsw_index_name(space_id: str, index_name: str) -> str:
+        """Return the name of a vector index's HNSW index."""
+        return f"idx_{space_id}_vec_{index_name}_hnsw"
+
+    def create_vector_hnsw_index_sql(
+        self, space_id: str, index_name: str, dimensions: int,
+        distance_metric: str = "cosine", storage: str = "vector",
+    ) -> str:
+        """Return SQL to create the HNSW index of a vector data table.
+
+        The index is on ``embedding`` for ``vector`` storage and on its
+        halfvec cast or binary quantization otherwise (see
+        vitalgraph/db/vector_storage.py). The name is the same for every
+        storage, so a storage change is a drop and a re-create.
+        """
+        from vitalgraph.db.vector_storage import hnsw_using_sql
+
+        table = self.vec_table_name(space_id, index_name)
+        return (
+            f'''CREATE INDEX IF NOT EXISTS {self.vec_hnsw_index_name(space_id, index_name)}
+                ON {table}
+                {hnsw_using_sql(storage, dimensions, distance_metric)}
+                WITH (m = 16, ef_construction = 200)'''
+        )
+
     def drop_vector_data_table_sql(self, space_id: str, index_name: str) -> List[str]:
         """Return SQL to drop a vector data table."""
         table = self.vec_table_name(space_id, index_name)
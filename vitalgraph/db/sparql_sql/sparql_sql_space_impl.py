@@ -26,6 +26,9 @@ from .sparql_sql_db_impl import SparqlSQLDbImpl
 from .sparql_sql_db_objects import SparqlSQLDbObjects
 from .sparql_sql_schema import SparqlSQLSchema, STANDARD_DATATYPES
 from .compile_cache import SparqlCompileCache
+from ...metrics.histograms import observe_sparql_timing
+from ...metrics.query_shape_stats import shape_stats
+from .auto_explain import auto_explain
 from .generator import invalidate_datatype_cache
 from . import db_provider
 
@@ -162,6 +165,48 @@ def _has_where_bound_delete(ops) -> bool:
     return False
 
 
+def _where_bound_write_predicates(ops) -> Optional[set]:
+    """Predicates written (inserted or deleted) with a variable subject.
+
+    Property tables are re-derived per subject, so a write whose subjects are
+    bound by a WHERE clause leaves rows the write path cannot name. Returns the
+    predicate URIs of those template quads so only the tables watching them
+    are rebuilt; None when such a quad's predicate is itself a variable, which
+    could touch any table. An empty set means every subject was concrete.
+
+    Graph operations other than a CLEAR/DROP of one named graph (COPY, MOVE,
+    ADD, CLEAR ALL/DEFAULT/NAMED) rewrite whole graphs without naming a
+    subject or predicate, so they return None too.
+    """
+    from ..jena_sparql.jena_types import (
+        URINode, UpdateDataInsert, UpdateDataDelete, UpdateModify,
+        UpdateDeleteWhere, UpdateClear, UpdateDrop, UpdateCopy, UpdateMove,
+        UpdateAdd,
+    )
+    preds: set = set()
+    for op in ops or []:
+        if isinstance(op, (UpdateCopy, UpdateMove, UpdateAdd)):
+            return None
+        if isinstance(op, (UpdateClear, UpdateDrop)):
+            if not _cleared_graphs_from_update_ops([op]):
+                return None
+            continue
+        if isinstance(op, (UpdateDataInsert, UpdateDataDelete, UpdateDeleteWhere)):
+            quads = getattr(op, 'quads', [])
+        elif isinstance(op, UpdateModify):
+            quads = (list(getattr(op, 'delete_quads', []))
+                     + list(getattr(op, 'insert_quads', [])))
+        else:
+            continue
+        for q in quads:
+            if isinstance(q.subject, URINode):
+                continue
+            if not isinstance(q.predicate, URINode):
+                return None
+            preds.add(q.predicate.value)
+    return preds
+
+
 def _concrete_predicates_from_update_ops(ops) -> set:
     """Predicate URIs an update inserts or deletes with, where concrete.
 
@@ -221,6 +266,61 @@ def _cleared_graphs_from_update_ops(ops) -> set:
     return graphs
 
 
+def _written_graphs_from_update_ops(ops) -> set:
+    """Named graphs an update writes to, as far as the ops name them.
+
+    Quad templates with a concrete graph, cleared or dropped graphs, and the
+    destination (and, for MOVE, the source) of COPY/MOVE/ADD. A template whose
+    graph is a variable, the default graph and `CLEAR ALL` name nothing here.
+    """
+    from ..jena_sparql.jena_types import (
+        URINode, UpdateDataInsert, UpdateDataDelete, UpdateModify,
+        UpdateDeleteWhere, UpdateCopy, UpdateMove, UpdateAdd,
+    )
+    graphs = set(_cleared_graphs_from_update_ops(ops))
+    for op in ops or []:
+        if isinstance(op, (UpdateCopy, UpdateMove, UpdateAdd)):
+            names = [op.dest] + ([op.source] if isinstance(op, UpdateMove) else [])
+            graphs.update(g for g in names
+                          if g and g not in ("DEFAULT", "NAMED", "ALL"))
+            continue
+        if isinstance(op, (UpdateDataInsert, UpdateDataDelete, UpdateDeleteWhere)):
+            quads = getattr(op, 'quads', [])
+        elif isinstance(op, UpdateModify):
+            quads = (list(getattr(op, 'delete_quads', []))
+                     + list(getattr(op, 'insert_quads', [])))
+        else:
+            continue
+        for q in quads:
+            if isinstance(q.graph, URINode):
+                graphs.add(q.graph.value)
+    return graphs
+
+
+async def _sync_property_tables_for_update(conn, space_id: str, ops) -> None:
+    """Bring declared property tables in line with an executed SPARQL update.
+
+    Runs in the update's transaction, after its SQL. Rows of a CLEARed or
+    DROPped named graph are deleted, concrete subjects are re-derived, and
+    a table the update may have changed in rows it cannot name is sent back
+    to 'building' so it stops serving rewrites until it is rebuilt.
+    """
+    from .sync_property_table import (
+        delete_property_rows_for_context, mark_property_tables_stale,
+        sync_property_tables,
+    )
+    for g_uri in _cleared_graphs_from_update_ops(ops):
+        await delete_property_rows_for_context(
+            conn, space_id, _generate_term_uuid(g_uri, 'U'))
+    subj_uris = _concrete_subjects_from_update_ops(ops)
+    if subj_uris:
+        await sync_property_tables(
+            conn, space_id, [_generate_term_uuid(u, 'U') for u in subj_uris])
+    stale_preds = _where_bound_write_predicates(ops)
+    if stale_preds is None or stale_preds:
+        await mark_property_tables_stale(conn, space_id, stale_preds)
+
+
 class _SparqlSQLGraphsAdapter:
     """Lightweight adapter so endpoint code can call ``db_space_impl.graphs.list_graphs()``
     and ``db_space_impl.graphs.get_graph()`` exactly like the fuseki_postgresql backend."""
@@ -310,10 +410,16 @@ class _SparqlSQLGraphsAdapter:
                     graph_uri,
                 )
                 if ctx_uuid:
-                    await conn.execute(
-                        f"DELETE FROM {t['rdf_quad']} WHERE context_uuid = $1",
-                        ctx_uuid,
-                    )
+                    # One transaction: the reset row must commit with the delete.
+                    async with conn.transaction():
+                        await conn.execute(
+                            f"DELETE FROM {t['rdf_quad']} WHERE context_uuid = $1",
+                            ctx_uuid,
+                        )
+                        from .sync_property_table import delete_property_rows_for_context
+                        await delete_property_rows_for_context(conn, space_id, ctx_uuid)
+                        from .change_log import append_graph_resets
+                        await append_graph_resets(conn, space_id, [ctx_uuid])
             # Invalidate entity graph + count cache (local, synchronous)
             try:
                 from ...cache.entity_graph_cache import _entity_graph_cache
@@ -330,6 +436,8 @@ class _SparqlSQLGraphsAdapter:
                     from vitalgraph.signal.signal_manager import SIGNAL_TYPE_UPDATED
                     await sm.notify_graphs_changed(SIGNAL_TYPE_UPDATED)
                     await sm.notify_graph_changed(graph_uri, SIGNAL_TYPE_UPDATED, space_id=space_id)
+                    # Graph-wide: flushes peers' entity graphs, counts and ETags.
+                    await sm.notify_entity_graphs_changed(space_id, graph_uri, [])
             except Exception as ne:
                 logger.debug("Graph clear notify failed (non-critical): %s", ne)
             return True
@@ -438,15 +546,25 @@ class _SparqlSQLDbOpsAdapter:
             graph_id = "main"
         t = self._impl.schema.get_table_names(space_id)
         removed = 0
+        deleted_rows: list = []
         async with self._impl._db._pool.acquire() as conn:
+          # One transaction: the change-log row must commit with the deletes.
+          async with conn.transaction():
             for uri in subject_uris:
                 s_uuid = _generate_term_uuid(uri, 'U')
-                result = await conn.execute(
-                    f"DELETE FROM {t['rdf_quad']} WHERE subject_uuid = $1",
+                rows = await conn.fetch(
+                    f"DELETE FROM {t['rdf_quad']} WHERE subject_uuid = $1 "
+                    f"RETURNING subject_uuid, predicate_uuid, object_uuid, context_uuid",
                     s_uuid,
                 )
-                if 'DELETE' in result:
-                    removed += 1
+                removed += 1
+                deleted_rows.extend(tuple(r) for r in rows)
+            from .sync_property_table import sync_property_tables
+            await sync_property_tables(
+                conn, space_id,
+                [_generate_term_uuid(uri, 'U') for uri in subject_uris])
+            from .change_log import append_changes
+            await append_changes(conn, space_id, 'D', deleted_rows)
         return removed
 
 
@@ -814,10 +932,16 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     graph_uri,
                 )
                 if ctx_uuid:
-                    await conn.execute(
-                        f"DELETE FROM {t['rdf_quad']} WHERE context_uuid = $1",
-                        ctx_uuid,
-                    )
+                    # One transaction: the reset row must commit with the delete.
+                    async with conn.transaction():
+                        await conn.execute(
+                            f"DELETE FROM {t['rdf_quad']} WHERE context_uuid = $1",
+                            ctx_uuid,
+                        )
+                        from .sync_property_table import delete_property_rows_for_context
+                        await delete_property_rows_for_context(conn, space_id, ctx_uuid)
+                        from .change_log import append_graph_resets
+                        await append_graph_resets(conn, space_id, [ctx_uuid])
             # Remove graph record
             await self._db.execute_query(
                 "DELETE FROM graph WHERE space_id = $1 AND graph_uri = $2",
@@ -838,6 +962,9 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     from vitalgraph.signal.signal_manager import SIGNAL_TYPE_DELETED
                     await sm.notify_graphs_changed(SIGNAL_TYPE_DELETED)
                     await sm.notify_graph_changed(graph_uri, SIGNAL_TYPE_DELETED, space_id=space_id)
+                    # Graph-wide: flushes peers' entity graphs, counts and ETags.
+                    await sm.notify_entity_graphs_changed(
+                        space_id, graph_uri, [], SIGNAL_TYPE_DELETED)
             except Exception as ne:
                 logger.debug("Graph deletion notify failed (non-critical): %s", ne)
             return True
@@ -917,7 +1044,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     p_uuid = await self._ensure_term(conn, t, p)
                     o_uuid = await self._ensure_term(conn, t, o)
                     g_uuid = await self._ensure_term(conn, t, g)
-                    await conn.execute(
+                    result = await conn.execute(
                         f"INSERT INTO {t['rdf_quad']} "
                         f"(subject_uuid, predicate_uuid, object_uuid, context_uuid) "
                         f"VALUES ($1, $2, $3, $4) ON CONFLICT DO NOTHING",
@@ -931,7 +1058,14 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     await sync_edge_table_after_insert(conn, space_id, [s_uuid])
                     from .sync_frame_entity_table import sync_frame_entity_after_edge_insert
                     await sync_frame_entity_after_edge_insert(conn, space_id, [s_uuid])
-            self._invalidate_counts_for_quads(space_id, [quad])
+                    from .sync_property_table import sync_property_tables
+                    await sync_property_tables(conn, space_id, [s_uuid])
+                    if result and result.split()[-1] != '0':
+                        # CDC feed last, like the batch path.
+                        from .change_log import append_changes
+                        await append_changes(conn, space_id, 'I',
+                                             [(s_uuid, p_uuid, o_uuid, g_uuid)])
+            await self._invalidate_counts_for_quads(space_id, [quad])
             return True
         except Exception as e:
             logger.error("add_rdf_quad(%s) failed: %s", space_id, e)
@@ -945,13 +1079,19 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
             o_uuid = _generate_term_uuid(o, self._infer_type(o))
             g_uuid = _generate_term_uuid(g, 'U')
             async with self._db._pool.acquire() as conn:
-                await conn.execute(
-                    f"DELETE FROM {t['rdf_quad']} "
-                    f"WHERE subject_uuid = $1 AND predicate_uuid = $2 "
-                    f"AND object_uuid = $3 AND context_uuid = $4",
-                    s_uuid, p_uuid, o_uuid, g_uuid,
-                )
-            self._invalidate_counts_for_quads(space_id, [(s, p, o, g)])
+                # One transaction: the change-log row must commit with the delete.
+                async with conn.transaction():
+                    from .sync_property_table import sync_property_tables
+                    from .change_log import delete_quads_logged
+                    await delete_quads_logged(
+                        conn, space_id,
+                        f"DELETE FROM {t['rdf_quad']} "
+                        f"WHERE subject_uuid = $1 AND predicate_uuid = $2 "
+                        f"AND object_uuid = $3 AND context_uuid = $4",
+                        s_uuid, p_uuid, o_uuid, g_uuid,
+                    )
+                    await sync_property_tables(conn, space_id, [s_uuid])
+            await self._invalidate_counts_for_quads(space_id, [(s, p, o, g)])
             return True
         except Exception as e:
             logger.error("remove_rdf_quad(%s) failed: %s", space_id, e)
@@ -1022,6 +1162,56 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
             return None
         return await self._table_row_estimate(table)
 
+    async def estimate_sparql_count(self, space_id: str, count_query: str) -> Optional[int]:
+        """Planner estimate of what a SPARQL COUNT query would return.
+
+        For ``count_mode=estimated``. The query is compiled and
+        translated as for execution, then only EXPLAINed: the cost is the
+        sidecar compile (usually a compile-cache hit) and planning, never the
+        scan. Returns None — caller falls back to a capped count — when the
+        SQL still holds vector / fuzzy / ANN placeholders, which are only
+        resolved by running their own lookups, or when anything fails.
+        """
+        try:
+            from ..jena_sparql.jena_ast_mapper import map_compile_response
+            from .count_mode import estimate_sql_count
+            from .generator import generate_sql
+
+            raw, _ = await _compile_cache.compile_with_key(count_query, self._get_sidecar_client())
+            cr = map_compile_response(raw)
+            if not cr.ok:
+                return None
+            async with self._db._pool.acquire() as conn:
+                gen = await generate_sql(cr, space_id, conn=conn)
+                if gen.vector_requests or gen.fuzzy_requests or gen.ann_requests:
+                    return None
+                return await estimate_sql_count(conn, gen.sql)
+        except Exception as e:
+            logger.debug("estimate_sparql_count(%s) failed: %s", space_id, e)
+            return None
+
+    async def estimate_pattern_count(self, space_id: str, predicate_uri: str,
+                                     object_uris: Optional[List[str]] = None) -> Optional[int]:
+        """Space-wide quads with a predicate (and object), from the stats tables."""
+        from .count_mode import pattern_count_estimate
+        try:
+            async with self._db._pool.acquire() as conn:
+                return await pattern_count_estimate(conn, space_id, predicate_uri, object_uris)
+        except Exception as e:
+            logger.debug("estimate_pattern_count(%s) failed: %s", space_id, e)
+            return None
+
+    async def estimate_frame_count(self, space_id: str,
+                                   graph_uri: Optional[str] = None) -> Optional[int]:
+        """Frames in a graph, from the planner's view of the frame_entity table."""
+        from .count_mode import frame_count_estimate
+        try:
+            async with self._db._pool.acquire() as conn:
+                return await frame_count_estimate(conn, space_id, graph_uri)
+        except Exception as e:
+            logger.debug("estimate_frame_count(%s) failed: %s", space_id, e)
+            return None
+
     async def get_rdf_quad_count(self, space_id: str,
                                   graph_uri: Optional[str] = None) -> int:
         """Exact quad count, CACHED — it is an unavoidable full count.
@@ -1092,9 +1282,9 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
             _count_cache.put(space_id, graph_uri, cache_key, count)
         return count
 
-    @staticmethod
-    def _invalidate_counts_for_quads(space_id: str, quads) -> None:
-        """Clear cached counts for every graph these quads touched.
+    async def _invalidate_counts_for_quads(self, space_id: str, quads) -> None:
+        """Clear cached counts for every graph these quads touched, here and
+        on every other instance.
 
         The counts behind the dashboard and the space pages are cached because
         an exact `COUNT(*)` over a graph is O(the graph). That is only sound if
@@ -1108,12 +1298,17 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
         against the real write path rather than calling `invalidate_graph`
         directly.
 
+        The ETag validators follow the count cache, so a peer instance that
+        kept them would answer 304 for an entity this write changed. One
+        graph-wide entity-graph NOTIFY per touched graph flushes them there
+        (the listener clears the graph's counts for any payload).
+
         Best effort: a cache failure must never fail a write that has already
         committed.
         """
+        contexts = set()
         try:
             from ...cache.count_cache import _count_cache
-            contexts = set()
             for q in quads or ():
                 if len(q) >= 4 and q[3] is not None:
                     contexts.add(str(q[3]))
@@ -1121,6 +1316,14 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 _count_cache.invalidate_graph(space_id, ctx)
         except Exception as e:      # pragma: no cover - defensive
             logger.debug("count cache invalidation skipped for %s: %s", space_id, e)
+        sm = self.get_signal_manager()
+        if not sm:
+            return
+        for ctx in contexts:
+            try:
+                await sm.notify_entity_graphs_changed(space_id, ctx, [])
+            except Exception as e:
+                logger.warning("Graph cache NOTIFY failed for %s/%s: %s", space_id, ctx, e)
 
     async def add_rdf_quads_batch(self, space_id: str,
                                    quads: List[Tuple[Identifier, Identifier, Identifier, Identifier]],
@@ -1165,6 +1368,8 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     await sync_edge_table_after_insert(conn, space_id, list(subjects))
                     from .sync_frame_entity_table import sync_frame_entity_after_edge_insert
                     await sync_frame_entity_after_edge_insert(conn, space_id, list(subjects))
+                    from .sync_property_table import sync_property_tables
+                    await sync_property_tables(conn, space_id, list(subjects))
                 # rdf_stats too. Only the BULK path synced these, so every quad
                 # written through this one left the planner's cardinality
                 # estimates behind — the same write-path gap as the edge table
@@ -1175,6 +1380,9 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 if inserted_rows:
                     from .sync_stats_tables import sync_stats_after_insert
                     await sync_stats_after_insert(conn, space_id, inserted_rows)
+                    # CDC feed last: it holds the space's log lock to commit.
+                    from .change_log import append_changes
+                    await append_changes(conn, space_id, 'I', inserted_rows)
 
             if connection:
                 # Caller owns the connection/transaction — don't open a nested one.
@@ -1187,7 +1395,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     async with conn.transaction():
                         await _do(conn)
 
-            self._invalidate_counts_for_quads(space_id, quads)
+            await self._invalidate_counts_for_quads(space_id, quads)
             return inserted
         except Exception as e:
             logger.error("add_rdf_quads_batch(%s) failed: %s", space_id, e)
@@ -1351,9 +1559,17 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     conn, space_id, unique_subjects)
                 _t5b = _time.monotonic()
 
+                # Declared property tables (no-op when the space has none)
+                from .sync_property_table import sync_property_tables
+                await sync_property_tables(conn, space_id, unique_subjects)
+
                 # Sync stats tables
                 from .sync_stats_tables import sync_stats_after_insert
                 await sync_stats_after_insert(conn, space_id, quad_rows)
+
+                # CDC feed last: it holds the space's log lock to commit.
+                from .change_log import append_changes
+                await append_changes(conn, space_id, 'I', quad_rows)
                 _t6 = _time.monotonic()
 
                 logger.info(
@@ -1379,7 +1595,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
             # Track row changes for auto-ANALYZE (outside transaction)
             from .auto_analyze import record_changes, maybe_analyze
             record_changes(space_id, count)
-            self._invalidate_counts_for_quads(space_id, quads)
+            await self._invalidate_counts_for_quads(space_id, quads)
             async with self._db._pool.acquire() as conn:
                 await maybe_analyze(conn, space_id, pg_config=self.postgresql_config)
             return count
@@ -1393,30 +1609,64 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
         """Return the subset of *uris* that already appear as subjects in *graph_id*.
 
         Uses a single SQL query with ``ANY($1)`` on an array of term UUIDs,
-        avoiding the SPARQL pipeline entirely.
+        avoiding the SPARQL pipeline entirely. The UUIDs are mapped back to
+        URIs here rather than by joining the term table.
         """
         if not uris:
             return []
         try:
             t = self.schema.get_table_names(space_id)
             # Generate deterministic UUIDs for all candidate URIs (all are URIRefs → type 'U')
-            uri_uuids = [_generate_term_uuid(uri, 'U') for uri in uris]
+            by_uuid = {_generate_term_uuid(uri, 'U'): uri for uri in uris}
             # Graph context UUID
             g_uuid = _generate_term_uuid(graph_id, 'U')
 
             async with self._db._pool.acquire() as conn:
                 rows = await conn.fetch(
-                    f"SELECT DISTINCT t.term_text "
-                    f"FROM {t['rdf_quad']} q "
-                    f"JOIN {t['term']} t ON t.term_uuid = q.subject_uuid "
-                    f"WHERE q.subject_uuid = ANY($1) AND q.context_uuid = $2",
-                    uri_uuids, g_uuid,
+                    f"SELECT DISTINCT subject_uuid FROM {t['rdf_quad']} "
+                    f"WHERE subject_uuid = ANY($1) AND context_uuid = $2",
+                    list(by_uuid), g_uuid,
                 )
-            return [row['term_text'] for row in rows]
+            return [by_uuid[row['subject_uuid']] for row in rows]
         except Exception as e:
             logger.error("check_subjects_exist(%s) failed: %s", space_id, e)
             return []
 
+    async def probe_subjects(self, space_id: str, graph_id: str, uris: List[str],
+                             type_uri: str, owner_predicate: str,
+                             owner_uri: Optional[str] = None) -> Dict[str, Tuple[bool, bool]]:
+        """Existence, type and owner of each subject in *graph_id*, in one probe.
+
+        Returns ``{uri: (has_type, owned)}`` for the *uris* that have any quad
+        in the graph: ``has_type`` when ``uri rdf:type type_uri`` is present,
+        ``owned`` when ``uri owner_predicate owner_uri`` is. One index-only
+        range scan of the (subject, …) primary key per URI, no term join —
+        the write-path validation layer (kg_impl/kg_write_validation) asks
+        this instead of one SPARQL ASK per object. Errors propagate so the
+        caller can fall back.
+        """
+        if not uris:
+            return {}
+        t = self.schema.get_table_names(space_id)
+        by_uuid = {_generate_term_uuid(uri, 'U'): uri for uri in uris}
+        async with self._db._pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT subject_uuid, "
+                f"bool_or(predicate_uuid = $3 AND object_uuid = $4) AS has_type, "
+                f"bool_or(predicate_uuid = $5 AND object_uuid = $6) AS owned "
+                f"FROM {t['rdf_quad']} "
+                f"WHERE subject_uuid = ANY($1::uuid[]) AND context_uuid = $2 "
+                f"GROUP BY subject_uuid",
+                list(by_uuid),
+                _generate_term_uuid(graph_id, 'U'),
+                _generate_term_uuid('http://www.w3.org/1999/02/22-rdf-syntax-ns#type', 'U'),
+                _generate_term_uuid(type_uri, 'U'),
+                _generate_term_uuid(owner_predicate, 'U'),
+                _generate_term_uuid(owner_uri, 'U') if owner_uri else None,
+            )
+        return {by_uuid[r['subject_uuid']]: (bool(r['has_type']), bool(r['owned']))
+                for r in rows}
+
     async def delete_entity_graph_bulk(self, space_id: str, graph_id: str,
                                        entity_uri: str) -> int:
         """Delete all quads belonging to an entity graph in one SQL operation.
@@ -1479,6 +1729,15 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                                       r['object_uuid'], r['context_uuid']) for r in deleted_rows]
                         await sync_stats_after_delete(conn, space_id, quad_rows)
 
+                    # Step 4: Property tables re-derive from what is left, so
+                    # this runs AFTER the delete, unlike edge/frame_entity.
+                    from .sync_property_table import sync_property_tables
+                    await sync_property_tables(conn, space_id, subject_uuids)
+
+                    if deleted_rows:
+                        from .change_log import append_changes
+                        await append_changes(conn, space_id, 'D', quad_rows)
+
             _t1 = _time.monotonic()
             logger.info(
                 "⏱️  BULK delete_entity_graph: %.3fs (%d subjects, %d quads, %d edges deleted)",
@@ -1574,6 +1833,15 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     f"AND object_uuid = $3 AND context_uuid = $4",
                     delete_rows,
                 )
+
+                # Property tables re-derive from the remaining quads: after the DELETE
+                from .sync_property_table import sync_property_tables
+                await sync_property_tables(conn, space_id, unique_subjects)
+
+                # CDC feed last: it holds the space's log lock to commit.
+                from .change_log import append_changes
+                await append_changes(conn, space_id, 'D', delete_rows)
+
                 _t1 = _time.monotonic()
                 logger.info("⏱️  BULK remove_quads: %.3fs (%d quads, %d edges)",
                             _t1 - _t0, len(delete_rows), edge_deleted)
@@ -1589,7 +1857,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
             # Track row changes for auto-ANALYZE (outside transaction)
             from .auto_analyze import record_changes, maybe_analyze
             record_changes(space_id, count)
-            self._invalidate_counts_for_quads(space_id, quads)
+            await self._invalidate_counts_for_quads(space_id, quads)
             async with self._db._pool.acquire() as conn:
                 await maybe_analyze(conn, space_id, pg_config=self.postgresql_config)
             return count
@@ -1602,6 +1870,8 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
         try:
             t = self.schema.get_table_names(space_id)
             removed = 0
+            removed_subjects = set()
+            removed_rows: list = []
             async with self._db._pool.acquire() as conn:
               # Atomic: run the multi-statement delete loop in one transaction so
               # a raise mid-loop rolls back cleanly rather than leaving the pooled
@@ -1632,7 +1902,14 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     )
                     if 'DELETE 1' in result:
                         removed += 1
-            self._invalidate_counts_for_quads(space_id, quads)
+                        removed_subjects.add(s_uuid)
+                        removed_rows.append((s_uuid, p_uuid, o_uuid, g_uuid))
+                if removed_subjects:
+                    from .sync_property_table import sync_property_tables
+                    await sync_property_tables(conn, space_id, list(removed_subjects))
+                    from .change_log import append_changes
+                    await append_changes(conn, space_id, 'D', removed_rows)
+            await self._invalidate_counts_for_quads(space_id, quads)
             return removed
         except Exception as e:
             logger.error("remove_rdf_quads_batch(%s) failed: %s", space_id, e)
@@ -1714,7 +1991,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
 
             t0 = _time.monotonic()
             client = self._get_sidecar_client()
-            raw = await _compile_cache.compile(query, client)
+            raw, shape_hash = await _compile_cache.compile_with_key(query, client)
             t_sidecar = _time.monotonic()
 
             cr = map_compile_response(raw)
@@ -1744,6 +2021,13 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     sql = await resolve_fuzzy_requests(
                         sql, gen.fuzzy_requests, space_id, conn)
 
+                # Filtered vector top-K: pick exact / iterative / over-fetch
+                # from selectivity and inline the result (vg_ann)
+                if gen.ann_requests:
+                    from .vg_ann import resolve_ann_requests
+                    sql = await resolve_ann_requests(
+                        sql, gen.ann_requests, space_id, conn, gen.vector_requests)
+
                 if 'ORDER BY' in query.upper() and 'MIN' in query.upper():
                     logger.info("DEBUG multi-value sort SQL:\n%s", sql)
 
@@ -1830,6 +2114,11 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 timing['sql_chars'],
             )
             logger.debug("Generated SQL [%s]:\n%s", space_id, sql)
+            shape_stats.record(space_id, shape_hash, timing, sql, query)
+            observe_sparql_timing(timing)
+            auto_explain.maybe_capture(
+                self._db._pool, space_id, shape_hash, sql, timing,
+                bool(gen.needs_ordered_scan))
 
             result = {
                 'results': {'bindings': bindings},
@@ -1837,6 +2126,7 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 'sql': sql,
                 'query_type': cr.meta.query_type,
                 'timing': timing,
+                'shape_hash': shape_hash,
             }
 
             # ASK answers from the EXISTS wrapper above, not from the bindings
@@ -1995,7 +2285,13 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 return False
 
             async with self._db._pool.acquire() as conn:
-                gen = await generate_sql(cr, space_id, conn=conn)
+                from .change_log import append_captured_changes, is_change_log_enabled
+                # With a change log, the update's SQL copies every quad it
+                # inserts or deletes (and each graph it resets) into a
+                # capture table, logged below in the same transaction.
+                log_changes = await is_change_log_enabled(conn, space_id)
+                gen = await generate_sql(cr, space_id, conn=conn,
+                                         capture_changes=log_changes)
                 sql = gen.sql
                 if sql:
                     # Atomic write: run the generated (multi-statement) update
@@ -2007,6 +2303,14 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                     # the pool (issue 019 defense-in-depth).
                     async with conn.transaction():
                         await conn.execute(sql)
+                        # Property tables have no background self-heal, so
+                        # they are kept in step inside the update's own
+                        # transaction: a sync failure fails the update rather
+                        # than leaving a 'ready' table serving stale rows.
+                        await _sync_property_tables_for_update(
+                            conn, space_id, cr.update_ops)
+                        if log_changes:
+                            await append_captured_changes(conn, space_id)
 
                     # Keep {space}_edge in sync — this write path bypasses the
                     # bulk sync. For every concrete subject the update touched:
@@ -2103,19 +2407,26 @@ class SparqlSQLSpaceImpl(SpaceBackendInterface, SparqlBackendInterface):
                 targets = _entity_graph_cache.collect_invalidation_targets(
                     cr.update_ops, space_id,
                 )
-                if targets:
+                by_graph: Dict[str, List[str]] = {}
+                for graph_id, entity_uri in targets:
+                    _entity_graph_cache.invalidate(space_id, graph_id, entity_uri)
+                    by_graph.setdefault(graph_id, []).append(entity_uri)
+                # A written graph with no locally cached entity still has
+                # counts and ETag validators here and on peers: flush it
+                # graph-wide (an empty URI list).
+                for graph_id in _written_graphs_from_update_ops(cr.update_ops):
+                    by_graph.setdefault(graph_id, [])
+                if by_graph:
                     from vitalgraph.cache.count_cache import _count_cache
                     sm = self._signal_manager or (
                         self.db_impl.get_signal_manager() if self.db_impl else None)
-                    _invalidated_graphs = set()
-                    for graph_id, entity_uri in targets:
-                        _entity_graph_cache.invalidate(space_id, graph_id, entity_uri)
-                        if graph_id not in _invalidated_graphs:
-                            _count_cache.invalidate_graph(space_id, graph_id)
-                            _invalidated_graphs.add(graph_id)
+                    # One count flush and one coalesced NOTIFY per graph,
+                    # not one of each per entity.
+                    for graph_id, entity_uris in by_graph.items():
+                        _count_cache.invalidate_graph(space_id, graph_id)
                         if sm:
-                            await sm.notify_entity_graph_changed(
-                                space_id, graph_id, entity_uri)
+                            await sm.notify_entity_graphs_changed(
+                                space_id, graph_id, entity_uris)
                     logger.debug(
                         "Entity+count cache: invalidated %d entries after SPARQL UPDATE",
                         len(targets))
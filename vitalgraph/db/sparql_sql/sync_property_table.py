@@ -0,0 +1,180 @@
+"""Incremental sync for declared {space}_ptab_{name} property tables.
+
+Called after quad inserts and after quad deletes with the touched subject
+UUIDs. A property table row is a pure function of the subject's quads in one
+graph, so sync is "recompute the row": delete the subjects' rows, then
+re-derive them from rdf_quad. That is the same statement for inserts,
+deletes and updates, and it cannot leave a stale column behind the way a
+per-column patch could. All functions accept an asyncpg connection that is
+already inside a transaction, after the quad change has been applied.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from typing import List, Optional, Tuple
+
+from .ensure_property_table import (
+    PropertyTableDef, STATUS_BUILDING, STATUS_DEGRADED, load_property_tables,
+    set_property_table_status, uri_uuid,
+)
+from .sync_edge_table import chunk_uuids
+
+logger = logging.getLogger(__name__)
+
+
+def _derive_sql(space_id: str, d: PropertyTableDef,
+                subject_param: Optional[str] = None) -> str:
+    """INSERT … SELECT that derives rows for a property table from rdf_quad.
+
+    Every column comes from ``(array_agg(x) FILTER (WHERE pred = p))[1]``
+    over the same grouped rows, so the ``_uuid``/``_text``/typed columns of
+    one property always describe the same quad. ``overflow`` records a
+    subject with two values for a declared property — the row still gets
+    one of them, and the caller marks the table degraded. The statement
+    returns (n, overflow) counts.
+
+    UUIDs are deterministic, so they are inlined as literals: the planner
+    then sees constants it can estimate instead of parameters.
+    """
+    t_quad = f"{space_id}_rdf_quad"
+    t_term = f"{space_id}_term"
+    table = d.data_table(space_id)
+
+    insert_cols = ["subject_uuid", "context_uuid"]
+    select_cols = ["ty.subject_uuid", "ty.context_uuid"]
+    overflow_terms = []
+    pred_literals = []
+    for c in d.columns:
+        pred = f"'{uri_uuid(c.predicate)}'::uuid"
+        pred_literals.append(pred)
+        for name, _sql_type, src in c.value_columns():
+            src_expr = "p.object_uuid" if src == "object_uuid" else f"t.{src}"
+            insert_cols.append(name)
+            select_cols.append(
+                f"(array_agg({src_expr}) FILTER "
+                f"(WHERE p.predicate_uuid = {pred}))[1]")
+        overflow_terms.append(
+            f"count(*) FILTER (WHERE p.predicate_uuid = {pred}) > 1")
+    insert_cols.append("overflow")
+    select_cols.append("(" + " OR ".join(overflow_terms) + ")")
+
+    subject_filter = (f"\n              AND ty.subject_uuid = ANY({subject_param})"
+                      if subject_param else "")
+    select_list = ",\n                   ".join(select_cols)
+    # Counted in the statement rather than returned row by row: a full
+    # rebuild writes one row per typed subject in the space.
+    return f"""
+            WITH ins AS (
+            INSERT INTO {table} ({", ".join(insert_cols)})
+            SELECT {select_list}
+            FROM {t_quad} ty
+            LEFT JOIN {t_quad} p
+                ON p.subject_uuid = ty.subject_uuid
+                AND p.context_uuid = ty.context_uuid
+                AND p.predicate_uuid IN ({", ".join(pred_literals)})
+            LEFT JOIN {t_term} t ON t.term_uuid = p.object_uuid
+            WHERE ty.predicate_uuid = '{uri_uuid(d.type_predicate)}'::uuid
+              AND ty.object_uuid = '{uri_uuid(d.type_uri)}'::uuid{subject_filter}
+            GROUP BY ty.subject_uuid, ty.context_uuid
+            RETURNING overflow
+            )
+            SELECT count(*) AS n, count(*) FILTER (WHERE overflow) AS overflow
+            FROM ins
+        """
+
+
+async def sync_property_tables(
+    conn,
+    space_id: str,
+    subject_uuids: List[uuid.UUID],
+) -> int:
+    """Re-derive the property table rows of the given subjects.
+
+    Call after the quad change is applied — inserts, deletes and updates are
+    all the same operation here. A subject that lost its type quad simply
+    gets no row back. Returns the number of rows written across all
+    declared tables.
+    """
+    if not subject_uuids:
+        return 0
+    defs = await load_property_tables(conn, space_id)
+    if not defs:
+        return 0
+
+    written = 0
+    for d in defs:
+        table = d.data_table(space_id)
+        overflow = 0
+        sql = _derive_sql(space_id, d, subject_param="$1")
+        for chunk in chunk_uuids(list(subject_uuids)):
+            await conn.execute(
+                f"DELETE FROM {table} WHERE subject_uuid = ANY($1)", chunk)
+            row = await conn.fetchrow(sql, chunk)
+            written += row["n"]
+            overflow += row["overflow"]
+        if overflow and d.status != STATUS_DEGRADED:
+            logger.warning(
+                "sync_property_tables(%s): %d subject(s) now have more than "
+                "one value for a single-valued column of %s — marking it "
+                "degraded; rewrites will stop using it",
+                space_id, overflow, d.name)
+            await set_property_table_status(conn, space_id, d.name,
+                                            STATUS_DEGRADED)
+    return written
+
+
+async def rebuild_property_table(conn, space_id: str,
+                                 d: PropertyTableDef) -> Tuple[int, int]:
+    """Full rebuild of one property table.  Returns (rows, overflow_rows)."""
+    table = d.data_table(space_id)
+    await conn.execute(f"TRUNCATE {table}")
+    row = await conn.fetchrow(_derive_sql(space_id, d))
+    logger.info("rebuild_property_table(%s, %s): %d rows, %d overflow",
+                space_id, d.name, row["n"], row["overflow"])
+    return row["n"], row["overflow"]
+
+
+async def resync_property_tables(conn, space_id: str) -> int:
+    """Rebuild every declared property table of a space.  Returns total rows."""
+    from .ensure_property_table import rebuild_property_tables
+    counts = await rebuild_property_tables(conn, space_id)
+    return sum(counts.values())
+
+
+async def delete_property_rows_for_context(conn, space_id: str,
+                                           context_uuid) -> int:
+    """Drop every property table row of one graph (CLEAR / DROP GRAPH)."""
+    defs = await load_property_tables(conn, space_id)
+    deleted = 0
+    for d in defs:
+        result = await conn.execute(
+            f"DELETE FROM {d.data_table(space_id)} WHERE context_uuid = $1",
+            context_uuid)
+        deleted += int(result.split()[-1]) if result else 0
+    return deleted
+
+
+async def mark_property_tables_stale(conn, space_id: str,
+                                     predicates: Optional[set]) -> List[str]:
+    """Send tables touched by an un-enumerable write back to 'building'.
+
+    ``predicates`` are the predicate URIs written with a WHERE-bound subject;
+    None means a predicate was itself a variable, so every table is suspect.
+    Such a write changed rows sync cannot name, so the table stops serving
+    rewrites until the maintenance job rebuilds it (promote_property_tables).
+    Returns the names.
+    """
+    defs = await load_property_tables(conn, space_id)
+    stale = []
+    for d in defs:
+        watched = {d.type_predicate} | {c.predicate for c in d.columns}
+        if predicates is None or watched & predicates:
+            stale.append(d.name)
+    for name in stale:
+        await set_property_table_status(conn, space_id, name, STATUS_BUILDING)
+    if stale:
+        logger.info("mark_property_tables_stale(%s): %s will be rebuilt",
+                    space_id, stale)
+    return stale
@@ -0,0 +1,237 @@
+"""Orphan term garbage collection for {space}_term.
+
+The term dictionary only grows: deleting a quad never deletes its terms,
+because another quad may still use them and finding out costs four index
+probes. Entity replacement and document re-segmentation delete and
+rewrite large numbers of literals, so in a churn-heavy space most of the
+term table — and of its trigram GIN and numeric indexes, which every
+filter_pushdown text probe reads — can be rows nothing references.
+
+A sweep walks the term table in term_uuid order, ``chunk_size`` rows at a
+time, and for each chunk:
+
+1. **Scan**, without locks: which terms of the chunk no rdf_quad row uses,
+   as an anti-join on each of the four positions (each has an index).
+2. **Delete**, in a short transaction: lock ``term`` and ``rdf_quad`` in
+   SHARE ROW EXCLUSIVE mode, re-check the candidates, delete the ones
+   still unreferenced.
+
+The lock is what makes deleting a deterministic-UUID term safe. A writer
+reuses an existing term by upserting it with ON CONFLICT DO NOTHING, which
+neither changes nor locks the row, and only later inserts the quad that
+references it. A GC that deleted in between would leave that quad
+pointing at nothing. But the upsert takes ROW EXCLUSIVE on the term
+*table*, held to commit: acquiring SHARE ROW EXCLUSIVE waits until every
+such writer has committed (its quads are then visible to the re-check)
+and holds new ones off until the delete commits (they then re-insert the
+term). rdf_quad is locked too, for writers that reference a term they
+read from an existing quad without upserting it — SPARQL
+``INSERT … WHERE``. Writers are held for one chunk's DELETE, a few
+milliseconds. The locks are taken with a short ``lock_timeout``, below
+PostgreSQL's deadlock_timeout, so a GC that queues behind a long write
+gives up the chunk — and never a user transaction to the deadlock
+detector.
+
+Sweeps are resumable: the cursor lives in ``{space}_term_gc`` and is
+advanced after every chunk, so a sweep spans as many job runs as its
+budget requires and survives restarts. Deleted terms reach the delete log
+of a delta export (bulk_export.enable_delta_tracking) through its trigger
+like any other delete; the space a delete frees is reused after VACUUM,
+which the maintenance job schedules from the dead-tuple count.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from .sparql_sql_schema import SparqlSQLSchema
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE_DEFAULT = 5_000
+# Kept below PostgreSQL's default deadlock_timeout (1s): see module doc.
+LOCK_TIMEOUT_MS_DEFAULT = 500
+
+_QUAD_POSITIONS = ("subject_uuid", "predicate_uuid", "object_uuid", "context_uuid")
+
+
+def _unreferenced_sql(alias: str, quad_table: str) -> str:
+    """Predicate: term ``alias`` appears in no position of any quad."""
+    return " AND ".join(
+        f"NOT EXISTS (SELECT 1 FROM {quad_table} q WHERE q.{col} = {alias}.term_uuid)"
+        for col in _QUAD_POSITIONS)
+
+
+def create_term_gc_state_sql(space_id: str) -> str:
+    t = SparqlSQLSchema.get_table_names(space_id)
+    return f"""
+        CREATE TABLE IF NOT EXISTS {t['term_gc']} (
+            id              SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            cursor_uuid     UUID,
+            sweep_started   TIMESTAMPTZ,
+            sweep_scanned   BIGINT NOT NULL DEFAULT 0,
+            sweep_deleted   BIGINT NOT NULL DEFAULT 0,
+            sweep_bytes     BIGINT NOT NULL DEFAULT 0,
+            sweeps_done     INTEGER NOT NULL DEFAULT 0,
+            last_sweep_end  TIMESTAMPTZ,
+            last_sweep_deleted BIGINT,
+            last_sweep_bytes   BIGINT
+        )
+    """
+
+
+async def _load_state(conn, space_id: str) -> Dict[str, object]:
+    t = SparqlSQLSchema.get_table_names(space_id)
+    await conn.execute(create_term_gc_state_sql(space_id))
+    await conn.execute(
+        f"INSERT INTO {t['term_gc']} (id) VALUES (1) ON CONFLICT DO NOTHING")
+    return dict(await conn.fetchrow(f"SELECT * FROM {t['term_gc']}"))
+
+
+async def get_term_gc_state(conn, space_id: str) -> Optional[Dict[str, object]]:
+    """The space's sweep cursor and totals, or None if GC never ran."""
+    t = SparqlSQLSchema.get_table_names(space_id)
+    if not await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", t['term_gc']):
+        return None
+    row = await conn.fetchrow(f"SELECT * FROM {t['term_gc']}")
+    return dict(row) if row else None
+
+
+async def scan_chunk(conn, space_id: str, after: Optional[uuid.UUID],
+                     chunk_size: int) -> Tuple[Optional[uuid.UUID], int, List[uuid.UUID]]:
+    """Read one chunk of terms after ``after``; return (last, scanned, orphans).
+
+    ``last`` is None once the chunk comes back empty — the sweep is done.
+    """
+    t = SparqlSQLSchema.get_table_names(space_id)
+    after_clause = "WHERE term_uuid > $1" if after is not None else "WHERE $1::uuid IS NULL"
+    rows = await conn.fetch(
+        f"""
+        WITH chunk AS (
+            SELECT term_uuid FROM {t['term']} {after_clause}
+            ORDER BY term_uuid LIMIT $2
+        )
+        SELECT c.term_uuid, ({_unreferenced_sql('c', t['rdf_quad'])}) AS orphan
+        FROM chunk c ORDER BY c.term_uuid
+        """,
+        after, chunk_size)
+    if not rows:
+        return None, 0, []
+    return rows[-1]["term_uuid"], len(rows), [r["term_uuid"] for r in rows if r["orphan"]]
+
+
+async def delete_orphans(conn, space_id: str, candidates: List[uuid.UUID],
+                         lock_timeout_ms: int = LOCK_TIMEOUT_MS_DEFAULT
+                         ) -> Optional[Tuple[int, int]]:
+    """Delete the candidates still unreferenced. Returns (rows, bytes).
+
+    Returns None when the locks could not be had within ``lock_timeout_ms``;
+    the caller leaves its cursor where it was and retries the chunk later.
+    """
+    if not candidates:
+        return 0, 0
+    import asyncpg
+
+    t = SparqlSQLSchema.get_table_names(space_id)
+    try:
+        async with conn.transaction():
+            await conn.execute(f"SET LOCAL lock_timeout = '{int(lock_timeout_ms)}ms'")
+            await conn.execute(
+                f"LOCK TABLE {t['term']}, {t['rdf_quad']} IN SHARE ROW EXCLUSIVE MODE")
+            row = await conn.fetchrow(
+                f"""
+                WITH gone AS (
+                    DELETE FROM {t['term']} tm
+                    WHERE tm.term_uuid = ANY($1::uuid[])
+                      AND {_unreferenced_sql('tm', t['rdf_quad'])}
+                    RETURNING pg_column_size(tm.*) AS nbytes
+                )
+                SELECT count(*) AS n, COALESCE(sum(nbytes), 0) AS nbytes FROM gone
+                """,
+                candidates)
+    except asyncpg.exceptions.LockNotAvailableError:
+        logger.info("term GC(%s): term/quad tables busy, chunk deferred", space_id)
+        return None
+    return row["n"], int(row["nbytes"])
+
+
+async def _term_relation_bytes(conn, space_id: str) -> int:
+    t = SparqlSQLSchema.get_table_names(space_id)
+    return await conn.fetchval(
+        "SELECT pg_total_relation_size($1::regclass)", t['term']) or 0
+
+
+async def sweep_orphan_terms(conn, space_id: str, *,
+                             chunk_size: int = CHUNK_SIZE_DEFAULT,
+                             max_chunks: Optional[int] = None,
+                             time_budget_s: Optional[float] = None,
+                             lock_timeout_ms: int = LOCK_TIMEOUT_MS_DEFAULT,
+                             ) -> Dict[str, object]:
+    """Advance the space's term sweep by up to ``max_chunks`` / ``time_budget_s``.
+
+    Picks up at the stored cursor and saves it after every chunk. Returns
+    this call's counts — ``bytes_reclaimed`` is the summed size of the
+    deleted term tuples (index entries come on top) — plus whether the
+    sweep finished, and the sweep-wide totals when it did.
+    """
+    t = SparqlSQLSchema.get_table_names(space_id)
+    state = await _load_state(conn, space_id)
+    cursor = state["cursor_uuid"]
+    if cursor is None and not state["sweep_started"]:
+        await conn.execute(
+            f"UPDATE {t['term_gc']} SET sweep_started = now(), sweep_scanned = 0, "
+            f"sweep_deleted = 0, sweep_bytes = 0")
+
+    started = time.monotonic()
+    size_before = await _term_relation_bytes(conn, space_id)
+    result = {"space_id": space_id, "chunks": 0, "scanned": 0, "candidates": 0,
+              "deleted": 0, "bytes_reclaimed": 0, "deferred_chunks": 0,
+              "sweep_complete": False}
+
+    while True:
+        if max_chunks is not None and result["chunks"] >= max_chunks:
+            break
+        if time_budget_s is not None and time.monotonic() - started >= time_budget_s:
+            break
+        last, scanned, orphans = await scan_chunk(conn, space_id, cursor, chunk_size)
+        if last is None:
+            result["sweep_complete"] = True
+            break
+        deleted = await delete_orphans(conn, space_id, orphans, lock_timeout_ms)
+        if deleted is None:
+            result["deferred_chunks"] += 1
+            break   # the cursor stays; this chunk is retried next run
+        n, nbytes = deleted
+        result["chunks"] += 1
+        result["scanned"] += scanned
+        result["candidates"] += len(orphans)
+        result["deleted"] += n
+        result["bytes_reclaimed"] += nbytes
+        cursor = last
+        await conn.execute(
+            f"UPDATE {t['term_gc']} SET cursor_uuid = $1, "
+            f"sweep_scanned = sweep_scanned + $2, sweep_deleted = sweep_deleted + $3, "
+            f"sweep_bytes = sweep_bytes + $4",
+            cursor, scanned, n, nbytes)
+
+    if result["sweep_complete"]:
+        row = await conn.fetchrow(
+            f"UPDATE {t['term_gc']} SET cursor_uuid = NULL, sweep_started = NULL, "
+            f"sweeps_done = sweeps_done + 1, last_sweep_end = now(), "
+            f"last_sweep_deleted = sweep_deleted, last_sweep_bytes = sweep_bytes "
+            f"RETURNING last_sweep_deleted, last_sweep_bytes, sweep_scanned")
+        result["sweep_deleted"] = row["last_sweep_deleted"]
+        result["sweep_bytes_reclaimed"] = row["last_sweep_bytes"]
+        result["sweep_scanned"] = row["sweep_scanned"]
+
+    result["term_relation_bytes"] = size_before
+    result["elapsed_s"] = round(time.monotonic() - started, 3)
+    if result["deleted"]:
+        logger.info("term GC(%s): deleted %d of %d scanned term(s), %d bytes%s",
+                    space_id, result["deleted"], result["scanned"],
+                    result["bytes_reclaimed"],
+                    " — sweep complete" if result["sweep_complete"] else "")
+    return result
@@ -0,0 +1,354 @@
+"""
+Filtered approximate-nearest-neighbour top-K for vector-driving queries.
+
+vg_optimize turns ``ORDER BY DESC(?score) LIMIT K`` over a
+``vg:vectorSimilarity`` / ``vg:vectorNearby`` BIND into a subquery that
+lets the HNSW index drive::
+
+    SELECT subject_uuid, 1 - (embedding <=> q) FROM vec
+    WHERE subject_uuid IN (<child pattern>)
+    ORDER BY embedding <=> q LIMIT K
+
+KGQuery vector criteria nearly always have a child pattern that filters:
+an entity type, frame/slot criteria, a geo radius. A plain HNSW scan
+returns ``hnsw.ef_search`` (default 40) nearest rows and only *then*
+applies that filter, so a filter passing 2% of the table leaves on
+average under one of them — the query under-returns, silently. When the
+planner foresees that, it drops the index and computes the distance for
+every row instead, which is exact but linear in the table.
+
+Neither is right across selectivities, so the driving subquery is
+generated with a correct default between markers (``AnnRequest``) and
+``resolve_ann_requests`` — called after vectorization, like the fuzzy
+resolver — replaces it with the top-K computed in one of three modes:
+
+``exact``
+    Filter first, then compute the distance for each surviving row and
+    sort. Chosen when the filter is estimated to leave few rows
+    (``EXACT_MAX_ROWS``) or there is no HNSW index. Recall 1 by
+    construction; cost linear in the *filtered* set.
+``iterative``
+    pgvector >= 0.8 iterative index scan (``hnsw.iterative_scan =
+    relaxed_order``): the scan keeps walking the graph until enough rows
+    pass the filter, bounded by ``hnsw.max_scan_tuples``, which is sized
+    from the estimated selectivity. ``ef_search`` is raised to the
+    rerank candidate count.
+``overfetch``
+    Older pgvector: fetch ``K / selectivity`` candidates from an
+    unfiltered HNSW scan (``ef_search`` raised to match, capped at 1000),
+    filter them, and re-query with 4x the candidates while fewer than K
+    survive; past the cap, fall back to ``exact``.
+
+Both index modes end with an exact rerank: candidates are re-sorted by
+their full-precision distance before the LIMIT, which fixes the ordering
+``relaxed_order`` gives up and is what keeps a quantized index (halfvec,
+binary) usable as a candidate generator. For those the
+index scan orders by the indexed expression (``vector_storage``) and the
+candidate count is at least ``K * rerank_factor`` of the index.
+
+Selectivity comes from the planner: the estimated row count of the child
+pattern's distinct subjects against the vector table's ``reltuples``.
+That is one EXPLAIN (no execution) and one catalog lookup per query.
+
+The result is inlined as a ``VALUES`` list of at most K rows, so the
+outer query joins the child pattern to K known subjects. If anything
+goes wrong the default subquery is left in place.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from ...metrics.histograms import registry
+from ..vector_storage import STORAGE_VECTOR, index_distance_sql
+
+if TYPE_CHECKING:
+    from .vg_functions import AnnRequest, VectorRequest
+
+logger = logging.getLogger(__name__)
+
+EXACT_MAX_ROWS = 20_000
+OVERFETCH_FACTOR = 1.5
+RERANK_FACTOR = 2
+MIN_EF_SEARCH = 40
+MAX_EF_SEARCH = 1_000
+MIN_SCAN_TUPLES = 20_000
+MAX_SCAN_TUPLES = 2_000_000
+MAX_OVERFETCH_ROUNDS = 3
+
+ann_queries = registry.counter(
+    "vitalgraph_vector_ann_queries",
+    "Filtered vector top-K queries by execution mode.",
+    ("mode",),
+)
+ann_seconds = registry.histogram(
+    "vitalgraph_vector_ann_duration_seconds",
+    "Filtered vector top-K resolution time by execution mode.",
+    ("mode",),
+)
+
+
+@dataclass
+class AnnPlan:
+    """How one filtered top-K will be executed."""
+    mode: str                      # 'exact' | 'iterative' | 'overfetch'
+    candidates: int                # rows fetched from the index before rerank
+    ef_search: int = MIN_EF_SEARCH
+    max_scan_tuples: int = MIN_SCAN_TUPLES
+    selectivity: float = 1.0
+    settings: Dict[str, str] = field(default_factory=dict)
+
+
+def _version_tuple(version: Optional[str]) -> Tuple[int, ...]:
+    return tuple(int(p) for p in re.findall(r"\d+", version or "")[:3])
+
+
+def supports_iterative_scan(pgvector_version: Optional[str]) -> bool:
+    """pgvector 0.8.0 introduced ``hnsw.iterative_scan``."""
+    return _version_tuple(pgvector_version) >= (0, 8, 0)
+
+
+def choose_ann_plan(limit: int, table_rows: float, filter_rows: float,
+                    has_hnsw: bool, iterative: bool,
+                    rerank_factor: int = RERANK_FACTOR) -> AnnPlan:
+    """Pick the execution mode for a top-``limit`` over a filtered vector table.
+
+    ``table_rows`` / ``filter_rows`` are planner estimates (reltuples, and
+    the child pattern's distinct subjects). ``rerank_factor`` is the
+    minimum candidates per result row; quantized indexes raise it.
+    """
+    limit = max(1, int(limit))
+    rerank_factor = max(RERANK_FACTOR, int(rerank_factor))
+    if not has_hnsw or table_rows <= 0 or filter_rows <= EXACT_MAX_ROWS:
+        sel = min(1.0, filter_rows / table_rows) if table_rows > 0 else 1.0
+        return AnnPlan('exact', candidates=limit, selectivity=sel)
+
+    sel = max(min(1.0, filter_rows / table_rows), 1e-6)
+    needed = math.ceil(limit / sel * OVERFETCH_FACTOR)
+
+    if iterative:
+        candidates = limit * rerank_factor
+        ef = min(max(candidates, MIN_EF_SEARCH), MAX_EF_SEARCH)
+        scan = min(max(needed * 4, MIN_SCAN_TUPLES), MAX_SCAN_TUPLES)
+        return AnnPlan('iterative', candidates=candidates, ef_search=ef,
+                       max_scan_tuples=scan, selectivity=sel, settings={
+                           'hnsw.iterative_scan': 'relaxed_order',
+                           'hnsw.ef_search': str(ef),
+                           'hnsw.max_scan_tuples': str(scan),
+                       })
+
+    # Without iterative scans HNSW returns at most ef_search rows.
+    candidates = max(needed, limit * rerank_factor)
+    if candidates > MAX_EF_SEARCH:
+        return AnnPlan('exact', candidates=limit, selectivity=sel)
+    ef = max(candidates, MIN_EF_SEARCH)
+    return AnnPlan('overfetch', candidates=candidates, ef_search=ef, selectivity=sel,
+                   settings={'hnsw.ef_search': str(ef)})
+
+
+# ---------------------------------------------------------------------------
+# SQL
+# ---------------------------------------------------------------------------
+
+def _filter_sql(child_sql: str, uuid_col: str) -> str:
+    return (f"subject_uuid IN (SELECT {uuid_col} FROM ({child_sql}) AS __cs "
+            f"WHERE {uuid_col} IS NOT NULL)")
+
+
+def ann_top_k_sql(plan: AnnPlan, vec_table: str, child_sql: str, uuid_col: str,
+                  limit: int, ctx_clause: str = "", threshold: Optional[float] = None,
+                  vector_param: str = "$1::vector", storage: str = STORAGE_VECTOR,
+                  dimensions: Optional[int] = None) -> str:
+    """The top-K statement for ``plan``; returns (subject_uuid, score) rows.
+
+    The query vector is the bind parameter ``vector_param``. In the index
+    modes the candidate scan orders by the distance ``storage``'s HNSW
+    index serves; the rerank is always full precision. ``threshold`` is
+    applied here only in ``exact`` mode: the index modes return the
+    filtered top-K unthresholded and ``resolve_ann_request`` cuts it, so a
+    short result can be told apart from a short scan.
+    """
+    q = vector_param
+    flt = _filter_sql(child_sql, uuid_col)
+
+    if plan.mode == 'exact':
+        # Ordering on the score (not on ``embedding <=> q``) keeps the
+        # planner off the HNSW index: filter first, then sort exactly.
+        thr = (f" AND 1 - (embedding <=> {q}) > {float(threshold)}"
+               if threshold is not None else "")
+        return (
+            f"SELECT subject_uuid, 1 - (embedding <=> {q}) AS score "
+            f"FROM {vec_table} WHERE TRUE{ctx_clause}{thr} AND {flt} "
+            f"ORDER BY score DESC LIMIT {int(limit)}"
+        )
+
+    inner_filter = f" AND {flt}" if plan.mode == 'iterative' else ""
+    outer_filter = f" AND {flt}" if plan.mode == 'overfetch' else ""
+    return (
+        f"SELECT subject_uuid, 1 - dist AS score FROM ("
+        f"SELECT subject_uuid, embedding <=> {q} AS dist "
+        f"FROM {vec_table} WHERE TRUE{ctx_clause}{inner_filter} "
+        f"ORDER BY {index_distance_sql(storage, dimensions, q)} LIMIT {int(plan.candidates)}"
+        f") AS __ann WHERE TRUE{outer_filter} "
+        f"ORDER BY dist LIMIT {int(limit)}"
+    )
+
+
+def values_subquery(rows: Sequence[Tuple[Any, float]], score_alias: str = "__vg_score") -> str:
+    """Inline (subject_uuid, score) rows as the driving subquery."""
+    if not rows:
+        return f"SELECT NULL::uuid AS subject_uuid, NULL::float8 AS {score_alias} WHERE FALSE"
+    values = ", ".join(f"('{uuid}'::uuid, {float(score)!r}::float8)" for uuid, score in rows)
+    return f"SELECT * FROM (VALUES {values}) AS __vg_ann(subject_uuid, {score_alias})"
+
+
+def replace_marked(sql: str, req: 'AnnRequest', replacement: str) -> str:
+    """Replace the default subquery between ``req``'s markers."""
+    start = sql.find(req.begin_marker)
+    end = sql.find(req.end_marker, start)
+    if start < 0 or end < 0:
+        return sql
+    return sql[:start] + replacement + sql[end + len(req.end_marker):]
+
+
+# ---------------------------------------------------------------------------
+# Resolution
+# ---------------------------------------------------------------------------
+
+async def _table_stats(conn, vec_table: str) -> Tuple[float, bool, Optional[str]]:
+    row = await conn.fetchrow(
+        """
+        SELECT c.reltuples::float8 AS table_rows,
+               EXISTS (SELECT 1 FROM pg_index i
+                       JOIN pg_class ic ON ic.oid = i.indexrelid
+                       JOIN pg_am am ON am.oid = ic.relam
+                       WHERE i.indrelid = c.oid AND am.amname = 'hnsw') AS has_hnsw,
+               (SELECT extversion FROM pg_extension WHERE extname = 'vector') AS version
+        FROM pg_class c WHERE c.oid = to_regclass($1)
+        """,
+        vec_table,
+    )
+    if row is None:
+        return 0.0, False, None
+    return float(row['table_rows'] or 0), bool(row['has_hnsw']), row['version']
+
+
+async def estimate_rows(conn, sql: str) -> float:
+    """Planner row estimate for ``sql`` (EXPLAIN, nothing executed)."""
+    raw = await conn.fetchval("EXPLAIN (FORMAT JSON) " + sql)
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return float(plan[0]['Plan']['Plan Rows'])
+
+
+async def _run(conn, plan: AnnPlan, statement: str, vector) -> List[Tuple[Any, float]]:
+    from .sparql_sql_space_impl import _apply_read_fence
+    async with conn.transaction():
+        await _apply_read_fence(conn)
+        for name, value in plan.settings.items():
+            await conn.execute("SELECT set_config($1, $2, true)", name, value)
+        rows = await conn.fetch(statement, vector)
+    return [(r['subject_uuid'], float(r['score'])) for r in rows]
+
+
+def _query_vector(req: 'AnnRequest'):
+    if req.vector_literal is not None:
+        return req.vector_literal
+    if req.vector_request is not None and req.vector_request.embedding is not None:
+        return req.vector_request.embedding
+    return None
+
+
+async def resolve_ann_request(conn, req: 'AnnRequest', vector,
+                              vector_requests: Sequence['VectorRequest'] = ()) -> Tuple[str, AnnPlan, int]:
+    """Run ``req``'s top-K; returns (driving subquery, plan used, rounds)."""
+    from .vg_resolve import substitute_embedding
+    from ..vector_codec import vector_arg
+
+    child_sql = req.child_sql
+    for vr in vector_requests:
+        child_sql = substitute_embedding(child_sql, vr)
+    if '__VG_' in child_sql or '__VG_' in req.ctx_clause:
+        raise ValueError("child pattern has unresolved placeholders")
+
+    table_rows, has_hnsw, version = await _table_stats(conn, req.vec_table)
+    filter_rows = table_rows
+    if has_hnsw and table_rows > EXACT_MAX_ROWS:
+        filter_rows = await estimate_rows(
+            conn, f"SELECT DISTINCT {req.child_uuid_col} FROM ({child_sql}) AS __cs")
+    plan = choose_ann_plan(req.limit, table_rows, filter_rows, has_hnsw,
+                           supports_iterative_scan(version), req.rerank_factor)
+    param = await vector_arg(conn, vector)
+
+    rounds = 0
+    while True:
+        rounds += 1
+        statement = ann_top_k_sql(plan, req.vec_table, child_sql, req.child_uuid_col,
+                                  req.limit, req.ctx_clause, req.threshold,
+                                  storage=req.storage, dimensions=req.dimensions)
+        rows = await _run(conn, plan, statement, param)
+        if plan.mode == 'exact':
+            break
+        complete = len(rows) >= req.limit
+        if req.threshold is not None:
+            # Rows come back nearest first, so once one is at or below the
+            # threshold every row the scan did not reach would be too: fewer
+            # than K passing it is the answer, not a truncated scan.
+            complete = complete or (bool(rows) and rows[-1][1] <= req.threshold)
+            rows = [r for r in rows if r[1] > req.threshold]
+        if complete:
+            break
+        # Too few survived the filter. Widen an over-fetch; an iterative scan
+        # that ran out of max_scan_tuples, or an over-fetch at the cap, is
+        # answered exactly — the filtered set is evidently small.
+        if plan.mode == 'overfetch' and rounds < MAX_OVERFETCH_ROUNDS \
+                and plan.candidates * 4 <= MAX_EF_SEARCH:
+            plan.candidates *= 4
+            plan.ef_search = plan.candidates
+            plan.settings['hnsw.ef_search'] = str(plan.ef_search)
+        else:
+            plan = AnnPlan('exact', candidates=req.limit, selectivity=plan.selectivity)
+    return values_subquery(rows), plan, rounds
+
+
+async def resolve_ann_requests(
+    sql: str,
+    ann_requests: List['AnnRequest'],
+    space_id: str,
+    conn,
+    vector_requests: Sequence['VectorRequest'] = (),
+) -> str:
+    """Replace each filtered top-K default subquery with its resolved rows.
+
+    Must run after resolve_vector_requests (the query embeddings come from
+    it). A request that cannot be resolved keeps its default subquery.
+    """
+    for req in ann_requests:
+        if req.begin_marker not in sql:
+            continue
+        vector = _query_vector(req)
+        if vector is None:
+            continue
+        t0 = time.perf_counter()
+        try:
+            replacement, plan, rounds = await resolve_ann_request(
+                conn, req, vector, vector_requests)
+        except Exception as e:
+            logger.warning("Filtered ANN resolution failed for %s (space=%s), "
+                           "using the default subquery: %s", req.vec_table, space_id, e)
+            continue
+        elapsed = time.perf_counter() - t0
+        ann_queries.labels(plan.mode).inc()
+        ann_seconds.labels(plan.mode).observe(elapsed)
+        logger.info(
+            "Filtered ANN [%s] %s: mode=%s K=%d selectivity=%.4f candidates=%d "
+            "ef_search=%d rounds=%d %.1fms",
+            space_id, req.vec_table, plan.mode, req.limit, plan.selectivity,
+            plan.candidates, plan.ef_search, rounds, elapsed * 1000)
+        sql = replace_marked(sql, req, replacement)
+    return sql
@@ -37,6 +37,7 @@ import logging
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 
+from ..vector_storage import STORAGE_VECTOR, index_distance_sql, is_quantized
 from ..jena_sparql.jena_types import (
     ExprFunction, ExprVar, ExprValue, LiteralNode,
 )
@@ -143,6 +144,44 @@ class VectorRequest:
     search_text: str       # The raw text to vectorize
     index_name: str        # Which vector index (determines provider + dims)
     space_id: str          # Space for table lookup
+    # Set by resolve_vector_requests; read by filtered-ANN resolution,
+    # which binds the query vector rather than inlining it again.
+    embedding: Optional[object] = field(default=None, repr=False)
+
+
+@dataclass
+class AnnRequest:
+    """Records a filtered vector top-K that may be resolved ahead of execution.
+
+    The vector-driving subquery restricts the HNSW scan to subjects of the
+    child pattern. With a selective child that post-filters the index's
+    ``ef_search`` candidates down to fewer than K rows; with an unselective
+    one the planner may give up the index for an exact scan. The generated
+    SQL keeps a correct default subquery between ``begin_marker`` and
+    ``end_marker``; resolve_ann_requests (vg_ann) picks an execution mode
+    from selectivity estimates, runs the top-K itself and replaces the
+    marked subquery with the resulting (subject_uuid, score) rows.
+    """
+    placeholder: str       # Marker id, e.g. '__VG_ANN_0__'
+    vec_table: str         # {space}_vec_{index}
+    ctx_clause: str        # ' AND context_uuid = (...)' or ''
+    child_sql: str         # Pattern the top-K is restricted to
+    child_uuid_col: str    # Column of child_sql holding subject uuids
+    limit: int             # K
+    threshold: Optional[float] = None
+    vector_request: Optional[VectorRequest] = None   # vectorSimilarity
+    vector_literal: Optional[str] = None             # vectorNearby
+    storage: str = STORAGE_VECTOR                    # HNSW storage of vec_table
+    dimensions: Optional[int] = None
+    rerank_factor: int = 1
+
+    @property
+    def begin_marker(self) -> str:
+        return f"/*{self.placeholder}*/"
+
+    @property
+    def end_marker(self) -> str:
+        return f"/*{self.placeholder}END*/"
 
 
 @dataclass
@@ -606,6 +645,17 @@ def _resolve_index_name(mapping_name: str, index_type: str, ctx) -> str:
     return mapping_name
 
 
+def _index_storage(index_name: str, ctx) -> Tuple[str, Optional[int], int]:
+    """(storage, dimensions, rerank_factor) of a vector index.
+
+    From vector_index_meta, loaded at generation time; an index missing
+    there is treated as full-precision ``vector`` storage.
+    """
+    meta = getattr(ctx, 'vector_index_meta', {}).get(index_name) or {}
+    return (meta.get('storage', STORAGE_VECTOR), meta.get('dimensions'),
+            int(meta.get('rerank_factor', 1)))
+
+
 def vector_similarity_sql(
     expr: ExprFunction,
     ctx,
@@ -691,6 +741,7 @@ class VectorDrivingSQL:
     uuid_col: str          # column in child SQL to JOIN on (e.g. 'v0__uuid')
     score_alias: str       # column alias for the score in the join subquery
     vec_request: Optional[VectorRequest]  # non-None if needs vectorization
+    ann_request: Optional[AnnRequest] = None  # non-None when restricted to a child
 
 
 def vector_top_k_driving_sql(
@@ -738,9 +789,11 @@ def vector_top_k_driving_sql(
         )
 
     ctx_clause = _context_clause(ctx)
+    storage, dimensions, rerank_factor = _index_storage(resolved_vec_index, ctx)
+    quantized = is_quantized(storage) and bool(dimensions)
     # Remove leading " AND " for standalone WHERE
     where_parts = [f"TRUE{ctx_clause}"]
-    if threshold is not None:
+    if threshold is not None and not quantized:
         where_parts.append(f"1 - (embedding <=> {embedding_sql}) > {threshold}")
 
     # Filter to only subjects present in the child pattern so the top-K
@@ -755,19 +808,58 @@ def vector_top_k_driving_sql(
     where_sql = " AND ".join(where_parts)
 
     score_alias = "__vg_score"
-    join_subquery = (
-        f"SELECT subject_uuid, 1 - (embedding <=> {embedding_sql}) AS {score_alias} "
-        f"FROM {vec_table} "
-        f"WHERE {where_sql} "
-        f"ORDER BY embedding <=> {embedding_sql} "
-        f"LIMIT {limit}"
-    )
+    if quantized:
+        # The HNSW index is over halfvec / binary-quantized vectors: order by
+        # the indexed expression for K * rerank_factor candidates, then
+        # rerank those by full-precision distance.
+        threshold_sql = (f" WHERE 1 - (embedding <=> {embedding_sql}) > {threshold}"
+                         if threshold is not None else "")
+        join_subquery = (
+            f"SELECT subject_uuid, 1 - (embedding <=> {embedding_sql}) AS {score_alias} "
+            f"FROM (SELECT subject_uuid, embedding FROM {vec_table} "
+            f"WHERE {where_sql} "
+            f"ORDER BY {index_distance_sql(storage, dimensions, embedding_sql)} "
+            f"LIMIT {limit * rerank_factor}) AS __vq{threshold_sql} "
+            f"ORDER BY embedding <=> {embedding_sql} "
+            f"LIMIT {limit}"
+        )
+    else:
+        join_subquery = (
+            f"SELECT subject_uuid, 1 - (embedding <=> {embedding_sql}) AS {score_alias} "
+            f"FROM {vec_table} "
+            f"WHERE {where_sql} "
+            f"ORDER BY embedding <=> {embedding_sql} "
+            f"LIMIT {limit}"
+        )
+
+    # Restricted to a child pattern: this is a filtered ANN search, which
+    # a single HNSW scan answers badly at both ends of selectivity. Mark
+    # the subquery so resolve_ann_requests can substitute a top-K computed
+    # with the right mode; unresolved, the SQL above still runs as before.
+    ann_request = None
+    if child_sql and child_uuid_col:
+        ann_request = AnnRequest(
+            placeholder=f"__VG_ANN_{id(expr) % 100000}__",
+            vec_table=vec_table,
+            ctx_clause=ctx_clause,
+            child_sql=child_sql,
+            child_uuid_col=child_uuid_col,
+            limit=limit,
+            threshold=threshold,
+            vector_request=vec_request,
+            vector_literal=vargs.vector_literal,
+            storage=storage,
+            dimensions=dimensions,
+            rerank_factor=rerank_factor,
+        )
+        join_subquery = f"{ann_request.begin_marker}{join_subquery}{ann_request.end_marker}"
 
     return VectorDrivingSQL(
         join_subquery=join_subquery,
         uuid_col=uuid_col,
         score_alias=score_alias,
         vec_request=vec_request,
+        ann_request=ann_request,
     )
 
 
@@ -10,7 +10,9 @@ Detected patterns and their hints:
 1. **Vector/Text/Hybrid top-K** (SLICE → ORDER → … → EXTEND with vg:*)
    Hint on EXTEND: ``hints['vg_top_k'] = {'limit': N, 'direction': 'DESC'}``
    → emit uses index-driving subqueries (HNSW for vector, GIN for text)
-     instead of a correlated subquery per row.
+     instead of a correlated subquery per row. When that subquery is
+     restricted to a child pattern, vg_ann resolves it before execution
+     with a mode chosen from the filter's selectivity.
 
 2. **Filter threshold pushdown** (FILTER(?score > T) after BIND vg:…)
    Hint on EXTEND: ``hints['vg_threshold'] = 0.7``
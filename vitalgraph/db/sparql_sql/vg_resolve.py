@@ -29,6 +29,21 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def embedding_literal(embedding) -> str:
+    """pgvector text literal ``[0.1,0.2,...]`` for inlining into SQL."""
+    return "[" + ",".join(f"{v:.8f}" for v in embedding) + "]"
+
+
+def substitute_embedding(sql: str, vr: VectorRequest) -> str:
+    """Replace ``vr``'s placeholder in ``sql`` with its resolved embedding."""
+    if vr.embedding is None:
+        return sql
+    return sql.replace(
+        f"'{vr.placeholder}'::vector",
+        f"'{embedding_literal(vr.embedding)}'::vector",
+    )
+
+
 async def resolve_vector_requests(
     sql: str,
     vector_requests: List[VectorRequest],
@@ -82,13 +97,9 @@ async def resolve_vector_requests(
             )
 
             embedding = await provider.vectorize_text(vr.search_text)
+            vr.embedding = embedding
 
-            # Format as pgvector literal: '[0.1,0.2,...]'
-            vec_literal = "[" + ",".join(f"{v:.8f}" for v in embedding) + "]"
-            sql = sql.replace(
-                f"'{vr.placeholder}'::vector",
-                f"'{vec_literal}'::vector",
-            )
+            sql = substitute_embedding(sql, vr)
 
             logger.debug(
                 "Vectorized '%s' via %s/%s → %d dims for placeholder %s",
@@ -0,0 +1,229 @@
+"""Binary asyncpg codec for pgvector's ``vector`` type.
+
+Without a codec asyncpg exchanges ``vector`` as text, so every embedding
+written or queried was first rendered as ``"[0.0123,-0.0456,...]"`` — a
+Python ``str()`` per float, and a float32 widened to a Python float
+prints ~17 significant digits — and parsed back into floats by the
+server's ``vector_in``. For a 384-d model that is ~7.5 KB of text built
+and parsed per vector, on the hot path of every population batch and
+every similarity query.
+
+pgvector's binary send/recv format is simply::
+
+    uint16 dim | uint16 unused (0) | dim x float32, big-endian
+
+which a float32 NumPy array becomes with one ``astype('>f4')`` and a
+four-byte header: 1,540 bytes for 384 dimensions, no per-float Python
+work and no parsing server-side. ``register_vector_codec`` installs that
+codec on a connection; both backends' pools do it in their ``init`` hook.
+Once registered, ``$n::vector`` parameters take ndarrays (or lists) and
+``vector`` columns come back as float32 ndarrays.
+
+The pgvector Python package ships an equivalent codec, but its decoded
+types have changed across releases (lists, then ndarrays, then ``Vector``
+objects); this one is a dozen lines and fixes the contract at float32
+ndarrays, which is what the providers now return.
+
+Connections created before ``CREATE EXTENSION vector`` (or by pools this
+module did not set up, e.g. the CLI tools) have no codec.
+``ensure_vector_codec`` registers lazily and remembers which connections
+have one; ``vector_arg`` falls back to the text literal where the type
+does not exist, so callers never need to know which case they are in.
+
+Bulk writes use ``copy_upsert_vectors``: one binary COPY of the whole
+batch into a temporary staging table and one ``INSERT … SELECT … ON
+CONFLICT`` into the target, instead of one upsert round trip per row.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import weakref
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>HH')
+_BE_FLOAT32 = np.dtype('>f4')
+
+# Raw asyncpg connections that have the codec. Keyed on the underlying
+# connection, not the pool's per-acquire proxy, so a registration made by
+# the pool's ``init`` hook is seen by every later acquire.
+_registered: "weakref.WeakSet" = weakref.WeakSet()
+
+
+# ---------------------------------------------------------------------------
+# Codec
+# ---------------------------------------------------------------------------
+
+def as_float32(value: Any) -> np.ndarray:
+    """``value`` (ndarray, sequence or ``"[...]"`` literal) as a 1-d float32 array."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    arr = np.asarray(value, dtype=np.float32)
+    if arr.ndim != 1:
+        raise ValueError(f"vector must be 1-dimensional, got shape {arr.shape}")
+    return arr
+
+
+def encode_vector(value: Any) -> bytes:
+    """pgvector binary representation (``vector_recv`` input) of ``value``."""
+    arr = as_float32(value)
+    return _HEADER.pack(arr.shape[0], 0) + arr.astype(_BE_FLOAT32, copy=False).tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Float32 ndarray from pgvector's binary representation (``vector_send``)."""
+    dim, _ = _HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=_BE_FLOAT32, count=dim,
+                         offset=_HEADER.size).astype(np.float32)
+
+
+def vector_literal(value: Any) -> str:
+    """Text form ``[v1,v2,...]``, for connections without the codec and inline SQL."""
+    if isinstance(value, str):
+        return value
+    return "[" + ",".join(repr(float(v)) for v in as_float32(value)) + "]"
+
+
+# ---------------------------------------------------------------------------
+# Registration
+# ---------------------------------------------------------------------------
+
+def _raw(conn):
+    # Pool acquires hand out a PoolConnectionProxy wrapping the connection.
+    return getattr(conn, '_con', None) or conn
+
+
+async def register_vector_codec(conn) -> bool:
+    """Install the binary ``vector`` codec on ``conn``.
+
+    Returns False, without error, when the extension is not installed in
+    the database (yet) — the connection keeps exchanging text.
+    """
+    schema = await conn.fetchval(
+        "SELECT n.nspname FROM pg_type t "
+        "JOIN pg_namespace n ON n.oid = t.typnamespace "
+        "WHERE t.typname = 'vector' "
+        "AND EXISTS (SELECT 1 FROM pg_extension e WHERE e.extname = 'vector' "
+        "            AND e.extnamespace = t.typnamespace)")
+    if schema is None:
+        return False
+    await conn.set_type_codec(
+        'vector', schema=schema,
+        encoder=encode_vector, decoder=decode_vector, format='binary',
+    )
+    _registered.add(_raw(conn))
+    return True
+
+
+async def ensure_vector_codec(conn) -> bool:
+    """True if ``conn`` has the codec, registering it first if needed."""
+    if _raw(conn) in _registered:
+        return True
+    try:
+        return await register_vector_codec(conn)
+    except Exception as e:
+        logger.warning("vector codec registration failed, using text: %s", e)
+        return False
+
+
+async def vector_arg(conn, value: Any):
+    """Bind value for a ``$n::vector`` parameter on ``conn``.
+
+    The float32 array when the connection has the binary codec, else the
+    text literal.
+    """
+    if await ensure_vector_codec(conn):
+        return as_float32(value)
+    return vector_literal(value)
+
+
+# ---------------------------------------------------------------------------
+# Bulk upsert
+# ---------------------------------------------------------------------------
+
+async def copy_upsert_vectors(
+    conn,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Tuple],
+    *,
+    conflict_columns: Sequence[str],
+    vector_column: str = 'embedding',
+    update_columns: Optional[Sequence[str]] = None,
+    timestamp_column: Optional[str] = 'updated_time',
+) -> int:
+    """Upsert ``rows`` into ``table`` with one binary COPY and one INSERT.
+
+    ``rows`` are tuples in ``columns`` order, vectors as ndarrays or
+    sequences. The batch is COPYed into a session-local staging table
+    shaped like ``table`` and merged with ``INSERT … SELECT … ON CONFLICT
+    (conflict_columns) DO UPDATE``, setting ``update_columns`` (default:
+    every non-key column) and ``timestamp_column`` to CURRENT_TIMESTAMP.
+
+    Later rows win over earlier ones with the same key, as with a loop of
+    single-row upserts. Without the codec on ``conn`` (no binary format
+    for ``vector``) it falls back to ``executemany`` with text literals.
+
+    Returns:
+        Number of rows written.
+    """
+    columns = list(columns)
+    vec_pos = columns.index(vector_column)
+    if update_columns is None:
+        update_columns = [c for c in columns if c not in conflict_columns]
+    set_cols = list(update_columns)
+    ins_cols = list(columns)
+    if timestamp_column:
+        set_cols.append(timestamp_column)
+        ins_cols.append(timestamp_column)
+    set_sql = ", ".join(f"{c} = EXCLUDED.{c}" for c in set_cols)
+    conflict_sql = ", ".join(conflict_columns)
+
+    binary = await ensure_vector_codec(conn)
+    records: List[Tuple] = []
+    for row in rows:
+        row = list(row)
+        row[vec_pos] = as_float32(row[vec_pos]) if binary else vector_literal(row[vec_pos])
+        records.append(tuple(row))
+    if not records:
+        return 0
+
+    if not binary:
+        values = ", ".join(
+            f"${i + 1}::vector" if c == vector_column else f"${i + 1}"
+            for i, c in enumerate(columns))
+        if timestamp_column:
+            values += ", CURRENT_TIMESTAMP"
+        await conn.executemany(
+            f"INSERT INTO {table} ({', '.join(ins_cols)}) VALUES ({values}) "
+            f"ON CONFLICT ({conflict_sql}) DO UPDATE SET {set_sql}",
+            records)
+        return len(records)
+
+    stage = f"_vg_stage_{table}"
+    select_cols = ", ".join(columns)
+    if timestamp_column:
+        select_cols += ", CURRENT_TIMESTAMP"
+    async with conn.transaction():
+        # Column types come from the target; constraints deliberately not.
+        # ON COMMIT DELETE ROWS keeps the session-local table for the
+        # connection's next batch; TRUNCATE covers an enclosing transaction.
+        await conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS "
+            f"SELECT 0::bigint AS ord, {', '.join(columns)} FROM {table} WITH NO DATA")
+        await conn.execute(f"TRUNCATE {stage}")
+        await conn.copy_records_to_table(
+            stage, records=[(i, *r) for i, r in enumerate(records)],
+            columns=['ord', *columns])
+        await conn.execute(
+            f"INSERT INTO {table} ({', '.join(ins_cols)}) "
+            f"SELECT DISTINCT ON ({conflict_sql}) {select_cols} FROM {stage} "
+            f"ORDER BY {conflict_sql}, ord DESC "
+            f"ON CONFLICT ({conflict_sql}) DO UPDATE SET {set_sql}")
+    return len(records)
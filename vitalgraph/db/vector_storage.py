@@ -0,0 +1,155 @@
+"""Quantized HNSW storage for per-space vector indexes.
+
+Each ``{space}_vec_{index}`` table keeps full-precision ``vector(d)``
+embeddings and one HNSW index over them. HNSW only performs while its
+graph is in shared buffers / page cache, and the graph stores every
+vector it links: for 384 dimensions that is ~1.5 KB per node, so a
+10M-subject space needs an index of ~20 GB before the heap is counted,
+and a cold search reads the graph from disk a few pages per hop.
+
+pgvector (>= 0.7) can index an *expression* of the column, so the index
+can be quantized while the table keeps the exact vectors:
+
+``vector``   (default)
+    ``USING hnsw (embedding vector_cosine_ops)`` — as before.
+``halfvec``
+    ``USING hnsw ((embedding::halfvec(d)) halfvec_cosine_ops)`` — float16
+    components, half the index. Distances change in the third or fourth
+    significant digit, so neighbour order barely moves.
+``binary``
+    ``USING hnsw ((binary_quantize(embedding)::bit(d)) bit_hamming_ops)``
+    — one sign bit per component, 1/32 of the index, compared with
+    Hamming distance (XOR + popcount). Coarse: it finds the right
+    neighbourhood, not the right order inside it.
+
+A quantized index is only a candidate generator. Searches order by the
+indexed expression with a widened LIMIT (``K * rerank_factor``) and then
+rerank those candidates by the full-precision ``embedding <=> q`` before
+the real LIMIT K, so scores stay exact and recall is recovered from the
+candidate margin instead of from index precision.
+
+The mode is per index, in the ``{space}_vector_index`` row's
+``provider_config``::
+
+    {"storage": "binary", "rerank_factor": 8}
+
+Providers ignore keys they do not know, so the embedding side is
+unaffected. Changing the mode rebuilds the HNSW index only
+(``vector_index_lifecycle.set_index_storage``); the table and its
+embeddings are untouched.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Optional, Tuple
+
+STORAGE_VECTOR = "vector"
+STORAGE_HALFVEC = "halfvec"
+STORAGE_BINARY = "binary"
+STORAGE_MODES = (STORAGE_VECTOR, STORAGE_HALFVEC, STORAGE_BINARY)
+
+# Candidates fetched per result row before the exact rerank. Binary
+# quantization loses most of the order inside a neighbourhood, so it
+# needs the wider margin.
+DEFAULT_RERANK_FACTOR: Dict[str, int] = {
+    STORAGE_VECTOR: 1,
+    STORAGE_HALFVEC: 2,
+    STORAGE_BINARY: 8,
+}
+MAX_RERANK_FACTOR = 64
+
+# halfvec, bit_hamming_ops and binary_quantize() arrived in pgvector 0.7.0;
+# halfvec is limited to 4,000 dimensions in an index, bit to 64,000.
+MIN_PGVECTOR_VERSION = (0, 7, 0)
+MAX_HALFVEC_DIMENSIONS = 4_000
+MAX_BIT_DIMENSIONS = 64_000
+
+_OPS = {
+    STORAGE_VECTOR: {"cosine": "vector_cosine_ops", "l2": "vector_l2_ops",
+                     "inner_product": "vector_ip_ops"},
+    STORAGE_HALFVEC: {"cosine": "halfvec_cosine_ops", "l2": "halfvec_l2_ops",
+                      "inner_product": "halfvec_ip_ops"},
+}
+
+
+def storage_config(provider_config: Any) -> Tuple[str, int]:
+    """``(storage, rerank_factor)`` from a ``provider_config`` value.
+
+    Accepts the decoded dict or the raw JSON text (connections without
+    the jsonb codec). Raises ValueError for an unknown mode or a
+    non-positive factor.
+    """
+    config = provider_config
+    if isinstance(config, str):
+        config = json.loads(config) if config.strip() else {}
+    config = config or {}
+    storage = config.get("storage") or STORAGE_VECTOR
+    if storage not in STORAGE_MODES:
+        raise ValueError(
+            f"provider_config.storage must be one of {', '.join(STORAGE_MODES)}, "
+            f"got {storage!r}")
+    factor = config.get("rerank_factor")
+    if factor is None:
+        factor = DEFAULT_RERANK_FACTOR[storage]
+    factor = int(factor)
+    if not 1 <= factor <= MAX_RERANK_FACTOR:
+        raise ValueError(
+            f"provider_config.rerank_factor must be between 1 and {MAX_RERANK_FACTOR}")
+    return storage, factor
+
+
+def validate_storage(storage: str, dimensions: int) -> Optional[str]:
+    """Error message if ``storage`` cannot index ``dimensions``-wide vectors."""
+    if storage not in STORAGE_MODES:
+        return f"unknown vector storage {storage!r}"
+    if storage == STORAGE_HALFVEC and dimensions > MAX_HALFVEC_DIMENSIONS:
+        return f"halfvec indexes hold at most {MAX_HALFVEC_DIMENSIONS} dimensions"
+    if storage == STORAGE_BINARY and dimensions > MAX_BIT_DIMENSIONS:
+        return f"bit indexes hold at most {MAX_BIT_DIMENSIONS} dimensions"
+    return None
+
+
+def supports_quantized_storage(pgvector_version: Optional[str]) -> bool:
+    parts = tuple(int(p) for p in re.findall(r"\d+", pgvector_version or "")[:3])
+    return parts >= MIN_PGVECTOR_VERSION
+
+
+async def pgvector_version(conn) -> Optional[str]:
+    return await conn.fetchval(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+
+
+def hnsw_using_sql(storage: str, dimensions: int, distance_metric: str = "cosine") -> str:
+    """The ``USING hnsw (...)`` clause of the index for ``storage``."""
+    d = int(dimensions)
+    if storage == STORAGE_BINARY:
+        # Hamming distance whatever the metric; the rerank applies it.
+        return f"USING hnsw ((binary_quantize(embedding)::bit({d})) bit_hamming_ops)"
+    ops = _OPS.get(storage, _OPS[STORAGE_VECTOR])
+    ops_class = ops.get(distance_metric, ops["cosine"])
+    if storage == STORAGE_HALFVEC:
+        return f"USING hnsw ((embedding::halfvec({d})) {ops_class})"
+    return f"USING hnsw (embedding {ops_class})"
+
+
+def index_distance_sql(storage: str, dimensions: Optional[int], query_sql: str,
+                       column: str = "embedding") -> str:
+    """Distance expression the HNSW index for ``storage`` can serve.
+
+    Must match the indexed expression exactly for the planner to use the
+    index. Without known dimensions the full-precision distance is used:
+    correct, but not index-assisted for a quantized index.
+    """
+    if storage == STORAGE_HALFVEC and dimensions:
+        d = int(dimensions)
+        return f"{column}::halfvec({d}) <=> ({query_sql})::halfvec({d})"
+    if storage == STORAGE_BINARY and dimensions:
+        return (f"binary_quantize({column})::bit({int(dimensions)}) "
+                f"<~> binary_quantize({query_sql})")
+    return f"{column} <=> {query_sql}"
+
+
+def is_quantized(storage: Optional[str]) -> bool:
+    return storage in (STORAGE_HALFVEC, STORAGE_BINARY)
@@ -0,0 +1,116 @@
+"""
+Process pool for CPU-bound document work.
+
+Converting an upload to markdown (PDF / DOCX parsing) and segmenting a
+document (heading split plus a model-tokenizer pass over every candidate
+chunk) are pure CPU. Segmentation used to run directly on the event
+loop inside the worker, so one large document stalled every request the
+process was serving, and conversion ran in a thread that still competed
+for the GIL. Neither could use more than one core.
+
+``run_cpu(fn, *args)`` runs a picklable module-level function in a
+shared ``ProcessPoolExecutor``. The pool is created lazily on first use
+with the ``spawn`` start method — forking a process that holds asyncpg
+connections and an ONNX session is not safe — so each child imports
+what it needs once and keeps it (the local embedding model's tokenizer
+is loaded once per child, not per job).
+
+``VITALGRAPH_DOC_CPU_WORKERS`` sizes the pool (default: CPU count, at
+most 4). ``0`` disables it: work runs in ``asyncio.to_thread`` instead,
+which keeps it off the event loop but within one process — useful for
+small deployments and for tests.
+
+A child that dies (OOM on a huge PDF, a native crash in a parser) breaks
+the whole executor. The broken pool is discarded and the call raises
+``CPUWorkerCrashed``; the next call builds a fresh pool. The failed job
+is retried through the job table's normal attempt accounting rather
+than re-run in this process, where the same input could take the server
+down with it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_WORKERS = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+class CPUWorkerCrashed(RuntimeError):
+    """A pool process died while running a job."""
+
+
+def cpu_workers() -> int:
+    """Configured pool size; 0 means run CPU work in a thread instead."""
+    default = min(_DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+    raw = os.environ.get("VITALGRAPH_DOC_CPU_WORKERS")
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("VITALGRAPH_DOC_CPU_WORKERS=%r is not an integer; using %d",
+                       raw, default)
+        return default
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = cpu_workers()
+            if workers <= 0:
+                return None
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Document CPU pool started with %d process(es)", workers)
+        return _pool
+
+
+def _discard(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_cpu(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` in the document CPU pool (or a thread if disabled).
+
+    ``fn`` and its arguments must be picklable: a module-level function
+    and plain data.
+    """
+    pool = _get_pool()
+    if pool is None:
+        return await asyncio.to_thread(fn, *args)
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, fn, *args)
+    except BrokenProcessPool as e:
+        logger.error("Document CPU pool process died running %s; discarding the pool",
+                     getattr(fn, "__name__", fn))
+        _discard(pool)
+        raise CPUWorkerCrashed(f"CPU worker process died: {e}") from e
+
+
+def shutdown_cpu_pool(wait: bool = True) -> None:
+    """Stop the pool's processes. A later ``run_cpu`` starts a new pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
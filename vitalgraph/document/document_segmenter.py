@@ -4,12 +4,28 @@ Document segmentation engine.
 Splits document text into segments using either markdown heading-based
 splitting or plain recursive character splitting. Auto-detects markdown
 content when no method is explicitly specified.
+
+Splitting works on character offsets into the original text, against a
+token index built in one pass. The earlier splitter re-joined
+candidate chunks as strings and re-tokenized them at every recursion
+level, located each chunk with ``str.find`` from the start of its
+section, and merged segments by string concatenation, so a large document
+— a 500-page PDF converted to one markdown blob — took quadratic time:
+7 s for 5 MB, 25 s for 10 MB, 99 s for 20 MB. Now each distinct word is
+tokenized once, split points are chosen by binary search over separator
+positions using prefix token sums, and only emitted segments are measured
+with the real tokenizer. Time grows linearly with document size
+(tests/performance/test_segmenter_scaling.py).
 """
 
 import logging
 import re
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Union
+from itertools import chain
+from operator import methodcaller
+from typing import Callable, List, Optional, Tuple, Union
 
 from vitalgraph.document.segment_config import MarkdownSegmentConfig, PlainSplitConfig
 
@@ -18,6 +34,21 @@ logger = logging.getLogger(__name__)
 # Regex to detect markdown headings (used for auto-detection)
 _MARKDOWN_HEADING_RE = re.compile(r"^#{1,6}\s+", re.MULTILINE)
 
+# Split hierarchy: paragraphs → newlines → sentences → spaces.
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+_WORD_RE = re.compile(r"\S+")
+
+# No tokenizer in use averages more characters per token than this; a
+# section longer than limit × this cannot fit and need not be measured.
+_CHARS_PER_TOKEN_CEILING = 16
+
+# Cuts made in one segment whose real token count came out over the limit.
+_MAX_REFIT = 8
+
+# (start, end, content, token_length) of one chunk of the text.
+_Chunk = Tuple[int, int, str, int]
+
 
 @dataclass
 class SegmentResult:
@@ -38,6 +69,98 @@ def detect_is_markdown(text: str) -> bool:
     return len(matches) >= 2
 
 
+class _TokenIndex:
+    """Token counts for any character range of one text, from a single pass.
+
+    The text is cut into words (runs of non-whitespace). Each word is
+    weighted by the token count of itself plus the whitespace before it —
+    measured once per distinct string — and prefix sums over those weights
+    answer "how many tokens in text[a:b]" with two bisections. With the
+    default whitespace tokenizer every word is one token and the tokenizer
+    is never called.
+
+    Model tokenizers pre-split on whitespace, so a range's count is the sum
+    of its words' counts plus the model's fixed overhead (special tokens,
+    measured as ``tokenizer("")``). That holds closely, not exactly, which
+    is why emitted segments are re-measured (``DocumentSegmenter._fit``).
+
+    Built on first use: a document whose sections all fit never needs it.
+    Word boundaries are one flat array of 32-bit offsets, start and end
+    interleaved (sorted, so it bisects directly) — 8 bytes per word, plus
+    4 for the prefix sums with a model tokenizer.
+    """
+
+    def __init__(self, text: str, tokenizer: Optional[Callable[[str], int]] = None):
+        self.text = text
+        self._tokenizer = tokenizer
+        self._bounds: Optional[array] = None
+        self._prefix: Optional[array] = None
+        self._overhead = 0
+
+    def _build(self) -> array:
+        text = self.text
+        bounds = array("i", chain.from_iterable(
+            map(methodcaller("span"), _WORD_RE.finditer(text))))
+        tokenizer = self._tokenizer
+        if tokenizer is not None:
+            try:
+                self._overhead = max(0, int(tokenizer("")))
+            except Exception:
+                self._overhead = 0
+            overhead = self._overhead
+            weights: dict = {}
+            prefix = array("i", [0])
+            total = 0
+            prev = 0
+            for end in bounds[1::2]:
+                unit = text[prev:end]
+                weight = weights.get(unit)
+                if weight is None:
+                    weight = weights[unit] = max(0, tokenizer(unit) - overhead)
+                total += weight
+                prefix.append(total)
+                prev = end
+            self._prefix = prefix
+        self._bounds = bounds
+        return bounds
+
+    def _words(self, a: int, b: int) -> Tuple[int, int]:
+        """Index range [lo, hi) of the words intersecting text[a:b]."""
+        bounds = self._bounds if self._bounds is not None else self._build()
+        return bisect_right(bounds, a) // 2, (bisect_left(bounds, b) + 1) // 2
+
+    def count(self, a: int, b: int) -> int:
+        """Estimated token count of text[a:b]."""
+        if b <= a:
+            return 0
+        lo, hi = self._words(a, b)
+        if hi <= lo:
+            return 0
+        if self._prefix is None:
+            return hi - lo
+        return self._prefix[hi] - self._prefix[lo] + self._overhead
+
+    def tail_start(self, a: int, b: int, tokens: int) -> int:
+        """Offset where the last ``tokens`` tokens of text[a:b] begin."""
+        lo, hi = self._words(a, b)
+        if hi <= lo:
+            return b
+        if self._prefix is None:
+            i = hi - tokens
+        else:
+            i = bisect_right(self._prefix, self._prefix[hi] - tokens) - 1
+        return max(a, self._bounds[2 * max(lo, i)])
+
+
+def _strip(text: str, a: int, b: int) -> Tuple[int, int]:
+    """Offsets of text[a:b].strip() within text."""
+    while a < b and text[a].isspace():
+        a += 1
+    while b > a and text[b - 1].isspace():
+        b -= 1
+    return a, b
+
+
 class DocumentSegmenter:
     """
     Splits document text into segments using configured strategy.
@@ -65,6 +188,7 @@ class DocumentSegmenter:
                        more cannot produce segments the model would truncate.
         """
         self._tokenizer = tokenizer or self._default_tokenizer
+        self._whitespace = tokenizer is None
         self._max_input_tokens = max_input_tokens
         self._clamp_warned = False
 
@@ -120,6 +244,10 @@ class DocumentSegmenter:
         else:
             return self._segment_plain(text, config)
 
+    def _index(self, text: str) -> _TokenIndex:
+        """Token index for text; the default tokenizer needs no calls at all."""
+        return _TokenIndex(text, None if self._whitespace else self._tokenizer)
+
     # -------------------------------------------------------------------------
     # Markdown splitting
     # -------------------------------------------------------------------------
@@ -129,17 +257,31 @@ class DocumentSegmenter:
     ) -> List[SegmentResult]:
         """Split by markdown headings, then recursively split oversized sections."""
         sections = self._split_by_headings(text, config.heading_levels, config.preserve_heading)
+        index = self._index(text)
 
         results: List[SegmentResult] = []
+        # Content pieces per result; merged results are joined once at the end
+        # instead of re-concatenated (and re-tokenized) per merge.
+        pieces: List[List[str]] = []
         segment_index = 1
 
         for section in sections:
             section_text = section["content"]
             section_heading = section.get("heading")
-            token_count = self._tokenizer(section_text)
-
-            if token_count <= self._effective_max_tokens(config.max_segment_tokens):
-                if token_count >= config.min_segment_tokens:
+            start, end = _strip(text, section["start"], section["end"])
+            max_tokens = self._effective_max_tokens(config.max_segment_tokens)
+
+            # A section far longer than the limit is judged by the index, so
+            # a huge one is never tokenized whole; the rest are measured.
+            token_count = None
+            if len(section_text) > _CHARS_PER_TOKEN_CEILING * max_tokens:
+                token_count = index.count(start, end)
+            if token_count is None or token_count <= max_tokens:
+                token_count = self._tokenizer(section_text)
+
+            if token_count <= max_tokens:
+                if token_count >= config.min_segment_tokens or not results:
+                    # (a too-small first section is kept anyway)
                     results.append(SegmentResult(
                         content=section_text,
                         segment_index=segment_index,
@@ -149,60 +291,41 @@ class DocumentSegmenter:
                         segment_type_uri=config.segment_type_uri,
                         heading=section_heading,
                     ))
+                    pieces.append([section_text])
                     segment_index += 1
                 else:
-                    # Too small — merge with previous if possible
-                    if results:
-                        prev = results[-1]
-                        merged_content = prev.content + "\n\n" + section_text
-                        results[-1] = SegmentResult(
-                            content=merged_content,
-                            segment_index=prev.segment_index,
-                            start_char_offset=prev.start_char_offset,
-                            end_char_offset=section["end"],
-                            token_length=self._tokenizer(merged_content),
-                            segment_type_uri=prev.segment_type_uri,
-                            heading=prev.heading,
-                        )
-                    else:
-                        # First section is too small, keep it anyway
-                        results.append(SegmentResult(
-                            content=section_text,
-                            segment_index=segment_index,
-                            start_char_offset=section["start"],
-                            end_char_offset=section["end"],
-                            token_length=token_count,
-                            segment_type_uri=config.segment_type_uri,
-                            heading=section_heading,
-                        ))
-                        segment_index += 1
+                    # Too small — merge with previous
+                    results[-1].end_char_offset = section["end"]
+                    pieces[-1].append(section_text)
             else:
                 # Oversized section — recursive split
-                sub_chunks = self._recursive_split(
-                    section_text,
-                    self._effective_max_tokens(config.max_segment_tokens),
-                    config.overlap_tokens,
-                )
-                for chunk in sub_chunks:
-                    chunk_tokens = self._tokenizer(chunk)
+                for chunk_start, chunk_end, chunk, chunk_tokens in self._chunk(
+                    index, start, end, max_tokens, config.overlap_tokens,
+                ):
                     if chunk_tokens >= config.min_segment_tokens:
-                        # Calculate approximate char offset within section
-                        chunk_start = section["start"] + section_text.find(chunk)
                         results.append(SegmentResult(
                             content=chunk,
                             segment_index=segment_index,
                             start_char_offset=chunk_start,
-                            end_char_offset=chunk_start + len(chunk),
+                            end_char_offset=chunk_end,
                             token_length=chunk_tokens,
                             segment_type_uri="urn:segtype:paragraph",
                             heading=section_heading,
                         ))
+                        pieces.append([chunk])
                         segment_index += 1
 
-        # Re-index to ensure contiguous 1-based indexing
-        for i, result in enumerate(results):
-            result.segment_index = i + 1
+        return self._finish(results, pieces)
 
+    def _finish(
+        self, results: List[SegmentResult], pieces: List[List[str]]
+    ) -> List[SegmentResult]:
+        """Join merged segments and re-index to contiguous 1-based indexing."""
+        for i, (result, parts) in enumerate(zip(results, pieces)):
+            if len(parts) > 1:
+                result.content = "\n\n".join(parts)
+                result.token_length = self._tokenizer(result.content)
+            result.segment_index = i + 1
         return results
 
     def _split_by_headings(
@@ -296,48 +419,32 @@ class DocumentSegmenter:
         self, text: str, config: PlainSplitConfig
     ) -> List[SegmentResult]:
         """Split text using recursive character splitting."""
-        chunks = self._recursive_split(
-            text, self._effective_max_tokens(config.max_segment_tokens), config.overlap_tokens
+        index = self._index(text)
+        chunks = self._chunk(
+            index, 0, len(text),
+            self._effective_max_tokens(config.max_segment_tokens), config.overlap_tokens,
         )
 
         results: List[SegmentResult] = []
-        char_offset = 0
+        pieces: List[List[str]] = []
 
-        for i, chunk in enumerate(chunks):
-            token_count = self._tokenizer(chunk)
+        for start, end, chunk, token_count in chunks:
             if token_count < config.min_segment_tokens and results:
                 # Merge with previous
-                prev = results[-1]
-                merged = prev.content + "\n\n" + chunk
-                results[-1] = SegmentResult(
-                    content=merged,
-                    segment_index=prev.segment_index,
-                    start_char_offset=prev.start_char_offset,
-                    end_char_offset=char_offset + len(chunk),
-                    token_length=self._tokenizer(merged),
-                    segment_type_uri=config.segment_type_uri,
-                )
+                results[-1].end_char_offset = end
+                pieces[-1].append(chunk)
             else:
                 results.append(SegmentResult(
                     content=chunk,
-                    segment_index=i + 1,
-                    start_char_offset=char_offset,
-                    end_char_offset=char_offset + len(chunk),
+                    segment_index=len(results) + 1,
+                    start_char_offset=start,
+                    end_char_offset=end,
                     token_length=token_count,
                     segment_type_uri=config.segment_type_uri,
                 ))
-            # Track position (approximate due to overlap)
-            chunk_pos = text.find(chunk, char_offset)
-            if chunk_pos >= 0:
-                char_offset = chunk_pos + len(chunk)
-            else:
-                char_offset += len(chunk)
-
-        # Re-index
-        for i, result in enumerate(results):
-            result.segment_index = i + 1
+                pieces.append([chunk])
 
-        return results
+        return self._finish(results, pieces)
 
     # -------------------------------------------------------------------------
     # Recursive character splitter (shared utility)
@@ -352,86 +459,170 @@ class DocumentSegmenter:
 
         Split hierarchy: paragraphs → newlines → sentences → spaces.
         """
-        separators = ["\n\n", "\n", ". ", " "]
-        return self._split_recursive(text, separators, max_tokens, overlap_tokens)
-
-    def _split_recursive(
-        self, text: str, separators: List[str], max_tokens: int, overlap_tokens: int
-    ) -> List[str]:
-        """Recursive implementation of character text splitting."""
-        if not text.strip():
-            return []
+        index = self._index(text)
+        return [chunk for _, _, chunk, _ in
+                self._chunk(index, 0, len(text), max_tokens, overlap_tokens)]
+
+    def _chunk(
+        self, index: _TokenIndex, start: int, end: int,
+        max_tokens: int, overlap_tokens: int = 0,
+    ) -> List[_Chunk]:
+        """Split text[start:end] into measured chunks, with overlap if configured.
+
+        Offsets are exact; with overlap a chunk's start moves back to where
+        its overlap begins in the previous chunk.
+        """
+        text = index.text
+        spans: List[Tuple[int, int, int]] = []
+        for a, b in self._split_range(index, start, end, max_tokens, 0):
+            a, b = _strip(text, a, b)
+            if a < b:
+                spans.extend(self._fit(index, a, b, max_tokens))
+
+        chunks: List[_Chunk] = [(a, b, text[a:b], n) for a, b, n in spans]
+        if overlap_tokens <= 0 or len(chunks) <= 1:
+            return chunks
 
-        # If text fits, return as-is
-        if self._tokenizer(text) <= max_tokens:
-            return [text.strip()] if text.strip() else []
+        # Prefix each chunk with the tail of the previous one.
+        result = [chunks[0]]
+        for (prev_start, prev_end, _, _), (a, b, chunk, n) in zip(chunks, chunks[1:]):
+            tail = index.tail_start(prev_start, prev_end, overlap_tokens)
+            if tail < prev_end:
+                chunk = " ".join(text[tail:prev_end].split()) + " " + chunk
+                a, n = tail, self._tokenizer(chunk)
+            result.append((a, b, chunk, n))
+        return result
 
-        # Find best separator
-        separator = separators[0] if separators else " "
-        remaining_separators = separators[1:] if len(separators) > 1 else [" "]
+    def _split_range(
+        self, index: _TokenIndex, start: int, end: int, max_tokens: int, level: int,
+    ) -> List[Tuple[int, int]]:
+        """Split text[start:end] at separator ``level`` and below until every
+        range's estimated count fits. Returns unstripped (start, end) ranges.
 
-        # Split by separator
-        parts = text.split(separator)
-        if len(parts) == 1:
-            if remaining_separators and remaining_separators != [" "]:
-                # This separator doesn't help — try next
-                return self._split_recursive(text, remaining_separators, max_tokens, overlap_tokens)
-            else:
-                # No separator works — hard-chunk by character count
-                # Estimate chars per token from current text
-                current_tokens = self._tokenizer(text)
-                if current_tokens == 0:
-                    return [text.strip()] if text.strip() else []
-                chars_per_token = max(1, len(text) // current_tokens)
-                chunk_size = max(1, max_tokens * chars_per_token)
-                chunks = []
-                for i in range(0, len(text), chunk_size):
-                    chunk = text[i:i + chunk_size].strip()
-                    if chunk:
-                        chunks.append(chunk)
-                return chunks
-
-        # Merge parts into chunks that fit within max_tokens
-        chunks: List[str] = []
-        current_chunk = ""
-
-        for part in parts:
-            candidate = (current_chunk + separator + part) if current_chunk else part
-            if self._tokenizer(candidate) <= max_tokens:
-                current_chunk = candidate
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                # If single part exceeds max, recursively split it
-                if self._tokenizer(part) > max_tokens:
-                    sub_chunks = self._split_recursive(
-                        part, remaining_separators, max_tokens, overlap_tokens
-                    )
-                    chunks.extend(sub_chunks)
-                    current_chunk = ""
+        Parts between separators are merged greedily; the furthest part a
+        chunk can extend to is found by binary search over the prefix counts,
+        so each chunk costs O(log parts) index lookups rather than a
+        re-tokenization per candidate.
+        """
+        if index.count(start, end) <= max_tokens:
+            return [(start, end)]
+
+        text = index.text
+        while level < len(_SEPARATORS) and text.find(_SEPARATORS[level], start, end) < 0:
+            level += 1  # this separator doesn't help — try the next
+        if level == len(_SEPARATORS):
+            return self._hard_split(index, start, end, max_tokens)
+
+        separator = _SEPARATORS[level]
+        parts: List[Tuple[int, int]] = []
+        pos = start
+        while True:
+            hit = text.find(separator, pos, end)
+            if hit < 0:
+                parts.append((pos, end))
+                break
+            parts.append((pos, hit))
+            pos = hit + len(separator)
+
+        ranges: List[Tuple[int, int]] = []
+        i = 0
+        while i < len(parts):
+            chunk_start = parts[i][0]
+            lo, hi, last = i, len(parts) - 1, i - 1
+            while lo <= hi:
+                mid = (lo + hi) // 2
+                if index.count(chunk_start, parts[mid][1]) <= max_tokens:
+                    last, lo = mid, mid + 1
                 else:
-                    current_chunk = part
-
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
-
-        # Apply overlap if configured
-        if overlap_tokens > 0 and len(chunks) > 1:
-            chunks = self._apply_overlap(chunks, overlap_tokens)
-
-        return [c for c in chunks if c.strip()]
-
-    def _apply_overlap(self, chunks: List[str], overlap_tokens: int) -> List[str]:
-        """Add overlap between consecutive chunks."""
-        if len(chunks) <= 1:
-            return chunks
+                    hi = mid - 1
+            if last < i:
+                # A single part exceeds max — split it at the next level
+                ranges.extend(self._split_range(
+                    index, chunk_start, parts[i][1], max_tokens, level + 1))
+                i += 1
+            else:
+                ranges.append((chunk_start, parts[last][1]))
+                i = last + 1
+        return ranges
 
-        result = [chunks[0]]
-        for i in range(1, len(chunks)):
-            # Get tail of previous chunk as overlap prefix
-            prev_words = chunks[i - 1].split()
-            overlap_words = prev_words[-overlap_tokens:] if len(prev_words) > overlap_tokens else prev_words
-            overlap_text = " ".join(overlap_words)
-            result.append(overlap_text + " " + chunks[i])
+    @staticmethod
+    def _hard_split(
+        index: _TokenIndex, start: int, end: int, max_tokens: int,
+    ) -> List[Tuple[int, int]]:
+        """No separator works — hard-chunk by character count, estimating
+        chars per token from the range itself."""
+        tokens = index.count(start, end)
+        if tokens <= 0:
+            return [(start, end)]
+        chunk_size = max(1, max_tokens * max(1, (end - start) // tokens))
+        return [(i, min(end, i + chunk_size)) for i in range(start, end, chunk_size)]
+
+    def _fit(
+        self, index: _TokenIndex, start: int, end: int, max_tokens: int,
+    ) -> List[Tuple[int, int, int]]:
+        """Measure a stripped range with the real tokenizer, cutting it where
+        the index under-estimated. Returns (start, end, token_length) ranges.
+
+        Each emitted segment is tokenized once here — linear in total. Only
+        a range that comes out over the limit pays for a binary search, with
+        real counts, for the longest prefix that fits.
+        """
+        text = index.text
+        spans: List[Tuple[int, int, int]] = []
+        for _ in range(_MAX_REFIT):
+            tokens = self._tokenizer(text[start:end])
+            if tokens <= max_tokens:
+                break
+            cut, cut_tokens = self._longest_fitting_prefix(index, start, end, max_tokens)
+            if cut >= end:
+                break
+            spans.append((start, cut, cut_tokens))
+            start, end = _strip(text, cut, end)
+            if start >= end:
+                return spans
+        else:
+            tokens = self._tokenizer(text[start:end])
+            logger.debug("Segment at %d still %d tokens over %d after %d cuts",
+                         start, tokens, max_tokens, _MAX_REFIT)
+        spans.append((start, end, tokens))
+        return spans
+
+    def _longest_fitting_prefix(
+        self, index: _TokenIndex, start: int, end: int, max_tokens: int,
+    ) -> Tuple[int, int]:
+        """Furthest separator boundary (highest level first, then any
+        character) such that text[start:cut] fits. Returns (cut, tokens)."""
+        text = index.text
+
+        def fits(cut: int) -> int:
+            a, b = _strip(text, start, cut)
+            n = self._tokenizer(text[a:b])
+            return n if n <= max_tokens else -1
+
+        for separator in _SEPARATORS:
+            cuts = []
+            pos = text.find(separator, start + 1, end)
+            while pos >= 0:
+                cuts.append(pos)
+                pos = text.find(separator, pos + len(separator), end)
+            best = self._search(cuts, fits)
+            if best is not None:
+                cut, n = best
+                return _strip(text, start, cut)[1], n
+        best = self._search(range(start + 1, end), fits)
+        if best is not None:
+            return best
+        return start + 1, self._tokenizer(text[start:start + 1])
 
-        return result
+    @staticmethod
+    def _search(cuts, fits) -> Optional[Tuple[int, int]]:
+        """Largest cut with fits(cut) >= 0 (fits is monotone), or None."""
+        lo, hi, best = 0, len(cuts) - 1, None
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            n = fits(cuts[mid])
+            if n >= 0:
+                best, lo = (cuts[mid], n), mid + 1
+            else:
+                hi = mid - 1
+        return best
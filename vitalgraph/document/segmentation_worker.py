@@ -11,15 +11,28 @@ Usage:
     # To stop gracefully:
     worker.stop()
     await task
+
+Jobs run concurrently. A dispatcher claims one job at a time
+into a fixed number of slots (``VITALGRAPH_SEGMENTATION_CONCURRENCY``,
+default 4), visiting spaces in least-recently-served order so one space
+with a thousand queued documents cannot starve another with one. Each
+claim is its own short transaction using FOR UPDATE SKIP LOCKED, so any
+number of workers across instances pull from the same per-space tables
+without blocking each other. The CPU part of a job — segmentation — runs
+in the shared process pool of `cpu_pool`, off the event loop.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
+from vitalgraph.document.cpu_pool import cpu_workers, run_cpu, shutdown_cpu_pool
 from vitalgraph.document.segment_deletion import delete_segmentation
 from vitalgraph.document.segmentation_job_manager import (
     SegmentationJobDTO,
@@ -33,8 +46,132 @@ logger = logging.getLogger(__name__)
 _IDLE_POLL_INTERVAL = 30.0
 # Short delay between consecutive jobs
 _BUSY_POLL_INTERVAL = 0.2
-# Max concurrent segmentation tasks
+# Max concurrent segmentation jobs (VITALGRAPH_SEGMENTATION_CONCURRENCY)
 _MAX_CONCURRENT = 4
+# Window over which documents/s and segments/s are reported
+_THROUGHPUT_WINDOW = 60.0
+
+
+def _concurrency() -> int:
+    raw = os.environ.get("VITALGRAPH_SEGMENTATION_CONCURRENCY")
+    if raw is None or not raw.strip():
+        return _MAX_CONCURRENT
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        logger.warning("VITALGRAPH_SEGMENTATION_CONCURRENCY=%r is not an integer; "
+                       "using %d", raw, _MAX_CONCURRENT)
+        return _MAX_CONCURRENT
+
+
+def _model_tokenizer():
+    """
+    Token counter from the shared local embedding model, or None.
+
+    Uses the process-wide cached provider. The previous version called
+    `get_provider("vitalsigns_onnx")` with no cache key, which built a fresh
+    tokenizer and ONNX InferenceSession on EVERY call — hundreds of ms to
+    seconds — and then looked for a `_tokenizer` attribute the provider does
+    not have, so it discarded the model and returned None anyway. That load
+    landed inside each segmentation request.
+    """
+    try:
+        from vitalgraph.vectorization import get_local_provider
+        provider = get_local_provider()
+        embedder = getattr(provider, "_embedder", None) if provider else None
+        tokenizer = getattr(embedder, "tokenizer", None) if embedder else None
+        if tokenizer is not None:
+            return lambda text: len(tokenizer.encode(text))
+    except Exception as e:
+        logger.debug("Model tokenizer unavailable, using whitespace count: %s", e)
+    return None  # Falls back to whitespace tokenizer
+
+
+def _model_max_input_tokens():
+    """
+    The embedding model's input ceiling, or None if unknown.
+
+    Segments longer than this are truncated at embed time, so the segmenter
+    clamps to it. Reads the shared cached provider — no model load.
+    """
+    try:
+        from vitalgraph.vectorization import get_local_provider
+        provider = get_local_provider()
+        return provider.max_input_tokens if provider else None
+    except Exception:
+        return None
+
+
+def segment_document(document_uri: str, doc_properties: dict, config):
+    """Segment one document — the CPU half of a job, run in `cpu_pool`.
+
+    Module-level and taking only plain data so it pickles into a pool
+    process. The tokenizer is built there: the provider cache is
+    per-process, so each pool process loads the model once and reuses it.
+    """
+    from vitalgraph.document import KGDocumentSegmentationProcessor
+
+    processor = KGDocumentSegmentationProcessor(
+        tokenizer=_model_tokenizer(), max_input_tokens=_model_max_input_tokens(),
+    )
+    return processor.process(
+        original_uri=document_uri,
+        original_properties=doc_properties,
+        config=config,
+    )
+
+
+class _Throughput:
+    """Completed documents and segments over a sliding time window."""
+
+    def __init__(self, window: float = _THROUGHPUT_WINDOW):
+        self._window = window
+        self._events: Deque[Tuple[float, int]] = deque()
+        self.documents_total = 0
+        self.segments_total = 0
+
+    def record(self, segments: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self._events.append((now, segments))
+        self.documents_total += 1
+        self.segments_total += segments
+        self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self._window
+        while self._events and self._events[0][0] < horizon:
+            self._events.popleft()
+
+    def rates(self, now: Optional[float] = None) -> Tuple[float, float]:
+        """(documents/s, segments/s) over the window."""
+        now = time.monotonic() if now is None else now
+        self._trim(now)
+        docs = len(self._events)
+        segs = sum(n for _, n in self._events)
+        return docs / self._window, segs / self._window
+
+
+class _PooledJobManager:
+    """Job-status updates that borrow a pool connection per call.
+
+    A job holds no connection while it is fetching, segmenting or storing;
+    with several jobs in flight, pinning one each for the whole job would
+    take that many connections out of the space's pool.
+    """
+
+    def __init__(self, pool, space_id: str):
+        self._pool = pool
+        self._space_id = space_id
+
+    async def fail(self, job_id: int, error_message: str) -> None:
+        async with self._pool.acquire() as conn:
+            await SegmentationJobManager(conn, self._space_id).fail(job_id, error_message)
+
+    async def mark_vectorizing(self, job_id: int, segment_count: int,
+                               *, content_hash: Optional[str] = None) -> None:
+        async with self._pool.acquire() as conn:
+            await SegmentationJobManager(conn, self._space_id).mark_vectorizing(
+                job_id, segment_count, content_hash=content_hash)
 
 
 class SegmentationWorker:
@@ -42,18 +179,30 @@ class SegmentationWorker:
     Background worker that claims and processes segmentation jobs.
 
     Uses SELECT ... FOR UPDATE SKIP LOCKED via SegmentationJobManager
-    to safely dequeue jobs across concurrent workers.
+    to safely dequeue jobs across concurrent workers, and runs up to
+    ``concurrency`` jobs at once (see the module docstring).
     """
 
-    def __init__(self, space_manager):
+    def __init__(self, space_manager, concurrency: Optional[int] = None):
         """
         Args:
             space_manager: VitalGraph space manager for DB access.
+            concurrency: Jobs in flight at once; defaults to
+                VITALGRAPH_SEGMENTATION_CONCURRENCY (4).
         """
         self._space_manager = space_manager
         self._running = False
-        self._semaphore = asyncio.Semaphore(_MAX_CONCURRENT)
+        self._concurrency = concurrency or _concurrency()
+        self._semaphore = asyncio.Semaphore(self._concurrency)
         self._wake_event = asyncio.Event()
+        # Spaces in least-recently-served order; a space moves to the back
+        # each time one of its jobs is claimed.
+        self._rotation: Deque[str] = deque()
+        self._tables_ready: Set[str] = set()
+        self._inflight: Set[asyncio.Task] = set()
+        self._inflight_by_space: Dict[str, int] = {}
+        self._throughput = _Throughput()
+        self._throughput_by_space: Dict[str, _Throughput] = {}
         self._listen_conns: list = []  # (connection, channel) pairs
         # One LISTEN connection per DATABASE, not per space — see
         # _get_listen_connection.
@@ -74,6 +223,7 @@ class SegmentationWorker:
 
     def get_health(self) -> Dict[str, Any]:
         """Return current worker health/status for diagnostics."""
+        docs_rate, segs_rate = self._throughput.rates()
         return {
             "running": self._running,
             "started_at": self._started_at,
@@ -83,8 +233,41 @@ class SegmentationWorker:
             "jobs_failed": self._jobs_failed,
             "listen_status": dict(self._listen_status),
             "listen_channels_active": len(self._listen_conns),
+            "concurrency": self._concurrency,
+            "cpu_workers": cpu_workers(),
+            "jobs_in_flight": len(self._inflight),
+            "in_flight_by_space": {k: v for k, v in self._inflight_by_space.items() if v},
+            "documents_per_second": round(docs_rate, 3),
+            "segments_per_second": round(segs_rate, 3),
+            "segments_total": self._throughput.segments_total,
         }
 
+    def collect(self) -> List[tuple]:
+        """``/metrics`` collector: in-flight jobs and throughput per space."""
+        inflight, docs, segs, docs_rate, segs_rate = [], [], [], [], []
+        for space_id, tp in sorted(self._throughput_by_space.items()):
+            labels = {'space': space_id}
+            inflight.append((labels, self._inflight_by_space.get(space_id, 0)))
+            docs.append((labels, tp.documents_total))
+            segs.append((labels, tp.segments_total))
+            d, n = tp.rates()
+            docs_rate.append((labels, d))
+            segs_rate.append((labels, n))
+        return [
+            ('vitalgraph_segmentation_jobs_in_flight', 'gauge',
+             'Segmentation jobs currently running.', inflight),
+            ('vitalgraph_segmentation_documents_total', 'counter',
+             'Documents segmented.', docs),
+            ('vitalgraph_segmentation_segments_total', 'counter',
+             'Segments produced.', segs),
+            ('vitalgraph_segmentation_documents_per_second', 'gauge',
+             f'Documents segmented per second over the last {_THROUGHPUT_WINDOW:.0f}s.',
+             docs_rate),
+            ('vitalgraph_segmentation_segments_per_second', 'gauge',
+             f'Segments produced per second over the last {_THROUGHPUT_WINDOW:.0f}s.',
+             segs_rate),
+        ]
+
     async def run(self) -> None:
         """
         Main worker loop. Polls all active spaces for pending jobs.
@@ -95,7 +278,10 @@ class SegmentationWorker:
         self._running = True
         self._started_at = datetime.now(timezone.utc).isoformat()
         self._last_wake_reason = "startup"
-        logger.info("Segmentation worker started")
+        logger.info("Segmentation worker started (concurrency=%d, cpu_workers=%d)",
+                    self._concurrency, cpu_workers())
+        from vitalgraph.metrics.histograms import registry
+        registry.register_collector(self.collect)
 
         await self._setup_listeners()
 
@@ -118,7 +304,11 @@ class SegmentationWorker:
                 self._last_wake_reason = "timeout"
                 logger.info("Worker safety-net poll (timeout=%.1fs)", interval)
 
+        if self._inflight:
+            logger.info("Waiting for %d in-flight segmentation job(s)", len(self._inflight))
+            await asyncio.gather(*self._inflight, return_exceptions=True)
         await self._teardown_listeners()
+        shutdown_cpu_pool(wait=False)
         logger.info("Segmentation worker stopped")
 
     # ------------------------------------------------------------------
@@ -245,56 +435,110 @@ class SegmentationWorker:
             return None
 
     async def _poll_all_spaces(self) -> bool:
-        """Poll each active space for pending jobs. Returns True if any work was done."""
+        """Fill free job slots from all active spaces. Returns True if any job was claimed.
+
+        Each slot is filled from the least-recently-served space that has a
+        pending job, and that space then moves to the back of the rotation —
+        round-robin across spaces, whatever their backlog. When every slot is
+        busy the dispatcher waits for one to free, which is the back-pressure:
+        a job is never claimed (and its row never marked in_progress) until
+        there is capacity to run it.
+        """
         if not self._space_manager:
             return False
 
         space_ids = self._get_active_space_ids()
         if not space_ids:
             return False
+        self._sync_rotation(space_ids)
 
         logger.info("Polling %d space(s) for segmentation jobs", len(space_ids))
         did_work = False
+        drained: Set[str] = set()
 
-        for space_id in space_ids:
-            try:
-                processed = await self._poll_space(space_id)
-                if processed:
-                    did_work = True
-            except Exception as e:
-                logger.error(f"Error polling space {space_id}: {e}", exc_info=True)
+        while self._running:
+            candidates = [s for s in self._rotation if s not in drained]
+            if not candidates:
+                break
+            await self._semaphore.acquire()
+            if not self._running:
+                self._semaphore.release()
+                break
+            claimed = False
+            for space_id in candidates:
+                try:
+                    job = await self._claim(space_id)
+                except Exception as e:
+                    logger.error(f"Error polling space {space_id}: {e}", exc_info=True)
+                    job = None
+                if job is None:
+                    drained.add(space_id)
+                    continue
+                self._rotation.remove(space_id)
+                self._rotation.append(space_id)
+                self._start_job(space_id, job)
+                claimed = did_work = True
+                break
+            if not claimed:
+                self._semaphore.release()
+                break
 
         return did_work
 
-    async def _poll_space(self, space_id: str) -> bool:
-        """Try to claim and process one job for a space. Returns True if a job was processed."""
+    def _sync_rotation(self, space_ids) -> None:
+        """Add new spaces to the front of the rotation and drop deleted ones."""
+        active = set(space_ids)
+        for space_id in list(self._rotation):
+            if space_id not in active:
+                self._rotation.remove(space_id)
+                self._tables_ready.discard(space_id)
+        known = set(self._rotation)
+        for space_id in reversed(list(space_ids)):
+            if space_id not in known:
+                self._rotation.appendleft(space_id)
+
+    async def _claim(self, space_id: str) -> Optional[SegmentationJobDTO]:
+        """Claim one pending job for a space in its own short transaction."""
         pool = await self._get_pool(space_id)
         if not pool:
             logger.warning("No pool for space %s, skipping", space_id)
-            return False
-
+            return None
         async with pool.acquire() as conn:
-            try:
-                manager = SegmentationJobManager(conn, space_id)
+            manager = SegmentationJobManager(conn, space_id)
+            if space_id not in self._tables_ready:
                 await manager.ensure_table()
+                self._tables_ready.add(space_id)
+            return await manager.claim_next()
+
+    def _start_job(self, space_id: str, job: SegmentationJobDTO) -> None:
+        """Run a claimed job as a task that holds one slot until it finishes."""
+        self._inflight_by_space[space_id] = self._inflight_by_space.get(space_id, 0) + 1
+        task = asyncio.get_running_loop().create_task(
+            self._run_job(space_id, job), name=f"segment_job:{space_id}:{job.job_id}",
+        )
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
 
-                job = await manager.claim_next()
-                if not job:
-                    return False
-
-                # Process under semaphore to bound concurrency
-                async with self._semaphore:
-                    await self._process_job(space_id, job, manager)
-                return True
-            except Exception as e:
-                logger.error(f"Error in poll_space({space_id}): {e}", exc_info=True)
-                return False
+    async def _run_job(self, space_id: str, job: SegmentationJobDTO) -> None:
+        try:
+            pool = await self._get_pool(space_id)
+            if not pool:
+                logger.error("Job %d: no pool for space %s", job.job_id, space_id)
+                return
+            await self._process_job(space_id, job, _PooledJobManager(pool, space_id))
+        except Exception as e:
+            logger.error(f"Error in job {job.job_id} ({space_id}): {e}", exc_info=True)
+        finally:
+            self._inflight_by_space[space_id] -= 1
+            self._semaphore.release()
+            # A freed slot may have queued work behind it.
+            self._wake_event.set()
 
     async def _process_job(
         self,
         space_id: str,
         job: SegmentationJobDTO,
-        manager: SegmentationJobManager,
+        manager,
     ) -> None:
         """Process a single segmentation job.
 
@@ -357,6 +601,7 @@ class SegmentationWorker:
                 job.job_id, segment_count, content_hash=content_hash,
             )
             self._jobs_processed += 1
+            self._record_throughput(space_id, segment_count)
 
             # Fire vectorization as a non-blocking background task
             self._fire_vectorization_background(
@@ -391,19 +636,9 @@ class SegmentationWorker:
         """Run the segmentation pipeline. Returns (segment_count, output).
 
         Does NOT trigger vectorization — caller is responsible for that.
+        The segmentation itself runs in the document CPU pool.
         """
-        from vitalgraph.document import KGDocumentSegmentationProcessor
-
-        tokenizer = self._get_tokenizer()
-        processor = KGDocumentSegmentationProcessor(
-            tokenizer=tokenizer, max_input_tokens=self._get_max_input_tokens(),
-        )
-
-        output = processor.process(
-            original_uri=document_uri,
-            original_properties=doc_properties,
-            config=config,
-        )
+        output = await run_cpu(segment_document, document_uri, doc_properties, config)
 
         # Delete existing segmentation for this method
         await self._delete_existing_segmentation(
@@ -422,6 +657,14 @@ class SegmentationWorker:
         )
         return output.segment_count, output
 
+    def _record_throughput(self, space_id: str, segment_count: int) -> None:
+        now = time.monotonic()
+        self._throughput.record(segment_count, now)
+        tp = self._throughput_by_space.get(space_id)
+        if tp is None:
+            tp = self._throughput_by_space[space_id] = _Throughput()
+        tp.record(segment_count, now)
+
     # ------------------------------------------------------------------
     # Helpers (largely mirrored from KGDocumentsEndpoint)
     # ------------------------------------------------------------------
@@ -572,40 +815,12 @@ class SegmentationWorker:
             return None  # Auto-detect
 
     def _get_tokenizer(self):
-        """
-        Token counter from the shared local embedding model, or None.
-
-        Uses the process-wide cached provider. The previous version called
-        `get_provider("vitalsigns_onnx")` with no cache key, which built a fresh
-        tokenizer and ONNX InferenceSession on EVERY call — hundreds of ms to
-        seconds — and then looked for a `_tokenizer` attribute the provider does
-        not have, so it discarded the model and returned None anyway. That load
-        landed inside each segmentation request.
-        """
-        try:
-            from vitalgraph.vectorization import get_local_provider
-            provider = get_local_provider()
-            embedder = getattr(provider, "_embedder", None) if provider else None
-            tokenizer = getattr(embedder, "tokenizer", None) if embedder else None
-            if tokenizer is not None:
-                return lambda text: len(tokenizer.encode(text))
-        except Exception as e:
-            logger.debug("Model tokenizer unavailable, using whitespace count: %s", e)
-        return None  # Falls back to whitespace tokenizer
+        """Token counter from the shared local embedding model, or None."""
+        return _model_tokenizer()
 
     def _get_max_input_tokens(self):
-        """
-        The embedding model's input ceiling, or None if unknown.
-
-        Segments longer than this are truncated at embed time, so the segmenter
-        clamps to it. Reads the shared cached provider — no model load.
-        """
-        try:
-            from vitalgraph.vectorization import get_local_provider
-            provider = get_local_provider()
-            return provider.max_input_tokens if provider else None
-        except Exception:
-            return None
+        """The embedding model's input ceiling, or None if unknown."""
+        return _model_max_input_tokens()
 
     async def _delete_existing_segmentation(
         self, backend_impl, space_id: str, graph_id: str,
@@ -2,7 +2,8 @@
 Admin REST API endpoint for VitalGraph.
 
 Provides administrative operations such as resyncing auxiliary tables
-(edge, frame_entity, stats) for the sparql_sql backend, and audit log querying.
+(edge, frame_entity, stats) for the sparql_sql backend, audit log querying,
+and per-query-shape SPARQL statistics with their captured plans.
 """
 
 import logging
@@ -12,7 +13,12 @@ from typing import Dict, List, Optional
 from fastapi import APIRouter, Query, Depends, HTTPException
 from pydantic import BaseModel, Field
 
-from ..model.admin_model import ResyncResponse, AuditLogEntry, AuditLogResponse
+from ..model.admin_model import (
+    ResyncResponse, AuditLogEntry, AuditLogResponse,
+    QueryShapeStat, QueryShapeStatsResponse,
+    ExplainCapture, ExplainCaptureResponse,
+    SyncQueueSpaceStats, SyncQueueStatsResponse,
+)
 from ..model.result_status import OperationStatus
 
 
@@ -225,6 +231,110 @@ class AdminEndpoint:
                 self.logger.error(f"Audit log query failed: {e}")
                 raise HTTPException(status_code=500, detail=f"Audit log query failed: {str(e)}")
 
+        @self.router.get("/query-shapes", response_model=QueryShapeStatsResponse, tags=["Admin"])
+        async def get_query_shape_stats(
+            space_id: Optional[str] = Query(None, description="Restrict to one space"),
+            hours: int = Query(24, ge=1, le=24 * 7, description="Window, in hours"),
+            order_by: str = Query("total_ms", description="total_ms, calls, p95_ms, exec_ms or rows"),
+            limit: int = Query(50, ge=1, le=500, description="Max shapes to return"),
+            current_user: Dict = Depends(self.auth_dependency)
+        ):
+            """Most expensive SPARQL query shapes (admin only).
+
+            A shape is a query with its IRIs parameterized, as the compile
+            cache keys it. Each entry has call and row counts, p50/p95/p99
+            per pipeline stage, and the slowest call's SQL and SPARQL.
+            Includes this instance's not-yet-flushed window.
+            """
+            from ..auth.role_dependencies import require_admin
+            require_admin(current_user)
+            from ..metrics.query_shape_stats import ORDER_KEYS, read_shape_stats, shape_stats
+
+            if order_by not in ORDER_KEYS:
+                return QueryShapeStatsResponse(
+                    status=OperationStatus.INVALID_REQUEST,
+                    message=f"order_by must be one of: {', '.join(ORDER_KEYS)}",
+                    hours=hours, order_by=order_by,
+                )
+
+            pool = getattr(getattr(self.space_manager, 'db_impl', None), 'connection_pool', None)
+            if not pool:
+                raise HTTPException(status_code=503, detail="Database pool not available")
+
+            try:
+                async with pool.acquire() as conn:
+                    shapes = await read_shape_stats(
+                        conn, space_id=space_id, hours=hours, order_by=order_by,
+                        limit=limit, pending=shape_stats)
+            except Exception as e:
+                self.logger.error(f"Query shape stats query failed: {e}")
+                raise HTTPException(status_code=500, detail=f"Query shape stats query failed: {str(e)}")
+
+            return QueryShapeStatsResponse(
+                status=OperationStatus.FOUND if shapes else OperationStatus.EMPTY,
+                hours=hours, order_by=order_by,
+                shapes=[QueryShapeStat(**{
+                    **s,
+                    'first_seen': s['first_seen'].isoformat(),
+                    'last_seen': s['last_seen'].isoformat(),
+                }) for s in shapes],
+            )
+
+        @self.router.get("/query-shapes/{shape_hash}/plans", response_model=ExplainCaptureResponse,
+                         tags=["Admin"])
+        async def get_query_shape_plans(
+            shape_hash: str,
+            limit: int = Query(20, ge=1, le=100, description="Max plans to return"),
+            current_user: Dict = Depends(self.auth_dependency)
+        ):
+            """Plans captured automatically for a query shape (admin only).
+
+            Recorded on the first slow execution of the shape, after the
+            re-check cooldown, or by sampling; each carries the cost class
+            (ordered-probe / blocking / set-based).
+            """
+            from ..auth.role_dependencies import require_admin
+            require_admin(current_user)
+            from ..db.sparql_sql.auto_explain import read_explain_log
+
+            pool = getattr(getattr(self.space_manager, 'db_impl', None), 'connection_pool', None)
+            if not pool:
+                raise HTTPException(status_code=503, detail="Database pool not available")
+
+            try:
+                async with pool.acquire() as conn:
+                    plans = await read_explain_log(conn, shape_hash, limit)
+            except Exception as e:
+                self.logger.error(f"Explain log query failed: {e}")
+                raise HTTPException(status_code=500, detail=f"Explain log query failed: {str(e)}")
+
+            return ExplainCaptureResponse(
+                status=OperationStatus.FOUND if plans else OperationStatus.NOT_FOUND,
+                shape_hash=shape_hash,
+                plans=[ExplainCapture(**{**p, 'captured_at': p['captured_at'].isoformat()})
+                       for p in plans],
+            )
+
+        @self.router.get("/sync-queue", response_model=SyncQueueStatsResponse, tags=["Admin"])
+        async def get_sync_queue_stats(
+            current_user: Dict = Depends(self.auth_dependency)
+        ):
+            """Auto-sync queue depth, in-flight batches and lag per space (admin only).
+
+            Lag is the age of the oldest subject still waiting for its
+            vector / geo / fuzzy / FTS sync. Per instance: each server
+            process has its own queue.
+            """
+            from ..auth.role_dependencies import require_admin
+            require_admin(current_user)
+            from ..vectorization.auto_sync import sync_queue
+
+            stats = sync_queue.stats()
+            return SyncQueueStatsResponse(
+                status=OperationStatus.FOUND if stats['spaces'] else OperationStatus.EMPTY,
+                **{**stats, 'spaces': [SyncQueueSpaceStats(**sp) for sp in stats['spaces']]},
+            )
+
 
 def create_admin_router(space_manager, auth_dependency) -> APIRouter:
     """Factory function to create the admin router."""
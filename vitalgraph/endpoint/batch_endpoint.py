@@ -0,0 +1,436 @@
+"""Batch REST Endpoint
+
+Run a list of KG operations against one space in one request.
+
+Routes (under /api/graphs):
+    POST   /batch     — ordered operations in, per-operation results out
+
+A typical client workflow is a chain of small calls: get an entity, get its
+frames, list its relations, upsert a correction. Each is a full round trip
+with its own auth, admission and connection-pool turn, and on a remote link
+the chain costs N x RTT before any of the server's own work is counted.
+A batch carries the whole chain in one round trip.
+
+Each operation is written as the call it replaces — method, path under
+``/api/graphs``, query parameters, JSON body — and is dispatched IN-PROCESS
+through the application's own router, so it runs the same handler,
+validation, permission check and result contract as when called alone, and
+its result is exactly that call's response body. Nothing about an operation's
+semantics is re-implemented here. Only the KG data routes are reachable
+(``_ALLOWED_ROOTS``); a batch cannot contain another batch.
+
+Scheduling keeps the written order observable:
+
+- A write runs after every operation before it, and every operation after
+  it runs after it. Reads between two writes are independent of each other
+  and run concurrently, at most ``max_parallel`` at a time. What counts as a
+  read is ``request_bounds.is_cancellable_read`` — the same predicate that
+  decides which requests the deadline may abandon.
+- ``depends_on`` adds edges on top, and more: an operation whose dependency
+  failed (or was skipped) is skipped with 424 instead of run.
+- With ``stop_on_error`` (the default) the first failure skips everything
+  not yet started. An operation fails on an HTTP error status or a body
+  with ``success: false`` — the unified result contract answers domain
+  failures with 200.
+
+By default there is NO cross-operation transaction. Each write commits in
+its own backend transaction, as when called alone, so ``stop_on_error``
+stops the batch but does not undo the writes that already ran. Likewise
+each operation takes its own pool connection; what the batch saves is the
+round trips, the per-request middleware and the token verification — the
+operations run as the user the batch authenticated as.
+
+``transactional: true`` asks for all or nothing. On the sparql_sql backend
+the operations then run one at a time on one connection inside one
+transaction (``shared_connection``): the first failure skips the rest and
+rolls every write back (``rolled_back``), and a failing commit is a
+``store_failed``. Reads inside the transaction bypass the process-wide
+caches (they may see uncommitted writes), and once it ends this
+instance's caches for the space are flushed. A backend without that support refuses a transactional
+batch that contains writes rather than run it non-atomically; a read-only
+one runs as usual.
+
+The batch itself is one request to the middleware stack: body size limits
+and compression apply to it as a whole, and it is not deadline-bounded
+(it may contain writes).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+from fastapi import APIRouter, Depends, Query, Request
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from ..api.fast_response import FastModelRoute
+from ..api.request_bounds import is_cancellable_read
+from ..auth.request_context import reset_authenticated_user, set_authenticated_user
+from ..auth.role_dependencies import require_space_read, require_space_write
+from ..model.batch_model import (
+    BatchOperation, BatchOperationResult, BatchRequest, BatchResponse,
+)
+from ..model.result_status import OperationStatus
+
+logger = logging.getLogger(__name__)
+
+# First path segment an operation may target, relative to /api/graphs.
+_ALLOWED_ROOTS = frozenset({
+    "kgentities", "kgframes", "kgrelations", "kgqueries", "kgtypes",
+    "objects", "triples",
+})
+
+_MAX_OPERATIONS = 200
+_DEFAULT_MAX_PARALLEL = 4
+_MAX_PARALLEL = 16
+
+_FAILED_DEPENDENCY = 424
+
+# Parent headers not forwarded to an operation: the body and its framing are
+# the operation's own, and a conditional or compressed sub-response would not
+# be readable as the operation's result.
+_DROP_HEADERS = frozenset({
+    b"content-length", b"content-type", b"content-encoding", b"transfer-encoding",
+    b"accept-encoding", b"if-none-match", b"if-modified-since", b"expect",
+})
+
+
+class _RollBack(Exception):
+    """Raised inside a transactional batch's transaction to undo it."""
+
+
+def _transaction_scope(space) -> Optional[Any]:
+    """The space backend's ``shared_transaction``, or None where it has none."""
+    space_impl = getattr(space, "space_impl", None)
+    backend = space_impl.get_db_space_impl() if space_impl is not None else None
+    return getattr(getattr(backend, "db_impl", None), "shared_transaction", None)
+
+
+def _flush_space_caches(space_id: str) -> None:
+    """Drop this instance's cached entity graphs, counts and ETag validators
+    for a space a transactional batch wrote to.
+
+    The writes invalidated those caches before the transaction committed,
+    so a request outside the batch could have cached the pre-batch data
+    again in between.
+    """
+    from ..cache.count_cache import _count_cache
+    from ..cache.entity_graph_cache import _entity_graph_cache
+    try:
+        _entity_graph_cache.invalidate_space(space_id)
+        _count_cache.invalidate_space(space_id)  # the ETag validators follow
+    except Exception as e:
+        logger.warning("Cache flush after transactional batch in %s failed: %s", space_id, e)
+
+
+def _is_read(op: BatchOperation) -> bool:
+    return is_cancellable_read(op.method, "/" + op.path.strip("/"))
+
+
+def _failed(result: BatchOperationResult) -> bool:
+    if result.skipped or result.status_code >= 400:
+        return True
+    return isinstance(result.body, dict) and result.body.get("success") is False
+
+
+def plan_dependencies(operations: List[BatchOperation]) -> Tuple[List[Set[int]], List[Set[int]]]:
+    """Ordering and explicit dependencies of each operation, by index.
+
+    Returns ``(after, requires)``: ``after[i]`` is every operation ``i``
+    must wait for, ``requires[i]`` the subset that must also have
+    succeeded (its ``depends_on``). A write waits for the operations since
+    the previous write and that write itself — transitively, everything
+    before it; a read waits for the last write before it.
+    """
+    index = {op.id: i for i, op in enumerate(operations) if op.id}
+    after: List[Set[int]] = []
+    requires: List[Set[int]] = []
+    last_write: Optional[int] = None
+    since_write: List[int] = []
+    for i, op in enumerate(operations):
+        wait: Set[int] = set()
+        if _is_read(op):
+            if last_write is not None:
+                wait.add(last_write)
+            since_write.append(i)
+        else:
+            wait.update(since_write)
+            if last_write is not None:
+                wait.add(last_write)
+            last_write, since_write = i, []
+        needed = {index[d] for d in op.depends_on}
+        after.append(wait | needed)
+        requires.append(needed)
+    return after, requires
+
+
+class BatchEndpoint:
+    """REST endpoint running many KG operations in one request."""
+
+    def __init__(self, space_manager, auth_dependency):
+        self.space_manager = space_manager
+        self.auth_dependency = auth_dependency
+        self.router = APIRouter(route_class=FastModelRoute)
+        self._setup_routes()
+
+    # ------------------------------------------------------------------
+    # Validation
+    # ------------------------------------------------------------------
+
+    def _invalid(self, operations: List[BatchOperation]) -> Optional[str]:
+        if not operations:
+            return "Batch has no operations"
+        if len(operations) > _MAX_OPERATIONS:
+            return f"Batch has {len(operations)} operations; the limit is {_MAX_OPERATIONS}"
+        seen: Set[str] = set()
+        for i, op in enumerate(operations):
+            root = op.path.strip("/").split("/", 1)[0]
+            if root not in _ALLOWED_ROOTS or ".." in op.path or "?" in op.path:
+                return f"Operation {i}: path '{op.path}' cannot be batched"
+            # The batch was authorized for its own space only.
+            if "space_id" in op.params:
+                return (f"Operation {i}: space_id cannot be set per operation; "
+                        f"a batch runs against one space")
+            for dep in op.depends_on:
+                if dep not in seen:
+                    return (f"Operation {i}: depends_on '{dep}' does not name an "
+                            f"earlier operation")
+            if op.id:
+                if op.id in seen:
+                    return f"Operation {i}: duplicate id '{op.id}'"
+                seen.add(op.id)
+        return None
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    async def _dispatch(self, request: Request, op: BatchOperation, index: int,
+                        params: Dict[str, Any]) -> BatchOperationResult:
+        """Run one operation through the app's router as its own request."""
+        prefix = request.scope["path"].rsplit("/", 1)[0]
+        path = f"{prefix}/{op.path.strip('/')}"
+        body = b"" if op.body is None else json.dumps(op.body, separators=(",", ":")).encode()
+        headers = [(k, v) for k, v in request.scope["headers"] if k not in _DROP_HEADERS]
+        headers += [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())]
+        scope = {k: v for k, v in request.scope.items()
+                 if k not in ("route", "endpoint", "path_params")}
+        scope.update(
+            method=op.method, path=path, raw_path=path.encode(), headers=headers,
+            query_string=urlencode(
+                {k: v for k, v in params.items() if v is not None}, doseq=True).encode(),
+        )
+
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if sent:
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status_code = 500
+        content_type = ""
+        chunks: List[bytes] = []
+
+        async def send(message):
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for k, v in message.get("headers", ()):
+                    if k.lower() == b"content-type":
+                        content_type = v.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        started = time.perf_counter()
+        try:
+            await request.app.router(scope, receive, send)
+        except StarletteHTTPException as e:
+            # No route (404) or wrong method (405): the router raises rather
+            # than responds when running inside an app.
+            status_code, content_type = e.status_code, "application/json"
+            chunks = [json.dumps({"detail": e.detail}).encode()]
+        except Exception as e:
+            logger.error("Batch operation %d (%s %s) failed: %s", index, op.method, op.path, e)
+            status_code, content_type = 500, "application/json"
+            chunks = [json.dumps({"detail": str(e)}).encode()]
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        raw = b"".join(chunks)
+        parsed: Any = None
+        if raw:
+            if "json" in content_type:
+                try:
+                    parsed = json.loads(raw)
+                except ValueError:
+                    parsed = raw.decode("utf-8", "replace")
+            else:
+                parsed = raw.decode("utf-8", "replace")
+        return BatchOperationResult(index=index, id=op.id, status_code=status_code,
+                                    body=parsed, elapsed_ms=round(elapsed_ms, 3))
+
+    # ------------------------------------------------------------------
+    # Handler
+    # ------------------------------------------------------------------
+
+    async def run_batch(self, request: Request, space_id: str, batch: BatchRequest,
+                        current_user: Dict) -> BatchResponse:
+        operations = batch.operations
+        require_space_read(current_user, space_id)
+
+        error = self._invalid(operations)
+        if error:
+            return BatchResponse(space_id=space_id, status=OperationStatus.INVALID_REQUEST,
+                                 message=error)
+        if not all(_is_read(op) for op in operations):
+            require_space_write(current_user, space_id)
+
+        # Resolve the space once, before the operations race to load it.
+        space = None
+        if self.space_manager is not None:
+            space = await self.space_manager.get_space_or_load(space_id)
+            if not space:
+                return BatchResponse(space_id=space_id, status=OperationStatus.NOT_FOUND,
+                                     message=f"Space '{space_id}' not found")
+
+        transaction = _transaction_scope(space) if batch.transactional else None
+        if batch.transactional and transaction is None \
+                and not all(_is_read(op) for op in operations):
+            return BatchResponse(
+                space_id=space_id, status=OperationStatus.INVALID_REQUEST,
+                message="This space's backend cannot run a batch's writes in one "
+                        "transaction; send it without transactional")
+
+        after, requires = plan_dependencies(operations)
+        # One connection: a transactional batch runs its operations one at a time.
+        parallel = 1 if transaction is not None else \
+            min(batch.max_parallel or _DEFAULT_MAX_PARALLEL, _MAX_PARALLEL)
+        limit = asyncio.Semaphore(parallel)
+        results: List[Optional[BatchOperationResult]] = [None] * len(operations)
+        tasks: List[asyncio.Task] = []
+        stopped = False
+
+        def skip(i: int, reason: str) -> BatchOperationResult:
+            return BatchOperationResult(index=i, id=operations[i].id,
+                                        status_code=_FAILED_DEPENDENCY,
+                                        body={"detail": reason}, skipped=True)
+
+        async def run(i: int) -> None:
+            nonlocal stopped
+            op = operations[i]
+            if after[i]:
+                await asyncio.wait([tasks[d] for d in after[i]])
+            failed_deps = sorted(d for d in requires[i] if _failed(results[d]))
+            if failed_deps:
+                results[i] = skip(i, f"Dependency {failed_deps[0]} did not succeed")
+            else:
+                async with limit:
+                    if stopped:
+                        results[i] = skip(i, "Batch stopped after a failed operation")
+                        return
+                    params = {} if batch.graph_id is None else {"graph_id": batch.graph_id}
+                    params.update(op.params)
+                    params["space_id"] = space_id
+                    results[i] = await self._dispatch(request, op, i, params)
+            if (batch.stop_on_error or transaction is not None) and _failed(results[i]):
+                stopped = True
+
+        async def run_all() -> None:
+            tasks.extend(asyncio.ensure_future(run(i)) for i in range(len(operations)))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        started = time.perf_counter()
+        rolled_back = False
+        commit_error = None
+        # The operations run as the user this request authenticated as.
+        user_token = set_authenticated_user(current_user)
+        try:
+            if transaction is None:
+                await run_all()
+            else:
+                try:
+                    async with transaction():
+                        await run_all()
+                        if any(_failed(r) for r in results):
+                            raise _RollBack()
+                except _RollBack:
+                    rolled_back = True
+                except Exception as e:
+                    if any(r is None for r in results):
+                        raise
+                    logger.error("Transactional batch in space %s did not commit: %s",
+                                 space_id, e)
+                    rolled_back, commit_error = True, e
+        finally:
+            reset_authenticated_user(user_token)
+            if transaction is not None and not all(_is_read(op) for op in operations):
+                _flush_space_caches(space_id)
+
+        done: List[BatchOperationResult] = results  # every slot is filled by now
+        skipped = sum(r.skipped for r in done)
+        failed = sum(_failed(r) for r in done) - skipped
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        if commit_error is not None:
+            return BatchResponse(
+                space_id=space_id, results=done, succeeded=0, failed=failed,
+                skipped=skipped, elapsed_ms=elapsed_ms, rolled_back=True,
+                status=OperationStatus.STORE_FAILED,
+                message=f"Transaction did not commit: {commit_error}",
+            )
+        message = "" if not failed and not skipped else \
+            f"{failed} operations failed, {skipped} skipped"
+        if rolled_back:
+            message += "; every write was rolled back"
+        return BatchResponse(
+            space_id=space_id,
+            results=done,
+            succeeded=len(done) - failed - skipped,
+            failed=failed,
+            skipped=skipped,
+            elapsed_ms=elapsed_ms,
+            rolled_back=rolled_back,
+            status=OperationStatus.OK if not failed and not skipped else OperationStatus.PARTIAL,
+            message=message,
+        )
+
+    # ------------------------------------------------------------------
+    # Route wiring
+    # ------------------------------------------------------------------
+
+    def _setup_routes(self):
+        auth = self.auth_dependency
+
+        @self.router.post(
+            "/batch",
+            response_model=BatchResponse,
+            tags=["Batch"],
+            summary="Run Batch",
+            description=(
+                "Run an ordered list of KG operations against one space in one "
+                "request. Independent reads run concurrently; results come back "
+                "per operation, in request order."
+            ),
+        )
+        async def batch_route(
+            request: Request,
+            batch: BatchRequest,
+            space_id: str = Query(..., description="Space ID"),
+            current_user: Dict = Depends(auth),
+        ):
+            return await self.run_batch(request, space_id, batch, current_user)
+
+
+def create_batch_router(space_manager, auth_dependency) -> APIRouter:
+    """Factory function matching the pattern used by other endpoints."""
+    endpoint = BatchEndpoint(space_manager, auth_dependency)
+    return endpoint.router
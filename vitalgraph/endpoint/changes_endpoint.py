@@ -0,0 +1,245 @@
+"""Change Log (CDC) REST Endpoint
+
+Follow a space's quad-level change log instead of re-scanning it.
+
+Routes (all under /api/changes):
+    GET    /          — change records after a seq; NDJSON stream by default
+    GET    /status    — enabled flag and retained seq range
+    POST   /enable    — create the space's change log
+    DELETE /          — drop the space's change log
+
+The stream is newline-delimited JSON over chunked HTTP: one ChangeRecord
+per line, in seq order. With ``follow=true`` it stays open, polling the log
+and writing ``{"heartbeat": true, "seq": N}`` lines while idle so proxies
+keep the connection and the consumer can checkpoint. A consumer that
+disconnects resumes with ``after_seq`` = the last seq it applied.
+
+A resume position the log no longer covers (pruned, or from a previous log)
+is answered before any record is streamed: a JSON ChangesPageResponse with
+status INVALID_REQUEST, per the unified result contract.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from ..auth.role_dependencies import require_space_read, require_space_write
+from ..db.sparql_sql import change_log
+from ..model.changes_model import (
+    ChangeLogStatusResponse, ChangeRecord, ChangesPageResponse,
+)
+from ..model.result_status import OperationStatus
+
+logger = logging.getLogger(__name__)
+
+# Follow-mode pacing: how often an idle stream re-reads the log, and how
+# often it writes a heartbeat line when nothing new arrived.
+_POLL_INTERVAL_S = 1.0
+_HEARTBEAT_S = 15.0
+_MAX_LIMIT = 1_000
+
+
+# ---------------------------------------------------------------------------
+# Endpoint class
+# ---------------------------------------------------------------------------
+
+class ChangesEndpoint:
+    """REST endpoint for the per-space change-log feed."""
+
+    def __init__(self, app_impl, auth_dependency):
+        self.app_impl = app_impl
+        self.auth_dependency = auth_dependency
+        self.router = APIRouter()
+        self._setup_routes()
+
+    def _pool(self):
+        db_impl = self.app_impl.db_impl
+        if db_impl is None or not getattr(db_impl, "connection_pool", None):
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database not available",
+            )
+        return db_impl.connection_pool
+
+    async def _status(self, space_id: str) -> ChangeLogStatusResponse:
+        async with self._pool().acquire() as conn:
+            info = await change_log.change_log_status(conn, space_id)
+        return ChangeLogStatusResponse(
+            space_id=space_id,
+            status=OperationStatus.FOUND if info["enabled"] else OperationStatus.NOT_FOUND,
+            message="" if info["enabled"] else "Change log is not enabled for this space",
+            **info,
+        )
+
+    # ------------------------------------------------------------------
+    # Handlers
+    # ------------------------------------------------------------------
+
+    async def get_status(self, space_id: str, current_user: Dict):
+        require_space_read(current_user, space_id)
+        return await self._status(space_id)
+
+    async def enable(self, space_id: str, current_user: Dict):
+        require_space_write(current_user, space_id)
+        async with self._pool().acquire() as conn:
+            await change_log.enable_change_log(conn, space_id)
+        result = await self._status(space_id)
+        result.status = OperationStatus.UPDATED
+        result.message = "Change log enabled"
+        return result
+
+    async def disable(self, space_id: str, current_user: Dict):
+        require_space_write(current_user, space_id)
+        async with self._pool().acquire() as conn:
+            await change_log.disable_change_log(conn, space_id)
+        return ChangeLogStatusResponse(
+            space_id=space_id, status=OperationStatus.DELETED,
+            message="Change log dropped; consumers must re-bootstrap",
+        )
+
+    async def get_changes(self, request: Request, space_id: str, after_seq: int,
+                          limit: int, follow: bool, stream: bool,
+                          current_user: Dict):
+        require_space_read(current_user, space_id)
+        limit = max(1, min(limit, _MAX_LIMIT))
+        pool = self._pool()
+
+        # First page up front: a bad position or a space without a log is
+        # reported as a plain response instead of a stream that ends at once.
+        async with pool.acquire() as conn:
+            if not await change_log.is_change_log_enabled(conn, space_id):
+                return ChangesPageResponse(
+                    space_id=space_id, after_seq=after_seq, next_seq=after_seq,
+                    status=OperationStatus.NOT_FOUND,
+                    message="Change log is not enabled for this space",
+                )
+            try:
+                first = await change_log.read_changes(conn, space_id, after_seq, limit)
+            except change_log.ChangeLogPositionError as e:
+                return ChangesPageResponse(
+                    space_id=space_id, after_seq=after_seq, next_seq=after_seq,
+                    status=OperationStatus.INVALID_REQUEST, message=str(e),
+                )
+
+        if not stream:
+            return ChangesPageResponse(
+                space_id=space_id, after_seq=after_seq,
+                next_seq=first[-1]["seq"] if first else after_seq,
+                changes=[ChangeRecord(**r) for r in first],
+                status=OperationStatus.FOUND if first else OperationStatus.EMPTY,
+            )
+
+        return StreamingResponse(
+            self._stream(request, pool, space_id, after_seq, limit, follow, first),
+            media_type="application/x-ndjson",
+        )
+
+    async def _stream(self, request: Request, pool, space_id: str,
+                      after_seq: int, limit: int, follow: bool, page):
+        """Yield NDJSON lines until caught up (or, with follow, until the
+        client goes away). A connection is held per read, never across the
+        idle wait, so a slow consumer does not pin a pool slot."""
+        seq = after_seq
+        last_write = time.monotonic()
+        while True:
+            for record in page:
+                seq = record["seq"]
+                yield json.dumps(record, separators=(",", ":")) + "\n"
+                last_write = time.monotonic()
+            if len(page) < limit:
+                if not follow:
+                    return
+                if await request.is_disconnected():
+                    return
+                if time.monotonic() - last_write >= _HEARTBEAT_S:
+                    yield json.dumps({"heartbeat": True, "seq": seq}) + "\n"
+                    last_write = time.monotonic()
+                await asyncio.sleep(_POLL_INTERVAL_S)
+            try:
+                async with pool.acquire() as conn:
+                    page = await change_log.read_changes(conn, space_id, seq, limit)
+            except change_log.ChangeLogPositionError as e:
+                # Pruned (or the log was re-created) under a live follower.
+                yield json.dumps({"error": str(e),
+                                  "status": OperationStatus.INVALID_REQUEST.value,
+                                  "seq": seq}) + "\n"
+                return
+
+    # ------------------------------------------------------------------
+    # Route wiring
+    # ------------------------------------------------------------------
+
+    def _setup_routes(self):
+        auth = self.auth_dependency
+
+        @self.router.get(
+            "/changes",
+            tags=["Changes"],
+            summary="Read Change Log",
+            description=(
+                "Change records after a sequence number. Streams NDJSON by "
+                "default; follow=true keeps the stream open for new changes."
+            ),
+        )
+        async def changes_route(
+            request: Request,
+            space_id: str = Query(..., description="Space ID"),
+            after_seq: int = Query(0, ge=0, description="Last seq already applied"),
+            limit: int = Query(100, ge=1, le=_MAX_LIMIT, description="Records per read"),
+            follow: bool = Query(False, description="Keep streaming new changes"),
+            stream: bool = Query(True, description="NDJSON stream (false: one JSON page)"),
+            current_user: Dict = Depends(auth),
+        ):
+            return await self.get_changes(request, space_id, after_seq, limit,
+                                          follow, stream, current_user)
+
+        @self.router.get(
+            "/changes/status",
+            response_model=ChangeLogStatusResponse,
+            tags=["Changes"],
+            summary="Change Log Status",
+            description="Whether the space has a change log, and its retained seq range",
+        )
+        async def status_route(
+            space_id: str = Query(..., description="Space ID"),
+            current_user: Dict = Depends(auth),
+        ):
+            return await self.get_status(space_id, current_user)
+
+        @self.router.post(
+            "/changes/enable",
+            response_model=ChangeLogStatusResponse,
+            tags=["Changes"],
+            summary="Enable Change Log",
+            description="Start recording quad-level changes for a space",
+        )
+        async def enable_route(
+            space_id: str = Query(..., description="Space ID"),
+            current_user: Dict = Depends(auth),
+        ):
+            return await self.enable(space_id, current_user)
+
+        @self.router.delete(
+            "/changes",
+            response_model=ChangeLogStatusResponse,
+            tags=["Changes"],
+            summary="Disable Change Log",
+            description="Drop the space's change log",
+        )
+        async def disable_route(
+            space_id: str = Query(..., description="Space ID"),
+            current_user: Dict = Depends(auth),
+        ):
+            return await self.disable(space_id, current_user)
+
+
+def create_changes_router(app_impl, auth_dependency) -> APIRouter:
+    """Factory function matching the pattern used by other endpoints."""
+    endpoint = ChangesEndpoint(app_impl, auth_dependency)
+    return endpoint.router
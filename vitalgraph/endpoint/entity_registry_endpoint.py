@@ -48,6 +48,8 @@ from ..model.entity_registry_model import (
     SameAsCreateRequest,
     SameAsResponse,
     SameAsRetractRequest,
+    ResolveEntitiesRequest,
+    ResolveEntitiesResponse,
     SimilarEntityResponse,
     SimilarEntityResult,
     EntitySearchResponse,
@@ -779,6 +781,19 @@ class EntityRegistryEndpoint:
             except ValueError as e:
                 return EntityEnvelope(status=OperationStatus.NOT_FOUND, message=str(e), entity=None)
 
+        @self.router.post("/sameas/resolve/batch", response_model=ResolveEntitiesResponse,
+                          tags=["Entity Registry"])
+        async def resolve_entities_route(
+            request: ResolveEntitiesRequest,
+            current_user: Dict = Depends(auth),
+        ):
+            canonical = await self.registry.resolve_entities(request.entity_ids)
+            not_found = [eid for eid in dict.fromkeys(request.entity_ids) if eid not in canonical]
+            return ResolveEntitiesResponse(
+                status=OperationStatus.FOUND if canonical else OperationStatus.NOT_FOUND,
+                canonical=canonical, not_found=not_found,
+            )
+
         # -- Entity Types --
 
         @self.router.get("/entity/types", response_model=EntityTypeListResponse, tags=["Entity Registry"])
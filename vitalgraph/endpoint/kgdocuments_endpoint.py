@@ -23,6 +23,7 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, Body, Depends, File, Form, HTTPException, Query, UploadFile, status
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel
 
 from ..model.kgdocuments_model import (
@@ -95,7 +96,7 @@ class KGDocumentsEndpoint:
         self.auth_dependency = auth_dependency
         self._segmentation_worker = segmentation_worker
         self.logger = logging.getLogger(f"{__name__}.KGDocumentsEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
 
         # Object storage for uploaded originals. Optional: without it, uploads
         # still work and the converted Markdown is stored — only the original
@@ -1161,6 +1162,7 @@ class KGDocumentsEndpoint:
         store_original: bool,
     ) -> KGDocumentUploadResponse:
         """Convert an uploaded file to Markdown and create a KGDocument from it."""
+        from vitalgraph.document.cpu_pool import run_cpu
         from vitalgraph.document.document_converter import (
             ConversionError,
             EXT_HTML,
@@ -1186,8 +1188,10 @@ class KGDocumentsEndpoint:
 
         # Unsupported type and unreadable file are DOMAIN outcomes: HTTP 200
         # with a non-success status, per the project convention (issues/034).
+        # PDF / DOCX parsing is CPU-bound: it runs in the document process
+        # pool so concurrent uploads use more than one core.
         try:
-            conversion = await asyncio.to_thread(convert_to_markdown, data, filename)
+            conversion = await run_cpu(convert_to_markdown, data, filename)
         except ConversionError as e:
             self.logger.info(f"Upload conversion rejected for '{filename}': {e}")
             return KGDocumentUploadResponse(
@@ -1427,7 +1431,7 @@ class KGDocumentsEndpoint:
 
             # Schedule auto-sync (vectorization + segmentation)
             created_uris = [str(getattr(obj, 'URI', '')) for obj in graph_objects if getattr(obj, 'URI', None)]
-            self._schedule_auto_sync(space_impl, space_id, graph_id, created_uris, "upsert")
+            await self._schedule_auto_sync(space_impl, space_id, graph_id, created_uris, "upsert")
 
             return QuadResultsResponse(
                 status=OperationStatus.CREATED,
@@ -1486,7 +1490,7 @@ class KGDocumentsEndpoint:
                 )
 
             # Schedule auto-sync (vectorization + re-segmentation)
-            self._schedule_auto_sync(space_impl, space_id, graph_id, updated_uris, "upsert")
+            await self._schedule_auto_sync(space_impl, space_id, graph_id, updated_uris, "upsert")
 
             return QuadResultsResponse(
                 status=OperationStatus.UPDATED,
@@ -1544,7 +1548,7 @@ class KGDocumentsEndpoint:
                 deleted_count += 1
 
             # Schedule auto-sync (delete vectors)
-            self._schedule_auto_sync(space_impl, space_id, graph_id, uris_to_delete, "delete")
+            await self._schedule_auto_sync(space_impl, space_id, graph_id, uris_to_delete, "delete")
 
             return QuadResultsResponse(
                 status=OperationStatus.DELETED,
@@ -1659,7 +1663,7 @@ class KGDocumentsEndpoint:
     # Auto-sync helper
     # ------------------------------------------------------------------
 
-    def _schedule_auto_sync(
+    async def _schedule_auto_sync(
         self, space_impl, space_id: str, graph_id: str,
         subject_uris: List[str], operation: Literal["upsert", "delete"]
     ) -> None:
@@ -1668,8 +1672,8 @@ class KGDocumentsEndpoint:
             backend_impl = getattr(space_impl, 'backend', None)
             db_impl = getattr(backend_impl, 'db_impl', None) if backend_impl else None
             if db_impl and subject_uris:
-                from ..vectorization.auto_sync import schedule_sync
-                schedule_sync(
+                from ..vectorization.auto_sync import enqueue_sync
+                await enqueue_sync(
                     db_impl=db_impl,
                     space_id=space_id,
                     subject_uris=subject_uris,
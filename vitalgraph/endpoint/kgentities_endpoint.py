@@ -9,6 +9,7 @@ import asyncio
 import logging
 from typing import Dict, List, Literal, Optional, Union, Any
 from fastapi import APIRouter, Query, Depends, Request, Response, Body, HTTPException
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel, Field, TypeAdapter
 from enum import Enum
 
@@ -34,6 +35,8 @@ from ..sparql.grouping_uri_queries import GroupingURIQueryBuilder, GroupingURIGr
 from ..sparql.graph_validation import EntityGraphValidator
 from ..cache.entity_graph_cache import _entity_graph_cache
 from ..cache.count_cache import _count_cache
+from ..cache.etag_cache import _etag_cache, conditional, etag_matches, not_modified_response
+from ..db.sparql_sql.count_mode import COUNT_MODE_DESCRIPTION, EXACT, CountMode, parse_count_mode
 from ..auth.role_dependencies import require_space_read, require_space_write
 
 # Import new kg_impl implementation
@@ -72,7 +75,7 @@ class KGEntitiesEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(f"{__name__}.KGEntitiesEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         
         # VitalSigns prefixes for proper SPARQL generation
         self.haley_prefix = "http://vital.ai/ontology/haley-ai-kg#"
@@ -93,16 +96,29 @@ class KGEntitiesEndpoint:
     
     async def _invalidate_entity_cache(self, space_id: str, graph_id: str, entity_uri: str,
                                        signal_type: str = "updated") -> None:
-        """Invalidate local entity graph cache and send cross-instance NOTIFY.
-        
+        """Invalidate one entity's cache entries locally and across instances."""
+        await self._invalidate_entity_caches(space_id, graph_id, [entity_uri], signal_type)
+
+    async def _invalidate_entity_caches(self, space_id: str, graph_id: str, entity_uris: List[str],
+                                        signal_type: str = "updated") -> None:
+        """Invalidate local entity graph caches and send one coalesced NOTIFY.
+
+        Called once per committed write with every entity it touched: the
+        graph's counts are flushed once, and other instances receive as few
+        payloads as fit the NOTIFY limit instead of one per entity.
+
         Failures are logged but never propagated — cache invalidation must not
         break the write path.
         """
         _effective_graph = graph_id or "default"
+        entity_uris = [u for u in dict.fromkeys(entity_uris) if u]
+        if not entity_uris:
+            return
         try:
-            _entity_graph_cache.invalidate(space_id, _effective_graph, entity_uri)
+            for entity_uri in entity_uris:
+                _entity_graph_cache.invalidate(space_id, _effective_graph, entity_uri)
             _count_cache.invalidate_graph(space_id, _effective_graph)
-            self.logger.info(f"🗑️ Entity+count cache LOCAL invalidation: {entity_uri} ({signal_type})")
+            self.logger.info(f"🗑️ Entity+count cache LOCAL invalidation: {len(entity_uris)} entities ({signal_type})")
         except Exception as e:
             self.logger.warning(f"Entity/count cache local invalidation failed: {e}")
         try:
@@ -111,23 +127,24 @@ class KGEntitiesEndpoint:
                 backend = space_record.space_impl.get_db_space_impl()
                 sm = getattr(backend, 'get_signal_manager', lambda: None)() if backend else None
                 if sm:
-                    await sm.notify_entity_graph_changed(space_id, _effective_graph, entity_uri, signal_type)
-                    self.logger.info(f"📡 Entity cache NOTIFY sent: {entity_uri} ({signal_type})")
+                    await sm.notify_entity_graphs_changed(space_id, _effective_graph, entity_uris, signal_type)
+                    self.logger.info(f"📡 Entity cache NOTIFY sent: {len(entity_uris)} entities ({signal_type})")
                 else:
                     self.logger.warning(f"⚠️ Entity cache NOTIFY skipped — no signal_manager on backend {type(backend).__name__}")
         except Exception as e:
-            self.logger.warning(f"⚠️ Entity cache NOTIFY failed: {entity_uri} — {e}")
+            self.logger.warning(f"⚠️ Entity cache NOTIFY failed: {len(entity_uris)} entities — {e}")
 
-    def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
-                            subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
+    async def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
+                                  subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
         """Schedule background auto-sync for vector and geo data.
 
-        Fire-and-forget: failures are logged but never block the response.
+        Fire-and-forget: failures are logged but never block the response;
+        only a sync backlog above the queue's high-water mark delays it briefly.
         """
         db_impl = getattr(backend_impl, 'db_impl', None)
         if db_impl and subject_uris:
-            from ..vectorization.auto_sync import schedule_sync
-            schedule_sync(
+            from ..vectorization.auto_sync import enqueue_sync
+            await enqueue_sync(
                 db_impl=db_impl,
                 space_id=space_id,
                 subject_uris=subject_uris,
@@ -161,12 +178,16 @@ class KGEntitiesEndpoint:
             modified_before: Optional[str] = Query(None, description="Entities modified before this ISO 8601 datetime"),
             action_type: Optional[str] = Query(None, description="Filter by action type URI (entity has this value in hasKGActionTypeList)"),
             provenance_type: Optional[str] = Query(None, description="Filter by provenance type URI (exact match on hasKGProvenanceType)"),
+            count_mode: Optional[str] = Query(None, description=COUNT_MODE_DESCRIPTION),
+            request: Request = None,
+            response: Response = None,
             current_user: Dict = Depends(self.auth_dependency),
         ):
             """
             List KG entities with pagination, or get specific entities by URI(s) or reference ID(s).
             
-            - If uri is provided: returns single entity by URI
+            - If uri is provided: returns single entity by URI (with a strong
+              ETag; If-None-Match answers 304 when unchanged)
             - If uri_list is provided: returns multiple entities by URIs
             - If id is provided: returns single entity by reference ID
             - If id_list is provided: returns multiple entities by reference IDs
@@ -199,7 +220,10 @@ class KGEntitiesEndpoint:
             
             # Handle single URI retrieval
             if uri:
-                return await self._get_entity_by_uri(space_id, graph_id, uri, include_entity_graph, current_user)
+                return await self._get_entity_by_uri(
+                    space_id, graph_id, uri, include_entity_graph, current_user,
+                    if_none_match=request.headers.get("if-none-match") if request else None,
+                    response=response)
             
             # Handle multiple URI retrieval
             if uri_list:
@@ -219,6 +243,11 @@ class KGEntitiesEndpoint:
                     from fastapi import HTTPException
                     raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
 
+            try:
+                mode = parse_count_mode(count_mode)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
             # Handle paginated listing
             return await self._list_entities(
                 space_id, graph_id, page_size, offset, entity_type_uri, search,
@@ -228,6 +257,7 @@ class KGEntitiesEndpoint:
                 modified_after=modified_after, modified_before=modified_before,
                 action_type=action_type,
                 provenance_type=provenance_type,
+                count_mode=mode,
             )
         
         @self.router.post("/kgentities", response_model=None, tags=["KG Entities"])
@@ -434,7 +464,7 @@ class KGEntitiesEndpoint:
             return await self._query_kgentities(space_id, graph_id, query_request, current_user)
         
     
-    async def _list_entities(self, space_id: str, graph_id: Optional[str], page_size: int, offset: int, entity_type_uri: Optional[str], search: Optional[str], include_entity_graph: bool, current_user: Dict, sort_by: Optional[str] = None, sort_order: str = "asc", status: Optional[str] = None, exclude_status: Optional[str] = None, created_after: Optional[str] = None, created_before: Optional[str] = None, modified_after: Optional[str] = None, modified_before: Optional[str] = None, action_type: Optional[str] = None, provenance_type: Optional[str] = None):
+    async def _list_entities(self, space_id: str, graph_id: Optional[str], page_size: int, offset: int, entity_type_uri: Optional[str], search: Optional[str], include_entity_graph: bool, current_user: Dict, sort_by: Optional[str] = None, sort_order: str = "asc", status: Optional[str] = None, exclude_status: Optional[str] = None, created_after: Optional[str] = None, created_before: Optional[str] = None, modified_after: Optional[str] = None, modified_before: Optional[str] = None, action_type: Optional[str] = None, provenance_type: Optional[str] = None, count_mode: CountMode = EXACT):
         """List entities using KGEntityListProcessor."""
         try:
             import time as _time
@@ -476,6 +506,7 @@ class KGEntitiesEndpoint:
                 modified_before=modified_before,
                 action_type=action_type,
                 provenance_type=provenance_type,
+                count_mode=count_mode,
             )
             t_query = _time.monotonic()
             
@@ -484,6 +515,7 @@ class KGEntitiesEndpoint:
             resp = QuadResponse(
                 results=quads,
                 total_count=result.total_count,
+                total_count_kind=result.count_kind,
                 page_size=page_size,
                 offset=offset,
             )
@@ -626,8 +658,14 @@ class KGEntitiesEndpoint:
             self.logger.error(f"Error in batch count: {e}")
             raise HTTPException(status_code=500, detail=f"Error in batch count: {e}")
     
-    async def _get_entity_by_uri(self, space_id: str, graph_id: Optional[str], uri: Optional[str], include_entity_graph: bool, current_user: Dict, reference_id: Optional[str] = None):
-        """Get single entity by URI or reference ID."""
+    async def _get_entity_by_uri(self, space_id: str, graph_id: Optional[str], uri: Optional[str], include_entity_graph: bool, current_user: Dict, reference_id: Optional[str] = None,
+                                 if_none_match: Optional[str] = None, response: Optional[Response] = None):
+        """Get single entity by URI or reference ID.
+
+        URI reads are conditional: the response carries a strong
+        ETag, and an ``If-None-Match`` equal to the validator cached for the
+        entity is answered with a 304 before any cache or quad-table read.
+        """
         try:
             import time as _time
             t0 = _time.monotonic()
@@ -638,6 +676,12 @@ class KGEntitiesEndpoint:
                 self.logger.debug(f"Getting KGEntity by reference ID '{reference_id}' from space {space_id}, graph {graph_id}")
             else:
                 raise ValueError("Either uri or reference_id must be provided")
+
+            _representation = "graph" if include_entity_graph else "entity"
+            if uri and if_none_match and graph_id:
+                _etag = _etag_cache.get(space_id, graph_id, uri, _representation)
+                if etag_matches(if_none_match, _etag):
+                    return not_modified_response(_etag)
             
             # Cache hit path — only for URI-based lookups with include_entity_graph
             if include_entity_graph and uri:
@@ -648,6 +692,11 @@ class KGEntitiesEndpoint:
                         "GET_ENTITY cache HIT: %.0fms (%d quads, entity=%s)",
                         (t_cache - t0) * 1000, len(cached_quads), uri,
                     )
+                    _, not_modified = conditional(
+                        space_id, graph_id, uri, _representation,
+                        cached_quads, if_none_match, response)
+                    if not_modified is not None:
+                        return not_modified
                     return QuadResultsResponse(results=cached_quads, total_count=len(cached_quads))
             
             # Get backend implementation
@@ -686,6 +735,13 @@ class KGEntitiesEndpoint:
             # Cache the result for entity graph lookups
             if include_entity_graph and uri and quads:
                 _entity_graph_cache.put(space_id, _effective_graph, uri, quads)
+
+            if uri and quads:
+                _, not_modified = conditional(
+                    space_id, graph_id, uri, _representation,
+                    quads, if_none_match, response)
+                if not_modified is not None:
+                    return not_modified
             
             resp = QuadResultsResponse(
                 results=quads,
@@ -884,14 +940,13 @@ class KGEntitiesEndpoint:
             _t_endpoint_end = _time.monotonic()
             self.logger.info(f"⏱️  ENDPOINT total: {_t_endpoint_end - _t_endpoint_start:.3f}s")
             # Invalidate entity graph cache for affected entities
-            for _ent in entity_objects:
-                _ent_uri = str(_ent.URI) if hasattr(_ent, 'URI') and _ent.URI else None
-                if _ent_uri:
-                    await self._invalidate_entity_cache(space_id, graph_id, _ent_uri)
+            await self._invalidate_entity_caches(
+                space_id, graph_id,
+                [str(_ent.URI) for _ent in entity_objects if hasattr(_ent, 'URI') and _ent.URI])
 
             # Auto-sync vector/geo data for changed subjects
             _sync_uris = [str(o.URI) for o in vitalsigns_objects if hasattr(o, 'URI') and o.URI]
-            self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
+            await self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
 
             return _result
 
@@ -1026,14 +1081,13 @@ class KGEntitiesEndpoint:
                 )
             
             # Invalidate entity graph cache for all affected entities
-            for _eu in entity_uris:
-                await self._invalidate_entity_cache(space_id, graph_id, _eu)
+            await self._invalidate_entity_caches(space_id, graph_id, list(entity_uris))
 
             # Auto-sync vector/geo data for changed subjects
             _sync_uris = [str(o.URI) for o in updated_objects if hasattr(o, 'URI') and o.URI]
             _bi = getattr(backend_adapter, 'backend', None)
             if _bi:
-                self._schedule_auto_sync(_bi, space_id, graph_id, _sync_uris)
+                await self._schedule_auto_sync(_bi, space_id, graph_id, _sync_uris)
 
             return result
 
@@ -1108,7 +1162,7 @@ class KGEntitiesEndpoint:
                 await self._invalidate_entity_cache(space_id, graph_id, entity_uri)
                 _bi = getattr(backend_adapter, 'backend', None)
                 if _bi:
-                    self._schedule_auto_sync(_bi, space_id, graph_id, [entity_uri])
+                    await self._schedule_auto_sync(_bi, space_id, graph_id, [entity_uri])
                 return EntityUpdateResponse(
                     status=OperationStatus.UPDATED,
                     message=f"Successfully updated entity (entity_only): {entity_uri}",
@@ -1235,7 +1289,7 @@ class KGEntitiesEndpoint:
             # Invalidate entity graph cache after successful deletion
             if success:
                 await self._invalidate_entity_cache(space_id, graph_id, uri, "deleted")
-                self._schedule_auto_sync(backend_impl, space_id, graph_id, [uri], "delete")
+                await self._schedule_auto_sync(backend_impl, space_id, graph_id, [uri], "delete")
             
             return EntityDeleteResponse(
                 status=OperationStatus.DELETED if success else OperationStatus.STORE_FAILED,
@@ -1332,12 +1386,11 @@ class KGEntitiesEndpoint:
             deleted_count = len(deleted_uris_list)
             
             # Invalidate entity graph cache for all successfully deleted entities
-            for _del_uri in deleted_uris_list:
-                await self._invalidate_entity_cache(space_id, graph_id, _del_uri, "deleted")
+            await self._invalidate_entity_caches(space_id, graph_id, deleted_uris_list, "deleted")
             
             # Auto-sync vector/geo data for deleted entities
             if deleted_uris_list:
-                self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris_list, "delete")
+                await self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris_list, "delete")
 
             self.logger.debug(f"Successfully deleted {deleted_count} KG entities")
             
@@ -16,6 +16,7 @@ import asyncio
 import logging
 from typing import Dict, List, Literal, Optional, Union, Any
 from fastapi import APIRouter, Query, Depends, Request, Response, Body, HTTPException
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel, Field, TypeAdapter
 from enum import Enum
 
@@ -34,6 +35,12 @@ from ..model.kgframes_model import (
     FrameQueryResponse,
 )
 from ..kg_impl.kg_sparql_utils import KGSparqlUtils
+from ..cache.etag_cache import _etag_cache, conditional, etag_matches, not_modified_response
+from ..signal.entity_graph_invalidation import invalidate_graph_caches
+from ..db.sparql_sql.count_mode import (
+    COUNT_ESTIMATED, COUNT_EXACT, COUNT_MODE_DESCRIPTION, COUNT_NONE, EXACT, CountMode,
+    finish_count, parse_count_mode, resolve_count,
+)
 
 # VitalSigns imports for proper graph object handling
 from ai_haley_kg_domain.model.KGFrame import KGFrame
@@ -81,7 +88,7 @@ class KGFramesEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(f"{__name__}.KGFramesEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self.haley_prefix = "http://vital.ai/ontology/haley-ai-kg#"
         self.vital_prefix = "http://vital.ai/ontology/vital-core#"
         
@@ -124,13 +131,13 @@ class KGFramesEndpoint:
         
         return create_backend_adapter(backend)
 
-    def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
-                            subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
+    async def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
+                                  subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
         """Schedule background auto-sync for vector and geo data."""
         db_impl = getattr(backend_impl, 'db_impl', None)
         if db_impl and subject_uris:
-            from ..vectorization.auto_sync import schedule_sync
-            schedule_sync(
+            from ..vectorization.auto_sync import enqueue_sync
+            await enqueue_sync(
                 db_impl=db_impl,
                 space_id=space_id,
                 subject_uris=subject_uris,
@@ -215,7 +222,7 @@ class KGFramesEndpoint:
 
             # Auto-sync vector/geo data for changed subjects
             _sync_uris = [str(o.URI) for o in enhanced_objects if hasattr(o, 'URI') and o.URI]
-            self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
+            await self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
 
             return _result
 
@@ -581,13 +588,16 @@ class KGFramesEndpoint:
             created_before: Optional[str] = Query(None, description="Frames created before this ISO 8601 datetime"),
             modified_after: Optional[str] = Query(None, description="Frames modified after this ISO 8601 datetime"),
             modified_before: Optional[str] = Query(None, description="Frames modified before this ISO 8601 datetime"),
+            count_mode: Optional[str] = Query(None, description=COUNT_MODE_DESCRIPTION),
+            request: Request = None,
+            response: Response = None,
             current_user: Dict = Depends(self.auth_dependency),
         ):
             """
             List KG frames with pagination, filtering, and sorting — or get specific frames by URI(s).
 
             **Retrieval modes:**
-            - `uri` provided → returns single frame
+            - `uri` provided → returns single frame (strong ETag; `If-None-Match` → 304 when unchanged)
             - `uri_list` provided → returns multiple frames
             - Otherwise → paginated list with optional filters
 
@@ -617,7 +627,10 @@ class KGFramesEndpoint:
             
             # Handle single URI retrieval
             if uri:
-                return await self._get_frame_by_uri(space_id, graph_id, uri, include_frame_graph, current_user)
+                return await self._get_frame_by_uri(
+                    space_id, graph_id, uri, include_frame_graph, current_user,
+                    if_none_match=request.headers.get("if-none-match") if request else None,
+                    response=response)
             
             # Handle multiple URI retrieval
             if uri_list:
@@ -636,6 +649,10 @@ class KGFramesEndpoint:
             if sort_order not in ("asc", "desc"):
                 from fastapi import HTTPException
                 raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
+            try:
+                mode = parse_count_mode(count_mode)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
             # Resolve form_type short label to full URI
             resolved_form_type = None
@@ -651,6 +668,7 @@ class KGFramesEndpoint:
                 status=status, exclude_status=exclude_status,
                 created_after=created_after, created_before=created_before,
                 modified_after=modified_after, modified_before=modified_before,
+                count_mode=mode,
             )
 
         @self.router.post("/kgframes", response_model=None, tags=["KG Frames"])
@@ -680,6 +698,8 @@ class KGFramesEndpoint:
                 import traceback
                 self.logger.error(f"❌ ROUTE: Traceback: {traceback.format_exc()}")
                 raise
+            finally:
+                await invalidate_graph_caches(self.space_manager, space_id, graph_id)
         
         @self.router.post("/kgframes/query", response_model=FrameQueryResponse, tags=["KG Frames"])
         async def query_frames(
@@ -710,11 +730,14 @@ class KGFramesEndpoint:
                 recursive: If true, cascade-delete all descendant frames. If false, fail if children exist.
             """
             require_space_write(current_user, space_id)
-            if uri:
-                return await self._delete_frame_by_uri(space_id, graph_id, uri, current_user, recursive=recursive)
-            elif uri_list:
-                uris = [u.strip() for u in uri_list.split(',') if u.strip()]
-                return await self._delete_frames_by_uris(space_id, graph_id, uris, current_user, recursive=recursive)
+            if uri or uri_list:
+                try:
+                    if uri:
+                        return await self._delete_frame_by_uri(space_id, graph_id, uri, current_user, recursive=recursive)
+                    uris = [u.strip() for u in uri_list.split(',') if u.strip()]
+                    return await self._delete_frames_by_uris(space_id, graph_id, uris, current_user, recursive=recursive)
+                finally:
+                    await invalidate_graph_caches(self.space_manager, space_id, graph_id, "deleted")
             else:
                 from ..model.kgframes_model import FrameDeleteResponse
                 return FrameDeleteResponse(
@@ -806,10 +829,12 @@ class KGFramesEndpoint:
             """
             require_space_write(current_user, space_id)
             quads = body.quads
-            if operation_mode == "update":
-                return await self._update_frame_slots(space_id, graph_id, frame_uri, quads, current_user)
-            else:
+            try:
+                if operation_mode == "update":
+                    return await self._update_frame_slots(space_id, graph_id, frame_uri, quads, current_user)
                 return await self._create_frame_slots(space_id, graph_id, frame_uri, quads, operation_mode, current_user, entity_uri, parent_uri)
+            finally:
+                await invalidate_graph_caches(self.space_manager, space_id, graph_id)
         
         @self.router.delete("/kgframes/kgslots", response_model=SlotDeleteResponse, tags=["KG Frame Slots"])
         async def delete_frame_slots(
@@ -824,7 +849,10 @@ class KGFramesEndpoint:
             """
             require_space_write(current_user, space_id)
             slot_uri_list = [uri.strip() for uri in slot_uris.split(',') if uri.strip()]
-            return await self._delete_frame_slots(space_id, graph_id, frame_uri, slot_uri_list, current_user)
+            try:
+                return await self._delete_frame_slots(space_id, graph_id, frame_uri, slot_uri_list, current_user)
+            finally:
+                await invalidate_graph_caches(self.space_manager, space_id, graph_id)
     
     # Implementation methods following MockKGFramesEndpoint patterns with VitalSigns integration
 
@@ -838,8 +866,15 @@ class KGFramesEndpoint:
                            created_after: Optional[str] = None,
                            created_before: Optional[str] = None,
                            modified_after: Optional[str] = None,
-                           modified_before: Optional[str] = None) -> QuadResponse:
-        """List KG frames with pagination using backend interface."""
+                           modified_before: Optional[str] = None,
+                           count_mode: CountMode = EXACT) -> QuadResponse:
+        """List KG frames with pagination using backend interface.
+
+        ``count_mode``: on the fast path the exact count is the
+        cheap vitaltype index count already, so only ``estimated`` (the
+        frame_entity cardinality) and ``none`` change it; on the SPARQL path
+        every mode goes through ``resolve_count``.
+        """
         try:
             self.logger.info(f"Listing KGFrames in space {space_id}, graph {graph_id}")
 
@@ -876,13 +911,23 @@ class KGFramesEndpoint:
                 # Preserve the subject_uuid page order.
                 _order = {u: i for i, u in enumerate(fast_uris)}
                 frames = sorted(frames or [], key=lambda fr: _order.get(str(fr.URI), len(fast_uris)))
-                fc = await fast_typed_subject_count(
-                    backend, space_id, graph_id, VITALTYPE_URI, _KGFRAME_TYPE_URIS)
+                fc, count_kind = None, COUNT_EXACT
+                if count_mode.kind == COUNT_NONE:
+                    fc, count_kind = 0, COUNT_NONE
+                elif count_mode.kind == COUNT_ESTIMATED:
+                    estimate_fn = getattr(backend, 'estimate_frame_count', None)
+                    fc = await estimate_fn(space_id, graph_id) if estimate_fn else None
+                    if fc is not None:
+                        count_kind = COUNT_ESTIMATED
+                if fc is None:
+                    fc = await fast_typed_subject_count(
+                        backend, space_id, graph_id, VITALTYPE_URI, _KGFRAME_TYPE_URIS)
                 total_count = fc if fc is not None else len(frames)
+                total_count = finish_count(total_count, count_kind, offset, len(frames))
                 quads = await asyncio.to_thread(graphobjects_to_quad_list, frames, graph_id)
                 return QuadResponse(
                     status=OperationStatus.FOUND if frames else OperationStatus.EMPTY,
-                    results=quads, total_count=total_count,
+                    results=quads, total_count=total_count, total_count_kind=count_kind,
                     page_size=page_size, offset=offset)
 
             # Build SPARQL query for listing frames
@@ -908,13 +953,24 @@ class KGFramesEndpoint:
                 created_after=created_after, created_before=created_before,
                 modified_after=modified_after, modified_before=modified_before,
             )
-            count_results = await backend.execute_sparql_query(space_id, count_query)
-            total_count = self._extract_count_from_results(count_results)
+
+            async def _run_count(query: str) -> int:
+                return self._extract_count_from_results(
+                    await backend.execute_sparql_query(space_id, query))
+
+            estimators = []
+            estimate_fn = getattr(backend, 'estimate_sparql_count', None)
+            if estimate_fn:
+                estimators.append(lambda: estimate_fn(space_id, count_query))
+            total_count, count_kind = await resolve_count(
+                count_mode, count_query, _run_count, estimators)
+            total_count = finish_count(total_count, count_kind, offset, len(frames or []))
             quads = await asyncio.to_thread(graphobjects_to_quad_list, frames or [], graph_id)
             return QuadResponse(
                 status=OperationStatus.FOUND if frames else OperationStatus.EMPTY,
                 results=quads,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=page_size,
                 offset=offset,
             )
@@ -925,10 +981,21 @@ class KGFramesEndpoint:
             self.logger.error(f"Error listing KGFrames: {e}")
             raise HTTPException(status_code=500, detail=f"Error listing KGFrames: {e}")
     
-    async def _get_frame_by_uri(self, space_id: str, graph_id: str, uri: str, include_frame_graph: bool, current_user: Dict) -> QuadResultsResponse:
-        """Get single frame by URI with optional complete graph."""
+    async def _get_frame_by_uri(self, space_id: str, graph_id: str, uri: str, include_frame_graph: bool, current_user: Dict,
+                                if_none_match: Optional[str] = None, response: Optional[Response] = None) -> QuadResultsResponse:
+        """Get single frame by URI with optional complete graph.
+
+        Conditional like the entity GET: a matching cached
+        validator answers 304 before the space is even loaded.
+        """
         try:
             self.logger.info(f"🔍 Getting KGFrame {uri} from space {space_id}, graph {graph_id}, include_frame_graph={include_frame_graph}")
+
+            representation = "frame_graph" if include_frame_graph else "frame"
+            if if_none_match and graph_id:
+                etag = _etag_cache.get(space_id, graph_id, uri, representation)
+                if etag_matches(if_none_match, etag):
+                    return not_modified_response(etag)
             
             # Get backend implementation via generic interface
             space_record = await self.space_manager.get_space_or_load(space_id)
@@ -969,6 +1036,11 @@ class KGFramesEndpoint:
                     all_objects.extend(frame_graph.graph)
             
             quads = await asyncio.to_thread(graphobjects_to_quad_list, all_objects, graph_id)
+            if quads:
+                _, not_modified = conditional(
+                    space_id, graph_id, uri, representation, quads, if_none_match, response)
+                if not_modified is not None:
+                    return not_modified
             return QuadResultsResponse(
                 status=OperationStatus.FOUND if all_objects else OperationStatus.NOT_FOUND,
                 results=quads,
@@ -1342,7 +1414,7 @@ class KGFramesEndpoint:
             
             # Auto-sync vector/geo data for deleted frames
             if deleted_uris:
-                self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris, "delete")
+                await self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris, "delete")
 
             return FrameDeleteResponse(
                 status=OperationStatus.DELETED,
@@ -1428,7 +1500,7 @@ class KGFramesEndpoint:
             
             # Auto-sync vector/geo data for deleted frames
             if deleted_uris:
-                self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris, "delete")
+                await self._schedule_auto_sync(backend_impl, space_id, graph_id, deleted_uris, "delete")
 
             return FrameDeleteResponse(
                 status=OperationStatus.DELETED,
@@ -1534,7 +1606,7 @@ class KGFramesEndpoint:
             
             # Auto-sync vector/geo data for created slots
             _sync_uris = [str(o.URI) for o in enhanced_objects if hasattr(o, 'URI') and o.URI]
-            self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
+            await self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
 
             return SlotCreateResponse(
                 status=OperationStatus.CREATED,
@@ -1609,7 +1681,7 @@ class KGFramesEndpoint:
             
             # Auto-sync vector/geo data for updated slots
             _sync_uris = [str(s.URI) for s in slots if hasattr(s, 'URI') and s.URI]
-            self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
+            await self._schedule_auto_sync(backend_impl, space_id, graph_id, _sync_uris)
 
             return SlotUpdateResponse(
                 status=OperationStatus.UPDATED,
@@ -1683,7 +1755,7 @@ class KGFramesEndpoint:
             
             # Auto-sync vector/geo data for deleted slots
             if deleted_count > 0:
-                self._schedule_auto_sync(backend_impl, space_id, graph_id, validated_slots[:deleted_count], "delete")
+                await self._schedule_auto_sync(backend_impl, space_id, graph_id, validated_slots[:deleted_count], "delete")
 
             return SlotDeleteResponse(
                 status=OperationStatus.DELETED,
@@ -11,8 +11,9 @@ import asyncio
 import logging
 import re
 import time as _time
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 from fastapi import APIRouter, Query, Depends, HTTPException
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel, Field
 
 from ..model.kgqueries_model import (
@@ -26,6 +27,9 @@ from ..model.kgqueries_model import (
 )
 from ..cache.entity_graph_cache import _entity_graph_cache
 from ..cache.count_cache import _count_cache
+from ..db.sparql_sql.count_mode import (
+    COUNT_CAPPED, COUNT_EXACT, finish_count, parse_count_mode, resolve_count,
+)
 from vitalgraph.model.result_status import OperationStatus
 from ..auth.role_dependencies import require_space_read
 
@@ -117,7 +121,7 @@ class KGQueriesEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(__name__)
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self.haley_prefix = "http://vital.ai/ontology/haley-ai-kg#"
         self.vital_prefix = "http://vital.ai/ontology/vital-core#"
         
@@ -243,15 +247,16 @@ class KGQueriesEndpoint:
             
             # Execute appropriate query type
             if query_type == "relation":
-                return await self._execute_relation_query(backend, space_id, graph_id, query_request)
+                response = await self._execute_relation_query(backend, space_id, graph_id, query_request)
             elif query_type == "entity":
-                return await self._execute_entity_query(backend, space_id, graph_id, query_request)
+                response = await self._execute_entity_query(backend, space_id, graph_id, query_request)
             elif query_type == "frame_query":
-                return await self._execute_frame_query_case(backend, space_id, graph_id, query_request)
+                response = await self._execute_frame_query_case(backend, space_id, graph_id, query_request)
             elif query_type == "document":
-                return await self._execute_document_query(backend, space_id, graph_id, query_request)
+                response = await self._execute_document_query(backend, space_id, graph_id, query_request)
             else:  # query_type == "frame"
-                return await self._execute_frame_query(backend, space_id, graph_id, query_request)
+                response = await self._execute_frame_query(backend, space_id, graph_id, query_request)
+            return self._settle_count_kind(response)
                 
         except HTTPException:
             raise
@@ -262,6 +267,45 @@ class KGQueriesEndpoint:
                 detail=f"Failed to execute KG query: {str(e)}"
             )
     
+    async def _run_count(self, backend, space_id: str, count_query: str,
+                         query_request: KGQueryRequest) -> Tuple[int, str]:
+        """Run a case's count query the way ``count_mode`` asks.
+
+        Without ``count_mode`` this is the plain exact count every case has
+        always run. With it: ``estimated`` asks the backend for a planner
+        estimate of the count, ``capped:N`` bounds the counted subquery,
+        ``none`` runs nothing. Returns ``(total, kind)``.
+        """
+        async def _run(query: str) -> int:
+            return self._extract_total_count(await _checked_query(backend, space_id, query))
+
+        if query_request.count_mode is None:
+            return await _run(count_query), COUNT_EXACT
+        estimators = []
+        estimate_fn = getattr(backend, 'estimate_sparql_count', None)
+        if estimate_fn:
+            estimators.append(lambda: estimate_fn(space_id, count_query))
+        return await resolve_count(
+            parse_count_mode(query_request.count_mode), count_query, _run, estimators)
+
+    @staticmethod
+    def _settle_count_kind(response: KGQueryResponse) -> KGQueryResponse:
+        """Reconcile a non-exact total with the page the case returned, and
+        keep ``total_count_capped`` and ``total_count_kind`` in agreement."""
+        if response.total_count_capped and response.total_count_kind == COUNT_EXACT:
+            response.total_count_kind = COUNT_CAPPED
+        kind = response.total_count_kind
+        if kind == COUNT_CAPPED:
+            response.total_count_capped = True
+        if kind != COUNT_EXACT:
+            page = next((rows for rows in (
+                response.relation_connections, response.entity_uris,
+                response.frame_results, response.document_uris,
+                response.frame_connections) if rows is not None), [])
+            response.total_count = finish_count(
+                response.total_count or 0, kind, response.offset or 0, len(page))
+        return response
+
     @staticmethod
     def _extract_total_count(count_results: dict) -> int:
         """Extract integer total from a COUNT SPARQL result."""
@@ -317,15 +361,17 @@ class KGQueriesEndpoint:
             
             # count_only short-circuit: run only the count query
             t0 = _time.monotonic()
+            count_kind = COUNT_EXACT
             if query_request.count_only:
                 _qh = _count_cache.query_hash(count_query)
                 _cached = _count_cache.get(space_id, graph_id, _qh)
                 if _cached is not None:
                     total_count = _cached
                 else:
-                    count_results = await _checked_query(backend, space_id, count_query)
-                    total_count = self._extract_total_count(count_results)
-                    _count_cache.put(space_id, graph_id, _qh, total_count)
+                    total_count, count_kind = await self._run_count(
+                        backend, space_id, count_query, query_request)
+                    if count_kind == COUNT_EXACT:
+                        _count_cache.put(space_id, graph_id, _qh, total_count)
                 self.logger.info(f"Relation count_only: {total_count}, {(_time.monotonic() - t0)*1000:.0f}ms")
                 return KGQueryResponse(
                     status=OperationStatus.EMPTY,
@@ -333,6 +379,7 @@ class KGQueriesEndpoint:
                     relation_connections=[],
                     frame_connections=None,
                     total_count=total_count,
+                    total_count_kind=count_kind,
                     page_size=0,
                     offset=0,
                 )
@@ -341,9 +388,9 @@ class KGQueriesEndpoint:
             # query first so we can skip the expensive paginated query if the
             # caller has already paged past the end of the result set.
             if query_request.offset > 0:
-                count_results = await _checked_query(backend, space_id, count_query)
-                total_count = self._extract_total_count(count_results)
-                if query_request.offset >= total_count:
+                total_count, count_kind = await self._run_count(
+                    backend, space_id, count_query, query_request)
+                if count_kind == COUNT_EXACT and query_request.offset >= total_count:
                     t_query = _time.monotonic()
                     self.logger.info(
                         f"Relation query short-circuit: offset {query_request.offset} >= total {total_count}, "
@@ -354,6 +401,7 @@ class KGQueriesEndpoint:
                         relation_connections=[],
                         frame_connections=None,
                         total_count=total_count,
+                        total_count_kind=count_kind,
                         page_size=query_request.page_size,
                         offset=query_request.offset,
                     )
@@ -363,9 +411,9 @@ class KGQueriesEndpoint:
                 # First page: run both in parallel for lowest latency
                 results, count_results = await _gather_cancelling(
                     _checked_query(backend, space_id, sparql_query),
-                    _checked_query(backend, space_id, count_query),
+                    self._run_count(backend, space_id, count_query, query_request),
                 )
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = count_results
             t_query = _time.monotonic()
             
             # Log the final SQL if returned by the backend (fire-and-forget, non-blocking)
@@ -396,6 +444,7 @@ class KGQueriesEndpoint:
                 relation_connections=connections,
                 frame_connections=None,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=query_request.page_size,
                 offset=query_request.offset,
             )
@@ -562,21 +611,24 @@ class KGQueriesEndpoint:
             
             # count_only short-circuit: run only the count query
             t0 = _time.monotonic()
+            count_kind = COUNT_EXACT
             if query_request.count_only:
                 _qh = _count_cache.query_hash(count_query)
                 _cached = _count_cache.get(space_id, graph_id, _qh)
                 if _cached is not None:
                     total_count = _cached
                 else:
-                    count_results = await _checked_query(backend, space_id, count_query)
-                    total_count = self._extract_total_count(count_results)
-                    _count_cache.put(space_id, graph_id, _qh, total_count)
+                    total_count, count_kind = await self._run_count(
+                        backend, space_id, count_query, query_request)
+                    if count_kind == COUNT_EXACT:
+                        _count_cache.put(space_id, graph_id, _qh, total_count)
                 self.logger.info(f"Entity count_only: {total_count}, {(_time.monotonic() - t0)*1000:.0f}ms")
                 return KGQueryResponse(
                     status=OperationStatus.EMPTY,
                     query_type="entity",
                     entity_uris=[],
                     total_count=total_count,
+                    total_count_kind=count_kind,
                     page_size=0,
                     offset=0,
                 )
@@ -585,9 +637,9 @@ class KGQueriesEndpoint:
             # query first so we can skip the expensive paginated query if the
             # caller has already paged past the end of the result set.
             if query_request.offset > 0:
-                count_results = await _checked_query(backend, space_id, count_query)
-                total_count = self._extract_total_count(count_results)
-                if query_request.offset >= total_count:
+                total_count, count_kind = await self._run_count(
+                    backend, space_id, count_query, query_request)
+                if count_kind == COUNT_EXACT and query_request.offset >= total_count:
                     t_query = _time.monotonic()
                     self.logger.info(
                         f"Entity query short-circuit: offset {query_request.offset} >= total {total_count}, "
@@ -597,6 +649,7 @@ class KGQueriesEndpoint:
                         query_type="entity",
                         entity_uris=[],
                         total_count=total_count,
+                        total_count_kind=count_kind,
                         page_size=query_request.page_size,
                         offset=query_request.offset
                     )
@@ -609,9 +662,9 @@ class KGQueriesEndpoint:
                 results, count_results = await _gather_cancelling(
                     _checked_query(backend, space_id, sparql_query,
                                    multi_vector_config=_mv_config),
-                    _checked_query(backend, space_id, count_query),
+                    self._run_count(backend, space_id, count_query, query_request),
                 )
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = count_results
             t_query = _time.monotonic()
             
             # Extract entity URIs
@@ -638,6 +691,7 @@ class KGQueriesEndpoint:
                 entity_uris=entity_uris,
                 entity_graphs=entity_graphs,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=query_request.page_size,
                 offset=query_request.offset
             )
@@ -732,6 +786,10 @@ class KGQueriesEndpoint:
                 count_mode = TotalCountMode.YES
             want_count = count_mode != TotalCountMode.NO
             cap = None if count_mode == TotalCountMode.EXACT else TOTAL_COUNT_CAP
+            if query_request.count_mode is not None:
+                # count_mode supersedes include_total_count and
+                # bounds the count itself.
+                want_count, cap = True, None
             count_query = self.query_builder.build_entity_count_query_sparql(
                 entity_criteria, graph_id, cap=cap
             )
@@ -740,15 +798,17 @@ class KGQueriesEndpoint:
             
             # count_only short-circuit: run only the count query
             t0 = _time.monotonic()
+            count_kind = COUNT_EXACT
             if query_request.count_only:
                 _qh = _count_cache.query_hash(count_query)
                 _cached = _count_cache.get(space_id, graph_id, _qh)
                 if _cached is not None:
                     total_count = _cached
                 else:
-                    count_results = await _checked_query(backend, space_id, count_query)
-                    total_count = self._extract_total_count(count_results)
-                    _count_cache.put(space_id, graph_id, _qh, total_count)
+                    total_count, count_kind = await self._run_count(
+                        backend, space_id, count_query, query_request)
+                    if count_kind == COUNT_EXACT:
+                        _count_cache.put(space_id, graph_id, _qh, total_count)
                 total_count_capped = cap is not None and total_count > cap
                 if total_count_capped:
                     total_count = cap
@@ -762,6 +822,7 @@ class KGQueriesEndpoint:
                     relation_connections=None,
                     frame_connections=[],
                     total_count=total_count,
+                    total_count_kind=count_kind,
                     total_count_capped=total_count_capped,
                     page_size=0,
                     offset=0,
@@ -771,14 +832,15 @@ class KGQueriesEndpoint:
             # query first so we can skip the expensive paginated query if the
             # caller has already paged past the end of the result set.
             if query_request.offset > 0 and want_count:
-                count_results = await _checked_query(backend, space_id, count_query)
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = await self._run_count(
+                    backend, space_id, count_query, query_request)
                 total_count_capped = cap is not None and total_count > cap
                 if total_count_capped:
                     total_count = cap
                 # Only short-circuit on an exact count: a capped total is a
                 # lower bound, so an offset beyond it may still have rows.
-                if not total_count_capped and query_request.offset >= total_count:
+                if (not total_count_capped and count_kind == COUNT_EXACT
+                        and query_request.offset >= total_count):
                     t_query = _time.monotonic()
                     self.logger.info(
                         f"Frame query short-circuit: offset {query_request.offset} >= total {total_count}, "
@@ -789,6 +851,7 @@ class KGQueriesEndpoint:
                         relation_connections=None,
                         frame_connections=[],
                         total_count=total_count,
+                        total_count_kind=count_kind,
                         page_size=query_request.page_size,
                         offset=query_request.offset
                     )
@@ -796,9 +859,9 @@ class KGQueriesEndpoint:
             elif want_count:
                 results, count_results = await _gather_cancelling(
                     _checked_query(backend, space_id, sparql_query),
-                    _checked_query(backend, space_id, count_query),
+                    self._run_count(backend, space_id, count_query, query_request),
                 )
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = count_results
                 total_count_capped = cap is not None and total_count > cap
                 if total_count_capped:
                     total_count = cap
@@ -835,6 +898,7 @@ class KGQueriesEndpoint:
                 relation_connections=None,
                 frame_connections=connections,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=query_request.page_size,
                 offset=query_request.offset
             )
@@ -913,21 +977,24 @@ class KGQueriesEndpoint:
             
             # count_only short-circuit: run only the count query
             t0 = _time.monotonic()
+            count_kind = COUNT_EXACT
             if query_request.count_only:
                 _qh = _count_cache.query_hash(count_query)
                 _cached = _count_cache.get(space_id, graph_id, _qh)
                 if _cached is not None:
                     total_count = _cached
                 else:
-                    count_results = await _checked_query(backend, space_id, count_query)
-                    total_count = self._extract_total_count(count_results)
-                    _count_cache.put(space_id, graph_id, _qh, total_count)
+                    total_count, count_kind = await self._run_count(
+                        backend, space_id, count_query, query_request)
+                    if count_kind == COUNT_EXACT:
+                        _count_cache.put(space_id, graph_id, _qh, total_count)
                 self.logger.info(f"Frame_query count_only: {total_count}, {(_time.monotonic() - t0)*1000:.0f}ms")
                 return KGQueryResponse(
                     status=OperationStatus.EMPTY,
                     query_type="frame_query",
                     frame_results=[],
                     total_count=total_count,
+                    total_count_kind=count_kind,
                     page_size=0,
                     offset=0,
                 )
@@ -936,9 +1003,9 @@ class KGQueriesEndpoint:
             # query first so we can skip the expensive paginated query if the
             # caller has already paged past the end of the result set.
             if query_request.offset > 0:
-                count_results = await _checked_query(backend, space_id, count_query)
-                total_count = self._extract_total_count(count_results)
-                if query_request.offset >= total_count:
+                total_count, count_kind = await self._run_count(
+                    backend, space_id, count_query, query_request)
+                if count_kind == COUNT_EXACT and query_request.offset >= total_count:
                     t_query = _time.monotonic()
                     self.logger.info(
                         f"Frame_query short-circuit: offset {query_request.offset} >= total {total_count}, "
@@ -948,6 +1015,7 @@ class KGQueriesEndpoint:
                         query_type="frame_query",
                         frame_results=[],
                         total_count=total_count,
+                        total_count_kind=count_kind,
                         page_size=query_request.page_size,
                         offset=query_request.offset
                     )
@@ -955,9 +1023,9 @@ class KGQueriesEndpoint:
             else:
                 results, count_results = await _gather_cancelling(
                     _checked_query(backend, space_id, sparql_query),
-                    _checked_query(backend, space_id, count_query),
+                    self._run_count(backend, space_id, count_query, query_request),
                 )
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = count_results
             t_query = _time.monotonic()
             
             # Extract frame URIs
@@ -1007,6 +1075,7 @@ class KGQueriesEndpoint:
                 query_type="frame_query",
                 frame_results=frame_results,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=query_request.page_size,
                 offset=query_request.offset
             )
@@ -1346,30 +1415,33 @@ class KGQueriesEndpoint:
             
             # count_only short-circuit
             t0 = _time.monotonic()
+            count_kind = COUNT_EXACT
             if query_request.count_only:
                 _qh = _count_cache.query_hash(count_query)
                 _cached = _count_cache.get(space_id, graph_id, _qh)
                 if _cached is not None:
                     total_count = _cached
                 else:
-                    count_results = await _checked_query(backend, space_id, count_query)
-                    total_count = self._extract_total_count(count_results)
-                    _count_cache.put(space_id, graph_id, _qh, total_count)
+                    total_count, count_kind = await self._run_count(
+                        backend, space_id, count_query, query_request)
+                    if count_kind == COUNT_EXACT:
+                        _count_cache.put(space_id, graph_id, _qh, total_count)
                 self.logger.info(f"Document count_only: {total_count}, {(_time.monotonic() - t0)*1000:.0f}ms")
                 return KGQueryResponse(
                     status=OperationStatus.EMPTY,
                     query_type="document",
                     document_uris=[],
                     total_count=total_count,
+                    total_count_kind=count_kind,
                     page_size=0,
                     offset=0,
                 )
             
             # Count-first short-circuit for offset > 0
             if query_request.offset > 0:
-                count_results = await _checked_query(backend, space_id, count_query)
-                total_count = self._extract_total_count(count_results)
-                if query_request.offset >= total_count:
+                total_count, count_kind = await self._run_count(
+                    backend, space_id, count_query, query_request)
+                if count_kind == COUNT_EXACT and query_request.offset >= total_count:
                     t_query = _time.monotonic()
                     self.logger.info(
                         f"Document query short-circuit: offset {query_request.offset} >= total {total_count}, "
@@ -1379,6 +1451,7 @@ class KGQueriesEndpoint:
                         query_type="document",
                         document_uris=[],
                         total_count=total_count,
+                        total_count_kind=count_kind,
                         page_size=query_request.page_size,
                         offset=query_request.offset
                     )
@@ -1389,9 +1462,9 @@ class KGQueriesEndpoint:
                 results, count_results = await _gather_cancelling(
                     _checked_query(backend, space_id, sparql_query,
                                    multi_vector_config=_mv_config),
-                    _checked_query(backend, space_id, count_query),
+                    self._run_count(backend, space_id, count_query, query_request),
                 )
-                total_count = self._extract_total_count(count_results)
+                total_count, count_kind = count_results
             t_query = _time.monotonic()
             
             # Extract results based on query mode
@@ -1452,6 +1525,7 @@ class KGQueriesEndpoint:
                 document_uris=document_uris,
                 document_results=document_results,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=query_request.page_size,
                 offset=query_request.offset
             )
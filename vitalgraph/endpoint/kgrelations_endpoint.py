@@ -9,6 +9,7 @@ import asyncio
 import logging
 from typing import Dict, List, Optional, Union, Any
 from fastapi import APIRouter, Query, Depends, HTTPException, Body
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -55,7 +56,7 @@ class KGRelationsEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(__name__)
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self.haley_prefix = "http://vital.ai/ontology/haley-ai-kg#"
         self.vital_prefix = "http://vital.ai/ontology/vital-core#"
         
@@ -7,6 +7,7 @@ Based on the planned API specification in docs/planned_rest_api_endpoints.md
 import asyncio
 from typing import Dict, Any, Literal, Optional, List, Union
 from fastapi import APIRouter, HTTPException, Depends, Query, Body, Request, Response
+from ..api.fast_response import FastModelRoute
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import logging
@@ -21,6 +22,8 @@ from ..kg_impl.kgtypes_read_impl import KGTypesReadProcessor
 from ..kg_impl.kgtypes_update_impl import KGTypesUpdateProcessor
 from ..kg_impl.kgtypes_delete_impl import KGTypesDeleteProcessor
 from ..kg_impl.kg_backend_utils import create_backend_adapter
+from ..cache.etag_cache import _etag_cache, conditional, etag_matches, not_modified_response
+from ..signal.entity_graph_invalidation import invalidate_graph_caches
 from vitalgraph.model.quad_model import Quad, QuadRequest, QuadResponse, QuadResultsResponse
 from vitalgraph.utils.quad_format_utils import quad_list_to_graphobjects, graphobjects_to_quad_list
 from ..model.kgtypes_model import KGTypeFilter
@@ -46,7 +49,7 @@ class KGTypesEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(f"{__name__}.KGTypesEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         
         # Initialize KGType services with new atomic processors
         self.kgtypes_create_processor = KGTypesCreateProcessor()
@@ -64,16 +67,17 @@ class KGTypesEndpoint:
             return SP_KG_TYPES_GRAPH
         return f"urn:vitalgraph:{space_id}:kg_types"
 
-    def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
-                            subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
+    async def _schedule_auto_sync(self, backend_impl, space_id: str, graph_id: str,
+                                  subject_uris: List[str], operation: Literal["upsert", "delete"] = "upsert") -> None:
         """Schedule background auto-sync for vector and geo data.
 
-        Fire-and-forget: failures are logged but never block the response.
+        Fire-and-forget: failures are logged but never block the response;
+        only a sync backlog above the queue's high-water mark delays it briefly.
         """
         db_impl = getattr(backend_impl, 'db_impl', None)
         if db_impl and subject_uris:
-            from ..vectorization.auto_sync import schedule_sync
-            schedule_sync(
+            from ..vectorization.auto_sync import enqueue_sync
+            await enqueue_sync(
                 db_impl=db_impl,
                 space_id=space_id,
                 subject_uris=subject_uris,
@@ -118,13 +122,18 @@ class KGTypesEndpoint:
             type_uri: Optional[str] = Query(None, description="Filter by KGType subclass URI (e.g. haley-ai-kg#KGFrameType)"),
             uri: Optional[str] = Query(None, description="Get specific type by URI"),
             uri_list: Optional[str] = Query(None, description="Get multiple types by comma-separated URI list"),
+            request: Request = None,
+            response: Response = None,
             current_user: Dict = Depends(self.auth_dependency),
         ):
             require_space_read(current_user, space_id)
             graph_id = self._types_graph(space_id)
-            # Handle specific URI request
+            # Handle specific URI request (conditional: ETag / If-None-Match)
             if uri:
-                return await self._get_kgtype_by_uri(space_id, graph_id, uri, current_user)
+                return await self._get_kgtype_by_uri(
+                    space_id, graph_id, uri, current_user,
+                    if_none_match=request.headers.get("if-none-match") if request else None,
+                    response=response)
             
             # Handle multiple URI request
             elif uri_list:
@@ -170,7 +179,11 @@ class KGTypesEndpoint:
         ):
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
-            return await self._create_type_relationship(space_id, self._types_graph(space_id), id, body.edge_type, body.target_uri, current_user)
+            try:
+                return await self._create_type_relationship(space_id, self._types_graph(space_id), id, body.edge_type, body.target_uri, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
 
         # DELETE /api/graphs/kgtypes/relationships - Delete a type-level edge
         @self.router.delete(
@@ -188,7 +201,11 @@ class KGTypesEndpoint:
         ):
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
-            return await self._delete_type_relationship(space_id, self._types_graph(space_id), id, edge_uri, current_user)
+            try:
+                return await self._delete_type_relationship(space_id, self._types_graph(space_id), id, edge_uri, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
 
         # GET /api/graphs/kgtypes/documentation - Get type documentation
         @self.router.get(
@@ -222,7 +239,11 @@ class KGTypesEndpoint:
         ):
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
-            return await self._update_type_documentation(space_id, self._types_graph(space_id), id, body.content, current_user)
+            try:
+                return await self._update_type_documentation(space_id, self._types_graph(space_id), id, body.content, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
 
         # DELETE /api/graphs/kgtypes/documentation - Delete type documentation
         @self.router.delete(
@@ -239,7 +260,11 @@ class KGTypesEndpoint:
         ):
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
-            return await self._delete_type_documentation(space_id, self._types_graph(space_id), id, current_user)
+            try:
+                return await self._delete_type_documentation(space_id, self._types_graph(space_id), id, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
 
         # GET /api/graphs/kgtypes/search - Search types
         @self.router.get(
@@ -278,7 +303,11 @@ class KGTypesEndpoint:
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
             quads = body.quads
-            return await self._create_kgtypes(space_id, self._types_graph(space_id), quads, current_user)
+            try:
+                return await self._create_kgtypes(space_id, self._types_graph(space_id), quads, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
         
         # PUT /api/graphs/kgtypes - Update KG types
         @self.router.put(
@@ -296,7 +325,11 @@ class KGTypesEndpoint:
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
             quads = body.quads
-            return await self._update_kgtypes(space_id, self._types_graph(space_id), quads, current_user)
+            try:
+                return await self._update_kgtypes(space_id, self._types_graph(space_id), quads, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id))
         
         # DELETE /api/graphs/kgtypes - Delete KG types
         @self.router.delete(
@@ -315,7 +348,11 @@ class KGTypesEndpoint:
         ):
             require_system_space_write(current_user, space_id)
             require_space_write(current_user, space_id)
-            return await self._delete_kgtypes(space_id, self._types_graph(space_id), uri, uri_list, request.data if request else None, current_user)
+            try:
+                return await self._delete_kgtypes(space_id, self._types_graph(space_id), uri, uri_list, request.data if request else None, current_user)
+            finally:
+                await invalidate_graph_caches(
+                    self.space_manager, space_id, self._types_graph(space_id), "deleted")
     
     async def _get_type_description_text(self, type_uri: str, mapping_type: str):
         """Fetch type-specific description from sp_kg_types via the description lookup."""
@@ -413,9 +450,21 @@ class KGTypesEndpoint:
         graph_id: str,
         uri: str,
         current_user: Dict,
+        if_none_match: Optional[str] = None,
+        response: Optional[Response] = None,
     ) -> QuadResultsResponse:
-        """Get a specific KGType by URI."""
+        """Get a specific KGType by URI.
+
+        Types are read far more often than they change, so this is the GET
+        that gains most from revalidation: a matching cached
+        validator is a 304 without loading the types space.
+        """
         try:
+            if if_none_match:
+                etag = _etag_cache.get(space_id, graph_id, uri, "type")
+                if etag_matches(if_none_match, etag):
+                    return not_modified_response(etag)
+
             space_record = await self.space_manager.get_space_or_load(space_id)
             if not space_record:
                 raise HTTPException(status_code=503, detail=f"Space {space_id} not available - server configuration error")
@@ -443,6 +492,10 @@ class KGTypesEndpoint:
                 )
 
             quads = await asyncio.to_thread(graphobjects_to_quad_list, [kgtype_object], graph_id)
+            _, not_modified = conditional(
+                space_id, graph_id, uri, "type", quads, if_none_match, response)
+            if not_modified is not None:
+                return not_modified
             return QuadResultsResponse(
                 status=OperationStatus.FOUND,
                 message=f"Found KGType '{uri}'",
@@ -555,7 +608,7 @@ class KGTypesEndpoint:
                     backend=backend_adapter, space_id=space_id, graph_id=graph_id, kgtype_objects=kgtype_objects)
 
             # Trigger background vector/FTS sync for new KGTypes
-            self._schedule_auto_sync(backend, space_id, graph_id, created_uris)
+            await self._schedule_auto_sync(backend, space_id, graph_id, created_uris)
 
             # Invalidate type description cache for created types
             from vitalgraph.vectorization.kgtype_description_lookup import invalidate_cache
@@ -630,7 +683,7 @@ class KGTypesEndpoint:
                 backend=backend_adapter, space_id=space_id, graph_id=graph_id, kgtype_updates=kgtype_updates)
 
             # Trigger background vector/FTS sync for updated KGTypes
-            self._schedule_auto_sync(backend, space_id, graph_id, updated_uris)
+            await self._schedule_auto_sync(backend, space_id, graph_id, updated_uris)
 
             # Invalidate type description cache for updated types
             from vitalgraph.vectorization.kgtype_description_lookup import invalidate_cache
@@ -818,7 +871,7 @@ class KGTypesEndpoint:
                 
                 # Trigger background vector/FTS cleanup for deleted KGTypes
                 if deleted_uris_str:
-                    self._schedule_auto_sync(backend, space_id, graph_id, deleted_uris_str, operation="delete")
+                    await self._schedule_auto_sync(backend, space_id, graph_id, deleted_uris_str, operation="delete")
                 
                 self.logger.debug(f"Delete response - deleted_uris type: {type(deleted_uris)}, deleted_uris_str type: {type(deleted_uris_str)}")
                 self.logger.debug(f"Delete response - deleted_uris: {deleted_uris}, deleted_uris_str: {deleted_uris_str}")
@@ -8,6 +8,7 @@ Graph objects represent RDF resources with their associated triples.
 import asyncio
 from typing import Dict, List, Optional, Union, Any
 from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response, Body
+from ..api.fast_response import FastModelRoute
 from pydantic import BaseModel, Field
 import logging
 
@@ -25,7 +26,7 @@ class GraphObjectsEndpoint:
     def __init__(self, space_manager, auth_dependency):
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self.logger = logging.getLogger(f"{__name__}.GraphObjectsEndpoint")
         
         # Initialize object service
@@ -0,0 +1,89 @@
+"""
+OpenMetrics exposition of the in-process metrics registry.
+
+GET /metrics — latency histograms (HTTP, SPARQL pipeline stages, pool
+acquire, sidecar, embeddings) plus, read at scrape time, the hit/miss
+counters of the count, entity-graph and compile caches and the database
+pool's size.
+
+Unauthenticated, like ``/health``, so that a scraper needs no token; it
+exposes timings and counters only, never space ids, queries or data.
+The JSON ``/api/metrics`` routes (PostgreSQL-backed, per space) are
+unchanged.
+"""
+
+import logging
+from typing import Callable, Iterable, List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..metrics.histograms import OPENMETRICS_CONTENT_TYPE, Family, registry
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_stats():
+    from ..cache.count_cache import _count_cache
+    from ..cache.entity_graph_cache import _entity_graph_cache
+    caches = [('count', _count_cache), ('entity_graph', _entity_graph_cache)]
+    try:
+        from ..db.sparql_sql.sparql_sql_space_impl import _compile_cache
+        caches.append(('compile', _compile_cache))
+    except ImportError as e:
+        logger.debug("compile cache not available for /metrics: %s", e)
+    return [(name, cache.stats) for name, cache in caches]
+
+
+def collect_caches() -> Iterable[Family]:
+    """Hits, misses, hit ratio and entry count of the process-wide caches."""
+    hits, misses, ratio, entries = [], [], [], []
+    for name, stats in _cache_stats():
+        labels = {'cache': name}
+        h, m = stats.get('hits', 0), stats.get('misses', 0)
+        hits.append((labels, h))
+        misses.append((labels, m))
+        ratio.append((labels, h / (h + m) if h + m else 0.0))
+        entries.append((labels, stats.get('entries', stats.get('size', 0))))
+    return [
+        ('vitalgraph_cache_hits', 'counter', 'Cache lookups answered from the cache.', hits),
+        ('vitalgraph_cache_misses', 'counter', 'Cache lookups that missed.', misses),
+        ('vitalgraph_cache_hit_ratio', 'gauge', 'Hits over lookups since start.', ratio),
+        ('vitalgraph_cache_entries', 'gauge', 'Entries currently cached.', entries),
+    ]
+
+
+def pool_collector(get_pool: Callable[[], Optional[object]]) -> Callable[[], Iterable[Family]]:
+    """Collector for an asyncpg pool's size, idle count and maximum."""
+
+    def collect() -> Iterable[Family]:
+        pool = get_pool()
+        if pool is None or not hasattr(pool, 'get_size'):
+            return []
+        families: List[Family] = [
+            ('vitalgraph_db_pool_connections', 'gauge',
+             'Open connections in the database pool.', [({}, pool.get_size())]),
+            ('vitalgraph_db_pool_idle_connections', 'gauge',
+             'Idle connections in the database pool.', [({}, pool.get_idle_size())]),
+            ('vitalgraph_db_pool_max_connections', 'gauge',
+             'Configured maximum of the database pool.', [({}, pool.get_max_size())]),
+        ]
+        return families
+
+    return collect
+
+
+class OpenMetricsEndpoint:
+    """Serves the process metrics registry on ``/metrics``."""
+
+    def __init__(self, get_pool: Optional[Callable[[], Optional[object]]] = None):
+        self.router = APIRouter()
+        registry.register_collector(collect_caches)
+        if get_pool is not None:
+            registry.register_collector(pool_collector(get_pool))
+        self._setup_routes()
+
+    def _setup_routes(self):
+        @self.router.get("/metrics", include_in_schema=False)
+        async def get_openmetrics():
+            return Response(content=registry.render(), media_type=OPENMETRICS_CONTENT_TYPE)
@@ -6,6 +6,7 @@ following the SPARQL 1.1 Protocol specification.
 
 from typing import Dict, List, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, Form, Body, Query
+from ..api.fast_response import FastModelRoute
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import logging
@@ -24,7 +25,7 @@ class SPARQLQueryEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(f"{__name__}.SPARQLQueryEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self._setup_routes()
     
     def _setup_routes(self):
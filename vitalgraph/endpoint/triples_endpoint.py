@@ -6,6 +6,7 @@ Based on the planned API specification in docs/planned_rest_api_endpoints.md
 
 from typing import Dict, List, Any, Optional, Union
 from fastapi import APIRouter, HTTPException, Depends, Query, Body
+from ..api.fast_response import FastModelRoute
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import logging
@@ -19,6 +20,10 @@ from ..model.triples_model import (
 )
 from ..model.result_status import OperationStatus
 from ..auth.role_dependencies import require_space_read, require_space_write
+from ..db.sparql_sql.count_mode import (
+    COUNT_MODE_DESCRIPTION, EXACT, CountMode, finish_count, parse_count_mode, resolve_count,
+)
+from ..signal.entity_graph_invalidation import invalidate_graph_caches
 
 
 class TriplesEndpoint:
@@ -28,7 +33,7 @@ class TriplesEndpoint:
         self.space_manager = space_manager
         self.auth_dependency = auth_dependency
         self.logger = logging.getLogger(f"{__name__}.TriplesEndpoint")
-        self.router = APIRouter()
+        self.router = APIRouter(route_class=FastModelRoute)
         self._setup_routes()
     
     def _setup_routes(self):
@@ -51,11 +56,17 @@ class TriplesEndpoint:
             predicate: Optional[str] = Query(None, description="Predicate URI to filter by"),
             object: Optional[str] = Query(None, description="Object value to filter by"),
             object_filter: Optional[str] = Query(None, description="Keyword to search within object values"),
+            count_mode: Optional[str] = Query(None, description=COUNT_MODE_DESCRIPTION),
             current_user: Dict = Depends(self.auth_dependency)
         ):
             require_space_read(current_user, space_id)
+            try:
+                mode = parse_count_mode(count_mode)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
             return await self._list_triples(
-                space_id, graph_id, page_size, offset, subject, predicate, object, object_filter, current_user
+                space_id, graph_id, page_size, offset, subject, predicate, object, object_filter, current_user,
+                count_mode=mode,
             )
         
         # POST /api/graphs/triples - Add new triples
@@ -73,7 +84,10 @@ class TriplesEndpoint:
             current_user: Dict = Depends(self.auth_dependency)
         ):
             require_space_write(current_user, space_id)
-            return await self._add_triples(space_id, graph_id, request, current_user)
+            try:
+                return await self._add_triples(space_id, graph_id, request, current_user)
+            finally:
+                await invalidate_graph_caches(self.space_manager, space_id, graph_id)
         
         # DELETE /api/graphs/triples - Delete specific triples
         @self.router.delete(
@@ -90,7 +104,10 @@ class TriplesEndpoint:
             current_user: Dict = Depends(self.auth_dependency)
         ):
             require_space_write(current_user, space_id)
-            return await self._delete_triples(space_id, graph_id, request, current_user)
+            try:
+                return await self._delete_triples(space_id, graph_id, request, current_user)
+            finally:
+                await invalidate_graph_caches(self.space_manager, space_id, graph_id, "deleted")
     
     async def _list_triples(
         self,
@@ -102,9 +119,15 @@ class TriplesEndpoint:
         predicate: Optional[str],
         object: Optional[str],
         object_filter: Optional[str],
-        current_user: Dict
+        current_user: Dict,
+        count_mode: CountMode = EXACT,
     ) -> TripleListResponse:
-        """List triples with filtering and pagination."""
+        """List triples with filtering and pagination.
+
+        ``count_mode`` picks how ``total_count`` is produced.
+        Under ``estimated`` a predicate-only listing is answered from the
+        predicate stats; anything else asks the planner about the count SQL.
+        """
         
         try:
             self.logger.info(f"Listing triples in space '{space_id}', graph '{graph_id}' for user '{current_user.get('username', 'unknown')}'")
@@ -168,12 +191,27 @@ class TriplesEndpoint:
                 
                 query_time = time.time() - start_time
                 
-                # Get total count with SPARQL COUNT query
+                # Total count, as count_mode asks for it
                 count_query = self._build_count_sparql_query(
                     graph_id, subject, predicate, object, object_filter
                 )
-                count_results = await db_space_impl.query_quads(space_id, count_query)
-                total_count = int(count_results[0].get('count', {}).get('value', 0)) if count_results else 0
+
+                async def _run_count(q: str) -> int:
+                    rows = await db_space_impl.query_quads(space_id, q)
+                    return int(rows[0].get('count', {}).get('value', 0)) if rows else 0
+
+                estimators = []
+                pattern_fn = getattr(db_space_impl, 'estimate_pattern_count', None)
+                if (pattern_fn and predicate and not subject and not object_filter
+                        and (object is None or self._is_uri(object))):
+                    estimators.append(lambda: pattern_fn(
+                        space_id, predicate, [object] if object else None))
+                sparql_fn = getattr(db_space_impl, 'estimate_sparql_count', None)
+                if sparql_fn:
+                    estimators.append(lambda: sparql_fn(space_id, count_query))
+                total_count, count_kind = await resolve_count(
+                    count_mode, count_query, _run_count, estimators)
+                total_count = finish_count(total_count, count_kind, offset, len(quad_results))
                         
             except Exception as e:
                 self.logger.error(f"Error executing SPARQL query: {e}")
@@ -189,6 +227,7 @@ class TriplesEndpoint:
             return TripleListResponse(
                 status=OperationStatus.FOUND if quad_results else OperationStatus.EMPTY,
                 total_count=total_count,
+                total_count_kind=count_kind,
                 page_size=page_size,
                 offset=offset,
                 results=quad_results,
@@ -414,6 +453,11 @@ class TriplesEndpoint:
         else:
             return f'"{value}"'
     
+    @staticmethod
+    def _is_uri(value: str) -> bool:
+        from vital_ai_vitalsigns.utils.uri_utils import validate_rfc3986
+        return bool(validate_rfc3986(value, rule='URI'))
+
     def _build_sparql_query(self, graph_id: str, subject: str = None, predicate: str = None, 
                            object: str = None, object_filter: str = None, 
                            limit: int = 100, offset: int = 0) -> str:
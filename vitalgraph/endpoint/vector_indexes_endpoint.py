@@ -24,6 +24,7 @@ from pydantic import BaseModel, Field
 
 from ..auth.role_dependencies import require_space_read, require_space_write
 from ..db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
+from ..db.vector_storage import storage_config, validate_storage
 from ..model.result_status import OperationStatus
 from ..model.vector_indexes_model import (
     VectorIndexOut, VectorIndexListResponse, VectorIndexDeleteResponse,
@@ -194,6 +195,22 @@ class VectorIndexesEndpoint:
                 message=dim_error,
             )
 
+        try:
+            storage, _ = storage_config(body.provider_config)
+            storage_error = validate_storage(storage, body.dimensions)
+        except (TypeError, ValueError) as e:
+            storage, storage_error = None, str(e)
+        if storage_error:
+            return VectorIndexOut(
+                index_id=0,
+                index_name=body.index_name,
+                dimensions=body.dimensions,
+                distance_metric=body.distance_metric,
+                provider=body.provider,
+                status=OperationStatus.INVALID_REQUEST,
+                message=storage_error,
+            )
+
         conn = await self._acquire()
         try:
             table = f"{space_id}_vector_index"
@@ -244,6 +261,7 @@ class VectorIndexesEndpoint:
             # Create the backing data table + indexes
             stmts = self.schema.create_vector_data_table_sql(
                 space_id, body.index_name, body.dimensions, body.distance_metric,
+                storage,
             )
             for stmt in stmts:
                 await conn.execute(stmt)
@@ -405,6 +423,8 @@ class VectorIndexesEndpoint:
             upserted = 0
             errors = []
 
+            rows = []  # (subject_uri, (subject_uuid, context_uuid, embedding))
+            terms = {}
             for entry in body.vectors:
                 if len(entry.embedding) != expected_dims:
                     errors.append(
@@ -414,33 +434,41 @@ class VectorIndexesEndpoint:
 
                 subject_uuid = uuid.uuid5(ns, f"{entry.subject_uri}\x00U")
                 context_uuid = uuid.uuid5(ns, f"{entry.graph_uri}\x00U")
-                vec_str = "[" + ",".join(str(v) for v in entry.embedding) + "]"
+                terms[subject_uuid] = entry.subject_uri
+                terms[context_uuid] = entry.graph_uri
+                rows.append((entry.subject_uri, (subject_uuid, context_uuid, entry.embedding)))
+
+            if rows:
+                from ..db.vector_codec import vector_arg
+                from ..vectorization.vector_populator import (
+                    UPSERT_VECTOR_SQL, upsert_vectors as upsert_vector_rows,
+                )
 
+                # Ensure URIs are in the term table so get_vectors can
+                # resolve UUIDs back to human-readable URIs (issue #008)
+                term_sql = (
+                    f"INSERT INTO {term_table} (term_uuid, term_text, term_type) "
+                    f"VALUES ($1, $2, 'U') ON CONFLICT DO NOTHING"
+                )
                 try:
-                    # Ensure URIs are in the term table so get_vectors can
-                    # resolve UUIDs back to human-readable URIs (issue #008)
-                    await conn.execute(
-                        f"INSERT INTO {term_table} (term_uuid, term_text, term_type) "
-                        f"VALUES ($1, $2, 'U') ON CONFLICT DO NOTHING",
-                        subject_uuid, entry.subject_uri,
-                    )
-                    await conn.execute(
-                        f"INSERT INTO {term_table} (term_uuid, term_text, term_type) "
-                        f"VALUES ($1, $2, 'U') ON CONFLICT DO NOTHING",
-                        context_uuid, entry.graph_uri,
-                    )
-                    await conn.execute(
-                        f"""INSERT INTO {vec_table}
-                            (subject_uuid, context_uuid, embedding, updated_time)
-                            VALUES ($1, $2, $3::vector, CURRENT_TIMESTAMP)
-                            ON CONFLICT (subject_uuid, context_uuid)
-                            DO UPDATE SET embedding = EXCLUDED.embedding,
-                                          updated_time = CURRENT_TIMESTAMP""",
-                        subject_uuid, context_uuid, vec_str,
-                    )
-                    upserted += 1
+                    # One binary COPY for the request's vectors.
+                    await conn.executemany(term_sql, list(terms.items()))
+                    upserted = await upsert_vector_rows(conn, vec_table, [r for _, r in rows])
                 except Exception as e:
-                    errors.append(f"{entry.subject_uri}: {e}")
+                    # Find the offending entries one by one.
+                    logger.warning("Batch vector upsert into %s failed (%s); "
+                                   "retrying per vector", vec_table, e)
+                    for subject_uri, row in rows:
+                        try:
+                            await conn.executemany(
+                                term_sql, [(row[0], subject_uri), (row[1], terms[row[1]])])
+                            await conn.execute(
+                                UPSERT_VECTOR_SQL.format(vec_table=vec_table),
+                                row[0], row[1], await vector_arg(conn, row[2]),
+                            )
+                            upserted += 1
+                        except Exception as e2:
+                            errors.append(f"{subject_uri}: {e2}")
 
             if errors and upserted:
                 upsert_status = OperationStatus.PARTIAL
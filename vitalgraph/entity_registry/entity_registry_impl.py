@@ -36,7 +36,9 @@ from .entity_metadata_ops import MetadataMixin
 from .entity_registry_id import generate_entity_id, entity_id_to_uri, uri_to_entity_id
 from .entity_registry_schema import EntityRegistrySchema
 from .entity_relationship_ops import RelationshipMixin
-from .entity_same_as_ops import SameAsMixin
+from .entity_same_as_ops import (
+    SameAsMixin, lock_same_as, rebuild_canonical, same_as_tree_members,
+)
 from .entity_registry_vector_populator import EntityRegistryVectorPopulator
 from .entity_status import ACTIVE, DELETED, RETRACTED, ENTITY_STATUSES
 
@@ -634,6 +636,12 @@ class EntityRegistryImpl(
                               "WHERE status = $1 AND primary_name = $2")
                     args = [DELETED, primary_name]
 
+                # Same-as trees the purged entities sit in are re-derived
+                # once their mappings are gone (entity_canonical).
+                await lock_same_as(conn)
+                purged = [r['entity_id'] for r in await conn.fetch(target, *args)]
+                members = await same_as_tree_members(conn, purged)
+
                 # entity_same_as does not cascade — clear both directions
                 # first or the delete below fails on the FK.
                 await conn.execute(
@@ -643,6 +651,9 @@ class EntityRegistryImpl(
                 result = await conn.execute(
                     f"DELETE FROM entity WHERE entity_id IN ({target})", *args)
 
+                purged_set = set(purged)
+                await rebuild_canonical(conn, [m for m in members if m not in purged_set])
+
         # asyncpg returns e.g. "DELETE 28"
         try:
             count = int(str(result).split()[-1])
@@ -127,6 +127,18 @@ class EntityRegistrySchema:
             )
         ''',
 
+        # Materialized same-as resolution: the root each merged
+        # entity resolves to. Maintained by create/retract_same_as; entities
+        # without a row are canonical.
+        'entity_canonical': '''
+            CREATE TABLE IF NOT EXISTS entity_canonical (
+                entity_id VARCHAR(50) PRIMARY KEY REFERENCES entity(entity_id) ON DELETE CASCADE,
+                canonical_id VARCHAR(50) NOT NULL REFERENCES entity(entity_id) ON DELETE CASCADE,
+                updated_time TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+                CONSTRAINT no_self_canonical CHECK (entity_id != canonical_id)
+            )
+        ''',
+
         'category': '''
             CREATE TABLE IF NOT EXISTS category (
                 category_id SERIAL PRIMARY KEY,
@@ -302,6 +314,7 @@ class EntityRegistrySchema:
         'CREATE INDEX IF NOT EXISTS idx_same_as_source ON entity_same_as(source_entity_id)',
         'CREATE INDEX IF NOT EXISTS idx_same_as_target ON entity_same_as(target_entity_id)',
         'CREATE INDEX IF NOT EXISTS idx_same_as_status ON entity_same_as(status)',
+        'CREATE INDEX IF NOT EXISTS idx_canonical_root ON entity_canonical(canonical_id)',
 
         'CREATE INDEX IF NOT EXISTS idx_category_key ON category(category_key)',
 
@@ -481,7 +494,22 @@ class EntityRegistrySchema:
 
     def migrations_sql(self) -> List[str]:
         """Get SQL statements for schema migrations (safe to re-run)."""
-        return list(self.MIGRATIONS) + self._status_standardization_sql()
+        return (list(self.MIGRATIONS) + self._status_standardization_sql()
+                + [self._canonical_backfill_sql()])
+
+    @staticmethod
+    def _canonical_backfill_sql() -> str:
+        """Populate entity_canonical from existing same-as mappings, once.
+
+        Only while the table is empty: afterwards create/retract_same_as keep
+        it exact, and re-deriving it here would race with them.
+        """
+        from .entity_same_as_ops import canonical_rows_sql
+        return (
+            "INSERT INTO entity_canonical (entity_id, canonical_id) "
+            f"SELECT entity_id, canonical_id FROM ({canonical_rows_sql(scoped=False)}) c "
+            "WHERE NOT EXISTS (SELECT 1 FROM entity_canonical)"
+        )
 
     @staticmethod
     def _status_standardization_sql() -> List[str]:
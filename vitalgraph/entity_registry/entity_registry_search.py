@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 
 import asyncpg
 
+from vitalgraph.db.vector_codec import vector_arg
 from vitalgraph.entity_registry.entity_registry_vector_schema import (
     ENTITY_VECTOR_TABLE, LOCATION_VECTOR_TABLE, GEO_TABLE,
     FTS_ENTITY_TABLE, FTS_LOCATION_TABLE,
@@ -60,14 +61,13 @@ class EntityRegistrySearch:
         """
         # Vectorize query
         query_vec = await self._provider.vectorize_text(query)
-        query_vec_str = f"[{','.join(str(v) for v in query_vec)}]"
 
         # Min distance threshold: cosine distance = 1 - similarity
         max_distance = 1.0 - min_certainty
 
         # Build filter clauses
         filters = []
-        params: list = [query_vec_str, max_distance, limit]
+        params: list = [query_vec, max_distance, limit]
         param_idx = 4
 
         if type_key:
@@ -129,6 +129,7 @@ class EntityRegistrySearch:
         """
 
         async with self.pool.acquire() as conn:
+            params[0] = await vector_arg(conn, query_vec)
             rows = await conn.fetch(sql, *params)
 
         return [dict(row) for row in rows]
@@ -156,11 +157,10 @@ class EntityRegistrySearch:
         alpha: Weight for vector score (0=pure BM25, 1=pure vector).
         """
         query_vec = await self._provider.vectorize_text(query)
-        query_vec_str = f"[{','.join(str(v) for v in query_vec)}]"
 
         # Build filter clauses on entity table
         filters = []
-        params: list = [query_vec_str, query, limit]
+        params: list = [query_vec, query, limit]
         param_idx = 4
 
         if type_key:
@@ -239,6 +239,7 @@ class EntityRegistrySearch:
         """
 
         async with self.pool.acquire() as conn:
+            params[0] = await vector_arg(conn, query_vec)
             rows = await conn.fetch(sql, *params)
 
         return [dict(row) for row in rows]
@@ -346,10 +347,11 @@ class EntityRegistrySearch:
         # Optional semantic filter via vector similarity
         vec_join = ""
         vec_order = ""
+        vec_pos = None
         if q:
             query_vec = await self._provider.vectorize_text(q)
-            query_vec_str = f"[{','.join(str(v) for v in query_vec)}]"
-            params.append(query_vec_str)
+            vec_pos = len(params)
+            params.append(query_vec)
             vec_join = f"""
                 JOIN {LOCATION_VECTOR_TABLE} lv ON lv.location_id = el.location_id
             """
@@ -422,6 +424,8 @@ class EntityRegistrySearch:
         """
 
         async with self.pool.acquire() as conn:
+            if vec_pos is not None:
+                params[vec_pos] = await vector_arg(conn, query_vec)
             rows = await conn.fetch(sql, *params)
 
         return [dict(row) for row in rows]
@@ -534,11 +538,10 @@ class EntityRegistrySearch:
         within radius_km. Returns results sorted by vector similarity.
         """
         query_vec = await self._provider.vectorize_text(query)
-        query_vec_str = f"[{','.join(str(v) for v in query_vec)}]"
         radius_meters = radius_km * 1000.0
         max_distance = 1.0 - min_certainty
 
-        params: list = [query_vec_str, longitude, latitude, radius_meters, max_distance, limit]
+        params: list = [query_vec, longitude, latitude, radius_meters, max_distance, limit]
         param_idx = 7
 
         filters = []
@@ -599,6 +602,7 @@ class EntityRegistrySearch:
         """
 
         async with self.pool.acquire() as conn:
+            params[0] = await vector_arg(conn, query_vec)
             rows = await conn.fetch(sql, *params)
 
             # Enrich with location data for each entity
@@ -19,6 +19,7 @@ from typing import List, Optional
 
 import asyncpg
 
+from vitalgraph.db.vector_codec import copy_upsert_vectors
 from vitalgraph.entity_registry.entity_registry_vector_schema import (
     ENTITY_VECTOR_TABLE, LOCATION_VECTOR_TABLE, GEO_TABLE,
     FTS_ENTITY_TABLE, FTS_LOCATION_TABLE, DIMENSIONS,
@@ -46,11 +47,6 @@ def location_id_to_uuid(location_id: int) -> uuid.UUID:
     return uuid.uuid5(_NAMESPACE, f"vitalgraph:location:{location_id}")
 
 
-def _vec_to_str(embedding: List[float]) -> str:
-    """Convert embedding list to pgvector literal string '[0.1,0.2,...]'."""
-    return '[' + ','.join(str(x) for x in embedding) + ']'
-
-
 # ---------------------------------------------------------------------------
 # Search text builders (hardcoded — same logic as entity_weaviate_schema.py)
 # ---------------------------------------------------------------------------
@@ -255,18 +251,16 @@ class EntityRegistryVectorPopulator:
 
         # Insert into vector + FTS tables
         async with self.pool.acquire() as conn:
-            # Vector table
-            await conn.executemany(f"""
-                INSERT INTO {ENTITY_VECTOR_TABLE} (subject_uuid, entity_id, {self._embedding_column}, search_text, updated_time)
-                VALUES ($1, $2, $3::vector, $4, CURRENT_TIMESTAMP)
-                ON CONFLICT (subject_uuid) DO UPDATE
-                SET {self._embedding_column} = EXCLUDED.{self._embedding_column},
-                    search_text = EXCLUDED.search_text,
-                    updated_time = CURRENT_TIMESTAMP
-            """, [
-                (str(rec[0]), rec[1], _vec_to_str(embeddings[idx]), rec[2])
-                for idx, rec in enumerate(records)
-            ])
+            # Vector table: one binary COPY + merge
+            await copy_upsert_vectors(
+                conn, ENTITY_VECTOR_TABLE,
+                ('subject_uuid', 'entity_id', self._embedding_column, 'search_text'),
+                [(str(rec[0]), rec[1], embeddings[idx], rec[2])
+                 for idx, rec in enumerate(records)],
+                conflict_columns=('subject_uuid',),
+                vector_column=self._embedding_column,
+                update_columns=(self._embedding_column, 'search_text'),
+            )
 
             # FTS table
             await conn.executemany(f"""
@@ -353,19 +347,17 @@ class EntityRegistryVectorPopulator:
             return
 
         async with self.pool.acquire() as conn:
-            # Location vector table
-            await conn.executemany(f"""
-                INSERT INTO {LOCATION_VECTOR_TABLE}
-                    (subject_uuid, location_id, entity_id, {self._embedding_column}, search_text, updated_time)
-                VALUES ($1, $2, $3, $4::vector, $5, CURRENT_TIMESTAMP)
-                ON CONFLICT (subject_uuid) DO UPDATE
-                SET {self._embedding_column} = EXCLUDED.{self._embedding_column},
-                    search_text = EXCLUDED.search_text,
-                    updated_time = CURRENT_TIMESTAMP
-            """, [
-                (str(rec[0]), rec[1], rec[2], _vec_to_str(embeddings[idx]), rec[3])
-                for idx, rec in enumerate(records)
-            ])
+            # Location vector table: one binary COPY + merge
+            await copy_upsert_vectors(
+                conn, LOCATION_VECTOR_TABLE,
+                ('subject_uuid', 'location_id', 'entity_id',
+                 self._embedding_column, 'search_text'),
+                [(str(rec[0]), rec[1], rec[2], embeddings[idx], rec[3])
+                 for idx, rec in enumerate(records)],
+                conflict_columns=('subject_uuid',),
+                vector_column=self._embedding_column,
+                update_columns=(self._embedding_column, 'search_text'),
+            )
 
             # FTS location table
             await conn.executemany(f"""
@@ -1,12 +1,109 @@
 """
 Same-As operations mixin for the Entity Registry.
+
+Resolution reads a materialized canonical-id table. Same-as
+mappings form a forest: a duplicate points at the entity it was merged
+into, and the canonical entity is the root of its tree. Following that
+chain used to cost one ``SELECT target_entity_id … LIMIT 1`` per hop — for
+every resolve and again for the cycle check on every create — so
+resolving a batch of incoming ids cost tens of thousands of queries.
+
+``entity_canonical`` holds, for every entity that has been merged, the
+root it currently resolves to (entities without a row are their own
+canonical). It is the union-find structure with full path compression,
+kept exact by the two writers:
+
+* ``create_same_as(A, T)`` — A must be a root (an entity merges into one
+  target; see below). It cycles iff T's root is A, one lookup. A and
+  every entity rooted at A are re-pointed at T's root.
+* ``retract_same_as`` / purge — the affected tree is re-derived from the
+  remaining active mappings with one recursive query scoped to it.
+
+Both run under one transaction-scoped advisory lock, so the table never
+reflects a half-applied merge. ``resolve_entity`` is then a primary-key
+lookup and ``resolve_entities`` answers any number of ids in one query.
+
+A second active mapping from an already-merged source is rejected: with
+two targets the old chain walk followed whichever row ``LIMIT 1``
+returned first. Existing data with several is resolved through the
+earliest mapping, which is what the walk usually returned.
 """
 
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 from .entity_status import ACTIVE, MERGED, RETRACTED
 
-MAX_RESOLVE_DEPTH = 10
+# pg_advisory_xact_lock key serializing same-as writes ("sameas" in ASCII).
+_SAME_AS_LOCK_KEY = 0x73616D656173
+
+
+async def lock_same_as(conn) -> None:
+    """Serialize same-as writers until the end of ``conn``'s transaction."""
+    await conn.execute("SELECT pg_advisory_xact_lock($1)", _SAME_AS_LOCK_KEY)
+
+
+def canonical_rows_sql(scoped: bool) -> str:
+    """``(entity_id, canonical_id)`` for every merged entity, from the mappings.
+
+    Each source's parent is the target of its earliest active mapping;
+    roots are parents with no parent of their own, and every entity below
+    a root maps to it. Entities on a cycle (never created by
+    create_same_as, but possible in legacy data) are not reachable from a
+    root and so resolve to themselves. ``scoped`` restricts the sources
+    to ``$1::varchar[]``.
+    """
+    scope = "AND source_entity_id = ANY($1::varchar[])" if scoped else ""
+    return f"""
+        WITH RECURSIVE parent AS (
+            SELECT DISTINCT ON (source_entity_id)
+                   source_entity_id AS entity_id, target_entity_id AS parent_id
+            FROM entity_same_as
+            WHERE status = '{ACTIVE}' {scope}
+            ORDER BY source_entity_id, created_time, same_as_id
+        ), walk (entity_id, canonical_id) AS (
+            SELECT DISTINCT p.parent_id, p.parent_id FROM parent p
+            WHERE NOT EXISTS (SELECT 1 FROM parent q WHERE q.entity_id = p.parent_id)
+            UNION ALL
+            SELECT p.entity_id, w.canonical_id
+            FROM parent p JOIN walk w ON p.parent_id = w.entity_id
+        )
+        SELECT entity_id, canonical_id FROM walk WHERE entity_id <> canonical_id
+    """
+
+
+async def rebuild_canonical(conn, members: Iterable[str]) -> None:
+    """Re-derive ``entity_canonical`` for ``members`` from the active mappings.
+
+    ``members`` must be whole trees (a root and everything rooted at it),
+    as collected by ``same_as_tree_members`` before the mappings changed.
+    """
+    members = list(dict.fromkeys(members))
+    if not members:
+        return
+    await conn.execute(
+        "DELETE FROM entity_canonical WHERE entity_id = ANY($1::varchar[])", members)
+    await conn.execute(
+        "INSERT INTO entity_canonical (entity_id, canonical_id) "
+        f"SELECT entity_id, canonical_id FROM ({canonical_rows_sql(scoped=True)}) c",
+        members)
+
+
+async def same_as_tree_members(conn, entity_ids: Iterable[str]) -> List[str]:
+    """Every entity in the trees containing ``entity_ids`` (roots included)."""
+    rows = await conn.fetch(
+        """
+        WITH roots AS (
+            SELECT COALESCE(c.canonical_id, i.id) AS root_id
+            FROM unnest($1::varchar[]) AS i(id)
+            LEFT JOIN entity_canonical c ON c.entity_id = i.id
+        )
+        SELECT root_id AS entity_id FROM roots
+        UNION
+        SELECT c.entity_id FROM entity_canonical c
+        WHERE c.canonical_id IN (SELECT root_id FROM roots)
+        """,
+        list(entity_ids))
+    return [r['entity_id'] for r in rows]
 
 
 class SameAsMixin:
@@ -35,16 +132,28 @@ class SameAsMixin:
 
         async with self.pool.acquire() as conn:
             async with conn.transaction():
-                # Verify both entities exist
+                await lock_same_as(conn)
+
+                # Verify both entities exist; read their roots in the same query
+                found = {
+                    r['entity_id']: r['canonical_id'] for r in await conn.fetch(
+                        "SELECT e.entity_id, COALESCE(c.canonical_id, e.entity_id) AS canonical_id "
+                        "FROM entity e LEFT JOIN entity_canonical c ON c.entity_id = e.entity_id "
+                        "WHERE e.entity_id = ANY($1::varchar[])",
+                        [source_entity_id, target_entity_id])
+                }
                 for eid in (source_entity_id, target_entity_id):
-                    exists = await conn.fetchval(
-                        "SELECT 1 FROM entity WHERE entity_id = $1", eid
-                    )
-                    if not exists:
+                    if eid not in found:
                         raise ValueError(f"Entity not found: {eid}")
 
+                if found[source_entity_id] != source_entity_id:
+                    raise ValueError(
+                        f"Entity {source_entity_id} is already merged into "
+                        f"{found[source_entity_id]}; retract that mapping first"
+                    )
                 # Check for cycles: would target eventually resolve back to source?
-                if await self._would_create_cycle(conn, source_entity_id, target_entity_id):
+                target_root = found[target_entity_id]
+                if target_root == source_entity_id:
                     raise ValueError(
                         f"Creating same-as {source_entity_id} -> {target_entity_id} would create a cycle"
                     )
@@ -72,26 +181,18 @@ class SameAsMixin:
                     datetime.now(timezone.utc), source_entity_id
                 )
 
-                return dict(row)
+                # Union: the source's tree now resolves to the target's root.
+                await conn.execute(
+                    "UPDATE entity_canonical SET canonical_id = $1, updated_time = now() "
+                    "WHERE canonical_id = $2",
+                    target_root, source_entity_id
+                )
+                await conn.execute(
+                    "INSERT INTO entity_canonical (entity_id, canonical_id) VALUES ($1, $2)",
+                    source_entity_id, target_root
+                )
 
-    async def _would_create_cycle(self, conn, source_id: str, target_id: str) -> bool:
-        """Check if adding source -> target would create a cycle."""
-        visited = {source_id}
-        current = target_id
-        for _ in range(MAX_RESOLVE_DEPTH):
-            if current in visited:
-                return True
-            visited.add(current)
-            next_id = await conn.fetchval(
-                "SELECT target_entity_id FROM entity_same_as "
-                f"WHERE source_entity_id = $1 AND status = '{ACTIVE}' LIMIT 1",
-                current
-            )
-            if next_id is None:
-                return False
-            current = next_id
-        # Exceeded depth — treat as potential cycle
-        return True
+                return dict(row)
 
     async def retract_same_as(
         self, same_as_id: int,
@@ -101,6 +202,13 @@ class SameAsMixin:
         """Retract a same-as mapping."""
         async with self.pool.acquire() as conn:
             async with conn.transaction():
+                await lock_same_as(conn)
+                source_id = await conn.fetchval(
+                    "SELECT source_entity_id FROM entity_same_as WHERE same_as_id = $1",
+                    same_as_id
+                )
+                members = await same_as_tree_members(conn, [source_id]) if source_id else []
+
                 row = await conn.fetchrow(
                     f"UPDATE entity_same_as SET status = '{RETRACTED}', "
                     "retracted_time = $1, retracted_by = $2 "
@@ -111,6 +219,9 @@ class SameAsMixin:
                 if row is None:
                     return False
 
+                # Split: the retracted source's subtree becomes its own tree.
+                await rebuild_canonical(conn, members)
+
                 await self._log_change(conn, row['source_entity_id'], 'same_as_retracted', {
                     'same_as_id': same_as_id,
                     'target_entity_id': row['target_entity_id'],
@@ -154,24 +265,31 @@ class SameAsMixin:
             ValueError: If entity not found.
         """
         async with self.pool.acquire() as conn:
-            current_id = entity_id
-            visited = set()
-
-            for _ in range(MAX_RESOLVE_DEPTH):
-                if current_id in visited:
-                    break  # cycle detected, stop
-                visited.add(current_id)
-
-                next_id = await conn.fetchval(
-                    "SELECT target_entity_id FROM entity_same_as "
-                    f"WHERE source_entity_id = $1 AND status = '{ACTIVE}' LIMIT 1",
-                    current_id
-                )
-                if next_id is None:
-                    break
-                current_id = next_id
+            canonical_id = await conn.fetchval(
+                "SELECT canonical_id FROM entity_canonical WHERE entity_id = $1", entity_id
+            )
 
-        entity = await self.get_entity(current_id)
+        entity = await self.get_entity(canonical_id or entity_id)
         if entity is None:
             raise ValueError(f"Entity not found: {entity_id}")
         return entity
+
+    async def resolve_entities(self, entity_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Canonical entity id for each of ``entity_ids``, in one query.
+
+        Returns:
+            ``{entity_id: canonical_id}``; ids that are not entities are
+            absent. An entity with no same-as mapping maps to itself.
+        """
+        ids = list(dict.fromkeys(entity_ids))
+        if not ids:
+            return {}
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT e.entity_id, COALESCE(c.canonical_id, e.entity_id) AS canonical_id "
+                "FROM entity e LEFT JOIN entity_canonical c ON c.entity_id = e.entity_id "
+                "WHERE e.entity_id = ANY($1::varchar[])",
+                ids
+            )
+        return {r['entity_id']: r['canonical_id'] for r in rows}
@@ -90,11 +90,25 @@ class VitalGraphImpl:
                         logger.warning(f"⚠️ space_backend does not have postgresql_impl attribute")
                     logger.info(f"✅ Initialized Fuseki-PostgreSQL hybrid backend successfully")
                     
+                elif backend_type == 'oxigraph':
+                    oxigraph_config = self.config.get_oxigraph_config()
+                    backend_config_obj = BackendConfig(
+                        backend_type=BackendType.OXIGRAPH,
+                        connection_params={
+                            'store_path': oxigraph_config.get('store_path') or None,
+                            'bulk_threshold': oxigraph_config.get('bulk_threshold', 10000),
+                        }
+                    )
+                    # Embedded store: no db_impl, signals stay in-process
+                    self.space_backend = BackendFactory.create_space_backend(backend_config_obj)
+                    logger.info("Initialized embedded Oxigraph backend (store_path=%s)",
+                                oxigraph_config.get('store_path') or ':memory:')
+                    
                 else:
                     raise ValueError(
                         f"Unsupported backend type: '{backend_type}'. "
                         f"The 'postgresql' (V1) backend has been archived. "
-                        f"Use 'sparql_sql' or 'fuseki_postgresql' instead."
+                        f"Use 'sparql_sql', 'fuseki_postgresql' or 'oxigraph' instead."
                     )
                     
             except Exception as e:
@@ -193,19 +207,24 @@ class VitalGraphImpl:
             logger.warning("⚠️ No database implementation or space backend available")
             return False
             
-        try:
-            logger.debug(f"🔍 Creating SignalManager in VitalGraphImpl")
-            self.signal_manager = SignalManager(db_impl=self.db_impl)
-            logger.debug(f"✅ SignalManager created: {self.signal_manager}")
+        if self.db_impl is None and hasattr(self.space_backend, 'get_signal_manager'):
+            # Embedded backend (oxigraph): its in-process signal manager is the
+            # only one; there is no database to LISTEN on.
+            self.signal_manager = self.space_backend.get_signal_manager()
+        else:
+            try:
+                logger.debug(f"🔍 Creating SignalManager in VitalGraphImpl")
+                self.signal_manager = SignalManager(db_impl=self.db_impl)
+                logger.debug(f"✅ SignalManager created: {self.signal_manager}")
         
-            logger.debug(f"🔍 Setting SignalManager on db_impl")
-            self.db_impl.set_signal_manager(self.signal_manager)
-            logger.debug(f"✅ SignalManager set on db_impl")
-            logger.debug(f"🔍 Verifying get_signal_manager: {self.db_impl.get_signal_manager()}")
-        except Exception as e:
-            logger.error(f"❌ ERROR creating/setting SignalManager: {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+                logger.debug(f"🔍 Setting SignalManager on db_impl")
+                self.db_impl.set_signal_manager(self.signal_manager)
+                logger.debug(f"✅ SignalManager set on db_impl")
+                logger.debug(f"🔍 Verifying get_signal_manager: {self.db_impl.get_signal_manager()}")
+            except Exception as e:
+                logger.error(f"❌ ERROR creating/setting SignalManager: {e}")
+                import traceback
+                logger.debug(traceback.format_exc())
 
         # Update SpaceManager's db_impl if it was created eagerly without one (sparql_sql)
         if self.space_manager is not None and self.space_manager.db_impl is None and self.db_impl:
@@ -93,11 +93,24 @@ class VitalGraphAppImpl:
             token_version_cache_ttl=token_cache_ttl,
         )
         
-        # Configure bootstrap admin from config/env (only if credentials are explicitly set)
-        bootstrap_user = auth_config.get("root_username", os.getenv("AUTH_ROOT_USERNAME", ""))
-        bootstrap_pass = auth_config.get("root_password", os.getenv("AUTH_ROOT_PASSWORD", ""))
-        if bootstrap_user and bootstrap_pass:
-            self.auth.set_bootstrap_admin(bootstrap_user, bootstrap_pass)
+        # Embedded Oxigraph has no user, API key or permission tables, so
+        # there is nothing to authenticate against. Rather than run forever on
+        # the bootstrap admin, refuse to start unless the config explicitly
+        # disables auth for a single local user.
+        backend_type = self.config.get_backend_config().get('type', 'sparql_sql') if self.config else None
+        if backend_type == 'oxigraph' and self.db_impl is None:
+            if not self.config.get_oxigraph_config().get('single_user', False):
+                raise ValueError(
+                    "The oxigraph backend has no user store; set OXIGRAPH_SINGLE_USER=true "
+                    "to run it with authentication disabled for a single local user"
+                )
+            self.auth.enable_single_user()
+        else:
+            # Configure bootstrap admin from config/env (only if credentials are explicitly set)
+            bootstrap_user = auth_config.get("root_username", os.getenv("AUTH_ROOT_USERNAME", ""))
+            bootstrap_pass = auth_config.get("root_password", os.getenv("AUTH_ROOT_PASSWORD", ""))
+            if bootstrap_user and bootstrap_pass:
+                self.auth.set_bootstrap_admin(bootstrap_user, bootstrap_pass)
         
         # Initialize WebSocket connection manager
         self.websocket_manager = ConnectionManager(self.auth)
@@ -182,7 +195,13 @@ class VitalGraphAppImpl:
         # obviously right.
         from ..api.request_bounds import RequestBoundsMiddleware
         self.app.add_middleware(RequestBoundsMiddleware)
-        
+
+        # Negotiated zstd / br / gzip for bulk JSON, quads and SPARQL results.
+        # Outside RequestBounds so the deadline and the stall
+        # fence keep seeing the handler's own, uncompressed sends.
+        from ..api.compression import CompressionMiddleware
+        self.app.add_middleware(CompressionMiddleware)
+
         # Add session middleware for authentication
         self.app.add_middleware(
             SessionMiddleware,
@@ -561,6 +580,9 @@ class VitalGraphAppImpl:
                                     process_type="metrics",
                                 )
                                 self.logger.info("✅ Query metrics collector initialized (PostgreSQL-backed)")
+                                # Per-query-shape SPARQL stats
+                                from vitalgraph.metrics.query_shape_stats import shape_stats
+                                await shape_stats.start(pool)
                             except Exception as e:
                                 self.logger.warning(f"Query metrics initialization failed (non-critical): {e}")
 
@@ -585,6 +607,28 @@ class VitalGraphAppImpl:
                             except Exception as e:
                                 self.logger.warning(f"Import/export cleanup job registration failed (non-critical): {e}")
 
+                            # Register orphan-term GC job (default: hourly)
+                            try:
+                                from vitalgraph.process.term_gc_job import TermGCJob
+                                gc_config = self.config.config_data.get('term_gc', {})
+                                if gc_config.get('enabled', True):
+                                    gc_interval = gc_config.get('interval_seconds', 3600)
+                                    term_gc_job = TermGCJob(
+                                        pool,
+                                        process_tracker=tracker,
+                                        chunk_size=gc_config.get('chunk_size', 5000),
+                                        max_chunks_per_run=gc_config.get('max_chunks_per_run', 20),
+                                    )
+                                    self.process_scheduler.register_job(
+                                        name="term_gc",
+                                        interval_seconds=gc_interval,
+                                        handler=term_gc_job,
+                                        process_type="term_gc",
+                                    )
+                                    self.logger.info(f"✅ Term GC job registered (interval={gc_interval}s)")
+                            except Exception as e:
+                                self.logger.warning(f"Term GC job registration failed (non-critical): {e}")
+
                             await self.process_scheduler.start()
                             self.logger.info(f"✅ Process scheduler started (maintenance={interval}s, analytics={analytics_interval}s, enabled={enabled})")
                         else:
@@ -669,6 +713,14 @@ class VitalGraphAppImpl:
                                 elif cache_type == "stats" and space_id:
                                     invalidate_stats_cache(space_id)
                                     self.logger.debug(f"Cache invalidation: cleared stats cache for {space_id}")
+                                elif cache_type == "property_table" and space_id:
+                                    from vitalgraph.db.sparql_sql.ensure_property_table import invalidate_property_table_cache
+                                    invalidate_property_table_cache(space_id)
+                                    self.logger.debug(f"Cache invalidation: cleared property table declarations for {space_id}")
+                                elif cache_type == "change_log" and space_id:
+                                    from vitalgraph.db.sparql_sql.change_log import invalidate_change_log_cache
+                                    invalidate_change_log_cache(space_id)
+                                    self.logger.debug(f"Cache invalidation: re-checking change log for {space_id}")
 
                             signal_manager.register_callback(
                                 CHANNEL_CACHE_INVALIDATE,
@@ -714,18 +766,21 @@ class VitalGraphAppImpl:
                             from vitalgraph.cache.entity_graph_cache import _entity_graph_cache
                             from vitalgraph.cache.count_cache import _count_cache
 
+                            from vitalgraph.signal.entity_graph_invalidation import EntityGraphInvalidator
+
+                            # One payload names many entities and carries a
+                            # per-origin sequence; a skipped one flushes the
+                            # space.
+                            _invalidator = EntityGraphInvalidator(
+                                _entity_graph_cache, _count_cache,
+                                origin=getattr(signal_manager, 'origin', None))
+                            signal_manager.entity_graph_invalidator = _invalidator
+
                             async def _handle_entity_graph_signal(data: dict):
-                                space_id = data.get("space_id", "")
-                                graph_id = data.get("graph_id", "")
-                                entity_uri = data.get("entity_uri", "")
-                                if space_id and graph_id and entity_uri:
-                                    _entity_graph_cache.invalidate(space_id, graph_id, entity_uri)
-                                    _count_cache.invalidate_graph(space_id, graph_id)
-                                    self.logger.info(f"📡 Entity+count cache NOTIFY received — invalidated {entity_uri}")
-                                elif space_id and graph_id:
-                                    _entity_graph_cache.invalidate_graph(space_id, graph_id)
-                                    _count_cache.invalidate_graph(space_id, graph_id)
-                                    self.logger.info(f"📡 Entity+count cache NOTIFY received — invalidated graph {graph_id}")
+                                _invalidator.apply(data)
+                                self.logger.debug(
+                                    f"📡 Entity+count cache NOTIFY received — "
+                                    f"{len(data.get('entity_uris') or [])} entities in {data.get('graph_id', '')}")
 
                             async def _handle_graph_entity_cache(data: dict):
                                 signal_type = data.get("type", "")
@@ -864,6 +919,14 @@ class VitalGraphAppImpl:
                     except Exception as e:
                         self.logger.warning(f"Backfill task initialization failed (non-critical): {e}")
 
+                    # Re-queue auto-sync work journaled by a previous run
+                    try:
+                        from vitalgraph.vectorization.auto_sync import sync_queue
+                        recovered = await sync_queue.start(self.db_impl)
+                        self.logger.info(f"✅ Auto-sync queue started ({recovered} journaled subjects re-queued)")
+                    except Exception as e:
+                        self.logger.warning(f"Auto-sync queue journal initialization failed (non-critical): {e}")
+
                 except Exception as e:
                     self.logger.error(f"Failed to connect to database: {e}")
             
@@ -926,6 +989,22 @@ class VitalGraphAppImpl:
                     except Exception as e:
                         self.logger.warning(f"Error stopping backfill task: {e}")
 
+                # Stop auto-sync workers; journal what is still pending
+                try:
+                    from vitalgraph.vectorization.auto_sync import sync_queue
+                    await sync_queue.stop()
+                    self.logger.info("✅ Auto-sync queue stopped")
+                except Exception as e:
+                    self.logger.warning(f"Error stopping auto-sync queue: {e}")
+
+                # Stop the shape-stats flusher; its final flush writes the
+                # current window while the pool is still open
+                try:
+                    from vitalgraph.metrics.query_shape_stats import shape_stats
+                    await shape_stats.stop()
+                except Exception as e:
+                    self.logger.warning(f"Error stopping shape stats: {e}")
+
                 # Stop event loop monitor
                 try:
                     await self.event_loop_monitor.stop()
@@ -1017,6 +1096,8 @@ class VitalGraphAppImpl:
         self._init_geo_config_routes()
         self.logger.info("Initializing geo points routes...")
         self._init_geo_points_routes()
+        self.logger.info("Initializing change log routes...")
+        self._init_changes_routes()
         self.logger.info("Initializing ontology routes...")
         self._init_ontology_routes()
         self.logger.info("Initializing metrics routes...")
@@ -1067,6 +1148,7 @@ class VitalGraphAppImpl:
         from vitalgraph.endpoint.kgquery_endpoint import create_kgqueries_router
         from vitalgraph.endpoint.files_endpoint import create_files_router
         from vitalgraph.endpoint.kgdocuments_endpoint import create_kgdocuments_router
+        from vitalgraph.endpoint.batch_endpoint import create_batch_router
         
         # Create routers with space manager and auth dependency
         triples_router = create_triples_router(self.space_manager, self.get_current_user)
@@ -1078,6 +1160,7 @@ class VitalGraphAppImpl:
         kgqueries_router = create_kgqueries_router(self.space_manager, self.get_current_user)
         kgdocuments_router = create_kgdocuments_router(self.space_manager, self.get_current_user, segmentation_worker=self._segmentation_worker, config=self.config.config_data)
         files_router = create_files_router(self.space_manager, self.get_current_user, config=self.config.config_data)
+        batch_router = create_batch_router(self.space_manager, self.get_current_user)
         
         # Include routers in the FastAPI app  
         self.app.include_router(triples_router, prefix="/api/graphs")
@@ -1088,6 +1171,7 @@ class VitalGraphAppImpl:
         self.app.include_router(kgrelations_router, prefix="/api/graphs")
         self.app.include_router(kgqueries_router, prefix="/api/graphs")
         self.app.include_router(kgdocuments_router, prefix="/api/graphs")
+        self.app.include_router(batch_router, prefix="/api/graphs")
         self.app.include_router(files_router, prefix="/api")
     
     def _init_data_routers(self):
@@ -1283,12 +1367,27 @@ class VitalGraphAppImpl:
         geo_points_router = create_geo_points_router(self, self.get_current_user)
         self.app.include_router(geo_points_router, prefix="/api", tags=["Geo"])
     
+    def _init_changes_routes(self):
+        """Initialize change log (CDC feed) endpoint routes."""
+        from vitalgraph.endpoint.changes_endpoint import create_changes_router
+        
+        changes_router = create_changes_router(self, self.get_current_user)
+        self.app.include_router(changes_router, prefix="/api", tags=["Changes"])
+    
     def _init_metrics_routes(self):
         """Initialize query metrics endpoint routes."""
         from vitalgraph.endpoint.metrics_endpoint import MetricsEndpoint
         
         metrics_endpoint = MetricsEndpoint(self.api)
         self.app.include_router(metrics_endpoint.router, prefix="/api", tags=["Metrics"])
+
+        # OpenMetrics scrape target (no authentication, like /health)
+        from vitalgraph.endpoint.openmetrics_endpoint import OpenMetricsEndpoint
+
+        openmetrics_endpoint = OpenMetricsEndpoint(
+            get_pool=lambda: getattr(
+                getattr(self.space_manager, 'db_impl', None), 'connection_pool', None))
+        self.app.include_router(openmetrics_endpoint.router, tags=["Metrics"])
     
     def _init_frontend_routes(self):
         """Initialize frontend serving routes."""
@@ -18,7 +18,9 @@ from ai_haley_kg_domain.model.KGEntity import KGEntity
 from ai_haley_kg_domain.model.KGFrame import KGFrame
 
 # Model imports
-from ..model.kgentities_model import EntityCreateResponse, EntityUpdateResponse
+from ..model.kgentities_model import (
+    EntityCreateResponse, EntityUpdateResponse, _FILTERABLE_ENTITY_PROPERTIES,
+)
 
 # Graph retrieval utilities
 from .kg_graph_retrieval_utils import GraphObjectRetriever
@@ -130,6 +132,114 @@ async def fast_typed_subject_page(backend, space_id: str, graph_id: str,
         return None
 
 
+HAS_KG_ENTITY_TYPE_URI = 'http://vital.ai/ontology/haley-ai-kg#hasKGEntityType'
+KGENTITY_URI = 'http://vital.ai/ontology/haley-ai-kg#KGEntity'
+
+
+async def _typed_listing_property_table(conn, space_id: str,
+                                        entity_type_uri: str, sort_by: str):
+    """The ready property table that covers a typed, sorted entity listing.
+
+    The listing's BGP is ``?s vitaltype KGEntity . ?s hasKGEntityType <T> .
+    ?s <sort_by> ?sort_val``, so the declaration must select on
+    ``hasKGEntityType <T>`` and carry both a vitaltype column and the sort
+    column. Returns (def, vitaltype column, sort column) or None.
+    """
+    from ..db.sparql_sql.ensure_property_table import (
+        STATUS_READY, load_property_tables)
+    for d in await load_property_tables(conn, space_id):
+        if (d.status != STATUS_READY or d.type_predicate != HAS_KG_ENTITY_TYPE_URI
+                or d.type_uri != entity_type_uri):
+            continue
+        vt_col = d.column_for_predicate(VITALTYPE_URI)
+        sort_col = d.column_for_predicate(sort_by)
+        if vt_col and sort_col:
+            return d, vt_col, sort_col
+    return None
+
+
+async def fast_property_table_count(backend, space_id: str, graph_id: str,
+                                    entity_type_uri: str,
+                                    sort_by: str) -> Optional[int]:
+    """Typed, sorted listing count from a declared property table, or None.
+
+    A row per (subject, graph) and the sort column being single-valued make
+    ``count(*)`` equal the SPARQL ``COUNT(DISTINCT ?entity)``.
+    """
+    if not graph_is_uri(graph_id):
+        return None
+    impl = _resolve_space_impl(backend)
+    if impl is None:
+        return None
+    try:
+        from ..db.sparql_sql.sparql_sql_space_impl import _generate_term_uuid
+        async with impl.db_impl.connection_pool.acquire() as conn:
+            found = await _typed_listing_property_table(
+                conn, space_id, entity_type_uri, sort_by)
+            if found is None:
+                return None
+            d, vt_col, sort_col = found
+            n = await conn.fetchval(
+                f"SELECT count(*) FROM {d.data_table(space_id)} "
+                f"WHERE context_uuid = $1 AND {vt_col.column}_uuid = $2 "
+                f"AND {sort_col.column}_uuid IS NOT NULL",
+                _generate_term_uuid(graph_id, 'U'),
+                _generate_term_uuid(KGENTITY_URI, 'U'),
+            )
+        return int(n or 0)
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "fast_property_table_count failed, caller will fall back", exc_info=True)
+        return None
+
+
+async def fast_property_table_page(backend, space_id: str, graph_id: str,
+                                   entity_type_uri: str, sort_by: str,
+                                   sort_order: str, page_size: int,
+                                   offset: int) -> Optional[list]:
+    """Typed listing page sorted by a property, from a property table, or None.
+
+    Same order as the SPARQL listing's ``ORDER BY DIR(?sort_val) ?s``: the
+    pipeline orders a variable by its term text, and ``{col}_text`` is that
+    text, so the ``(context_uuid, {col}_text, subject_uuid)`` index delivers
+    rows already in order and LIMIT stops the scan. Only ties on the sort
+    value need the subject's URI, which PostgreSQL adds as an incremental
+    sort over the presorted prefix rather than sorting the type.
+    """
+    if not graph_is_uri(graph_id):
+        return None
+    impl = _resolve_space_impl(backend)
+    if impl is None:
+        return None
+    try:
+        from ..db.sparql_sql.sparql_sql_space_impl import _generate_term_uuid
+        t = impl.schema.get_table_names(space_id)
+        direction = "DESC" if sort_order == "desc" else "ASC"
+        async with impl.db_impl.connection_pool.acquire() as conn:
+            found = await _typed_listing_property_table(
+                conn, space_id, entity_type_uri, sort_by)
+            if found is None:
+                return None
+            d, vt_col, sort_col = found
+            rows = await conn.fetch(
+                f"SELECT st.term_text AS uri "
+                f"FROM {d.data_table(space_id)} pt "
+                f"JOIN {t['term']} st ON st.term_uuid = pt.subject_uuid "
+                f"WHERE pt.context_uuid = $1 AND pt.{vt_col.column}_uuid = $2 "
+                f"AND pt.{sort_col.column}_uuid IS NOT NULL "
+                f"ORDER BY pt.{sort_col.column}_text {direction}, st.term_text "
+                f"LIMIT $3 OFFSET $4",
+                _generate_term_uuid(graph_id, 'U'),
+                _generate_term_uuid(KGENTITY_URI, 'U'),
+                page_size, offset,
+            )
+        return [r['uri'] for r in rows]
+    except Exception:
+        logging.getLogger(__name__).warning(
+            "fast_property_table_page failed, caller will fall back", exc_info=True)
+        return None
+
+
 @dataclass
 class BackendOperationResult:
     """Result of a backend operation."""
@@ -1135,8 +1245,14 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
                                 prop_filters: str = "",
                                 sort_by: Optional[str] = None) -> Optional[int]:
         """Exact entity count for the *plain default* listing (see
-        ``fast_typed_subject_count``). Returns ``None`` (→ SPARQL fallback) for
-        any filtered/searched/sorted/typed shape."""
+        ``fast_typed_subject_count``), or for a typed listing sorted by a
+        property a declared property table covers
+        (``fast_property_table_count``). Returns ``None`` (→ SPARQL fallback)
+        for any other filtered/searched/sorted/typed shape."""
+        if (entity_type_uri and sort_by and not search and not prop_filters
+                and _FILTERABLE_ENTITY_PROPERTIES.get(sort_by) != "uri_list"):
+            return await fast_property_table_count(
+                self.backend, space_id, graph_id, entity_type_uri, sort_by)
         if entity_type_uri or search or prop_filters or sort_by:
             return None
         return await fast_typed_subject_count(
@@ -1147,9 +1263,17 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
                                entity_type_uri: Optional[str] = None,
                                search: Optional[str] = None,
                                prop_filters: str = "",
-                               sort_by: Optional[str] = None) -> Optional[List[str]]:
+                               sort_by: Optional[str] = None,
+                               sort_order: str = "asc") -> Optional[List[str]]:
         """Ordered (`subject_uuid`) page of entity URIs for the *plain default*
-        listing (see ``fast_typed_subject_page``). ``None`` → SPARQL fallback."""
+        listing (see ``fast_typed_subject_page``), or a typed listing sorted by
+        a property-table column (``fast_property_table_page``). ``None`` →
+        SPARQL fallback."""
+        if (entity_type_uri and sort_by and not search and not prop_filters
+                and _FILTERABLE_ENTITY_PROPERTIES.get(sort_by) != "uri_list"):
+            return await fast_property_table_page(
+                self.backend, space_id, graph_id, entity_type_uri, sort_by,
+                sort_order, page_size, offset)
         if entity_type_uri or search or prop_filters or sort_by:
             return None
         return await fast_typed_subject_page(
@@ -1242,15 +1366,21 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
                         from ..db.sparql_sql.sync_stats_tables import sync_stats_for_deleted_subjects
                         await sync_stats_for_deleted_subjects(conn, space_id, subject_uuids, context_uuid=g_uuid)
 
-                        # Step 3: Delete all quads for those subjects
-                        result = await conn.execute(
+                        # Step 3: Delete all quads for those subjects (logged
+                        # to the change log before the insert below logs its own)
+                        from ..db.sparql_sql.change_log import delete_quads_logged
+                        deleted = await delete_quads_logged(
+                            conn, space_id,
                             f"DELETE FROM {t['rdf_quad']} "
                             f"WHERE subject_uuid = ANY($1) AND context_uuid = $2",
                             subject_uuids, g_uuid,
                         )
-                        deleted = int(result.split()[-1]) if result else 0
                         self.logger.info("update_entity_graph: deleted %d quads for %d subjects",
                                          deleted, len(subject_uuids))
+                        # Property tables re-derive from what is left; the
+                        # bulk insert below re-syncs the subjects it writes.
+                        from ..db.sparql_sql.sync_property_table import sync_property_tables
+                        await sync_property_tables(conn, space_id, subject_uuids)
 
                     # Step 4: Insert new quads in the same transaction
                     if insert_quads:
@@ -1293,14 +1423,17 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
                         conn, space_id, [entity_uuid], context_uuid=g_uuid)
 
                     # Delete only entity's own quads
-                    result = await conn.execute(
+                    from ..db.sparql_sql.change_log import delete_quads_logged
+                    deleted = await delete_quads_logged(
+                        conn, space_id,
                         f"DELETE FROM {t['rdf_quad']} "
                         f"WHERE subject_uuid = $1 AND context_uuid = $2",
                         entity_uuid, g_uuid,
                     )
-                    deleted = int(result.split()[-1]) if result else 0
                     self.logger.info("update_entity_subject_only: deleted %d quads for %s",
                                      deleted, entity_uri)
+                    from ..db.sparql_sql.sync_property_table import sync_property_tables
+                    await sync_property_tables(conn, space_id, [entity_uuid])
 
                     # Insert new entity quads
                     if insert_quads:
@@ -1347,14 +1480,17 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
                         await sync_stats_for_deleted_subjects(conn, space_id, s_uuids, context_uuid=g_uuid)
 
                         # Delete all quads for these subjects in this graph
-                        result = await conn.execute(
+                        from ..db.sparql_sql.change_log import delete_quads_logged
+                        deleted = await delete_quads_logged(
+                            conn, space_id,
                             f"DELETE FROM {t['rdf_quad']} "
                             f"WHERE subject_uuid = ANY($1) AND context_uuid = $2",
                             s_uuids, g_uuid,
                         )
-                        deleted = int(result.split()[-1]) if result else 0
                         self.logger.info("update_subjects_graph: deleted %d quads for %d subjects",
                                          deleted, len(s_uuids))
+                        from ..db.sparql_sql.sync_property_table import sync_property_tables
+                        await sync_property_tables(conn, space_id, s_uuids)
 
                     # Insert new quads
                     if insert_quads:
@@ -1416,6 +1552,47 @@ class SparqlSQLBackendAdapter(KGBackendInterface):
             return []
 
 
+class OxigraphBackendAdapter(FusekiPostgreSQLBackendAdapter):
+    """Adapter for the embedded Oxigraph backend.
+
+    Oxigraph speaks the same SPARQL and returns the same JSON bindings as
+    Fuseki, so reads, stores and SPARQL updates are the Fuseki adapter's.
+    What differs is the write path: there is no ``db_ops`` / dual-write
+    coordinator and no PostgreSQL ``db_objects`` — the store is the only
+    copy, and ``OxigraphSpaceImpl`` does the batch remove and the atomic
+    delete+insert itself.
+    """
+
+    def __init__(self, backend_impl):
+        super().__init__(backend_impl)
+        self.logger = logging.getLogger(f"{__name__}.OxigraphBackendAdapter")
+
+    async def remove_rdf_quads_batch(self, space_id: str, quads: List[tuple]) -> int:
+        try:
+            return await self.backend.remove_rdf_quads_batch(space_id, quads)
+        except Exception as e:
+            self.logger.error(f"Error removing quads batch: {e}")
+            return 0
+
+    async def update_quads(self, space_id: str, graph_id: str,
+                          delete_quads: List[tuple], insert_quads: List[tuple]) -> bool:
+        """Delete+insert in one Oxigraph transaction (a single SPARQL update)."""
+        try:
+            return await self.backend.update_quads(space_id, graph_id, delete_quads, insert_quads)
+        except Exception as e:
+            self.logger.error(f"update_quads failed: {e}")
+            return False
+
+    async def get_objects_by_uris(self, space_id: str, uris: List[str],
+                                  graph_id: Optional[str] = None) -> List[GraphObject]:
+        """Retrieve multiple objects by URI list as VitalSigns GraphObjects."""
+        if not uris or not graph_id:
+            return []
+        triples_by_uri = await self.retriever.get_objects_by_uris(space_id, graph_id, uris)
+        triples = [t for uri in uris for t in triples_by_uri.get(uri, [])]
+        return await self._triples_to_vitalsigns(triples)
+
+
 def create_backend_adapter(backend_impl) -> KGBackendInterface:
     """Factory function to create appropriate backend adapter."""
     backend_type = type(backend_impl).__name__
@@ -1424,6 +1601,8 @@ def create_backend_adapter(backend_impl) -> KGBackendInterface:
         return SparqlSQLBackendAdapter(backend_impl)
     elif 'FusekiPostgreSQL' in backend_type:
         return FusekiPostgreSQLBackendAdapter(backend_impl)
+    elif 'Oxigraph' in backend_type:
+        return OxigraphBackendAdapter(backend_impl)
     else:
         # Default to Fuseki+PostgreSQL adapter
         return FusekiPostgreSQLBackendAdapter(backend_impl)
@@ -16,6 +16,8 @@ from ai_haley_kg_domain.model.KGEntity import KGEntity
 from ai_haley_kg_domain.model.KGFrame import KGFrame
 from ai_haley_kg_domain.model.KGSlot import KGSlot
 
+from .kg_write_validation import check_write_batch
+
 
 @dataclass
 class ValidationResult:
@@ -558,6 +560,10 @@ class KGHierarchicalFrameValidator:
         """
         Validate that parent_frame_uri exists and belongs to the specified entity.
         
+        Since parent_frame_uri is for immediate parent-child only, this checks
+        that the parent is ``a haley:KGFrame`` with ``haley:hasKGGraphURI``
+        pointing at the entity.
+        
         Args:
             space_id: Space identifier
             graph_id: Graph identifier
@@ -568,73 +574,11 @@ class KGHierarchicalFrameValidator:
             bool: True if parent frame is valid, False otherwise
         """
         try:
-            # SPARQL query to check if parent frame exists and has kGGraphURI matching entity
-            # Since parent_frame_uri is for immediate parent-child only, we just validate:
-            # 1. Parent frame exists
-            # 2. Parent frame belongs to this entity (has matching kGGraphURI)
-            validation_query = f"""
-            PREFIX haley: <http://vital.ai/ontology/haley-ai-kg#>
-            PREFIX vital: <http://vital.ai/ontology/vital-core#>
-            
-            ASK {{
-                GRAPH <{graph_id}> {{
-                    # Check if parent frame exists and belongs to this entity
-                    <{parent_frame_uri}> a haley:KGFrame ;
-                                         haley:hasKGGraphURI <{entity_uri}> .
-                }}
-            }}
-            """
-            
-            # Debug: First check what properties the frame actually has
-            debug_query = f"""
-            PREFIX haley: <http://vital.ai/ontology/haley-ai-kg#>
-            PREFIX vital: <http://vital.ai/ontology/vital-core#>
-            
-            SELECT ?p ?o WHERE {{
-                GRAPH <{graph_id}> {{
-                    <{parent_frame_uri}> ?p ?o .
-                    FILTER(?p != <http://vital.ai/vitalgraph/direct#hasEntityFrame> &&
-                           ?p != <http://vital.ai/vitalgraph/direct#hasFrame> &&
-                           ?p != <http://vital.ai/vitalgraph/direct#hasSlot>)
-                }}
-            }}
-            """
-            
-            debug_result = await self.backend.execute_sparql_query(space_id, debug_query)
-            self.logger.debug(f"🔍 DEBUG: Frame {parent_frame_uri} properties: {debug_result}")
-            
-            # Execute validation query
-            result = await self.backend.execute_sparql_query(space_id, validation_query)
-            self.logger.debug(f"🔍 DEBUG: Validation query result for {parent_frame_uri}: {result}")
-            self.logger.debug(f"🔍 DEBUG: Validation query was: {validation_query}")
-            
-            # Parse ASK query result
-            if hasattr(result, 'boolean'):
-                validation_result = result.boolean
-                self.logger.debug(f"🔍 DEBUG: Parsed boolean result: {validation_result}")
-                return validation_result
-            elif isinstance(result, dict):
-                # Check for nested boolean in results.bindings.boolean
-                if 'results' in result and 'bindings' in result['results'] and 'boolean' in result['results']['bindings']:
-                    validation_result = result['results']['bindings']['boolean']
-                    self.logger.debug(f"🔍 DEBUG: Parsed nested boolean result: {validation_result}")
-                    return validation_result
-                # Check for direct boolean in result
-                elif 'boolean' in result:
-                    validation_result = result['boolean']
-                    self.logger.debug(f"🔍 DEBUG: Parsed dict boolean result: {validation_result}")
-                    return validation_result
-                else:
-                    self.logger.warning(f"Could not find boolean in result structure: {result}")
-                    return False
-            elif isinstance(result, bool):
-                self.logger.debug(f"🔍 DEBUG: Direct boolean result: {result}")
-                return result
-            else:
-                # If we can't parse the result, assume invalid for safety
-                self.logger.warning(f"Could not parse parent frame validation result: {result}")
-                return False
-                
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [parent_frame_uri], owner_uri=entity_uri)
+            self.logger.debug(f"Parent frame check for {parent_frame_uri}: "
+                              f"{check.elapsed_s * 1000:.1f}ms ({check.path})")
+            return parent_frame_uri in check.owned_frames()
         except Exception as e:
             self.logger.error(f"Error validating parent frame {parent_frame_uri}: {e}")
             return False
@@ -643,6 +587,8 @@ class KGHierarchicalFrameValidator:
         """
         Validate that a list of frame URIs belong to the specified entity.
         
+        All frames are checked in one batched probe (kg_write_validation).
+        
         Args:
             space_id: Space identifier
             graph_id: Graph identifier
@@ -652,38 +598,13 @@ class KGHierarchicalFrameValidator:
         Returns:
             Dict[str, bool]: Mapping of frame URIs to their ownership validation results
         """
-        validation_results = {}
-        
         try:
-            for frame_uri in frame_uris:
-                # SPARQL query to validate frame ownership
-                ownership_query = f"""
-                PREFIX haley: <http://vital.ai/ontology/haley-ai-kg#>
-                
-                ASK {{
-                    GRAPH <{graph_id}> {{
-                        <{frame_uri}> a haley:KGFrame ;
-                                      haley:hasKGGraphURI <{entity_uri}> .
-                    }}
-                }}
-                """
-                
-                # Execute ownership validation
-                result = await self.backend.execute_sparql_query(space_id, ownership_query)
-                
-                # Parse ASK query result
-                if hasattr(result, 'boolean'):
-                    validation_results[frame_uri] = result.boolean
-                elif isinstance(result, dict) and 'boolean' in result:
-                    validation_results[frame_uri] = result['boolean']
-                elif isinstance(result, bool):
-                    validation_results[frame_uri] = result
-                else:
-                    validation_results[frame_uri] = False
-                    self.logger.warning(f"Could not parse ownership validation result for {frame_uri}: {result}")
-            
-            self.logger.debug(f"Validated ownership for {len(frame_uris)} frames")
-            return validation_results
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            frame_uris, owner_uri=entity_uri)
+            owned = check.owned_frames()
+            self.logger.debug(f"Validated ownership for {len(frame_uris)} frames in "
+                              f"{check.elapsed_s * 1000:.1f}ms ({check.path})")
+            return {frame_uri: frame_uri in owned for frame_uri in frame_uris}
             
         except Exception as e:
             self.logger.error(f"Error validating frame ownership: {e}")
@@ -708,13 +629,13 @@ class KGHierarchicalFrameValidator:
             errors = []
             warnings = []
             
-            # Step 1: Validate parent frame exists and belongs to entity
-            parent_valid = await self.validate_parent_frame(space_id, graph_id, entity_uri, parent_frame_uri)
-            if not parent_valid:
+            # Steps 1-2: parent and child frames exist and belong to the entity,
+            # answered together in one batched probe
+            ownership = await self.validate_frame_ownership(
+                space_id, graph_id, entity_uri, [parent_frame_uri] + list(child_frame_uris))
+            if not ownership.get(parent_frame_uri, False):
                 errors.append(f"Parent frame {parent_frame_uri} does not exist or does not belong to entity {entity_uri}")
-            
-            # Step 2: Validate child frames exist and belong to entity
-            child_ownership = await self.validate_frame_ownership(space_id, graph_id, entity_uri, child_frame_uris)
+            child_ownership = {uri: ownership.get(uri, False) for uri in child_frame_uris}
             invalid_children = [uri for uri, valid in child_ownership.items() if not valid]
             if invalid_children:
                 errors.extend([f"Child frame {uri} does not exist or does not belong to entity {entity_uri}" for uri in invalid_children])
@@ -0,0 +1,126 @@
+"""
+Batched write-path validation.
+
+Create/update/upsert processors validate before they write: does each
+object already exist, is the referenced parent frame a KGFrame, does it
+belong to the entity being edited. Each of those was a SPARQL query per
+object — per entity in UPDATE/UPSERT mode, per frame in ownership checks,
+plus an unconditional debug query in ``validate_parent_frame`` — and each
+one paid SPARQL parsing, SQL generation and term-table joins to answer a
+question about URIs the caller already has.
+
+Term UUIDs are deterministic (UUIDv5 of the term text and type), so on the
+sparql_sql backend every one of those questions, for the whole request, is
+a single probe of the rdf_quad primary key
+(``SparqlSQLSpaceImpl.probe_subjects``). Other backends, graph ids that are
+not IRIs (no derivable context UUID), and a failed probe answer the same
+questions with two SPARQL queries over a VALUES block instead of one per
+object.
+
+The check reports how long it took so processors can log validation time
+next to their store time.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set
+
+from .kg_backend_utils import _resolve_space_impl, graph_is_uri
+
+logger = logging.getLogger(__name__)
+
+RDF_TYPE_URI = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+KGFRAME_URI = 'http://vital.ai/ontology/haley-ai-kg#KGFrame'
+HAS_KG_GRAPH_URI = 'http://vital.ai/ontology/haley-ai-kg#hasKGGraphURI'
+
+
+@dataclass
+class WriteCheck:
+    """What a batch check found, by URI."""
+    existing: Set[str] = field(default_factory=set)
+    # Subjects typed haley:KGFrame in the graph.
+    frames: Set[str] = field(default_factory=set)
+    # Subjects whose hasKGGraphURI is the owner passed to the check.
+    owned: Set[str] = field(default_factory=set)
+    elapsed_s: float = 0.0
+    path: str = "sql"
+
+    def owned_frames(self) -> Set[str]:
+        """Frames that belong to the owner (``a KGFrame ; hasKGGraphURI owner``)."""
+        return self.frames & self.owned
+
+
+async def check_write_batch(backend, space_id: str, graph_id: str,
+                            uris: Iterable[str],
+                            owner_uri: Optional[str] = None) -> WriteCheck:
+    """Existence, KGFrame type and ownership of ``uris`` in one round trip.
+
+    Args:
+        backend: The processor's backend (space impl or adapter)
+        space_id: Space identifier
+        graph_id: Graph URI
+        uris: Subject URIs to check
+        owner_uri: Entity URI for the ownership flag (``hasKGGraphURI``)
+
+    Returns:
+        WriteCheck; URIs absent from ``existing`` have no quad in the graph.
+    """
+    t0 = time.monotonic()
+    uris = list(dict.fromkeys(str(u) for u in uris))
+    if not uris:
+        return WriteCheck()
+
+    result = None
+    impl = _resolve_space_impl(backend) if graph_is_uri(graph_id) else None
+    if impl is not None and hasattr(impl, 'probe_subjects'):
+        try:
+            found = await impl.probe_subjects(
+                space_id, graph_id, uris, KGFRAME_URI, HAS_KG_GRAPH_URI, owner_uri)
+            result = WriteCheck(
+                existing=set(found),
+                frames={u for u, (is_frame, _) in found.items() if is_frame},
+                owned={u for u, (_, owned) in found.items() if owned},
+                path="sql",
+            )
+        except Exception:
+            logger.warning("probe_subjects failed, falling back to SPARQL", exc_info=True)
+    if result is None:
+        result = await _check_sparql(backend, space_id, graph_id, uris, owner_uri)
+    result.elapsed_s = time.monotonic() - t0
+    return result
+
+
+def _bindings(result) -> List[dict]:
+    if not isinstance(result, dict):
+        return []
+    return result.get('results', {}).get('bindings', [])
+
+
+async def _check_sparql(backend, space_id: str, graph_id: str, uris: List[str],
+                        owner_uri: Optional[str]) -> WriteCheck:
+    values = " ".join(f"<{u}>" for u in uris)
+    existing_query = f"""
+        SELECT DISTINCT ?s WHERE {{
+            GRAPH <{graph_id}> {{ VALUES ?s {{ {values} }} ?s ?p ?o . }}
+        }}
+    """
+    flags_query = f"""
+        SELECT ?s ?p ?o WHERE {{
+            GRAPH <{graph_id}> {{
+                VALUES ?s {{ {values} }}
+                ?s ?p ?o .
+                FILTER(?p IN (<{RDF_TYPE_URI}>, <{HAS_KG_GRAPH_URI}>))
+            }}
+        }}
+    """
+    result = WriteCheck(path="sparql")
+    for b in _bindings(await backend.execute_sparql_query(space_id, existing_query)):
+        result.existing.add(b['s']['value'])
+    for b in _bindings(await backend.execute_sparql_query(space_id, flags_query)):
+        s, p, o = b['s']['value'], b['p']['value'], b['o']['value']
+        if p == RDF_TYPE_URI and o == KGFRAME_URI:
+            result.frames.add(s)
+        elif p == HAS_KG_GRAPH_URI and owner_uri and o == owner_uri:
+            result.owned.add(s)
+    return result
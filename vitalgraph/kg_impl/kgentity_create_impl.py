@@ -24,6 +24,7 @@ from ..model.result_status import OperationStatus
 # Local imports
 from .kg_backend_utils import KGBackendInterface, BackendOperationResult
 from .kg_validation_utils import KGEntityValidator, KGGroupingURIManager, KGOwnershipValidator, ValidationResult
+from .kg_write_validation import check_write_batch
 
 
 class OperationMode(str, Enum):
@@ -249,10 +250,14 @@ class KGEntityCreateProcessor:
                                 entities: List[KGEntity], objects: List[GraphObject]) -> EntityUpdateResponse:
         """Handle UPDATE mode: verify all entities exist before updating."""
         try:
-            # Check if all entities exist
+            # Check if all entities exist (one batched probe)
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [str(e.URI) for e in entities])
+            self.logger.info(f"⏱️  UPDATE_IMPL validate: {check.elapsed_s:.3f}s "
+                             f"({len(entities)} entities, {len(check.existing)} found, {check.path})")
             for entity in entities:
                 entity_uri = str(entity.URI)
-                if not await self.backend.object_exists(space_id, graph_id, entity_uri):
+                if entity_uri not in check.existing:
                     return EntityUpdateResponse(
                         status=OperationStatus.NOT_FOUND,
                         message=f"Entity {entity_uri} not found - cannot update in 'update' mode",
@@ -293,13 +298,17 @@ class KGEntityCreateProcessor:
                                 entities: List[KGEntity], objects: List[GraphObject]) -> EntityUpdateResponse:
         """Handle UPSERT mode: create if not exists, update if exists."""
         try:
-            # Check which entities exist
+            # Check which entities exist (one batched probe)
             existing_entities = []
             new_entities = []
             
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [str(e.URI) for e in entities])
+            self.logger.info(f"⏱️  UPSERT_IMPL validate: {check.elapsed_s:.3f}s "
+                             f"({len(entities)} entities, {len(check.existing)} found, {check.path})")
             for entity in entities:
                 entity_uri = str(entity.URI)
-                if await self.backend.object_exists(space_id, graph_id, entity_uri):
+                if entity_uri in check.existing:
                     existing_entities.append(entity)
                 else:
                     new_entities.append(entity)
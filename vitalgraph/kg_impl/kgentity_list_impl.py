@@ -25,6 +25,11 @@ from vitalgraph.model.kgentities_model import _FILTERABLE_ENTITY_PROPERTIES
 # Count cache — shared with the /kgentities/count endpoint; invalidated on writes.
 from vitalgraph.cache.count_cache import _count_cache
 
+# count_mode (exact | estimated | capped:N | none) for the listing total
+from vitalgraph.db.sparql_sql.count_mode import (
+    COUNT_EXACT, EXACT, CountMode, finish_count, resolve_count,
+)
+
 # ---------------------------------------------------------------------------
 # KGEntity subclass type clause — matches KGEntity and all known subclasses.
 # Must be kept in sync with kg_query_builder.py entity_type_clause.
@@ -62,6 +67,7 @@ class ListEntitiesResult:
     """Result container for list operations."""
     entities: List[GraphObject]
     total_count: int
+    count_kind: str = COUNT_EXACT
 
 
 class KGEntityListProcessor:
@@ -96,7 +102,8 @@ class KGEntityListProcessor:
                            modified_after: Optional[str] = None,
                            modified_before: Optional[str] = None,
                            action_type: Optional[str] = None,
-                           provenance_type: Optional[str] = None) -> ListEntitiesResult:
+                           provenance_type: Optional[str] = None,
+                           count_mode: CountMode = EXACT) -> ListEntitiesResult:
         """
         List KGEntities with filtering and pagination.
 
@@ -110,6 +117,8 @@ class KGEntityListProcessor:
 
         sort_by: Optional property URI to sort by (e.g. vital-core:hasName).
         sort_order: 'asc' or 'desc'.
+        count_mode: how total_count is produced (see _resolve_listing_count);
+        the result's count_kind says which kind it is.
         """
         try:
             self.logger.debug(
@@ -133,14 +142,14 @@ class KGEntityListProcessor:
                     space_id, graph_id, page_size, offset,
                     entity_type_uri, search, backend_adapter,
                     sort_by=sort_by, sort_order=sort_order,
-                    prop_filters=prop_filters,
+                    prop_filters=prop_filters, count_mode=count_mode,
                 )
             else:
                 return await self._list_entities_with_graph(
                     space_id, graph_id, page_size, offset,
                     entity_type_uri, search, backend_adapter,
                     sort_by=sort_by, sort_order=sort_order,
-                    prop_filters=prop_filters,
+                    prop_filters=prop_filters, count_mode=count_mode,
                 )
 
         except Exception as e:
@@ -155,15 +164,18 @@ class KGEntityListProcessor:
                                   offset, entity_type_uri, search,
                                   backend_adapter,
                                   sort_by=None, sort_order="asc",
-                                  prop_filters: str = "") -> ListEntitiesResult:
+                                  prop_filters: str = "",
+                                  count_mode: CountMode = EXACT) -> ListEntitiesResult:
         """Fetch one page of entities + total count as cheaply as possible.
 
         Fast path (plain default listing): a direct-SQL page ordered by
         ``subject_uuid`` (``fast_entity_page``) that materializes only the
         page's subjects, avoiding the ``ORDER BY ?s`` full-URI resolution that
-        dominates cold renders on large spaces.  Falls back to the SPARQL
-        properties query for filtered/searched/sorted lists or backends
-        without the fast path.
+        dominates cold renders on large spaces.  A typed listing sorted by a
+        property that a declared property table covers is served the same
+        way, in the SPARQL order, off that table's sort index.  Falls back to
+        the SPARQL properties query for filtered/searched/sorted lists or
+        backends without the fast path.
         """
         count_sparql = self._build_count_query(
             graph_id, entity_type_uri, search,
@@ -176,7 +188,8 @@ class KGEntityListProcessor:
         if fast_page_fn is not None:
             fast_uris = await fast_page_fn(
                 space_id, graph_id, page_size, offset,
-                entity_type_uri, search, prop_filters, sort_by)
+                entity_type_uri, search, prop_filters, sort_by,
+                sort_order=sort_order)
 
         if fast_uris is not None:
             async def _fetch_objects():
@@ -184,7 +197,7 @@ class KGEntityListProcessor:
                     return []
                 objs = await backend_adapter.get_objects_by_uris(
                     space_id, fast_uris, graph_id)
-                # Preserve the subject_uuid page order.
+                # Preserve the page order (subject_uuid, or the sort column).
                 by_uri = {}
                 for o in objs:
                     u = str(o.URI) if getattr(o, 'URI', None) else None
@@ -193,13 +206,14 @@ class KGEntityListProcessor:
                 return [by_uri[u] for u in fast_uris if u in by_uri]
 
             objs_task = asyncio.ensure_future(_fetch_objects())
-            count_task = asyncio.ensure_future(self._resolve_total_count(
+            count_task = asyncio.ensure_future(self._resolve_listing_count(
                 space_id, graph_id, backend_adapter, count_sparql,
-                entity_type_uri, search, prop_filters, sort_by))
-            objects, total_count = await asyncio.gather(objs_task, count_task)
-            self.logger.debug("list_entities_fast(direct): %d objects, total=%d",
-                              len(objects), total_count)
-            return ListEntitiesResult(entities=objects, total_count=total_count)
+                entity_type_uri, search, prop_filters, sort_by, count_mode))
+            objects, (total_count, kind) = await asyncio.gather(objs_task, count_task)
+            total_count = finish_count(total_count, kind, offset, len(fast_uris))
+            self.logger.debug("list_entities_fast(direct): %d objects, total=%d (%s)",
+                              len(objects), total_count, kind)
+            return ListEntitiesResult(entities=objects, total_count=total_count, count_kind=kind)
 
         # --- Fallback: SPARQL properties query (filtered/sorted/searched) ---
         sparql = self._build_optimized_properties_query(
@@ -212,19 +226,22 @@ class KGEntityListProcessor:
         # cache → fast direct-SQL → SPARQL (see _resolve_total_count).
         data_task = asyncio.ensure_future(
             backend_adapter.execute_sparql_query(space_id, sparql))
-        count_task = asyncio.ensure_future(self._resolve_total_count(
+        count_task = asyncio.ensure_future(self._resolve_listing_count(
             space_id, graph_id, backend_adapter, count_sparql,
-            entity_type_uri, search, prop_filters, sort_by))
-        data_result, total_count = await asyncio.gather(data_task, count_task)
+            entity_type_uri, search, prop_filters, sort_by, count_mode))
+        data_result, (total_count, kind) = await asyncio.gather(data_task, count_task)
 
         # Parse data bindings → GraphObjects via from_property_maps
         bindings = _extract_bindings(data_result)
         if not bindings:
-            return ListEntitiesResult(entities=[], total_count=total_count)
+            total_count = finish_count(total_count, kind, offset, 0)
+            return ListEntitiesResult(entities=[], total_count=total_count, count_kind=kind)
 
         objects = await self._bindings_to_graph_objects(bindings)
-        self.logger.debug("list_entities_fast: %d objects, total=%d", len(objects), total_count)
-        return ListEntitiesResult(entities=objects, total_count=total_count)
+        total_count = finish_count(total_count, kind, offset, len(objects))
+        self.logger.debug("list_entities_fast: %d objects, total=%d (%s)",
+                          len(objects), total_count, kind)
+        return ListEntitiesResult(entities=objects, total_count=total_count, count_kind=kind)
 
     # ------------------------------------------------------------------
     # Graph path: include_entity_graph=True
@@ -234,7 +251,8 @@ class KGEntityListProcessor:
                                         offset, entity_type_uri, search,
                                         backend_adapter,
                                         sort_by=None, sort_order="asc",
-                                        prop_filters: str = "") -> ListEntitiesResult:
+                                        prop_filters: str = "",
+                                        count_mode: CountMode = EXACT) -> ListEntitiesResult:
         """Get entity URIs, then fetch full entity graphs in parallel."""
         from .kgentity_get_impl import KGEntityGetProcessor
 
@@ -249,17 +267,18 @@ class KGEntityListProcessor:
         # Run URI + count concurrently (count via cache → fast SQL → SPARQL)
         uri_task = asyncio.ensure_future(
             backend_adapter.execute_sparql_query(space_id, uri_sparql))
-        count_task = asyncio.ensure_future(self._resolve_total_count(
+        count_task = asyncio.ensure_future(self._resolve_listing_count(
             space_id, graph_id, backend_adapter, count_sparql,
-            entity_type_uri, search, prop_filters, sort_by))
-        uri_result, total_count = await asyncio.gather(uri_task, count_task)
+            entity_type_uri, search, prop_filters, sort_by, count_mode))
+        uri_result, (total_count, kind) = await asyncio.gather(uri_task, count_task)
 
         # Parse URIs
         uri_bindings = _extract_bindings(uri_result)
         entity_uris = [b['entity']['value'] for b in uri_bindings if 'entity' in b]
+        total_count = finish_count(total_count, kind, offset, len(entity_uris))
 
         if not entity_uris:
-            return ListEntitiesResult(entities=[], total_count=total_count)
+            return ListEntitiesResult(entities=[], total_count=total_count, count_kind=kind)
 
         # Fetch entity graphs concurrently
         get_processor = KGEntityGetProcessor(logger=self.logger)
@@ -282,13 +301,64 @@ class KGEntityListProcessor:
             if objs:
                 entities.extend(objs)
 
-        self.logger.debug("list_entities_with_graph: %d objects, total=%d", len(entities), total_count)
-        return ListEntitiesResult(entities=entities, total_count=total_count)
+        self.logger.debug("list_entities_with_graph: %d objects, total=%d (%s)",
+                          len(entities), total_count, kind)
+        return ListEntitiesResult(entities=entities, total_count=total_count, count_kind=kind)
 
     # ------------------------------------------------------------------
     # Total-count resolution: cache → fast direct-SQL → SPARQL
     # ------------------------------------------------------------------
 
+    async def _resolve_listing_count(self, space_id, graph_id, backend_adapter,
+                                     count_sparql, entity_type_uri, search,
+                                     prop_filters, sort_by,
+                                     count_mode: CountMode = EXACT):
+        """``(total, kind)`` for the listing under ``count_mode``.
+
+        ``exact`` is ``_resolve_total_count``. ``estimated`` reads the
+        ``vitaltype`` / ``hasKGEntityType`` row counts from the stats tables
+        for an unfiltered listing, else the planner's estimate of the count
+        SQL; ``capped:N`` bounds the SPARQL count; ``none`` skips it. An
+        exact total already in the count cache is returned, as exact,
+        whatever the mode — it costs nothing.
+        """
+        if count_mode.kind == COUNT_EXACT:
+            total = await self._resolve_total_count(
+                space_id, graph_id, backend_adapter, count_sparql,
+                entity_type_uri, search, prop_filters, sort_by)
+            return total, COUNT_EXACT
+
+        cached = _count_cache.get(space_id, graph_id, _count_cache.query_hash(count_sparql))
+        if cached is not None:
+            return cached, COUNT_EXACT
+
+        from .kg_backend_utils import (
+            VITALTYPE_URI, SparqlSQLBackendAdapter, _resolve_space_impl,
+        )
+        impl = _resolve_space_impl(backend_adapter)
+        estimators = []
+        pattern_fn = getattr(impl, 'estimate_pattern_count', None)
+        if pattern_fn and not (search or prop_filters or sort_by):
+            if entity_type_uri:
+                estimators.append(lambda: pattern_fn(
+                    space_id, 'http://vital.ai/ontology/haley-ai-kg#hasKGEntityType',
+                    [entity_type_uri]))
+            else:
+                estimators.append(lambda: pattern_fn(
+                    space_id, VITALTYPE_URI, list(SparqlSQLBackendAdapter._KGENTITY_TYPE_URIS)))
+        sparql_fn = getattr(impl, 'estimate_sparql_count', None)
+        if sparql_fn:
+            estimators.append(lambda: sparql_fn(space_id, count_sparql))
+        return await resolve_count(
+            count_mode, count_sparql,
+            lambda q: self._sparql_count(space_id, backend_adapter, q), estimators)
+
+    async def _sparql_count(self, space_id, backend_adapter, count_sparql) -> int:
+        count_result = await backend_adapter.execute_sparql_query(space_id, count_sparql)
+        count_bindings = _extract_bindings(count_result)
+        return (int(count_bindings[0]['count']['value'])
+                if count_bindings and 'count' in count_bindings[0] else 0)
+
     async def _resolve_total_count(self, space_id, graph_id, backend_adapter,
                                    count_sparql, entity_type_uri, search,
                                    prop_filters, sort_by) -> int:
@@ -320,10 +390,7 @@ class KGEntityListProcessor:
                 total = None
 
         if total is None:
-            count_result = await backend_adapter.execute_sparql_query(space_id, count_sparql)
-            count_bindings = _extract_bindings(count_result)
-            total = (int(count_bindings[0]['count']['value'])
-                     if count_bindings and 'count' in count_bindings[0] else 0)
+            total = await self._sparql_count(space_id, backend_adapter, count_sparql)
 
         _count_cache.put(space_id, graph_id, qhash, total)
         return total
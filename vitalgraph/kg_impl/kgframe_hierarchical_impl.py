@@ -28,6 +28,7 @@ from vitalgraph.kg_impl.kg_backend_utils import (
     KGBackendInterface,
     BackendOperationResult
 )
+from vitalgraph.kg_impl.kg_write_validation import check_write_batch
 
 
 @dataclass
@@ -180,21 +181,11 @@ class KGFrameHierarchicalProcessor:
             True if parent frame exists, False otherwise
         """
         try:
-            query = f"""
-            ASK WHERE {{
-                GRAPH <{graph_id}> {{
-                    <{parent_frame_uri}> a <http://vital.ai/ontology/haley-ai-kg#KGFrame> .
-                }}
-            }}
-            """
-            
-            results = await backend_adapter.execute_sparql_query(space_id, query)
-            
-            # Handle ASK result format
-            if isinstance(results, dict):
-                return results.get('boolean', False)
-            if isinstance(results, bool):
-                return results
+            check = await check_write_batch(backend_adapter, space_id, graph_id,
+                                            [parent_frame_uri])
+            self.logger.info(f"⏱️ CHILD_FRAMES validate_parent: {check.elapsed_s:.3f}s ({check.path})")
+            if parent_frame_uri in check.frames:
+                return True
             
             self.logger.warning(f"Parent frame {parent_frame_uri} not found")
             return False
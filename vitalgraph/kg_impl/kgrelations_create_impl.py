@@ -20,6 +20,7 @@ from ..model.result_status import OperationStatus
 
 # Local imports
 from .kg_backend_utils import KGBackendInterface, BackendOperationResult
+from .kg_write_validation import check_write_batch
 
 
 class OperationMode(str, Enum):
@@ -159,11 +160,15 @@ class KGRelationsCreateProcessor:
         """Handle UPSERT mode: create if not exists, update if exists."""
         try:
             # Delete existing relation data for clean upsert
+            check = await check_write_batch(
+                self.backend, space_id, graph_id,
+                [str(r.URI) for r in relations if hasattr(r, 'URI')])
+            self.logger.info(f"⏱️  RELATION_UPSERT validate: {check.elapsed_s:.3f}s "
+                             f"({len(relations)} relations, {len(check.existing)} found, {check.path})")
             for relation in relations:
                 if hasattr(relation, 'URI'):
                     relation_uri = str(relation.URI)
-                    # Check if exists and delete
-                    if await self.backend.object_exists(space_id, graph_id, relation_uri):
+                    if relation_uri in check.existing:
                         await self.backend.delete_object(space_id, graph_id, relation_uri)
             
             # Store all objects (both new and updated)
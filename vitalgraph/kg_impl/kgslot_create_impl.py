@@ -25,6 +25,7 @@ from ..model.result_status import OperationStatus
 # Local imports
 from .kg_backend_utils import KGBackendInterface, BackendOperationResult
 from .kg_validation_utils import KGEntityValidator, KGGroupingURIManager, ValidationResult
+from .kg_write_validation import check_write_batch
 
 
 class OperationMode(str, Enum):
@@ -131,10 +132,14 @@ class KGSlotCreateProcessor:
                                 slots: List[KGSlot], objects: List[GraphObject]) -> SlotCreateResponse:
         """Handle CREATE mode: verify none of the objects already exist."""
         try:
-            # Check if any slots already exist
+            # Check if any slots already exist (one batched probe)
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [str(s.URI) for s in slots])
+            self.logger.info(f"⏱️  SLOT_CREATE validate: {check.elapsed_s:.3f}s "
+                             f"({len(slots)} slots, {len(check.existing)} found, {check.path})")
             for slot in slots:
                 slot_uri = str(slot.URI)
-                if await self.backend.object_exists(space_id, graph_id, slot_uri):
+                if slot_uri in check.existing:
                     return SlotCreateResponse(
                         status=OperationStatus.ALREADY_EXISTS,
                         message=f"Slot {slot_uri} already exists - cannot create in 'create' mode",
@@ -176,10 +181,14 @@ class KGSlotCreateProcessor:
                                 slots: List[KGSlot], objects: List[GraphObject]) -> SlotUpdateResponse:
         """Handle UPDATE mode: verify all slots exist before updating."""
         try:
-            # Check if all slots exist
+            # Check if all slots exist (one batched probe)
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [str(s.URI) for s in slots])
+            self.logger.info(f"⏱️  SLOT_UPDATE validate: {check.elapsed_s:.3f}s "
+                             f"({len(slots)} slots, {len(check.existing)} found, {check.path})")
             for slot in slots:
                 slot_uri = str(slot.URI)
-                if not await self.backend.object_exists(space_id, graph_id, slot_uri):
+                if slot_uri not in check.existing:
                     return SlotUpdateResponse(
                         status=OperationStatus.NOT_FOUND,
                         message=f"Slot {slot_uri} not found - cannot update in 'update' mode",
@@ -220,13 +229,17 @@ class KGSlotCreateProcessor:
                                 slots: List[KGSlot], objects: List[GraphObject]) -> SlotUpdateResponse:
         """Handle UPSERT mode: create if not exists, update if exists."""
         try:
-            # Check which slots exist
+            # Check which slots exist (one batched probe)
             existing_slots = []
             new_slots = []
             
+            check = await check_write_batch(self.backend, space_id, graph_id,
+                                            [str(s.URI) for s in slots])
+            self.logger.info(f"⏱️  SLOT_UPSERT validate: {check.elapsed_s:.3f}s "
+                             f"({len(slots)} slots, {len(check.existing)} found, {check.path})")
             for slot in slots:
                 slot_uri = str(slot.URI)
-                if await self.backend.object_exists(space_id, graph_id, slot_uri):
+                if slot_uri in check.existing:
                     existing_slots.append(slot)
                 else:
                     new_slots.append(slot)
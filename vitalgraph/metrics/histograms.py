@@ -0,0 +1,325 @@
+"""
+In-process latency histograms and OpenMetrics exposition.
+
+``PostgresMetricsCollector`` buffers one row per request into minute
+buckets: enough for request rates and averages per endpoint, but an
+average hides the tail, and nothing below the endpoint is visible — not
+how long a SPARQL query waited for a pooled connection, how much of it
+was the sidecar compile, or how often the count / entity-graph / compile
+caches actually hit. Per-shape statistics answer "which
+query" but not "which part of the stack".
+
+This module is a small metrics registry kept entirely in memory:
+
+* ``Histogram`` — fixed log-spaced buckets (1-2.5-5 per decade, 100 µs to
+  100 s, plus +Inf). ``observe`` is a ``bisect`` and two additions on a
+  per-label-set child looked up in a dict; there is no lock, no I/O and
+  no allocation after a label set's first observation, so it can sit on
+  every request. Cumulative counts are only built at scrape time.
+* ``Counter`` — monotonically increasing, per label set.
+* scrape-time collectors (``register_collector``) — callables that report
+  values owned elsewhere (cache counters, pool sizes) when ``/metrics``
+  is read, so the hot paths that own them are not touched at all.
+
+``render_openmetrics`` writes the OpenMetrics text format, which
+Prometheus, the OpenTelemetry collector and most agents scrape directly.
+prometheus_client would do the same, but it is not a dependency of this
+project and the subset needed here is a page of code.
+
+Label sets per metric are capped (``MAX_SERIES``); observations past the
+cap are folded into one series whose labels are all ``"other"``, so an
+unbounded label value (a path segment that slipped through
+classification) costs one series, not memory proportional to traffic.
+
+The registry is per process. Each worker exposes its own ``/metrics``;
+aggregating across workers is the scraper's job, as usual.
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Upper bounds in seconds: 100us .. 100s, three per decade.
+DEFAULT_BUCKETS: Tuple[float, ...] = tuple(
+    round(m * 10.0 ** e, 6) for e in range(-4, 2) for m in (1.0, 2.5, 5.0)
+) + (100.0,)
+
+MAX_SERIES = 1_000
+_OVERFLOW = "other"
+
+# (labels, value) pairs reported by a collector for one metric family.
+Sample = Tuple[Dict[str, str], float]
+# (name, type, help, samples) — type is 'gauge' or 'counter'.
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self.overflowed = 0
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh child for one label set."""
+
+    def labels(self, *values: str):
+        """The child for one label set, created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values!r}")
+            if len(self._children) >= MAX_SERIES:
+                self.overflowed += 1
+                values = (_OVERFLOW,) * len(self.labelnames)
+                child = self._children.get(values)
+                if child is not None:
+                    return child
+            child = self._new_child()
+            self._children[values] = child
+        return child
+
+    def clear(self) -> None:
+        self._children.clear()
+
+    @abstractmethod
+    def render(self, out: List[str]) -> None:
+        """Append this metric's exposition lines to ``out``."""
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+class _Timer:
+    __slots__ = ("_child", "_t0")
+
+    def __init__(self, child: _HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._t0)
+        return False
+
+
+class Histogram(_Metric):
+    """Latency histogram in seconds with fixed, shared bucket bounds."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._le = [f'le="{_format_value(b)}"' for b in self.buckets] + ['le="+Inf"']
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, seconds: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(seconds)
+
+    def render(self, out: List[str]) -> None:
+        for values, child in sorted(self._children.items()):
+            cumulative = 0
+            for le, n in zip(self._le, child.counts):
+                cumulative += n
+                out.append(f"{self.name}_bucket"
+                           f"{_format_labels(self.labelnames, values, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            out.append(f"{self.name}_count{labels} {cumulative}")
+            out.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonic counter; exposed with the ``_total`` suffix."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1, *labelvalues: str) -> None:
+        self.labels(*labelvalues).inc(amount)
+
+    def render(self, out: List[str]) -> None:
+        for values, child in sorted(self._children.items()):
+            out.append(f"{self.name}_total{_format_labels(self.labelnames, values)} "
+                       f"{_format_value(child.value)}")
+
+
+class MetricsRegistry:
+    """Named metrics plus scrape-time collectors, rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"metric {metric.name} already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def register_collector(self, fn: Callable[[], Iterable[Family]]) -> None:
+        """Call ``fn`` at every scrape; it yields ``(name, type, help, samples)``."""
+        if fn not in self._collectors:
+            self._collectors.append(fn)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """The whole registry in OpenMetrics text format, ``# EOF`` terminated."""
+        out: List[str] = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            out.append(f"# TYPE {name} {metric.type_name}")
+            out.append(f"# HELP {name} {_escape(metric.documentation)}")
+            metric.render(out)
+        for fn in self._collectors:
+            try:
+                families = list(fn())
+            except Exception as e:
+                logger.debug("metrics collector %r failed (skipped): %s", fn, e)
+                continue
+            for name, type_name, documentation, samples in families:
+                out.append(f"# TYPE {name} {type_name}")
+                out.append(f"# HELP {name} {_escape(documentation)}")
+                suffix = "_total" if type_name == "counter" else ""
+                for labels, value in samples:
+                    out.append(f"{name}{suffix}"
+                               f"{_format_labels(list(labels), list(labels.values()))} "
+                               f"{_format_value(value)}")
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Process-wide registry and the request-path metrics
+# ---------------------------------------------------------------------------
+
+registry = MetricsRegistry()
+
+http_request_seconds = registry.histogram(
+    "vitalgraph_http_request_duration_seconds",
+    "HTTP request latency by classified endpoint, method and status class.",
+    ("endpoint", "method", "status"),
+)
+sparql_stage_seconds = registry.histogram(
+    "vitalgraph_sparql_stage_duration_seconds",
+    "execute_sparql_query latency per pipeline stage.",
+    ("stage",),
+)
+pool_acquire_seconds = registry.histogram(
+    "vitalgraph_pool_acquire_duration_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ("site",),
+)
+sidecar_seconds = registry.histogram(
+    "vitalgraph_sidecar_request_duration_seconds",
+    "SPARQL compiler sidecar round-trip latency.",
+    ("op", "outcome"),
+)
+embedding_seconds = registry.histogram(
+    "vitalgraph_embedding_duration_seconds",
+    "Embedding provider call latency.",
+    ("provider", "op"),
+)
+embedding_texts = registry.counter(
+    "vitalgraph_embedding_texts",
+    "Texts sent to embedding providers.",
+    ("provider",),
+)
+
+
+def status_class(status_code: int) -> str:
+    """``"2xx"``, ``"4xx"``… — bounded label values for HTTP status."""
+    return f"{status_code // 100}xx"
+
+
+def observe_sparql_timing(timing: Dict[str, float]) -> None:
+    """Feed one ``execute_sparql_query`` timing breakdown into the stage histograms."""
+    for key, value in timing.items():
+        if key.endswith("_ms"):
+            sparql_stage_seconds.labels(key[:-3]).observe(value / 1000.0)
+    acquire = timing.get("acquire_ms")
+    if acquire is not None:
+        pool_acquire_seconds.labels("sparql_query").observe(acquire / 1000.0)
+
+
+def render_openmetrics() -> str:
+    return registry.render()
@@ -4,6 +4,10 @@ FastAPI middleware that captures per-request metrics.
 Extracts space_id from the URL path, classifies the endpoint,
 measures duration, and fires off a metric recording to PostgreSQL
 via the buffered PostgresMetricsCollector.
+
+Every request, tracked or not and with or without a collector, is also
+observed in the in-process latency histogram served on ``/metrics``.
+The PostgreSQL rows give per-space averages over time; the histogram gives the tail.
 """
 
 import logging
@@ -15,6 +19,7 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from vitalgraph.metrics.histograms import http_request_seconds, status_class
 from vitalgraph.metrics.postgres_metrics_collector import PostgresMetricsCollector
 
 logger = logging.getLogger(__name__)
@@ -103,14 +108,16 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         collector: Optional[PostgresMetricsCollector] = getattr(
             request.app.state, 'metrics_collector', None
         )
-        if not collector or not collector.enabled:
-            return await call_next(request)
+        if collector is not None and not collector.enabled:
+            collector = None
 
         start = time.perf_counter()
         error = False
+        status = 500
 
         try:
             response = await call_next(request)
+            status = response.status_code
             if response.status_code >= 400:
                 error = True
             return response
@@ -118,7 +125,8 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             error = True
             raise
         finally:
-            duration_ms = (time.perf_counter() - start) * 1000
+            elapsed = time.perf_counter() - start
+            duration_ms = elapsed * 1000
 
             # Classify request
             query_params = dict(request.query_params)
@@ -126,7 +134,14 @@ class MetricsMiddleware(BaseHTTPMiddleware):
                 request.url.path, request.method, query_params
             )
 
-            if space_id and endpoint:
+            try:
+                http_request_seconds.labels(
+                    endpoint or 'other', request.method, status_class(status)
+                ).observe(elapsed)
+            except Exception as e:
+                logger.debug(f"Metrics middleware histogram failed: {e}")
+
+            if collector and space_id and endpoint:
                 # Build metadata for slow query log
                 metadata = None
                 if duration_ms >= collector._slow_threshold_ms:
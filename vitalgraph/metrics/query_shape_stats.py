@@ -0,0 +1,377 @@
+"""
+Per-query-shape SPARQL statistics — pg_stat_statements for SPARQL.
+
+``execute_sparql_query`` computes a per-stage timing breakdown for every
+query (pool acquire, sidecar compile, SQL generation, execution, row
+conversion, bindings) and until now only logged it. Request metrics
+(PostgresMetricsCollector) are per endpoint, so "which queries cost the
+most" could only be answered by grepping logs.
+
+Queries are grouped by the compile cache's shape hash: the SHA-256 of the
+SPARQL with every ``<IRI>`` replaced by a positional placeholder, so the
+same query issued for different entities, frames or graphs is one shape.
+For each (space, shape, hour) this module keeps, in process:
+
+* call count, total and maximum result rows;
+* per stage, the sum and a log-bucketed latency histogram (buckets 25%
+  wide, 0.05 ms to ~150 s), from which p50/p95/p99 are read;
+* the slowest call's generated SQL and SPARQL, as the example to EXPLAIN.
+
+Recording is a dict lookup and a few list increments — no I/O on the
+query path. ``QueryShapeStats.start`` runs a loop that flushes the window
+every minute into ``sparql_shape_stats`` with one batched upsert; the
+upsert adds histograms element-wise, so windows from any number of
+flushes and instances merge into exact hourly totals and percentiles stay
+computable over any range. ``read_shape_stats`` serves the admin endpoint,
+folding in this instance's unflushed window.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STAGES: Tuple[str, ...] = (
+    'acquire_ms', 'sidecar_ms', 'gen_ms', 'exec_ms',
+    'rows_to_dict_ms', 'bindings_ms', 'total_ms',
+)
+
+# Upper bounds (ms) of the histogram buckets; one overflow bucket follows.
+BUCKET_BOUNDS_MS: Tuple[float, ...] = tuple(0.05 * 1.25 ** i for i in range(68))
+N_BUCKETS = len(BUCKET_BOUNDS_MS) + 1
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 60
+DEFAULT_MAX_SHAPES = 2_000
+SHAPE_STATS_RETENTION_DAYS = 7
+# Examples are for reading, not replaying; cap what a flush carries.
+MAX_EXAMPLE_CHARS = 20_000
+
+_TOTAL = STAGES.index('total_ms')
+
+
+def bucket_index(ms: float) -> int:
+    return bisect_left(BUCKET_BOUNDS_MS, ms)
+
+
+def percentile(hist: List[int], q: float) -> float:
+    """Upper bound of the bucket holding the ``q`` quantile of ``hist``."""
+    total = sum(hist)
+    if not total:
+        return 0.0
+    target = q * total
+    running = 0
+    for i, n in enumerate(hist):
+        running += n
+        if running >= target:
+            return BUCKET_BOUNDS_MS[min(i, len(BUCKET_BOUNDS_MS) - 1)]
+    return BUCKET_BOUNDS_MS[-1]
+
+
+class _Shape:
+    """One (space, shape, hour) window. ``hist`` is stage-major: STAGES x N_BUCKETS."""
+
+    __slots__ = ('calls', 'rows', 'max_rows', 'sums', 'hist',
+                 'worst_ms', 'worst_sql', 'worst_sparql', 'first_seen', 'last_seen')
+
+    def __init__(self, now: float):
+        self.calls = 0
+        self.rows = 0
+        self.max_rows = 0
+        self.sums = [0.0] * len(STAGES)
+        self.hist = [0] * (len(STAGES) * N_BUCKETS)
+        self.worst_ms = -1.0
+        self.worst_sql = ''
+        self.worst_sparql = ''
+        self.first_seen = now
+        self.last_seen = now
+
+
+class QueryShapeStats:
+    """In-process aggregator of SPARQL timings by query shape, flushed in batches."""
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+                 max_shapes: int = DEFAULT_MAX_SHAPES):
+        self._flush_interval = flush_interval
+        self._max_shapes = max_shapes
+        self._window: Dict[Tuple[str, str, int], _Shape] = {}
+        self._pool = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running = False
+        self.enabled = True
+        self.dropped = 0
+
+    def record(self, space_id: str, shape_hash: str, timing: Dict[str, Any],
+               sql: str = '', sparql: str = '') -> None:
+        """Add one query's ``timing`` dict to its shape. Never raises into the caller."""
+        if not self.enabled or not shape_hash:
+            return
+        try:
+            now = time.time()
+            key = (space_id, shape_hash, int(now) // 3600 * 3600)
+            s = self._window.get(key)
+            if s is None:
+                if len(self._window) >= self._max_shapes:
+                    self.dropped += 1
+                    return
+                s = self._window[key] = _Shape(now)
+            s.calls += 1
+            s.last_seen = now
+            rows = int(timing.get('rows') or 0)
+            s.rows += rows
+            if rows > s.max_rows:
+                s.max_rows = rows
+            for i, stage in enumerate(STAGES):
+                ms = float(timing.get(stage) or 0.0)
+                s.sums[i] += ms
+                s.hist[i * N_BUCKETS + bucket_index(ms)] += 1
+            total = float(timing.get('total_ms') or 0.0)
+            if total > s.worst_ms:
+                s.worst_ms = total
+                s.worst_sql = sql[:MAX_EXAMPLE_CHARS]
+                s.worst_sparql = sparql[:MAX_EXAMPLE_CHARS]
+        except Exception as e:
+            logger.debug("shape stats record failed (non-fatal): %s", e)
+
+    def pending_rows(self) -> List[Dict[str, Any]]:
+        """The unflushed window in ``sparql_shape_stats`` row form."""
+        return [_to_row(key, s) for key, s in self._window.items()]
+
+    # ---- flushing --------------------------------------------------------
+
+    async def start(self, pool) -> None:
+        """Start flushing to ``sparql_shape_stats`` through ``pool``."""
+        self._pool = pool
+        if self._running:
+            return
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info("QueryShapeStats started (flush_interval=%ss)", self._flush_interval)
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while self._running:
+            try:
+                await asyncio.sleep(self._flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.debug(f"Shape stats flush loop error (non-fatal): {e}")
+
+    async def flush(self) -> int:
+        """Upsert the current window; returns the number of shape rows written."""
+        if not self._window or self._pool is None:
+            return 0
+        window, self._window = self._window, {}
+        rows = [_to_row(key, s) for key, s in window.items()]
+        try:
+            async with self._pool.acquire() as conn:
+                known = await _known_space_ids(conn, {r['space_id'] for r in rows})
+                rows = [r for r in rows if r['space_id'] in known]
+                if rows:
+                    await conn.executemany(_UPSERT_SQL, [_upsert_args(r) for r in rows])
+            return len(rows)
+        except Exception as e:
+            # Keep the swapped-out window: merge it back under whatever was
+            # recorded meanwhile, so the next flush retries it.
+            logger.debug(f"Shape stats flush to PostgreSQL failed (non-fatal): {e}")
+            self._restore(window)
+            return 0
+
+    def _restore(self, window: Dict[Tuple[str, str, int], _Shape]) -> None:
+        for key, old in window.items():
+            s = self._window.get(key)
+            if s is None:
+                if len(self._window) >= self._max_shapes:
+                    self.dropped += old.calls
+                    continue
+                self._window[key] = old
+                continue
+            s.calls += old.calls
+            s.rows += old.rows
+            s.max_rows = max(s.max_rows, old.max_rows)
+            s.sums = [a + b for a, b in zip(s.sums, old.sums)]
+            s.hist = [a + b for a, b in zip(s.hist, old.hist)]
+            if old.worst_ms > s.worst_ms:
+                s.worst_ms, s.worst_sql, s.worst_sparql = old.worst_ms, old.worst_sql, old.worst_sparql
+            s.first_seen = min(s.first_seen, old.first_seen)
+            s.last_seen = max(s.last_seen, old.last_seen)
+
+
+def _to_row(key: Tuple[str, str, int], s: _Shape) -> Dict[str, Any]:
+    space_id, shape_hash, hour = key
+    return {
+        'space_id': space_id,
+        'shape_hash': shape_hash,
+        'bucket_start': datetime.fromtimestamp(hour, tz=timezone.utc),
+        'calls': s.calls,
+        'rows_total': s.rows,
+        'max_rows': s.max_rows,
+        'stage_sum_ms': list(s.sums),
+        'stage_hist': list(s.hist),
+        'worst_total_ms': s.worst_ms,
+        'worst_sql': s.worst_sql,
+        'worst_sparql': s.worst_sparql,
+        'first_seen': datetime.fromtimestamp(s.first_seen, tz=timezone.utc),
+        'last_seen': datetime.fromtimestamp(s.last_seen, tz=timezone.utc),
+    }
+
+
+def _upsert_args(r: Dict[str, Any]) -> Tuple:
+    return (r['space_id'], r['shape_hash'], r['bucket_start'], r['calls'],
+            r['rows_total'], r['max_rows'], r['stage_sum_ms'], r['stage_hist'],
+            r['worst_total_ms'], r['worst_sql'], r['worst_sparql'],
+            r['first_seen'], r['last_seen'])
+
+
+def _elementwise_sum(col: str) -> str:
+    return (f"(SELECT array_agg(COALESCE(a, 0) + COALESCE(b, 0) ORDER BY i) "
+            f"FROM unnest(sparql_shape_stats.{col}, EXCLUDED.{col}) "
+            f"WITH ORDINALITY AS u(a, b, i))")
+
+
+_UPSERT_SQL = f"""
+    INSERT INTO sparql_shape_stats
+        (space_id, shape_hash, bucket_start, calls, rows_total, max_rows,
+         stage_sum_ms, stage_hist, worst_total_ms, worst_sql, worst_sparql,
+         first_seen, last_seen)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+    ON CONFLICT (space_id, shape_hash, bucket_start) DO UPDATE SET
+        calls = sparql_shape_stats.calls + EXCLUDED.calls,
+        rows_total = sparql_shape_stats.rows_total + EXCLUDED.rows_total,
+        max_rows = GREATEST(sparql_shape_stats.max_rows, EXCLUDED.max_rows),
+        stage_sum_ms = {_elementwise_sum('stage_sum_ms')},
+        stage_hist = {_elementwise_sum('stage_hist')},
+        worst_sql = CASE WHEN EXCLUDED.worst_total_ms > sparql_shape_stats.worst_total_ms
+                         THEN EXCLUDED.worst_sql ELSE sparql_shape_stats.worst_sql END,
+        worst_sparql = CASE WHEN EXCLUDED.worst_total_ms > sparql_shape_stats.worst_total_ms
+                            THEN EXCLUDED.worst_sparql ELSE sparql_shape_stats.worst_sparql END,
+        worst_total_ms = GREATEST(sparql_shape_stats.worst_total_ms, EXCLUDED.worst_total_ms),
+        first_seen = LEAST(sparql_shape_stats.first_seen, EXCLUDED.first_seen),
+        last_seen = GREATEST(sparql_shape_stats.last_seen, EXCLUDED.last_seen)
+"""
+
+
+async def _known_space_ids(conn, space_ids) -> set:
+    # sparql_shape_stats has an FK to space; a window can outlive its space.
+    if not space_ids:
+        return set()
+    rows = await conn.fetch(
+        "SELECT space_id FROM space WHERE space_id = ANY($1::varchar[])", list(space_ids))
+    return {row['space_id'] for row in rows}
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+ORDER_KEYS = ('total_ms', 'calls', 'p95_ms', 'exec_ms', 'rows')
+
+
+def summarize(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge row-form windows per (space, shape) and compute the reported figures."""
+    merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for r in rows:
+        key = (r['space_id'], r['shape_hash'])
+        m = merged.get(key)
+        if m is None:
+            merged[key] = m = {
+                'space_id': r['space_id'], 'shape_hash': r['shape_hash'],
+                'calls': 0, 'rows_total': 0, 'max_rows': 0,
+                'stage_sum_ms': [0.0] * len(STAGES), 'stage_hist': [0] * (len(STAGES) * N_BUCKETS),
+                'worst_total_ms': -1.0, 'worst_sql': '', 'worst_sparql': '',
+                'first_seen': r['first_seen'], 'last_seen': r['last_seen'],
+            }
+        m['calls'] += r['calls']
+        m['rows_total'] += r['rows_total']
+        m['max_rows'] = max(m['max_rows'], r['max_rows'])
+        m['stage_sum_ms'] = [a + b for a, b in zip(m['stage_sum_ms'], r['stage_sum_ms'])]
+        m['stage_hist'] = [a + b for a, b in zip(m['stage_hist'], r['stage_hist'])]
+        if r['worst_total_ms'] > m['worst_total_ms']:
+            m['worst_total_ms'] = r['worst_total_ms']
+            m['worst_sql'] = r['worst_sql']
+            m['worst_sparql'] = r['worst_sparql']
+        m['first_seen'] = min(m['first_seen'], r['first_seen'])
+        m['last_seen'] = max(m['last_seen'], r['last_seen'])
+
+    out = []
+    for m in merged.values():
+        calls = m['calls'] or 1
+        stages = {}
+        for i, stage in enumerate(STAGES):
+            hist = m['stage_hist'][i * N_BUCKETS:(i + 1) * N_BUCKETS]
+            stages[stage] = {
+                'sum_ms': round(m['stage_sum_ms'][i], 2),
+                'mean_ms': round(m['stage_sum_ms'][i] / calls, 3),
+                'p50_ms': round(percentile(hist, 0.50), 3),
+                'p95_ms': round(percentile(hist, 0.95), 3),
+                'p99_ms': round(percentile(hist, 0.99), 3),
+            }
+        out.append({
+            'space_id': m['space_id'],
+            'shape_hash': m['shape_hash'],
+            'calls': m['calls'],
+            'rows_total': m['rows_total'],
+            'mean_rows': round(m['rows_total'] / calls, 2),
+            'max_rows': m['max_rows'],
+            'stages': stages,
+            'worst_total_ms': round(m['worst_total_ms'], 2),
+            'worst_sql': m['worst_sql'],
+            'worst_sparql': m['worst_sparql'],
+            'first_seen': m['first_seen'],
+            'last_seen': m['last_seen'],
+        })
+    return out
+
+
+def _sort_key(order_by: str):
+    if order_by == 'calls':
+        return lambda s: s['calls']
+    if order_by == 'p95_ms':
+        return lambda s: s['stages']['total_ms']['p95_ms']
+    if order_by == 'exec_ms':
+        return lambda s: s['stages']['exec_ms']['sum_ms']
+    if order_by == 'rows':
+        return lambda s: s['rows_total']
+    return lambda s: s['stages']['total_ms']['sum_ms']
+
+
+async def read_shape_stats(conn, *, space_id: Optional[str] = None, hours: int = 24,
+                           order_by: str = 'total_ms', limit: int = 50,
+                           pending: Optional[QueryShapeStats] = None) -> List[Dict[str, Any]]:
+    """Top shapes over the last ``hours``, merged across instances and hours.
+
+    ``order_by`` is one of ORDER_KEYS; ``total_ms`` (cumulative wall time)
+    is the "what dominates production cost" view. ``pending`` adds an
+    aggregator's unflushed window.
+    """
+    since = datetime.fromtimestamp((int(time.time()) // 3600 - hours + 1) * 3600, tz=timezone.utc)
+    rows = [dict(r) for r in await conn.fetch(
+        "SELECT * FROM sparql_shape_stats "
+        "WHERE bucket_start >= $1 AND ($2::varchar IS NULL OR space_id = $2)",
+        since, space_id)]
+    if pending is not None:
+        rows.extend(r for r in pending.pending_rows()
+                    if r['bucket_start'] >= since and (space_id is None or r['space_id'] == space_id))
+    shapes = summarize(rows)
+    shapes.sort(key=_sort_key(order_by), reverse=True)
+    return shapes[:limit]
+
+
+# Module-level aggregator, like the compile cache it keys on: every space
+# impl in the process records here; the app starts its flush loop.
+shape_stats = QueryShapeStats()
@@ -2,7 +2,7 @@
 Pydantic request/response models for Admin endpoints.
 """
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 from .api_model import BasePaginatedResponse
@@ -36,3 +36,79 @@ class AuditLogEntry(BaseModel):
 class AuditLogResponse(BasePaginatedResponse):
     """Paginated audit log response."""
     entries: List[AuditLogEntry]
+
+
+class QueryShapeStageStats(BaseModel):
+    """Latency of one pipeline stage for a query shape."""
+    sum_ms: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class QueryShapeStat(BaseModel):
+    """Aggregated statistics for one parameterized SPARQL shape in a space."""
+    space_id: str
+    shape_hash: str
+    calls: int
+    rows_total: int
+    mean_rows: float
+    max_rows: int
+    stages: Dict[str, QueryShapeStageStats]
+    worst_total_ms: float
+    worst_sql: Optional[str] = None
+    worst_sparql: Optional[str] = None
+    first_seen: str
+    last_seen: str
+
+
+class QueryShapeStatsResponse(ResultStatus):
+    """Top SPARQL query shapes by cost over a time window."""
+    status: OperationStatus = OperationStatus.FOUND
+    hours: int
+    order_by: str
+    shapes: List[QueryShapeStat] = []
+
+
+class ExplainCapture(BaseModel):
+    """An automatically captured plan for a slow or sampled SPARQL execution."""
+    id: int
+    space_id: str
+    shape_hash: str
+    captured_at: str
+    reason: str
+    plan_class: str
+    total_ms: Optional[float] = None
+    exec_ms: Optional[float] = None
+    ordered_scan: bool = False
+    sql: str
+    plan: Any
+
+
+class ExplainCaptureResponse(ResultStatus):
+    """Captured plans for one query shape, newest first."""
+    status: OperationStatus = OperationStatus.FOUND
+    shape_hash: str
+    plans: List[ExplainCapture] = []
+
+
+class SyncQueueSpaceStats(BaseModel):
+    """Auto-sync backlog of one space."""
+    space_id: str
+    depth: int
+    inflight: int
+    lag_seconds: float
+    journaled: int
+
+
+class SyncQueueStatsResponse(ResultStatus):
+    """State of this instance's post-CRUD auto-sync queue."""
+    status: OperationStatus = OperationStatus.FOUND
+    depth: int
+    inflight: int
+    high_water: int
+    workers: int
+    batch_size: int
+    journal_enabled: bool
+    spaces: List[SyncQueueSpaceStats] = []
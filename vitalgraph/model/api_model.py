@@ -24,6 +24,9 @@ class BasePaginatedResponse(ResultStatus):
     total_count: int = Field(..., description="Total number of items available")
     page_size: int = Field(..., description="Number of items per page")
     offset: int = Field(..., description="Offset for pagination")
+    total_count_kind: str = Field(
+        "exact",
+        description="'exact', 'estimated', 'capped' (lower bound) or 'none' — see count_mode")
 
 
 class BaseQuadListResponse(QuadResponse):
@@ -0,0 +1,76 @@
+"""
+Pydantic request/response models for the batch endpoint.
+
+A batch is an ordered list of operations against one space, each written
+as the call it replaces — method, path under ``/api/graphs``, query
+parameters and JSON body — so anything the KG endpoints accept one call at
+a time can be sent together in one request.
+"""
+
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+from .result_status import ResultStatus, OperationStatus
+
+
+class BatchOperation(BaseModel):
+    """One call inside a batch.
+
+    ``path`` is relative to ``/api/graphs`` (``kgentities``,
+    ``kgentities/kgframes``, ``kgqueries``, ...). ``space_id`` is always the
+    batch's and may not appear in ``params``; the batch's ``graph_id``, when
+    it sets one, is filled in unless the operation sets its own.
+    """
+    id: Optional[str] = Field(None, description="Name other operations use in depends_on")
+    method: Literal["GET", "POST", "PUT", "DELETE"] = "GET"
+    path: str = Field(..., description="Path under /api/graphs, e.g. 'kgentities/kgframes'")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Query parameters")
+    body: Optional[Any] = Field(None, description="JSON request body")
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Ids of operations that must succeed before this one runs",
+    )
+
+
+class BatchRequest(BaseModel):
+    """An ordered list of operations against one space."""
+    operations: List[BatchOperation]
+    graph_id: Optional[str] = Field(None, description="Default graph_id for every operation")
+    stop_on_error: bool = Field(
+        True, description="Skip every later operation once one fails (no rollback)",
+    )
+    max_parallel: Optional[int] = Field(
+        None, ge=1, description="Independent reads run at once (server default when unset)",
+    )
+    transactional: bool = Field(
+        False,
+        description="Run every operation in one backend transaction, one at a time: "
+                    "the first failure rolls all writes back (sparql_sql only; a "
+                    "batch with writes is refused on other backends)",
+    )
+
+
+class BatchOperationResult(BaseModel):
+    """What one operation returned, in the shape its own call would have."""
+    index: int
+    id: Optional[str] = None
+    status_code: int
+    body: Optional[Any] = None
+    elapsed_ms: float = 0.0
+    skipped: bool = Field(False, description="Not run: a dependency failed or the batch stopped")
+
+
+class BatchResponse(ResultStatus):
+    """Per-operation results, in request order."""
+    space_id: str
+    results: List[BatchOperationResult] = Field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_ms: float = 0.0
+    rolled_back: bool = Field(
+        False, description="Transactional batch: no write in it was kept",
+    )
+    status: OperationStatus = Field(
+        OperationStatus.OK, description="OK when every operation succeeded, else PARTIAL",
+    )
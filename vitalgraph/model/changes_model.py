@@ -0,0 +1,46 @@
+"""
+Pydantic request/response models for the change-log (CDC) feed endpoints.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from .result_status import ResultStatus, OperationStatus
+
+
+class ChangeRecord(BaseModel):
+    """One change-log row: a batch of quads a single write added or removed.
+
+    ``quads`` are [subject, predicate, object, graph] N-Triples terms.
+    Replaying records in ``seq`` order as set operations reproduces the
+    space's quad changes. A 'reset' names graphs replaced wholesale (CLEAR,
+    DROP, COPY, MOVE, ADD) as [null, null, null, graph]: drop what is held
+    for each and re-read it.
+    """
+    seq: int
+    op: str = Field(..., description="'insert', 'delete' or 'reset'")
+    created_time: Optional[str] = None
+    quads: List[List[Optional[str]]] = Field(default_factory=list)
+
+
+class ChangeLogStatusResponse(ResultStatus):
+    """Whether a space has a change log, and the seq range it retains."""
+    space_id: str
+    enabled: bool = False
+    oldest_seq: Optional[int] = None
+    current_seq: Optional[int] = None
+    rows: int = 0
+    status: OperationStatus = Field(
+        OperationStatus.FOUND, description="Outcome discriminator (FOUND/UPDATED/DELETED/...)"
+    )
+
+
+class ChangesPageResponse(ResultStatus):
+    """A non-streaming page of change records (``stream=false``)."""
+    space_id: str
+    after_seq: int
+    next_seq: int = Field(..., description="Pass as after_seq to continue")
+    changes: List[ChangeRecord] = Field(default_factory=list)
+    status: OperationStatus = Field(
+        OperationStatus.FOUND, description="Outcome discriminator (FOUND/EMPTY/...)"
+    )
@@ -128,6 +128,10 @@ class SameAsRetractRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class ResolveEntitiesRequest(BaseModel):
+    entity_ids: List[str]
+
+
 class EntityTypeCreateRequest(BaseModel):
     type_key: str
     type_label: str
@@ -630,6 +634,18 @@ class SameAsEnvelope(ResultStatus):
     same_as: Optional[SameAsResponse] = None
 
 
+class ResolveEntitiesResponse(ResultStatus):
+    """Enveloped outcome for POST /sameas/resolve/batch.
+
+    ``canonical`` maps every requested entity that exists to its canonical
+    id (itself when it has not been merged); ids that do not exist are
+    listed in ``not_found``.
+    """
+    status: OperationStatus = OperationStatus.FOUND
+    canonical: Dict[str, str] = {}
+    not_found: List[str] = []
+
+
 class EntityLookupResponse(ResultStatus):
     """Enveloped list outcome for GET /identifiers/lookup."""
     status: OperationStatus = OperationStatus.FOUND
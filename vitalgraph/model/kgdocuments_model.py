@@ -140,6 +140,13 @@ class SegmentationWorkerStatus(BaseModel):
     jobs_failed: int = 0
     listen_status: Dict[str, str] = Field(default_factory=dict)
     listen_channels_active: int = 0
+    concurrency: Optional[int] = None
+    cpu_workers: Optional[int] = None
+    jobs_in_flight: int = 0
+    in_flight_by_space: Dict[str, int] = Field(default_factory=dict)
+    documents_per_second: float = 0.0
+    segments_per_second: float = 0.0
+    segments_total: int = 0
 
 
 class SegmentationStatusSummaryResponse(ResultStatus):
@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field, field_validator
 from .kgentities_model import EntityQueryCriteria, EntityPropertyFilter, FrameCriteria, SlotCriteria, SortCriteria, VectorSearchCriteria, MultiVectorSearchCriteria, GeoSearchCriteria, DocumentSearchCriteria
 from .api_model import BasePaginatedResponse
 from .result_status import ResultStatus, OperationStatus
+from ..db.sparql_sql.count_mode import parse_count_mode
 
 
 class KGQueryCriteria(BaseModel):
@@ -99,6 +100,20 @@ class KGQueryRequest(BaseModel):
             "total_count_capped set), or 'exact' (the true total, however long "
             "it takes). One type, three values — booleans are not accepted, so "
             "there is no ambiguity about what True would have meant."))
+    count_mode: Optional[str] = Field(
+        None,
+        description=(
+            "How to compute total_count, as on the listing endpoints: 'exact', "
+            "'estimated', 'capped:N' or 'none'. When set it takes precedence "
+            "over include_total_count; the response's total_count_kind says "
+            "which kind was returned."))
+
+    @field_validator("count_mode")
+    @classmethod
+    def _check_count_mode(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return str(parse_count_mode(value))
 
 
 class RelationConnection(BaseModel):
@@ -172,6 +187,7 @@ class FrameQueryResponse(BasePaginatedResponse):
             message=raw.message,
             results=raw.frame_results or [],
             total_count=raw.total_count,
+            total_count_kind=raw.total_count_kind,
             page_size=raw.page_size,
             offset=raw.offset,
         )
@@ -194,6 +210,7 @@ class KGEntityQueryResponse(BasePaginatedResponse):
             entity_uris=raw.entity_uris or [],
             entity_graphs=raw.entity_graphs,
             total_count=raw.total_count,
+            total_count_kind=raw.total_count_kind,
             page_size=raw.page_size,
             offset=raw.offset,
         )
@@ -210,6 +227,7 @@ class RelationQueryResponse(BasePaginatedResponse):
             message=raw.message,
             connections=raw.relation_connections or [],
             total_count=raw.total_count,
+            total_count_kind=raw.total_count_kind,
             page_size=raw.page_size,
             offset=raw.offset,
         )
@@ -240,6 +258,7 @@ class DocumentQueryResponse(BasePaginatedResponse):
             document_uris=raw.document_uris or [],
             document_results=raw.document_results,
             total_count=raw.total_count,
+            total_count_kind=raw.total_count_kind,
             page_size=raw.page_size,
             offset=raw.offset,
         )
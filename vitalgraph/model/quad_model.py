@@ -47,6 +47,14 @@ class QuadResponse(QuadResultsResponse):
     """JSON Quads response envelope — paginated list results."""
     page_size: int = Field(description="Number of results per page")
     offset: int = Field(description="Offset into the result set")
+    total_count_kind: str = Field(
+        "exact",
+        description=(
+            "What total_count is, per the request's count_mode: 'exact', "
+            "'estimated' (statistics / planner estimate), 'capped' (the count "
+            "stopped at the cap — a lower bound, render as 'N+') or 'none' "
+            "(not counted; offset plus the rows on this page)."),
+    )
     slot_counts: Optional[Dict[str, int]] = Field(
         None,
         description=(
@@ -6,4 +6,5 @@ Provides:
 - ProcessLockManager: Distributed advisory lock coordination
 - ProcessScheduler: Periodic asyncio job runner
 - MaintenanceJob: Periodic ANALYZE/VACUUM scoring and execution
+- TermGCJob: Chunked, resumable orphan-term sweeps
 """
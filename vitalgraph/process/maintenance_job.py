@@ -153,6 +153,16 @@ class MaintenanceJob:
             if stats_prune_result:
                 summary["stats_prune"] = stats_prune_result
 
+            # --- Change-log retention (CDC feed) ---
+            change_log_result = await self._run_change_log_prune(list(stats.keys()))
+            if change_log_result:
+                summary["change_log_prune"] = change_log_result
+
+            # --- Property tables (promote declarations past their grace) ---
+            ptab_result = await self._run_property_table_promotion(list(stats.keys()))
+            if ptab_result:
+                summary["property_tables"] = ptab_result
+
             # --- Vector index REINDEX ---
             vector_result = await self._run_vector_reindex(list(stats.keys()))
             if vector_result:
@@ -479,6 +489,55 @@ class MaintenanceJob:
         logger.info("Stats prune: %s ~%d → %d rows", worst_space, int(worst_rows), kept)
         return result
 
+    async def _run_change_log_prune(self, space_ids: List[str]) -> Optional[Dict]:
+        """Apply retention to every space that has a change log.
+
+        Unlike the stats prune this is not one-space-per-cycle: the log grows
+        with every write, and a consumer-facing retention promise ("72 hours
+        or 1M rows") has to hold for all spaces. Each prune is a bounded
+        DELETE from the log's old end (see change_log.prune_change_log), and
+        spaces without a log cost one catalog lookup.
+        """
+        from ..db.sparql_sql.change_log import (
+            prune_change_log, is_change_log_enabled)
+
+        pruned: Dict[str, int] = {}
+        for space_id in space_ids:
+            try:
+                async with self._pool.acquire() as conn:
+                    if not await is_change_log_enabled(conn, space_id, use_cache=False):
+                        continue
+                    deleted = await prune_change_log(conn, space_id)
+            except Exception as e:
+                logger.warning("Change-log prune failed for %s: %s", space_id, e)
+                continue
+            if deleted:
+                pruned[space_id] = deleted
+        return pruned or None
+
+    async def _run_property_table_promotion(self, space_ids: List[str]) -> Optional[Dict]:
+        """Rebuild and promote 'building' property tables in every space.
+
+        A declared table, or one a WHERE-bound update sent back to
+        'building', serves no rewrites until it is rebuilt. The rebuild
+        TRUNCATEs the table, so it belongs here rather than on the query
+        path. Spaces without declarations cost one catalog lookup.
+        """
+        from ..db.sparql_sql.ensure_property_table import promote_property_tables
+
+        promoted: Dict[str, List[str]] = {}
+        for space_id in space_ids:
+            try:
+                async with self._pool.acquire() as conn:
+                    names = await promote_property_tables(conn, space_id)
+            except Exception as e:
+                logger.warning("Property table promotion failed for %s: %s", space_id, e)
+                continue
+            if names:
+                promoted[space_id] = names
+                logger.info("Property tables: rebuilt %s in %s", names, space_id)
+        return promoted or None
+
     async def _run_edge_integrity(self, space_ids: List[str]) -> Optional[Dict]:
         """Resync the single worst-drifted {space}_edge table, if any.
 
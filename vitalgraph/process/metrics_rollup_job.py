@@ -9,6 +9,8 @@ import logging
 import time
 from datetime import datetime, timezone
 
+from vitalgraph.metrics.query_shape_stats import SHAPE_STATS_RETENTION_DAYS
+
 logger = logging.getLogger(__name__)
 
 # Keep minute-granularity data for 25 hours (slightly over 24h for safety)
@@ -24,6 +26,8 @@ class MetricsRollupJob:
     2. Aggregates them into a single hour-level row per (space, endpoint).
     3. Deletes the original minute rows for that hour.
     4. Purges slow_query_log entries older than 7 days.
+    5. Purges sparql_shape_stats hours and sparql_explain_log plans older
+       than 7 days.
     """
 
     def __init__(self, pool):
@@ -104,9 +108,37 @@ class MetricsRollupJob:
                 slow_cutoff,
             )
 
+            # 4. Purge old query-shape stats
+            shape_cutoff = datetime.fromtimestamp(
+                now - SHAPE_STATS_RETENTION_DAYS * 86400, tz=timezone.utc
+            )
+            deleted_shapes = await conn.fetchval(
+                """
+                WITH d AS (
+                    DELETE FROM sparql_shape_stats
+                    WHERE bucket_start < $1
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM d
+                """,
+                shape_cutoff,
+            )
+            deleted_shapes += await conn.fetchval(
+                """
+                WITH d AS (
+                    DELETE FROM sparql_explain_log
+                    WHERE captured_at < $1
+                    RETURNING 1
+                )
+                SELECT COUNT(*) FROM d
+                """,
+                shape_cutoff,
+            )
+
         elapsed = (time.perf_counter() - start) * 1000
         logger.info(
             "Metrics rollup: %s hour rows upserted, %s minute rows purged, "
-            "%s slow log entries purged (%.0fms)",
-            rows_rolled or 0, deleted_minutes or 0, deleted_slow or 0, elapsed,
+            "%s slow log entries purged, %s shape-stat/plan rows purged (%.0fms)",
+            rows_rolled or 0, deleted_minutes or 0, deleted_slow or 0,
+            deleted_shapes or 0, elapsed,
         )
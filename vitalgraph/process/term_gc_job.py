@@ -0,0 +1,133 @@
+"""
+Term GC Job — periodic removal of unreferenced rows from {space}_term.
+
+Registered with ProcessScheduler; default interval: hourly (3600s).
+
+Each cycle advances every space's orphan-term sweep (db/sparql_sql/term_gc)
+by a bounded number of chunks, so one large space cannot hold the job — or
+the brief table locks each chunk's delete takes — for long. A sweep that
+does not finish within a cycle continues from its stored cursor in the
+next one. Cycles that delete terms or finish a sweep are recorded as a
+``term_gc`` process with the rows deleted and tuple bytes reclaimed.
+
+Can also be triggered for a single space via
+``ProcessScheduler.trigger_now("term_gc", space_id)``, which runs that
+space's sweep to completion.
+"""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from vitalgraph.db.sparql_sql import term_gc
+from vitalgraph.process.maintenance_job import _get_instance_id
+
+logger = logging.getLogger(__name__)
+
+# Chunks per space per cycle: 20 x 5,000 terms bounds a cycle to ~100k
+# terms per space, a few seconds of index probes.
+MAX_CHUNKS_PER_RUN_DEFAULT = 20
+
+
+class TermGCJob:
+    """Chunked, resumable orphan-term sweeps across all spaces.
+
+    Usage::
+
+        job = TermGCJob(pool, process_tracker=tracker)
+        await job.run()                     # one budgeted step per space
+        await job.trigger_term_gc(space_id) # finish one space's sweep now
+    """
+
+    def __init__(self, pool, process_tracker=None,
+                 chunk_size: int = term_gc.CHUNK_SIZE_DEFAULT,
+                 max_chunks_per_run: int = MAX_CHUNKS_PER_RUN_DEFAULT,
+                 lock_timeout_ms: int = term_gc.LOCK_TIMEOUT_MS_DEFAULT):
+        """
+        Args:
+            pool: asyncpg connection pool.
+            process_tracker: Optional ProcessTracker for recording results.
+            chunk_size: Terms examined per chunk (one short delete each).
+            max_chunks_per_run: Per-space chunk budget of a scheduled cycle.
+            lock_timeout_ms: How long a chunk's delete waits for the
+                term/quad table locks before deferring the chunk.
+        """
+        self._pool = pool
+        self._tracker = process_tracker
+        self._chunk_size = chunk_size
+        self._max_chunks = max_chunks_per_run
+        self._lock_timeout_ms = lock_timeout_ms
+        self._instance_id = _get_instance_id()
+
+    # ------------------------------------------------------------------
+    # Public entry points
+    # ------------------------------------------------------------------
+
+    async def run(self) -> Dict[str, Any]:
+        """Advance each space's sweep by one budget. Called by ProcessScheduler."""
+        start = time.perf_counter()
+        summary: Dict[str, Any] = {"spaces": {}, "deleted": 0, "bytes_reclaimed": 0}
+        try:
+            spaces = await self._list_spaces()
+        except Exception as e:
+            logger.error("TermGCJob: cannot list spaces: %s", e, exc_info=True)
+            return summary
+        for space_id in spaces:
+            result = await self._sweep(space_id, max_chunks=self._max_chunks)
+            summary["spaces"][space_id] = result
+            summary["deleted"] += result.get("deleted", 0)
+            summary["bytes_reclaimed"] += result.get("bytes_reclaimed", 0)
+        if summary["deleted"]:
+            logger.info("TermGCJob: %d orphan term(s) deleted, %d bytes, %.1fs",
+                        summary["deleted"], summary["bytes_reclaimed"],
+                        time.perf_counter() - start)
+        return summary
+
+    async def trigger_term_gc(self, space_id: str) -> Dict[str, Any]:
+        """On-demand: run ``space_id``'s sweep until it completes."""
+        return await self._sweep(space_id, max_chunks=None)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _sweep(self, space_id: str, max_chunks: Optional[int]) -> Dict[str, Any]:
+        process_id = None
+        try:
+            async with self._pool.acquire() as conn:
+                result = await term_gc.sweep_orphan_terms(
+                    conn, space_id,
+                    chunk_size=self._chunk_size,
+                    max_chunks=max_chunks,
+                    lock_timeout_ms=self._lock_timeout_ms,
+                )
+        except Exception as e:
+            logger.error("TermGCJob: sweep failed for space %s: %s", space_id, e, exc_info=True)
+            if self._tracker:
+                process_id = await self._tracker.create_process(
+                    "term_gc", process_subtype=space_id,
+                    instance_id=self._instance_id, status="running")
+                await self._tracker.mark_failed(process_id, str(e))
+            return {"space_id": space_id, "error": str(e)}
+
+        # Chunks that found nothing are not worth a process row each cycle.
+        if self._tracker and (result["deleted"] or result["sweep_complete"]):
+            process_id = await self._tracker.create_process(
+                "term_gc", process_subtype=space_id,
+                instance_id=self._instance_id, status="running")
+            await self._tracker.mark_completed(process_id, result_details=result)
+        return result
+
+    async def _list_spaces(self) -> List[str]:
+        """Space ids with a quad table (see AnalyticsJob._list_spaces)."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT s.space_id FROM space s
+                WHERE EXISTS (
+                    SELECT 1 FROM pg_tables t
+                    WHERE t.schemaname = 'public'
+                      AND t.tablename = s.space_id || '_rdf_quad')
+                ORDER BY s.space_id
+                """)
+        return [r["space_id"] for r in rows]
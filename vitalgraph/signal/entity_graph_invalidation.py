@@ -0,0 +1,179 @@
+"""
+Coalesced, sequenced entity-graph invalidation over NOTIFY.
+
+Every write used to send one ``CHANNEL_ENTITY_GRAPH`` notification per
+entity, and every instance answered each one by dropping the entity's
+cached graph *and* every cached count for the graph. A 5,000-entity batch
+therefore cost 5,000 NOTIFY round trips on the writer and 5,000
+graph-wide count flushes on each listener — the last 4,999 of them
+flushing an already-empty cache — and one lost notification (listener
+reconnecting, dedicated connection reset mid-send) left an entity stale
+until the cache TTL.
+
+Writers now hand the whole set of entities a request changed to
+``SignalManager.notify_entity_graphs_changed`` once, after the write has
+committed. ``build_payloads`` packs the URIs into as few payloads as fit
+under PostgreSQL's 8,000-byte NOTIFY limit; each carries the sender's
+``origin`` and a per-space ``seq`` that increases by one per payload.
+
+Listeners feed payloads through ``EntityGraphInvalidator``, which:
+
+* ignores its own instance's payloads (the writer invalidated locally
+  before sending);
+* invalidates each named entity and the graph's counts once per payload;
+* tracks the last ``seq`` per (origin, space) and, when one is skipped,
+  flushes the whole space from both caches — the missing payload could
+  have named any graph in it.
+
+Payloads from instances that predate this format (a single ``entity_uri``,
+no ``seq``) are still applied, without gap tracking.
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more (default build).
+MAX_NOTIFY_PAYLOAD_BYTES = 7_900
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"))
+
+
+def build_payloads(
+    header: Dict[str, Any],
+    entity_uris: Iterable[str],
+    max_bytes: int = MAX_NOTIFY_PAYLOAD_BYTES,
+) -> List[Dict[str, Any]]:
+    """Split ``entity_uris`` into payload dicts that each encode under ``max_bytes``.
+
+    ``header`` holds the fields every payload shares (type, space, graph,
+    origin); ``seq`` is assigned by the caller. A URI too long to fit any
+    payload on its own degrades that payload to graph-wide (empty
+    ``entity_uris``), which listeners treat as "flush the graph".
+    """
+    uris = list(dict.fromkeys(u for u in entity_uris if u))
+    # Room for the header, the list brackets and a 20-digit seq.
+    base = len(_encode({**header, "seq": 10 ** 20, "entity_uris": []}).encode("utf-8"))
+    payloads: List[Dict[str, Any]] = []
+    batch: List[str] = []
+    size = base
+    for uri in uris:
+        # quotes + separating comma, plus JSON escaping
+        cost = len(json.dumps(uri).encode("utf-8")) + 1
+        if base + cost > max_bytes:
+            logger.warning("Entity URI too long for a NOTIFY payload, flushing graph: %.80s", uri)
+            payloads.append({**header, "entity_uris": []})
+            continue
+        if size + cost > max_bytes and batch:
+            payloads.append({**header, "entity_uris": batch})
+            batch, size = [], base
+        batch.append(uri)
+        size += cost
+    if batch or not payloads:
+        payloads.append({**header, "entity_uris": batch})
+    return payloads
+
+
+class EntityGraphInvalidator:
+    """Applies entity-graph NOTIFY payloads to the local caches, detecting gaps."""
+
+    def __init__(self, entity_cache, count_cache, origin: Optional[str] = None):
+        self.entity_cache = entity_cache
+        self.count_cache = count_cache
+        self.origin = origin
+        self._last_seq: Dict[Tuple[str, str], int] = {}
+
+        # Counters for observability
+        self.payloads = 0
+        self.entities = 0
+        self.own_skipped = 0
+        self.gaps = 0
+        self.apply_seconds = 0.0
+
+    def apply(self, data: Dict[str, Any]) -> None:
+        """Invalidate what ``data`` names; flush the space if a payload was missed."""
+        space_id = data.get("space_id", "")
+        graph_id = data.get("graph_id", "")
+        if not space_id:
+            return
+        origin = data.get("origin")
+        if origin and origin == self.origin:
+            self.own_skipped += 1
+            return
+
+        t0 = time.perf_counter()
+        self.payloads += 1
+        seq = data.get("seq")
+        if origin and isinstance(seq, int):
+            key = (origin, space_id)
+            last = self._last_seq.get(key)
+            self._last_seq[key] = seq
+            if last is not None and seq != last + 1:
+                self.gaps += 1
+                logger.warning(
+                    "Entity graph NOTIFY gap from %s in space %s (seq %d after %d) — "
+                    "flushing space caches", origin, space_id, seq, last)
+                self.entity_cache.invalidate_space(space_id)
+                self.count_cache.invalidate_space(space_id)
+                self.apply_seconds += time.perf_counter() - t0
+                return
+
+        if "entity_uris" in data:
+            uris = data.get("entity_uris") or []
+        else:
+            uris = [data["entity_uri"]] if data.get("entity_uri") else []
+
+        if graph_id:
+            if uris:
+                for uri in uris:
+                    self.entity_cache.invalidate(space_id, graph_id, uri)
+            else:
+                self.entity_cache.invalidate_graph(space_id, graph_id)
+            self.count_cache.invalidate_graph(space_id, graph_id)
+        self.entities += len(uris)
+        self.apply_seconds += time.perf_counter() - t0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "payloads": self.payloads,
+            "entities": self.entities,
+            "own_skipped": self.own_skipped,
+            "gaps": self.gaps,
+            "apply_ms": round(self.apply_seconds * 1000, 3),
+        }
+
+
+async def invalidate_graph_caches(space_manager, space_id: str, graph_id: Optional[str],
+                                  signal_type: str = "updated") -> None:
+    """Flush one graph's cached entity graphs, counts and ETag validators,
+    here and — through a graph-wide payload — on every other instance.
+
+    For writes that do not know which entities they changed: type, frame
+    and slot writes and raw triples. Call it once the write has run,
+    whether or not it succeeded; a failed write may still have changed
+    quads. Failures are logged, never raised: invalidation must not break
+    the write path.
+    """
+    from ..cache.count_cache import _count_cache
+    from ..cache.entity_graph_cache import _entity_graph_cache
+
+    graph = graph_id or "default"
+    try:
+        _entity_graph_cache.invalidate_graph(space_id, graph)
+        # The ETag validators follow the count cache (etag_cache.py).
+        _count_cache.invalidate_graph(space_id, graph)
+    except Exception as e:
+        logger.warning("Graph cache invalidation failed for %s/%s: %s", space_id, graph, e)
+    try:
+        space_record = await space_manager.get_space_or_load(space_id)
+        backend = space_record.space_impl.get_db_space_impl() if space_record else None
+        sm = getattr(backend, 'get_signal_manager', lambda: None)() if backend else None
+        if sm:
+            await sm.notify_entity_graphs_changed(space_id, graph, [], signal_type)
+    except Exception as e:
+        logger.warning("Graph cache NOTIFY failed for %s/%s: %s", space_id, graph, e)
@@ -2,9 +2,12 @@
 import asyncio
 import json
 import logging
+import uuid
 import asyncpg
 from asyncio import Task
-from typing import Dict, List, Optional, Callable, Set, Awaitable
+from typing import Dict, Iterable, List, Optional, Callable, Set, Awaitable
+
+from .entity_graph_invalidation import build_payloads
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +52,13 @@ class SignalManager:
         self.notify_lock = asyncio.Lock()  # Lock for notify connection
         self.listener_task: Optional[Task] = None
         self.running = False
+
+        # Identifies this instance's entity-graph payloads, and the per-space
+        # sequence listeners use to detect a lost one.
+        self.origin = uuid.uuid4().hex[:12]
+        self._entity_graph_seq: Dict[str, int] = {}
+        self.entity_graph_payloads_sent = 0
+        self.entity_graph_entities_sent = 0
         
         # Callbacks for notification channels
         self.callbacks: Dict[str, List[Callable[[dict], Awaitable[None]]]] = {
@@ -463,14 +473,41 @@ class SignalManager:
             entity_uri: URI of the entity whose graph changed (empty string for graph-wide)
             signal_type: Type of change (updated, deleted)
         """
-        payload = json.dumps({
+        await self.notify_entity_graphs_changed(
+            space_id, graph_id, [entity_uri] if entity_uri else [], signal_type)
+
+    async def notify_entity_graphs_changed(
+        self, space_id: str, graph_id: str, entity_uris: Iterable[str],
+        signal_type: str = SIGNAL_TYPE_UPDATED
+    ):
+        """
+        Send one coalesced notification for every entity a write changed.
+
+        Call once per committed write, not per entity: the URIs are packed
+        into as few payloads as fit the NOTIFY size limit, each stamped
+        with this instance's origin and the space's next sequence number
+        (see entity_graph_invalidation).
+
+        Args:
+            space_id: Space identifier
+            graph_id: Graph identifier
+            entity_uris: URIs of the entities whose graphs changed (empty for graph-wide)
+            signal_type: Type of change (updated, deleted)
+        """
+        header = {
             "type": signal_type,
             "space_id": space_id,
             "graph_id": graph_id,
-            "entity_uri": entity_uri,
-            "timestamp": str(asyncio.get_event_loop().time()),
-        })
-        await self._send_notification(CHANNEL_ENTITY_GRAPH, payload)
+            "origin": self.origin,
+        }
+        for payload in build_payloads(header, entity_uris):
+            seq = self._entity_graph_seq.get(space_id, 0) + 1
+            self._entity_graph_seq[space_id] = seq
+            payload["seq"] = seq
+            await self._send_notification(
+                CHANNEL_ENTITY_GRAPH, json.dumps(payload, separators=(",", ":")))
+            self.entity_graph_payloads_sent += 1
+            self.entity_graph_entities_sent += len(payload["entity_uris"])
 
     async def notify_token_version_changed(self, username: str, signal_type: str = "revoked"):
         """
@@ -493,7 +530,8 @@ class SignalManager:
         Send a cache invalidation signal to all instances.
         
         Args:
-            cache_type: Which cache to invalidate ("datatype" or "stats")
+            cache_type: Which cache to invalidate ("datatype", "stats",
+                "property_table" or "change_log")
             space_id: Space whose cache entry should be invalidated
         """
         payload = json.dumps({
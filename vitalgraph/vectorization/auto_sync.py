@@ -3,20 +3,26 @@ Auto-sync hooks for vector, geo, fuzzy, and FTS data.
 
 Provides fire-and-forget post-CRUD sync that re-vectorizes and/or
 re-populates geo and fuzzy data for changed subjects.  The caller is not blocked;
-sync runs as a background asyncio task.
+changed subjects go into the process-wide ``sync_queue`` (see sync_queue.py),
+which coalesces them per space, drops superseded changes and syncs them in
+batches on a bounded set of workers.
 
 Usage from an endpoint::
 
-    from vitalgraph.vectorization.auto_sync import schedule_sync
+    from vitalgraph.vectorization.auto_sync import enqueue_sync
 
     # After a successful entity create/update:
-    schedule_sync(
+    await enqueue_sync(
         db_impl=backend_impl.db_impl,
         space_id=space_id,
         subject_uris=created_uris,   # list of changed subject URIs
         graph_uri=graph_id,           # named graph URI
         operation="upsert",           # "upsert" or "delete"
     )
+
+``enqueue_sync`` applies back-pressure (waits, briefly, while the queue is
+above its high-water mark); ``schedule_sync`` is the non-waiting form for
+callers that are not request handlers.
 """
 from __future__ import annotations
 
@@ -27,13 +33,16 @@ import uuid
 import asyncpg
 from typing import Dict, List, Literal, Optional, Set
 
+from vitalgraph.metrics.histograms import registry
+from vitalgraph.vectorization.sync_queue import SyncQueue
+
 logger = logging.getLogger(__name__)
 
-# In-flight auto-sync tasks, keyed by space, so a space deletion can cancel work
-# that would otherwise run against dropped tables.  Callers of schedule_sync()
-# discard the returned Task, so without this registry those tasks are
-# unreachable.  Process-local by nature — see cancel_space_syncs().
-_IN_FLIGHT: Dict[str, Set[asyncio.Task]] = {}
+# Completion futures of scheduled syncs, keyed by space, so a space deletion
+# can cancel work that would otherwise run against dropped tables.  Callers of
+# schedule_sync() mostly discard the returned future, so without this registry
+# it is unreachable.  Process-local by nature — see cancel_space_syncs().
+_IN_FLIGHT: Dict[str, Set[asyncio.Future]] = {}
 
 # Deterministic UUID namespace (matches sparql_sql_space_impl)
 _VITALGRAPH_NS = uuid.UUID('6ba7b810-9dad-11d1-80b4-00c04fd430c8')
@@ -66,10 +75,12 @@ async def _sync_vectors_for_subjects(
       1. Batch-fetch all literal properties (single DB query)
       2. Embed all texts in one batched provider call (falls back to
          per-subject, bounded by _VECTOR_CONCURRENCY, if the batch fails)
-      3. Sequentially upsert embeddings on the single connection
+      3. Upsert the embeddings in one binary COPY on the single connection
     """
+    from vitalgraph.db.vector_codec import vector_arg
     from vitalgraph.vectorization.vector_populator import (
         delete_subject_vectors,
+        upsert_vectors,
         UPSERT_VECTOR_SQL,
     )
     from vitalgraph.vectorization.search_text_builder import (
@@ -161,7 +172,7 @@ async def _sync_vectors_for_subjects(
         # _VECTOR_CONCURRENCY, i.e. one HTTP round trip per entity/frame/slot
         # covered by the index — 100 subjects meant 100 requests in 13 waves of
         # 8.  See issues/037.
-        embeddings: List[Optional[List[float]]] = [None] * len(to_embed)
+        embeddings: list = [None] * len(to_embed)  # float32 ndarrays
         texts = [text for _, text in to_embed]
         try:
             embeddings = list(await provider.vectorize_texts(texts))
@@ -190,19 +201,30 @@ async def _sync_vectors_for_subjects(
                 _embed(i, text) for i, text in enumerate(texts)
             ])
 
-        # Phase 4: Sequential upsert on the single connection
-        for i, (subj_uuid, _) in enumerate(to_embed):
-            emb = embeddings[i]
-            if emb is None:
-                continue
-            try:
-                vec_str = "[" + ",".join(str(v) for v in emb) + "]"
-                await conn.execute(upsert_sql, subj_uuid, context_uuid, vec_str)
-            except Exception as e:
-                logger.warning(
-                    "auto_sync vector upsert %s/%s/%s failed: %s",
-                    space_id, idx_name, subj_uuid, e,
-                )
+        # Phase 4: One binary COPY + merge for the set. If the
+        # batch fails, per-subject upserts isolate the bad row as before.
+        vec_rows = [
+            (subj_uuid, context_uuid, emb)
+            for (subj_uuid, _), emb in zip(to_embed, embeddings)
+            if emb is not None
+        ]
+        try:
+            await upsert_vectors(conn, vec_table, vec_rows)
+        except Exception as e:
+            logger.warning(
+                "auto_sync batch vector upsert %s/%s (%d rows) failed: %s — "
+                "falling back to per-subject",
+                space_id, idx_name, len(vec_rows), e,
+            )
+            for subj_uuid, _, emb in vec_rows:
+                try:
+                    await conn.execute(
+                        upsert_sql, subj_uuid, context_uuid, await vector_arg(conn, emb))
+                except Exception as e2:
+                    logger.warning(
+                        "auto_sync vector upsert %s/%s/%s failed: %s",
+                        space_id, idx_name, subj_uuid, e2,
+                    )
 
 
 async def _sync_geo_for_subjects(
@@ -394,6 +416,19 @@ async def _run_sync(
         logger.error("auto_sync(%s) failed: %s", space_id, e)
 
 
+# -----------------------------------------------------------------------
+# Queue
+# -----------------------------------------------------------------------
+
+async def _run_queued(db_impl, space_id, subject_uris, graph_uri, operation) -> None:
+    # Looked up at call time so tests can substitute _run_sync.
+    await _run_sync(db_impl, space_id, subject_uris, graph_uri, operation)
+
+
+sync_queue = SyncQueue(_run_queued)
+registry.register_collector(sync_queue.collect)
+
+
 # -----------------------------------------------------------------------
 # Public API
 # -----------------------------------------------------------------------
@@ -405,8 +440,8 @@ def schedule_sync(
     subject_uris: List[str],
     graph_uri: str,
     operation: Literal["upsert", "delete"] = "upsert",
-) -> Optional[asyncio.Task]:
-    """Schedule a background auto-sync task (non-blocking).
+) -> Optional[asyncio.Future]:
+    """Queue changed subjects for background auto-sync (non-blocking).
 
     Args:
         db_impl: Database implementation with ``connection_pool`` attribute.
@@ -416,28 +451,26 @@ def schedule_sync(
         operation: ``"upsert"`` for create/update, ``"delete"`` for deletion.
 
     Returns:
-        The asyncio.Task if scheduled, or None if nothing to sync.
+        A future resolved once all of ``subject_uris`` have been synced
+        (awaiting it is optional), or None if nothing to sync.
     """
     if not subject_uris:
         return None
 
     try:
-        loop = asyncio.get_running_loop()
+        asyncio.get_running_loop()
     except RuntimeError:
         logger.debug("auto_sync: no running event loop, skipping")
         return None
 
-    task = loop.create_task(
-        _run_sync(db_impl, space_id, subject_uris, graph_uri, operation),
-        name=f"auto_sync:{space_id}:{len(subject_uris)}",
-    )
+    task = sync_queue.submit(db_impl, space_id, graph_uri, subject_uris, operation)
 
-    # Track it so deleting the space can cancel work still in flight.  Without
-    # this the task is unreachable: callers fire-and-forget the return value.
+    # Track it so deleting the space can cancel work still queued.  Without
+    # this the future is unreachable: callers fire-and-forget the return value.
     _IN_FLIGHT.setdefault(space_id, set()).add(task)
 
     # Swallow exceptions so they don't surface as "unhandled task exception"
-    def _on_done(t: asyncio.Task):
+    def _on_done(t: asyncio.Future):
         pending = _IN_FLIGHT.get(space_id)
         if pending is not None:
             pending.discard(t)
@@ -452,43 +485,58 @@ def schedule_sync(
     return task
 
 
+async def enqueue_sync(
+    *,
+    db_impl,
+    space_id: str,
+    subject_uris: List[str],
+    graph_uri: str,
+    operation: Literal["upsert", "delete"] = "upsert",
+) -> Optional[asyncio.Future]:
+    """``schedule_sync`` with back-pressure, for request handlers.
+
+    While the queue holds more than its high-water mark of subjects the
+    caller is held (bounded by ``sync_queue.max_wait``) before its own
+    subjects are queued, so sustained writes slow down instead of growing
+    the backlog without bound.
+    """
+    if not subject_uris:
+        return None
+    await sync_queue.wait_for_capacity()
+    return schedule_sync(
+        db_impl=db_impl, space_id=space_id, subject_uris=subject_uris,
+        graph_uri=graph_uri, operation=operation,
+    )
+
+
 async def cancel_space_syncs(space_id: str, *, timeout: float = 5.0) -> int:
-    """Cancel auto-sync tasks still in flight for a space, and wait for them.
+    """Cancel auto-sync work queued or running for a space, and wait for it.
 
-    Call this BEFORE dropping a space's tables. Otherwise queued tasks wake up
+    Call this BEFORE dropping a space's tables. Otherwise queued work wakes up
     against a half-dropped schema: they log a wall of "relation ... does not
     exist" errors (PostgreSQL records every failed statement server-side even
     though the client swallows it) and, worse, spend real money embedding text
     for a space that is being deleted.
 
-    Only reaches tasks in THIS process; `_space_still_exists()` in `_run_sync`
+    Only reaches work in THIS process; `_space_still_exists()` in `_run_sync`
     is the backstop for multi-worker deployments.
 
     Returns:
-        The number of tasks cancelled.
+        The number of scheduled syncs cancelled.
     """
-    pending = _IN_FLIGHT.get(space_id)
-    if not pending:
-        return 0
-
-    tasks = list(pending)
-    for t in tasks:
+    pending = list(_IN_FLIGHT.pop(space_id, ()))
+    for t in pending:
         t.cancel()
 
-    # Await them so the tables are not dropped while a cancelled task is still
-    # unwinding mid-statement.
-    try:
-        await asyncio.wait_for(
-            asyncio.gather(*tasks, return_exceptions=True), timeout=timeout,
-        )
-    except asyncio.TimeoutError:
-        logger.warning(
-            "auto_sync: %d task(s) for space '%s' did not stop within %.1fs",
-            len(tasks), space_id, timeout,
-        )
+    # Drop the space's queued subjects and cancel its running batch, waiting
+    # for it so the tables are not dropped while it is still unwinding
+    # mid-statement.
+    dropped = await sync_queue.discard_space(space_id, timeout=timeout)
+    if not pending and not dropped:
+        return 0
 
     logger.info(
-        "auto_sync: cancelled %d in-flight task(s) for space '%s'",
-        len(tasks), space_id,
+        "auto_sync: cancelled %d scheduled sync(s) (%d subject(s)) for space '%s'",
+        len(pending), dropped, space_id,
     )
-    return len(tasks)
+    return len(pending)
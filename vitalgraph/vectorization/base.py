@@ -2,31 +2,71 @@
 Abstract base class for vectorization providers.
 """
 
+import functools
+import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
+from ..metrics.histograms import embedding_seconds, embedding_texts
+
+
+def _timed(fn, op: str):
+    """Wrap a provider's ``vectorize_*`` coroutine with the embedding histogram."""
+
+    @functools.wraps(fn)
+    async def wrapper(self, arg):
+        t0 = time.perf_counter()
+        try:
+            return await fn(self, arg)
+        finally:
+            name = self.provider_name
+            embedding_seconds.labels(name, op).observe(time.perf_counter() - t0)
+            embedding_texts.labels(name).inc(1 if op == 'text' else len(arg))
+
+    wrapper._vg_timed = True
+    return wrapper
+
 
 class VectorizationProvider(ABC):
     """Abstract base for all vectorization providers.
 
     Each provider wraps a specific embedding model (local or remote).
     Providers are instantiated per vector-index and cached for reuse.
+
+    Embeddings are 1-d float32 ndarrays. The pools' binary ``vector``
+    codec (db/vector_codec) writes them as-is, so no provider output is
+    ever turned into a Python list or a ``"[...]"`` string.
+
+    Every subclass's ``vectorize_text`` / ``vectorize_texts`` is timed into
+    the ``/metrics`` embedding histogram by
+    ``__init_subclass__`` — the providers are called from a dozen places,
+    and this is the one they all pass through.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for attr, op in (('vectorize_text', 'text'), ('vectorize_texts', 'batch')):
+            fn = cls.__dict__.get(attr)
+            if fn is not None and not getattr(fn, '__isabstractmethod__', False) \
+                    and not getattr(fn, '_vg_timed', False):
+                setattr(cls, attr, _timed(fn, op))
+
     @abstractmethod
-    async def vectorize_text(self, text: str) -> List[float]:
+    async def vectorize_text(self, text: str) -> np.ndarray:
         """Vectorize a single text string.
 
         Args:
             text: Input text to embed.
 
         Returns:
-            List of floats representing the embedding vector.
+            Float32 ndarray of shape ``(dimensions,)``.
         """
         ...
 
     @abstractmethod
-    async def vectorize_texts(self, texts: List[str]) -> List[List[float]]:
+    async def vectorize_texts(self, texts: List[str]) -> List[np.ndarray]:
         """Vectorize a batch of text strings.
 
         Implementations should handle batching internally for optimal throughput.
@@ -35,7 +75,7 @@ class VectorizationProvider(ABC):
             texts: List of input texts to embed.
 
         Returns:
-            List of embedding vectors, one per input text.
+            One float32 ndarray per input text, in input order.
         """
         ...
 
@@ -10,6 +10,8 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from vitalgraph.vectorization.base import VectorizationProvider
 
 logger = logging.getLogger(__name__)
@@ -121,16 +123,16 @@ class OpenAIProvider(VectorizationProvider):
             batch_size=config.get("batch_size", DEFAULT_BATCH_SIZE),
         )
 
-    async def vectorize_text(self, text: str) -> List[float]:
+    async def vectorize_text(self, text: str) -> np.ndarray:
         """Vectorize a single text string via OpenAI API."""
         response = await self._client.embeddings.create(
             input=[text],
             model=self._model_name_str,
             dimensions=self._dim,
         )
-        return response.data[0].embedding
+        return np.asarray(response.data[0].embedding, dtype=np.float32)
 
-    async def vectorize_texts(self, texts: List[str]) -> List[List[float]]:
+    async def vectorize_texts(self, texts: List[str]) -> List[np.ndarray]:
         """Vectorize a batch of texts via OpenAI API.
 
         Handles batching internally if len(texts) > batch_size.
@@ -138,7 +140,7 @@ class OpenAIProvider(VectorizationProvider):
         if not texts:
             return []
 
-        all_embeddings: List[List[float]] = []
+        all_embeddings: List[np.ndarray] = []
 
         for i in range(0, len(texts), self._batch_size):
             batch = texts[i : i + self._batch_size]
@@ -148,7 +150,9 @@ class OpenAIProvider(VectorizationProvider):
                 dimensions=self._dim,
             )
             # Response data is in same order as input
-            batch_embeddings = [item.embedding for item in response.data]
+            batch_embeddings = [
+                np.asarray(item.embedding, dtype=np.float32) for item in response.data
+            ]
             all_embeddings.extend(batch_embeddings)
 
         return all_embeddings
@@ -32,6 +32,8 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from vitalgraph.vectorization.base import VectorizationProvider
 
 logger = logging.getLogger(__name__)
@@ -159,18 +161,18 @@ class ParaphraseMultilingualMiniLMProvider(VectorizationProvider):
             device=config.get("device"),
         )
 
-    async def vectorize_text(self, text: str) -> List[float]:
+    async def vectorize_text(self, text: str) -> np.ndarray:
         """Vectorize a single text string (offloaded to a thread)."""
         return await asyncio.to_thread(self._vectorize_sync, text)
 
-    async def vectorize_texts(self, texts: List[str]) -> List[List[float]]:
+    async def vectorize_texts(self, texts: List[str]) -> List[np.ndarray]:
         """Vectorize a batch of texts, preserving input order."""
         if not texts:
             return []
         return await asyncio.to_thread(self._vectorize_batch_sync, texts)
 
-    def _vectorize_sync(self, text: str) -> List[float]:
-        return self._vectorizer.vectorize_text(text).tolist()
+    def _vectorize_sync(self, text: str) -> np.ndarray:
+        return np.asarray(self._vectorizer.vectorize_text(text), dtype=np.float32)
 
-    def _vectorize_batch_sync(self, texts: List[str]) -> List[List[float]]:
-        return [self._vectorizer.vectorize_text(t).tolist() for t in texts]
+    def _vectorize_batch_sync(self, texts: List[str]) -> List[np.ndarray]:
+        return [self._vectorize_sync(t) for t in texts]
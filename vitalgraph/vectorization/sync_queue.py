@@ -0,0 +1,600 @@
+"""
+Per-space coalescing queue for post-CRUD auto-sync.
+
+``schedule_sync`` used to start one asyncio task per CRUD call, and each
+task acquired a connection, checked that the space still existed, and
+ran the vector, geo, fuzzy and FTS sync for just that call's subjects.
+Under a sustained stream of small entity updates that is thousands of
+concurrent tasks queued on the pool, the same catalog check thousands of
+times, embedding requests of one or two texts each, and a subject edited
+ten times re-embedded ten times — none of it visible or bounded.
+
+``SyncQueue`` replaces the task-per-call model:
+
+* **Coalescing.** Pending work is one entry per (space, graph, subject).
+  Enqueuing a subject that is already pending *supersedes* the entry:
+  only the latest operation (upsert or delete) runs, once. A subject
+  whose batch is already running is queued again, since that run may
+  have read the old state.
+* **Batching.** A worker takes up to ``batch_size`` pending subjects of
+  one space, graph and operation and runs them through
+  ``auto_sync._run_sync`` together: one connection, one existence check,
+  one batched embedding call per index. Entries wait ``linger`` seconds
+  after their first enqueue so a burst lands in one batch.
+* **Bounded workers.** ``workers`` tasks serve all spaces round-robin,
+  at most one batch per space at a time, so sync work holds at most
+  ``workers`` pool connections however many writes arrive.
+* **Back-pressure.** Above ``high_water`` pending subjects,
+  ``wait_for_capacity`` (awaited by the CRUD endpoints through
+  ``auto_sync.enqueue_sync``) holds the writer until the queue drains,
+  for at most ``max_wait`` seconds, so a write burst slows down instead
+  of growing the backlog without bound. The write itself has already
+  committed; its sync is always accepted.
+* **Journal.** With ``start()`` the queue journals entries that are still
+  pending after ``journal_interval`` seconds into the ``sync_queue``
+  admin table and deletes them once synced; ``stop()`` journals
+  everything still pending. Each row carries the ``owner`` instance that
+  wrote it and a ``lease_until`` the owner keeps renewing, so several
+  instances share one journal: an instance only claims rows whose lease
+  has run out (``FOR UPDATE SKIP LOCKED``) — on startup and on every
+  renewal — and re-queues them, so a restart or a crash of any instance,
+  minus the last ``journal_interval`` of writes, does not leave indexes
+  stale, and entries another live instance is holding are never taken.
+  ``stop()`` ends the lease on what it journaled so a peer or the
+  restarted instance picks it up at once. Most entries are synced before
+  their first journal pass and never cost a write. Rows of a deleted
+  space go with it (``ON DELETE CASCADE``).
+
+Depth, lag (age of the oldest pending entry) and in-flight batches are
+reported per space on ``/metrics`` and ``GET /api/admin/sync-queue``.
+
+``schedule_sync`` still returns an awaitable (a Future resolved when all
+of the call's subjects have been synced) and ``cancel_space_syncs`` still
+cancels a space's pending and running work before its tables are dropped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from vitalgraph.metrics.histograms import Family, registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_LINGER_SECONDS = 0.05
+DEFAULT_HIGH_WATER = 20_000
+DEFAULT_MAX_WAIT_SECONDS = 2.0
+DEFAULT_JOURNAL_INTERVAL_SECONDS = 1.0
+DEFAULT_LEASE_SECONDS = 60.0
+
+sync_batch_seconds = registry.histogram(
+    "vitalgraph_sync_batch_duration_seconds",
+    "Auto-sync batch duration by operation.",
+    ("operation",),
+)
+sync_subjects = registry.counter(
+    "vitalgraph_sync_subjects",
+    "Subjects synced (vector, geo, fuzzy, FTS) by operation.",
+    ("operation",),
+)
+sync_superseded = registry.counter(
+    "vitalgraph_sync_superseded",
+    "Pending sync entries replaced by a later change to the same subject.",
+)
+sync_backpressure_seconds = registry.histogram(
+    "vitalgraph_sync_backpressure_wait_seconds",
+    "Time writers waited for the auto-sync queue to drain below its high-water mark.",
+)
+
+# (db_impl, space_id, subject_uris, graph_uri, operation) -> None
+Runner = Callable[[Any, str, List[str], str, str], Awaitable[None]]
+_Key = Tuple[str, str]   # (graph_uri, subject_uri)
+
+
+class _Ticket:
+    """Completion of one ``submit`` call: done when all its subjects are synced."""
+    __slots__ = ("future", "remaining")
+
+    def __init__(self, future: asyncio.Future, remaining: int):
+        self.future = future
+        self.remaining = remaining
+
+    def settle(self) -> None:
+        self.remaining -= 1
+        if self.remaining <= 0 and not self.future.done():
+            self.future.set_result(None)
+
+
+class _Entry:
+    __slots__ = ("operation", "first_enqueued", "updated", "tickets", "journaled", "in_journal")
+
+    def __init__(self, operation: str, now: float):
+        self.operation = operation
+        self.first_enqueued = now     # for lag: when the subject first went stale
+        self.updated = now            # journal version of the latest change
+        self.tickets: List[_Ticket] = []
+        self.journaled = False        # the journal row is current
+        self.in_journal = False       # some version of it has a journal row
+
+
+class _Space:
+    __slots__ = ("db_impl", "pending", "batch", "inflight", "busy")
+
+    def __init__(self, db_impl):
+        self.db_impl = db_impl
+        self.pending: "OrderedDict[_Key, _Entry]" = OrderedDict()
+        self.batch: Optional[asyncio.Task] = None
+        self.inflight = 0
+        self.busy = False             # a worker owns this space
+
+
+class SyncQueue:
+    """Coalescing, batching, bounded auto-sync queue shared by all spaces."""
+
+    def __init__(self, runner: Runner, *, workers: int = DEFAULT_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 linger: float = DEFAULT_LINGER_SECONDS,
+                 high_water: int = DEFAULT_HIGH_WATER,
+                 max_wait: float = DEFAULT_MAX_WAIT_SECONDS,
+                 journal_interval: float = DEFAULT_JOURNAL_INTERVAL_SECONDS,
+                 lease: float = DEFAULT_LEASE_SECONDS,
+                 owner: Optional[str] = None):
+        self._runner = runner
+        self.workers = workers
+        self.batch_size = batch_size
+        self.linger = linger
+        self.high_water = high_water
+        self.max_wait = max_wait
+        self.journal_interval = journal_interval
+        self.lease = lease
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._spaces: Dict[str, _Space] = {}
+        self._ready: Deque[str] = deque()
+        self._wake = asyncio.Event()
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+        self._depth = 0
+        self._worker_tasks: List[asyncio.Task] = []
+        self._journal_task: Optional[asyncio.Task] = None
+        self._pool = None
+        self._db_impl = None
+        self._lease_renewed = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # ---- producers -------------------------------------------------------
+
+    def submit(self, db_impl, space_id: str, graph_uri: str,
+               subject_uris: Iterable[str], operation: str) -> asyncio.Future:
+        """Queue ``subject_uris`` for sync; never blocks.
+
+        Returns a Future resolved once every one of them has been synced
+        (by this call's entry or by one that superseded it).
+        """
+        self._ensure_workers()
+        uris = list(dict.fromkeys(subject_uris))
+        future = asyncio.get_running_loop().create_future()
+        ticket = _Ticket(future, len(uris))
+        space = self._spaces.get(space_id)
+        if space is None:
+            space = self._spaces[space_id] = _Space(db_impl)
+        space.db_impl = db_impl
+        now = time.time()
+        for uri in uris:
+            self._put(space, (graph_uri, uri), operation, now, [ticket])
+        self._mark_ready(space_id)
+        if not uris:
+            future.set_result(None)
+        return future
+
+    def _put(self, space: _Space, key: _Key, operation: str, now: float,
+             tickets: List[_Ticket]) -> None:
+        entry = space.pending.get(key)
+        if entry is None:
+            entry = space.pending[key] = _Entry(operation, now)
+            self._depth += 1
+        else:
+            sync_superseded.inc()
+            entry.operation = operation
+            entry.updated = max(now, entry.updated)
+            entry.journaled = False
+        entry.tickets.extend(tickets)
+        if self._depth >= self.high_water:
+            self._capacity.clear()
+
+    async def wait_for_capacity(self, max_wait: Optional[float] = None) -> float:
+        """Hold the caller while the queue is above its high-water mark.
+
+        Waits at most ``max_wait`` seconds (default ``self.max_wait``);
+        returns the time waited.
+        """
+        if self._capacity.is_set():
+            return 0.0
+        t0 = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._capacity.wait(),
+                                   self.max_wait if max_wait is None else max_wait)
+        except asyncio.TimeoutError:
+            logger.warning("auto_sync queue above high-water mark (%d pending); "
+                           "writer released after %.1fs", self._depth, self.max_wait)
+        waited = time.perf_counter() - t0
+        sync_backpressure_seconds.labels().observe(waited)
+        return waited
+
+    # ---- workers ---------------------------------------------------------
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or a new event loop (tests): workers and futures
+            # of another loop can never run again.
+            self._loop = loop
+            self._worker_tasks = []
+            self._spaces.clear()
+            self._ready.clear()
+            self._depth = 0
+            self._wake = asyncio.Event()
+            self._capacity = asyncio.Event()
+            if self._depth < self.high_water:
+                self._capacity.set()
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(loop.create_task(
+                self._worker(), name=f"auto_sync_worker:{len(self._worker_tasks)}"))
+
+    def _mark_ready(self, space_id: str) -> None:
+        space = self._spaces.get(space_id)
+        if (space is not None and space.pending and not space.busy
+                and space_id not in self._ready):
+            self._ready.append(space_id)
+            self._wake.set()
+
+    async def _worker(self) -> None:
+        while True:
+            while not self._ready:
+                self._wake.clear()
+                await self._wake.wait()
+            space_id = self._ready.popleft()
+            space = self._spaces.get(space_id)
+            if space is None or not space.pending or space.busy:
+                continue
+            space.busy = True
+            try:
+                await self._run_batch(space_id, space)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("auto_sync worker error for space %s: %s", space_id, e)
+            finally:
+                space.busy = False
+                self._mark_ready(space_id)
+
+    def _take_batch(self, space: _Space) -> Tuple[str, str, List[Tuple[_Key, _Entry]]]:
+        (graph_uri, _), first = next(iter(space.pending.items()))
+        operation = first.operation
+        batch = []
+        for key, entry in space.pending.items():
+            if key[0] == graph_uri and entry.operation == operation:
+                batch.append((key, entry))
+                if len(batch) >= self.batch_size:
+                    break
+        for key, _ in batch:
+            del space.pending[key]
+        self._depth -= len(batch)
+        if self._depth < self.high_water:
+            self._capacity.set()
+        return graph_uri, operation, batch
+
+    async def _run_batch(self, space_id: str, space: _Space) -> None:
+        oldest = next(iter(space.pending.values())).first_enqueued
+        wait = self.linger - (time.time() - oldest)
+        if wait > 0:
+            # Let a burst of small writes land in this batch.
+            await asyncio.sleep(wait)
+            if not space.pending or self._spaces.get(space_id) is not space:
+                return
+        graph_uri, operation, batch = self._take_batch(space)
+        uris = [key[1] for key, _ in batch]
+        space.inflight = len(batch)
+        space.batch = asyncio.ensure_future(
+            self._runner(space.db_impl, space_id, uris, graph_uri, operation))
+        t0 = time.perf_counter()
+        try:
+            # asyncio.wait does not propagate the batch's own cancellation
+            # (cancel_space_syncs) into this worker.
+            await asyncio.wait({space.batch})
+        except asyncio.CancelledError:
+            # Worker stopped (shutdown): let the batch go and keep its
+            # entries pending so stop() journals them.
+            space.batch.cancel()
+            for key, entry in batch:
+                if key not in space.pending:
+                    space.pending[key] = entry
+                    self._depth += 1
+            raise
+        finally:
+            done, space.batch, space.inflight = space.batch, None, 0
+        elapsed = time.perf_counter() - t0
+        if done.cancelled():
+            return
+        if done.exception() is not None:
+            logger.error("auto_sync batch %s/%s (%d subjects) failed: %s",
+                         space_id, operation, len(batch), done.exception())
+        sync_batch_seconds.labels(operation).observe(elapsed)
+        sync_subjects.labels(operation).inc(len(batch))
+        for _, entry in batch:
+            for ticket in entry.tickets:
+                ticket.settle()
+        journaled = [(key[1], entry.updated) for key, entry in batch if entry.in_journal]
+        if journaled:
+            await self._journal_done(space_id, graph_uri, journaled)
+
+    # ---- cancellation ----------------------------------------------------
+
+    async def discard_space(self, space_id: str, timeout: float = 5.0) -> int:
+        """Drop a space's pending entries and cancel its running batch.
+
+        Returns the number of subjects discarded (pending plus in flight).
+        """
+        space = self._spaces.pop(space_id, None)
+        try:
+            self._ready.remove(space_id)
+        except ValueError:
+            pass
+        if space is None:
+            return 0
+        dropped = len(space.pending) + space.inflight
+        self._depth -= len(space.pending)
+        if self._depth < self.high_water:
+            self._capacity.set()
+        for entry in space.pending.values():
+            for ticket in entry.tickets:
+                ticket.future.cancel()
+        space.pending.clear()
+        batch = space.batch
+        if batch is not None and not batch.done():
+            batch.cancel()
+            done, _ = await asyncio.wait({batch}, timeout=timeout)
+            if not done:
+                logger.warning("auto_sync: batch for space '%s' did not stop within %.1fs",
+                               space_id, timeout)
+        return dropped
+
+    def abort(self) -> None:
+        """Cancel workers and running batches and forget all pending work."""
+        for task in self._worker_tasks:
+            task.cancel()
+        for space in self._spaces.values():
+            if space.batch is not None:
+                space.batch.cancel()
+        self._worker_tasks = []
+        self._spaces.clear()
+        self._ready.clear()
+        self._depth = 0
+        self._capacity.set()
+
+    # ---- journal ---------------------------------------------------------
+
+    async def start(self, db_impl) -> int:
+        """Attach the journal through ``db_impl``'s pool and re-queue what a
+        stopped or crashed instance left; returns the number of entries
+        recovered."""
+        pool = getattr(db_impl, 'connection_pool', None)
+        if pool is None:
+            return 0
+        self._pool, self._db_impl = pool, db_impl
+        self._ensure_workers()
+        recovered = await self._claim_expired()
+        if self._journal_task is None or self._journal_task.done():
+            self._journal_task = asyncio.create_task(self._journal_loop())
+        return recovered
+
+    async def _claim_expired(self) -> int:
+        """Take over journal rows whose owner's lease has run out and queue
+        them; rows another live instance holds are left alone."""
+        try:
+            async with self._pool.acquire() as conn:
+                rows = await conn.fetch(_JOURNAL_CLAIM_SQL, self.owner, self.lease)
+        except Exception as e:
+            logger.warning("auto_sync journal recovery failed (non-fatal): %s", e)
+            return 0
+        self._lease_renewed = time.monotonic()
+        recovered = 0
+        for r in rows:
+            space = self._spaces.get(r['space_id'])
+            if space is None:
+                space = self._spaces[r['space_id']] = _Space(self._db_impl)
+            key = (r['graph_uri'], r['subject_uri'])
+            enqueued = r['enqueued_at'].timestamp()
+            entry = space.pending.get(key)
+            if entry is None:
+                self._put(space, key, r['operation'], enqueued, [])
+                entry = space.pending[key]
+                recovered += 1
+            elif entry.updated < enqueued:
+                entry.operation, entry.updated = r['operation'], enqueued
+            # The claimed row is ours now. Unless a newer change is pending
+            # here it needs no re-journal; the batch that syncs it deletes it.
+            entry.journaled = entry.updated <= enqueued
+            entry.in_journal = True
+        if rows:
+            for space_id in list(self._spaces):
+                self._mark_ready(space_id)
+            logger.info("auto_sync: re-queued %d journaled subject(s) across %d space(s)",
+                        recovered, len({r['space_id'] for r in rows}))
+        return recovered
+
+    async def _renew_lease(self) -> None:
+        async with self._pool.acquire() as conn:
+            await conn.execute(_JOURNAL_RENEW_SQL, self.owner, self.lease)
+
+    async def stop(self) -> None:
+        """Stop the workers and journal everything still pending."""
+        if self._journal_task is not None:
+            self._journal_task.cancel()
+            await asyncio.gather(self._journal_task, return_exceptions=True)
+            self._journal_task = None
+        workers, self._worker_tasks = self._worker_tasks, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await self.flush_journal(all_pending=True)
+        if self._pool is not None:
+            try:
+                # Hand what is left to whichever instance claims next.
+                async with self._pool.acquire() as conn:
+                    await conn.execute(_JOURNAL_RELEASE_SQL, self.owner)
+            except Exception as e:
+                logger.warning("auto_sync journal release failed: %s", e)
+
+    async def _journal_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.journal_interval)
+                await self.flush_journal()
+                if time.monotonic() - self._lease_renewed >= self.lease / 3:
+                    await self._renew_lease()
+                    await self._claim_expired()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.debug("auto_sync journal flush error (non-fatal): %s", e)
+
+    async def flush_journal(self, all_pending: bool = False) -> int:
+        """Journal pending entries older than ``journal_interval`` (or all)."""
+        if self._pool is None:
+            return 0
+        cutoff = time.time() - (0 if all_pending else self.journal_interval)
+        rows, entries = [], []
+        for space_id, space in self._spaces.items():
+            for (graph_uri, subject_uri), entry in space.pending.items():
+                if not entry.journaled and entry.updated <= cutoff:
+                    rows.append((space_id, graph_uri, subject_uri, entry.operation,
+                                 datetime.fromtimestamp(entry.updated, tz=timezone.utc)))
+                    entries.append(entry)
+        if not rows:
+            return 0
+        try:
+            async with self._pool.acquire() as conn:
+                await conn.execute(_JOURNAL_UPSERT_SQL, *[list(c) for c in zip(*rows)],
+                                   self.owner, self.lease)
+        except Exception as e:
+            logger.warning("auto_sync journal write of %d entries failed: %s", len(rows), e)
+            return 0
+        for entry in entries:
+            entry.journaled = entry.in_journal = True
+        return len(rows)
+
+    async def _journal_done(self, space_id: str, graph_uri: str,
+                            done: List[Tuple[str, float]]) -> None:
+        if self._pool is None:
+            return
+        try:
+            async with self._pool.acquire() as conn:
+                await conn.execute(
+                    _JOURNAL_DELETE_SQL, space_id, graph_uri,
+                    [uri for uri, _ in done],
+                    [datetime.fromtimestamp(ts, tz=timezone.utc) for _, ts in done])
+        except Exception as e:
+            logger.debug("auto_sync journal cleanup failed (non-fatal): %s", e)
+
+    # ---- introspection ---------------------------------------------------
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        spaces = []
+        for space_id, space in sorted(self._spaces.items()):
+            if not space.pending and not space.inflight:
+                continue
+            oldest = min((e.first_enqueued for e in space.pending.values()), default=now)
+            spaces.append({
+                'space_id': space_id,
+                'depth': len(space.pending),
+                'inflight': space.inflight,
+                'lag_seconds': round(now - oldest, 3),
+                'journaled': sum(1 for e in space.pending.values() if e.journaled),
+            })
+        return {
+            'depth': self._depth,
+            'inflight': sum(s['inflight'] for s in spaces),
+            'high_water': self.high_water,
+            'workers': self.workers,
+            'batch_size': self.batch_size,
+            'journal_enabled': self._pool is not None,
+            'spaces': spaces,
+        }
+
+    def collect(self) -> Iterable[Family]:
+        """``/metrics`` collector: depth, in-flight and lag per space."""
+        stats = self.stats()
+        depth, inflight, lag = [], [], []
+        for s in stats['spaces']:
+            labels = {'space': s['space_id']}
+            depth.append((labels, s['depth']))
+            inflight.append((labels, s['inflight']))
+            lag.append((labels, s['lag_seconds']))
+        return [
+            ('vitalgraph_sync_queue_depth', 'gauge',
+             'Subjects waiting for auto-sync.', depth),
+            ('vitalgraph_sync_queue_inflight', 'gauge',
+             'Subjects in a running auto-sync batch.', inflight),
+            ('vitalgraph_sync_queue_lag_seconds', 'gauge',
+             'Age of the oldest subject waiting for auto-sync.', lag),
+        ]
+
+
+_JOURNAL_UPSERT_SQL = """
+    INSERT INTO sync_queue (space_id, graph_uri, subject_uri, operation, enqueued_at,
+                            owner, lease_until)
+    SELECT u.space_id, u.graph_uri, u.subject_uri, u.operation, u.enqueued_at,
+           $6, now() + make_interval(secs => $7)
+    FROM unnest($1::varchar[], $2::text[], $3::text[], $4::varchar[], $5::timestamptz[])
+         AS u(space_id, graph_uri, subject_uri, operation, enqueued_at)
+    WHERE EXISTS (SELECT 1 FROM space s WHERE s.space_id = u.space_id)
+    ON CONFLICT (space_id, graph_uri, subject_uri) DO UPDATE SET
+        operation = EXCLUDED.operation,
+        enqueued_at = EXCLUDED.enqueued_at,
+        owner = EXCLUDED.owner,
+        lease_until = EXCLUDED.lease_until
+    WHERE sync_queue.enqueued_at <= EXCLUDED.enqueued_at
+"""
+
+# Rows whose owner stopped renewing (crashed, or released them on stop).
+_JOURNAL_CLAIM_SQL = """
+    UPDATE sync_queue q SET owner = $1, lease_until = now() + make_interval(secs => $2)
+    FROM (SELECT space_id, graph_uri, subject_uri FROM sync_queue
+          WHERE lease_until < now()
+          FOR UPDATE SKIP LOCKED) c
+    WHERE q.space_id = c.space_id AND q.graph_uri = c.graph_uri
+      AND q.subject_uri = c.subject_uri
+    RETURNING q.space_id, q.graph_uri, q.subject_uri, q.operation, q.enqueued_at
+"""
+
+_JOURNAL_RENEW_SQL = """
+    UPDATE sync_queue SET lease_until = now() + make_interval(secs => $2) WHERE owner = $1
+"""
+
+_JOURNAL_RELEASE_SQL = """
+    UPDATE sync_queue SET lease_until = now() WHERE owner = $1
+"""
+
+# Only rows not re-journaled by a later change since the batch was taken.
+_JOURNAL_DELETE_SQL = """
+    DELETE FROM sync_queue q
+    USING unnest($3::text[], $4::timestamptz[]) AS d(subject_uri, enqueued_at)
+    WHERE q.space_id = $1 AND q.graph_uri = $2
+      AND q.subject_uri = d.subject_uri AND q.enqueued_at <= d.enqueued_at
+"""
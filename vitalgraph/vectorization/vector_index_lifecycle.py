@@ -4,15 +4,26 @@ General-purpose vector index lifecycle helpers.
 Provides setup, teardown, and swap operations for any named vector index.
 Callers supply index configuration (name, dimensions, provider, etc.)
 and mapping definitions as plain data — no class-specific logic lives here.
+
+The HNSW index of a data table follows the ``storage`` key of the index's
+``provider_config`` (``vector`` / ``halfvec`` / ``binary``, see
+vitalgraph/db/vector_storage.py); ``set_index_storage`` switches it, and
+``drop_hnsw_index`` / ``build_hnsw_index`` let a bulk load build the
+graph once at the end instead of inserting into it row by row.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from vitalgraph.db.sparql_sql.sparql_sql_schema import SparqlSQLSchema
+from vitalgraph.db.vector_storage import (
+    STORAGE_VECTOR, is_quantized, pgvector_version, storage_config,
+    supports_quantized_storage, validate_storage,
+)
 from vitalgraph.vectorization.search_mapping_manager import SearchMappingManager
 
 logger = logging.getLogger(__name__)
@@ -43,7 +54,8 @@ async def ensure_index(
 
     *config* must contain: ``dimensions``, ``distance_metric``,
     ``provider``, ``model_name``.  Optional: ``provider_config``,
-    ``description``.
+    ``description``.  ``provider_config.storage`` selects a quantized
+    HNSW index (``halfvec`` / ``binary``, pgvector >= 0.7).
 
     ``provider`` and ``dimensions`` are validated against the provider registry
     using the same rule as the REST create path, so this programmatic entry
@@ -74,6 +86,19 @@ async def ensure_index(
         )
         return False
 
+    try:
+        storage, _ = storage_config(config.get("provider_config"))
+    except ValueError as e:
+        logger.error("Refusing to create index '%s' for %s: %s", index_name, space_id, e)
+        return False
+    storage_error = validate_storage(storage, config["dimensions"])
+    if storage_error:
+        logger.error(
+            "Refusing to create index '%s' for %s: %s",
+            index_name, space_id, storage_error,
+        )
+        return False
+
     vector_index_table = f"{space_id}_vector_index"
     try:
         row = await conn.fetchrow(
@@ -84,6 +109,14 @@ async def ensure_index(
             logger.debug("Index '%s' already exists for space %s", index_name, space_id)
             return True
 
+        if is_quantized(storage) and not supports_quantized_storage(
+                await pgvector_version(conn)):
+            logger.error(
+                "Refusing to create index '%s' for %s: %s storage needs pgvector >= 0.7",
+                index_name, space_id, storage,
+            )
+            return False
+
         await conn.execute(
             f"""
             INSERT INTO {vector_index_table}
@@ -104,13 +137,13 @@ async def ensure_index(
         schema = SparqlSQLSchema()
         for stmt in schema.create_vector_data_table_sql(
             space_id, index_name,
-            config["dimensions"], config["distance_metric"],
+            config["dimensions"], config["distance_metric"], storage,
         ):
             await conn.execute(stmt)
 
         logger.info(
-            "Created vector index '%s' for space %s: dims=%d, provider=%s",
-            index_name, space_id, config["dimensions"], config["provider"],
+            "Created vector index '%s' for space %s: dims=%d, provider=%s, storage=%s",
+            index_name, space_id, config["dimensions"], config["provider"], storage,
         )
         return True
 
@@ -232,6 +265,104 @@ async def swap_index(
     return await setup_index(conn, space_id, index_name, new_config, mapping_defs)
 
 
+async def drop_hnsw_index(conn, space_id: str, index_name: str) -> None:
+    """Drop the HNSW index of *index_name*'s data table, if present."""
+    name = SparqlSQLSchema.vec_hnsw_index_name(space_id, index_name)
+    await conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+async def build_hnsw_index(
+    conn,
+    space_id: str,
+    index_name: str,
+    maintenance_work_mem: Optional[str] = None,
+) -> str:
+    """(Re)create the HNSW index of *index_name* for its configured storage.
+
+    Reads dimensions, metric and storage from the registry row. A no-op
+    when the index already exists. ``maintenance_work_mem`` (e.g.
+    ``'2GB'``) is applied for this build only: HNSW builds are much
+    faster while the graph fits in it.
+
+    Returns the storage the index was built for.
+    """
+    row = await conn.fetchrow(
+        f"SELECT dimensions, distance_metric, provider_config "
+        f"FROM {space_id}_vector_index WHERE index_name = $1",
+        index_name,
+    )
+    if row is None:
+        raise ValueError(f"Vector index '{index_name}' not found in {space_id}_vector_index")
+    storage, _ = storage_config(row["provider_config"])
+    stmt = SparqlSQLSchema().create_vector_hnsw_index_sql(
+        space_id, index_name, row["dimensions"], row["distance_metric"], storage,
+    )
+    t0 = time.monotonic()
+    async with conn.transaction():
+        if maintenance_work_mem:
+            await conn.execute(
+                "SELECT set_config('maintenance_work_mem', $1, true)", maintenance_work_mem,
+            )
+        await conn.execute(stmt)
+    logger.info(
+        "Built HNSW index for '%s' in space %s (storage=%s) in %.1fs",
+        index_name, space_id, storage, time.monotonic() - t0,
+    )
+    return storage
+
+
+async def set_index_storage(
+    conn,
+    space_id: str,
+    index_name: str,
+    storage: str,
+    rerank_factor: Optional[int] = None,
+) -> bool:
+    """Switch *index_name* to another HNSW storage and rebuild its index.
+
+    Records ``storage`` (and ``rerank_factor`` when given) in the
+    registry row's ``provider_config``, then drops and re-creates the
+    HNSW index. Embeddings are kept — no repopulation is needed.
+
+    Returns True on success, False on error.
+    """
+    patch: Dict[str, Any] = {"storage": storage}
+    if rerank_factor is not None:
+        patch["rerank_factor"] = rerank_factor
+    try:
+        storage_config(patch)
+        row = await conn.fetchrow(
+            f"SELECT dimensions FROM {space_id}_vector_index WHERE index_name = $1",
+            index_name,
+        )
+        if row is None:
+            logger.error("No vector index '%s' in space %s", index_name, space_id)
+            return False
+        error = validate_storage(storage, row["dimensions"])
+        if error is None and storage != STORAGE_VECTOR and not supports_quantized_storage(
+                await pgvector_version(conn)):
+            error = f"{storage} storage needs pgvector >= 0.7"
+        if error:
+            logger.error("Cannot set storage of '%s' in %s: %s", index_name, space_id, error)
+            return False
+
+        async with conn.transaction():
+            await conn.execute(
+                f"UPDATE {space_id}_vector_index "
+                f"SET provider_config = COALESCE(provider_config, '{{}}'::jsonb) || $2::jsonb "
+                f"WHERE index_name = $1",
+                index_name, _jsonb(patch),
+            )
+            await drop_hnsw_index(conn, space_id, index_name)
+            await build_hnsw_index(conn, space_id, index_name)
+        logger.info("Index '%s' in space %s now uses %s storage", index_name, space_id, storage)
+        return True
+
+    except Exception as e:
+        logger.error("Error changing storage of '%s' for %s: %s", index_name, space_id, e)
+        return False
+
+
 # ── helpers ───────────────────────────────────────────────────────────
 
 def _jsonb(value) -> Optional[str]:
@@ -11,6 +11,8 @@ import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from vital_ai_vitalsigns.embedding.embedding_model import EmbeddingModel
 
 from vitalgraph.vectorization.base import VectorizationProvider
@@ -78,7 +80,7 @@ class VitalSignsProvider(VectorizationProvider):
             cache_size=config.get("cache_size", 1000),
         )
 
-    async def vectorize_text(self, text: str) -> List[float]:
+    async def vectorize_text(self, text: str) -> np.ndarray:
         """Vectorize a single text string.
 
         Offloads the synchronous ONNX inference to a thread to avoid
@@ -87,7 +89,7 @@ class VitalSignsProvider(VectorizationProvider):
         vec = await asyncio.to_thread(self._vectorize_sync, text)
         return vec
 
-    async def vectorize_texts(self, texts: List[str]) -> List[List[float]]:
+    async def vectorize_texts(self, texts: List[str]) -> List[np.ndarray]:
         """Vectorize a batch of texts.
 
         Processes all texts in a single thread call.
@@ -95,16 +97,13 @@ class VitalSignsProvider(VectorizationProvider):
         vecs = await asyncio.to_thread(self._vectorize_batch_sync, texts)
         return vecs
 
-    def _vectorize_sync(self, text: str) -> List[float]:
+    def _vectorize_sync(self, text: str) -> np.ndarray:
         """Synchronous vectorization of a single text."""
-        import numpy as np
-        result = self._embedder.vectorize(text)  # type: ignore[arg-type]
         # EmbeddingModel returns numpy ndarray for single string
-        if isinstance(result, np.ndarray):
-            return result.tolist()
-        return list(result)  # type: ignore[arg-type]
+        result = self._embedder.vectorize(text)  # type: ignore[arg-type]
+        return np.asarray(result, dtype=np.float32)
 
-    def _vectorize_batch_sync(self, texts: List[str]) -> List[List[float]]:
+    def _vectorize_batch_sync(self, texts: List[str]) -> List[np.ndarray]:
         """Synchronous batch vectorization.
 
         NOTE: We vectorize one-at-a-time to preserve positional order.
@@ -112,12 +111,7 @@ class VitalSignsProvider(VectorizationProvider):
         where cached results are placed before newly-computed ones, breaking
         the correspondence between input texts and output embeddings.
         """
-        import numpy as np
-        out: List[List[float]] = []
-        for t in texts:
-            result = self._embedder.vectorize(t)  # single string → single array
-            if isinstance(result, np.ndarray):
-                out.append(result.tolist())
-            else:
-                out.append(list(result))  # type: ignore[arg-type]
-        return out
+        return [
+            np.asarray(self._embedder.vectorize(t), dtype=np.float32)  # type: ignore[arg-type]
+            for t in texts
+        ]